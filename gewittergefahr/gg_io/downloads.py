@@ -1,11 +1,21 @@
 """Methods for downloading files."""
 
 import os
+import re
+import time
+import base64
+import calendar
 import warnings
+import threading
 import subprocess
 import ftplib
+import httplib
 import urllib2
+import urlparse
+import email.utils
+from multiprocessing.pool import ThreadPool
 import numpy
+import pandas
 from gewittergefahr.gg_utils import file_system_utils
 from gewittergefahr.gg_utils import error_checking
 
@@ -23,6 +33,758 @@ ACCEPTABLE_URL_ERROR_CODES = [URL_NOT_FOUND_ERROR_CODE, URL_TIMEOUT_ERROR_CODE]
 ACCEPTABLE_HTTP_ERROR_CODES = [
     HTTP_NOT_FOUND_ERROR_CODE, SERVICE_TEMP_UNAVAILABLE_ERROR_CODE]
 
+HTTP_OK_CODE = 200
+HTTP_PARTIAL_CONTENT_CODE = 206
+HTTP_RANGE_NOT_SATISFIABLE_CODE = 416
+HTTP_REDIRECT_CODES = [301, 302, 303, 307, 308]
+HTTP_CONTENT_RANGE_PATTERN = re.compile(r'bytes (\d+)-(\d+)/(\d+|\*)')
+MAX_NUM_REDIRECTS = 5
+
+HTTP_SCHEME = 'http'
+HTTPS_SCHEME = 'https'
+FTP_SCHEME = 'ftp'
+VALID_URL_SCHEMES = [HTTP_SCHEME, HTTPS_SCHEME, FTP_SCHEME]
+
+DEFAULT_NUM_THREADS = 4
+DEFAULT_TIMEOUT_SECONDS = 60.
+PARTIAL_FILE_SUFFIX = '.part'
+FTP_TIME_FORMAT = '%Y%m%d%H%M%S'
+
+ONLINE_FILE_COLUMN = 'online_file_name'
+LOCAL_FILE_COLUMN = 'local_file_name'
+STATUS_COLUMN = 'status'
+NUM_BYTES_COLUMN = 'num_bytes_transferred'
+ERROR_STRING_COLUMN = 'error_string'
+MANIFEST_COLUMNS = [
+    ONLINE_FILE_COLUMN, LOCAL_FILE_COLUMN, STATUS_COLUMN, NUM_BYTES_COLUMN,
+    ERROR_STRING_COLUMN]
+
+DOWNLOADED_STATUS = 'downloaded'
+RESUMED_STATUS = 'resumed'
+SKIPPED_STATUS = 'skipped'
+NOT_FOUND_STATUS = 'not_found'
+FAILED_STATUS = 'failed'
+SUCCESS_STATUSES = [DOWNLOADED_STATUS, RESUMED_STATUS, SKIPPED_STATUS]
+
+
+class _FileNotFoundError(Exception):
+    """Raised when file does not exist on server."""
+    pass
+
+
+class _ConnectionPool(object):
+    """Pool of open connections, keyed by (scheme, host, port).
+
+    Connections are checked out by one worker thread at a time and returned
+    after each transfer, so that consecutive files on the same host reuse the
+    connection (HTTP keep-alive, or one FTP login for many files).
+    """
+
+    def __init__(self, user_name=None, password=None,
+                 timeout_seconds=DEFAULT_TIMEOUT_SECONDS):
+        """Constructor.
+
+        :param user_name: User name on all servers.  To login anonymously,
+            leave this as None.
+        :param password: Password on all servers.  To login anonymously,
+            leave this as None.
+        :param timeout_seconds: Timeout for socket operations.
+        """
+
+        self.user_name = user_name
+        self.password = password
+        self.timeout_seconds = timeout_seconds
+        self._idle_connections_by_key = {}
+        self._lock = threading.Lock()
+
+    def check_out(self, connection_key):
+        """Returns idle connection to the given server (or opens a new one).
+
+        :param connection_key: Tuple of (scheme, host name, port).
+        :return: connection_object: Instance of `httplib.HTTPConnection`,
+            `httplib.HTTPSConnection`, or `ftplib.FTP`.
+        :return: reused_flag: Boolean flag, indicating whether or not the
+            connection was used for a previous transfer.
+        """
+
+        with self._lock:
+            these_connections = self._idle_connections_by_key.get(
+                connection_key, [])
+            if these_connections:
+                return these_connections.pop(), True
+
+        scheme, host_name, port = connection_key
+        if scheme == FTP_SCHEME:
+            return _open_ftp_connection(
+                host_name=host_name, port=port, user_name=self.user_name,
+                password=self.password,
+                timeout_seconds=self.timeout_seconds), False
+
+        if scheme == HTTPS_SCHEME:
+            return httplib.HTTPSConnection(
+                host_name, port, timeout=self.timeout_seconds), False
+
+        return httplib.HTTPConnection(
+            host_name, port, timeout=self.timeout_seconds), False
+
+    def check_in(self, connection_key, connection_object):
+        """Returns connection to the pool, after a successful transfer.
+
+        :param connection_key: See doc for `check_out`.
+        :param connection_object: Same.
+        """
+
+        with self._lock:
+            self._idle_connections_by_key.setdefault(
+                connection_key, []).append(connection_object)
+
+    def close_all(self):
+        """Closes all idle connections."""
+
+        with self._lock:
+            for these_connections in self._idle_connections_by_key.values():
+                for this_connection in these_connections:
+                    _close_connection(this_connection)
+
+            self._idle_connections_by_key = {}
+
+
+def _open_ftp_connection(host_name, port, user_name, password,
+                         timeout_seconds):
+    """Opens connection to FTP server and logs in.
+
+    :param host_name: Name of FTP server.
+    :param port: Port on FTP server.  If None, will use the default port.
+    :param user_name: User name on FTP server.  To login anonymously, leave
+        this as None.
+    :param password: Password on FTP server.  To login anonymously, leave this
+        as None.
+    :param timeout_seconds: Timeout for socket operations.
+    :return: ftp_object: Instance of `ftplib.FTP`.
+    """
+
+    ftp_object = ftplib.FTP(timeout=timeout_seconds)
+    ftp_object.connect(host_name, port or ftplib.FTP_PORT)
+
+    if user_name is None or password is None:
+        ftp_object.login()
+    else:
+        ftp_object.login(user_name, password)
+
+    ftp_object.voidcmd('TYPE I')
+    return ftp_object
+
+
+def _close_connection(connection_object):
+    """Closes HTTP or FTP connection, ignoring errors.
+
+    :param connection_object: Instance of `httplib.HTTPConnection`,
+        `httplib.HTTPSConnection`, or `ftplib.FTP`.
+    """
+
+    try:
+        if isinstance(connection_object, ftplib.FTP):
+            connection_object.quit()
+        else:
+            connection_object.close()
+    except Exception:
+        pass
+
+
+def _split_url(online_file_name):
+    """Splits URL into connection key and path.
+
+    :param online_file_name: URL (scheme must be in `VALID_URL_SCHEMES`).
+    :return: connection_key: Tuple of (scheme, host name, port).
+    :return: path_string: Path on server (for HTTP, including the query; for
+        FTP, relative to the login directory).
+    :raises: ValueError: if scheme is not in `VALID_URL_SCHEMES`.
+    """
+
+    url_parts = urlparse.urlsplit(online_file_name)
+    if url_parts.scheme not in VALID_URL_SCHEMES:
+        error_string = (
+            '\n\n{0:s}\nValid URL schemes (listed above) do not include '
+            '"{1:s}" (from URL "{2:s}").').format(
+                str(VALID_URL_SCHEMES), url_parts.scheme, online_file_name)
+        raise ValueError(error_string)
+
+    # As in RFC 1738, the path in an FTP URL is relative to the login
+    # directory, so "ftp://host//pub/a.txt" is needed for the absolute path
+    # "/pub/a.txt".
+    if url_parts.scheme == FTP_SCHEME:
+        path_string = url_parts.path[1:]
+    else:
+        path_string = url_parts.path or '/'
+        if url_parts.query:
+            path_string += '?' + url_parts.query
+
+    return (url_parts.scheme, url_parts.hostname, url_parts.port), path_string
+
+
+def _is_local_file_current(local_file_name, remote_num_bytes,
+                           remote_modification_time_unix_sec):
+    """Determines whether or not local file matches remote file.
+
+    The local file matches if it has the same size and (when the server reports
+    a modification time) the same modification time.
+
+    :param local_file_name: Path to local file.
+    :param remote_num_bytes: Size of remote file.  If None (unknown), this
+        method returns False.
+    :param remote_modification_time_unix_sec: Modification time of remote file.
+        If None (unknown), only size is compared.
+    :return: current_flag: Boolean flag.
+    """
+
+    if remote_num_bytes is None or not os.path.isfile(local_file_name):
+        return False
+    if os.path.getsize(local_file_name) != remote_num_bytes:
+        return False
+    if remote_modification_time_unix_sec is None:
+        return True
+
+    return (int(os.path.getmtime(local_file_name)) ==
+            remote_modification_time_unix_sec)
+
+
+def _http_date_to_unix_sec(http_date_string):
+    """Converts date from HTTP header (e.g., "Last-Modified") to Unix time.
+
+    :param http_date_string: Date string (e.g., "Sun, 06 Nov 1994 08:49:37
+        GMT").  May be None.
+    :return: unix_time_sec: Time in Unix format.  If the string is None or
+        cannot be parsed, this is None.
+    """
+
+    if http_date_string is None:
+        return None
+
+    date_tuple = email.utils.parsedate_tz(http_date_string)
+    if date_tuple is None:
+        return None
+    return int(email.utils.mktime_tz(date_tuple))
+
+
+def _ftp_mdtm_to_unix_sec(mdtm_response_string):
+    """Converts response to FTP command "MDTM" to Unix time.
+
+    :param mdtm_response_string: Response (e.g., "213 19941106084937").
+    :return: unix_time_sec: Time in Unix format.  If the response cannot be
+        parsed, this is None.
+    """
+
+    try:
+        time_string = mdtm_response_string.split()[1][:14]
+        return calendar.timegm(time.strptime(time_string, FTP_TIME_FORMAT))
+    except (IndexError, ValueError):
+        return None
+
+
+def _finish_local_file(partial_file_name, local_file_name,
+                       modification_time_unix_sec):
+    """Moves completed partial file to its final path.
+
+    :param partial_file_name: Path to partial (now complete) file.
+    :param local_file_name: Final path.
+    :param modification_time_unix_sec: Modification time of remote file, to be
+        set on the local file (so that later calls can skip it).  If None, the
+        modification time is left alone.
+    """
+
+    if os.path.isfile(local_file_name):
+        os.remove(local_file_name)
+    os.rename(partial_file_name, local_file_name)
+
+    if modification_time_unix_sec is not None:
+        os.utime(local_file_name, (
+            modification_time_unix_sec, modification_time_unix_sec))
+
+
+def _get_http_headers(connection_pool, num_bytes_to_skip=0):
+    """Creates headers for HTTP request.
+
+    :param connection_pool: Instance of `_ConnectionPool`.
+    :param num_bytes_to_skip: Number of bytes (at beginning of file) to skip.
+    :return: header_dict: Dictionary of headers.
+    """
+
+    header_dict = {}
+    if not (connection_pool.user_name is None or
+            connection_pool.password is None):
+        header_dict['Authorization'] = 'Basic ' + base64.b64encode(
+            '{0:s}:{1:s}'.format(
+                connection_pool.user_name, connection_pool.password))
+
+    if num_bytes_to_skip > 0:
+        header_dict['Range'] = 'bytes={0:d}-'.format(num_bytes_to_skip)
+
+    return header_dict
+
+
+def _send_http_request(connection_pool, method_string, online_file_name,
+                       header_dict):
+    """Sends HTTP request, following redirects.
+
+    If the request fails on a connection reused from an earlier transfer (which
+    the server may have closed), it is repeated once on a new connection.  If
+    a redirect leads to another host, the "Authorization" header is not sent
+    there.
+
+    :param connection_pool: Instance of `_ConnectionPool`.
+    :param method_string: HTTP method ("HEAD" or "GET").
+    :param online_file_name: URL.
+    :param header_dict: Dictionary of headers.
+    :return: response_object: Instance of `httplib.HTTPResponse`.
+    :return: connection_key: Key for the connection used (see
+        `_ConnectionPool.check_out`).
+    :return: connection_object: Connection used.  Must be returned to the pool
+        (or closed) by the caller, after the response has been read.
+    :raises: ValueError: if there are too many redirects.
+    """
+
+    first_host_name = _split_url(online_file_name)[0][1]
+
+    for _ in range(MAX_NUM_REDIRECTS + 1):
+        connection_key, path_string = _split_url(online_file_name)
+        if connection_key[1] != first_host_name:
+            header_dict = {
+                k: header_dict[k] for k in header_dict
+                if k != 'Authorization'}
+
+        while True:
+            connection_object, reused_flag = connection_pool.check_out(
+                connection_key)
+
+            try:
+                connection_object.request(
+                    method_string, path_string, headers=header_dict)
+                response_object = connection_object.getresponse()
+                break
+            except (httplib.HTTPException, IOError):
+                _close_connection(connection_object)
+                if not reused_flag:
+                    raise
+
+        if response_object.status not in HTTP_REDIRECT_CODES:
+            return response_object, connection_key, connection_object
+
+        response_object.read()
+        connection_pool.check_in(connection_key, connection_object)
+        online_file_name = urlparse.urljoin(
+            online_file_name, response_object.getheader('location'))
+
+    raise ValueError('Too many redirects for URL "{0:s}".'.format(
+        online_file_name))
+
+
+def _check_http_content_range(response_object, num_bytes_to_skip):
+    """Ensures that partial content starts where the partial file ends.
+
+    :param response_object: Instance of `httplib.HTTPResponse`, with status
+        `HTTP_PARTIAL_CONTENT_CODE`.
+    :param num_bytes_to_skip: Size of partial file.
+    :return: total_num_bytes: Size of remote file, from the "Content-Range"
+        header.  If the header is missing or the size is unknown, this is None.
+    :raises: ValueError: if the content does not start at byte
+        `num_bytes_to_skip`.
+    """
+
+    content_range_string = response_object.getheader('content-range')
+    if content_range_string is None:
+        return None
+
+    match_object = HTTP_CONTENT_RANGE_PATTERN.match(
+        content_range_string.strip())
+    if match_object is None:
+        return None
+
+    if int(match_object.group(1)) != num_bytes_to_skip:
+        error_string = (
+            'Requested content starting at byte {0:d}, but server sent content '
+            'range "{1:s}".').format(num_bytes_to_skip, content_range_string)
+        raise ValueError(error_string)
+
+    if match_object.group(3) == '*':
+        return None
+    return int(match_object.group(3))
+
+
+def _check_num_bytes(partial_file_name, num_bytes_transferred,
+                     expected_num_bytes_transferred, expected_file_size):
+    """Ensures that transfer is complete.
+
+    If not, the partial file is left alone, so that it can be resumed later.
+
+    :param partial_file_name: Path to partial file.
+    :param num_bytes_transferred: Number of bytes transferred.
+    :param expected_num_bytes_transferred: Expected number of bytes
+        transferred.  If None (unknown), this is not checked.
+    :param expected_file_size: Expected size of partial file, in bytes.  If
+        None (unknown), this is not checked.
+    :raises: ValueError: if either check fails.
+    """
+
+    if (expected_num_bytes_transferred is not None and
+            num_bytes_transferred != expected_num_bytes_transferred):
+        error_string = (
+            'Expected {0:d} bytes, but transferred {1:d}.  Partial file kept '
+            'at "{2:s}".').format(
+                expected_num_bytes_transferred, num_bytes_transferred,
+                partial_file_name)
+        raise ValueError(error_string)
+
+    if expected_file_size is None:
+        return
+
+    file_size = os.path.getsize(partial_file_name)
+    if file_size != expected_file_size:
+        error_string = (
+            'Expected file size of {0:d} bytes, but partial file "{1:s}" has '
+            '{2:d} bytes.').format(
+                expected_file_size, partial_file_name, file_size)
+        raise ValueError(error_string)
+
+
+def _download_one_file_via_http(
+        connection_pool, online_file_name, local_file_name, skip_existing,
+        resume_partial):
+    """Downloads one file via HTTP or HTTPS.
+
+    :param connection_pool: Instance of `_ConnectionPool`.
+    :param online_file_name: URL.
+    :param local_file_name: Path to local file.
+    :param skip_existing: See doc for `download_files`.
+    :param resume_partial: Same.
+    :return: status_string: Status (one of the statuses in `SUCCESS_STATUSES`).
+    :return: num_bytes_transferred: Number of bytes transferred.
+    :raises: _FileNotFoundError: if file does not exist on server.
+    :raises: ValueError: if server returns an unexpected status code, or if the
+        number of bytes transferred does not match the "Content-Length" header
+        (or, for a resumed download, the total size in the "Content-Range"
+        header).  In the latter case the partial file is kept.
+    """
+
+    if skip_existing and os.path.isfile(local_file_name):
+        response_object, connection_key, connection_object = (
+            _send_http_request(
+                connection_pool, 'HEAD', online_file_name,
+                _get_http_headers(connection_pool)))
+        response_object.read()
+        connection_pool.check_in(connection_key, connection_object)
+
+        if response_object.status == HTTP_OK_CODE:
+            remote_num_bytes = response_object.getheader('content-length')
+            if remote_num_bytes is not None:
+                remote_num_bytes = int(remote_num_bytes)
+
+            if _is_local_file_current(
+                    local_file_name, remote_num_bytes, _http_date_to_unix_sec(
+                        response_object.getheader('last-modified'))):
+                return SKIPPED_STATUS, 0
+
+    partial_file_name = local_file_name + PARTIAL_FILE_SUFFIX
+    num_bytes_to_skip = 0
+    if resume_partial and os.path.isfile(partial_file_name):
+        num_bytes_to_skip = os.path.getsize(partial_file_name)
+
+    response_object, connection_key, connection_object = _send_http_request(
+        connection_pool, 'GET', online_file_name,
+        _get_http_headers(connection_pool, num_bytes_to_skip))
+
+    if (num_bytes_to_skip > 0 and
+            response_object.status == HTTP_RANGE_NOT_SATISFIABLE_CODE):
+
+        # Partial file is stale (e.g., larger than remote file).  Start over.
+        response_object.read()
+        connection_pool.check_in(connection_key, connection_object)
+        os.remove(partial_file_name)
+
+        num_bytes_to_skip = 0
+        response_object, connection_key, connection_object = (
+            _send_http_request(
+                connection_pool, 'GET', online_file_name,
+                _get_http_headers(connection_pool)))
+
+    if response_object.status not in [
+            HTTP_OK_CODE, HTTP_PARTIAL_CONTENT_CODE]:
+        response_object.read()
+        connection_pool.check_in(connection_key, connection_object)
+
+        if response_object.status in ACCEPTABLE_HTTP_ERROR_CODES:
+            raise _FileNotFoundError('HTTP status {0:d} ({1:s}).'.format(
+                response_object.status, response_object.reason))
+
+        raise ValueError('HTTP status {0:d} ({1:s}).'.format(
+            response_object.status, response_object.reason))
+
+    resumed_flag = response_object.status == HTTP_PARTIAL_CONTENT_CODE
+    num_bytes_transferred = 0
+
+    try:
+        expected_file_size = None
+        if resumed_flag:
+            expected_file_size = _check_http_content_range(
+                response_object, num_bytes_to_skip)
+
+        expected_num_bytes_transferred = response_object.getheader(
+            'content-length')
+        if expected_num_bytes_transferred is not None:
+            expected_num_bytes_transferred = int(
+                expected_num_bytes_transferred)
+
+        with open(partial_file_name, 'ab' if resumed_flag else 'wb') as (
+                this_file_handle):
+            while True:
+                this_chunk = response_object.read(NUM_BYTES_PER_BLOCK)
+                if not this_chunk:
+                    break
+
+                this_file_handle.write(this_chunk)
+                num_bytes_transferred += len(this_chunk)
+
+        _check_num_bytes(
+            partial_file_name=partial_file_name,
+            num_bytes_transferred=num_bytes_transferred,
+            expected_num_bytes_transferred=expected_num_bytes_transferred,
+            expected_file_size=expected_file_size)
+    except Exception:
+        _close_connection(connection_object)
+        raise
+
+    connection_pool.check_in(connection_key, connection_object)
+    _finish_local_file(
+        partial_file_name, local_file_name,
+        _http_date_to_unix_sec(response_object.getheader('last-modified')))
+
+    if resumed_flag:
+        return RESUMED_STATUS, num_bytes_transferred
+    return DOWNLOADED_STATUS, num_bytes_transferred
+
+
+def _download_one_file_via_ftp(
+        connection_pool, online_file_name, local_file_name, skip_existing,
+        resume_partial):
+    """Downloads one file via FTP.
+
+    :param connection_pool: See doc for `_download_one_file_via_http`.
+    :param online_file_name: Same.
+    :param local_file_name: Same.
+    :param skip_existing: Same.
+    :param resume_partial: Same.
+    :return: status_string: Same.
+    :return: num_bytes_transferred: Same.
+    :raises: _FileNotFoundError: if file does not exist on server.
+    :raises: ValueError: if the server reports the size of the file and the
+        downloaded file has a different size.  In this case the partial file is
+        kept.
+    """
+
+    connection_key, ftp_file_name = _split_url(online_file_name)
+
+    while True:
+        ftp_object, reused_flag = connection_pool.check_out(connection_key)
+        try:
+            # This is None if the reply does not contain the size.
+            remote_num_bytes = ftp_object.size(ftp_file_name)
+            break
+        except ftplib.error_perm as this_error:
+            if str(this_error).startswith(str(FTP_NOT_FOUND_ERROR_CODE)):
+                connection_pool.check_in(connection_key, ftp_object)
+                raise _FileNotFoundError(str(this_error))
+
+            # Server does not support the "SIZE" command (e.g., reply 500 or
+            # 502), so the size is unknown.
+            remote_num_bytes = None
+            break
+        except (ftplib.error_temp, ftplib.error_reply, EOFError, IOError):
+            _close_connection(ftp_object)
+            if not reused_flag:
+                raise
+
+    try:
+        modification_time_unix_sec = _ftp_mdtm_to_unix_sec(
+            ftp_object.sendcmd('MDTM ' + ftp_file_name))
+    except ftplib.error_perm:
+        modification_time_unix_sec = None
+
+    if skip_existing and _is_local_file_current(
+            local_file_name, remote_num_bytes, modification_time_unix_sec):
+        connection_pool.check_in(connection_key, ftp_object)
+        return SKIPPED_STATUS, 0
+
+    partial_file_name = local_file_name + PARTIAL_FILE_SUFFIX
+    num_bytes_to_skip = 0
+    if (resume_partial and remote_num_bytes is not None and
+            os.path.isfile(partial_file_name)):
+        num_bytes_to_skip = os.path.getsize(partial_file_name)
+        if num_bytes_to_skip > remote_num_bytes:
+            num_bytes_to_skip = 0
+
+    num_bytes_by_chunk = []
+
+    try:
+        with open(partial_file_name, 'ab' if num_bytes_to_skip else 'wb') as (
+                this_file_handle):
+
+            def _write_chunk(chunk_string):
+                this_file_handle.write(chunk_string)
+                num_bytes_by_chunk.append(len(chunk_string))
+
+            if (remote_num_bytes is None or
+                    num_bytes_to_skip < remote_num_bytes):
+                ftp_object.retrbinary(
+                    'RETR ' + ftp_file_name, _write_chunk,
+                    blocksize=NUM_BYTES_PER_BLOCK,
+                    rest=num_bytes_to_skip or None)
+    except ftplib.error_perm as this_error:
+
+        # If the server does not support "SIZE", a missing file is detected
+        # only here.
+        if not str(this_error).startswith(str(FTP_NOT_FOUND_ERROR_CODE)):
+            _close_connection(ftp_object)
+            raise
+
+        connection_pool.check_in(connection_key, ftp_object)
+        if num_bytes_to_skip == 0:
+            os.remove(partial_file_name)
+        raise _FileNotFoundError(str(this_error))
+    except Exception:
+        _close_connection(ftp_object)
+        raise
+
+    connection_pool.check_in(connection_key, ftp_object)
+    _check_num_bytes(
+        partial_file_name=partial_file_name,
+        num_bytes_transferred=sum(num_bytes_by_chunk),
+        expected_num_bytes_transferred=None,
+        expected_file_size=remote_num_bytes)
+    _finish_local_file(
+        partial_file_name, local_file_name, modification_time_unix_sec)
+
+    if num_bytes_to_skip > 0:
+        return RESUMED_STATUS, sum(num_bytes_by_chunk)
+    return DOWNLOADED_STATUS, sum(num_bytes_by_chunk)
+
+
+def _download_one_file(argument_tuple):
+    """Downloads one file for `download_files`.
+
+    Errors are caught and recorded, so that one failed download does not stop
+    the others.
+
+    :param argument_tuple: Tuple of (connection_pool, online_file_name,
+        local_file_name, skip_existing, resume_partial).  See doc for
+        `_download_one_file_via_http`.
+    :return: manifest_dict: Dictionary with keys listed in `MANIFEST_COLUMNS`.
+    """
+
+    (connection_pool, online_file_name, local_file_name, skip_existing,
+     resume_partial) = argument_tuple
+
+    manifest_dict = {
+        ONLINE_FILE_COLUMN: online_file_name,
+        LOCAL_FILE_COLUMN: local_file_name,
+        NUM_BYTES_COLUMN: 0,
+        ERROR_STRING_COLUMN: ''
+    }
+
+    if online_file_name.startswith(FTP_SCHEME + ':'):
+        download_function = _download_one_file_via_ftp
+    else:
+        download_function = _download_one_file_via_http
+
+    try:
+        (manifest_dict[STATUS_COLUMN], manifest_dict[NUM_BYTES_COLUMN]) = (
+            download_function(
+                connection_pool=connection_pool,
+                online_file_name=online_file_name,
+                local_file_name=local_file_name, skip_existing=skip_existing,
+                resume_partial=resume_partial))
+    except _FileNotFoundError as this_error:
+        manifest_dict[STATUS_COLUMN] = NOT_FOUND_STATUS
+        manifest_dict[ERROR_STRING_COLUMN] = str(this_error)
+    except Exception as this_error:
+        manifest_dict[STATUS_COLUMN] = FAILED_STATUS
+        manifest_dict[ERROR_STRING_COLUMN] = '{0:s}: {1:s}'.format(
+            type(this_error).__name__, str(this_error))
+
+    return manifest_dict
+
+
+def _run_downloads(
+        online_file_names, local_file_names, user_name, password, num_threads,
+        skip_existing, resume_partial, timeout_seconds):
+    """Downloads many files concurrently.
+
+    Input arguments are not checked, and local directories must already exist.
+
+    :param online_file_names: See doc for `download_files`.
+    :param local_file_names: Same.
+    :param user_name: Same.
+    :param password: Same.
+    :param num_threads: Same.
+    :param skip_existing: Same.
+    :param resume_partial: Same.
+    :param timeout_seconds: Same.
+    :return: manifest_table: Same.
+    """
+
+    num_files = len(online_file_names)
+    connection_pool = _ConnectionPool(
+        user_name=user_name, password=password,
+        timeout_seconds=timeout_seconds)
+    argument_tuples = [
+        (connection_pool, online_file_names[i], local_file_names[i],
+         skip_existing, resume_partial) for i in range(num_files)]
+
+    try:
+        if num_threads == 1 or num_files <= 1:
+            manifest_dicts = [_download_one_file(a) for a in argument_tuples]
+        else:
+            thread_pool = ThreadPool(min([num_threads, num_files]))
+            try:
+                manifest_dicts = thread_pool.map(
+                    _download_one_file, argument_tuples, chunksize=1)
+            finally:
+                thread_pool.close()
+                thread_pool.join()
+    finally:
+        connection_pool.close_all()
+
+    return pandas.DataFrame(manifest_dicts, columns=MANIFEST_COLUMNS)
+
+
+def _report_failures(manifest_table, raise_error_if_fails):
+    """Reports failed downloads.
+
+    :param manifest_table: pandas DataFrame created by `_run_downloads`.
+    :param raise_error_if_fails: Boolean flag.  If True, this method will raise
+        an error if any download failed.  If False, will issue a warning for
+        each failed download.
+    :raises: ValueError: if any download failed and raise_error_if_fails =
+        True.
+    """
+
+    failed_indices = numpy.where(numpy.invert(
+        manifest_table[STATUS_COLUMN].isin(SUCCESS_STATUSES).values))[0]
+    if len(failed_indices) == 0:
+        return
+
+    if raise_error_if_fails:
+        error_string = (
+            'Could not download {0:d} of {1:d} files.  First failure: "{2:s}" '
+            '({3:s}).').format(
+                len(failed_indices), len(manifest_table.index),
+                manifest_table[ONLINE_FILE_COLUMN].values[failed_indices[0]],
+                manifest_table[ERROR_STRING_COLUMN].values[failed_indices[0]])
+        raise ValueError(error_string)
+
+    for i in failed_indices:
+        warnings.warn('Could not download file "{0:s}" ({1:s}).'.format(
+            manifest_table[ONLINE_FILE_COLUMN].values[i],
+            manifest_table[ERROR_STRING_COLUMN].values[i]))
+
 
 def download_file_via_passwordless_ssh(host_name=None, user_name=None,
                                        remote_file_name=None,
@@ -242,3 +1004,176 @@ def download_file_via_ftp(server_name=None, user_name=None, password=None,
             local_file_name = None
 
     return local_file_name
+
+
+def download_files(
+        online_file_names, local_file_names, user_name=None, password=None,
+        num_threads=DEFAULT_NUM_THREADS, skip_existing=True,
+        resume_partial=True, timeout_seconds=DEFAULT_TIMEOUT_SECONDS,
+        raise_error_if_fails=True):
+    """Downloads many files concurrently via HTTP, HTTPS, or FTP.
+
+    Files are downloaded by a pool of `num_threads` worker threads.  Each open
+    connection is reused for later files on the same host (HTTP keep-alive, or
+    one FTP login for many files).  Each file is written to a partial file
+    (with suffix ".part") and moved to its final path only when complete, so
+    interrupted downloads never leave truncated files behind.  If
+    resume_partial = True, a later call continues the partial file (with an
+    HTTP "Range" header or the FTP "REST" command).
+
+    N = number of files to download
+
+    :param online_file_names: length-N list of URLs, starting with "http://",
+        "https://", or "ftp://".  Example:
+        "ftp://madis-data.ncep.noaa.gov/archive/2011/05/20/point/metar/netcdf/
+        20110520_0000.gz"
+    :param local_file_names: length-N list of target paths on local machine.
+    :param user_name: User name on all servers.  To login anonymously, leave
+        this as None.
+    :param password: Password on all servers.  To login anonymously, leave this
+        as None.
+    :param num_threads: Number of worker threads (maximum number of concurrent
+        transfers).
+    :param skip_existing: Boolean flag.  If True, files whose local size and
+        modification time match the remote file will not be downloaded again.
+        (Modification times of downloaded files are set to those on the server,
+        which makes this check exact.)
+    :param resume_partial: Boolean flag.  If True, partial files from earlier
+        calls will be continued rather than restarted.
+    :param timeout_seconds: Timeout for socket operations.
+    :param raise_error_if_fails: Boolean flag.  If True and any download fails,
+        this method will raise an error (after trying all files).  If False,
+        will issue a warning for each failed download.
+    :return: manifest_table: pandas DataFrame with the following columns.  Each
+        row is one file, in the same order as the input lists.
+    manifest_table.online_file_name: URL.
+    manifest_table.local_file_name: Path on local machine.
+    manifest_table.status: Status (one of "downloaded", "resumed", "skipped",
+        "not_found", "failed").
+    manifest_table.num_bytes_transferred: Number of bytes transferred.
+    manifest_table.error_string: Error message (empty if the download
+        succeeded).
+
+    :raises: ValueError: if any download failed and raise_error_if_fails =
+        True.
+    """
+
+    error_checking.assert_is_string_list(online_file_names)
+    error_checking.assert_is_numpy_array(
+        numpy.asarray(online_file_names), num_dimensions=1)
+    num_files = len(online_file_names)
+
+    error_checking.assert_is_string_list(local_file_names)
+    error_checking.assert_is_numpy_array(
+        numpy.asarray(local_file_names),
+        exact_dimensions=numpy.array([num_files]))
+
+    error_checking.assert_is_integer(num_threads)
+    error_checking.assert_is_greater(num_threads, 0)
+    error_checking.assert_is_boolean(skip_existing)
+    error_checking.assert_is_boolean(resume_partial)
+    error_checking.assert_is_greater(timeout_seconds, 0.)
+    error_checking.assert_is_boolean(raise_error_if_fails)
+
+    for this_file_name in online_file_names:
+        _split_url(this_file_name)
+
+    # Directories are created here, rather than by worker threads, to avoid
+    # race conditions.
+    for this_file_name in local_file_names:
+        file_system_utils.mkdir_recursive_if_necessary(file_name=this_file_name)
+
+    manifest_table = _run_downloads(
+        online_file_names=online_file_names, local_file_names=local_file_names,
+        user_name=user_name, password=password, num_threads=num_threads,
+        skip_existing=skip_existing, resume_partial=resume_partial,
+        timeout_seconds=timeout_seconds)
+
+    _report_failures(manifest_table, raise_error_if_fails)
+    return manifest_table
+
+
+def download_files_with_candidates(
+        candidate_file_names_by_target, local_file_names, user_name=None,
+        password=None, num_threads=DEFAULT_NUM_THREADS, skip_existing=True,
+        resume_partial=True, timeout_seconds=DEFAULT_TIMEOUT_SECONDS,
+        raise_error_if_fails=True):
+    """Downloads many files concurrently, each with candidate URLs.
+
+    This is useful when the online location of a file is not known exactly
+    (e.g., when the file may be in one of several directories or may have one
+    of several extensions).  Candidates are tried in rounds: the first round
+    tries the first candidate for every file (concurrently), the second round
+    tries the second candidate for every file not yet found, and so on.
+
+    N = number of files to download
+
+    :param candidate_file_names_by_target: length-N list, where each element is
+        a list of URLs to try (in order) for the given file.
+    :param local_file_names: length-N list of target paths on local machine.
+    :param user_name: See doc for `download_files`.
+    :param password: Same.
+    :param num_threads: Same.
+    :param skip_existing: Same.
+    :param resume_partial: Same.
+    :param timeout_seconds: Same.
+    :param raise_error_if_fails: Same.
+    :return: manifest_table: Same as output from `download_files`, except that
+        online_file_name is the last candidate tried for each file (the one
+        downloaded, if the download succeeded).
+    :raises: ValueError: if any file could not be downloaded from any of its
+        candidates and raise_error_if_fails = True.
+    """
+
+    error_checking.assert_is_list(candidate_file_names_by_target)
+    num_files = len(candidate_file_names_by_target)
+    error_checking.assert_is_string_list(local_file_names)
+    error_checking.assert_is_numpy_array(
+        numpy.asarray(local_file_names),
+        exact_dimensions=numpy.array([num_files]))
+
+    for these_candidate_names in candidate_file_names_by_target:
+        error_checking.assert_is_string_list(these_candidate_names)
+        error_checking.assert_is_greater(len(these_candidate_names), 0)
+        for this_file_name in these_candidate_names:
+            _split_url(this_file_name)
+
+    error_checking.assert_is_integer(num_threads)
+    error_checking.assert_is_greater(num_threads, 0)
+    error_checking.assert_is_boolean(skip_existing)
+    error_checking.assert_is_boolean(resume_partial)
+    error_checking.assert_is_greater(timeout_seconds, 0.)
+    error_checking.assert_is_boolean(raise_error_if_fails)
+
+    for this_file_name in local_file_names:
+        file_system_utils.mkdir_recursive_if_necessary(file_name=this_file_name)
+
+    manifest_dicts = [None] * num_files
+    num_rounds = max([len(c) for c in candidate_file_names_by_target] + [0])
+
+    for k in range(num_rounds):
+        these_file_indices = [
+            i for i in range(num_files)
+            if k < len(candidate_file_names_by_target[i]) and (
+                manifest_dicts[i] is None or
+                manifest_dicts[i][STATUS_COLUMN] not in SUCCESS_STATUSES)
+        ]
+        if not these_file_indices:
+            break
+
+        this_manifest_table = _run_downloads(
+            online_file_names=[
+                candidate_file_names_by_target[i][k]
+                for i in these_file_indices],
+            local_file_names=[local_file_names[i] for i in these_file_indices],
+            user_name=user_name, password=password, num_threads=num_threads,
+            skip_existing=skip_existing, resume_partial=resume_partial,
+            timeout_seconds=timeout_seconds)
+
+        for j in range(len(these_file_indices)):
+            manifest_dicts[these_file_indices[j]] = dict(
+                this_manifest_table.iloc[j])
+
+    manifest_table = pandas.DataFrame(manifest_dicts, columns=MANIFEST_COLUMNS)
+    _report_failures(manifest_table, raise_error_if_fails)
+    return manifest_table
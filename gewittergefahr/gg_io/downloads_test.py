@@ -0,0 +1,579 @@
+"""Unit tests for downloads.py."""
+
+import os
+import time
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+import SocketServer
+import BaseHTTPServer
+import email.utils
+from gewittergefahr.gg_io import downloads
+
+FILE_CONTENTS_BY_PATH = {
+    '/data/a.txt': b'foo' * 10000,
+    '/data/b.txt': b'bar' * 20000,
+    '/data/c.txt': b'moo',
+    '/data/d.txt': b'hello world' * 5000
+}
+PATHS_TO_DOWNLOAD = sorted(FILE_CONTENTS_BY_PATH.keys())
+MISSING_PATH = '/data/missing.txt'
+REDIRECT_PATH = '/redirect/a.txt'
+REDIRECT_TARGET_PATH = '/data/a.txt'
+OTHER_HOST_REDIRECT_PATH = '/redirect/other_host/a.txt'
+OTHER_HOST_NAME = 'localhost'
+TRUNCATED_PATH = '/truncated/a.txt'
+NUM_BYTES_IN_TRUNCATED_FILE = 500
+USER_NAME = 'user'
+PASSWORD = 'password'
+
+MODIFICATION_TIME_UNIX_SEC = 1306000000
+NUM_BYTES_IN_PARTIAL_FILE = 1000
+
+# The following constants are used to test _http_date_to_unix_sec and
+# _ftp_mdtm_to_unix_sec.
+HTTP_DATE_STRING = 'Sun, 06 Nov 1994 08:49:37 GMT'
+MDTM_RESPONSE_STRING = '213 19941106084937'
+UNIX_TIME_SEC = 784111777
+
+
+class _HttpHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Stand-in for HTTP server (supports keep-alive, ranges, redirects)."""
+
+    protocol_version = 'HTTP/1.1'
+    connection_counter = [0]
+    authorization_by_path = {}
+
+    def setup(self):
+        """Counts new connection."""
+
+        self.connection_counter[0] += 1
+        BaseHTTPServer.BaseHTTPRequestHandler.setup(self)
+
+    def log_message(self, format, *args):
+        """Suppresses logging."""
+
+        pass
+
+    def _send_file(self, include_body):
+        """Responds to HEAD or GET request.
+
+        :param include_body: Boolean flag.  If True, will send file contents.
+        """
+
+        self.authorization_by_path[self.path] = self.headers.getheader(
+            'authorization')
+
+        if self.path == OTHER_HOST_REDIRECT_PATH:
+            self.send_response(302)
+            self.send_header('Location', 'http://{0:s}:{1:d}{2:s}'.format(
+                OTHER_HOST_NAME, self.server.server_address[1],
+                REDIRECT_TARGET_PATH))
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        if self.path == TRUNCATED_PATH:
+            file_contents = FILE_CONTENTS_BY_PATH[REDIRECT_TARGET_PATH]
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(file_contents)))
+            self.end_headers()
+
+            if include_body:
+                self.wfile.write(file_contents[:NUM_BYTES_IN_TRUNCATED_FILE])
+            self.close_connection = 1
+            return
+
+        if self.path == REDIRECT_PATH:
+            self.send_response(302)
+            self.send_header('Location', REDIRECT_TARGET_PATH)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        if self.path not in FILE_CONTENTS_BY_PATH:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        file_contents = FILE_CONTENTS_BY_PATH[self.path]
+        range_string = self.headers.getheader('range')
+        if range_string is None:
+            first_byte_index = 0
+            self.send_response(200)
+        else:
+            first_byte_index = int(range_string.split('=')[1].split('-')[0])
+            self.send_response(206)
+            self.send_header('Content-Range', 'bytes {0:d}-{1:d}/{2:d}'.format(
+                first_byte_index, len(file_contents) - 1, len(file_contents)))
+
+        self.send_header(
+            'Content-Length', str(len(file_contents) - first_byte_index))
+        self.send_header('Last-Modified', email.utils.formatdate(
+            MODIFICATION_TIME_UNIX_SEC, usegmt=True))
+        self.end_headers()
+
+        if include_body:
+            self.wfile.write(file_contents[first_byte_index:])
+
+    def do_HEAD(self):
+        """Responds to HEAD request."""
+
+        self._send_file(include_body=False)
+
+    def do_GET(self):
+        """Responds to GET request."""
+
+        self._send_file(include_body=True)
+
+
+class _FtpHandler(SocketServer.StreamRequestHandler):
+    """Stand-in for FTP server (passive mode, SIZE, MDTM, REST, RETR)."""
+
+    login_counter = [0]
+    size_supported = [True]
+
+    def _reply(self, reply_string):
+        """Sends reply on control connection.
+
+        :param reply_string: Reply.
+        """
+
+        self.wfile.write(reply_string + '\r\n')
+
+    def handle(self):
+        """Handles one control connection."""
+
+        self._reply('220 Welcome')
+        data_socket_object = None
+        num_bytes_to_skip = 0
+
+        while True:
+            this_line = self.rfile.readline()
+            if not this_line:
+                break
+
+            this_command = this_line.strip().split(' ', 1)
+            this_argument = this_command[1] if len(this_command) > 1 else ''
+            this_command = this_command[0].upper()
+            this_path = '/' + this_argument.lstrip('/')
+
+            if this_command == 'USER':
+                self._reply('331 Password required')
+            elif this_command == 'PASS':
+                self.login_counter[0] += 1
+                self._reply('230 Logged in')
+            elif this_command in ['TYPE', 'NOOP']:
+                self._reply('200 OK')
+            elif this_command == 'SIZE' and not self.size_supported[0]:
+                self._reply('502 Command not implemented')
+            elif this_command in ['SIZE', 'MDTM', 'RETR'] and (
+                    this_path not in FILE_CONTENTS_BY_PATH):
+                self._reply('550 No such file')
+            elif this_command == 'SIZE':
+                self._reply('213 {0:d}'.format(
+                    len(FILE_CONTENTS_BY_PATH[this_path])))
+            elif this_command == 'MDTM':
+                self._reply('213 ' + time.strftime(
+                    '%Y%m%d%H%M%S', time.gmtime(MODIFICATION_TIME_UNIX_SEC)))
+            elif this_command == 'PASV':
+                data_socket_object = socket.socket()
+                data_socket_object.bind(('127.0.0.1', 0))
+                data_socket_object.listen(1)
+                this_port = data_socket_object.getsockname()[1]
+                self._reply(
+                    '227 Entering Passive Mode (127,0,0,1,{0:d},{1:d})'.format(
+                        this_port // 256, this_port % 256))
+            elif this_command == 'REST':
+                num_bytes_to_skip = int(this_argument)
+                self._reply('350 Restarting')
+            elif this_command == 'RETR':
+                self._reply('150 Opening data connection')
+                this_connection_object = data_socket_object.accept()[0]
+                this_connection_object.sendall(
+                    FILE_CONTENTS_BY_PATH[this_path][num_bytes_to_skip:])
+                this_connection_object.close()
+                data_socket_object.close()
+                num_bytes_to_skip = 0
+                self._reply('226 Transfer complete')
+            elif this_command == 'QUIT':
+                self._reply('221 Bye')
+                break
+            else:
+                self._reply('502 Not implemented')
+
+
+class _ThreadedServer(SocketServer.ThreadingMixIn, SocketServer.TCPServer):
+    """Server that handles each connection in a separate thread."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def _start_server(handler_class):
+    """Starts local server in background thread.
+
+    :param handler_class: Request-handler class.
+    :return: server_object: Instance of `_ThreadedServer`.
+    """
+
+    server_object = _ThreadedServer(('127.0.0.1', 0), handler_class)
+    this_thread = threading.Thread(target=server_object.serve_forever)
+    this_thread.daemon = True
+    this_thread.start()
+    return server_object
+
+
+class DownloadsTests(unittest.TestCase):
+    """Each method is a unit test for downloads.py."""
+
+    def setUp(self):
+        """Starts local HTTP and FTP servers; creates temporary directory."""
+
+        self.directory_name = tempfile.mkdtemp()
+        self.http_server_object = _start_server(_HttpHandler)
+        self.ftp_server_object = _start_server(_FtpHandler)
+        _HttpHandler.connection_counter[0] = 0
+        _HttpHandler.authorization_by_path.clear()
+        _FtpHandler.login_counter[0] = 0
+        _FtpHandler.size_supported[0] = True
+
+        self.http_url_prefix = 'http://127.0.0.1:{0:d}'.format(
+            self.http_server_object.server_address[1])
+        self.ftp_url_prefix = 'ftp://127.0.0.1:{0:d}/'.format(
+            self.ftp_server_object.server_address[1])
+
+        self.local_file_names = [
+            '{0:s}/downloaded{1:s}'.format(self.directory_name, p)
+            for p in PATHS_TO_DOWNLOAD]
+
+    def tearDown(self):
+        """Stops local servers; deletes temporary directory."""
+
+        self.http_server_object.shutdown()
+        self.http_server_object.server_close()
+        self.ftp_server_object.shutdown()
+        self.ftp_server_object.server_close()
+        shutil.rmtree(self.directory_name)
+
+    def _check_local_files(self, num_files=len(PATHS_TO_DOWNLOAD)):
+        """Ensures that local files have correct contents.
+
+        :param num_files: Number of files to check (starting from the first).
+        """
+
+        for i in range(num_files):
+            this_file_handle = open(self.local_file_names[i], 'rb')
+            self.assertTrue(
+                this_file_handle.read() ==
+                FILE_CONTENTS_BY_PATH[PATHS_TO_DOWNLOAD[i]])
+            this_file_handle.close()
+
+            self.assertTrue(
+                int(os.path.getmtime(self.local_file_names[i])) ==
+                MODIFICATION_TIME_UNIX_SEC)
+            self.assertFalse(os.path.exists(
+                self.local_file_names[i] + downloads.PARTIAL_FILE_SUFFIX))
+
+    def test_http_date_to_unix_sec(self):
+        """Ensures correct output from _http_date_to_unix_sec."""
+
+        self.assertTrue(
+            downloads._http_date_to_unix_sec(HTTP_DATE_STRING) ==
+            UNIX_TIME_SEC)
+        self.assertTrue(downloads._http_date_to_unix_sec('foo') is None)
+
+    def test_ftp_mdtm_to_unix_sec(self):
+        """Ensures correct output from _ftp_mdtm_to_unix_sec."""
+
+        self.assertTrue(
+            downloads._ftp_mdtm_to_unix_sec(MDTM_RESPONSE_STRING) ==
+            UNIX_TIME_SEC)
+        self.assertTrue(downloads._ftp_mdtm_to_unix_sec('213') is None)
+
+    def test_split_url_bad_scheme(self):
+        """Ensures that _split_url raises error for invalid scheme."""
+
+        with self.assertRaises(ValueError):
+            downloads._split_url('file:///data/a.txt')
+
+    def test_download_files_http(self):
+        """Ensures correct output from download_files.
+
+        In this case, files are downloaded via HTTP and connections are reused.
+        """
+
+        this_manifest_table = downloads.download_files(
+            online_file_names=[
+                self.http_url_prefix + p for p in PATHS_TO_DOWNLOAD],
+            local_file_names=self.local_file_names, num_threads=2)
+
+        self._check_local_files()
+        self.assertTrue(all(
+            this_manifest_table[downloads.STATUS_COLUMN].values ==
+            downloads.DOWNLOADED_STATUS))
+        self.assertTrue(_HttpHandler.connection_counter[0] <= 2)
+
+    def test_download_files_http_skip_existing(self):
+        """Ensures correct output from download_files.
+
+        In this case, all files already exist on the local machine.
+        """
+
+        these_online_file_names = [
+            self.http_url_prefix + p for p in PATHS_TO_DOWNLOAD]
+        downloads.download_files(
+            online_file_names=these_online_file_names,
+            local_file_names=self.local_file_names, num_threads=2)
+        this_manifest_table = downloads.download_files(
+            online_file_names=these_online_file_names,
+            local_file_names=self.local_file_names, num_threads=2)
+
+        self._check_local_files()
+        self.assertTrue(all(
+            this_manifest_table[downloads.STATUS_COLUMN].values ==
+            downloads.SKIPPED_STATUS))
+        self.assertTrue(
+            this_manifest_table[downloads.NUM_BYTES_COLUMN].sum() == 0)
+
+    def test_download_files_http_resume(self):
+        """Ensures correct output from download_files.
+
+        In this case, a partial file is resumed.
+        """
+
+        os.makedirs(os.path.dirname(self.local_file_names[0]))
+        this_file_handle = open(
+            self.local_file_names[0] + downloads.PARTIAL_FILE_SUFFIX, 'wb')
+        this_file_handle.write(FILE_CONTENTS_BY_PATH[PATHS_TO_DOWNLOAD[0]][
+            :NUM_BYTES_IN_PARTIAL_FILE])
+        this_file_handle.close()
+
+        this_manifest_table = downloads.download_files(
+            online_file_names=[
+                self.http_url_prefix + p for p in PATHS_TO_DOWNLOAD],
+            local_file_names=self.local_file_names, num_threads=1)
+
+        self._check_local_files()
+        self.assertTrue(
+            this_manifest_table[downloads.STATUS_COLUMN].values[0] ==
+            downloads.RESUMED_STATUS)
+        self.assertTrue(
+            this_manifest_table[downloads.NUM_BYTES_COLUMN].values[0] ==
+            len(FILE_CONTENTS_BY_PATH[PATHS_TO_DOWNLOAD[0]]) -
+            NUM_BYTES_IN_PARTIAL_FILE)
+        self.assertTrue(_HttpHandler.connection_counter[0] == 1)
+
+    def test_download_files_http_redirect(self):
+        """Ensures correct output from download_files.
+
+        In this case, the server redirects to another path.
+        """
+
+        this_manifest_table = downloads.download_files(
+            online_file_names=[self.http_url_prefix + REDIRECT_PATH],
+            local_file_names=self.local_file_names[:1])
+
+        self._check_local_files(num_files=1)
+        self.assertTrue(
+            this_manifest_table[downloads.STATUS_COLUMN].values[0] ==
+            downloads.DOWNLOADED_STATUS)
+
+    def test_download_files_http_redirect_other_host(self):
+        """Ensures correct output from download_files.
+
+        In this case, the server redirects to another host, which should not
+        receive the password.
+        """
+
+        this_manifest_table = downloads.download_files(
+            online_file_names=[self.http_url_prefix + OTHER_HOST_REDIRECT_PATH],
+            local_file_names=self.local_file_names[:1], user_name=USER_NAME,
+            password=PASSWORD)
+
+        self._check_local_files(num_files=1)
+        self.assertTrue(
+            this_manifest_table[downloads.STATUS_COLUMN].values[0] ==
+            downloads.DOWNLOADED_STATUS)
+        self.assertTrue(
+            _HttpHandler.authorization_by_path[OTHER_HOST_REDIRECT_PATH]
+            is not None)
+        self.assertTrue(
+            _HttpHandler.authorization_by_path[REDIRECT_TARGET_PATH] is None)
+
+    def test_download_files_http_truncated(self):
+        """Ensures correct output from download_files.
+
+        In this case, the server sends fewer bytes than it promised.
+        """
+
+        this_manifest_table = downloads.download_files(
+            online_file_names=[self.http_url_prefix + TRUNCATED_PATH],
+            local_file_names=self.local_file_names[:1],
+            raise_error_if_fails=False)
+
+        self.assertTrue(
+            this_manifest_table[downloads.STATUS_COLUMN].values[0] ==
+            downloads.FAILED_STATUS)
+        self.assertFalse(os.path.exists(self.local_file_names[0]))
+        self.assertTrue(
+            os.path.getsize(
+                self.local_file_names[0] + downloads.PARTIAL_FILE_SUFFIX) ==
+            NUM_BYTES_IN_TRUNCATED_FILE)
+
+    def test_download_files_missing_no_error(self):
+        """Ensures correct output from download_files.
+
+        In this case, one file is missing and raise_error_if_fails = False.
+        """
+
+        these_online_file_names = [
+            self.http_url_prefix + p for p in PATHS_TO_DOWNLOAD]
+        these_online_file_names[1] = self.http_url_prefix + MISSING_PATH
+
+        this_manifest_table = downloads.download_files(
+            online_file_names=these_online_file_names,
+            local_file_names=self.local_file_names, num_threads=2,
+            raise_error_if_fails=False)
+
+        self.assertTrue(
+            this_manifest_table[downloads.STATUS_COLUMN].values[1] ==
+            downloads.NOT_FOUND_STATUS)
+        self.assertFalse(os.path.exists(self.local_file_names[1]))
+        self._check_local_files(num_files=1)
+
+    def test_download_files_missing_error(self):
+        """Ensures that download_files raises error for missing file.
+
+        In this case, raise_error_if_fails = True.
+        """
+
+        with self.assertRaises(ValueError):
+            downloads.download_files(
+                online_file_names=[self.http_url_prefix + MISSING_PATH],
+                local_file_names=self.local_file_names[:1])
+
+    def test_download_files_ftp(self):
+        """Ensures correct output from download_files.
+
+        In this case, files are downloaded via FTP with one login.
+        """
+
+        this_manifest_table = downloads.download_files(
+            online_file_names=[
+                self.ftp_url_prefix + p for p in PATHS_TO_DOWNLOAD],
+            local_file_names=self.local_file_names, num_threads=1)
+
+        self._check_local_files()
+        self.assertTrue(all(
+            this_manifest_table[downloads.STATUS_COLUMN].values ==
+            downloads.DOWNLOADED_STATUS))
+        self.assertTrue(_FtpHandler.login_counter[0] == 1)
+
+    def test_download_files_ftp_skip_and_resume(self):
+        """Ensures correct output from download_files.
+
+        In this case, files are downloaded via FTP; one file is up to date on
+        the local machine and another is partial.
+        """
+
+        these_online_file_names = [
+            self.ftp_url_prefix + p for p in PATHS_TO_DOWNLOAD]
+        downloads.download_files(
+            online_file_names=these_online_file_names[:1],
+            local_file_names=self.local_file_names[:1])
+
+        this_file_handle = open(
+            self.local_file_names[1] + downloads.PARTIAL_FILE_SUFFIX, 'wb')
+        this_file_handle.write(FILE_CONTENTS_BY_PATH[PATHS_TO_DOWNLOAD[1]][
+            :NUM_BYTES_IN_PARTIAL_FILE])
+        this_file_handle.close()
+
+        this_manifest_table = downloads.download_files(
+            online_file_names=these_online_file_names,
+            local_file_names=self.local_file_names, num_threads=2)
+
+        self._check_local_files()
+        self.assertTrue(
+            list(this_manifest_table[downloads.STATUS_COLUMN].values[:3]) == [
+                downloads.SKIPPED_STATUS, downloads.RESUMED_STATUS,
+                downloads.DOWNLOADED_STATUS])
+
+    def test_download_files_ftp_unknown_size(self):
+        """Ensures correct output from download_files.
+
+        In this case, files are downloaded via FTP and the server does not
+        report their sizes.
+        """
+
+        _FtpHandler.size_supported[0] = False
+
+        this_manifest_table = downloads.download_files(
+            online_file_names=[
+                self.ftp_url_prefix + p for p in PATHS_TO_DOWNLOAD],
+            local_file_names=self.local_file_names, num_threads=1)
+
+        self._check_local_files()
+        self.assertTrue(all(
+            this_manifest_table[downloads.STATUS_COLUMN].values ==
+            downloads.DOWNLOADED_STATUS))
+
+    def test_download_files_ftp_unknown_size_missing(self):
+        """Ensures correct output from download_files.
+
+        In this case, file is missing from FTP server, which does not report
+        file sizes.
+        """
+
+        _FtpHandler.size_supported[0] = False
+
+        this_manifest_table = downloads.download_files(
+            online_file_names=[self.ftp_url_prefix + MISSING_PATH],
+            local_file_names=self.local_file_names[:1],
+            raise_error_if_fails=False)
+
+        self.assertTrue(
+            this_manifest_table[downloads.STATUS_COLUMN].values[0] ==
+            downloads.NOT_FOUND_STATUS)
+        self.assertFalse(os.path.exists(
+            self.local_file_names[0] + downloads.PARTIAL_FILE_SUFFIX))
+
+    def test_download_files_ftp_missing(self):
+        """Ensures correct output from download_files.
+
+        In this case, file is missing from FTP server.
+        """
+
+        this_manifest_table = downloads.download_files(
+            online_file_names=[self.ftp_url_prefix + MISSING_PATH],
+            local_file_names=self.local_file_names[:1],
+            raise_error_if_fails=False)
+
+        self.assertTrue(
+            this_manifest_table[downloads.STATUS_COLUMN].values[0] ==
+            downloads.NOT_FOUND_STATUS)
+
+    def test_download_files_with_candidates(self):
+        """Ensures correct output from download_files_with_candidates."""
+
+        these_candidate_names_by_target = [
+            [self.http_url_prefix + MISSING_PATH, self.http_url_prefix + p]
+            for p in PATHS_TO_DOWNLOAD]
+        these_candidate_names_by_target[0] = [
+            self.http_url_prefix + PATHS_TO_DOWNLOAD[0]]
+
+        this_manifest_table = downloads.download_files_with_candidates(
+            candidate_file_names_by_target=these_candidate_names_by_target,
+            local_file_names=self.local_file_names, num_threads=2)
+
+        self._check_local_files()
+        self.assertTrue(
+            list(this_manifest_table[downloads.ONLINE_FILE_COLUMN].values) ==
+            [self.http_url_prefix + p for p in PATHS_TO_DOWNLOAD])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,7 +5,9 @@
 http://gridrad.org
 """
 
+import copy
 import numpy
+import scipy.io
 from gewittergefahr.gg_io import netcdf_io
 from gewittergefahr.gg_io import radar_io
 from gewittergefahr.gg_utils import grids
@@ -49,6 +51,12 @@ RADAR_FIELD_NAMES_ORIG = [
 
 ZERO_TIME_UNIX_SEC = 978307200  # 0000 UTC 1 Jan 2001
 
+DEFAULT_NUM_ROWS_PER_CHUNK = 100
+NETCDF3_SIGNATURE = b'CDF'
+SCALE_FACTOR_ATTRIBUTE_NAME = 'scale_factor'
+ADD_OFFSET_ATTRIBUTE_NAME = 'add_offset'
+CHUNK_CACHE_MARGIN = 1.1
+
 
 # TODO(thunderhoser): merge this file with radar_io.py (which reads MYRORSS and
 # MRMS data).
@@ -96,6 +104,435 @@ def _time_from_gridrad_to_unix(gridrad_time_sec):
     return gridrad_time_sec + ZERO_TIME_UNIX_SEC
 
 
+def _get_grid_point_coords(metadata_dict):
+    """Returns coordinates of grid points in full-grid file.
+
+    M = number of rows (unique grid-point latitudes)
+    N = number of columns (unique grid-point longitudes)
+    H = number of height levels (unique grid-point heights)
+
+    :param metadata_dict: Dictionary created by
+        read_metadata_from_full_grid_file.
+    :return: unique_grid_point_heights_m_asl: length-H numpy array of grid-point
+        heights (metres above sea level).
+    :return: unique_grid_point_lat_deg: length-M numpy array of grid-point
+        latitudes (deg N).
+    :return: unique_grid_point_lng_deg: length-N numpy array of grid-point
+        longitudes (deg E).
+    """
+
+    min_latitude_deg = metadata_dict[radar_io.NW_GRID_POINT_LAT_COLUMN] - (
+        metadata_dict[radar_io.LAT_SPACING_COLUMN] *
+        (metadata_dict[radar_io.NUM_LAT_COLUMN] - 1))
+    unique_grid_point_lat_deg, unique_grid_point_lng_deg = (
+        grids.get_latlng_grid_points(
+            min_latitude_deg=min_latitude_deg,
+            min_longitude_deg=metadata_dict[radar_io.NW_GRID_POINT_LNG_COLUMN],
+            lat_spacing_deg=metadata_dict[radar_io.LAT_SPACING_COLUMN],
+            lng_spacing_deg=metadata_dict[radar_io.LNG_SPACING_COLUMN],
+            num_rows=metadata_dict[radar_io.NUM_LAT_COLUMN],
+            num_columns=metadata_dict[radar_io.NUM_LNG_COLUMN]))
+
+    max_height_m_asl = metadata_dict[MIN_GRID_POINT_HEIGHT_COLUMN] + (
+        metadata_dict[HEIGHT_SPACING_COLUMN] *
+        (metadata_dict[NUM_HEIGHTS_COLUMN] - 1))
+    unique_grid_point_heights_m_asl = numpy.linspace(
+        metadata_dict[MIN_GRID_POINT_HEIGHT_COLUMN], max_height_m_asl,
+        num=metadata_dict[NUM_HEIGHTS_COLUMN])
+
+    return (unique_grid_point_heights_m_asl, unique_grid_point_lat_deg,
+            unique_grid_point_lng_deg)
+
+
+def _is_netcdf3_file(netcdf_file_name):
+    """Determines whether or not file is in NetCDF3 (classic) format.
+
+    Only NetCDF3 files are stored contiguously and uncompressed, which means
+    that only NetCDF3 files can be memory-mapped.
+
+    :param netcdf_file_name: Path to input file.
+    :return: netcdf3_flag: Boolean flag.
+    """
+
+    file_handle = open(netcdf_file_name, 'rb')
+    try:
+        signature = file_handle.read(len(NETCDF3_SIGNATURE))
+    finally:
+        file_handle.close()
+
+    return signature == NETCDF3_SIGNATURE
+
+
+def _index_to_hyperslab(index_object, num_values, first_value_index):
+    """Converts index along one axis of view to hyperslab in file.
+
+    :param index_object: Integer or slice object, indexing the axis of the view.
+    :param num_values: Length of the axis in the view.
+    :param first_value_index: Index (in the file) of the first value in the
+        view.
+    :return: hyperslab_object: Slice object, indexing the axis of the file.
+        Step is always positive.
+    :return: reverse_flag: Boolean flag.  If True, values read from the
+        hyperslab must be reversed.
+    :return: squeeze_flag: Boolean flag.  If True, the axis must be removed from
+        values read from the hyperslab (because `index_object` is an integer).
+    :raises: IndexError: if `index_object` is an integer out of range.
+    :raises: TypeError: if `index_object` is neither an integer nor a slice.
+    """
+
+    if isinstance(index_object, slice):
+        these_indices = numpy.arange(*index_object.indices(num_values))
+        if len(these_indices) == 0:
+            return (slice(first_value_index, first_value_index), False,
+                    False)
+
+        step = abs(index_object.step or 1)
+        hyperslab_object = slice(
+            first_value_index + numpy.min(these_indices),
+            first_value_index + numpy.max(these_indices) + 1, step)
+        return hyperslab_object, (index_object.step or 1) < 0, False
+
+    error_checking.assert_is_integer(index_object)
+    if index_object < 0:
+        index_object += num_values
+    if not 0 <= index_object < num_values:
+        error_string = (
+            'Index ({0:d}) is out of range for axis with {1:d} values.'
+        ).format(int(index_object), num_values)
+        raise IndexError(error_string)
+
+    return (slice(first_value_index + index_object,
+                  first_value_index + index_object + 1), False, True)
+
+
+class GridradFieldView(object):
+    """Lazy view of one radar field in a full-grid (not sparse-grid) file.
+
+    No data are read when the view is created or subset.  Data are read only by
+    `read`, `__getitem__`, or `iterate_row_chunks`, and then only for the
+    hyperslab (height range and lat-long box) covered by the view.  Indexing
+    works like indexing the H-by-M-by-N matrix returned by
+    read_field_from_full_grid_file.
+
+    M = number of rows (unique grid-point latitudes) in view
+    N = number of columns (unique grid-point longitudes) in view
+    H = number of height levels (unique grid-point heights) in view
+    """
+
+    def __init__(self, netcdf_file_name, field_name, metadata_dict,
+                 use_memory_map=False):
+        """Constructor.
+
+        The view created by the constructor covers the full grid.
+
+        :param netcdf_file_name: Path to input file.
+        :param field_name: Name of radar field.
+        :param metadata_dict: Dictionary created by
+            read_metadata_from_full_grid_file.
+        :param use_memory_map: Boolean flag.  If True, the file will be
+            memory-mapped (with `scipy.io.netcdf_file`) rather than read with
+            the NetCDF library.  This works only for NetCDF3 files, which are
+            uncompressed.
+        :raises: ValueError: if use_memory_map = True and the file is not in
+            NetCDF3 format.
+        """
+
+        error_checking.assert_file_exists(netcdf_file_name)
+        error_checking.assert_is_boolean(use_memory_map)
+        if use_memory_map and not _is_netcdf3_file(netcdf_file_name):
+            error_string = (
+                'Cannot memory-map file "{0:s}", because it is not in NetCDF3 '
+                'format.').format(netcdf_file_name)
+            raise ValueError(error_string)
+
+        self.netcdf_file_name = netcdf_file_name
+        self.field_name = field_name
+        self.field_name_orig = _field_name_new_to_orig(field_name)
+        self.use_memory_map = use_memory_map
+
+        (self.unique_grid_point_heights_m_asl, self.unique_grid_point_lat_deg,
+         self.unique_grid_point_lng_deg) = _get_grid_point_coords(metadata_dict)
+
+        self.first_height_index = 0
+        self.first_row_index = 0
+        self.first_column_index = 0
+        self.shape = (len(self.unique_grid_point_heights_m_asl),
+                      len(self.unique_grid_point_lat_deg),
+                      len(self.unique_grid_point_lng_deg))
+
+    def _subset(self, height_indices, row_indices, column_indices):
+        """Creates view covering a subset of this view.
+
+        :param height_indices: 1-D numpy array of height indices (into this
+            view) to keep.  Must be consecutive.
+        :param row_indices: Same but for rows.
+        :param column_indices: Same but for columns.
+        :return: new_view: New instance of `GridradFieldView`.
+        """
+
+        new_view = copy.copy(self)
+        new_view.first_height_index = (
+            self.first_height_index + height_indices[0])
+        new_view.first_row_index = self.first_row_index + row_indices[0]
+        new_view.first_column_index = (
+            self.first_column_index + column_indices[0])
+
+        new_view.unique_grid_point_heights_m_asl = (
+            self.unique_grid_point_heights_m_asl[height_indices])
+        new_view.unique_grid_point_lat_deg = self.unique_grid_point_lat_deg[
+            row_indices]
+        new_view.unique_grid_point_lng_deg = self.unique_grid_point_lng_deg[
+            column_indices]
+        new_view.shape = (len(height_indices), len(row_indices),
+                          len(column_indices))
+
+        return new_view
+
+    def _open(self):
+        """Opens file for reading.
+
+        :return: dataset_object: Instance of `netCDF4.Dataset` or (if
+            `self.use_memory_map` = True) `scipy.io.netcdf_file`.
+        """
+
+        if self.use_memory_map:
+            return scipy.io.netcdf_file(
+                self.netcdf_file_name, mode='r', mmap=True)
+
+        return netcdf_io.open_netcdf(
+            self.netcdf_file_name, raise_error_if_fails=True)
+
+    def _read_hyperslab(self, dataset_object, height_slice, row_slice,
+                        column_slice):
+        """Reads hyperslab from open file.
+
+        :param dataset_object: Object created by `_open`.
+        :param height_slice: Slice object, indexing heights in the file.
+        :param row_slice: Same but for rows.
+        :param column_slice: Same but for columns.
+        :return: field_matrix: 3-D numpy array with values of radar field.
+        """
+
+        variable_object = dataset_object.variables[self.field_name_orig]
+        if not self.use_memory_map:
+            return numpy.array(
+                variable_object[0, height_slice, row_slice, column_slice])
+
+        field_matrix = numpy.array(
+            variable_object.data[0, height_slice, row_slice, column_slice])
+
+        # Unlike the NetCDF library, scipy does not unpack packed values.
+        if hasattr(variable_object, SCALE_FACTOR_ATTRIBUTE_NAME):
+            field_matrix = field_matrix * getattr(
+                variable_object, SCALE_FACTOR_ATTRIBUTE_NAME)
+        if hasattr(variable_object, ADD_OFFSET_ATTRIBUTE_NAME):
+            field_matrix = field_matrix + getattr(
+                variable_object, ADD_OFFSET_ATTRIBUTE_NAME)
+
+        return field_matrix
+
+    def subset_by_height(self, min_height_m_asl, max_height_m_asl):
+        """Creates view covering a range of heights in this view.
+
+        :param min_height_m_asl: Minimum height (metres above sea level).
+        :param max_height_m_asl: Max height (metres above sea level).
+        :return: new_view: New instance of `GridradFieldView`.
+        :raises: ValueError: if no grid-point heights are in the range.
+        """
+
+        error_checking.assert_is_geq(max_height_m_asl, min_height_m_asl)
+        height_indices = numpy.where(numpy.logical_and(
+            self.unique_grid_point_heights_m_asl >= min_height_m_asl,
+            self.unique_grid_point_heights_m_asl <= max_height_m_asl))[0]
+
+        if len(height_indices) == 0:
+            error_string = (
+                'No grid-point heights are in range {0:.1f}...{1:.1f} m ASL.'
+            ).format(min_height_m_asl, max_height_m_asl)
+            raise ValueError(error_string)
+
+        return self._subset(
+            height_indices=height_indices,
+            row_indices=numpy.arange(self.shape[1]),
+            column_indices=numpy.arange(self.shape[2]))
+
+    def subset_by_latlng(self, min_latitude_deg, max_latitude_deg,
+                         min_longitude_deg, max_longitude_deg):
+        """Creates view covering a lat-long bounding box in this view.
+
+        :param min_latitude_deg: Minimum latitude (deg N).
+        :param max_latitude_deg: Max latitude (deg N).
+        :param min_longitude_deg: Minimum longitude (deg E).
+        :param max_longitude_deg: Max longitude (deg E).
+        :return: new_view: New instance of `GridradFieldView`.
+        :raises: ValueError: if no grid points are in the bounding box.
+        """
+
+        error_checking.assert_is_valid_latitude(min_latitude_deg)
+        error_checking.assert_is_valid_latitude(max_latitude_deg)
+        error_checking.assert_is_geq(max_latitude_deg, min_latitude_deg)
+
+        min_longitude_deg = lng_conversion.convert_lng_positive_in_west(
+            min_longitude_deg, allow_nan=False)
+        max_longitude_deg = lng_conversion.convert_lng_positive_in_west(
+            max_longitude_deg, allow_nan=False)
+        error_checking.assert_is_geq(max_longitude_deg, min_longitude_deg)
+
+        row_indices = numpy.where(numpy.logical_and(
+            self.unique_grid_point_lat_deg >= min_latitude_deg,
+            self.unique_grid_point_lat_deg <= max_latitude_deg))[0]
+        column_indices = numpy.where(numpy.logical_and(
+            self.unique_grid_point_lng_deg >= min_longitude_deg,
+            self.unique_grid_point_lng_deg <= max_longitude_deg))[0]
+
+        if len(row_indices) == 0 or len(column_indices) == 0:
+            error_string = (
+                'No grid points are in bounding box ({0:.4f}...{1:.4f} deg N, '
+                '{2:.4f}...{3:.4f} deg E).'
+            ).format(min_latitude_deg, max_latitude_deg, min_longitude_deg,
+                     max_longitude_deg)
+            raise ValueError(error_string)
+
+        return self._subset(
+            height_indices=numpy.arange(self.shape[0]),
+            row_indices=row_indices, column_indices=column_indices)
+
+    def __getitem__(self, index_tuple):
+        """Reads values in part of this view.
+
+        :param index_tuple: Integer, slice, or tuple of up to 3 integers and
+            slices (indexing height, row, and column, in that order).
+        :return: field_matrix: numpy array with values of radar field.
+        """
+
+        if not isinstance(index_tuple, tuple):
+            index_tuple = (index_tuple,)
+        if len(index_tuple) > len(self.shape):
+            raise IndexError('Views have only {0:d} dimensions.'.format(
+                len(self.shape)))
+
+        index_tuple += (slice(None),) * (len(self.shape) - len(index_tuple))
+        first_indices = [self.first_height_index, self.first_row_index,
+                         self.first_column_index]
+
+        hyperslab_objects = []
+        reverse_flags = []
+        squeeze_flags = []
+        for k in range(len(self.shape)):
+            this_hyperslab_object, this_reverse_flag, this_squeeze_flag = (
+                _index_to_hyperslab(
+                    index_tuple[k], num_values=self.shape[k],
+                    first_value_index=first_indices[k]))
+
+            hyperslab_objects.append(this_hyperslab_object)
+            reverse_flags.append(this_reverse_flag)
+            squeeze_flags.append(this_squeeze_flag)
+
+        dataset_object = self._open()
+        try:
+            field_matrix = self._read_hyperslab(
+                dataset_object, *hyperslab_objects)
+        finally:
+            dataset_object.close()
+
+        field_matrix = field_matrix[tuple(
+            [slice(None, None, -1) if f else slice(None)
+             for f in reverse_flags])]
+        return numpy.squeeze(
+            field_matrix, axis=tuple(numpy.where(squeeze_flags)[0]))
+
+    def read(self):
+        """Reads all values in this view.
+
+        :return: field_matrix: H-by-M-by-N numpy array with values of radar
+            field.
+        """
+
+        return self[:, :, :]
+
+    def _set_chunk_cache(self, dataset_object):
+        """Enlarges chunk cache for variable, if necessary.
+
+        If the variable is stored in compressed chunks (NetCDF4/HDF5), reading a
+        few rows decompresses every storage chunk that contains those rows.  To
+        ensure that each storage chunk is decompressed only once while the view
+        is read row by row, the cache must hold one band of storage chunks (all
+        chunks with the same rows).
+
+        :param dataset_object: Object created by `_open`.
+        """
+
+        if self.use_memory_map:
+            return
+
+        variable_object = dataset_object.variables[self.field_name_orig]
+        chunk_sizes = variable_object.chunking()
+        if not isinstance(chunk_sizes, list):
+            return
+
+        first_indices = numpy.array(
+            [self.first_height_index, self.first_column_index], dtype=int)
+        last_indices = first_indices + numpy.array(
+            [self.shape[0], self.shape[2]], dtype=int) - 1
+        these_chunk_sizes = numpy.array(
+            [chunk_sizes[1], chunk_sizes[3]], dtype=int)
+        num_chunks_in_band = numpy.prod(
+            last_indices // these_chunk_sizes -
+            first_indices // these_chunk_sizes + 1)
+
+        num_bytes_in_band = (
+            num_chunks_in_band * numpy.prod(numpy.array(chunk_sizes)) *
+            variable_object.dtype.itemsize)
+
+        cache_size_bytes, num_cache_slots, preemption_fraction = (
+            variable_object.get_var_chunk_cache())
+        if num_bytes_in_band >= cache_size_bytes:
+            variable_object.set_var_chunk_cache(
+                size=int(CHUNK_CACHE_MARGIN * num_bytes_in_band),
+                nelems=num_cache_slots, preemption=preemption_fraction)
+
+    def iterate_row_chunks(self, num_rows_per_chunk=DEFAULT_NUM_ROWS_PER_CHUNK):
+        """Reads this view in chunks of consecutive rows.
+
+        The file is opened only once, and only one chunk is held in memory at a
+        time (along with one band of storage chunks, if the file is compressed;
+        see `_set_chunk_cache`).
+
+        R = number of rows in chunk
+
+        :param num_rows_per_chunk: Number of rows per chunk.
+        :return: first_row_index: Index (into this view) of the first row in
+            the chunk.
+        :return: field_matrix: H-by-R-by-N numpy array with values of radar
+            field.
+        """
+
+        error_checking.assert_is_integer(num_rows_per_chunk)
+        error_checking.assert_is_greater(num_rows_per_chunk, 0)
+
+        height_slice = slice(
+            self.first_height_index, self.first_height_index + self.shape[0])
+        column_slice = slice(
+            self.first_column_index, self.first_column_index + self.shape[2])
+
+        dataset_object = self._open()
+        try:
+            self._set_chunk_cache(dataset_object)
+
+            for first_row_index in range(
+                    0, self.shape[1], num_rows_per_chunk):
+                last_row_index = min(
+                    [first_row_index + num_rows_per_chunk, self.shape[1]])
+                this_row_slice = slice(
+                    self.first_row_index + first_row_index,
+                    self.first_row_index + last_row_index)
+
+                yield first_row_index, self._read_hyperslab(
+                    dataset_object, height_slice, this_row_slice, column_slice)
+        finally:
+            dataset_object.close()
+
+
 def read_metadata_from_full_grid_file(netcdf_file_name,
                                       raise_error_if_fails=True):
     """Reads metadata from full-grid (not sparse-grid) file.
@@ -201,25 +638,32 @@ def read_field_from_full_grid_file(
     field_matrix = numpy.array(
         netcdf_dataset.variables[field_name_orig][0, :, :, :])
 
-    min_latitude_deg = metadata_dict[radar_io.NW_GRID_POINT_LAT_COLUMN] - (
-        metadata_dict[radar_io.LAT_SPACING_COLUMN] *
-        (metadata_dict[radar_io.NUM_LAT_COLUMN] - 1))
-    unique_grid_point_lat_deg, unique_grid_point_lng_deg = (
-        grids.get_latlng_grid_points(
-            min_latitude_deg=min_latitude_deg,
-            min_longitude_deg=metadata_dict[radar_io.NW_GRID_POINT_LNG_COLUMN],
-            lat_spacing_deg=metadata_dict[radar_io.LAT_SPACING_COLUMN],
-            lng_spacing_deg=metadata_dict[radar_io.LNG_SPACING_COLUMN],
-            num_rows=metadata_dict[radar_io.NUM_LAT_COLUMN],
-            num_columns=metadata_dict[radar_io.NUM_LNG_COLUMN]))
-
-    max_height_m_asl = metadata_dict[MIN_GRID_POINT_HEIGHT_COLUMN] + (
-        metadata_dict[HEIGHT_SPACING_COLUMN] *
-        (metadata_dict[NUM_HEIGHTS_COLUMN] - 1))
-    unique_grid_point_heights_m_asl = numpy.linspace(
-        metadata_dict[MIN_GRID_POINT_HEIGHT_COLUMN], max_height_m_asl,
-        num=metadata_dict[NUM_HEIGHTS_COLUMN])
+    (unique_grid_point_heights_m_asl, unique_grid_point_lat_deg,
+     unique_grid_point_lng_deg) = _get_grid_point_coords(metadata_dict)
 
     netcdf_dataset.close()
     return (field_matrix, unique_grid_point_heights_m_asl,
             unique_grid_point_lat_deg, unique_grid_point_lng_deg)
+
+
+def open_field_from_full_grid_file(
+        netcdf_file_name, field_name, metadata_dict, use_memory_map=False):
+    """Opens one radar field from full-grid (not sparse-grid) file lazily.
+
+    This is a lazy version of read_field_from_full_grid_file.  No data are read
+    until the view is indexed, which means that the caller can read only a
+    height range or lat-long box (see `GridradFieldView.subset_by_height` and
+    `GridradFieldView.subset_by_latlng`), or read the full grid in chunks (see
+    `GridradFieldView.iterate_row_chunks`).
+
+    :param netcdf_file_name: Path to input file.
+    :param field_name: Name of radar field.
+    :param metadata_dict: Dictionary created by
+        read_metadata_from_full_grid_file.
+    :param use_memory_map: See documentation for `GridradFieldView`.
+    :return: field_view: Instance of `GridradFieldView`, covering the full grid.
+    """
+
+    return GridradFieldView(
+        netcdf_file_name=netcdf_file_name, field_name=field_name,
+        metadata_dict=metadata_dict, use_memory_map=use_memory_map)
@@ -1,6 +1,10 @@
 """Unit tests for gridrad_io.py."""
 
+import shutil
+import tempfile
 import unittest
+import numpy
+from netCDF4 import Dataset
 from gewittergefahr.gg_io import gridrad_io
 
 DIFFERENTIAL_REFL_NAME = gridrad_io.DIFFERENTIAL_REFL_NAME
@@ -10,10 +14,87 @@ DIFFERENTIAL_REFL_NAME_FAKE = 'foo'
 GRIDRAD_TIME_SEC = 512395800
 UNIX_TIME_SEC = 1490703000
 
+# The following constants are used to test _index_to_hyperslab.
+NUM_VALUES_FOR_HYPERSLAB = 10
+FIRST_VALUE_INDEX_FOR_HYPERSLAB = 5
+SLICE_OBJECT = slice(2, None, 3)
+HYPERSLAB_FOR_SLICE = slice(7, 14, 3)
+REVERSED_SLICE_OBJECT = slice(None, None, -2)
+HYPERSLAB_FOR_REVERSED_SLICE = slice(6, 15, 2)
+INTEGER_INDEX = -1
+HYPERSLAB_FOR_INTEGER = slice(14, 15)
+
+# The following constants are used to test GridradFieldView.
+GRID_POINT_HEIGHTS_KM_ASL = numpy.array([1., 2., 3.])
+GRID_POINT_LATITUDES_DEG = numpy.array([30., 30.5, 31., 31.5])
+GRID_POINT_LONGITUDES_DEG = numpy.array([250., 250.5, 251., 251.5, 252.])
+REFLECTIVITY_MATRIX_DBZ = numpy.reshape(
+    numpy.linspace(0., 59., num=60), (3, 4, 5))
+
+MIN_HEIGHT_M_ASL = 1500.
+MAX_HEIGHT_M_ASL = 3000.
+MIN_LATITUDE_DEG = 30.5
+MAX_LATITUDE_DEG = 31.2
+MIN_LONGITUDE_DEG = -109.2
+MAX_LONGITUDE_DEG = -108.
+SUBSET_REFL_MATRIX_DBZ = REFLECTIVITY_MATRIX_DBZ[1:, 1:3, 2:]
+SUBSET_HEIGHTS_M_ASL = numpy.array([2000., 3000.])
+
+
+def _write_full_grid_file(netcdf_file_name, netcdf_format):
+    """Writes reflectivity to full-grid file.
+
+    :param netcdf_file_name: Path to output file.
+    :param netcdf_format: Format (input to `netCDF4.Dataset`).
+    """
+
+    netcdf_dataset = Dataset(netcdf_file_name, 'w', format=netcdf_format)
+    netcdf_dataset.createDimension(gridrad_io.TIME_NAME_ORIG, 1)
+    netcdf_dataset.createDimension(
+        gridrad_io.HEIGHT_NAME_ORIG, len(GRID_POINT_HEIGHTS_KM_ASL))
+    netcdf_dataset.createDimension(
+        gridrad_io.LATITUDE_NAME_ORIG, len(GRID_POINT_LATITUDES_DEG))
+    netcdf_dataset.createDimension(
+        gridrad_io.LONGITUDE_NAME_ORIG, len(GRID_POINT_LONGITUDES_DEG))
+
+    for this_name, these_values in zip(
+            [gridrad_io.TIME_NAME_ORIG, gridrad_io.HEIGHT_NAME_ORIG,
+             gridrad_io.LATITUDE_NAME_ORIG, gridrad_io.LONGITUDE_NAME_ORIG],
+            [numpy.array([GRIDRAD_TIME_SEC]), GRID_POINT_HEIGHTS_KM_ASL,
+             GRID_POINT_LATITUDES_DEG, GRID_POINT_LONGITUDES_DEG]):
+        netcdf_dataset.createVariable(this_name, 'f8', (this_name,))
+        netcdf_dataset.variables[this_name][:] = these_values
+
+    netcdf_dataset.createVariable(
+        gridrad_io.REFL_NAME_ORIG, 'f4',
+        (gridrad_io.TIME_NAME_ORIG, gridrad_io.HEIGHT_NAME_ORIG,
+         gridrad_io.LATITUDE_NAME_ORIG, gridrad_io.LONGITUDE_NAME_ORIG))
+    netcdf_dataset.variables[gridrad_io.REFL_NAME_ORIG][:] = (
+        REFLECTIVITY_MATRIX_DBZ[numpy.newaxis, ...])
+    netcdf_dataset.close()
+
 
 class GridradIoTests(unittest.TestCase):
     """Each method is a unit test for gridrad_io.py."""
 
+    def setUp(self):
+        """Creates temporary directory with full-grid files."""
+
+        self.directory_name = tempfile.mkdtemp()
+        self.netcdf4_file_name = '{0:s}/netcdf4.nc'.format(self.directory_name)
+        _write_full_grid_file(self.netcdf4_file_name, 'NETCDF4')
+
+        self.netcdf3_file_name = '{0:s}/netcdf3.nc'.format(self.directory_name)
+        _write_full_grid_file(self.netcdf3_file_name, 'NETCDF3_CLASSIC')
+
+        self.metadata_dict = gridrad_io.read_metadata_from_full_grid_file(
+            self.netcdf4_file_name)
+
+    def tearDown(self):
+        """Deletes temporary directory."""
+
+        shutil.rmtree(self.directory_name)
+
     def test_check_field_name_valid(self):
         """Ensures correct output from _check_field_name.
 
@@ -45,6 +126,136 @@ class GridradIoTests(unittest.TestCase):
             GRIDRAD_TIME_SEC)
         self.assertTrue(this_time_unix_sec == UNIX_TIME_SEC)
 
+    def test_index_to_hyperslab_slice(self):
+        """Ensures correct output from _index_to_hyperslab.
+
+        In this case, input is a slice with positive step.
+        """
+
+        this_hyperslab_object, this_reverse_flag, this_squeeze_flag = (
+            gridrad_io._index_to_hyperslab(
+                SLICE_OBJECT, num_values=NUM_VALUES_FOR_HYPERSLAB,
+                first_value_index=FIRST_VALUE_INDEX_FOR_HYPERSLAB))
+
+        self.assertTrue(this_hyperslab_object == HYPERSLAB_FOR_SLICE)
+        self.assertFalse(this_reverse_flag)
+        self.assertFalse(this_squeeze_flag)
+
+    def test_index_to_hyperslab_reversed_slice(self):
+        """Ensures correct output from _index_to_hyperslab.
+
+        In this case, input is a slice with negative step.
+        """
+
+        this_hyperslab_object, this_reverse_flag, this_squeeze_flag = (
+            gridrad_io._index_to_hyperslab(
+                REVERSED_SLICE_OBJECT, num_values=NUM_VALUES_FOR_HYPERSLAB,
+                first_value_index=FIRST_VALUE_INDEX_FOR_HYPERSLAB))
+
+        self.assertTrue(this_hyperslab_object == HYPERSLAB_FOR_REVERSED_SLICE)
+        self.assertTrue(this_reverse_flag)
+        self.assertFalse(this_squeeze_flag)
+
+    def test_index_to_hyperslab_integer(self):
+        """Ensures correct output from _index_to_hyperslab.
+
+        In this case, input is an integer.
+        """
+
+        this_hyperslab_object, this_reverse_flag, this_squeeze_flag = (
+            gridrad_io._index_to_hyperslab(
+                INTEGER_INDEX, num_values=NUM_VALUES_FOR_HYPERSLAB,
+                first_value_index=FIRST_VALUE_INDEX_FOR_HYPERSLAB))
+
+        self.assertTrue(this_hyperslab_object == HYPERSLAB_FOR_INTEGER)
+        self.assertFalse(this_reverse_flag)
+        self.assertTrue(this_squeeze_flag)
+
+    def test_read_field_from_full_grid_file(self):
+        """Ensures correct output from read_field_from_full_grid_file."""
+
+        this_refl_matrix_dbz, these_heights_m_asl, _, _ = (
+            gridrad_io.read_field_from_full_grid_file(
+                self.netcdf4_file_name, field_name=gridrad_io.REFL_NAME,
+                metadata_dict=self.metadata_dict))
+
+        self.assertTrue(numpy.allclose(
+            this_refl_matrix_dbz, REFLECTIVITY_MATRIX_DBZ))
+        self.assertTrue(numpy.allclose(
+            these_heights_m_asl,
+            GRID_POINT_HEIGHTS_KM_ASL * gridrad_io.KM_TO_METRES))
+
+    def test_open_field_from_full_grid_file(self):
+        """Ensures correct output from open_field_from_full_grid_file.
+
+        In this case, the view is indexed and read in full.
+        """
+
+        this_field_view = gridrad_io.open_field_from_full_grid_file(
+            self.netcdf4_file_name, field_name=gridrad_io.REFL_NAME,
+            metadata_dict=self.metadata_dict)
+
+        self.assertTrue(this_field_view.shape == REFLECTIVITY_MATRIX_DBZ.shape)
+        self.assertTrue(numpy.allclose(
+            this_field_view.read(), REFLECTIVITY_MATRIX_DBZ))
+        self.assertTrue(numpy.allclose(
+            this_field_view[1, ::-1, 1:4], REFLECTIVITY_MATRIX_DBZ[
+                1, ::-1, 1:4]))
+
+    def test_open_field_subset(self):
+        """Ensures correct output from open_field_from_full_grid_file.
+
+        In this case, the view is subset by height and lat-long box.
+        """
+
+        this_field_view = gridrad_io.open_field_from_full_grid_file(
+            self.netcdf4_file_name, field_name=gridrad_io.REFL_NAME,
+            metadata_dict=self.metadata_dict)
+        this_field_view = this_field_view.subset_by_height(
+            MIN_HEIGHT_M_ASL, MAX_HEIGHT_M_ASL).subset_by_latlng(
+                MIN_LATITUDE_DEG, MAX_LATITUDE_DEG, MIN_LONGITUDE_DEG,
+                MAX_LONGITUDE_DEG)
+
+        self.assertTrue(numpy.allclose(
+            this_field_view.unique_grid_point_heights_m_asl,
+            SUBSET_HEIGHTS_M_ASL))
+        self.assertTrue(numpy.allclose(
+            this_field_view.read(), SUBSET_REFL_MATRIX_DBZ))
+        self.assertTrue(numpy.allclose(
+            this_field_view[-1, 1], SUBSET_REFL_MATRIX_DBZ[-1, 1]))
+
+    def test_open_field_memory_map(self):
+        """Ensures correct output from open_field_from_full_grid_file.
+
+        In this case, the NetCDF3 file is memory-mapped and read in chunks.
+        """
+
+        this_field_view = gridrad_io.open_field_from_full_grid_file(
+            self.netcdf3_file_name, field_name=gridrad_io.REFL_NAME,
+            metadata_dict=self.metadata_dict, use_memory_map=True)
+
+        this_refl_matrix_dbz = numpy.full(
+            REFLECTIVITY_MATRIX_DBZ.shape, numpy.nan)
+        for this_first_row, this_chunk_matrix_dbz in (
+                this_field_view.iterate_row_chunks(num_rows_per_chunk=3)):
+            this_refl_matrix_dbz[
+                :, this_first_row:(this_first_row + 3), :
+            ] = this_chunk_matrix_dbz
+
+        self.assertTrue(numpy.allclose(
+            this_refl_matrix_dbz, REFLECTIVITY_MATRIX_DBZ))
+
+    def test_open_field_memory_map_netcdf4(self):
+        """Ensures that open_field_from_full_grid_file raises error.
+
+        In this case, memory-mapping is requested for a NetCDF4 file.
+        """
+
+        with self.assertRaises(ValueError):
+            gridrad_io.open_field_from_full_grid_file(
+                self.netcdf4_file_name, field_name=gridrad_io.REFL_NAME,
+                metadata_dict=self.metadata_dict, use_memory_map=True)
+
 
 if __name__ == '__main__':
     unittest.main()
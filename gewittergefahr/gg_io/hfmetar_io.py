@@ -8,6 +8,7 @@ stations.
 """
 
 import os.path
+import multiprocessing
 import numpy
 import pandas
 from gewittergefahr.gg_io import downloads
@@ -36,9 +37,12 @@ FTP_USER_NAME = 'ftp'
 FTP_PASSWORD = 'ryan.lagerquist@ou.edu'
 TOP_FTP_DIR_NAME_1MINUTE = '/pub/data/asos-onemin'
 TOP_FTP_DIR_NAME_5MINUTE = '/pub/data/asos-fivemin'
+DEFAULT_NUM_THREADS = 4
 
 FEET_TO_METRES = 1. / 3.2808
+MINUTES_TO_SECONDS = 60
 HOURS_TO_SECONDS = 3600
+DAYS_TO_SECONDS = 86400
 KT_TO_METRES_PER_SECOND = 1.852 / 3.6
 
 STATION_ID_CHAR_INDICES = numpy.array([22, 26], dtype=int)
@@ -52,8 +56,12 @@ NUM_HEADER_LINES_IN_METAFILE = 2
 LOCAL_DATE_CHAR_INDICES_1MINUTE_FILE = numpy.array([13, 21], dtype=int)
 LOCAL_TIME_CHAR_INDICES_1MINUTE_FILE = numpy.array([21, 25], dtype=int)
 WIND_CHAR_INDICES_1MINUTE_FILE = numpy.array([68, 89], dtype=int)
+WIND_REGEX_1MINUTE_FILE = r'(\S+)\s+(\S+)\s+(\S+)\s+(\S+)\s*$'
 LOCAL_TIME_CHAR_INDICES_5MINUTE_FILE = numpy.array([13, 25], dtype=int)
 
+WIND_WORD_REGEX_5MINUTE_FILE = r'^\s*(?:\S+\s+){6}(?:AUTO\s+)?(\S+)'
+WIND_REGEX_5MINUTE_FILE = r'^(.{3})([^G]*?)(?:G(.*?))?KT'
+
 METADATA_COLUMNS_TO_MERGE = [
     raw_wind_io.STATION_ID_COLUMN, raw_wind_io.STATION_NAME_COLUMN,
     raw_wind_io.LATITUDE_COLUMN, raw_wind_io.LONGITUDE_COLUMN,
@@ -110,6 +118,156 @@ def _local_time_string_to_unix_sec(local_time_string, utc_offset_hours):
             utc_offset_hours * HOURS_TO_SECONDS)
 
 
+def _local_time_strings_to_unix_sec(local_time_strings, utc_offset_hours):
+    """Converts many times from local strings to Unix format.
+
+    This method is a vectorized version of _local_time_string_to_unix_sec.
+    Rather than calling `time.strptime` for each string, it converts all strings
+    to integers (yyyymmddHHMM) and splits them into date/time components.
+
+    N = number of times
+
+    :param local_time_strings: length-N list (or numpy array) of local times
+        (format "yyyymmddHHMM").
+    :param utc_offset_hours: Local time minus UTC.
+    :return: unix_times_sec: length-N numpy array of times in Unix format.
+    :raises: ValueError: if any string is not a valid time in format
+        "yyyymmddHHMM".
+    """
+
+    local_time_strings = numpy.asarray(local_time_strings)
+    if len(local_time_strings) == 0:
+        return numpy.array([], dtype=int)
+
+    time_integers = local_time_strings.astype(numpy.int64)
+    minutes = numpy.mod(time_integers, 100)
+    hours = numpy.mod(time_integers // 100, 100)
+    days = numpy.mod(time_integers // 10 ** 4, 100)
+    months = numpy.mod(time_integers // 10 ** 6, 100)
+    years = time_integers // 10 ** 8
+
+    month_starts = ((years - 1970) * 12 + months - 1).astype('datetime64[M]')
+    dates = month_starts.astype('datetime64[D]') + (days - 1)
+
+    valid_flags = numpy.all(numpy.vstack((
+        months >= 1, months <= 12, days >= 1,
+        dates.astype('datetime64[M]') == month_starts,
+        hours <= 23, minutes <= 59)), axis=0)
+    if not numpy.all(valid_flags):
+        first_invalid_index = numpy.where(numpy.invert(valid_flags))[0][0]
+        raise ValueError(
+            'Local time string "{0:s}" is invalid.  Expected format is '
+            '"yyyymmddHHMM".'.format(local_time_strings[first_invalid_index]))
+
+    unix_times_sec = (
+        dates.astype(numpy.int64) * DAYS_TO_SECONDS +
+        hours * HOURS_TO_SECONDS + minutes * MINUTES_TO_SECONDS -
+        utc_offset_hours * HOURS_TO_SECONDS)
+    return numpy.round(unix_times_sec).astype(int)
+
+
+def _strings_to_floats(input_strings):
+    """Converts strings to floats.
+
+    N = number of strings
+
+    :param input_strings: length-N pandas Series of strings.  Missing values
+        (NaN or None) are allowed.
+    :return: output_values: length-N numpy array of floats.  Any string that
+        cannot be converted is NaN.
+    """
+
+    return pandas.to_numeric(input_strings, errors='coerce').values.astype(
+        float)
+
+
+def _parse_1minute_winds_from_lines(line_strings):
+    """Parses wind observations from many lines of 1-minute-METAR file.
+
+    This method is a vectorized version of _parse_1minute_wind_from_line.
+
+    N = number of lines
+
+    :param line_strings: length-N list (or pandas Series) of lines from
+        1-minute-METAR file.
+    :return: wind_speeds_kt: length-N numpy array with speeds of sustained wind
+        (kt).
+    :return: wind_directions_deg: length-N numpy array with directions of
+        sustained wind (degrees of origin).
+    :return: wind_gust_speeds_kt: length-N numpy array with speeds of wind gust
+        (kt).
+    :return: wind_gust_directions_deg: length-N numpy array with directions of
+        wind gust (degrees of origin).
+    """
+
+    wind_parts_table = pandas.Series(line_strings, dtype=object).str.slice(
+        WIND_CHAR_INDICES_1MINUTE_FILE[0], WIND_CHAR_INDICES_1MINUTE_FILE[1]
+    ).str.extract(WIND_REGEX_1MINUTE_FILE, expand=True)
+
+    wind_directions_deg = _strings_to_floats(wind_parts_table[0])
+    wind_speeds_kt = _strings_to_floats(wind_parts_table[1])
+    wind_gust_directions_deg = _strings_to_floats(wind_parts_table[2])
+    wind_gust_speeds_kt = _strings_to_floats(wind_parts_table[3])
+
+    invalid_flags = numpy.any(numpy.isnan(numpy.vstack((
+        wind_directions_deg, wind_speeds_kt, wind_gust_directions_deg,
+        wind_gust_speeds_kt))), axis=0)
+
+    wind_speeds_kt[invalid_flags] = numpy.nan
+    wind_directions_deg[invalid_flags] = numpy.nan
+    wind_gust_speeds_kt[invalid_flags] = numpy.nan
+    wind_gust_directions_deg[invalid_flags] = numpy.nan
+
+    return (wind_speeds_kt, wind_directions_deg, wind_gust_speeds_kt,
+            wind_gust_directions_deg)
+
+
+def _parse_5minute_winds_from_lines(line_strings):
+    """Parses wind observations from many lines of 5-minute-METAR file.
+
+    This method is a vectorized version of _parse_5minute_wind_from_line.  The
+    wind group (e.g., "02008KT" or "02008G13KT") is the 7th word in each line,
+    or the 8th word if the 7th is "AUTO".
+
+    N = number of lines
+
+    :param line_strings: length-N list (or pandas Series) of lines from
+        5-minute-METAR file.
+    :return: wind_speeds_kt: See documentation for
+        _parse_1minute_winds_from_lines.
+    :return: wind_directions_deg: Same.
+    :return: wind_gust_speeds_kt: Same.
+    :return: wind_gust_directions_deg: Same.
+    """
+
+    wind_strings = pandas.Series(line_strings, dtype=object).str.extract(
+        WIND_WORD_REGEX_5MINUTE_FILE, expand=False)
+    wind_strings = wind_strings.fillna('').str.upper()
+
+    kt_indices = wind_strings.str.find('KT').values
+    g_indices = wind_strings.str.find('G').values
+    no_gust_flags = g_indices == -1
+
+    valid_flags = numpy.logical_and(kt_indices >= 0, numpy.logical_or(
+        numpy.logical_and(no_gust_flags, kt_indices > 3),
+        numpy.logical_and(g_indices > 3, kt_indices > g_indices + 1)))
+
+    wind_parts_table = wind_strings.str.extract(
+        WIND_REGEX_5MINUTE_FILE, expand=True)
+    wind_directions_deg = _strings_to_floats(wind_parts_table[0])
+    wind_speeds_kt = _strings_to_floats(wind_parts_table[1])
+    wind_gust_speeds_kt = _strings_to_floats(wind_parts_table[2])
+    wind_gust_directions_deg = numpy.full(len(wind_strings), numpy.nan)
+
+    invalid_flags = numpy.invert(valid_flags)
+    wind_speeds_kt[invalid_flags] = numpy.nan
+    wind_directions_deg[invalid_flags] = numpy.nan
+    wind_gust_speeds_kt[invalid_flags] = numpy.nan
+
+    return (wind_speeds_kt, wind_directions_deg, wind_gust_speeds_kt,
+            wind_gust_directions_deg)
+
+
 def _parse_1minute_wind_from_line(line_string):
     """Parses wind observation from 1-minute-METAR file.
 
@@ -120,20 +278,8 @@ def _parse_1minute_wind_from_line(line_string):
     wind_gust_direction_deg: Direction of wind gust (degrees of origin).
     """
 
-    wind_string = line_string[WIND_CHAR_INDICES_1MINUTE_FILE[0]:
-                              WIND_CHAR_INDICES_1MINUTE_FILE[1]]
-    wind_parts = wind_string.split()
-
-    try:
-        wind_direction_deg = float(wind_parts[-4])
-        wind_speed_kt = float(wind_parts[-3])
-        wind_gust_direction_deg = float(wind_parts[-2])
-        wind_gust_speed_kt = float(wind_parts[-1])
-    except (ValueError, IndexError):
-        return numpy.nan, numpy.nan, numpy.nan, numpy.nan
-
-    return (wind_speed_kt, wind_direction_deg, wind_gust_speed_kt,
-            wind_gust_direction_deg)
+    return tuple(
+        a[0] for a in _parse_1minute_winds_from_lines([line_string]))
 
 
 def _parse_5minute_wind_from_line(line_string):
@@ -146,63 +292,89 @@ def _parse_5minute_wind_from_line(line_string):
     wind_gust_direction_deg: Direction of wind gust (degrees of origin).
     """
 
-    wind_gust_direction_deg = numpy.nan
-    words = line_string.split()
-
-    try:
-        if words[6] == 'AUTO':
-            wind_string = words[7]
-        else:
-            wind_string = words[6]
-    except IndexError:
-        return numpy.nan, numpy.nan, numpy.nan, numpy.nan
-
-    wind_string = wind_string.upper()
-    index_of_kt = wind_string.find('KT')
-    if index_of_kt == -1:
-        return numpy.nan, numpy.nan, numpy.nan, numpy.nan
-
-    try:
-        wind_direction_deg = float(wind_string[0:3])
-    except IndexError:
-        return numpy.nan, numpy.nan, numpy.nan, numpy.nan
-    except ValueError:
-        wind_direction_deg = numpy.nan
-
-    index_of_g = wind_string.find('G')
-
-    try:
-        if index_of_g == -1:
-            if index_of_kt <= 3:
-                raise IndexError
-
-            wind_speed_kt = float(wind_string[3:index_of_kt])
-        else:
-            if index_of_g <= 3:
-                raise IndexError
-
-            wind_speed_kt = float(wind_string[3:index_of_g])
-    except IndexError:
-        return numpy.nan, numpy.nan, numpy.nan, numpy.nan
-    except ValueError:
-        wind_speed_kt = numpy.nan
-
-    if index_of_g == -1:
-        wind_gust_speed_kt = numpy.nan
-    else:
-        try:
-            if index_of_kt <= index_of_g + 1:
-                raise IndexError
+    return tuple(
+        a[0] for a in _parse_5minute_winds_from_lines([line_string]))
 
-            wind_gust_speed_kt = float(
-                wind_string[(index_of_g + 1):index_of_kt])
-        except IndexError:
-            return numpy.nan, numpy.nan, numpy.nan, numpy.nan
-        except ValueError:
-            wind_gust_speed_kt = numpy.nan
 
-    return (wind_speed_kt, wind_direction_deg, wind_gust_speed_kt,
-            wind_gust_direction_deg)
+def _read_lines_from_raw_file(text_file_name):
+    """Reads all lines from raw file.
+
+    :param text_file_name: Path to input file.
+    :return: line_strings: pandas Series of lines (without newline
+        characters).
+    """
+
+    return pandas.Series(
+        open(text_file_name, 'r').read().splitlines(), dtype=object)
+
+
+def _winds_to_table(unix_times_sec, wind_speeds_kt, wind_directions_deg,
+                    wind_gust_speeds_kt, wind_gust_directions_deg):
+    """Converts wind observations to pandas DataFrame.
+
+    :param unix_times_sec: See documentation for
+        _local_time_strings_to_unix_sec.
+    :param wind_speeds_kt: See documentation for
+        _parse_1minute_winds_from_lines.
+    :param wind_directions_deg: Same.
+    :param wind_gust_speeds_kt: Same.
+    :param wind_gust_directions_deg: Same.
+    :return: wind_table: See documentation for
+        read_1minute_winds_from_raw_file.
+    """
+
+    wind_dict = {
+        raw_wind_io.WIND_SPEED_COLUMN:
+            wind_speeds_kt * KT_TO_METRES_PER_SECOND,
+        raw_wind_io.WIND_DIR_COLUMN: wind_directions_deg,
+        raw_wind_io.WIND_GUST_SPEED_COLUMN:
+            wind_gust_speeds_kt * KT_TO_METRES_PER_SECOND,
+        raw_wind_io.WIND_GUST_DIR_COLUMN: wind_gust_directions_deg,
+        raw_wind_io.TIME_COLUMN: unix_times_sec}
+
+    wind_table = pandas.DataFrame.from_dict(wind_dict)
+    return _remove_invalid_wind_rows(wind_table)
+
+
+def _read_winds_for_one_station(argument_list):
+    """Reads wind observations for one station-month and adds metadata.
+
+    This method is called by read_winds_for_many_stations, possibly in a worker
+    process, so it takes one argument list rather than keyword arguments.
+
+    :param argument_list: List with the following elements.
+    argument_list[0]: Path to raw file (readable by
+        read_1minute_winds_from_raw_file or read_5minute_winds_from_raw_file).
+    argument_list[1]: String ID for station.
+    argument_list[2]: pandas DataFrame created by
+        read_station_metadata_from_raw_file.
+    argument_list[3]: Boolean flag.  If True, file contains 1-minute METARs.
+        If False, file contains 5-minute METARs.
+    :return: wind_table: pandas DataFrame created by
+        merge_winds_and_station_metadata, after
+        `raw_wind_io.sustained_and_gust_to_uv_max`.
+    """
+
+    (text_file_name, station_id, station_metadata_table,
+     one_minute_flag) = argument_list
+
+    these_station_flags = (
+        station_metadata_table[raw_wind_io.STATION_ID_COLUMN].values ==
+        station_id)
+    this_station_index = numpy.where(these_station_flags)[0][0]
+    utc_offset_hours = station_metadata_table[
+        raw_wind_io.UTC_OFFSET_COLUMN].values[this_station_index]
+
+    if one_minute_flag:
+        wind_table = read_1minute_winds_from_raw_file(
+            text_file_name, utc_offset_hours)
+    else:
+        wind_table = read_5minute_winds_from_raw_file(
+            text_file_name, utc_offset_hours)
+
+    wind_table = raw_wind_io.sustained_and_gust_to_uv_max(wind_table)
+    return merge_winds_and_station_metadata(
+        wind_table, station_metadata_table, station_id)
 
 
 def _remove_invalid_metadata_rows(station_metadata_table):
@@ -448,6 +620,64 @@ def download_1minute_file(station_id=None, month_unix_sec=None,
     return None
 
 
+def download_1minute_files(station_ids=None, month_unix_sec=None,
+                           top_local_directory_name=None,
+                           num_threads=DEFAULT_NUM_THREADS,
+                           raise_error_if_fails=True):
+    """Downloads files with 1-minute METARs for many stations and one month.
+
+    Unlike calling `download_1minute_file` in a loop, this method logs into the
+    FTP server once per connection (rather than once per file), downloads files
+    in parallel, skips files that are already up to date on the local machine,
+    and resumes partial downloads.
+
+    N = number of stations
+
+    :param station_ids: length-N list of string IDs for stations.
+    :param month_unix_sec: See doc for `download_1minute_file`.
+    :param top_local_directory_name: Same.
+    :param num_threads: Number of files to download at once.
+    :param raise_error_if_fails: Boolean flag.  If True and any download fails,
+        will raise error (after trying all stations).
+    :return: local_file_names: length-N list of paths on local machine.  If a
+        download failed but raise_error_if_fails = False, the corresponding
+        element is None.
+    """
+
+    error_checking.assert_is_string_list(station_ids)
+
+    candidate_file_names_by_target = []
+    local_file_names = []
+
+    for this_station_id in station_ids:
+        local_file_names.append(find_local_raw_1minute_file(
+            station_id=this_station_id, month_unix_sec=month_unix_sec,
+            top_directory_name=top_local_directory_name,
+            raise_error_if_missing=False))
+
+        candidate_file_names_by_target.append([
+            'ftp://{0:s}/{1:s}/{2:s}{3:s}/{4:s}'.format(
+                FTP_SERVER_NAME, TOP_FTP_DIR_NAME_1MINUTE,
+                ONLINE_SUBDIR_PREFIX_1MINUTE,
+                time_conversion.unix_sec_to_string(
+                    month_unix_sec, TIME_FORMAT_YEAR),
+                _get_pathless_raw_1minute_file_name(
+                    this_orig_station_id, month_unix_sec))
+            for this_orig_station_id in _station_id_to_online(this_station_id)
+        ])
+
+    manifest_table = downloads.download_files_with_candidates(
+        candidate_file_names_by_target=candidate_file_names_by_target,
+        local_file_names=local_file_names, user_name=FTP_USER_NAME,
+        password=FTP_PASSWORD, num_threads=num_threads,
+        raise_error_if_fails=raise_error_if_fails)
+
+    success_flags = manifest_table[downloads.STATUS_COLUMN].isin(
+        downloads.SUCCESS_STATUSES).values
+    return [local_file_names[i] if success_flags[i] else None
+            for i in range(len(local_file_names))]
+
+
 def download_5minute_file(station_id=None, month_unix_sec=None,
                           top_local_directory_name=None,
                           raise_error_if_fails=True):
@@ -522,45 +752,23 @@ def read_1minute_winds_from_raw_file(text_file_name, utc_offset_hours):
     error_checking.assert_file_exists(text_file_name)
     error_checking.assert_is_not_nan(utc_offset_hours)
 
-    unix_times_sec = []
-    wind_speeds_m_s01 = []
-    wind_directions_deg = []
-    wind_gust_speeds_m_s01 = []
-    wind_gust_directions_deg = []
+    line_strings = _read_lines_from_raw_file(text_file_name)
+    local_time_strings = (
+        line_strings.str.slice(LOCAL_DATE_CHAR_INDICES_1MINUTE_FILE[0],
+                               LOCAL_DATE_CHAR_INDICES_1MINUTE_FILE[1]) +
+        line_strings.str.slice(LOCAL_TIME_CHAR_INDICES_1MINUTE_FILE[0],
+                               LOCAL_TIME_CHAR_INDICES_1MINUTE_FILE[1]))
+    unix_times_sec = _local_time_strings_to_unix_sec(
+        local_time_strings.values, utc_offset_hours)
 
-    for this_line in open(text_file_name, 'r').readlines():
-        this_local_hour_string = (
-            this_line[LOCAL_TIME_CHAR_INDICES_1MINUTE_FILE[0]:
-                      LOCAL_TIME_CHAR_INDICES_1MINUTE_FILE[1]])
-        this_local_date_string = (
-            this_line[LOCAL_DATE_CHAR_INDICES_1MINUTE_FILE[0]:
-                      LOCAL_DATE_CHAR_INDICES_1MINUTE_FILE[1]])
-
-        this_local_time_string = this_local_date_string + this_local_hour_string
-        this_time_unix_sec = _local_time_string_to_unix_sec(
-            this_local_time_string, utc_offset_hours)
-
-        (this_wind_speed_m_s01, this_wind_direction_deg,
-         this_wind_gust_speed_m_s01,
-         this_wind_gust_direction_deg) = _parse_1minute_wind_from_line(
-             this_line)
-
-        unix_times_sec.append(this_time_unix_sec)
-        wind_speeds_m_s01.append(this_wind_speed_m_s01)
-        wind_directions_deg.append(this_wind_direction_deg)
-        wind_gust_speeds_m_s01.append(this_wind_gust_speed_m_s01)
-        wind_gust_directions_deg.append(this_wind_gust_direction_deg)
-
-    wind_dict = {raw_wind_io.WIND_SPEED_COLUMN: wind_speeds_m_s01,
-                 raw_wind_io.WIND_DIR_COLUMN: wind_directions_deg,
-                 raw_wind_io.WIND_GUST_SPEED_COLUMN: wind_gust_speeds_m_s01,
-                 raw_wind_io.WIND_GUST_DIR_COLUMN: wind_gust_directions_deg,
-                 raw_wind_io.TIME_COLUMN: unix_times_sec}
+    (wind_speeds_kt, wind_directions_deg, wind_gust_speeds_kt,
+     wind_gust_directions_deg) = _parse_1minute_winds_from_lines(line_strings)
 
-    wind_table = pandas.DataFrame.from_dict(wind_dict)
-    wind_table[raw_wind_io.WIND_SPEED_COLUMN] *= KT_TO_METRES_PER_SECOND
-    wind_table[raw_wind_io.WIND_GUST_SPEED_COLUMN] *= KT_TO_METRES_PER_SECOND
-    return _remove_invalid_wind_rows(wind_table)
+    return _winds_to_table(
+        unix_times_sec=unix_times_sec, wind_speeds_kt=wind_speeds_kt,
+        wind_directions_deg=wind_directions_deg,
+        wind_gust_speeds_kt=wind_gust_speeds_kt,
+        wind_gust_directions_deg=wind_gust_directions_deg)
 
 
 def read_5minute_winds_from_raw_file(text_file_name, utc_offset_hours):
@@ -587,40 +795,21 @@ def read_5minute_winds_from_raw_file(text_file_name, utc_offset_hours):
     error_checking.assert_file_exists(text_file_name)
     error_checking.assert_is_not_nan(utc_offset_hours)
 
-    unix_times_sec = []
-    wind_speeds_m_s01 = []
-    wind_directions_deg = []
-    wind_gust_speeds_m_s01 = []
-    wind_gust_directions_deg = []
+    line_strings = _read_lines_from_raw_file(text_file_name)
+    local_time_strings = line_strings.str.slice(
+        LOCAL_TIME_CHAR_INDICES_5MINUTE_FILE[0],
+        LOCAL_TIME_CHAR_INDICES_5MINUTE_FILE[1])
+    unix_times_sec = _local_time_strings_to_unix_sec(
+        local_time_strings.values, utc_offset_hours)
 
-    for this_line in open(text_file_name, 'r').readlines():
-        this_local_time_string = (
-            this_line[LOCAL_TIME_CHAR_INDICES_5MINUTE_FILE[0]:
-                      LOCAL_TIME_CHAR_INDICES_5MINUTE_FILE[1]])
-        this_time_unix_sec = _local_time_string_to_unix_sec(
-            this_local_time_string, utc_offset_hours)
-
-        (this_wind_speed_m_s01, this_wind_direction_deg,
-         this_wind_gust_speed_m_s01,
-         this_wind_gust_direction_deg) = _parse_5minute_wind_from_line(
-             this_line)
-
-        unix_times_sec.append(this_time_unix_sec)
-        wind_speeds_m_s01.append(this_wind_speed_m_s01)
-        wind_directions_deg.append(this_wind_direction_deg)
-        wind_gust_speeds_m_s01.append(this_wind_gust_speed_m_s01)
-        wind_gust_directions_deg.append(this_wind_gust_direction_deg)
-
-    wind_dict = {raw_wind_io.WIND_SPEED_COLUMN: wind_speeds_m_s01,
-                 raw_wind_io.WIND_DIR_COLUMN: wind_directions_deg,
-                 raw_wind_io.WIND_GUST_SPEED_COLUMN: wind_gust_speeds_m_s01,
-                 raw_wind_io.WIND_GUST_DIR_COLUMN: wind_gust_directions_deg,
-                 raw_wind_io.TIME_COLUMN: unix_times_sec}
+    (wind_speeds_kt, wind_directions_deg, wind_gust_speeds_kt,
+     wind_gust_directions_deg) = _parse_5minute_winds_from_lines(line_strings)
 
-    wind_table = pandas.DataFrame.from_dict(wind_dict)
-    wind_table[raw_wind_io.WIND_SPEED_COLUMN] *= KT_TO_METRES_PER_SECOND
-    wind_table[raw_wind_io.WIND_GUST_SPEED_COLUMN] *= KT_TO_METRES_PER_SECOND
-    return _remove_invalid_wind_rows(wind_table)
+    return _winds_to_table(
+        unix_times_sec=unix_times_sec, wind_speeds_kt=wind_speeds_kt,
+        wind_directions_deg=wind_directions_deg,
+        wind_gust_speeds_kt=wind_gust_speeds_kt,
+        wind_gust_directions_deg=wind_gust_directions_deg)
 
 
 def merge_winds_and_station_metadata(wind_table, station_metadata_table,
@@ -651,6 +840,65 @@ def merge_winds_and_station_metadata(wind_table, station_metadata_table,
                             on=raw_wind_io.STATION_ID_COLUMN, how='inner')
 
 
+def read_winds_for_many_stations(raw_file_names, station_ids,
+                                 station_metadata_table, one_minute_flag=True,
+                                 num_processes=1):
+    """Reads wind observations for many station-months.
+
+    Each raw file is read, converted to u- and v-components (with
+    `raw_wind_io.sustained_and_gust_to_uv_max`), and merged with station
+    metadata.  If num_processes > 1, files are handled in parallel by a pool of
+    worker processes.  The output table is ready to be split into hourly files
+    by `raw_wind_io.write_processed_hourly_files`, which should be called only
+    from the parent process.
+
+    N = number of raw files
+
+    :param raw_file_names: length-N list of paths to raw files (each with either
+        1-minute or 5-minute METARs for one station-month).
+    :param station_ids: length-N list of station IDs (in GewitterGefahr format,
+        e.g., "BGD_hfmetar").
+    :param station_metadata_table: pandas DataFrame created by
+        read_station_metadata_from_raw_file.
+    :param one_minute_flag: Boolean flag.  If True, raw files contain 1-minute
+        METARs.  If False, they contain 5-minute METARs.
+    :param num_processes: Number of worker processes.
+    :return: wind_table: pandas DataFrame with columns listed in
+        `raw_wind_io.write_processed_file`.
+    """
+
+    error_checking.assert_is_string_list(raw_file_names)
+    error_checking.assert_is_numpy_array(
+        numpy.asarray(raw_file_names), num_dimensions=1)
+    num_files = len(raw_file_names)
+
+    error_checking.assert_is_string_list(station_ids)
+    error_checking.assert_is_numpy_array(
+        numpy.asarray(station_ids), exact_dimensions=numpy.array([num_files]))
+    error_checking.assert_is_boolean(one_minute_flag)
+    error_checking.assert_is_integer(num_processes)
+    error_checking.assert_is_greater(num_processes, 0)
+
+    argument_lists = [
+        [raw_file_names[i], station_ids[i], station_metadata_table,
+         one_minute_flag] for i in range(num_files)]
+
+    if num_processes == 1 or num_files <= 1:
+        list_of_wind_tables = map(_read_winds_for_one_station, argument_lists)
+    else:
+        worker_pool = multiprocessing.Pool(
+            processes=min([num_processes, num_files]))
+
+        try:
+            list_of_wind_tables = worker_pool.map(
+                _read_winds_for_one_station, argument_lists)
+        finally:
+            worker_pool.close()
+            worker_pool.join()
+
+    return pandas.concat(list_of_wind_tables, axis=0, ignore_index=True)
+
+
 if __name__ == '__main__':
     # Read metadata from original text file; write to new CSV file.
     STATION_METADATA_TABLE = read_station_metadata_from_raw_file(
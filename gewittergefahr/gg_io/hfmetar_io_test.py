@@ -29,6 +29,12 @@ POSITIVE_UTC_OFFSET_HOURS_SAME_DAY = 10
 UNIX_TIME_SEC_ZERO_OFFSET = 1505443380  # 0243 UTC 15 Sep 2017
 LOCAL_TIME_STRING_ZERO_OFFSET = '201709150243'
 
+LOCAL_TIME_STRINGS_NEG_OFFSET = numpy.array(
+    [LOCAL_TIME_STRING_NEG_OFFSET_DIFF_DAYS, '201712312359', '201603010000'])
+UNIX_TIMES_SEC_NEG_OFFSET = numpy.array(
+    [UNIX_TIME_SEC_NEG_OFFSET_DIFF_DAYS, 1514782740, 1456808400], dtype=int)
+INVALID_LOCAL_TIME_STRINGS = numpy.array(['201709142143', '201702290000'])
+
 WIND_LINES_5MINUTE = [
     '24156KPIH PIH2011010100440744   0.062 N                             204'
     '    11   208   13                        ',
@@ -97,6 +103,15 @@ WIND_STRING_5MINUTE_NO_GUST_SPEED = (
     WIND_STRING_5MINUTE_PREFIX + ' AUTO 02008GKT')
 WIND_ARRAY_5MINUTE_NO_GUST_SPEED = numpy.full(4, numpy.nan)
 
+WIND_STRINGS_5MINUTE = [
+    WIND_STRING_5MINUTE_NO_AUTO_NO_GUST, WIND_STRING_5MINUTE_AUTO_WITH_GUST,
+    WIND_STRING_5MINUTE_AUTO_TOO_SHORT, WIND_STRING_5MINUTE_NO_DIR_WITH_GUST,
+    WIND_STRING_5MINUTE_NO_AUTO_WITH_GUST]
+WIND_MATRIX_5MINUTE = numpy.vstack((
+    WIND_ARRAY_5MINUTE_NO_AUTO_NO_GUST, WIND_ARRAY_5MINUTE_AUTO_WITH_GUST,
+    WIND_ARRAY_5MINUTE_AUTO_TOO_SHORT, WIND_ARRAY_5MINUTE_NO_DIR_WITH_GUST,
+    WIND_ARRAY_5MINUTE_NO_AUTO_WITH_GUST))
+
 STATION_ID = 'CYEG'
 MONTH_UNIX_SEC = 1506194267  # Sep 2017
 PATHLESS_RAW_1MINUTE_FILE_NAME = '64050CYEG201709.dat'
@@ -174,6 +189,42 @@ class HfmetarIoTests(unittest.TestCase):
             LOCAL_TIME_STRING_ZERO_OFFSET, 0)
         self.assertTrue(this_time_unix_sec == UNIX_TIME_SEC_ZERO_OFFSET)
 
+    def test_local_time_strings_to_unix_sec(self):
+        """Ensures correct output from _local_time_strings_to_unix_sec."""
+
+        these_times_unix_sec = hfmetar_io._local_time_strings_to_unix_sec(
+            LOCAL_TIME_STRINGS_NEG_OFFSET, NEGATIVE_UTC_OFFSET_HOURS_DIFF_DAYS)
+        self.assertTrue(
+            numpy.array_equal(these_times_unix_sec, UNIX_TIMES_SEC_NEG_OFFSET))
+
+    def test_local_time_strings_to_unix_sec_invalid(self):
+        """Ensures that _local_time_strings_to_unix_sec raises error.
+
+        In this case, one string is not a valid date (29 Feb 2017).
+        """
+
+        with self.assertRaises(ValueError):
+            hfmetar_io._local_time_strings_to_unix_sec(
+                INVALID_LOCAL_TIME_STRINGS, 0)
+
+    def test_parse_1minute_winds_from_lines(self):
+        """Ensures correct output from _parse_1minute_winds_from_lines."""
+
+        this_wind_matrix = numpy.transpose(numpy.vstack(
+            hfmetar_io._parse_1minute_winds_from_lines(WIND_LINES_5MINUTE)))
+        self.assertTrue(numpy.allclose(
+            this_wind_matrix, numpy.vstack(WIND_ARRAYS_5MINUTE),
+            atol=TOLERANCE, equal_nan=True))
+
+    def test_parse_5minute_winds_from_lines(self):
+        """Ensures correct output from _parse_5minute_winds_from_lines."""
+
+        this_wind_matrix = numpy.transpose(numpy.vstack(
+            hfmetar_io._parse_5minute_winds_from_lines(WIND_STRINGS_5MINUTE)))
+        self.assertTrue(numpy.allclose(
+            this_wind_matrix, WIND_MATRIX_5MINUTE, atol=TOLERANCE,
+            equal_nan=True))
+
     def test_parse_1minute_wind_from_line(self):
         """Ensures correct output from _parse_1minute_wind_from_line."""
 
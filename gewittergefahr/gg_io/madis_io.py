@@ -21,12 +21,16 @@ near-surface wind observations, listed below:
 import copy
 import os
 import os.path
+import threading
+from multiprocessing.pool import ThreadPool
 import numpy
 import pandas
+import netCDF4
 from gewittergefahr.gg_io import downloads
 from gewittergefahr.gg_io import netcdf_io
 from gewittergefahr.gg_io import raw_wind_io
 from gewittergefahr.gg_utils import time_conversion
+from gewittergefahr.gg_utils import unzipping
 from gewittergefahr.gg_utils import error_checking
 
 # TODO(thunderhoser): replace main method with named method.
@@ -53,6 +57,9 @@ TIME_FORMAT_MONTH = '%m'
 TIME_FORMAT_MONTH_YEAR = '%Y%m'
 TIME_FORMAT_DAY_OF_MONTH = '%d'
 TIME_FORMAT_HOUR = '%Y%m%d_%H00'
+HOURS_TO_SECONDS = 3600
+DAYS_TO_SECONDS = 86400
+DEFAULT_NUM_THREADS = 8
 
 LOW_QUALITY_FLAGS = ['X', 'Q', 'k', 'B']
 DEFAULT_QUALITY_FLAG = 'y'
@@ -97,6 +104,10 @@ COLUMN_NAMES_ORIG = [STATION_ID_COLUMN_ORIG, STATION_NAME_COLUMN_ORIG,
                      WIND_GUST_SPEED_FLAG_COLUMN_ORIG,
                      WIND_GUST_DIR_FLAG_COLUMN_ORIG]
 
+# The NetCDF library is not thread-safe, so raw files are opened and read by one
+# thread at a time.  Gunzipping is done outside the lock.
+_NETCDF_READ_LOCK = threading.Lock()
+
 # The following constants are used only in the main method.
 NETCDF_FILE_NAME = (
     '/localdata/ryan.lagerquist/aasswp/madis_mesonet_2011-06-08-07.netcdf')
@@ -122,16 +133,21 @@ def _char_matrix_to_string_list(char_matrix):
     M = number of strings
     N = max number of characters per string
 
-    :param char_matrix: M-by-N character matrix.
-    :return: strings: length-M list of strings.
+    :param char_matrix: M-by-N character matrix.  If the NetCDF library has
+        already converted characters to strings, this may also be a length-M
+        array of strings.
+    :return: strings: length-M list of strings, with leading and trailing
+        whitespace removed.  Trailing null characters are also removed.
     """
 
-    num_strings = char_matrix.shape[0]
-    strings = [''] * num_strings
-    for i in range(num_strings):
-        strings[i] = ''.join(char_matrix[i, :]).strip()
+    char_matrix = numpy.asarray(char_matrix)
+    if char_matrix.ndim == 1:
+        string_array = char_matrix.astype(str)
+    else:
+        string_array = netCDF4.chartostring(
+            char_matrix.astype('S1'), encoding='none')
 
-    return strings
+    return numpy.char.strip(string_array).tolist()
 
 
 def _get_online_file_name(unix_time_sec, secondary_source, protocol):
@@ -196,29 +212,19 @@ def _remove_low_quality_data(wind_table):
         [3] Quality flags (columns) are removed.
     """
 
-    is_low_quality = [f in LOW_QUALITY_FLAGS for f in
-                      wind_table[WIND_SPEED_FLAG_COLUMN].values]
-    low_quality_indices = numpy.where(is_low_quality)[0]
-    wind_table[raw_wind_io.WIND_SPEED_COLUMN].values[
-        low_quality_indices] = numpy.nan
-
-    is_low_quality = [f in LOW_QUALITY_FLAGS for f in
-                      wind_table[WIND_DIR_FLAG_COLUMN].values]
-    low_quality_indices = numpy.where(is_low_quality)[0]
-    wind_table[raw_wind_io.WIND_DIR_COLUMN].values[
-        low_quality_indices] = numpy.nan
-
-    is_low_quality = [f in LOW_QUALITY_FLAGS for f in
-                      wind_table[WIND_GUST_SPEED_FLAG_COLUMN].values]
-    low_quality_indices = numpy.where(is_low_quality)[0]
-    wind_table[raw_wind_io.WIND_GUST_SPEED_COLUMN].values[
-        low_quality_indices] = numpy.nan
-
-    is_low_quality = [f in LOW_QUALITY_FLAGS for f in
-                      wind_table[WIND_GUST_DIR_FLAG_COLUMN].values]
-    low_quality_indices = numpy.where(is_low_quality)[0]
-    wind_table[raw_wind_io.WIND_GUST_DIR_COLUMN].values[
-        low_quality_indices] = numpy.nan
+    flag_column_to_value_column = {
+        WIND_SPEED_FLAG_COLUMN: raw_wind_io.WIND_SPEED_COLUMN,
+        WIND_DIR_FLAG_COLUMN: raw_wind_io.WIND_DIR_COLUMN,
+        WIND_GUST_SPEED_FLAG_COLUMN: raw_wind_io.WIND_GUST_SPEED_COLUMN,
+        WIND_GUST_DIR_FLAG_COLUMN: raw_wind_io.WIND_GUST_DIR_COLUMN
+    }
+
+    for this_flag_column in flag_column_to_value_column:
+        these_low_quality_flags = numpy.isin(
+            numpy.asarray(wind_table[this_flag_column].values).astype(str),
+            LOW_QUALITY_FLAGS)
+        wind_table[flag_column_to_value_column[this_flag_column]].values[
+            these_low_quality_flags] = numpy.nan
 
     columns_to_drop = [WIND_SPEED_FLAG_COLUMN, WIND_DIR_FLAG_COLUMN,
                        WIND_GUST_SPEED_FLAG_COLUMN, WIND_GUST_DIR_FLAG_COLUMN]
@@ -230,6 +236,112 @@ def _remove_low_quality_data(wind_table):
                         axis=1)]
 
 
+def _read_variables_from_raw_file(netcdf_dataset, secondary_source):
+    """Reads wind observations from open raw file.
+
+    The caller should hold _NETCDF_READ_LOCK.
+
+    :param netcdf_dataset: Instance of `netCDF4.Dataset`, opened by
+        `netcdf_io.open_netcdf`.
+    :param secondary_source: String ID for secondary data source.
+    :return: wind_dict: Dictionary with columns listed in
+        read_winds_from_raw_file, plus quality flags.
+    """
+
+    station_names = _char_matrix_to_string_list(
+        netcdf_dataset.variables[STATION_NAME_COLUMN_ORIG][:])
+
+    try:
+        station_ids = _char_matrix_to_string_list(
+            netcdf_dataset.variables[STATION_ID_COLUMN_ORIG][:])
+    except KeyError:
+        station_ids = station_names
+
+    station_id_suffix = raw_wind_io.append_source_to_station_id(
+        '', primary_source=raw_wind_io.MADIS_DATA_SOURCE,
+        secondary_source=secondary_source)
+    station_ids = numpy.char.add(
+        numpy.array(station_ids, dtype=str), station_id_suffix).tolist()
+
+    try:
+        unix_times_sec = netcdf_dataset.variables[TIME_COLUMN_ORIG][:]
+    except KeyError:
+        unix_times_sec = netcdf_dataset.variables[TIME_COLUMN_ORIG_BACKUP][:]
+
+    wind_speeds_m_s01 = netcdf_dataset.variables[WIND_SPEED_COLUMN_ORIG][:]
+    wind_speed_quality_flags = netcdf_dataset.variables[
+        WIND_SPEED_FLAG_COLUMN_ORIG][:]
+    num_observations = len(wind_speeds_m_s01)
+
+    try:
+        wind_directions_deg = netcdf_dataset.variables[WIND_DIR_COLUMN_ORIG][:]
+        wind_dir_quality_flags = netcdf_dataset.variables[
+            WIND_DIR_FLAG_COLUMN_ORIG][:]
+    except KeyError:
+        wind_directions_deg = numpy.full(num_observations, numpy.nan)
+        wind_dir_quality_flags = [DEFAULT_QUALITY_FLAG] * num_observations
+
+    try:
+        wind_gust_speeds_m_s01 = netcdf_dataset.variables[
+            WIND_GUST_SPEED_COLUMN_ORIG][:]
+        wind_gust_speed_quality_flags = netcdf_dataset.variables[
+            WIND_GUST_SPEED_FLAG_COLUMN_ORIG][:]
+    except KeyError:
+        wind_gust_speeds_m_s01 = numpy.full(num_observations, numpy.nan)
+        wind_gust_speed_quality_flags = (
+            [DEFAULT_QUALITY_FLAG] * num_observations)
+
+    try:
+        wind_gust_directions_deg = netcdf_dataset.variables[
+            WIND_GUST_DIR_COLUMN_ORIG][:]
+        wind_gust_dir_quality_flags = netcdf_dataset.variables[
+            WIND_GUST_DIR_FLAG_COLUMN_ORIG][:]
+    except KeyError:
+        wind_gust_directions_deg = numpy.full(num_observations, numpy.nan)
+        wind_gust_dir_quality_flags = [DEFAULT_QUALITY_FLAG] * num_observations
+
+    wind_dict = {raw_wind_io.STATION_ID_COLUMN: station_ids,
+                 raw_wind_io.STATION_NAME_COLUMN: station_names,
+                 raw_wind_io.LATITUDE_COLUMN: netcdf_dataset.variables[
+                     LATITUDE_COLUMN_ORIG][:],
+                 raw_wind_io.LONGITUDE_COLUMN: netcdf_dataset.variables[
+                     LONGITUDE_COLUMN_ORIG][:],
+                 raw_wind_io.ELEVATION_COLUMN: netcdf_dataset.variables[
+                     ELEVATION_COLUMN_ORIG][:],
+                 raw_wind_io.TIME_COLUMN: numpy.array(unix_times_sec).astype(
+                     int),
+                 raw_wind_io.WIND_SPEED_COLUMN: wind_speeds_m_s01,
+                 raw_wind_io.WIND_DIR_COLUMN: wind_directions_deg,
+                 raw_wind_io.WIND_GUST_SPEED_COLUMN: wind_gust_speeds_m_s01,
+                 raw_wind_io.WIND_GUST_DIR_COLUMN: wind_gust_directions_deg,
+                 WIND_SPEED_FLAG_COLUMN: wind_speed_quality_flags,
+                 WIND_DIR_FLAG_COLUMN: wind_dir_quality_flags,
+                 WIND_GUST_SPEED_FLAG_COLUMN: wind_gust_speed_quality_flags,
+                 WIND_GUST_DIR_FLAG_COLUMN: wind_gust_dir_quality_flags}
+
+    return wind_dict
+
+
+def _wind_dict_to_table(wind_dict):
+    """Converts dictionary of wind observations to pandas DataFrame.
+
+    Arrays are converted to native byte order first (see
+    `netcdf_io.to_native_byte_order`), since pandas cannot handle big-endian
+    arrays.
+
+    :param wind_dict: Dictionary created by _read_variables_from_raw_file.
+    :return: wind_table: pandas DataFrame, where each column is one key in
+        `wind_dict`.
+    """
+
+    for this_key in wind_dict:
+        if isinstance(wind_dict[this_key], numpy.ndarray):
+            wind_dict[this_key] = netcdf_io.to_native_byte_order(
+                wind_dict[this_key])
+
+    return pandas.DataFrame.from_dict(wind_dict)
+
+
 def _get_pathless_raw_file_name(unix_time_sec):
     """Generates pathless name for raw MADIS file.
 
@@ -331,6 +443,75 @@ def download_raw_file(
         raise_error_if_fails=raise_error_if_fails)[0]
 
 
+def download_raw_files(
+        unix_times_sec, secondary_source, top_local_directory_name, protocol,
+        user_name=None, password=None, num_threads=DEFAULT_NUM_THREADS,
+        raise_error_if_fails=True):
+    """Downloads many raw files concurrently from either FTP or HTTP server.
+
+    Unlike calling `download_raw_file` in a loop, this method reuses one
+    connection (or one FTP login) for many files, downloads files in parallel,
+    skips files that are already up to date on the local machine, and resumes
+    partial downloads.
+
+    N = number of files
+
+    :param unix_times_sec: length-N numpy array of valid times.
+    :param secondary_source: See doc for `download_raw_file`.
+    :param top_local_directory_name: Same.
+    :param protocol: Same.
+    :param user_name: Same.
+    :param password: Same.
+    :param num_threads: Number of files to download at once.
+    :param raise_error_if_fails: Boolean flag.  If True and any download fails,
+        this method will raise an error (after trying all files).
+    :return: local_gzip_file_names: length-N list of local paths.  If a download
+        failed but raise_error_if_fails = False, the corresponding element is
+        None.
+    :raises: ValueError: if protocol is neither "ftp" nor "http".
+    """
+
+    error_checking.assert_is_string(protocol)
+    if protocol not in ['ftp', 'http']:
+        error_string = (
+            'Protocol should be either "ftp" or "http", not "{0:s}"'.format(
+                protocol))
+        raise ValueError(error_string)
+
+    error_checking.assert_is_integer_numpy_array(unix_times_sec)
+    error_checking.assert_is_numpy_array(unix_times_sec, num_dimensions=1)
+    raw_wind_io.check_data_sources(
+        raw_wind_io.MADIS_DATA_SOURCE, secondary_source)
+
+    online_file_names = [
+        _get_online_file_name(
+            unix_time_sec=t, secondary_source=secondary_source,
+            protocol=protocol)
+        for t in unix_times_sec]
+    if protocol == 'ftp':
+        online_file_names = [
+            'ftp://{0:s}/{1:s}'.format(FTP_SERVER_NAME, f)
+            for f in online_file_names]
+
+    local_gzip_file_names = [
+        find_local_raw_file(
+            unix_time_sec=t, secondary_source=secondary_source,
+            top_directory_name=top_local_directory_name,
+            raise_error_if_missing=False)
+        for t in unix_times_sec]
+
+    manifest_table = downloads.download_files(
+        online_file_names=online_file_names,
+        local_file_names=local_gzip_file_names, user_name=user_name,
+        password=password, num_threads=num_threads,
+        raise_error_if_fails=raise_error_if_fails)
+
+    success_flags = manifest_table[downloads.STATUS_COLUMN].isin(
+        downloads.SUCCESS_STATUSES).values
+    return [local_gzip_file_names[i] if success_flags[i] else None
+            for i in range(len(local_gzip_file_names))]
+
+
 def read_winds_from_raw_file(netcdf_file_name, secondary_source=None,
                              raise_error_if_fails=True):
     """Reads wind observations from raw file.
@@ -363,85 +544,137 @@ def read_winds_from_raw_file(netcdf_file_name, secondary_source=None,
     """
 
     error_checking.assert_file_exists(netcdf_file_name)
-    netcdf_dataset = netcdf_io.open_netcdf(netcdf_file_name,
-                                           raise_error_if_fails)
-    if netcdf_dataset is None:
-        return None
 
-    station_names = _char_matrix_to_string_list(
-        netcdf_dataset.variables[STATION_NAME_COLUMN_ORIG][:])
+    netcdf_contents = None
+    label_file_name = netcdf_file_name
+    if netcdf_file_name.endswith(netcdf_io.GZIP_FILE_EXTENSION):
+        try:
+            netcdf_contents = unzipping.read_gzip_file(netcdf_file_name)
+        except IOError:
+            if raise_error_if_fails:
+                raise
+            return None
+
+        label_file_name = netcdf_file_name[
+            :-len(netcdf_io.GZIP_FILE_EXTENSION)]
+
+    with _NETCDF_READ_LOCK:
+        netcdf_dataset = netcdf_io.open_netcdf(
+            label_file_name, raise_error_if_fails,
+            netcdf_contents=netcdf_contents)
+        if netcdf_dataset is None:
+            return None
+
+        try:
+            wind_dict = _read_variables_from_raw_file(
+                netcdf_dataset, secondary_source)
+        finally:
+            netcdf_dataset.close()
+
+    wind_table = _wind_dict_to_table(wind_dict)
+    wind_table = _remove_invalid_wind_rows(wind_table)
+    return _remove_low_quality_data(wind_table)
 
-    try:
-        station_ids = _char_matrix_to_string_list(
-            netcdf_dataset.variables[STATION_ID_COLUMN_ORIG][:])
-    except KeyError:
-        station_ids = station_names
 
-    for i in range(len(station_ids)):
-        station_ids[i] = raw_wind_io.append_source_to_station_id(
-            station_ids[i], primary_source=raw_wind_io.MADIS_DATA_SOURCE,
-            secondary_source=secondary_source)
+def _read_winds_from_one_file(argument_list):
+    """Reads wind observations from one raw file.
 
-    try:
-        unix_times_sec = netcdf_dataset.variables[TIME_COLUMN_ORIG][:]
-    except KeyError:
-        unix_times_sec = netcdf_dataset.variables[TIME_COLUMN_ORIG_BACKUP][:]
+    This method is called by read_winds_for_one_day, possibly in a worker
+    thread, so it takes one argument list rather than keyword arguments.
 
-    wind_speeds_m_s01 = netcdf_dataset.variables[WIND_SPEED_COLUMN_ORIG][:]
-    wind_speed_quality_flags = netcdf_dataset.variables[
-        WIND_SPEED_FLAG_COLUMN_ORIG][:]
-    num_observations = len(wind_speeds_m_s01)
+    :param argument_list: List with the following elements.
+    argument_list[0]: Path to raw file.
+    argument_list[1]: String ID for secondary data source.
+    argument_list[2]: Boolean flag (see `raise_error_if_fails` in
+        read_winds_from_raw_file).
+    :return: wind_table: pandas DataFrame created by read_winds_from_raw_file.
+        If file cannot be read and argument_list[2] = False, this is None.
+    """
 
-    try:
-        wind_directions_deg = netcdf_dataset.variables[WIND_DIR_COLUMN_ORIG][:]
-        wind_dir_quality_flags = netcdf_dataset.variables[
-            WIND_DIR_FLAG_COLUMN_ORIG][:]
-    except KeyError:
-        wind_directions_deg = numpy.full(num_observations, numpy.nan)
-        wind_dir_quality_flags = [DEFAULT_QUALITY_FLAG] * num_observations
+    return read_winds_from_raw_file(
+        argument_list[0], secondary_source=argument_list[1],
+        raise_error_if_fails=argument_list[2])
+
+
+def read_winds_for_one_day(
+        day_unix_sec, top_directory_name, secondary_sources=None,
+        num_threads=DEFAULT_NUM_THREADS, raise_error_if_missing=False):
+    """Reads wind observations from all hourly files in one day.
+
+    Files (one for each hour and secondary source) are read concurrently by a
+    pool of threads.  Decompressing the gzip files (most of the work) is done
+    outside the Python interpreter, so threads are enough to overlap it.  The
+    NetCDF library is not thread-safe, so opening and reading the decompressed
+    files is done by one thread at a time.
+
+    :param day_unix_sec: Any time in the day (the day runs from 000000-235959
+        UTC).
+    :param top_directory_name: Name of top-level directory with raw MADIS files
+        (see find_local_raw_file).
+    :param secondary_sources: 1-D list of secondary data sources.  If None, will
+        use all sources in `raw_wind_io.SECONDARY_DATA_SOURCES`.
+    :param num_threads: Number of threads used to read files.
+    :param raise_error_if_missing: Boolean flag.  If True and any file is
+        missing or unreadable, this method will raise an error.  If False, such
+        files will be skipped.
+    :return: wind_table: pandas DataFrame with columns listed in
+        read_winds_from_raw_file (after quality control).  If no files could be
+        read, this is None.
+    """
 
-    try:
-        wind_gust_speeds_m_s01 = netcdf_dataset.variables[
-            WIND_GUST_SPEED_COLUMN_ORIG][:]
-        wind_gust_speed_quality_flags = netcdf_dataset.variables[
-            WIND_GUST_SPEED_FLAG_COLUMN_ORIG][:]
-    except KeyError:
-        wind_gust_speeds_m_s01 = numpy.full(num_observations, numpy.nan)
-        wind_gust_speed_quality_flags = (
-            [DEFAULT_QUALITY_FLAG] * num_observations)
+    error_checking.assert_is_integer(day_unix_sec)
+    if secondary_sources is None:
+        secondary_sources = copy.deepcopy(raw_wind_io.SECONDARY_DATA_SOURCES)
 
-    try:
-        wind_gust_directions_deg = netcdf_dataset.variables[
-            WIND_GUST_DIR_COLUMN_ORIG][:]
-        wind_gust_dir_quality_flags = netcdf_dataset.variables[
-            WIND_GUST_DIR_FLAG_COLUMN_ORIG][:]
-    except KeyError:
-        wind_gust_directions_deg = numpy.full(num_observations, numpy.nan)
-        wind_gust_dir_quality_flags = [DEFAULT_QUALITY_FLAG] * num_observations
+    error_checking.assert_is_string_list(secondary_sources)
+    error_checking.assert_is_numpy_array(
+        numpy.asarray(secondary_sources), num_dimensions=1)
+    error_checking.assert_is_integer(num_threads)
+    error_checking.assert_is_greater(num_threads, 0)
+    error_checking.assert_is_boolean(raise_error_if_missing)
 
-    wind_dict = {raw_wind_io.STATION_ID_COLUMN: station_ids,
-                 raw_wind_io.STATION_NAME_COLUMN: station_names,
-                 raw_wind_io.LATITUDE_COLUMN: netcdf_dataset.variables[
-                     LATITUDE_COLUMN_ORIG][:],
-                 raw_wind_io.LONGITUDE_COLUMN: netcdf_dataset.variables[
-                     LONGITUDE_COLUMN_ORIG][:],
-                 raw_wind_io.ELEVATION_COLUMN: netcdf_dataset.variables[
-                     ELEVATION_COLUMN_ORIG][:],
-                 raw_wind_io.TIME_COLUMN: numpy.array(unix_times_sec).astype(
-                     int),
-                 raw_wind_io.WIND_SPEED_COLUMN: wind_speeds_m_s01,
-                 raw_wind_io.WIND_DIR_COLUMN: wind_directions_deg,
-                 raw_wind_io.WIND_GUST_SPEED_COLUMN: wind_gust_speeds_m_s01,
-                 raw_wind_io.WIND_GUST_DIR_COLUMN: wind_gust_directions_deg,
-                 WIND_SPEED_FLAG_COLUMN: wind_speed_quality_flags,
-                 WIND_DIR_FLAG_COLUMN: wind_dir_quality_flags,
-                 WIND_GUST_SPEED_FLAG_COLUMN: wind_gust_speed_quality_flags,
-                 WIND_GUST_DIR_FLAG_COLUMN: wind_gust_dir_quality_flags}
+    first_hour_unix_sec = day_unix_sec - numpy.mod(
+        day_unix_sec, DAYS_TO_SECONDS)
+    hours_unix_sec = numpy.linspace(
+        first_hour_unix_sec, first_hour_unix_sec + DAYS_TO_SECONDS -
+        HOURS_TO_SECONDS, num=DAYS_TO_SECONDS // HOURS_TO_SECONDS, dtype=int)
+
+    argument_lists = []
+    for this_secondary_source in secondary_sources:
+        for this_hour_unix_sec in hours_unix_sec:
+            this_file_name = find_local_raw_file(
+                unix_time_sec=this_hour_unix_sec,
+                secondary_source=this_secondary_source,
+                top_directory_name=top_directory_name,
+                raise_error_if_missing=raise_error_if_missing)
+            if not os.path.isfile(this_file_name):
+                continue
+
+            argument_lists.append(
+                [this_file_name, this_secondary_source,
+                 raise_error_if_missing])
+
+    if not argument_lists:
+        return None
 
-    netcdf_dataset.close()
-    wind_table = pandas.DataFrame.from_dict(wind_dict)
-    wind_table = _remove_invalid_wind_rows(wind_table)
-    return _remove_low_quality_data(wind_table)
+    if num_threads == 1 or len(argument_lists) == 1:
+        list_of_wind_tables = map(_read_winds_from_one_file, argument_lists)
+    else:
+        thread_pool = ThreadPool(
+            processes=min([num_threads, len(argument_lists)]))
+
+        try:
+            list_of_wind_tables = thread_pool.map(
+                _read_winds_from_one_file, argument_lists)
+        finally:
+            thread_pool.close()
+            thread_pool.join()
+
+    list_of_wind_tables = [t for t in list_of_wind_tables if t is not None]
+    if not list_of_wind_tables:
+        return None
+
+    return pandas.concat(list_of_wind_tables, axis=0, ignore_index=True)
 
 
 if __name__ == '__main__':
@@ -1,9 +1,13 @@
 """Unit tests for madis_io.py."""
 
 import copy
+import gzip
+import shutil
+import tempfile
 import unittest
 import numpy
 import pandas
+import netCDF4
 from gewittergefahr.gg_io import raw_wind_io
 from gewittergefahr.gg_io import madis_io
 from gewittergefahr.gg_utils import longitude_conversion as lng_conversion
@@ -17,6 +21,8 @@ CHAR_MATRIX = numpy.array([['f', 'o', 'o', 'b', 'a', 'r'],
                            ['h', 'a', 'l', ' ', ' ', ' '],
                            ['p', ' ', 'o', 'o', ' ', 'p']])
 STRING_LIST = ['foobar', 'foo', 'moo', 'hal', 'p oo p']
+STRING_ARRAY_UNSTRIPPED = numpy.array(
+    ['foobar', 'foo   ', ' moo', 'hal\x00\x00', 'p oo p'])
 
 UNIX_TIME_SEC = 1506127260  # 0041 UTC 23 Sep 2017
 PATHLESS_FILE_NAME = '20170923_0000.gz'
@@ -169,6 +175,98 @@ FLAG_COLUMNS = [madis_io.WIND_SPEED_FLAG_COLUMN, madis_io.WIND_DIR_FLAG_COLUMN,
                 madis_io.WIND_GUST_DIR_FLAG_COLUMN]
 WIND_TABLE_NO_LOW_QUALITY_DATA.drop(FLAG_COLUMNS, axis=1, inplace=True)
 
+# The following constants are used to test read_winds_from_raw_file.
+RAW_STATION_IDS = ['ST01', 'ST02', 'ST03']
+RAW_LATITUDES_DEG = numpy.array([35., 36., 37.])
+RAW_LONGITUDES_DEG = numpy.array([-97., -98., -99.])
+RAW_ELEVATIONS_M_ASL = numpy.array([300., 350., 400.])
+RAW_WIND_SPEEDS_M_S01 = numpy.array([5., 10., 15.])
+RAW_WIND_DIRECTIONS_DEG = numpy.array([90., 180., 270.])
+RAW_TIMES_UNIX_SEC = numpy.array([1506127260, 1506127320, 1506127380])
+RAW_QUALITY_FLAG = 'V'
+
+# The following constants are used to test _wind_dict_to_table.
+BIG_ENDIAN_WIND_DICT = {
+    raw_wind_io.STATION_ID_COLUMN: RAW_STATION_IDS,
+    raw_wind_io.STATION_NAME_COLUMN: RAW_STATION_IDS,
+    raw_wind_io.LATITUDE_COLUMN: numpy.ma.array(
+        RAW_LATITUDES_DEG, dtype='>f4'),
+    raw_wind_io.LONGITUDE_COLUMN: numpy.ma.array(
+        RAW_LONGITUDES_DEG, dtype='>f4'),
+    raw_wind_io.ELEVATION_COLUMN: numpy.ma.array(
+        RAW_ELEVATIONS_M_ASL, dtype='>f4'),
+    raw_wind_io.TIME_COLUMN: RAW_TIMES_UNIX_SEC,
+    raw_wind_io.WIND_SPEED_COLUMN: numpy.ma.array(
+        RAW_WIND_SPEEDS_M_S01, dtype='>f4'),
+    raw_wind_io.WIND_DIR_COLUMN: numpy.ma.array(
+        RAW_WIND_DIRECTIONS_DEG, dtype='>f4'),
+    raw_wind_io.WIND_GUST_SPEED_COLUMN: numpy.ma.array(
+        RAW_WIND_SPEEDS_M_S01, dtype='>f4'),
+    raw_wind_io.WIND_GUST_DIR_COLUMN: numpy.ma.array(
+        RAW_WIND_DIRECTIONS_DEG, dtype='>f4'),
+    madis_io.WIND_SPEED_FLAG_COLUMN: [RAW_QUALITY_FLAG] * 3,
+    madis_io.WIND_DIR_FLAG_COLUMN: [RAW_QUALITY_FLAG] * 3,
+    madis_io.WIND_GUST_SPEED_FLAG_COLUMN: [RAW_QUALITY_FLAG] * 3,
+    madis_io.WIND_GUST_DIR_FLAG_COLUMN: [RAW_QUALITY_FLAG] * 3
+}
+
+
+def _write_classic_raw_file(netcdf_file_name):
+    """Writes raw file in classic (NetCDF-3) format, then gzips it.
+
+    :param netcdf_file_name: Path to output file (without ".gz").
+    :return: gzip_file_name: Path to gzipped file.
+    """
+
+    num_observations = len(RAW_STATION_IDS)
+    num_characters = len(RAW_STATION_IDS[0])
+
+    netcdf_dataset = netCDF4.Dataset(
+        netcdf_file_name, 'w', format='NETCDF3_CLASSIC')
+    netcdf_dataset.createDimension('recNum', num_observations)
+    netcdf_dataset.createDimension('maxStaIdLen', num_characters)
+
+    for this_column in [madis_io.STATION_ID_COLUMN_ORIG,
+                        madis_io.STATION_NAME_COLUMN_ORIG]:
+        this_variable = netcdf_dataset.createVariable(
+            this_column, 'S1', ('recNum', 'maxStaIdLen'))
+        this_variable[:] = numpy.array([list(s) for s in RAW_STATION_IDS])
+
+    this_column_to_values = {
+        madis_io.LATITUDE_COLUMN_ORIG: RAW_LATITUDES_DEG,
+        madis_io.LONGITUDE_COLUMN_ORIG: RAW_LONGITUDES_DEG,
+        madis_io.ELEVATION_COLUMN_ORIG: RAW_ELEVATIONS_M_ASL,
+        madis_io.WIND_SPEED_COLUMN_ORIG: RAW_WIND_SPEEDS_M_S01,
+        madis_io.WIND_DIR_COLUMN_ORIG: RAW_WIND_DIRECTIONS_DEG,
+        madis_io.WIND_GUST_SPEED_COLUMN_ORIG: RAW_WIND_SPEEDS_M_S01,
+        madis_io.WIND_GUST_DIR_COLUMN_ORIG: RAW_WIND_DIRECTIONS_DEG
+    }
+    for this_column in this_column_to_values:
+        this_variable = netcdf_dataset.createVariable(
+            this_column, 'f4', ('recNum',))
+        this_variable[:] = this_column_to_values[this_column]
+
+    this_variable = netcdf_dataset.createVariable(
+        madis_io.TIME_COLUMN_ORIG, 'f8', ('recNum',))
+    this_variable[:] = RAW_TIMES_UNIX_SEC
+
+    for this_column in [madis_io.WIND_SPEED_FLAG_COLUMN_ORIG,
+                        madis_io.WIND_DIR_FLAG_COLUMN_ORIG,
+                        madis_io.WIND_GUST_SPEED_FLAG_COLUMN_ORIG,
+                        madis_io.WIND_GUST_DIR_FLAG_COLUMN_ORIG]:
+        this_variable = netcdf_dataset.createVariable(
+            this_column, 'S1', ('recNum',))
+        this_variable[:] = numpy.array([RAW_QUALITY_FLAG] * num_observations)
+    netcdf_dataset.close()
+
+    gzip_file_name = netcdf_file_name + madis_io.RAW_FILE_EXTENSION
+    with open(netcdf_file_name, 'rb') as netcdf_file_handle:
+        gzip_file_handle = gzip.open(gzip_file_name, 'wb')
+        gzip_file_handle.write(netcdf_file_handle.read())
+        gzip_file_handle.close()
+
+    return gzip_file_name
+
 
 class MadisIoTests(unittest.TestCase):
     """Each method is a unit test for madis_io.py."""
@@ -187,6 +285,63 @@ class MadisIoTests(unittest.TestCase):
         for i in range(len(string_list)):
             self.assertTrue(string_list[i] == STRING_LIST[i])
 
+    def test_char_matrix_to_string_list_1d(self):
+        """Ensures correct output from _char_matrix_to_string_list.
+
+        In this case, input is already an array of strings.
+        """
+
+        string_list = madis_io._char_matrix_to_string_list(
+            STRING_ARRAY_UNSTRIPPED)
+        self.assertTrue(string_list == STRING_LIST)
+
+    def test_wind_dict_to_table_big_endian(self):
+        """Ensures correct output from _wind_dict_to_table.
+
+        In this case, some arrays are big-endian (as sometimes returned by the
+        NetCDF library for a classic-format file opened in memory).
+        """
+
+        this_wind_table = madis_io._wind_dict_to_table(
+            copy.deepcopy(BIG_ENDIAN_WIND_DICT))
+        self.assertTrue(all([
+            this_wind_table[c].values.dtype.isnative
+            for c in this_wind_table.columns]))
+
+        this_wind_table = madis_io._remove_low_quality_data(this_wind_table)
+        self.assertTrue(numpy.allclose(
+            this_wind_table[raw_wind_io.LATITUDE_COLUMN].values,
+            RAW_LATITUDES_DEG))
+
+    def test_read_winds_from_raw_file_classic(self):
+        """Ensures correct output from read_winds_from_raw_file.
+
+        In this case, the file is gzipped and in classic (NetCDF-3) format, so
+        it is opened in memory.
+        """
+
+        this_directory_name = tempfile.mkdtemp()
+
+        try:
+            this_file_name = _write_classic_raw_file(
+                '{0:s}/{1:s}'.format(
+                    this_directory_name,
+                    PATHLESS_FILE_NAME[:-len(madis_io.RAW_FILE_EXTENSION)]))
+
+            this_wind_table = madis_io.read_winds_from_raw_file(
+                this_file_name,
+                secondary_source=SECONDARY_DATA_SOURCE_NON_LDAD,
+                raise_error_if_fails=True)
+
+            self.assertTrue(numpy.allclose(
+                this_wind_table[raw_wind_io.LATITUDE_COLUMN].values,
+                RAW_LATITUDES_DEG))
+            self.assertTrue(numpy.allclose(
+                this_wind_table[raw_wind_io.WIND_SPEED_COLUMN].values,
+                RAW_WIND_SPEEDS_M_S01))
+        finally:
+            shutil.rmtree(this_directory_name)
+
     def test_get_online_file_name_ftp_ldad(self):
         """Ensures correct output from _get_online_file_name.
 
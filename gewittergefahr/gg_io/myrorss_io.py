@@ -28,30 +28,21 @@ DEFAULT_REFL_HEIGHTS_TO_REMOVE_M_AGL = radar_io.get_valid_heights_for_field(
     radar_io.REFL_NAME, data_source=radar_io.MYRORSS_SOURCE_ID)
 
 
-def unzip_1day_tar_file(
-        tar_file_name, field_names, spc_date_string, top_target_directory_name,
-        refl_heights_m_agl=None):
-    """Unzips 1-day tar file (containing raw MYRORSS data for one SPC date).
+def _get_relative_dirs_for_1day_tar(field_names, refl_heights_m_agl=None):
+    """Returns relative directories (inside 1-day tar file) for radar fields.
 
-    :param tar_file_name: Path to input file.
-    :param field_names: 1-D list with names of radar fields.
-    :param spc_date_string: SPC date (format "yyyymmdd").
-    :param top_target_directory_name: Name of top-level directory for unzipped
-        MYRORSS files.  This method will create a subdirectory therein for the
-        SPC date.
-    :param refl_heights_m_agl: 1-D integer numpy array of reflectivity heights
-        (metres above ground level).
-    :return: target_directory_name: Path to output directory.
+    :param field_names: See doc for unzip_1day_tar_file.
+    :param refl_heights_m_agl: Same.
+    :return: relative_directory_names: 1-D list of relative paths inside tar
+        file.
     """
 
     error_checking.assert_is_string_list(field_names)
     error_checking.assert_is_numpy_array(
         numpy.asarray(field_names), num_dimensions=1)
-    error_checking.assert_is_string(top_target_directory_name)
 
     # Put ignorable radar fields (ones that are allowed to be missing) at the
-    # end.  This way, if the tar command errors out due to missing data, it will
-    # do so after unzipping all the non-missing data.
+    # end, so that warnings about missing data come after the other fields.
     field_names_removed = []
     for this_field_name in IGNORABLE_RADAR_FIELD_NAMES:
         if this_field_name in field_names:
@@ -65,28 +56,100 @@ def unzip_1day_tar_file(
         field_names, refl_heights_m_agl=refl_heights_m_agl,
         data_source=radar_io.MYRORSS_SOURCE_ID)
 
-    target_directory_name = '{0:s}/{1:s}'.format(
-        top_target_directory_name, spc_date_string)
     field_names = field_to_heights_dict_m_agl.keys()
-    directory_names_to_unzip = []
+    relative_directory_names = []
 
     for this_field_name in field_names:
         these_heights_m_agl = field_to_heights_dict_m_agl[this_field_name]
 
         for this_height_m_agl in these_heights_m_agl:
-            directory_names_to_unzip.append(
+            relative_directory_names.append(
                 radar_io.get_relative_dir_for_raw_files(
                     field_name=this_field_name, height_m_agl=this_height_m_agl,
                     data_source=radar_io.MYRORSS_SOURCE_ID))
 
+    return relative_directory_names
+
+
+def unzip_1day_tar_file(
+        tar_file_name, field_names, spc_date_string, top_target_directory_name,
+        refl_heights_m_agl=None, num_threads=unzipping.DEFAULT_NUM_THREADS):
+    """Unzips 1-day tar file (containing raw MYRORSS data for one SPC date).
+
+    :param tar_file_name: Path to input file.
+    :param field_names: 1-D list with names of radar fields.
+    :param spc_date_string: SPC date (format "yyyymmdd").
+    :param top_target_directory_name: Name of top-level directory for unzipped
+        MYRORSS files.  This method will create a subdirectory therein for the
+        SPC date.
+    :param refl_heights_m_agl: 1-D integer numpy array of reflectivity heights
+        (metres above ground level).
+    :param num_threads: Number of threads used to unzip files (see doc for
+        `unzipping.unzip_tar`).
+    :return: target_directory_name: Path to output directory.
+    """
+
+    error_checking.assert_is_string(top_target_directory_name)
+    directory_names_to_unzip = _get_relative_dirs_for_1day_tar(
+        field_names, refl_heights_m_agl=refl_heights_m_agl)
+
+    target_directory_name = '{0:s}/{1:s}'.format(
+        top_target_directory_name, spc_date_string)
     unzipping.unzip_tar(
         tar_file_name,
         target_directory_name=target_directory_name,
-        file_and_dir_names_to_unzip=directory_names_to_unzip)
+        file_and_dir_names_to_unzip=directory_names_to_unzip,
+        num_threads=num_threads)
 
     return target_directory_name
 
 
+def read_sparse_grids_from_1day_tar_file(
+        tar_file_name, field_names, refl_heights_m_agl=None,
+        num_threads=unzipping.DEFAULT_NUM_THREADS):
+    """Reads sparse radar grids directly from 1-day tar file.
+
+    This is an alternative to unzip_1day_tar_file, followed by
+    `radar_io.read_data_from_sparse_grid_file` for each unzipped file.  Files
+    are read from the tar file into memory (see `unzipping.read_tar_members`)
+    and never written to disk.
+
+    :param tar_file_name: Path to input file.
+    :param field_names: See doc for unzip_1day_tar_file.
+    :param refl_heights_m_agl: Same.
+    :param num_threads: Number of threads used to unzip files (see doc for
+        `unzipping.read_tar_members`).
+    :return: relative_file_name: Relative path of file inside the tar file
+        (without ".gz" at the end).
+    :return: metadata_dict: Dictionary created by
+        `radar_io.read_metadata_from_raw_file`.
+    :return: sparse_grid_table: pandas DataFrame created by
+        `radar_io.read_data_from_sparse_grid_file`.
+
+    This is a generator, yielding one set of outputs (one file) at a time, in
+    the order that files appear in the tar file.
+    """
+
+    directory_names_to_read = _get_relative_dirs_for_1day_tar(
+        field_names, refl_heights_m_agl=refl_heights_m_agl)
+
+    for this_file_name, this_file_contents in unzipping.read_tar_members(
+            tar_file_name, file_and_dir_names_to_read=directory_names_to_read,
+            unzip_gzip_members=True, num_threads=num_threads):
+        this_metadata_dict = radar_io.read_metadata_from_raw_file(
+            this_file_name, data_source=radar_io.MYRORSS_SOURCE_ID,
+            netcdf_contents=this_file_contents)
+
+        this_sparse_grid_table = radar_io.read_data_from_sparse_grid_file(
+            this_file_name,
+            field_name_orig=this_metadata_dict[radar_io.FIELD_NAME_COLUMN_ORIG],
+            data_source=radar_io.MYRORSS_SOURCE_ID,
+            sentinel_values=this_metadata_dict[radar_io.SENTINEL_VALUE_COLUMN],
+            netcdf_contents=this_file_contents)
+
+        yield this_file_name, this_metadata_dict, this_sparse_grid_table
+
+
 def remove_unzipped_data_1day(
         spc_date_string, top_directory_name,
         field_names=DEFAULT_FIELDS_TO_REMOVE,
@@ -1,24 +1,46 @@
 """IO methods for NetCDF files."""
 
-import os
 import gzip
-import shutil
-import tempfile
+from io import BytesIO
+import numpy
 from netCDF4 import Dataset
 from gewittergefahr.gg_utils import error_checking
 
 GZIP_FILE_EXTENSION = '.gz'
 
 
-def open_netcdf(netcdf_file_name, raise_error_if_fails=False):
+def to_native_byte_order(input_array):
+    """Converts numpy array to native byte order.
+
+    :param input_array: numpy array (may be masked).
+    :return: output_array: Same as input, but in native byte order.  If the
+        input is already in native byte order, this is the input itself.
+    """
+
+    input_array = numpy.asanyarray(input_array)
+    if input_array.dtype.isnative:
+        return input_array
+
+    return input_array.astype(input_array.dtype.newbyteorder('='))
+
+
+def open_netcdf(netcdf_file_name, raise_error_if_fails=False,
+                netcdf_contents=None):
     """Attempts to open NetCDF file.
 
-    Code for handling gzip files comes from jochen at the following
-    StackOverflow page: https://stackoverflow.com/posts/45356133/revisions
+    If the file is gzipped, it is unzipped into memory (not to a temporary
+    file) and opened with the in-memory mode of `netCDF4.Dataset`.  For
+    classic-format (NetCDF-3) files, in-memory mode sometimes returns
+    big-endian arrays, which pandas cannot handle.  Arrays that will be put in
+    a pandas DataFrame should therefore go through `to_native_byte_order`.
 
     :param netcdf_file_name: Path to input file.
     :param raise_error_if_fails: Boolean flag.  If raise_error_if_fails = True
         and file cannot be opened, this method will throw an error.
+    :param netcdf_contents: Contents of file (string), for example read from a
+        tar file by `unzipping.read_tar_members`.  If this is specified,
+        `netcdf_file_name` is used only as a label (and to determine whether or
+        not the contents are gzipped), so it need not exist.
     :return: netcdf_dataset: Instance of `NetCDF4.Dataset`, containing all data
         from the file.  If raise_error_if_fails = False and file could not be
         opened, this will be None.
@@ -26,29 +48,35 @@ def open_netcdf(netcdf_file_name, raise_error_if_fails=False):
         True.
     """
 
-    error_checking.assert_file_exists(netcdf_file_name)
+    if netcdf_contents is None:
+        error_checking.assert_file_exists(netcdf_file_name)
+    else:
+        error_checking.assert_is_string(netcdf_file_name)
     error_checking.assert_is_boolean(raise_error_if_fails)
+
     gzip_as_input = netcdf_file_name.endswith(GZIP_FILE_EXTENSION)
 
-    if gzip_as_input:
-        gzip_file_object = gzip.open(netcdf_file_name, 'rb')
-        netcdf_temporary_file_object = tempfile.NamedTemporaryFile(delete=False)
-        shutil.copyfileobj(gzip_file_object, netcdf_temporary_file_object)
+    try:
+        if gzip_as_input:
+            if netcdf_contents is None:
+                gzip_file_object = gzip.open(netcdf_file_name, 'rb')
+            else:
+                gzip_file_object = gzip.GzipFile(
+                    fileobj=BytesIO(netcdf_contents))
 
-        netcdf_file_name = netcdf_temporary_file_object.name
-        gzip_file_object.close()
-        netcdf_temporary_file_object.close()
+            try:
+                netcdf_contents = gzip_file_object.read()
+            finally:
+                gzip_file_object.close()
 
-    try:
-        netcdf_dataset = Dataset(netcdf_file_name)
+        if netcdf_contents is None:
+            netcdf_dataset = Dataset(netcdf_file_name)
+        else:
+            netcdf_dataset = Dataset(netcdf_file_name, memory=netcdf_contents)
     except IOError:
         if raise_error_if_fails:
-            if gzip_as_input:
-                os.remove(netcdf_file_name)
             raise
 
         netcdf_dataset = None
 
-    if gzip_as_input:
-        os.remove(netcdf_file_name)
     return netcdf_dataset
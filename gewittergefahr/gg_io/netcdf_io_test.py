@@ -0,0 +1,39 @@
+"""Unit tests for netcdf_io.py."""
+
+import unittest
+import numpy
+from gewittergefahr.gg_io import netcdf_io
+
+BIG_ENDIAN_ARRAY = numpy.ma.array(
+    [1., 2., 3.], mask=[False, True, False], dtype='>f4')
+NATIVE_ARRAY = numpy.array([1, 2, 3], dtype=int)
+
+
+class NetcdfIoTests(unittest.TestCase):
+    """Each method is a unit test for netcdf_io.py."""
+
+    def test_to_native_byte_order_big_endian(self):
+        """Ensures correct output from to_native_byte_order.
+
+        In this case, the input array is big-endian.
+        """
+
+        this_array = netcdf_io.to_native_byte_order(BIG_ENDIAN_ARRAY)
+        self.assertTrue(this_array.dtype.isnative)
+        self.assertTrue(numpy.array_equal(
+            this_array.mask, BIG_ENDIAN_ARRAY.mask))
+        self.assertTrue(numpy.allclose(
+            this_array.compressed(), BIG_ENDIAN_ARRAY.compressed()))
+
+    def test_to_native_byte_order_native(self):
+        """Ensures correct output from to_native_byte_order.
+
+        In this case, the input array is already in native byte order.
+        """
+
+        this_array = netcdf_io.to_native_byte_order(NATIVE_ARRAY)
+        self.assertTrue(this_array is NATIVE_ARRAY)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,7 @@
 
 import os
 import tempfile
+import numpy
 from gewittergefahr.gg_io import grib_io
 from gewittergefahr.gg_io import downloads
 from gewittergefahr.gg_utils import nwp_model_utils
@@ -14,6 +15,7 @@ TIME_FORMAT_HOUR = '%Y%m%d_%H00'
 
 SINGLE_FIELD_FILE_EXTENSION = '.txt'
 NARR_ID_FOR_FILE_NAMES = 'narr-a_221'
+DEFAULT_NUM_THREADS = 4
 
 
 def _lead_time_to_string(lead_time_hours):
@@ -322,6 +324,105 @@ def download_grib_file(init_time_unix_sec, lead_time_hours=None,
     return local_file_name
 
 
+def download_grib_files(
+        init_times_unix_sec, lead_times_hours=None, model_name=None,
+        grid_id=None, top_local_directory_name=None,
+        num_threads=DEFAULT_NUM_THREADS, raise_error_if_fails=True):
+    """Downloads many grib files concurrently to local machine.
+
+    Unlike calling `download_grib_file` in a loop, this method reuses
+    connections for many files, downloads files in parallel, skips files that
+    are already up to date on the local machine, and resumes partial downloads.
+    For each file, possible online names are tried in the same order as in
+    `download_grib_file`.
+
+    N = number of files
+
+    :param init_times_unix_sec: length-N numpy array of model-initialization
+        times.
+    :param lead_times_hours: length-N numpy array of lead times.  If model is a
+        reanalysis, you can leave this as None (always zero).
+    :param model_name: See doc for `download_grib_file`.
+    :param grid_id: Same.
+    :param top_local_directory_name: Same.
+    :param num_threads: Number of files to download at once.
+    :param raise_error_if_fails: Boolean flag.  If True and any download fails,
+        will raise an error (after trying all files).
+    :return: local_file_names: length-N list of paths on local machine.  If a
+        download failed but raise_error_if_fails = False, the corresponding
+        element is None.
+    """
+
+    error_checking.assert_is_integer_numpy_array(init_times_unix_sec)
+    error_checking.assert_is_numpy_array(init_times_unix_sec, num_dimensions=1)
+    num_files = len(init_times_unix_sec)
+
+    if lead_times_hours is None:
+        lead_times_hours = [None] * num_files
+    else:
+        error_checking.assert_is_integer_numpy_array(lead_times_hours)
+        error_checking.assert_is_numpy_array(
+            lead_times_hours, exact_dimensions=numpy.array([num_files]))
+
+    error_checking.assert_is_boolean(raise_error_if_fails)
+    top_online_directory_names = nwp_model_utils.get_top_online_directories(
+        model_name, grid_id)
+
+    candidate_file_names_by_target = []
+    desired_local_file_names = []
+
+    for k in range(num_files):
+        these_pathless_file_names = _get_pathless_grib_file_names(
+            init_times_unix_sec[k], lead_time_hours=lead_times_hours[k],
+            model_name=model_name, grid_id=grid_id)
+
+        candidate_file_names_by_target.append([
+            '{0:s}/{1:s}/{2:s}/{3:s}'.format(
+                this_directory_name,
+                time_conversion.unix_sec_to_string(
+                    init_times_unix_sec[k], TIME_FORMAT_MONTH),
+                time_conversion.unix_sec_to_string(
+                    init_times_unix_sec[k], TIME_FORMAT_DATE),
+                this_pathless_file_name)
+            for this_pathless_file_name in these_pathless_file_names
+            for this_directory_name in top_online_directory_names
+        ])
+
+        desired_local_file_names.append(find_grib_file(
+            init_times_unix_sec[k], lead_time_hours=lead_times_hours[k],
+            model_name=model_name, grid_id=grid_id,
+            top_directory_name=top_local_directory_name,
+            raise_error_if_missing=False))
+
+    manifest_table = downloads.download_files_with_candidates(
+        candidate_file_names_by_target=candidate_file_names_by_target,
+        local_file_names=desired_local_file_names, num_threads=num_threads,
+        raise_error_if_fails=raise_error_if_fails)
+
+    local_file_names = [None] * num_files
+    for k in range(num_files):
+        if (manifest_table[downloads.STATUS_COLUMN].values[k] not in
+                downloads.SUCCESS_STATUSES):
+            continue
+
+        local_file_names[k] = desired_local_file_names[k]
+        extensionless_local_file_name, local_file_extension = (
+            os.path.splitext(local_file_names[k]))
+        if manifest_table[downloads.ONLINE_FILE_COLUMN].values[k].endswith(
+                local_file_extension):
+            continue
+
+        if local_file_extension == grib_io.GRIB1_FILE_EXTENSION:
+            new_file_extension = grib_io.GRIB2_FILE_EXTENSION
+        else:
+            new_file_extension = grib_io.GRIB1_FILE_EXTENSION
+
+        local_file_names[k] = extensionless_local_file_name + new_file_extension
+        os.rename(desired_local_file_names[k], local_file_names[k])
+
+    return local_file_names
+
+
 def download_ruc_grib_file(
         init_time_unix_sec, lead_time_hours=None, top_local_directory_name=None,
         raise_error_if_fails=True):
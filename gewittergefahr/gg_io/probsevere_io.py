@@ -2,14 +2,24 @@
 
 import json
 import os.path
+import itertools
+import multiprocessing
 import numpy
 import pandas
 from gewittergefahr.gg_io import radar_io
 from gewittergefahr.gg_io import storm_tracking_io as tracking_io
 from gewittergefahr.gg_utils import polygons
+from gewittergefahr.gg_utils import file_catalog
 from gewittergefahr.gg_utils import time_conversion
 from gewittergefahr.gg_utils import error_checking
 
+# ujson is optional.  If it is installed, raw files are parsed with ujson, which
+# is several times faster than the standard json module.
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
 # TODO(thunderhoser): add file-management code (will include transferring
 # raw files from NSSL machine to local machine).
 # TODO(thunderhoser): replace main method with named method.
@@ -44,6 +54,17 @@ GRID_LNG_SPACING_DEG = 0.01
 NUM_GRID_ROWS = 3501
 NUM_GRID_COLUMNS = 7001
 
+RADAR_GRID = radar_io.RadarGrid({
+    radar_io.NW_GRID_POINT_LAT_COLUMN: NW_GRID_POINT_LAT_DEG,
+    radar_io.NW_GRID_POINT_LNG_COLUMN: NW_GRID_POINT_LNG_DEG,
+    radar_io.LAT_SPACING_COLUMN: GRID_LAT_SPACING_DEG,
+    radar_io.LNG_SPACING_COLUMN: GRID_LNG_SPACING_DEG,
+    radar_io.NUM_LAT_COLUMN: NUM_GRID_ROWS,
+    radar_io.NUM_LNG_COLUMN: NUM_GRID_COLUMNS
+})
+
+DEFAULT_NUM_PROCESSES = 1
+
 # Dummy variables (0000 UTC 1 Jan 1970 and 0520 UTC 24 Jan 2065).
 TRACKING_START_TIME_UNIX_SEC = 0
 TRACKING_END_TIME_UNIX_SEC = int(3e9)
@@ -78,6 +99,108 @@ def _get_pathless_raw_file_name(unix_time_sec):
         RAW_FILE_EXTENSION)
 
 
+def _raw_file_name_to_time(pathless_raw_file_name):
+    """Parses valid time from name of raw file.
+
+    This method is the inverse of _get_pathless_raw_file_name and is used to
+    build file catalogs (see `file_catalog.get_catalog`).
+
+    :param pathless_raw_file_name: Pathless name of raw file.
+    :return: unix_time_sec: Valid time.  If the file name is not formatted like
+        a raw file, this is None.
+    """
+
+    prefix_string = RAW_FILE_PREFIX + '_'
+    if not (pathless_raw_file_name.startswith(prefix_string) and
+            pathless_raw_file_name.endswith(RAW_FILE_EXTENSION)):
+        return None
+
+    try:
+        return time_conversion.string_to_unix_sec(
+            pathless_raw_file_name[len(prefix_string):-len(RAW_FILE_EXTENSION)],
+            TIME_FORMAT_IN_RAW_FILE_NAMES)
+    except ValueError:
+        return None
+
+
+def _read_json_file(json_file_name):
+    """Reads JSON file, with ujson if available.
+
+    :param json_file_name: Path to input file.
+    :return: json_dict: Dictionary with contents of file.
+    """
+
+    with open(json_file_name) as json_file_handle:
+        if ujson is None:
+            return json.load(json_file_handle)
+        return ujson.load(json_file_handle)
+
+
+def _features_to_flat_arrays(feature_dicts):
+    """Extracts storm properties and polygon vertices from raw features.
+
+    This is done in one pass over the features, with vertices from all storm
+    objects concatenated into flat arrays.
+
+    N = number of storm objects
+    V = total number of vertices over all storm objects
+
+    :param feature_dicts: length-N list of dictionaries (the "features" list in
+        a raw file).
+    :return: storm_ids: length-N list of storm IDs (strings).
+    :return: east_velocities_m_s01: length-N numpy array of eastward velocities
+        (m/s).
+    :return: north_velocities_m_s01: length-N numpy array of northward
+        velocities (m/s).
+    :return: vertex_latitudes_deg: length-V numpy array with latitudes (deg N)
+        of vertices.
+    :return: vertex_longitudes_deg: length-V numpy array with longitudes of
+        vertices.
+    :return: vertex_offsets: numpy array (length N + 1) of integers.  Vertices
+        of the [i]th storm object are [vertex_offsets[i]:vertex_offsets[i + 1]].
+    """
+
+    property_dicts = [f[PROPERTIES_COLUMN_ORIG] for f in feature_dicts]
+    storm_ids = [str(d[STORM_ID_COLUMN_ORIG]) for d in property_dicts]
+    east_velocities_m_s01 = numpy.array(
+        [float(d[EAST_VELOCITY_COLUMN_ORIG]) for d in property_dicts])
+    north_velocities_m_s01 = -1 * numpy.array(
+        [float(d[NORTH_VELOCITY_COLUMN_ORIG]) for d in property_dicts])
+
+    vertex_lists = [
+        f[GEOMETRY_COLUMN_ORIG][COORDINATES_COLUMN_ORIG][0]
+        for f in feature_dicts]
+    vertex_offsets = numpy.concatenate((
+        numpy.array([0], dtype=int),
+        numpy.cumsum([len(v) for v in vertex_lists], dtype=int)))
+
+    vertex_matrix_deg = numpy.array(
+        list(itertools.chain.from_iterable(vertex_lists)), dtype=float)
+    if vertex_matrix_deg.size == 0:
+        vertex_matrix_deg = numpy.full((0, 2), numpy.nan)
+
+    return (storm_ids, east_velocities_m_s01, north_velocities_m_s01,
+            vertex_matrix_deg[:, LAT_COLUMN_INDEX_ORIG],
+            vertex_matrix_deg[:, LNG_COLUMN_INDEX_ORIG], vertex_offsets)
+
+
+def _list_to_object_array(input_list):
+    """Converts list to 1-D numpy array of objects.
+
+    This allows a pandas column to contain numpy arrays or other sequences.
+
+    :param input_list: 1-D list.
+    :return: object_array: 1-D numpy array, where object_array[i] is
+        input_list[i].
+    """
+
+    object_array = numpy.full(len(input_list), None, dtype=object)
+    for i in range(len(input_list)):
+        object_array[i] = input_list[i]
+
+    return object_array
+
+
 def get_raw_file_name_on_ftp(unix_time_sec, top_ftp_directory_name):
     """Generates name of raw file on FTP server.
 
@@ -162,124 +285,217 @@ def read_storm_objects_from_raw_file(json_file_name):
     """
 
     error_checking.assert_file_exists(json_file_name)
-    with open(json_file_name) as json_file_handle:
-        probsevere_dict = json.load(json_file_handle)
+    probsevere_dict = _read_json_file(json_file_name)
 
     unix_time_sec = time_conversion.string_to_unix_sec(
         probsevere_dict[TIME_COLUMN_ORIG].encode('ascii', 'ignore'),
         TIME_FORMAT_IN_RAW_FILES)
     spc_date_unix_sec = time_conversion.time_to_spc_date_unix_sec(unix_time_sec)
 
-    num_storms = len(probsevere_dict[FEATURES_COLUMN_ORIG])
-    unix_times_sec = numpy.full(num_storms, unix_time_sec, dtype=int)
-    spc_dates_unix_sec = numpy.full(num_storms, spc_date_unix_sec, dtype=int)
-    tracking_start_times_unix_sec = numpy.full(
-        num_storms, TRACKING_START_TIME_UNIX_SEC, dtype=int)
-    tracking_end_times_unix_sec = numpy.full(
-        num_storms, TRACKING_END_TIME_UNIX_SEC, dtype=int)
-
-    storm_ids = [None] * num_storms
-    east_velocities_m_s01 = numpy.full(num_storms, numpy.nan)
-    north_velocities_m_s01 = numpy.full(num_storms, numpy.nan)
-
-    for i in range(num_storms):
-        storm_ids[i] = str(
-            probsevere_dict[FEATURES_COLUMN_ORIG][i][PROPERTIES_COLUMN_ORIG][
-                STORM_ID_COLUMN_ORIG])
-        east_velocities_m_s01[i] = float(
-            probsevere_dict[FEATURES_COLUMN_ORIG][i][PROPERTIES_COLUMN_ORIG][
-                EAST_VELOCITY_COLUMN_ORIG])
-        north_velocities_m_s01[i] = -1 * float(
-            probsevere_dict[FEATURES_COLUMN_ORIG][i][PROPERTIES_COLUMN_ORIG][
-                NORTH_VELOCITY_COLUMN_ORIG])
+    (storm_ids, east_velocities_m_s01, north_velocities_m_s01,
+     vertex_latitudes_deg, vertex_longitudes_deg,
+     vertex_offsets) = _features_to_flat_arrays(
+         probsevere_dict[FEATURES_COLUMN_ORIG])
 
+    num_storms = len(storm_ids)
     storm_object_dict = {
         tracking_io.STORM_ID_COLUMN: storm_ids,
         tracking_io.EAST_VELOCITY_COLUMN: east_velocities_m_s01,
         tracking_io.NORTH_VELOCITY_COLUMN: north_velocities_m_s01,
-        tracking_io.TIME_COLUMN: unix_times_sec,
-        tracking_io.SPC_DATE_COLUMN: spc_dates_unix_sec,
-        tracking_io.TRACKING_START_TIME_COLUMN: tracking_start_times_unix_sec,
-        tracking_io.TRACKING_END_TIME_COLUMN: tracking_end_times_unix_sec}
+        tracking_io.TIME_COLUMN:
+            numpy.full(num_storms, unix_time_sec, dtype=int),
+        tracking_io.SPC_DATE_COLUMN:
+            numpy.full(num_storms, spc_date_unix_sec, dtype=int),
+        tracking_io.TRACKING_START_TIME_COLUMN:
+            numpy.full(num_storms, TRACKING_START_TIME_UNIX_SEC, dtype=int),
+        tracking_io.TRACKING_END_TIME_COLUMN:
+            numpy.full(num_storms, TRACKING_END_TIME_UNIX_SEC, dtype=int)}
     storm_object_table = pandas.DataFrame.from_dict(storm_object_dict)
     storm_object_table = tracking_io.remove_rows_with_nan(storm_object_table)
 
-    num_storms = len(storm_object_table.index)
-    storm_ages_sec = numpy.full(num_storms, numpy.nan)
-
-    simple_array = numpy.full(num_storms, numpy.nan)
-    object_array = numpy.full(num_storms, numpy.nan, dtype=object)
-    nested_array = storm_object_table[[
-        tracking_io.STORM_ID_COLUMN,
-        tracking_io.STORM_ID_COLUMN]].values.tolist()
-
-    argument_dict = {tracking_io.AGE_COLUMN: storm_ages_sec,
-                     tracking_io.CENTROID_LAT_COLUMN: simple_array,
-                     tracking_io.CENTROID_LNG_COLUMN: simple_array,
-                     tracking_io.GRID_POINT_LAT_COLUMN: nested_array,
-                     tracking_io.GRID_POINT_LNG_COLUMN: nested_array,
-                     tracking_io.GRID_POINT_ROW_COLUMN: nested_array,
-                     tracking_io.GRID_POINT_COLUMN_COLUMN: nested_array,
-                     tracking_io.POLYGON_OBJECT_LATLNG_COLUMN: object_array,
-                     tracking_io.POLYGON_OBJECT_ROWCOL_COLUMN: object_array}
-    storm_object_table = storm_object_table.assign(**argument_dict)
+    # Index labels of the remaining rows are positions in the original list of
+    # features.
+    feature_indices = storm_object_table.index.values
+    num_storms = len(feature_indices)
+
+    # Convert all vertices from lat-long to row-column with one call.
+    vertex_rows, vertex_columns = RADAR_GRID.latlng_to_rowcol(
+        vertex_latitudes_deg, vertex_longitudes_deg)
+
+    fixed_rows_by_storm = [None] * num_storms
+    fixed_columns_by_storm = [None] * num_storms
+    grid_point_rows_by_storm = [None] * num_storms
+    grid_point_columns_by_storm = [None] * num_storms
 
     for i in range(num_storms):
-        this_vertex_matrix_deg = numpy.asarray(
-            probsevere_dict[FEATURES_COLUMN_ORIG][i][GEOMETRY_COLUMN_ORIG][
-                COORDINATES_COLUMN_ORIG][0])
-        these_vertex_lat_deg = this_vertex_matrix_deg[:, LAT_COLUMN_INDEX_ORIG]
-        these_vertex_lng_deg = this_vertex_matrix_deg[:, LNG_COLUMN_INDEX_ORIG]
-
-        (these_vertex_rows, these_vertex_columns) = radar_io.latlng_to_rowcol(
-            these_vertex_lat_deg, these_vertex_lng_deg,
-            nw_grid_point_lat_deg=NW_GRID_POINT_LAT_DEG,
-            nw_grid_point_lng_deg=NW_GRID_POINT_LNG_DEG,
-            lat_spacing_deg=GRID_LAT_SPACING_DEG,
-            lng_spacing_deg=GRID_LNG_SPACING_DEG)
-
-        these_vertex_rows, these_vertex_columns = (
+        j = feature_indices[i]
+        fixed_rows_by_storm[i], fixed_columns_by_storm[i] = (
             polygons.fix_probsevere_vertices(
-                these_vertex_rows, these_vertex_columns))
-
-        these_vertex_lat_deg, these_vertex_lng_deg = radar_io.rowcol_to_latlng(
-            these_vertex_rows, these_vertex_columns,
-            nw_grid_point_lat_deg=NW_GRID_POINT_LAT_DEG,
-            nw_grid_point_lng_deg=NW_GRID_POINT_LNG_DEG,
-            lat_spacing_deg=GRID_LAT_SPACING_DEG,
-            lng_spacing_deg=GRID_LNG_SPACING_DEG)
-
-        (storm_object_table[tracking_io.GRID_POINT_ROW_COLUMN].values[i],
-         storm_object_table[tracking_io.GRID_POINT_COLUMN_COLUMN].values[i]) = (
-             polygons.simple_polygon_to_grid_points(
-                 these_vertex_rows, these_vertex_columns))
-
-        (storm_object_table[tracking_io.GRID_POINT_LAT_COLUMN].values[i],
-         storm_object_table[tracking_io.GRID_POINT_LNG_COLUMN].values[i]) = (
-             radar_io.rowcol_to_latlng(
-                 storm_object_table[tracking_io.GRID_POINT_ROW_COLUMN].values[i],
-                 storm_object_table[
-                     tracking_io.GRID_POINT_COLUMN_COLUMN].values[i],
-                 nw_grid_point_lat_deg=NW_GRID_POINT_LAT_DEG,
-                 nw_grid_point_lng_deg=NW_GRID_POINT_LNG_DEG,
-                 lat_spacing_deg=GRID_LAT_SPACING_DEG,
-                 lng_spacing_deg=GRID_LNG_SPACING_DEG))
-
-        (storm_object_table[tracking_io.CENTROID_LAT_COLUMN].values[i],
-         storm_object_table[tracking_io.CENTROID_LNG_COLUMN].values[i]) = (
-             polygons.get_latlng_centroid(
-                 these_vertex_lat_deg, these_vertex_lng_deg))
-
-        storm_object_table[
-            tracking_io.POLYGON_OBJECT_ROWCOL_COLUMN].values[i] = (
-                polygons.vertex_arrays_to_polygon_object(
-                    these_vertex_columns, these_vertex_rows))
-        storm_object_table[
-            tracking_io.POLYGON_OBJECT_LATLNG_COLUMN].values[i] = (
-                polygons.vertex_arrays_to_polygon_object(
-                    these_vertex_lng_deg, these_vertex_lat_deg))
-
-    return storm_object_table
+                vertex_rows[vertex_offsets[j]:vertex_offsets[j + 1]],
+                vertex_columns[vertex_offsets[j]:vertex_offsets[j + 1]]))
+
+        grid_point_rows_by_storm[i], grid_point_columns_by_storm[i] = (
+            polygons.simple_polygon_to_grid_points(
+                fixed_rows_by_storm[i], fixed_columns_by_storm[i]))
+
+    # Convert fixed vertices and grid points from row-column to lat-long, each
+    # with one call.
+    fixed_vertex_rows, fixed_vertex_offsets = radar_io.flatten_ragged_arrays(
+        fixed_rows_by_storm)
+    fixed_vertex_columns = radar_io.flatten_ragged_arrays(
+        fixed_columns_by_storm)[0]
+    fixed_vertex_latitudes_deg, fixed_vertex_longitudes_deg = (
+        RADAR_GRID.rowcol_to_latlng(fixed_vertex_rows, fixed_vertex_columns))
+
+    grid_point_rows, grid_point_offsets = radar_io.flatten_ragged_arrays(
+        grid_point_rows_by_storm)
+    grid_point_columns = radar_io.flatten_ragged_arrays(
+        grid_point_columns_by_storm)[0]
+    grid_point_latitudes_deg, grid_point_longitudes_deg = (
+        RADAR_GRID.rowcol_to_latlng(grid_point_rows, grid_point_columns))
+
+    # Centroid of each storm object is the mean of its fixed vertices.
+    if num_storms > 0:
+        num_vertices_by_storm = numpy.diff(fixed_vertex_offsets)
+        centroid_latitudes_deg = numpy.add.reduceat(
+            fixed_vertex_latitudes_deg,
+            fixed_vertex_offsets[:-1]) / num_vertices_by_storm
+        centroid_longitudes_deg = numpy.add.reduceat(
+            fixed_vertex_longitudes_deg,
+            fixed_vertex_offsets[:-1]) / num_vertices_by_storm
+    else:
+        centroid_latitudes_deg = numpy.array([])
+        centroid_longitudes_deg = numpy.array([])
+
+    these_polygon_offsets = numpy.linspace(
+        0, num_storms, num=num_storms + 1, dtype=int)
+    polygon_objects_rowcol = polygons.flat_arrays_to_polygon_objects(
+        vertex_x_coords=fixed_vertex_columns, vertex_y_coords=fixed_vertex_rows,
+        ring_offsets=fixed_vertex_offsets,
+        polygon_offsets=these_polygon_offsets)
+    polygon_objects_latlng = polygons.flat_arrays_to_polygon_objects(
+        vertex_x_coords=fixed_vertex_longitudes_deg,
+        vertex_y_coords=fixed_vertex_latitudes_deg,
+        ring_offsets=fixed_vertex_offsets,
+        polygon_offsets=these_polygon_offsets)
+
+    argument_dict = {
+        tracking_io.AGE_COLUMN: numpy.full(num_storms, numpy.nan),
+        tracking_io.CENTROID_LAT_COLUMN: centroid_latitudes_deg,
+        tracking_io.CENTROID_LNG_COLUMN: centroid_longitudes_deg,
+        tracking_io.GRID_POINT_LAT_COLUMN: _list_to_object_array(
+            radar_io.unflatten_ragged_arrays(
+                grid_point_latitudes_deg, grid_point_offsets)),
+        tracking_io.GRID_POINT_LNG_COLUMN: _list_to_object_array(
+            radar_io.unflatten_ragged_arrays(
+                grid_point_longitudes_deg, grid_point_offsets)),
+        tracking_io.GRID_POINT_ROW_COLUMN:
+            _list_to_object_array(grid_point_rows_by_storm),
+        tracking_io.GRID_POINT_COLUMN_COLUMN:
+            _list_to_object_array(grid_point_columns_by_storm),
+        tracking_io.POLYGON_OBJECT_LATLNG_COLUMN:
+            _list_to_object_array(polygon_objects_latlng),
+        tracking_io.POLYGON_OBJECT_ROWCOL_COLUMN:
+            _list_to_object_array(polygon_objects_rowcol)
+    }
+
+    return storm_object_table.assign(**argument_dict)
+
+
+def find_raw_files_for_spc_date(
+        spc_date_string, top_local_directory_name, raise_error_if_missing=True,
+        index_directory_name=None):
+    """Finds all raw files (on local machine) for one SPC date.
+
+    An SPC date (1200-1159 UTC) spans two calendar dates, so files are found in
+    two directories (see find_raw_file_on_local_machine).
+
+    :param spc_date_string: SPC date (format "yyyymmdd").
+    :param top_local_directory_name: Top-level directory with raw files on local
+        machine.
+    :param raise_error_if_missing: Boolean flag.  If True and no files can be
+        found, this method will raise an error.
+    :param index_directory_name: Name of directory with index files for file
+        catalogs (see `file_catalog.get_catalog`).  If None, catalogs will be
+        cached only in memory.
+    :return: raw_file_names: 1-D list of paths to raw files, sorted by valid
+        time.
+    :raises: ValueError: if raise_error_if_missing = True and no files can be
+        found.
+    """
+
+    error_checking.assert_is_string(top_local_directory_name)
+    error_checking.assert_is_boolean(raise_error_if_missing)
+
+    first_time_unix_sec = time_conversion.string_to_unix_sec(
+        spc_date_string, time_conversion.SPC_DATE_FORMAT
+    ) + time_conversion.MIN_SECONDS_INTO_SPC_DATE
+    last_time_unix_sec = time_conversion.string_to_unix_sec(
+        spc_date_string, time_conversion.SPC_DATE_FORMAT
+    ) + time_conversion.MAX_SECONDS_INTO_SPC_DATE
+
+    raw_file_names = []
+    for this_time_unix_sec in [first_time_unix_sec, last_time_unix_sec]:
+        this_directory_name = '{0:s}/{1:s}'.format(
+            top_local_directory_name, time_conversion.unix_sec_to_string(
+                this_time_unix_sec, TIME_FORMAT_DATE))
+
+        this_catalog_dict = file_catalog.get_catalog(
+            this_directory_name, file_name_to_time=_raw_file_name_to_time,
+            index_directory_name=index_directory_name)
+        raw_file_names += file_catalog.find_files_in_time_range(
+            this_catalog_dict, start_time_unix_sec=first_time_unix_sec,
+            end_time_unix_sec=last_time_unix_sec)
+
+    if raise_error_if_missing and not raw_file_names:
+        raise ValueError(
+            'Cannot find any raw files for SPC date "{0:s}" in directory: '
+            '{1:s}'.format(spc_date_string, top_local_directory_name))
+
+    return raw_file_names
+
+
+def read_storm_objects_for_spc_date(
+        spc_date_string, top_local_directory_name,
+        num_processes=DEFAULT_NUM_PROCESSES, index_directory_name=None):
+    """Reads storm objects from all raw files for one SPC date.
+
+    :param spc_date_string: See doc for find_raw_files_for_spc_date.
+    :param top_local_directory_name: Same.
+    :param num_processes: Number of files to read at once (in separate
+        processes).
+    :param index_directory_name: See doc for find_raw_files_for_spc_date.
+    :return: storm_object_table: pandas DataFrame with columns documented in
+        read_storm_objects_from_raw_file.  Rows from all files are
+        concatenated, in order of valid time.
+    """
+
+    error_checking.assert_is_integer(num_processes)
+    error_checking.assert_is_greater(num_processes, 0)
+
+    raw_file_names = find_raw_files_for_spc_date(
+        spc_date_string=spc_date_string,
+        top_local_directory_name=top_local_directory_name,
+        raise_error_if_missing=True,
+        index_directory_name=index_directory_name)
+    num_files = len(raw_file_names)
+
+    if num_processes == 1 or num_files <= 1:
+        list_of_storm_object_tables = map(
+            read_storm_objects_from_raw_file, raw_file_names)
+    else:
+        worker_pool = multiprocessing.Pool(
+            processes=min([num_processes, num_files]))
+
+        try:
+            list_of_storm_object_tables = worker_pool.map(
+                read_storm_objects_from_raw_file, raw_file_names)
+        finally:
+            worker_pool.close()
+            worker_pool.join()
+
+    return pandas.concat(
+        list_of_storm_object_tables, axis=0, ignore_index=True)
 
 
 if __name__ == '__main__':
@@ -1,10 +1,15 @@
 """Unit tests for probsevere_io.py."""
 
+import os
+import shutil
+import tempfile
 import unittest
+import numpy
 from gewittergefahr.gg_io import probsevere_io
 
 UNIX_TIME_SEC = 1507181187  # 052627 5 Oct 2017
 PATHLESS_RAW_FILE_NAME = 'SSEC_AWIPS_PROBSEVERE_20171005_052627.json'
+BAD_PATHLESS_RAW_FILE_NAME = 'SSEC_AWIPS_PROBSEVERE_2017-10-05.json'
 
 TOP_FTP_DIRECTORY_NAME = '/data/storm_tracking/probSevere'
 RAW_FTP_FILE_NAME = (
@@ -16,6 +21,34 @@ RAW_LOCAL_FILE_NAME = (
     '/data/storm_tracking/probSevere/20171005/'
     'SSEC_AWIPS_PROBSEVERE_20171005_052627.json')
 
+# The following constants are used to test _features_to_flat_arrays.
+FEATURE_DICTS = [
+    {'geometry': {'coordinates': [[[-100., 40.], [-99.9, 40.], [-100., 40.]]]},
+     'properties': {'ID': 1234, 'MOTION_EAST': '5.5', 'MOTION_SOUTH': '2.'}},
+    {'geometry': {'coordinates': [[[-90., 35.], [-90., 35.1], [-89.9, 35.1],
+                                   [-90., 35.]]]},
+     'properties': {'ID': '5678', 'MOTION_EAST': '-1.', 'MOTION_SOUTH': '-3.'}}
+]
+
+STORM_IDS_FROM_FEATURES = ['1234', '5678']
+EAST_VELOCITIES_FROM_FEATURES_M_S01 = numpy.array([5.5, -1.])
+NORTH_VELOCITIES_FROM_FEATURES_M_S01 = numpy.array([-2., 3.])
+VERTEX_LATITUDES_FROM_FEATURES_DEG = numpy.array(
+    [40., 40., 40., 35., 35.1, 35.1, 35.])
+VERTEX_LONGITUDES_FROM_FEATURES_DEG = numpy.array(
+    [-100., -99.9, -100., -90., -90., -89.9, -90.])
+VERTEX_OFFSETS_FROM_FEATURES = numpy.array([0, 3, 7], dtype=int)
+
+# The following constants are used to test find_raw_files_for_spc_date.
+SPC_DATE_STRING = '20171005'
+RELATIVE_FILE_NAMES_FOR_SPC_DATE = [
+    '20171005/SSEC_AWIPS_PROBSEVERE_20171005_120000.json',
+    '20171006/SSEC_AWIPS_PROBSEVERE_20171006_115959.json']
+RELATIVE_FILE_NAMES_NOT_FOR_SPC_DATE = [
+    '20171005/SSEC_AWIPS_PROBSEVERE_20171005_115959.json',
+    '20171005/foo.txt',
+    '20171006/SSEC_AWIPS_PROBSEVERE_20171006_120000.json']
+
 
 class ProbsevereIoTests(unittest.TestCase):
     """Each method is a unit test for probsevere_io.py."""
@@ -27,6 +60,42 @@ class ProbsevereIoTests(unittest.TestCase):
             UNIX_TIME_SEC)
         self.assertTrue(this_pathless_file_name == PATHLESS_RAW_FILE_NAME)
 
+    def test_raw_file_name_to_time(self):
+        """Ensures correct output from _raw_file_name_to_time."""
+
+        this_time_unix_sec = probsevere_io._raw_file_name_to_time(
+            PATHLESS_RAW_FILE_NAME)
+        self.assertTrue(this_time_unix_sec == UNIX_TIME_SEC)
+
+    def test_raw_file_name_to_time_bad_name(self):
+        """Ensures correct output from _raw_file_name_to_time.
+
+        In this case, the file name is not formatted like a raw file.
+        """
+
+        self.assertTrue(probsevere_io._raw_file_name_to_time(
+            BAD_PATHLESS_RAW_FILE_NAME) is None)
+
+    def test_features_to_flat_arrays(self):
+        """Ensures correct output from _features_to_flat_arrays."""
+
+        (these_storm_ids, these_east_velocities_m_s01,
+         these_north_velocities_m_s01, these_vertex_latitudes_deg,
+         these_vertex_longitudes_deg, these_vertex_offsets) = (
+             probsevere_io._features_to_flat_arrays(FEATURE_DICTS))
+
+        self.assertTrue(these_storm_ids == STORM_IDS_FROM_FEATURES)
+        self.assertTrue(numpy.allclose(
+            these_east_velocities_m_s01, EAST_VELOCITIES_FROM_FEATURES_M_S01))
+        self.assertTrue(numpy.allclose(
+            these_north_velocities_m_s01, NORTH_VELOCITIES_FROM_FEATURES_M_S01))
+        self.assertTrue(numpy.allclose(
+            these_vertex_latitudes_deg, VERTEX_LATITUDES_FROM_FEATURES_DEG))
+        self.assertTrue(numpy.allclose(
+            these_vertex_longitudes_deg, VERTEX_LONGITUDES_FROM_FEATURES_DEG))
+        self.assertTrue(numpy.array_equal(
+            these_vertex_offsets, VERTEX_OFFSETS_FROM_FEATURES))
+
     def test_get_raw_file_name_on_ftp(self):
         """Ensures correct output from get_raw_file_name_on_ftp."""
 
@@ -43,6 +112,32 @@ class ProbsevereIoTests(unittest.TestCase):
             raise_error_if_missing=False)
         self.assertTrue(this_raw_file_name == RAW_LOCAL_FILE_NAME)
 
+    def test_find_raw_files_for_spc_date(self):
+        """Ensures correct output from find_raw_files_for_spc_date."""
+
+        this_top_directory_name = tempfile.mkdtemp()
+
+        try:
+            for this_relative_name in (
+                    RELATIVE_FILE_NAMES_FOR_SPC_DATE +
+                    RELATIVE_FILE_NAMES_NOT_FOR_SPC_DATE):
+                this_file_name = '{0:s}/{1:s}'.format(
+                    this_top_directory_name, this_relative_name)
+                if not os.path.isdir(os.path.dirname(this_file_name)):
+                    os.makedirs(os.path.dirname(this_file_name))
+                open(this_file_name, 'w').close()
+
+            these_file_names = probsevere_io.find_raw_files_for_spc_date(
+                spc_date_string=SPC_DATE_STRING,
+                top_local_directory_name=this_top_directory_name)
+        finally:
+            shutil.rmtree(this_top_directory_name)
+
+        these_expected_file_names = [
+            '{0:s}/{1:s}'.format(this_top_directory_name, n)
+            for n in RELATIVE_FILE_NAMES_FOR_SPC_DATE]
+        self.assertTrue(these_file_names == these_expected_file_names)
+
 
 if __name__ == '__main__':
     unittest.main()
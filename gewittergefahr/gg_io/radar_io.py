@@ -9,13 +9,12 @@ MRMS = Multi-radar Multi-sensor
 
 import copy
 import os
-import glob
 import numpy
 import pandas
 from gewittergefahr.gg_io import netcdf_io
+from gewittergefahr.gg_utils import file_catalog
 from gewittergefahr.gg_utils import number_rounding as rounder
 from gewittergefahr.gg_utils import time_conversion
-from gewittergefahr.gg_utils import time_periods
 from gewittergefahr.gg_utils import longitude_conversion as lng_conversion
 from gewittergefahr.gg_utils import grids
 from gewittergefahr.gg_utils import error_checking
@@ -62,6 +61,13 @@ GRID_ROW_COLUMN_ORIG = 'pixel_x'
 GRID_COLUMN_COLUMN_ORIG = 'pixel_y'
 NUM_GRID_CELL_COLUMN_ORIG = 'pixel_count'
 
+GRID_METADATA_KEYS = [
+    NW_GRID_POINT_LAT_COLUMN, NW_GRID_POINT_LNG_COLUMN, LAT_SPACING_COLUMN,
+    LNG_SPACING_COLUMN, NUM_LAT_COLUMN, NUM_LNG_COLUMN]
+
+# Memoized remapping tables, keyed by (source grid, target grid).
+_REMAPPING_TABLE_CACHE = {}
+
 ECHO_TOP_18DBZ_NAME = 'echo_top_18dbz_km'
 ECHO_TOP_40DBZ_NAME = 'echo_top_40dbz_km'
 ECHO_TOP_50DBZ_NAME = 'echo_top_50dbz_km'
@@ -274,6 +280,32 @@ def _get_pathless_raw_file_name(unix_time_sec, zipped=True):
         UNZIPPED_FILE_EXTENSION)
 
 
+def _raw_file_name_to_time(pathless_raw_file_name):
+    """Parses valid time from name of raw file.
+
+    This method is the inverse of _get_pathless_raw_file_name and is used to
+    build file catalogs (see `file_catalog.get_catalog`).
+
+    :param pathless_raw_file_name: Pathless name of raw file (may be zipped or
+        unzipped).
+    :return: unix_time_sec: Valid time.  If the file name is not formatted like
+        a raw file, this is None.
+    """
+
+    if pathless_raw_file_name.endswith(ZIPPED_FILE_EXTENSION):
+        pathless_raw_file_name = pathless_raw_file_name[
+            :-len(ZIPPED_FILE_EXTENSION)]
+    if not pathless_raw_file_name.endswith(UNZIPPED_FILE_EXTENSION):
+        return None
+
+    try:
+        return time_conversion.string_to_unix_sec(
+            pathless_raw_file_name[:-len(UNZIPPED_FILE_EXTENSION)],
+            TIME_FORMAT_SECONDS)
+    except ValueError:
+        return None
+
+
 def _remove_sentinels_from_sparse_grid(sparse_grid_table, field_name=None,
                                        sentinel_values=None):
     """Removes sentinel values from sparse radar grid.
@@ -510,7 +542,7 @@ def find_raw_azimuthal_shear_file(
         desired_time_unix_sec, spc_date_unix_sec, field_name, data_source,
         top_directory_name,
         max_time_offset_sec=DEFAULT_MAX_TIME_OFFSET_FOR_AZ_SHEAR_SEC,
-        raise_error_if_missing=False):
+        raise_error_if_missing=False, index_directory_name=None):
     """Finds raw azimuthal-shear file on local machine.
 
     If you know the exact time step for azimuthal shear, use find_raw_file.
@@ -525,10 +557,15 @@ def find_raw_azimuthal_shear_file(
     :param data_source: Data source (either "myrorss" or "mrms").
     :param top_directory_name: Name of top-level directory with raw MYRORSS
         files.
+    :param max_time_offset_sec: Maximum offset between desired and actual
+        time.
     :param raise_error_if_missing: Boolean flag.  If True and no az-shear file
         can be found within `max_time_offset_sec` of `desired_time_unix_sec`,
         will raise error.  If False and no az-shear file can be found within
         `max_time_offset_sec` of `desired_time_unix_sec`, will return None.
+    :param index_directory_name: Name of directory with index files for file
+        catalogs (see `file_catalog.get_catalog`).  If None, catalogs will be
+        cached only in memory.
     :return: raw_file_name: Path to raw az-shear file.  If file is missing and
         raise_error_if_missing = False, this is the *expected* path.
     :raises: ValueError: if raise_error_if_missing = True and file is missing.
@@ -539,66 +576,33 @@ def find_raw_azimuthal_shear_file(
     error_checking.assert_is_greater(max_time_offset_sec, 0)
     error_checking.assert_is_boolean(raise_error_if_missing)
 
-    first_allowed_minute_unix_sec = numpy.round(int(rounder.floor_to_nearest(
-        float(desired_time_unix_sec - max_time_offset_sec),
-        MINUTES_TO_SECONDS)))
-    last_allowed_minute_unix_sec = numpy.round(int(rounder.floor_to_nearest(
-        float(desired_time_unix_sec + max_time_offset_sec),
-        MINUTES_TO_SECONDS)))
-
-    allowed_minutes_unix_sec = time_periods.range_and_interval_to_list(
-        start_time_unix_sec=first_allowed_minute_unix_sec,
-        end_time_unix_sec=last_allowed_minute_unix_sec,
-        time_interval_sec=MINUTES_TO_SECONDS, include_endpoint=True).astype(int)
-
     spc_date_string = time_conversion.time_to_spc_date_string(spc_date_unix_sec)
     relative_directory_name = get_relative_dir_for_raw_files(
         field_name=field_name, data_source=data_source)
+    directory_name = '{0:s}/{1:s}/{2:s}'.format(
+        top_directory_name, spc_date_string, relative_directory_name)
+
+    catalog_dict = file_catalog.get_catalog(
+        directory_name, file_name_to_time=_raw_file_name_to_time,
+        index_directory_name=index_directory_name)
+    raw_file_name = file_catalog.find_nearest_file(
+        catalog_dict, desired_time_unix_sec=desired_time_unix_sec,
+        max_time_offset_sec=max_time_offset_sec)
+
+    if raw_file_name is None and raise_error_if_missing:
+        desired_time_string = time_conversion.unix_sec_to_string(
+            desired_time_unix_sec, TIME_FORMAT_FOR_LOG_MESSAGES)
+        log_string = ('Could not find "{0:s}" file within {1:d} seconds of '
+                      '{2:s}').format(field_name, max_time_offset_sec,
+                                      desired_time_string)
+        raise ValueError(log_string)
 
-    raw_file_names = []
-    for this_time_unix_sec in allowed_minutes_unix_sec:
-        this_pathless_file_pattern = _get_pathless_raw_file_pattern(
-            this_time_unix_sec)
-        this_file_pattern = '{0:s}/{1:s}/{2:s}/{3:s}'.format(
-            top_directory_name, spc_date_string, relative_directory_name,
-            this_pathless_file_pattern)
-        raw_file_names += glob.glob(this_file_pattern)
-
-    file_times_unix_sec = []
-    for this_raw_file_name in raw_file_names:
-        _, this_pathless_file_name = os.path.split(this_raw_file_name)
-        this_time_string, ending = os.path.splitext(this_pathless_file_name)
-        if (ending.rfind("gz") > -1):
-            this_time_string, ending = os.path.splitext(this_time_string)
-        file_times_unix_sec.append(time_conversion.string_to_unix_sec(
-            this_time_string, TIME_FORMAT_SECONDS))
-
-    if len(file_times_unix_sec):
-        file_times_unix_sec = numpy.array(file_times_unix_sec)
-        time_differences_sec = numpy.absolute(
-            file_times_unix_sec - desired_time_unix_sec)
-        nearest_index = numpy.argmin(time_differences_sec)
-        min_time_diff_sec = time_differences_sec[nearest_index]
-    else:
-        min_time_diff_sec = numpy.inf
-
-    if min_time_diff_sec > max_time_offset_sec:
-        if raise_error_if_missing:
-            desired_time_string = time_conversion.unix_sec_to_string(
-                desired_time_unix_sec, TIME_FORMAT_FOR_LOG_MESSAGES)
-            log_string = ('Could not find "{0:s}" file within {1:d} seconds of '
-                          '{2:s}').format(field_name, max_time_offset_sec,
-                                          desired_time_string)
-            raise ValueError(log_string)
-
-        return None
-
-    return raw_file_names[nearest_index]
+    return raw_file_name
 
 
 def find_raw_file(unix_time_sec=None, spc_date_unix_sec=None, field_name=None,
                   height_m_agl=None, data_source=None, top_directory_name=None,
-                  raise_error_if_missing=True):
+                  raise_error_if_missing=True, index_directory_name=None):
     """Finds raw file on local machine.
 
     This file should contain one radar field at one height and one time step.
@@ -612,6 +616,9 @@ def find_raw_file(unix_time_sec=None, spc_date_unix_sec=None, field_name=None,
     :param top_directory_name: Top-level directory for raw files.
     :param raise_error_if_missing: Boolean flag.  If raise_error_if_missing =
         True and file is missing, will raise error.
+    :param index_directory_name: Name of directory with index files for file
+        catalogs (see `file_catalog.get_catalog`).  If None, catalogs will be
+        cached only in memory.
     :return: raw_file_name: Path to raw file.  If raise_error_if_missing = False
         and file is missing, this will be the *expected* path.
     :raises: ValueError: if raise_error_if_missing = True and file is missing.
@@ -623,22 +630,30 @@ def find_raw_file(unix_time_sec=None, spc_date_unix_sec=None, field_name=None,
     relative_directory_name = get_relative_dir_for_raw_files(
         field_name=field_name, height_m_agl=height_m_agl,
         data_source=data_source)
-
-    pathless_file_name = _get_pathless_raw_file_name(unix_time_sec, zipped=True)
-    raw_file_name = '{0:s}/{1:s}/{2:s}/{3:s}'.format(
+    directory_name = '{0:s}/{1:s}/{2:s}'.format(
         top_directory_name,
         time_conversion.time_to_spc_date_string(spc_date_unix_sec),
-        relative_directory_name, pathless_file_name)
-
-    if raise_error_if_missing and not os.path.isfile(raw_file_name):
-        pathless_file_name = _get_pathless_raw_file_name(
-            unix_time_sec, zipped=False)
-        raw_file_name = '{0:s}/{1:s}/{2:s}/{3:s}'.format(
-            top_directory_name,
-            time_conversion.time_to_spc_date_string(spc_date_unix_sec),
-            relative_directory_name, pathless_file_name)
+        relative_directory_name)
 
-    if raise_error_if_missing and not os.path.isfile(raw_file_name):
+    pathless_file_name = _get_pathless_raw_file_name(unix_time_sec, zipped=True)
+    raw_file_name = '{0:s}/{1:s}'.format(directory_name, pathless_file_name)
+    if not raise_error_if_missing:
+        return raw_file_name
+
+    catalog_dict = file_catalog.get_catalog(
+        directory_name, file_name_to_time=_raw_file_name_to_time,
+        index_directory_name=index_directory_name)
+    cataloged_file_names = file_catalog.find_files_in_time_range(
+        catalog_dict, start_time_unix_sec=unix_time_sec,
+        end_time_unix_sec=unix_time_sec)
+
+    if raw_file_name in cataloged_file_names:
+        return raw_file_name
+
+    pathless_file_name = _get_pathless_raw_file_name(
+        unix_time_sec, zipped=False)
+    raw_file_name = '{0:s}/{1:s}'.format(directory_name, pathless_file_name)
+    if raw_file_name not in cataloged_file_names:
         raise ValueError(
             'Cannot find raw file.  Expected at location: ' + raw_file_name)
 
@@ -738,6 +753,183 @@ def latlng_to_rowcol(latitudes_deg, longitudes_deg, nw_grid_point_lat_deg=None,
     return grid_rows, grid_columns
 
 
+def flatten_ragged_arrays(array_list):
+    """Flattens list of 1-D arrays into one array.
+
+    K = number of arrays
+    P = total number of values in all arrays
+
+    :param array_list: length-K list of 1-D numpy arrays.
+    :return: values: length-P numpy array with values from all arrays.
+    :return: offsets: length-(K + 1) numpy array of integers.  Values from the
+        [k]th array are values[offsets[k]:offsets[k + 1]].
+    """
+
+    offsets = numpy.concatenate((
+        numpy.array([0], dtype=int),
+        numpy.cumsum([len(a) for a in array_list], dtype=int)))
+
+    if len(array_list) == 0:
+        return numpy.array([]), offsets
+    return numpy.concatenate(array_list), offsets
+
+
+def unflatten_ragged_arrays(values, offsets):
+    """Inverse of flatten_ragged_arrays.
+
+    :param values: See output doc for flatten_ragged_arrays.
+    :param offsets: Same.
+    :return: array_list: Same as input to flatten_ragged_arrays.
+    """
+
+    return [values[offsets[k]:offsets[k + 1]] for k in range(len(offsets) - 1)]
+
+
+class RadarGrid(object):
+    """Regular lat-long radar grid (e.g., MYRORSS, MRMS, or segmotion grid).
+
+    Grids are compared and hashed by their parameters (everything in
+    `GRID_METADATA_KEYS`), so they can be used as dictionary keys.  All
+    coordinate conversions work on flat arrays.  To convert many ragged arrays
+    (e.g., grid points in many storm objects) with one call, use
+    `flatten_ragged_arrays` and `unflatten_ragged_arrays`.
+    """
+
+    def __init__(self, metadata_dict):
+        """Constructor.
+
+        :param metadata_dict: Dictionary with keys listed in
+            `GRID_METADATA_KEYS` (e.g., created by read_metadata_from_raw_file).
+        """
+
+        self.nw_grid_point_lat_deg = metadata_dict[NW_GRID_POINT_LAT_COLUMN]
+        self.nw_grid_point_lng_deg = metadata_dict[NW_GRID_POINT_LNG_COLUMN]
+        self.lat_spacing_deg = metadata_dict[LAT_SPACING_COLUMN]
+        self.lng_spacing_deg = metadata_dict[LNG_SPACING_COLUMN]
+        self.num_grid_rows = metadata_dict[NUM_LAT_COLUMN]
+        self.num_grid_columns = metadata_dict[NUM_LNG_COLUMN]
+
+    def _get_key(self):
+        """Returns parameters of grid, used for comparison and hashing.
+
+        :return: key_tuple: Tuple with values of keys in `GRID_METADATA_KEYS`.
+        """
+
+        return (self.nw_grid_point_lat_deg, self.nw_grid_point_lng_deg,
+                self.lat_spacing_deg, self.lng_spacing_deg,
+                self.num_grid_rows, self.num_grid_columns)
+
+    def __eq__(self, other_grid):
+        """Determines whether or not two grids are equal.
+
+        :param other_grid: Another instance of `RadarGrid`.
+        :return: are_grids_equal_flag: Boolean flag.
+        """
+
+        return (isinstance(other_grid, RadarGrid) and
+                self._get_key() == other_grid._get_key())
+
+    def __ne__(self, other_grid):
+        """Determines whether or not two grids are different.
+
+        :param other_grid: Another instance of `RadarGrid`.
+        :return: are_grids_different_flag: Boolean flag.
+        """
+
+        return not self == other_grid
+
+    def __hash__(self):
+        """Returns hash of grid parameters.
+
+        :return: hash_value: Integer.
+        """
+
+        return hash(self._get_key())
+
+    def rowcol_to_latlng(self, grid_rows, grid_columns):
+        """Converts coordinates from row-column to lat-long.
+
+        For details, see the module-level method rowcol_to_latlng.
+
+        :param grid_rows: See doc for rowcol_to_latlng.
+        :param grid_columns: Same.
+        :return: latitudes_deg: Same.
+        :return: longitudes_deg: Same.
+        """
+
+        return rowcol_to_latlng(
+            grid_rows, grid_columns,
+            nw_grid_point_lat_deg=self.nw_grid_point_lat_deg,
+            nw_grid_point_lng_deg=self.nw_grid_point_lng_deg,
+            lat_spacing_deg=self.lat_spacing_deg,
+            lng_spacing_deg=self.lng_spacing_deg)
+
+    def latlng_to_rowcol(self, latitudes_deg, longitudes_deg):
+        """Converts coordinates from lat-long to row-column.
+
+        For details, see the module-level method latlng_to_rowcol.
+
+        :param latitudes_deg: See doc for latlng_to_rowcol.
+        :param longitudes_deg: Same.
+        :return: grid_rows: Same.
+        :return: grid_columns: Same.
+        """
+
+        return latlng_to_rowcol(
+            latitudes_deg, longitudes_deg,
+            nw_grid_point_lat_deg=self.nw_grid_point_lat_deg,
+            nw_grid_point_lng_deg=self.nw_grid_point_lng_deg,
+            lat_spacing_deg=self.lat_spacing_deg,
+            lng_spacing_deg=self.lng_spacing_deg)
+
+    def get_remapping_table(self, target_grid):
+        """Maps rows and columns in this grid to rows and columns in another.
+
+        Since both grids are regular in lat-long, the target row depends only on
+        the source row and the target column depends only on the source column.
+        Thus, grid point [i, j] in this grid corresponds to grid point
+        [target_rows[i], target_columns[j]] in the target grid, where
+        target_rows[i] = latlng_to_rowcol(rowcol_to_latlng(i)).
+
+        Tables are memoized, so each pair of grids is handled only once per
+        process.
+
+        M = number of rows in this grid
+        N = number of columns in this grid
+
+        :param target_grid: Another instance of `RadarGrid`.
+        :return: target_rows: length-M numpy array of row indices in target
+            grid (may be out of range).
+        :return: target_columns: length-N numpy array of column indices in
+            target grid (may be out of range).
+        """
+
+        cache_key = (self, target_grid)
+        if cache_key in _REMAPPING_TABLE_CACHE:
+            return _REMAPPING_TABLE_CACHE[cache_key]
+
+        source_rows = numpy.linspace(
+            0, self.num_grid_rows - 1, num=self.num_grid_rows, dtype=int)
+        source_columns = numpy.linspace(
+            0, self.num_grid_columns - 1, num=self.num_grid_columns, dtype=int)
+
+        latitudes_deg, _ = self.rowcol_to_latlng(
+            source_rows, numpy.full(self.num_grid_rows, 0, dtype=int))
+        _, longitudes_deg = self.rowcol_to_latlng(
+            numpy.full(self.num_grid_columns, 0, dtype=int), source_columns)
+
+        target_rows, _ = target_grid.latlng_to_rowcol(
+            latitudes_deg,
+            numpy.full(self.num_grid_rows, target_grid.nw_grid_point_lng_deg))
+        _, target_columns = target_grid.latlng_to_rowcol(
+            numpy.full(
+                self.num_grid_columns, target_grid.nw_grid_point_lat_deg),
+            longitudes_deg)
+
+        _REMAPPING_TABLE_CACHE[cache_key] = (target_rows, target_columns)
+        return target_rows, target_columns
+
+
 def get_center_of_grid(nw_grid_point_lat_deg=None, nw_grid_point_lng_deg=None,
                        lat_spacing_deg=None, lng_spacing_deg=None,
                        num_grid_rows=None, num_grid_columns=None):
@@ -777,7 +969,8 @@ def get_center_of_grid(nw_grid_point_lat_deg=None, nw_grid_point_lng_deg=None,
 
 
 def read_metadata_from_raw_file(netcdf_file_name, data_source=None,
-                                raise_error_if_fails=True):
+                                raise_error_if_fails=True,
+                                netcdf_contents=None):
     """Reads metadata raw (either MYRORSS or MRMS) file..
 
     This file should contain one radar field at one height and one time step.
@@ -787,6 +980,9 @@ def read_metadata_from_raw_file(netcdf_file_name, data_source=None,
     :param raise_error_if_fails: Boolean flag.  If True and file cannot be
         opened, this method will raise an error.  If False and file cannot be
         opened, this method will return None.
+    :param netcdf_contents: Contents of file (string).  If this is specified,
+        the file will be read from memory, rather than disk.  See doc for
+        `netcdf_io.open_netcdf`.
     :return: metadata_dict: Dictionary with the following keys.
     metadata_dict['nw_grid_point_lat_deg']: Latitude (deg N) of northwesternmost
         grid point.
@@ -806,9 +1002,9 @@ def read_metadata_from_raw_file(netcdf_file_name, data_source=None,
     metadata_dict['sentinel_values']: 1-D numpy array of sentinel values.
     """
 
-    error_checking.assert_file_exists(netcdf_file_name)
-    netcdf_dataset = netcdf_io.open_netcdf(netcdf_file_name,
-                                           raise_error_if_fails)
+    netcdf_dataset = netcdf_io.open_netcdf(
+        netcdf_file_name, raise_error_if_fails,
+        netcdf_contents=netcdf_contents)
     if netcdf_dataset is None:
         return None
 
@@ -849,7 +1045,8 @@ def read_metadata_from_raw_file(netcdf_file_name, data_source=None,
 
 def read_data_from_sparse_grid_file(netcdf_file_name, field_name_orig=None,
                                     data_source=None, sentinel_values=None,
-                                    raise_error_if_fails=True):
+                                    raise_error_if_fails=True,
+                                    netcdf_contents=None):
     """Reads sparse radar grid from raw (either MYRORSS or MRMS) file.
 
     This file should contain one radar field at one height and one time step.
@@ -862,6 +1059,9 @@ def read_data_from_sparse_grid_file(netcdf_file_name, field_name_orig=None,
     :param raise_error_if_fails: Boolean flag.  If True and file cannot be
         opened, this method will raise an error.  If False and file cannot be
         opened, this method will return None.
+    :param netcdf_contents: Contents of file (string).  If this is specified,
+        the file will be read from memory, rather than disk.  See doc for
+        `netcdf_io.open_netcdf`.
     :return: sparse_grid_table: pandas DataFrame with the following columns.
         Each row corresponds to one grid cell.
     sparse_grid_table.grid_row: Row index.
@@ -873,12 +1073,12 @@ def read_data_from_sparse_grid_file(netcdf_file_name, field_name_orig=None,
         second -- with the same radar measurement.
     """
 
-    error_checking.assert_file_exists(netcdf_file_name)
     error_checking.assert_is_numpy_array_without_nan(sentinel_values)
     error_checking.assert_is_numpy_array(sentinel_values, num_dimensions=1)
 
-    netcdf_dataset = netcdf_io.open_netcdf(netcdf_file_name,
-                                           raise_error_if_fails)
+    netcdf_dataset = netcdf_io.open_netcdf(
+        netcdf_file_name, raise_error_if_fails,
+        netcdf_contents=netcdf_contents)
     if netcdf_dataset is None:
         return None
 
@@ -902,6 +1102,10 @@ def read_data_from_sparse_grid_file(netcdf_file_name, field_name_orig=None,
             field_name: netcdf_dataset.variables[field_name_orig][:]}
 
     netcdf_dataset.close()
+    for this_key in sparse_grid_dict:
+        sparse_grid_dict[this_key] = netcdf_io.to_native_byte_order(
+            sparse_grid_dict[this_key])
+
     sparse_grid_table = pandas.DataFrame.from_dict(sparse_grid_dict)
     return _remove_sentinels_from_sparse_grid(
         sparse_grid_table, field_name, sentinel_values)
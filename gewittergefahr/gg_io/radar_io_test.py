@@ -1,5 +1,8 @@
 """Unit tests for radar_io.py."""
 
+import os
+import shutil
+import tempfile
 import unittest
 import numpy
 import pandas
@@ -23,13 +26,14 @@ NON_SHEAR_HEIGHTS_MRMS_M_AGL = numpy.array([radar_io.DEFAULT_HEIGHT_MRMS_M_AGL])
 REFL_HEIGHTS_M_AGL = numpy.array([500, 1000, 2000, 3000, 5000, 10000])
 REFL_HEIGHTS_ONE_BAD_M_AGL = numpy.array([500, 1000, 2000, 3456, 5000, 10000])
 
-# The following constants are used to test _get_pathless_raw_file_pattern and
-# _get_pathless_raw_file_name.
+# The following constants are used to test _get_pathless_raw_file_pattern,
+# _get_pathless_raw_file_name, and _raw_file_name_to_time.
 FILE_TIME_UNIX_SEC = 1507234802  # 202002 UTC 5 Oct 2017
 FILE_SPC_DATE_UNIX_SEC = 1507234802
 PATHLESS_ZIPPED_FILE_NAME = '20171005-202002.netcdf.gz'
 PATHLESS_UNZIPPED_FILE_NAME = '20171005-202002.netcdf'
 PATHLESS_FILE_PATTERN = '20171005-2020*.netcdf*'
+PATHLESS_NON_RAW_FILE_NAME = '20171005-202002.netcdf.tmp'
 
 # The following constants are used to test field_and_height_arrays_to_dict.
 UNIQUE_FIELD_NAMES = [
@@ -136,6 +140,35 @@ NUM_GRID_COLUMNS = 7001
 GRID_CENTER_LATITUDE_DEG = 37.5
 GRID_CENTER_LONGITUDE_DEG = 265.
 
+# The following constants are used to test RadarGrid.
+GRID_METADATA_DICT = {
+    radar_io.NW_GRID_POINT_LAT_COLUMN: NW_GRID_POINT_LAT_DEG,
+    radar_io.NW_GRID_POINT_LNG_COLUMN: NW_GRID_POINT_LNG_DEG,
+    radar_io.LAT_SPACING_COLUMN: LAT_SPACING_DEG,
+    radar_io.LNG_SPACING_COLUMN: LNG_SPACING_DEG,
+    radar_io.NUM_LAT_COLUMN: 11, radar_io.NUM_LNG_COLUMN: 11,
+    radar_io.UNIX_TIME_COLUMN: FILE_TIME_UNIX_SEC
+}
+
+FINE_GRID_METADATA_DICT = {
+    radar_io.NW_GRID_POINT_LAT_COLUMN: 54.99,
+    radar_io.NW_GRID_POINT_LNG_COLUMN: -129.99,
+    radar_io.LAT_SPACING_COLUMN: 0.005,
+    radar_io.LNG_SPACING_COLUMN: 0.005,
+    radar_io.NUM_LAT_COLUMN: 21, radar_io.NUM_LNG_COLUMN: 21
+}
+
+REMAPPED_ROW_INDICES = numpy.linspace(-2, 18, num=11)
+REMAPPED_COLUMN_INDICES = numpy.linspace(-2, 18, num=11)
+
+# The following constants are used to test flatten_ragged_arrays and
+# unflatten_ragged_arrays.
+RAGGED_ARRAYS = [
+    numpy.array([1, 2, 3], dtype=int), numpy.array([], dtype=int),
+    numpy.array([4, 5], dtype=int)]
+FLATTENED_VALUES = numpy.array([1, 2, 3, 4, 5], dtype=int)
+RAGGED_ARRAY_OFFSETS = numpy.array([0, 3, 3, 5], dtype=int)
+
 
 class RadarIoTests(unittest.TestCase):
     """Each method is a unit test for radar_io.py."""
@@ -360,6 +393,33 @@ class RadarIoTests(unittest.TestCase):
             FILE_TIME_UNIX_SEC, zipped=False)
         self.assertTrue(this_pathless_file_name == PATHLESS_UNZIPPED_FILE_NAME)
 
+    def test_raw_file_name_to_time_zipped(self):
+        """Ensures correct output from _raw_file_name_to_time.
+
+        In this case, the file is zipped.
+        """
+
+        self.assertTrue(radar_io._raw_file_name_to_time(
+            PATHLESS_ZIPPED_FILE_NAME) == FILE_TIME_UNIX_SEC)
+
+    def test_raw_file_name_to_time_unzipped(self):
+        """Ensures correct output from _raw_file_name_to_time.
+
+        In this case, the file is unzipped.
+        """
+
+        self.assertTrue(radar_io._raw_file_name_to_time(
+            PATHLESS_UNZIPPED_FILE_NAME) == FILE_TIME_UNIX_SEC)
+
+    def test_raw_file_name_to_time_non_raw(self):
+        """Ensures correct output from _raw_file_name_to_time.
+
+        In this case, the file is not a raw file.
+        """
+
+        self.assertTrue(radar_io._raw_file_name_to_time(
+            PATHLESS_NON_RAW_FILE_NAME) is None)
+
     def test_remove_sentinels_from_sparse_grid(self):
         """Ensures correct output from _remove_sentinels_from_sparse_grid."""
 
@@ -473,6 +533,37 @@ class RadarIoTests(unittest.TestCase):
             raise_error_if_missing=False)
         self.assertTrue(this_raw_file_name == RAW_FILE_NAME_MYRORSS)
 
+    def test_find_raw_file_two_spellings(self):
+        """Ensures correct output from find_raw_file.
+
+        In this case, the file exists and the top-level directory is spelled
+        two ways (with and without a trailing slash).
+        """
+
+        this_top_directory_name = tempfile.mkdtemp()
+        this_relative_file_name = RAW_FILE_NAME_MYRORSS[
+            len(TOP_RAW_DIRECTORY_NAME):]
+
+        try:
+            os.makedirs(os.path.dirname(
+                this_top_directory_name + this_relative_file_name))
+            open(this_top_directory_name + this_relative_file_name, 'w').close()
+
+            for this_suffix in ['/', '']:
+                this_raw_file_name = radar_io.find_raw_file(
+                    unix_time_sec=FILE_TIME_UNIX_SEC,
+                    spc_date_unix_sec=FILE_SPC_DATE_UNIX_SEC,
+                    field_name=LL_SHEAR_NAME_NEW,
+                    data_source=radar_io.MYRORSS_SOURCE_ID,
+                    top_directory_name=this_top_directory_name + this_suffix,
+                    raise_error_if_missing=True)
+
+                self.assertTrue(this_raw_file_name == '{0:s}{1:s}{2:s}'.format(
+                    this_top_directory_name, this_suffix,
+                    this_relative_file_name))
+        finally:
+            shutil.rmtree(this_top_directory_name)
+
     def test_find_raw_file_mrms(self):
         """Ensures correct output from find_raw_file."""
 
@@ -526,6 +617,80 @@ class RadarIoTests(unittest.TestCase):
         self.assertTrue(numpy.allclose(
             these_column_indices, GRID_COLUMN_INDICES, atol=TOLERANCE))
 
+    def test_radar_grid_equal(self):
+        """Ensures that RadarGrid objects compare by grid parameters.
+
+        Metadata that do not describe the grid (e.g., valid time) are ignored.
+        """
+
+        this_metadata_dict = {
+            k: GRID_METADATA_DICT[k] for k in radar_io.GRID_METADATA_KEYS}
+        this_radar_grid = radar_io.RadarGrid(this_metadata_dict)
+
+        self.assertTrue(
+            this_radar_grid == radar_io.RadarGrid(GRID_METADATA_DICT))
+        self.assertTrue(
+            hash(this_radar_grid) ==
+            hash(radar_io.RadarGrid(GRID_METADATA_DICT)))
+        self.assertTrue(
+            this_radar_grid != radar_io.RadarGrid(FINE_GRID_METADATA_DICT))
+
+    def test_radar_grid_rowcol_to_latlng(self):
+        """Ensures correct output from RadarGrid.rowcol_to_latlng."""
+
+        these_latitudes_deg, these_longitudes_deg = radar_io.RadarGrid(
+            GRID_METADATA_DICT).rowcol_to_latlng(
+                GRID_ROW_INDICES, GRID_COLUMN_INDICES)
+
+        self.assertTrue(numpy.allclose(
+            these_latitudes_deg, GRID_POINT_LATITUDES_DEG, atol=TOLERANCE))
+        self.assertTrue(numpy.allclose(
+            these_longitudes_deg, GRID_POINT_LONGITUDES_DEG, atol=TOLERANCE))
+
+    def test_radar_grid_latlng_to_rowcol(self):
+        """Ensures correct output from RadarGrid.latlng_to_rowcol."""
+
+        these_row_indices, these_column_indices = radar_io.RadarGrid(
+            GRID_METADATA_DICT).latlng_to_rowcol(
+                GRID_POINT_LATITUDES_DEG, GRID_POINT_LONGITUDES_DEG)
+
+        self.assertTrue(numpy.allclose(
+            these_row_indices, GRID_ROW_INDICES, atol=TOLERANCE))
+        self.assertTrue(numpy.allclose(
+            these_column_indices, GRID_COLUMN_INDICES, atol=TOLERANCE))
+
+    def test_get_remapping_table(self):
+        """Ensures correct output from RadarGrid.get_remapping_table."""
+
+        this_radar_grid = radar_io.RadarGrid(GRID_METADATA_DICT)
+        these_row_indices, these_column_indices = (
+            this_radar_grid.get_remapping_table(
+                radar_io.RadarGrid(FINE_GRID_METADATA_DICT)))
+
+        self.assertTrue(numpy.allclose(
+            these_row_indices, REMAPPED_ROW_INDICES, atol=TOLERANCE))
+        self.assertTrue(numpy.allclose(
+            these_column_indices, REMAPPED_COLUMN_INDICES, atol=TOLERANCE))
+
+    def test_flatten_ragged_arrays(self):
+        """Ensures correct output from flatten_ragged_arrays."""
+
+        these_values, these_offsets = radar_io.flatten_ragged_arrays(
+            RAGGED_ARRAYS)
+        self.assertTrue(numpy.array_equal(these_values, FLATTENED_VALUES))
+        self.assertTrue(numpy.array_equal(these_offsets, RAGGED_ARRAY_OFFSETS))
+
+    def test_unflatten_ragged_arrays(self):
+        """Ensures correct output from unflatten_ragged_arrays."""
+
+        these_arrays = radar_io.unflatten_ragged_arrays(
+            FLATTENED_VALUES, RAGGED_ARRAY_OFFSETS)
+
+        self.assertTrue(len(these_arrays) == len(RAGGED_ARRAYS))
+        for k in range(len(RAGGED_ARRAYS)):
+            self.assertTrue(
+                numpy.array_equal(these_arrays[k], RAGGED_ARRAYS[k]))
+
     def test_get_center_of_grid(self):
         """Ensures correct output from get_center_of_grid."""
 
@@ -10,6 +10,7 @@ import copy
 import os.path
 import numpy
 import pandas
+import netCDF4
 from gewittergefahr.gg_utils import time_conversion
 from gewittergefahr.gg_utils import time_periods
 from gewittergefahr.gg_utils import longitude_conversion as lng_conversion
@@ -18,6 +19,7 @@ from gewittergefahr.gg_utils import file_system_utils
 from gewittergefahr.gg_utils import error_checking
 
 TOLERANCE = 1e-6
+DUPLICATE_QUANTIZATION_FACTOR = 100.
 WIND_DIR_DEFAULT_DEG = 0.
 
 DEGREES_TO_RADIANS = numpy.pi / 180
@@ -27,7 +29,10 @@ HOURS_TO_SECONDS = 3600
 TIME_FORMAT_MONTH_YEAR = '%Y%m'
 TIME_FORMAT_SECOND = '%Y-%m-%d-%H%M%S'
 PROCESSED_FILE_PREFIX = 'wind-observations'
-PROCESSED_FILE_EXTENSION = '.csv'
+CSV_FILE_EXTENSION = '.csv'
+NETCDF_FILE_EXTENSION = '.nc'
+PROCESSED_FILE_EXTENSION = CSV_FILE_EXTENSION
+VALID_PROCESSED_FILE_EXTENSIONS = [CSV_FILE_EXTENSION, NETCDF_FILE_EXTENSION]
 
 HFMETAR_DATA_SOURCE = 'hfmetar'
 MADIS_DATA_SOURCE = 'madis'
@@ -109,6 +114,17 @@ WIND_COLUMN_TYPE_DICT.update({TIME_COLUMN: numpy.int64,
                               U_WIND_COLUMN: numpy.float64,
                               V_WIND_COLUMN: numpy.float64})
 
+# The following constants are used for processed files in NetCDF format.
+# String columns are stored as categories (each observation has an index into
+# a list of unique strings), and most float columns are stored as 32-bit.
+STRING_WIND_COLUMNS = [STATION_ID_COLUMN, STATION_NAME_COLUMN]
+NETCDF_OBSERVATION_DIMENSION = 'observation'
+NETCDF_CATEGORY_DIMENSION_SUFFIX = '_category'
+NETCDF_CATEGORY_INDEX_SUFFIX = '_index'
+NETCDF_COLUMN_TYPE_DICT = {
+    LATITUDE_COLUMN: 'f8', LONGITUDE_COLUMN: 'f8', ELEVATION_COLUMN: 'f4',
+    TIME_COLUMN: 'i8', U_WIND_COLUMN: 'f4', V_WIND_COLUMN: 'f4'}
+
 
 def _primary_and_secondary_sources_to_table():
     """Creates pandas DataFrame with all pairs of primary/secondary data source.
@@ -283,40 +299,267 @@ def _check_wind_directions(wind_directions_deg):
     return numpy.where(numpy.invert(valid_flags))[0]
 
 
+def _quantize_to_hundredths(input_values):
+    """Rounds values to the nearest 0.01 and multiplies by 100.
+
+    The result is the same as formatting each value with "{0:.2f}" (which
+    rounds the exact binary value), but only values very close to a rounding
+    tie are actually formatted as strings.
+
+    :param input_values: numpy array of floats.
+    :return: quantized_values: numpy array (same shape) of rounded values, in
+        hundredths.  NaN values stay NaN.
+    """
+
+    scaled_values = input_values * DUPLICATE_QUANTIZATION_FACTOR
+    quantized_values = numpy.round(scaled_values)
+
+    with numpy.errstate(invalid='ignore'):
+        near_tie_flags = numpy.absolute(
+            numpy.absolute(scaled_values - numpy.floor(scaled_values)) - 0.5
+        ) < TOLERANCE
+
+    for i in numpy.where(near_tie_flags)[0]:
+        quantized_values[i] = numpy.round(
+            float('{0:.2f}'.format(input_values[i])) *
+            DUPLICATE_QUANTIZATION_FACTOR)
+
+    return quantized_values
+
+
 def _remove_duplicate_observations(wind_table):
     """Removes duplicate wind observations.
 
+    Two observations are considered duplicates if they have the same time and
+    the same latitude, longitude, and wind speed to 2 decimal places.  Rather
+    than formatting a string for each observation, this method quantizes the
+    values (see _quantize_to_hundredths) and finds duplicate rows with pandas.
+
     :param wind_table: See documentation for write_processed_file.
-    :return: wind_table: Same as input, but maybe with fewer rows.
+    :return: wind_table: Same as input, but maybe with fewer rows.  Of each set
+        of duplicates, only the first is kept.
     """
 
     wind_speeds_m_s01 = numpy.sqrt(
         wind_table[U_WIND_COLUMN].values ** 2 +
         wind_table[V_WIND_COLUMN].values ** 2)
 
-    num_observations = len(wind_speeds_m_s01)
-    observation_strings = [''] * num_observations
-    for i in range(num_observations):
-        observation_strings[i] = '{0:.2f}_{1:.2f}_{2:d}_{3:.2f}'.format(
-            wind_table[LATITUDE_COLUMN].values[i],
-            wind_table[LONGITUDE_COLUMN].values[i],
-            wind_table[TIME_COLUMN].values[i], wind_speeds_m_s01[i])
-
-    _, unique_indices = numpy.unique(
-        numpy.asarray(observation_strings), return_index=True)
-    return wind_table.iloc[unique_indices]
-
-
-def _get_pathless_processed_file_name(start_time_unix_sec=None,
-                                      end_time_unix_sec=None,
-                                      primary_source=None,
-                                      secondary_source=None):
+    quantized_value_dict = {
+        LATITUDE_COLUMN: _quantize_to_hundredths(
+            wind_table[LATITUDE_COLUMN].values),
+        LONGITUDE_COLUMN: _quantize_to_hundredths(
+            wind_table[LONGITUDE_COLUMN].values),
+        TIME_COLUMN: wind_table[TIME_COLUMN].values,
+        U_WIND_COLUMN: _quantize_to_hundredths(wind_speeds_m_s01)
+    }
+
+    duplicate_flags = pandas.DataFrame.from_dict(
+        quantized_value_dict).duplicated(keep='first').values
+    if not numpy.any(duplicate_flags):
+        return wind_table
+
+    return wind_table.iloc[numpy.where(numpy.invert(duplicate_flags))[0]]
+
+
+def _check_file_extension(file_extension):
+    """Ensures that file extension is valid for processed wind files.
+
+    :param file_extension: File extension (must be in
+        VALID_PROCESSED_FILE_EXTENSIONS).
+    :raises: ValueError: if file_extension is not in
+        VALID_PROCESSED_FILE_EXTENSIONS.
+    """
+
+    error_checking.assert_is_string(file_extension)
+    if file_extension not in VALID_PROCESSED_FILE_EXTENSIONS:
+        error_string = (
+            '\n\n' + str(VALID_PROCESSED_FILE_EXTENSIONS) +
+            '\n\nValid file extensions (listed above) do not include "' +
+            file_extension + '".')
+        raise ValueError(error_string)
+
+
+def _file_name_to_extension(processed_file_name):
+    """Returns extension of processed wind file.
+
+    :param processed_file_name: Path to processed wind file.
+    :return: file_extension: File extension (in
+        VALID_PROCESSED_FILE_EXTENSIONS).
+    :raises: ValueError: if extension is not in VALID_PROCESSED_FILE_EXTENSIONS.
+    """
+
+    error_checking.assert_is_string(processed_file_name)
+    _, file_extension = os.path.splitext(processed_file_name)
+    _check_file_extension(file_extension)
+    return file_extension
+
+
+def _strings_to_category_indices(input_strings, existing_categories):
+    """Converts strings to indices in list of categories.
+
+    N = number of strings
+
+    :param input_strings: length-N numpy array of strings.
+    :param existing_categories: 1-D list of existing categories (unique
+        strings).
+    :return: category_indices: length-N numpy array of indices into
+        `existing_categories + new_categories`.
+    :return: new_categories: 1-D list of strings in `input_strings` that were
+        not in `existing_categories`.
+    """
+
+    unique_strings, orig_to_unique_indices = numpy.unique(
+        input_strings, return_inverse=True)
+
+    category_to_index_dict = dict(
+        zip(existing_categories, range(len(existing_categories))))
+    new_categories = []
+    unique_to_category_indices = numpy.full(
+        len(unique_strings), -1, dtype=int)
+
+    for i in range(len(unique_strings)):
+        if unique_strings[i] not in category_to_index_dict:
+            category_to_index_dict[unique_strings[i]] = len(
+                category_to_index_dict)
+            new_categories.append(unique_strings[i])
+
+        unique_to_category_indices[i] = category_to_index_dict[
+            unique_strings[i]]
+
+    return (unique_to_category_indices[orig_to_unique_indices].astype(
+        numpy.int32), new_categories)
+
+
+def _write_processed_file_netcdf(wind_table, netcdf_file_name, append):
+    """Writes wind observations to NetCDF file.
+
+    :param wind_table: See documentation for write_processed_file.
+    :param netcdf_file_name: Path to output file.
+    :param append: Boolean flag.  If True, will append to existing file.  If
+        False, will create new file (overwriting the old one if necessary).
+    """
+
+    if append:
+        netcdf_dataset = netCDF4.Dataset(netcdf_file_name, 'a')
+    else:
+        netcdf_dataset = netCDF4.Dataset(
+            netcdf_file_name, 'w', format='NETCDF4')
+        netcdf_dataset.createDimension(NETCDF_OBSERVATION_DIMENSION, None)
+
+        for this_column in STRING_WIND_COLUMNS:
+            this_dimension_name = this_column + NETCDF_CATEGORY_DIMENSION_SUFFIX
+            netcdf_dataset.createDimension(this_dimension_name, None)
+            netcdf_dataset.createVariable(
+                this_column, str, (this_dimension_name,))
+            netcdf_dataset.createVariable(
+                this_column + NETCDF_CATEGORY_INDEX_SUFFIX, 'i4',
+                (NETCDF_OBSERVATION_DIMENSION,), zlib=True)
+
+        for this_column in NETCDF_COLUMN_TYPE_DICT:
+            netcdf_dataset.createVariable(
+                this_column, NETCDF_COLUMN_TYPE_DICT[this_column],
+                (NETCDF_OBSERVATION_DIMENSION,), zlib=True)
+
+    num_existing_obs = len(
+        netcdf_dataset.dimensions[NETCDF_OBSERVATION_DIMENSION])
+    num_new_obs = len(wind_table.index)
+    obs_slice = slice(num_existing_obs, num_existing_obs + num_new_obs)
+
+    for this_column in STRING_WIND_COLUMNS:
+        this_dimension_name = this_column + NETCDF_CATEGORY_DIMENSION_SUFFIX
+        num_existing_categories = len(
+            netcdf_dataset.dimensions[this_dimension_name])
+        if num_existing_categories == 0:
+            these_existing_categories = []
+        else:
+            these_existing_categories = [
+                c.encode('utf-8') for c in
+                netcdf_dataset.variables[this_column][:]]
+
+        these_category_indices, these_new_categories = (
+            _strings_to_category_indices(
+                wind_table[this_column].values.astype(str),
+                these_existing_categories))
+
+        if len(these_new_categories):
+            netcdf_dataset.variables[this_column][
+                num_existing_categories:
+                (num_existing_categories + len(these_new_categories))
+            ] = numpy.array(these_new_categories, dtype=object)
+
+        netcdf_dataset.variables[
+            this_column + NETCDF_CATEGORY_INDEX_SUFFIX
+        ][obs_slice] = these_category_indices
+
+    for this_column in NETCDF_COLUMN_TYPE_DICT:
+        netcdf_dataset.variables[this_column][obs_slice] = wind_table[
+            this_column].values
+
+    netcdf_dataset.close()
+
+
+def _read_processed_file_netcdf(
+        netcdf_file_name, column_names, start_time_unix_sec,
+        end_time_unix_sec):
+    """Reads wind observations from NetCDF file.
+
+    :param netcdf_file_name: Path to input file.
+    :param column_names: 1-D list of columns to read.
+    :param start_time_unix_sec: See documentation for read_processed_file.
+    :param end_time_unix_sec: Same.
+    :return: wind_table: pandas DataFrame with columns in `column_names`.
+    """
+
+    netcdf_dataset = netCDF4.Dataset(netcdf_file_name)
+    netcdf_dataset.set_auto_mask(False)
+
+    unix_times_sec = netcdf_dataset.variables[TIME_COLUMN][:]
+    good_indices = numpy.where(numpy.logical_and(
+        unix_times_sec >= start_time_unix_sec,
+        unix_times_sec <= end_time_unix_sec))[0]
+
+    if len(good_indices):
+        first_index = good_indices[0]
+        good_indices = good_indices - first_index
+        obs_slice = slice(first_index, first_index + good_indices[-1] + 1)
+    else:
+        obs_slice = slice(0, 0)
+
+    wind_dict = {}
+    for this_column in column_names:
+        if this_column in STRING_WIND_COLUMNS:
+            these_category_indices = netcdf_dataset.variables[
+                this_column + NETCDF_CATEGORY_INDEX_SUFFIX
+            ][obs_slice][good_indices]
+
+            if len(these_category_indices):
+                these_categories = numpy.array([
+                    c.encode('utf-8') for c in
+                    netcdf_dataset.variables[this_column][:]])
+                wind_dict[this_column] = these_categories[
+                    these_category_indices]
+            else:
+                wind_dict[this_column] = numpy.array([], dtype=str)
+
+            continue
+
+        wind_dict[this_column] = netcdf_dataset.variables[this_column][
+            obs_slice][good_indices].astype(WIND_COLUMN_TYPE_DICT[this_column])
+
+    netcdf_dataset.close()
+    return pandas.DataFrame.from_dict(wind_dict)[column_names]
+
+
+def _get_pathless_processed_file_name(
+        start_time_unix_sec=None, end_time_unix_sec=None, primary_source=None,
+        secondary_source=None, file_extension=PROCESSED_FILE_EXTENSION):
     """Generates pathless name for processed wind file.
 
     :param start_time_unix_sec: Start time.
     :param end_time_unix_sec: End time.
     :param primary_source: String ID for primary data source.
     :param secondary_source: String ID for secondary data source.
+    :param file_extension: File extension (in VALID_PROCESSED_FILE_EXTENSIONS).
     :return: pathless_processed_file_name: Pathless name for processed wind
         file.
     """
@@ -332,7 +575,7 @@ def _get_pathless_processed_file_name(start_time_unix_sec=None,
             start_time_unix_sec, TIME_FORMAT_SECOND),
         time_conversion.unix_sec_to_string(
             end_time_unix_sec, TIME_FORMAT_SECOND),
-        PROCESSED_FILE_EXTENSION)
+        file_extension)
 
 
 def check_data_sources(
@@ -728,7 +971,8 @@ def read_station_metadata_from_processed_file(csv_file_name):
 
 def find_processed_file(start_time_unix_sec=None, end_time_unix_sec=None,
                         primary_source=None, secondary_source=None,
-                        top_directory_name=None, raise_error_if_missing=True):
+                        top_directory_name=None, raise_error_if_missing=True,
+                        file_extension=PROCESSED_FILE_EXTENSION):
     """Finds processed wind file on local machine.
 
     :param start_time_unix_sec: Start time.
@@ -739,6 +983,8 @@ def find_processed_file(start_time_unix_sec=None, end_time_unix_sec=None,
         files.
     :param raise_error_if_missing: Boolean flag.  If True and file is missing,
         this method will raise an error.
+    :param file_extension: File extension (in VALID_PROCESSED_FILE_EXTENSIONS).
+        This determines the file format (CSV or NetCDF).
     :return: processed_file_name: Path to processed wind file.  If
         raise_error_if_missing = False and file is missing, this will be the
         *expected* path.
@@ -748,11 +994,12 @@ def find_processed_file(start_time_unix_sec=None, end_time_unix_sec=None,
     check_data_sources(primary_source, secondary_source, allow_merged=True)
     error_checking.assert_is_string(top_directory_name)
     error_checking.assert_is_boolean(raise_error_if_missing)
+    _check_file_extension(file_extension)
 
     pathless_file_name = _get_pathless_processed_file_name(
         start_time_unix_sec=start_time_unix_sec,
         end_time_unix_sec=end_time_unix_sec, primary_source=primary_source,
-        secondary_source=secondary_source)
+        secondary_source=secondary_source, file_extension=file_extension)
 
     if primary_source == MADIS_DATA_SOURCE:
         combined_source = '{0:s}/{1:s}'.format(primary_source, secondary_source)
@@ -775,7 +1022,8 @@ def find_processed_file(start_time_unix_sec=None, end_time_unix_sec=None,
 def find_processed_hourly_files(start_time_unix_sec=None,
                                 end_time_unix_sec=None, primary_source=None,
                                 secondary_source=None, top_directory_name=None,
-                                raise_error_if_missing=True):
+                                raise_error_if_missing=True,
+                                file_extension=PROCESSED_FILE_EXTENSION):
     """Finds processed hourly wind files on local machine.
 
     N = number of hours in time period (start_time_unix_sec...end_time_unix_sec)
@@ -788,6 +1036,7 @@ def find_processed_hourly_files(start_time_unix_sec=None,
         files.
     :param raise_error_if_missing: Boolean flag.  If True and *any* file is
         missing, this method will raise an error.
+    :param file_extension: See documentation for find_processed_file.
     :return: processed_file_names: length-N list of paths to processed files.
     :return: hours_unix_sec: length-N numpy array of corresponding hours.
     """
@@ -811,12 +1060,14 @@ def find_processed_hourly_files(start_time_unix_sec=None,
             end_time_unix_sec=hours_unix_sec[i] + HOURS_TO_SECONDS - 1,
             primary_source=primary_source, secondary_source=secondary_source,
             top_directory_name=top_directory_name,
-            raise_error_if_missing=raise_error_if_missing)
+            raise_error_if_missing=raise_error_if_missing,
+            file_extension=file_extension)
 
     return processed_file_names, hours_unix_sec
 
 
-def write_processed_file(wind_table, csv_file_name=None, write_mode='w'):
+def write_processed_file(wind_table, processed_file_name=None,
+                         write_mode='w'):
     """Writes wind observations to file.
 
     This is considered a "processed file," as opposed to a "raw file".  A "raw
@@ -824,6 +1075,11 @@ def write_processed_file(wind_table, csv_file_name=None, write_mode='w'):
     said database.  For examples, see `madis_io.read_winds_from_raw_file` and
     `ok_mesonet_io.read_winds_from_raw_file`.
 
+    File format is determined by extension of `processed_file_name`.  If the
+    extension is ".csv", this is a CSV file.  If the extension is ".nc", this
+    is a NetCDF file, in which station IDs and names are stored as categories
+    and most floats are stored as 32-bit.  NetCDF files are much faster to read.
+
     :param wind_table: pandas DataFrame with the following columns.
     wind_table.station_id: String ID for station.
     wind_table.station_name: Verbose name for station.
@@ -834,23 +1090,36 @@ def write_processed_file(wind_table, csv_file_name=None, write_mode='w'):
     wind_table.u_wind_m_s01: u-wind (metres per second).
     wind_table.v_wind_m_s01: v-wind (metres per second).
 
-    :param csv_file_name: Path to output file.
-    :param write_mode: Any string accepted by the built-in method `open`.
+    :param processed_file_name: Path to output file.
+    :param write_mode: Any string accepted by the built-in method `open`.  If
+        write_mode contains "a" and the file already exists, observations will
+        be appended to the file.
     """
 
     error_checking.assert_columns_in_dataframe(wind_table, WIND_COLUMNS)
-    file_system_utils.mkdir_recursive_if_necessary(file_name=csv_file_name)
+    file_extension = _file_name_to_extension(processed_file_name)
+    file_system_utils.mkdir_recursive_if_necessary(
+        file_name=processed_file_name)
 
-    write_header = not os.path.isfile(csv_file_name) or 'w' in write_mode
-    wind_table.to_csv(csv_file_name, header=write_header, columns=WIND_COLUMNS,
-                      index=False, mode=write_mode)
+    create_new_file = (
+        not os.path.isfile(processed_file_name) or 'w' in write_mode)
+
+    if file_extension == NETCDF_FILE_EXTENSION:
+        _write_processed_file_netcdf(
+            wind_table, processed_file_name, append=not create_new_file)
+        return
+
+    wind_table.to_csv(
+        processed_file_name, header=create_new_file, columns=WIND_COLUMNS,
+        index=False, mode=write_mode)
 
 
 def write_processed_hourly_files(wind_table, write_mode='w',
                                  start_time_unix_sec=None,
                                  end_time_unix_sec=None, primary_source=None,
                                  secondary_source=None,
-                                 top_directory_name=None):
+                                 top_directory_name=None,
+                                 file_extension=PROCESSED_FILE_EXTENSION):
     """Writes wind observations to hourly files.
 
     N = number of hours in time period (start_time_unix_sec...end_time_unix_sec)
@@ -863,6 +1132,7 @@ def write_processed_hourly_files(wind_table, write_mode='w',
     :param secondary_source: String ID for secondary data source.
     :param top_directory_name: Name of top-level directory with processed wind
         files.
+    :param file_extension: See documentation for find_processed_file.
     :return: processed_file_names: length-N list of paths to processed files.
     """
 
@@ -872,7 +1142,7 @@ def write_processed_hourly_files(wind_table, write_mode='w',
             end_time_unix_sec=end_time_unix_sec, primary_source=primary_source,
             secondary_source=secondary_source,
             top_directory_name=top_directory_name,
-            raise_error_if_missing=False))
+            raise_error_if_missing=False, file_extension=file_extension))
 
     hour_end_times_unix_sec = hour_start_times_unix_sec + HOURS_TO_SECONDS - 1
     num_hours = len(hour_start_times_unix_sec)
@@ -885,13 +1155,15 @@ def write_processed_hourly_files(wind_table, write_mode='w',
 
         write_processed_file(
             wind_table.iloc[this_hour_indices],
-            csv_file_name=processed_file_names[i], write_mode=write_mode)
+            processed_file_name=processed_file_names[i], write_mode=write_mode)
 
     return processed_file_names
 
 
 def merge_data_sources_by_hour(
-        start_time_unix_sec, end_time_unix_sec, top_directory_name):
+        start_time_unix_sec, end_time_unix_sec, top_directory_name,
+        input_file_extension=PROCESSED_FILE_EXTENSION,
+        output_file_extension=PROCESSED_FILE_EXTENSION):
     """For each hour in time period, merges files from all data sources.
 
     N = number of hours in period (start_time_unix_sec...end_time_unix_sec)
@@ -900,6 +1172,9 @@ def merge_data_sources_by_hour(
     :param end_time_unix_sec: End of time period.
     :param top_directory_name: Name of top-level directory with processed wind
         files (both input and output).
+    :param input_file_extension: Extension of input files (see documentation
+        for find_processed_file).
+    :param output_file_extension: Extension of output files.
     :return: merged_file_names: length-N list of paths to output files.
     """
 
@@ -920,7 +1195,8 @@ def merge_data_sources_by_hour(
                     primary_and_secondary_source_pairs_as_table[
                         SECONDARY_SOURCE_COLUMN].values[j],
                     top_directory_name=top_directory_name,
-                    raise_error_if_missing=True))
+                    raise_error_if_missing=True,
+                    file_extension=input_file_extension))
 
             num_hours = len(hours_unix_sec)
             input_file_name_matrix = numpy.full(
@@ -936,7 +1212,8 @@ def merge_data_sources_by_hour(
                 secondary_source=primary_and_secondary_source_pairs_as_table[
                     SECONDARY_SOURCE_COLUMN].values[j],
                 top_directory_name=top_directory_name,
-                raise_error_if_missing=True)
+                raise_error_if_missing=True,
+                file_extension=input_file_extension)
 
     merged_file_names = [''] * num_hours
     for i in range(num_hours):
@@ -959,21 +1236,72 @@ def merge_data_sources_by_hour(
             start_time_unix_sec=hours_unix_sec[i],
             end_time_unix_sec=hours_unix_sec[i] + HOURS_TO_SECONDS - 1,
             primary_source=MERGED_DATA_SOURCE,
-            top_directory_name=top_directory_name, raise_error_if_missing=False)
+            top_directory_name=top_directory_name, raise_error_if_missing=False,
+            file_extension=output_file_extension)
         write_processed_file(
             this_wind_table, merged_file_names[i], write_mode='w')
 
     return merged_file_names
 
 
-def read_processed_file(csv_file_name):
+def read_processed_file(processed_file_name, column_names=None,
+                        start_time_unix_sec=None, end_time_unix_sec=None):
     """Reads wind observations from processed file.
 
-    Path to input file.
-    :return: wind_table: See documentation for write_processed_file.
+    File format (CSV or NetCDF) is determined by extension of
+    `processed_file_name` (see documentation for write_processed_file).  For
+    NetCDF files, only the requested columns are read and observations outside
+    the time window are never converted to a table.
+
+    :param processed_file_name: Path to input file.
+    :param column_names: 1-D list of columns to read (must be a subset of
+        WIND_COLUMNS).  If None, will read all columns.
+    :param start_time_unix_sec: Start of time window.  Observations before this
+        time will not be returned.  If None, there is no lower limit.
+    :param end_time_unix_sec: End of time window.  Observations after this time
+        will not be returned.  If None, there is no upper limit.
+    :return: wind_table: pandas DataFrame with columns in `column_names` (see
+        documentation for write_processed_file).
     """
 
-    error_checking.assert_file_exists(csv_file_name)
-    return pandas.read_csv(
-        csv_file_name, header=0, usecols=WIND_COLUMNS,
-        dtype=WIND_COLUMN_TYPE_DICT)
+    error_checking.assert_file_exists(processed_file_name)
+    file_extension = _file_name_to_extension(processed_file_name)
+
+    if column_names is None:
+        column_names = copy.deepcopy(WIND_COLUMNS)
+    else:
+        error_checking.assert_is_string_list(column_names)
+        for this_column in column_names:
+            if this_column not in WIND_COLUMNS:
+                error_string = (
+                    '\n\n' + str(WIND_COLUMNS) + '\n\nValid columns (listed '
+                    'above) do not include "' + this_column + '".')
+                raise ValueError(error_string)
+
+    if start_time_unix_sec is None:
+        start_time_unix_sec = numpy.iinfo(numpy.int64).min
+    else:
+        error_checking.assert_is_integer(start_time_unix_sec)
+    if end_time_unix_sec is None:
+        end_time_unix_sec = numpy.iinfo(numpy.int64).max
+    else:
+        error_checking.assert_is_integer(end_time_unix_sec)
+
+    if file_extension == NETCDF_FILE_EXTENSION:
+        return _read_processed_file_netcdf(
+            processed_file_name, column_names=column_names,
+            start_time_unix_sec=start_time_unix_sec,
+            end_time_unix_sec=end_time_unix_sec)
+
+    columns_to_read = list(set(column_names + [TIME_COLUMN]))
+    wind_table = pandas.read_csv(
+        processed_file_name, header=0, usecols=columns_to_read,
+        dtype={c: WIND_COLUMN_TYPE_DICT[c] for c in columns_to_read})
+
+    good_flags = numpy.logical_and(
+        wind_table[TIME_COLUMN].values >= start_time_unix_sec,
+        wind_table[TIME_COLUMN].values <= end_time_unix_sec)
+    if numpy.all(good_flags):
+        return wind_table[column_names]
+
+    return wind_table[column_names].loc[good_flags].reset_index(drop=True)
@@ -1,5 +1,7 @@
 """Unit tests for raw_wind_io.py."""
 
+import shutil
+import tempfile
 import unittest
 import numpy
 import pandas
@@ -65,6 +67,12 @@ STATION_ID_NON_MADIS = 'CYEG_ok-mesonet'
 SECONDARY_DATA_SOURCE = 'sao'
 STATION_ID_MADIS = 'CYEG_madis_sao'
 
+# The following constants are used to test _quantize_to_hundredths.
+VALUES_TO_QUANTIZE = numpy.array(
+    [35.125, 1.005, 2.675, 0.115, 12.344, -3.456, numpy.nan])
+QUANTIZED_VALUES = numpy.array(
+    [3512., 100., 267., 12., 1234., -346., numpy.nan])
+
 # The following constants are used to test _remove_duplicate_observations.
 THESE_LATITUDES_DEG = numpy.array(
     [51.1, 51.102, 51.104, 51.106, 53.5, 53.501, 53.502, 53.503])
@@ -85,6 +93,46 @@ WIND_TABLE_WITH_DUPLICATES = pandas.DataFrame.from_dict(
     WIND_DICT_WITH_DUPLICATES)
 WITH_TABLE_SANS_DUPLICATES = WIND_TABLE_WITH_DUPLICATES.iloc[[0, 2, 3, 4, 6, 7]]
 
+# The following constants are used to test _remove_duplicate_observations with
+# values just inside and just outside the 2-decimal tolerance.
+THESE_LATITUDES_DEG = numpy.array(
+    [40.001, 40.004, 40.004, 40.006, 40., 40., 40., 40., 40., 40., 40.001])
+THESE_LONGITUDES_DEG = numpy.array(
+    [250., 250., 250., 250., 250.0049, 249.9951, 250., 250., 250., 250., 250.])
+THESE_TIMES_UNIX_SEC = numpy.array([0, 0, 1, 1, 2, 2, 3, 3, 4, 4, 5], dtype=int)
+THESE_U_WINDS_M_S01 = numpy.array([0., 0., 0., 0., 0., 0., 3., 4., 3., 3., 0.])
+THESE_V_WINDS_M_S01 = numpy.array(
+    [0., 0., 0., 0., 0., 0., 4., 3., 4., 4.01, 0.])
+
+WIND_TABLE_TOLERANCE = pandas.DataFrame.from_dict({
+    raw_wind_io.LATITUDE_COLUMN: THESE_LATITUDES_DEG,
+    raw_wind_io.LONGITUDE_COLUMN: THESE_LONGITUDES_DEG,
+    raw_wind_io.TIME_COLUMN: THESE_TIMES_UNIX_SEC,
+    raw_wind_io.U_WIND_COLUMN: THESE_U_WINDS_M_S01,
+    raw_wind_io.V_WIND_COLUMN: THESE_V_WINDS_M_S01})
+ROWS_KEPT_TOLERANCE = numpy.array([0, 2, 3, 4, 6, 8, 9, 10], dtype=int)
+
+# The following constants are used to test _remove_duplicate_observations with
+# values at or near rounding ties.  As with "{0:.2f}", 1.005, 2.675, and 0.015
+# round down (their binary values are just below the tie), 0.025 rounds up (its
+# binary value is just above the tie), and the exact ties 0.125 and 0.375 round
+# to even.  For 0.015 and 0.025, numpy.round(100 * x) gives the wrong answer.
+THESE_LATITUDES_DEG = numpy.array(
+    [1.005, 1., 1.005, 1.01, 2.675, 2.67, 0.125, 0.12, 0.375, 0.38, 0.375,
+     0.37, 0.015, 0.01, 0.025, 0.03])
+THESE_TIMES_UNIX_SEC = numpy.array(
+    [0, 0, 1, 1, 2, 2, 3, 3, 4, 4, 5, 5, 6, 6, 7, 7], dtype=int)
+THESE_ZEROS = numpy.full(len(THESE_LATITUDES_DEG), 0.)
+
+WIND_TABLE_NEAR_TIES = pandas.DataFrame.from_dict({
+    raw_wind_io.LATITUDE_COLUMN: THESE_LATITUDES_DEG,
+    raw_wind_io.LONGITUDE_COLUMN: THESE_ZEROS + 250.,
+    raw_wind_io.TIME_COLUMN: THESE_TIMES_UNIX_SEC,
+    raw_wind_io.U_WIND_COLUMN: THESE_ZEROS,
+    raw_wind_io.V_WIND_COLUMN: THESE_ZEROS})
+ROWS_KEPT_NEAR_TIES = numpy.array(
+    [0, 2, 3, 4, 6, 8, 10, 11, 12, 14], dtype=int)
+
 # The following constants are used to test _get_pathless_processed_file_name.
 FILE_START_TIME_UNIX_SEC = 1506999600  # 0300 UTC 3 Oct 2017
 FILE_END_TIME_UNIX_SEC = 1507003200  # 0400 UTC 3 Oct 2017
@@ -94,6 +142,43 @@ PATHLESS_FILE_NAME_MADIS = (
 PATHLESS_FILE_NAME_NON_MADIS = (
     'wind-observations_ok-mesonet_2017-10-03-030000_2017-10-03-040000.csv')
 
+# The following constants are used to test _file_name_to_extension.
+CSV_FILE_NAME = 'wind/foo.csv'
+NETCDF_FILE_NAME = 'wind/foo.nc'
+BAD_FILE_NAME = 'wind/foo.txt'
+
+# The following constants are used to test _strings_to_category_indices.
+EXISTING_CATEGORIES = ['YRL_hfmetar', 'CYEG_madis']
+STRINGS_TO_CATEGORIZE = numpy.array(
+    ['ABC_ok-mesonet', 'CYEG_madis', 'ABC_ok-mesonet', 'XYZ_madis'])
+CATEGORY_INDICES = numpy.array([2, 1, 2, 3], dtype=int)
+NEW_CATEGORIES = ['ABC_ok-mesonet', 'XYZ_madis']
+
+# The following constants are used to test _write_processed_file_netcdf and
+# _read_processed_file_netcdf.  Floats are exactly representable in 32 bits, so
+# they survive the round trip without error.
+THIS_WIND_DICT = {
+    raw_wind_io.STATION_ID_COLUMN:
+        ['YRL_hfmetar', 'CYEG_madis', 'YRL_hfmetar', 'ABC_ok-mesonet'],
+    raw_wind_io.STATION_NAME_COLUMN:
+        ['Red Lake', 'Edmonton', 'Red Lake', 'Abc'],
+    raw_wind_io.LATITUDE_COLUMN: numpy.array([51.07, 53.31, 51.07, 35.2]),
+    raw_wind_io.LONGITUDE_COLUMN: numpy.array([266.17, 246.42, 266.17, 262.5]),
+    raw_wind_io.ELEVATION_COLUMN: numpy.array([386., 723.5, 386., 300.25]),
+    raw_wind_io.TIME_COLUMN:
+        numpy.array([1507000000, 1507000300, 1507000600, 1507000900]),
+    raw_wind_io.U_WIND_COLUMN: numpy.array([2.5, -1.25, 0., 10.]),
+    raw_wind_io.V_WIND_COLUMN: numpy.array([-4.5, 3., 0.75, -0.5])
+}
+WIND_TABLE_FOR_NETCDF = pandas.DataFrame.from_dict(THIS_WIND_DICT)[
+    raw_wind_io.WIND_COLUMNS]
+
+NUM_OBS_IN_FIRST_NETCDF_WRITE = 2
+NETCDF_START_TIME_UNIX_SEC = 1507000300
+NETCDF_END_TIME_UNIX_SEC = 1507000600
+NETCDF_COLUMNS_TO_READ = [
+    raw_wind_io.STATION_ID_COLUMN, raw_wind_io.U_WIND_COLUMN]
+
 # The following constants are used to test find_processed_file.
 TOP_DIRECTORY_NAME = 'wind'
 PROCESSED_FILE_NAME_MADIS = (
@@ -102,6 +187,9 @@ PROCESSED_FILE_NAME_MADIS = (
 PROCESSED_FILE_NAME_NON_MADIS = (
     'wind/ok_mesonet/201710/wind-observations_ok-mesonet_2017-10-03-030000_'
     '2017-10-03-040000.csv')
+PROCESSED_FILE_NAME_NETCDF = (
+    'wind/ok_mesonet/201710/wind-observations_ok-mesonet_2017-10-03-030000_'
+    '2017-10-03-040000.nc')
 
 # The following constants are used to test find_processed_hourly_files.
 PERIOD_START_TIME_UNIX_SEC = 1506993753  # 012233 UTC 3 Oct 2017
@@ -152,9 +240,50 @@ EXPECTED_MAX_V_WINDS_M_S01 = numpy.array(
      6.6 * HALF_SQRT_OF_TWO, 0., -40. * HALF_SQRT_OF_TWO])
 
 
+def _compare_wind_tables(first_wind_table, second_wind_table):
+    """Determines whether or not two wind tables are equal.
+
+    :param first_wind_table: pandas DataFrame (see documentation for
+        `raw_wind_io.write_processed_file`).
+    :param second_wind_table: Same.
+    :return: are_tables_equal: Boolean flag.
+    """
+
+    first_column_names = list(first_wind_table)
+    if first_column_names != list(second_wind_table):
+        return False
+    if len(first_wind_table.index) != len(second_wind_table.index):
+        return False
+
+    for this_column in first_column_names:
+        if this_column in raw_wind_io.STRING_WIND_COLUMNS:
+            if not numpy.array_equal(
+                    first_wind_table[this_column].values.astype(str),
+                    second_wind_table[this_column].values.astype(str)):
+                return False
+        else:
+            if not numpy.allclose(
+                    first_wind_table[this_column].values,
+                    second_wind_table[this_column].values, atol=TOLERANCE):
+                return False
+
+    return True
+
+
 class RawWindIoTests(unittest.TestCase):
     """Each method is a unit test for raw_wind_io.py."""
 
+    def setUp(self):
+        """Creates temporary directory for processed files."""
+
+        self.directory_name = tempfile.mkdtemp()
+        self.netcdf_file_name = '{0:s}/wind.nc'.format(self.directory_name)
+
+    def tearDown(self):
+        """Deletes temporary directory."""
+
+        shutil.rmtree(self.directory_name)
+
     def test_check_data_sources_fake_primary(self):
         """Ensures correct output from check_data_sources.
 
@@ -290,6 +419,15 @@ class RawWindIoTests(unittest.TestCase):
         self.assertTrue(numpy.array_equal(these_invalid_indices,
                                           DIRECTION_INVALID_INDICES))
 
+    def test_quantize_to_hundredths(self):
+        """Ensures correct output from _quantize_to_hundredths."""
+
+        these_quantized_values = raw_wind_io._quantize_to_hundredths(
+            VALUES_TO_QUANTIZE)
+        self.assertTrue(numpy.allclose(
+            these_quantized_values, QUANTIZED_VALUES, atol=TOLERANCE,
+            equal_nan=True))
+
     def test_remove_duplicate_observations(self):
         """Ensures correct output from _remove_duplicate_observations."""
 
@@ -297,6 +435,30 @@ class RawWindIoTests(unittest.TestCase):
             WIND_TABLE_WITH_DUPLICATES)
         self.assertTrue(this_wind_table.equals(WITH_TABLE_SANS_DUPLICATES))
 
+    def test_remove_duplicate_observations_tolerance(self):
+        """Ensures correct output from _remove_duplicate_observations.
+
+        In this case, some values differ by less than 0.01 but round to
+        different hundredths, and others differ by almost 0.01 but round to the
+        same hundredth.
+        """
+
+        this_wind_table = raw_wind_io._remove_duplicate_observations(
+            WIND_TABLE_TOLERANCE)
+        self.assertTrue(this_wind_table.equals(
+            WIND_TABLE_TOLERANCE.iloc[ROWS_KEPT_TOLERANCE]))
+
+    def test_remove_duplicate_observations_near_ties(self):
+        """Ensures correct output from _remove_duplicate_observations.
+
+        In this case, some values are at or near rounding ties.
+        """
+
+        this_wind_table = raw_wind_io._remove_duplicate_observations(
+            WIND_TABLE_NEAR_TIES)
+        self.assertTrue(this_wind_table.equals(
+            WIND_TABLE_NEAR_TIES.iloc[ROWS_KEPT_NEAR_TIES]))
+
     def test_get_pathless_processed_file_name_madis(self):
         """Ensures correct output from _get_pathless_processed_file_name.
 
@@ -401,6 +563,45 @@ class RawWindIoTests(unittest.TestCase):
         self.assertTrue(numpy.allclose(
             these_wind_directions_deg, MAX_WIND_DIRECTIONS_DEG, atol=TOLERANCE))
 
+    def test_file_name_to_extension_csv(self):
+        """Ensures correct output from _file_name_to_extension.
+
+        In this case, file is CSV.
+        """
+
+        self.assertTrue(raw_wind_io._file_name_to_extension(CSV_FILE_NAME) ==
+                        raw_wind_io.CSV_FILE_EXTENSION)
+
+    def test_file_name_to_extension_netcdf(self):
+        """Ensures correct output from _file_name_to_extension.
+
+        In this case, file is NetCDF.
+        """
+
+        self.assertTrue(
+            raw_wind_io._file_name_to_extension(NETCDF_FILE_NAME) ==
+            raw_wind_io.NETCDF_FILE_EXTENSION)
+
+    def test_file_name_to_extension_bad(self):
+        """Ensures that _file_name_to_extension raises error.
+
+        In this case, file extension is invalid.
+        """
+
+        with self.assertRaises(ValueError):
+            raw_wind_io._file_name_to_extension(BAD_FILE_NAME)
+
+    def test_strings_to_category_indices(self):
+        """Ensures correct output from _strings_to_category_indices."""
+
+        these_category_indices, these_new_categories = (
+            raw_wind_io._strings_to_category_indices(
+                STRINGS_TO_CATEGORIZE, EXISTING_CATEGORIES))
+
+        self.assertTrue(
+            numpy.array_equal(these_category_indices, CATEGORY_INDICES))
+        self.assertTrue(these_new_categories == NEW_CATEGORIES)
+
     def test_find_processed_file_madis(self):
         """Ensures correct output from find_processed_file.
 
@@ -430,6 +631,21 @@ class RawWindIoTests(unittest.TestCase):
 
         self.assertTrue(this_file_name == PROCESSED_FILE_NAME_NON_MADIS)
 
+    def test_find_processed_file_netcdf(self):
+        """Ensures correct output from find_processed_file.
+
+        In this case, file is NetCDF.
+        """
+
+        this_file_name = raw_wind_io.find_processed_file(
+            start_time_unix_sec=FILE_START_TIME_UNIX_SEC,
+            end_time_unix_sec=FILE_END_TIME_UNIX_SEC,
+            primary_source=NON_MADIS_PRIMARY_SOURCE,
+            top_directory_name=TOP_DIRECTORY_NAME, raise_error_if_missing=False,
+            file_extension=raw_wind_io.NETCDF_FILE_EXTENSION)
+
+        self.assertTrue(this_file_name == PROCESSED_FILE_NAME_NETCDF)
+
     def test_find_processed_hourly_files_madis(self):
         """Ensures correct output from find_processed_hourly_files.
 
@@ -461,5 +677,120 @@ class RawWindIoTests(unittest.TestCase):
             these_file_names == PROCESSED_HOURLY_FILE_NAMES_NON_MADIS)
 
 
+    def test_write_read_processed_file_netcdf(self):
+        """Ensures that _read_processed_file_netcdf inverts the writer.
+
+        In this case, the file is written all at once and read in full.
+        """
+
+        raw_wind_io._write_processed_file_netcdf(
+            WIND_TABLE_FOR_NETCDF, self.netcdf_file_name, append=False)
+
+        this_wind_table = raw_wind_io._read_processed_file_netcdf(
+            self.netcdf_file_name, column_names=raw_wind_io.WIND_COLUMNS,
+            start_time_unix_sec=numpy.iinfo(numpy.int64).min,
+            end_time_unix_sec=numpy.iinfo(numpy.int64).max)
+
+        self.assertTrue(
+            _compare_wind_tables(this_wind_table, WIND_TABLE_FOR_NETCDF))
+        for this_column in raw_wind_io.NETCDF_COLUMN_TYPE_DICT:
+            self.assertTrue(
+                this_wind_table[this_column].values.dtype ==
+                raw_wind_io.WIND_COLUMN_TYPE_DICT[this_column])
+
+    def test_write_read_processed_file_netcdf_append(self):
+        """Ensures that _read_processed_file_netcdf inverts the writer.
+
+        In this case, the second write is appended to an existing file, and
+        some of the appended station IDs are already in the file.
+        """
+
+        raw_wind_io._write_processed_file_netcdf(
+            WIND_TABLE_FOR_NETCDF.iloc[:NUM_OBS_IN_FIRST_NETCDF_WRITE],
+            self.netcdf_file_name, append=False)
+        raw_wind_io._write_processed_file_netcdf(
+            WIND_TABLE_FOR_NETCDF.iloc[NUM_OBS_IN_FIRST_NETCDF_WRITE:],
+            self.netcdf_file_name, append=True)
+
+        this_wind_table = raw_wind_io._read_processed_file_netcdf(
+            self.netcdf_file_name, column_names=raw_wind_io.WIND_COLUMNS,
+            start_time_unix_sec=numpy.iinfo(numpy.int64).min,
+            end_time_unix_sec=numpy.iinfo(numpy.int64).max)
+
+        self.assertTrue(
+            _compare_wind_tables(this_wind_table, WIND_TABLE_FOR_NETCDF))
+
+    def test_read_processed_file_netcdf_subset(self):
+        """Ensures correct output from _read_processed_file_netcdf.
+
+        In this case, only some columns are read and only observations in a
+        time window are returned.
+        """
+
+        raw_wind_io._write_processed_file_netcdf(
+            WIND_TABLE_FOR_NETCDF, self.netcdf_file_name, append=False)
+
+        this_wind_table = raw_wind_io._read_processed_file_netcdf(
+            self.netcdf_file_name, column_names=NETCDF_COLUMNS_TO_READ,
+            start_time_unix_sec=NETCDF_START_TIME_UNIX_SEC,
+            end_time_unix_sec=NETCDF_END_TIME_UNIX_SEC)
+
+        these_good_flags = numpy.logical_and(
+            WIND_TABLE_FOR_NETCDF[raw_wind_io.TIME_COLUMN].values >=
+            NETCDF_START_TIME_UNIX_SEC,
+            WIND_TABLE_FOR_NETCDF[raw_wind_io.TIME_COLUMN].values <=
+            NETCDF_END_TIME_UNIX_SEC)
+        this_expected_table = WIND_TABLE_FOR_NETCDF[
+            NETCDF_COLUMNS_TO_READ].loc[these_good_flags]
+
+        self.assertTrue(
+            _compare_wind_tables(this_wind_table, this_expected_table))
+
+    def test_read_processed_file_netcdf_no_obs_in_window(self):
+        """Ensures correct output from _read_processed_file_netcdf.
+
+        In this case, no observations are in the time window.
+        """
+
+        raw_wind_io._write_processed_file_netcdf(
+            WIND_TABLE_FOR_NETCDF, self.netcdf_file_name, append=False)
+
+        this_wind_table = raw_wind_io._read_processed_file_netcdf(
+            self.netcdf_file_name, column_names=raw_wind_io.WIND_COLUMNS,
+            start_time_unix_sec=0,
+            end_time_unix_sec=NETCDF_START_TIME_UNIX_SEC - 1000)
+
+        self.assertTrue(_compare_wind_tables(
+            this_wind_table, WIND_TABLE_FOR_NETCDF.iloc[:0]))
+
+    def test_write_read_processed_file_netcdf_empty(self):
+        """Ensures that _read_processed_file_netcdf inverts the writer.
+
+        In this case, the table is empty at first and observations are appended
+        later.
+        """
+
+        raw_wind_io._write_processed_file_netcdf(
+            WIND_TABLE_FOR_NETCDF.iloc[:0], self.netcdf_file_name,
+            append=False)
+
+        this_wind_table = raw_wind_io._read_processed_file_netcdf(
+            self.netcdf_file_name, column_names=raw_wind_io.WIND_COLUMNS,
+            start_time_unix_sec=numpy.iinfo(numpy.int64).min,
+            end_time_unix_sec=numpy.iinfo(numpy.int64).max)
+        self.assertTrue(_compare_wind_tables(
+            this_wind_table, WIND_TABLE_FOR_NETCDF.iloc[:0]))
+
+        raw_wind_io._write_processed_file_netcdf(
+            WIND_TABLE_FOR_NETCDF, self.netcdf_file_name, append=True)
+
+        this_wind_table = raw_wind_io._read_processed_file_netcdf(
+            self.netcdf_file_name, column_names=raw_wind_io.WIND_COLUMNS,
+            start_time_unix_sec=numpy.iinfo(numpy.int64).min,
+            end_time_unix_sec=numpy.iinfo(numpy.int64).max)
+        self.assertTrue(
+            _compare_wind_tables(this_wind_table, WIND_TABLE_FOR_NETCDF))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -9,9 +9,7 @@ package for the visualization and analysis of thunderstorm-related data.
 """
 
 import os
-import glob
 import gzip
-import tempfile
 import shutil
 import xml.etree.ElementTree as ElementTree
 import numpy
@@ -22,8 +20,8 @@ from gewittergefahr.gg_io import storm_tracking_io as tracking_io
 from gewittergefahr.gg_utils import radar_sparse_to_full as radar_s2f
 from gewittergefahr.gg_utils import polygons
 from gewittergefahr.gg_utils import unzipping
+from gewittergefahr.gg_utils import file_catalog
 from gewittergefahr.gg_utils import time_conversion
-from gewittergefahr.gg_utils import time_periods
 from gewittergefahr.gg_utils import error_checking
 
 # TODO(thunderhoser): replace main method with named method.
@@ -209,6 +207,32 @@ def _get_pathless_polygon_file_name(unix_time_sec, zipped=True):
         POLYGON_FILE_EXTENSION)
 
 
+def _polygon_file_name_to_time(pathless_polygon_file_name):
+    """Parses valid time from name of polygon file.
+
+    This method is the inverse of _get_pathless_polygon_file_name and is used to
+    build file catalogs (see `file_catalog.get_catalog`).
+
+    :param pathless_polygon_file_name: Pathless name of polygon file (may be
+        zipped or unzipped).
+    :return: unix_time_sec: Valid time.  If the file name is not formatted like
+        a polygon file, this is None.
+    """
+
+    if pathless_polygon_file_name.endswith(GZIP_FILE_EXTENSION):
+        pathless_polygon_file_name = pathless_polygon_file_name[
+            :-len(GZIP_FILE_EXTENSION)]
+    if not pathless_polygon_file_name.endswith(POLYGON_FILE_EXTENSION):
+        return None
+
+    try:
+        return time_conversion.string_to_unix_sec(
+            pathless_polygon_file_name[:-len(POLYGON_FILE_EXTENSION)],
+            TIME_FORMAT_IN_FILES)
+    except ValueError:
+        return None
+
+
 def _get_relative_stats_dir_ordinal_scale(spc_date_string,
                                           tracking_scale_ordinal):
     """Generates expected relative path for stats directory.
@@ -346,26 +370,47 @@ def _open_xml_file(xml_file_name):
     :return: xml_tree: Instance of `xml.etree.ElementTree`.
     """
 
-    gzip_as_input = xml_file_name.endswith(GZIP_FILE_EXTENSION)
-    if gzip_as_input:
-        gzip_file_object = gzip.open(xml_file_name, 'rb')
-        xml_temporary_file_object = tempfile.NamedTemporaryFile(delete=False)
-        shutil.copyfileobj(gzip_file_object, xml_temporary_file_object)
+    if not xml_file_name.endswith(GZIP_FILE_EXTENSION):
+        return ElementTree.parse(xml_file_name)
 
-        xml_file_name = xml_temporary_file_object.name
+    # The gzip file is parsed as a stream, without writing the unzipped file to
+    # disk.
+    gzip_file_object = gzip.open(xml_file_name, 'rb')
+    try:
+        return ElementTree.parse(gzip_file_object)
+    finally:
         gzip_file_object.close()
-        xml_temporary_file_object.close()
 
-    xml_tree = ElementTree.parse(xml_file_name)
-    if gzip_as_input:
-        os.remove(xml_file_name)
 
-    return xml_tree
+def _rowcol_to_latlng_by_storm(radar_grid, rows_by_storm, columns_by_storm):
+    """Converts row-column coordinates to lat-long for many storms at once.
+
+    K = number of storms
+
+    :param radar_grid: Instance of `radar_io.RadarGrid`.
+    :param rows_by_storm: length-K list of 1-D numpy arrays with row indices.
+    :param columns_by_storm: length-K list of 1-D numpy arrays with column
+        indices.  columns_by_storm[k] must have the same length as
+        rows_by_storm[k].
+    :return: latitudes_by_storm_deg: length-K list of 1-D numpy arrays with
+        latitudes (deg N).
+    :return: longitudes_by_storm_deg: length-K list of 1-D numpy arrays with
+        longitudes (deg E).
+    """
+
+    all_rows, offsets = radar_io.flatten_ragged_arrays(rows_by_storm)
+    all_columns, _ = radar_io.flatten_ragged_arrays(columns_by_storm)
+    all_latitudes_deg, all_longitudes_deg = radar_grid.rowcol_to_latlng(
+        all_rows, all_columns)
+
+    return (radar_io.unflatten_ragged_arrays(all_latitudes_deg, offsets),
+            radar_io.unflatten_ragged_arrays(all_longitudes_deg, offsets))
 
 
 def unzip_1day_tar_file(
         tar_file_name, spc_date_unix_sec=None, top_target_directory_name=None,
-        scales_to_extract_metres2=None):
+        scales_to_extract_metres2=None,
+        num_threads=unzipping.DEFAULT_NUM_THREADS):
     """Unzips tar file with segmotion output for one SPC date.
 
     :param tar_file_name: Path to input file.
@@ -373,6 +418,8 @@ def unzip_1day_tar_file(
     :param top_target_directory_name: Name of top-level output directory.
     :param scales_to_extract_metres2: 1-D numpy array of tracking scales to
         extract.
+    :param num_threads: Number of threads used to unzip files (see doc for
+        `unzipping.unzip_tar`).
     :return: target_directory_name: Path to output directory.  This will be
         "<top_target_directory_name>/<yyyymmdd>", where <yyyymmdd> is the SPC
         date.
@@ -404,7 +451,8 @@ def unzip_1day_tar_file(
         top_target_directory_name, spc_date_string)
     unzipping.unzip_tar(
         tar_file_name, target_directory_name=target_directory_name,
-        file_and_dir_names_to_unzip=directory_names_to_unzip)
+        file_and_dir_names_to_unzip=directory_names_to_unzip,
+        num_threads=num_threads)
     return target_directory_name
 
 
@@ -509,15 +557,22 @@ def find_local_polygon_file(unix_time_sec=None, spc_date_unix_sec=None,
 def find_polygon_files_for_spc_date(spc_date_unix_sec=None,
                                     top_raw_directory_name=None,
                                     tracking_scale_metres2=None,
-                                    raise_error_if_missing=True):
+                                    raise_error_if_missing=True,
+                                    index_directory_name=None):
     """Finds all polygon files for one SPC date.
 
+    If both zipped and unzipped versions of a file exist, this method returns
+    only the zipped version.
+
     :param spc_date_unix_sec: SPC date.
     :param top_raw_directory_name: Name of top-level directory with raw
         segmotion files.
     :param tracking_scale_metres2: Tracking scale.
     :param raise_error_if_missing: If True and no files can be found, this
         method will raise an error.
+    :param index_directory_name: Name of directory with index files for file
+        catalogs (see `file_catalog.get_catalog`).  If None, catalogs will be
+        cached only in memory.
     :return: polygon_file_names: 1-D list of paths to polygon files.
     """
 
@@ -534,47 +589,19 @@ def find_polygon_files_for_spc_date(spc_date_unix_sec=None,
     last_hour_unix_sec = SPC_DATE_END_HOUR * HOURS_TO_SECONDS + (
         time_conversion.string_to_unix_sec(
             spc_date_string, time_conversion.SPC_DATE_FORMAT))
-    hours_in_spc_date_unix_sec = time_periods.range_and_interval_to_list(
-        start_time_unix_sec=first_hour_unix_sec,
-        end_time_unix_sec=last_hour_unix_sec,
-        time_interval_sec=HOURS_TO_SECONDS, include_endpoint=True)
-
-    polygon_file_names = []
-    for this_hour_unix_sec in hours_in_spc_date_unix_sec:
-        this_time_string_seconds = time_conversion.unix_sec_to_string(
-            this_hour_unix_sec, TIME_FORMAT_IN_FILES)
-        this_time_string_hours = time_conversion.unix_sec_to_string(
-            this_hour_unix_sec, TIME_FORMAT_IN_FILES_HOUR_ONLY) + '*'
-
-        this_pathless_file_name_zipped = _get_pathless_polygon_file_name(
-            this_hour_unix_sec, zipped=True)
-        this_pathless_file_pattern_zipped = (
-            this_pathless_file_name_zipped.replace(
-                this_time_string_seconds, this_time_string_hours))
-        this_file_pattern_zipped = '{0:s}/{1:s}'.format(
-            directory_name, this_pathless_file_pattern_zipped)
-
-        these_polygon_file_names_zipped = glob.glob(this_file_pattern_zipped)
-        if these_polygon_file_names_zipped:
-            polygon_file_names += these_polygon_file_names_zipped
-
-        this_pathless_file_name_unzipped = _get_pathless_polygon_file_name(
-            this_hour_unix_sec, zipped=False)
-        this_pathless_file_pattern_unzipped = (
-            this_pathless_file_name_unzipped.replace(
-                this_time_string_seconds, this_time_string_hours))
-        this_file_pattern_unzipped = '{0:s}/{1:s}'.format(
-            directory_name, this_pathless_file_pattern_unzipped)
-
-        these_polygon_file_names_unzipped = glob.glob(
-            this_file_pattern_unzipped)
-        for this_file_name_unzipped in these_polygon_file_names_unzipped:
-            this_file_name_zipped = (
-                this_file_name_unzipped + GZIP_FILE_EXTENSION)
-            if this_file_name_zipped in polygon_file_names:
-                continue
-
-            polygon_file_names.append(this_file_name_unzipped)
+
+    catalog_dict = file_catalog.get_catalog(
+        directory_name, file_name_to_time=_polygon_file_name_to_time,
+        index_directory_name=index_directory_name)
+    polygon_file_names = file_catalog.find_files_in_time_range(
+        catalog_dict, start_time_unix_sec=first_hour_unix_sec,
+        end_time_unix_sec=last_hour_unix_sec + HOURS_TO_SECONDS - 1)
+
+    zipped_file_names = set(
+        [f for f in polygon_file_names if f.endswith(GZIP_FILE_EXTENSION)])
+    polygon_file_names = [
+        f for f in polygon_file_names
+        if f + GZIP_FILE_EXTENSION not in zipped_file_names]
 
     if raise_error_if_missing and not polygon_file_names:
         raise ValueError(
@@ -787,8 +814,11 @@ def read_polygons_from_netcdf(
         tracking_io.POLYGON_OBJECT_ROWCOL_COLUMN: object_array}
     polygon_table = polygon_table.assign(**argument_dict)
 
+    vertex_rows_by_storm = [None] * num_storms
+    vertex_columns_by_storm = [None] * num_storms
+
     for i in range(num_storms):
-        these_vertex_rows, these_vertex_columns = (
+        vertex_rows_by_storm[i], vertex_columns_by_storm[i] = (
             polygons.grid_points_in_poly_to_vertices(
                 polygon_table[tracking_io.GRID_POINT_ROW_COLUMN].values[i],
                 polygon_table[tracking_io.GRID_POINT_COLUMN_COLUMN].values[i]))
@@ -796,40 +826,38 @@ def read_polygons_from_netcdf(
         (polygon_table[tracking_io.GRID_POINT_ROW_COLUMN].values[i],
          polygon_table[tracking_io.GRID_POINT_COLUMN_COLUMN].values[i]) = (
              polygons.simple_polygon_to_grid_points(
-                 these_vertex_rows, these_vertex_columns))
-
-        (polygon_table[tracking_io.GRID_POINT_LAT_COLUMN].values[i],
-         polygon_table[tracking_io.GRID_POINT_LNG_COLUMN].values[i]) = (
-             radar_io.rowcol_to_latlng(
-                 polygon_table[tracking_io.GRID_POINT_ROW_COLUMN].values[i],
-                 polygon_table[tracking_io.GRID_POINT_COLUMN_COLUMN].values[i],
-                 nw_grid_point_lat_deg=
-                 metadata_dict[radar_io.NW_GRID_POINT_LAT_COLUMN],
-                 nw_grid_point_lng_deg=
-                 metadata_dict[radar_io.NW_GRID_POINT_LNG_COLUMN],
-                 lat_spacing_deg=metadata_dict[radar_io.LAT_SPACING_COLUMN],
-                 lng_spacing_deg=metadata_dict[radar_io.LNG_SPACING_COLUMN]))
-
-        these_vertex_lat_deg, these_vertex_lng_deg = radar_io.rowcol_to_latlng(
-            these_vertex_rows, these_vertex_columns,
-            nw_grid_point_lat_deg=
-            metadata_dict[radar_io.NW_GRID_POINT_LAT_COLUMN],
-            nw_grid_point_lng_deg=
-            metadata_dict[radar_io.NW_GRID_POINT_LNG_COLUMN],
-            lat_spacing_deg=metadata_dict[radar_io.LAT_SPACING_COLUMN],
-            lng_spacing_deg=metadata_dict[radar_io.LNG_SPACING_COLUMN])
+                 vertex_rows_by_storm[i], vertex_columns_by_storm[i]))
+
+    # Grid points and vertices in all storms are converted to lat-long at
+    # once, rather than one storm at a time.
+    radar_grid = radar_io.RadarGrid(metadata_dict)
+    grid_point_lat_by_storm_deg, grid_point_lng_by_storm_deg = (
+        _rowcol_to_latlng_by_storm(
+            radar_grid,
+            polygon_table[tracking_io.GRID_POINT_ROW_COLUMN].values.tolist(),
+            polygon_table[
+                tracking_io.GRID_POINT_COLUMN_COLUMN].values.tolist()))
+    vertex_lat_by_storm_deg, vertex_lng_by_storm_deg = (
+        _rowcol_to_latlng_by_storm(
+            radar_grid, vertex_rows_by_storm, vertex_columns_by_storm))
+
+    for i in range(num_storms):
+        polygon_table[tracking_io.GRID_POINT_LAT_COLUMN].values[i] = (
+            grid_point_lat_by_storm_deg[i])
+        polygon_table[tracking_io.GRID_POINT_LNG_COLUMN].values[i] = (
+            grid_point_lng_by_storm_deg[i])
 
         (polygon_table[tracking_io.CENTROID_LAT_COLUMN].values[i],
          polygon_table[tracking_io.CENTROID_LNG_COLUMN].values[i]) = (
              polygons.get_latlng_centroid(
-                 these_vertex_lat_deg, these_vertex_lng_deg))
+                 vertex_lat_by_storm_deg[i], vertex_lng_by_storm_deg[i]))
 
         polygon_table[tracking_io.POLYGON_OBJECT_ROWCOL_COLUMN].values[i] = (
             polygons.vertex_arrays_to_polygon_object(
-                these_vertex_columns, these_vertex_rows))
+                vertex_columns_by_storm[i], vertex_rows_by_storm[i]))
         polygon_table[tracking_io.POLYGON_OBJECT_LATLNG_COLUMN].values[i] = (
             polygons.vertex_arrays_to_polygon_object(
-                these_vertex_lng_deg, these_vertex_lat_deg))
+                vertex_lng_by_storm_deg[i], vertex_lat_by_storm_deg[i]))
 
     return polygon_table
 
@@ -1,13 +1,15 @@
 """IO methods for storm-tracking output (both polygons and track statistics)."""
 
 import os
-import glob
 import pickle
+import fnmatch
 import numpy
+import shapely.geometry
 from gewittergefahr.gg_utils import polygons
 from gewittergefahr.gg_utils import projections
 from gewittergefahr.gg_utils import time_conversion
 from gewittergefahr.gg_utils import file_system_utils
+from gewittergefahr.gg_utils import file_catalog
 from gewittergefahr.gg_utils import error_checking
 
 DATE_FORMAT = '%Y%m%d'
@@ -86,6 +88,28 @@ def _get_pathless_processed_file_name(unix_time_sec, data_source):
         PROCESSED_FILE_EXTENSION)
 
 
+def _processed_file_name_to_time(pathless_processed_file_name):
+    """Parses valid time from name of processed file.
+
+    This method is used to build file catalogs (see
+    `file_catalog.get_catalog`).  Unlike processed_file_name_to_time, it does
+    not raise an error for files that are not processed tracking files.
+
+    :param pathless_processed_file_name: Pathless name of processed file.
+    :return: unix_time_sec: Valid time.  If the file name is not formatted like
+        a processed file, this is None.
+    """
+
+    if not (pathless_processed_file_name.startswith(PROCESSED_FILE_PREFIX) and
+            pathless_processed_file_name.endswith(PROCESSED_FILE_EXTENSION)):
+        return None
+
+    try:
+        return processed_file_name_to_time(pathless_processed_file_name)
+    except ValueError:
+        return None
+
+
 def _get_relative_processed_directory(data_source=None, spc_date_unix_sec=None,
                                       unix_time_sec=None,
                                       tracking_scale_metres2=None):
@@ -267,12 +291,13 @@ def make_buffers_around_polygons(storm_object_table,
             allow_nan=False)
 
     num_storm_objects = len(storm_object_table.index)
+    orig_polygon_objects_latlng = storm_object_table[
+        POLYGON_OBJECT_LATLNG_COLUMN].values
+
     centroid_latitudes_deg = numpy.full(num_storm_objects, numpy.nan)
     centroid_longitudes_deg = numpy.full(num_storm_objects, numpy.nan)
-
     for i in range(num_storm_objects):
-        this_centroid_object = storm_object_table[
-            POLYGON_OBJECT_LATLNG_COLUMN].values[0].centroid
+        this_centroid_object = orig_polygon_objects_latlng[i].centroid
         centroid_latitudes_deg[i] = this_centroid_object.y
         centroid_longitudes_deg[i] = this_centroid_object.x
 
@@ -282,64 +307,73 @@ def make_buffers_around_polygons(storm_object_table,
     projection_object = projections.init_azimuthal_equidistant_projection(
         global_centroid_lat_deg, global_centroid_lng_deg)
 
-    object_array = numpy.full(num_storm_objects, numpy.nan, dtype=object)
-    argument_dict = {}
+    # Project vertices of all storm objects at once.
+    (orig_vertex_lng_deg, orig_vertex_lat_deg, orig_ring_offsets,
+     orig_polygon_offsets) = polygons.polygon_objects_to_flat_arrays(
+         orig_polygon_objects_latlng, exterior_only=True)
+    orig_vertex_x_metres, orig_vertex_y_metres = (
+        projections.project_latlng_to_xy(
+            orig_vertex_lat_deg, orig_vertex_lng_deg,
+            projection_object=projection_object))
+    orig_polygon_objects_xy = polygons.flat_arrays_to_polygon_objects(
+        orig_vertex_x_metres, orig_vertex_y_metres, orig_ring_offsets,
+        orig_polygon_offsets)
+
+    # Buffer all storm objects once for each unique distance, so that buffers
+    # shared by several distance ranges (e.g., 0-5 km and 5-10 km) are computed
+    # only once.
+    all_buffer_dists_metres = numpy.concatenate((
+        min_buffer_dists_metres[numpy.invert(numpy.isnan(
+            min_buffer_dists_metres))], max_buffer_dists_metres))
+    buffer_objects_xy_by_distance = {}
+    for this_distance_metres in numpy.unique(all_buffer_dists_metres):
+        buffer_objects_xy_by_distance[this_distance_metres] = (
+            polygons.buffer_many_polygons(
+                orig_polygon_objects_xy, this_distance_metres))
+
     buffer_column_names = [''] * num_buffers
+    buffer_polygon_objects_xy = []
 
     for j in range(num_buffers):
         buffer_column_names[j] = distance_buffer_to_column_name(
             min_buffer_dists_metres[j], max_buffer_dists_metres[j])
-        argument_dict.update({buffer_column_names[j]: object_array})
-    storm_object_table = storm_object_table.assign(**argument_dict)
+        these_outer_objects_xy = buffer_objects_xy_by_distance[
+            max_buffer_dists_metres[j]]
 
-    for i in range(num_storm_objects):
-        orig_vertex_dict_latlng = polygons.polygon_object_to_vertex_arrays(
-            storm_object_table[POLYGON_OBJECT_LATLNG_COLUMN].values[i])
-
-        (orig_vertex_x_metres,
-         orig_vertex_y_metres) = projections.project_latlng_to_xy(
-             orig_vertex_dict_latlng[polygons.EXTERIOR_Y_COLUMN],
-             orig_vertex_dict_latlng[polygons.EXTERIOR_X_COLUMN],
-             projection_object=projection_object)
-
-        for j in range(num_buffers):
-            buffer_polygon_object_xy = polygons.buffer_simple_polygon(
-                orig_vertex_x_metres, orig_vertex_y_metres,
-                min_buffer_dist_metres=min_buffer_dists_metres[j],
-                max_buffer_dist_metres=max_buffer_dists_metres[j])
-
-            buffer_vertex_dict = polygons.polygon_object_to_vertex_arrays(
-                buffer_polygon_object_xy)
-
-            (buffer_vertex_dict[polygons.EXTERIOR_Y_COLUMN],
-             buffer_vertex_dict[polygons.EXTERIOR_X_COLUMN]) = (
-                 projections.project_xy_to_latlng(
-                     buffer_vertex_dict[polygons.EXTERIOR_X_COLUMN],
-                     buffer_vertex_dict[polygons.EXTERIOR_Y_COLUMN],
-                     projection_object=projection_object))
-
-            this_num_holes = len(buffer_vertex_dict[polygons.HOLE_X_COLUMN])
-            for k in range(this_num_holes):
-                (buffer_vertex_dict[polygons.HOLE_Y_COLUMN][k],
-                 buffer_vertex_dict[polygons.HOLE_X_COLUMN][k]) = (
-                     projections.project_xy_to_latlng(
-                         buffer_vertex_dict[polygons.HOLE_X_COLUMN][k],
-                         buffer_vertex_dict[polygons.HOLE_Y_COLUMN][k],
-                         projection_object=projection_object))
-
-            buffer_polygon_object_latlng = (
-                polygons.vertex_arrays_to_polygon_object(
-                    buffer_vertex_dict[polygons.EXTERIOR_X_COLUMN],
-                    buffer_vertex_dict[polygons.EXTERIOR_Y_COLUMN],
-                    hole_x_coords_list=
-                    buffer_vertex_dict[polygons.HOLE_X_COLUMN],
-                    hole_y_coords_list=
-                    buffer_vertex_dict[polygons.HOLE_Y_COLUMN]))
-
-            storm_object_table[buffer_column_names[j]].values[
-                i] = buffer_polygon_object_latlng
+        if numpy.isnan(min_buffer_dists_metres[j]):
+            buffer_polygon_objects_xy += these_outer_objects_xy
+            continue
 
-    return storm_object_table
+        these_inner_objects_xy = buffer_objects_xy_by_distance[
+            min_buffer_dists_metres[j]]
+        for i in range(num_storm_objects):
+            buffer_polygon_objects_xy.append(shapely.geometry.Polygon(
+                shell=these_outer_objects_xy[i].exterior.coords,
+                holes=[these_inner_objects_xy[i].exterior.coords]))
+
+    # Project vertices of all buffers back to lat-long at once.
+    (buffer_vertex_x_metres, buffer_vertex_y_metres, buffer_ring_offsets,
+     buffer_polygon_offsets) = polygons.polygon_objects_to_flat_arrays(
+         buffer_polygon_objects_xy)
+    buffer_vertex_lat_deg, buffer_vertex_lng_deg = (
+        projections.project_xy_to_latlng(
+            buffer_vertex_x_metres, buffer_vertex_y_metres,
+            projection_object=projection_object))
+    buffer_polygon_objects_latlng = polygons.flat_arrays_to_polygon_objects(
+        buffer_vertex_lng_deg, buffer_vertex_lat_deg, buffer_ring_offsets,
+        buffer_polygon_offsets)
+
+    argument_dict = {}
+    for j in range(num_buffers):
+        this_object_array = numpy.full(
+            num_storm_objects, numpy.nan, dtype=object)
+        for i in range(num_storm_objects):
+            this_object_array[i] = buffer_polygon_objects_latlng[
+                j * num_storm_objects + i]
+
+        argument_dict.update({buffer_column_names[j]: this_object_array})
+
+    return storm_object_table.assign(**argument_dict)
 
 
 def find_processed_file(unix_time_sec=None, data_source=None,
@@ -386,7 +420,8 @@ def find_processed_file(unix_time_sec=None, data_source=None,
 
 def find_processed_files_one_spc_date(
         spc_date_unix_sec, data_source=None, top_processed_dir_name=None,
-        tracking_scale_metres2=None, raise_error_if_missing=True):
+        tracking_scale_metres2=None, raise_error_if_missing=True,
+        index_directory_name=None):
     """Finds all processed files for one SPC date.
 
     :param spc_date_unix_sec: SPC date.
@@ -396,7 +431,11 @@ def find_processed_files_one_spc_date(
     :param tracking_scale_metres2: Tracking scale.
     :param raise_error_if_missing: Boolean flag.  If True and no files are
         found, this method will raise an error.
-    :return: processed_file_names: 1-D list of paths to processed files.
+    :param index_directory_name: Name of directory with index files for file
+        catalogs (see `file_catalog.get_catalog`).  If None, catalogs will be
+        cached only in memory.
+    :return: processed_file_names: 1-D list of paths to processed files, sorted
+        by valid time.
     :raises: ValueError: if raise_error_if_missing = True and no files are
         found.
     """
@@ -421,7 +460,14 @@ def find_processed_files_one_spc_date(
 
     processed_file_pattern = '{0:s}/{1:s}'.format(
         example_directory_name, example_pathless_file_name)
-    processed_file_names = glob.glob(processed_file_pattern)
+
+    catalog_dict = file_catalog.get_catalog(
+        example_directory_name, file_name_to_time=_processed_file_name_to_time,
+        index_directory_name=index_directory_name)
+    processed_file_names = [
+        '{0:s}/{1:s}'.format(example_directory_name, f)
+        for f in catalog_dict[file_catalog.PATHLESS_FILE_NAMES_KEY]
+        if fnmatch.fnmatchcase(f, example_pathless_file_name)]
 
     if raise_error_if_missing and not processed_file_names:
         error_string = (
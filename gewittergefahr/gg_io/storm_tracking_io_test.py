@@ -4,6 +4,8 @@ import unittest
 import numpy
 import pandas
 from gewittergefahr.gg_io import storm_tracking_io as tracking_io
+from gewittergefahr.gg_utils import polygons
+from gewittergefahr.gg_utils import projections
 
 FAKE_DATA_SOURCE = 'foo'
 FAKE_BUFFER_COLUMN_NAME = 'bar'
@@ -44,6 +46,43 @@ ROWS_WITH_NAN = numpy.array([1, 3], dtype=int)
 DATAFRAME_WITHOUT_NAN = DATAFRAME_WITH_NAN.drop(
     DATAFRAME_WITH_NAN.index[ROWS_WITH_NAN], axis=0, inplace=False)
 
+# The following constants are used to test make_buffers_around_polygons.
+VERTEX_LATITUDES_DEG = numpy.array([53.5, 53.6, 53.7, 53.6, 53.5])
+VERTEX_LONGITUDES_DEG = numpy.array([246.4, 246.3, 246.4, 246.6, 246.4])
+POLYGON_OBJECT_LATLNG = polygons.vertex_arrays_to_polygon_object(
+    VERTEX_LONGITUDES_DEG, VERTEX_LATITUDES_DEG)
+
+THIS_POLYGON_OBJECT_ARRAY = numpy.full(1, numpy.nan, dtype=object)
+THIS_POLYGON_OBJECT_ARRAY[0] = POLYGON_OBJECT_LATLNG
+STORM_OBJECT_TABLE_NO_BUFFERS = pandas.DataFrame.from_dict(
+    {tracking_io.STORM_ID_COLUMN: ['foo']})
+STORM_OBJECT_TABLE_NO_BUFFERS = STORM_OBJECT_TABLE_NO_BUFFERS.assign(
+    **{tracking_io.POLYGON_OBJECT_LATLNG_COLUMN: THIS_POLYGON_OBJECT_ARRAY})
+
+MIN_BUFFER_DISTS_METRES = numpy.array([numpy.nan, 0., 5000.])
+MAX_BUFFER_DISTS_METRES = numpy.array([5000., 5000., 10000.])
+
+THIS_PROJECTION_OBJECT = projections.init_azimuthal_equidistant_projection(
+    POLYGON_OBJECT_LATLNG.centroid.y, POLYGON_OBJECT_LATLNG.centroid.x)
+THIS_POLYGON_OBJECT_XY, _ = polygons.project_latlng_to_xy(
+    POLYGON_OBJECT_LATLNG, projection_object=THIS_PROJECTION_OBJECT)
+THIS_VERTEX_DICT_XY = polygons.polygon_object_to_vertex_arrays(
+    THIS_POLYGON_OBJECT_XY)
+
+BUFFER_COLUMN_NAMES = []
+BUFFER_POLYGON_OBJECTS_LATLNG = []
+for j in range(len(MIN_BUFFER_DISTS_METRES)):
+    BUFFER_COLUMN_NAMES.append(tracking_io.distance_buffer_to_column_name(
+        MIN_BUFFER_DISTS_METRES[j], MAX_BUFFER_DISTS_METRES[j]))
+
+    THIS_BUFFER_OBJECT_XY = polygons.buffer_simple_polygon(
+        THIS_VERTEX_DICT_XY[polygons.EXTERIOR_X_COLUMN],
+        THIS_VERTEX_DICT_XY[polygons.EXTERIOR_Y_COLUMN],
+        min_buffer_dist_metres=MIN_BUFFER_DISTS_METRES[j],
+        max_buffer_dist_metres=MAX_BUFFER_DISTS_METRES[j])
+    BUFFER_POLYGON_OBJECTS_LATLNG.append(polygons.project_xy_to_latlng(
+        THIS_BUFFER_OBJECT_XY, projection_object=THIS_PROJECTION_OBJECT))
+
 
 class StormTrackingIoTests(unittest.TestCase):
     """Each method is a unit test for storm_tracking_io.py."""
@@ -211,5 +250,20 @@ class StormTrackingIoTests(unittest.TestCase):
         self.assertTrue(this_processed_file_name == PROBSEVERE_FILE_NAME)
 
 
+    def test_make_buffers_around_polygons(self):
+        """Ensures correct output from make_buffers_around_polygons."""
+
+        this_storm_object_table = tracking_io.make_buffers_around_polygons(
+            STORM_OBJECT_TABLE_NO_BUFFERS,
+            min_buffer_dists_metres=MIN_BUFFER_DISTS_METRES,
+            max_buffer_dists_metres=MAX_BUFFER_DISTS_METRES)
+
+        for j in range(len(BUFFER_COLUMN_NAMES)):
+            this_polygon_object = this_storm_object_table[
+                BUFFER_COLUMN_NAMES[j]].values[0]
+            self.assertTrue(this_polygon_object.almost_equals(
+                BUFFER_POLYGON_OBJECTS_LATLNG[j], decimal=6))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,13 +1,40 @@
 """Methods for dilation (the mathematical-morphology operation)."""
 
 import numpy
-from scipy.ndimage.filters import percentile_filter
+from scipy.ndimage.filters import percentile_filter, maximum_filter, \
+    minimum_filter
 from gewittergefahr.gg_utils import error_checking
 
 DEFAULT_HALF_WIDTH = 2
 TOLERANCE = 1e-6
 
 
+def _filter_2d_matrix(input_matrix, percentile_level, width_in_pixels):
+    """Applies percentile filter to 2-D matrix.
+
+    The 0th and 100th percentiles are computed with `minimum_filter` and
+    `maximum_filter`, which are separable and take constant time per pixel
+    (independent of window width).
+
+    :param input_matrix: See doc for dilate_2d_matrix.
+    :param percentile_level: Same.
+    :param width_in_pixels: Width of dilation window.
+    :return: output_matrix: Filtered version of `input_matrix`.
+    """
+
+    if percentile_level >= 100. - TOLERANCE:
+        return maximum_filter(
+            input_matrix, size=width_in_pixels, mode='constant', cval=0.)
+
+    if percentile_level <= TOLERANCE:
+        return minimum_filter(
+            input_matrix, size=width_in_pixels, mode='constant', cval=0.)
+
+    return percentile_filter(
+        input_matrix, percentile=percentile_level, size=width_in_pixels,
+        mode='constant', cval=0.)
+
+
 def dilate_2d_matrix(input_matrix, percentile_level,
                      half_width_in_pixels=DEFAULT_HALF_WIDTH,
                      take_largest_absolute_value=False):
@@ -40,33 +67,68 @@ def dilate_2d_matrix(input_matrix, percentile_level,
     width_in_pixels = 2 * half_width_in_pixels + 1
     input_matrix[numpy.isnan(input_matrix)] = 0.
 
+    output_matrix = _filter_2d_matrix(
+        input_matrix, percentile_level=percentile_level,
+        width_in_pixels=width_in_pixels)
+
     if take_largest_absolute_value:
-        output_matrix_orig_percentile = percentile_filter(
-            input_matrix, percentile=percentile_level, size=width_in_pixels,
-            mode='constant', cval=0.)
-        output_matrix_opposite_percentile = percentile_filter(
-            input_matrix, percentile=100. - percentile_level,
-            size=width_in_pixels, mode='constant', cval=0.)
-
-        output_matrix = numpy.dstack((
-            output_matrix_orig_percentile, output_matrix_opposite_percentile))
-        max_index_matrix = numpy.argmax(numpy.absolute(output_matrix), axis=2)
-
-        num_rows = output_matrix.shape[0]
-        num_columns = output_matrix.shape[1]
-        row_indices = numpy.linspace(0, num_rows - 1, num=num_rows, dtype=int)
-        column_indices = numpy.linspace(
-            0, num_columns - 1, num=num_columns, dtype=int)
-
-        column_index_matrix, row_index_matrix = numpy.meshgrid(
-            column_indices, row_indices)
-        output_matrix = output_matrix[
-            row_index_matrix, column_index_matrix, max_index_matrix]
-
-    else:
-        output_matrix = percentile_filter(
-            input_matrix, percentile=percentile_level, size=width_in_pixels,
-            mode='constant', cval=0.)
+        output_matrix_opposite_percentile = _filter_2d_matrix(
+            input_matrix, percentile_level=100. - percentile_level,
+            width_in_pixels=width_in_pixels)
+
+        output_matrix = numpy.where(
+            numpy.absolute(output_matrix_opposite_percentile) >
+            numpy.absolute(output_matrix),
+            output_matrix_opposite_percentile, output_matrix)
 
     output_matrix[numpy.absolute(output_matrix) < TOLERANCE] = numpy.nan
     return output_matrix
+
+
+def get_bounding_box_for_points(row_indices, column_indices,
+                                half_width_in_pixels, num_rows, num_columns):
+    """Returns bounding box needed to dilate a matrix at the given points.
+
+    Dilated values at the given points depend only on input values inside the
+    bounding box.  Thus, if dilated values are needed only at these points,
+    dilate_2d_matrix can be applied to the bounding box rather than the full
+    matrix.  Results are the same, because the bounding box is padded by the
+    half-width of the dilation window (or extends to the edge of the full
+    matrix).
+
+    P = number of points
+
+    :param row_indices: length-P numpy array of row indices.
+    :param column_indices: length-P numpy array of column indices.
+    :param half_width_in_pixels: Half-width of dilation window.
+    :param num_rows: Number of rows in full matrix.
+    :param num_columns: Number of columns in full matrix.
+    :return: first_row: First row in bounding box.
+    :return: last_row: Last row in bounding box.
+    :return: first_column: First column in bounding box.
+    :return: last_column: Last column in bounding box.
+    """
+
+    error_checking.assert_is_integer_numpy_array(row_indices)
+    error_checking.assert_is_numpy_array(row_indices, num_dimensions=1)
+    error_checking.assert_is_geq_numpy_array(row_indices, 0)
+    error_checking.assert_is_less_than_numpy_array(row_indices, num_rows)
+
+    num_points = len(row_indices)
+    error_checking.assert_is_integer_numpy_array(column_indices)
+    error_checking.assert_is_numpy_array(
+        column_indices, exact_dimensions=numpy.array([num_points]))
+    error_checking.assert_is_geq_numpy_array(column_indices, 0)
+    error_checking.assert_is_less_than_numpy_array(column_indices, num_columns)
+
+    error_checking.assert_is_integer(half_width_in_pixels)
+    error_checking.assert_is_greater(half_width_in_pixels, 0)
+
+    first_row = max([numpy.min(row_indices) - half_width_in_pixels, 0])
+    last_row = min([numpy.max(row_indices) + half_width_in_pixels,
+                    num_rows - 1])
+    first_column = max([numpy.min(column_indices) - half_width_in_pixels, 0])
+    last_column = min([numpy.max(column_indices) + half_width_in_pixels,
+                       num_columns - 1])
+
+    return first_row, last_row, first_column, last_column
@@ -33,6 +33,29 @@ OUTPUT_MATRIX_LARGEST_ABS_VALUE = numpy.array(
      [10., 15., 15., 10., 5.],
      [10., 15., 15., 10., numpy.nan]])
 
+OUTPUT_MATRIX_MAX = numpy.array(
+    [[numpy.nan, numpy.nan, 5., 10., 10.],
+     [5., 10., 10., 10., 10.],
+     [15., 20., 20., 20., 10.],
+     [15., 20., 20., 20., numpy.nan]])
+
+OUTPUT_MATRIX_MAX_OR_MIN = numpy.array(
+    [[-20., -20., -15., 10., 10.],
+     [-20., -20., -15., 10., 10.],
+     [15., 20., 20., 20., 10.],
+     [15., 20., 20., 20., numpy.nan]])
+
+# The following constants are used to test get_bounding_box_for_points.
+NUM_ROWS_IN_FULL_MATRIX = 10
+NUM_COLUMNS_IN_FULL_MATRIX = 20
+ROW_INDICES_FOR_BOX = numpy.array([1, 5, 3], dtype=int)
+COLUMN_INDICES_FOR_BOX = numpy.array([10, 12, 19], dtype=int)
+BOX_HALF_WIDTH_IN_PIXELS = 2
+FIRST_ROW_IN_BOX = 0
+LAST_ROW_IN_BOX = 7
+FIRST_COLUMN_IN_BOX = 8
+LAST_COLUMN_IN_BOX = 19
+
 
 class DilationTests(unittest.TestCase):
     """Each method is a unit test for dilation.py."""
@@ -74,6 +97,52 @@ class DilationTests(unittest.TestCase):
             this_output_matrix, OUTPUT_MATRIX_LARGEST_ABS_VALUE, atol=TOLERANCE,
             equal_nan=True))
 
+    def test_dilate_2d_matrix_max(self):
+        """Ensures correct output from dilate_2d_matrix.
+
+        In this case, percentile_level = 100 (so the maximum filter is used).
+        """
+
+        this_output_matrix = dilation.dilate_2d_matrix(
+            INPUT_MATRIX + 0., percentile_level=100.,
+            half_width_in_pixels=DILATION_HALF_WIDTH_IN_PIXELS)
+
+        self.assertTrue(numpy.allclose(
+            this_output_matrix, OUTPUT_MATRIX_MAX, atol=TOLERANCE,
+            equal_nan=True))
+
+    def test_dilate_2d_matrix_max_or_min(self):
+        """Ensures correct output from dilate_2d_matrix.
+
+        In this case, percentile_level = 100 and take_largest_absolute_value =
+        True (so both the maximum and minimum filters are used).
+        """
+
+        this_output_matrix = dilation.dilate_2d_matrix(
+            INPUT_MATRIX + 0., percentile_level=100.,
+            half_width_in_pixels=DILATION_HALF_WIDTH_IN_PIXELS,
+            take_largest_absolute_value=True)
+
+        self.assertTrue(numpy.allclose(
+            this_output_matrix, OUTPUT_MATRIX_MAX_OR_MIN, atol=TOLERANCE,
+            equal_nan=True))
+
+    def test_get_bounding_box_for_points(self):
+        """Ensures correct output from get_bounding_box_for_points."""
+
+        this_first_row, this_last_row, this_first_column, this_last_column = (
+            dilation.get_bounding_box_for_points(
+                row_indices=ROW_INDICES_FOR_BOX,
+                column_indices=COLUMN_INDICES_FOR_BOX,
+                half_width_in_pixels=BOX_HALF_WIDTH_IN_PIXELS,
+                num_rows=NUM_ROWS_IN_FULL_MATRIX,
+                num_columns=NUM_COLUMNS_IN_FULL_MATRIX))
+
+        self.assertTrue(this_first_row == FIRST_ROW_IN_BOX)
+        self.assertTrue(this_last_row == LAST_ROW_IN_BOX)
+        self.assertTrue(this_first_column == FIRST_COLUMN_IN_BOX)
+        self.assertTrue(this_last_column == LAST_COLUMN_IN_BOX)
+
 
 if __name__ == '__main__':
     unittest.main()
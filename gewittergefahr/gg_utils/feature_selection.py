@@ -13,13 +13,20 @@ Lakshmanan, V., C. Karstens, J. Krause, K. Elmore, A. Ryzhkov, and S. Berkseth,
 Webb, A.R., 2003: "Statistical Pattern Recognition". John Wiley & Sons.
 """
 
+import os
+import os.path
 import copy
+import pickle
+import hashlib
+import multiprocessing
 import numpy
 import pandas
 import sklearn.base
 import sklearn.metrics
 import matplotlib.pyplot as pyplot
 from gewittergefahr.gg_utils import model_evaluation as model_eval
+from gewittergefahr.gg_utils import bootstrapping
+from gewittergefahr.gg_utils import file_system_utils
 from gewittergefahr.gg_utils import error_checking
 
 # TODO(thunderhoser): This module has a lot of duplicated code.  Need to clean
@@ -57,10 +64,45 @@ REMOVED_FEATURES_KEY = 'removed_feature_names'
 FEATURE_NAME_KEY = 'feature_name'
 VALIDATION_XENTROPY_KEY = 'validation_cross_entropy'
 VALIDATION_AUC_KEY = 'validation_auc'
+VALIDATION_XENTROPY_CI_BOTTOM_KEY = 'validation_cross_entropy_ci_bottom'
+VALIDATION_XENTROPY_CI_TOP_KEY = 'validation_cross_entropy_ci_top'
+VALIDATION_AUC_CI_BOTTOM_KEY = 'validation_auc_ci_bottom'
+VALIDATION_AUC_CI_TOP_KEY = 'validation_auc_ci_top'
 TESTING_XENTROPY_KEY = 'testing_cross_entropy'
 TESTING_AUC_KEY = 'testing_auc'
 VALIDATION_XENTROPY_BY_STEP_KEY = 'validation_cross_entropy_by_step'
 
+DEFAULT_NUM_PROCESSES_FOR_SELECTION = 1
+DEFAULT_NUM_PERMUTATIONS = 1
+DEFAULT_CONFIDENCE_LEVEL_FOR_PERMUTATION = 0.95
+MAX_RANDOM_SEED = numpy.iinfo(numpy.int32).max
+
+ESTIMATOR_KEY = 'estimator_object'
+TRAINING_MATRIX_KEY = 'training_matrix'
+TRAINING_LABELS_KEY = 'training_labels'
+VALIDATION_MATRIX_KEY = 'validation_matrix'
+VALIDATION_LABELS_KEY = 'validation_labels'
+COLUMN_INDEX_BY_FEATURE_KEY = 'column_index_by_feature'
+TRAINED_ESTIMATOR_KEY = 'trained_estimator_object'
+NUM_PERMUTATIONS_KEY = 'num_permutations'
+
+ALGORITHM_NAME_KEY = 'algorithm_name'
+ALL_FEATURES_KEY = 'all_feature_names'
+UNSELECTED_FEATURES_KEY = 'unselected_feature_names'
+MIN_XENTROPY_BY_STEP_KEY = 'min_xentropy_by_step'
+MAJOR_STEP_NUM_KEY = 'major_step_num'
+INPUT_FINGERPRINT_KEY = 'input_fingerprint'
+
+SFS_NAME = 'sfs'
+SFS_WITH_BACKWARD_STEPS_NAME = 'sfs_with_backward_steps'
+SFFS_NAME = 'sffs'
+SBS_NAME = 'sbs'
+SBS_WITH_FORWARD_STEPS_NAME = 'sbs_with_forward_steps'
+SBFS_NAME = 'sbfs'
+
+# Used only inside worker processes (set by _init_selection_worker).
+_WORKER_SELECTION_DICT = None
+
 PERMUTATION_TYPE = 'permutation'
 FORWARD_SELECTION_TYPE = 'forward'
 BACKWARD_SELECTION_TYPE = 'backward'
@@ -105,6 +147,379 @@ def _check_sequential_selection_inputs(
         training_table[target_name].values, 1)
 
 
+def _get_selection_dict(
+        training_table=None, validation_table=None, feature_names=None,
+        target_name=None, estimator_object=None):
+    """Creates dictionary with inputs for evaluating candidate feature sets.
+
+    Training and validation data are converted to numpy matrices only once.
+    Each candidate feature set is then evaluated by indexing columns of these
+    matrices, rather than re-extracting columns from the pandas DataFrames.
+
+    :param training_table: See doc for _check_sequential_selection_inputs.
+    :param validation_table: See doc for _check_sequential_selection_inputs.
+    :param feature_names: See doc for _check_sequential_selection_inputs.
+    :param target_name: See doc for _check_sequential_selection_inputs.
+    :param estimator_object: Instance of scikit-learn estimator.  Must implement
+        the methods `fit` and `predict_proba`.
+    :return: selection_dict: Dictionary with the following keys.
+    selection_dict['estimator_object']: See input doc.
+    selection_dict['training_matrix']: E_t-by-F numpy array of feature values,
+        where E_t = number of training examples.  Column order is the same as
+        in `feature_names`.
+    selection_dict['training_labels']: length-E_t numpy array of labels.
+    selection_dict['validation_matrix']: E_v-by-F numpy array of feature values,
+        where E_v = number of validation examples.
+    selection_dict['validation_labels']: length-E_v numpy array of labels.
+    selection_dict['column_index_by_feature']: Dictionary, where each key is a
+        feature name and the corresponding value is the column index in
+        training_matrix and validation_matrix.
+    """
+
+    return {
+        ESTIMATOR_KEY: estimator_object,
+        TRAINING_MATRIX_KEY: numpy.asfortranarray(
+            training_table[feature_names].values, dtype=float),
+        TRAINING_LABELS_KEY: training_table[target_name].values,
+        VALIDATION_MATRIX_KEY: numpy.asfortranarray(
+            validation_table[feature_names].values, dtype=float),
+        VALIDATION_LABELS_KEY: validation_table[target_name].values,
+        COLUMN_INDEX_BY_FEATURE_KEY: dict(
+            [(feature_names[j], j) for j in range(len(feature_names))])
+    }
+
+
+def _get_xentropy_for_feature_set(selection_dict, feature_names):
+    """Trains model with one set of features; computes validation cross-entropy.
+
+    :param selection_dict: Dictionary created by _get_selection_dict.
+    :param feature_names: 1-D list with names of features to use.
+    :return: validation_cross_entropy: Cross-entropy on validation data.
+    """
+
+    column_indices = numpy.array(
+        [selection_dict[COLUMN_INDEX_BY_FEATURE_KEY][f]
+         for f in feature_names], dtype=int)
+
+    new_estimator_object = sklearn.base.clone(selection_dict[ESTIMATOR_KEY])
+    new_estimator_object.fit(
+        selection_dict[TRAINING_MATRIX_KEY][:, column_indices],
+        selection_dict[TRAINING_LABELS_KEY])
+
+    forecast_probabilities = new_estimator_object.predict_proba(
+        selection_dict[VALIDATION_MATRIX_KEY][:, column_indices])[:, 1]
+    return model_eval.get_cross_entropy(
+        forecast_probabilities, selection_dict[VALIDATION_LABELS_KEY])
+
+
+def _init_selection_worker(selection_dict):
+    """Initializes worker process for evaluating candidate feature sets.
+
+    The selection dictionary (containing training and validation matrices) is
+    sent to each worker only once, rather than with every candidate.
+
+    :param selection_dict: Dictionary created by _get_selection_dict.
+    """
+
+    global _WORKER_SELECTION_DICT
+    _WORKER_SELECTION_DICT = selection_dict
+
+
+def _get_xentropy_for_feature_set_in_worker(feature_names):
+    """Same as _get_xentropy_for_feature_set, but runs in worker process.
+
+    :param feature_names: See doc for _get_xentropy_for_feature_set.
+    :return: validation_cross_entropy: Same.
+    """
+
+    return _get_xentropy_for_feature_set(_WORKER_SELECTION_DICT, feature_names)
+
+
+def _create_worker_pool(selection_dict, num_processes):
+    """Creates pool of worker processes for evaluating candidate feature sets.
+
+    :param selection_dict: Dictionary created by _get_selection_dict.
+    :param num_processes: Number of worker processes.  If num_processes = 1,
+        candidates will be evaluated in the calling process.
+    :return: worker_pool: Instance of `multiprocessing.Pool`.  If
+        num_processes = 1, this is None.
+    """
+
+    error_checking.assert_is_integer(num_processes)
+    error_checking.assert_is_greater(num_processes, 0)
+    if num_processes == 1:
+        return None
+
+    return multiprocessing.Pool(
+        processes=num_processes, initializer=_init_selection_worker,
+        initargs=(selection_dict,))
+
+
+def _close_worker_pool(worker_pool):
+    """Closes pool of worker processes.
+
+    :param worker_pool: Instance of `multiprocessing.Pool` (or None).
+    """
+
+    if worker_pool is None:
+        return
+
+    worker_pool.close()
+    worker_pool.join()
+
+
+def _get_xentropy_for_candidates(
+        selection_dict, list_of_candidate_feature_names, worker_pool=None):
+    """Computes validation cross-entropy for each candidate set of features.
+
+    C = number of candidates
+
+    :param selection_dict: Dictionary created by _get_selection_dict.
+    :param list_of_candidate_feature_names: length-C list, where each element is
+        a 1-D list of feature names.
+    :param worker_pool: Instance of `multiprocessing.Pool`, created by
+        _create_worker_pool.  If None, candidates will be evaluated serially in
+        the calling process.
+    :return: xentropy_by_candidate: length-C numpy array of validation
+        cross-entropies.
+    """
+
+    if worker_pool is None:
+        xentropy_by_candidate = [
+            _get_xentropy_for_feature_set(selection_dict, f)
+            for f in list_of_candidate_feature_names]
+    else:
+        xentropy_by_candidate = worker_pool.map(
+            _get_xentropy_for_feature_set_in_worker,
+            list_of_candidate_feature_names)
+
+    return numpy.array(xentropy_by_candidate, dtype=float)
+
+
+def _get_candidates_for_addition(selected_feature_names, other_feature_names):
+    """Creates candidate feature sets, each adding one unselected feature.
+
+    C = number of candidates = number of other features
+
+    :param selected_feature_names: 1-D list with names of selected features.
+    :param other_feature_names: length-C list with names of features that may be
+        added.
+    :return: list_of_candidate_feature_names: length-C list, where each element
+        is a 1-D list of feature names.
+    """
+
+    return [selected_feature_names + [f] for f in other_feature_names]
+
+
+def _get_candidates_for_removal(selected_feature_names):
+    """Creates candidate feature sets, each removing one selected feature.
+
+    C = number of candidates = number of selected features
+
+    :param selected_feature_names: length-C list with names of selected
+        features.
+    :return: list_of_candidate_feature_names: length-C list, where the [j]th
+        element is a 1-D list of feature names without the [j]th selected
+        feature.
+    """
+
+    list_of_candidate_feature_names = []
+    for this_feature_name in selected_feature_names:
+        these_feature_names = set(selected_feature_names)
+        these_feature_names.remove(this_feature_name)
+        list_of_candidate_feature_names.append(list(these_feature_names))
+
+    return list_of_candidate_feature_names
+
+
+def _permute_one_feature(selection_dict, column_index, random_seed):
+    """Permutes one feature repeatedly and computes validation scores.
+
+    The feature is permuted in place and restored afterwards, so that the
+    validation matrix is never copied.
+
+    K = number of permutations
+
+    :param selection_dict: Dictionary created by _get_selection_dict, with the
+        additional keys "trained_estimator_object" and "num_permutations".
+    :param column_index: Index of feature (column in validation matrix) to
+        permute.
+    :param random_seed: Seed for random-number generator.
+    :return: xentropy_by_permutation: length-K numpy array of validation
+        cross-entropies.
+    :return: auc_by_permutation: length-K numpy array of validation AUC (area
+        under ROC curve).
+    """
+
+    validation_matrix = selection_dict[VALIDATION_MATRIX_KEY]
+    validation_labels = selection_dict[VALIDATION_LABELS_KEY]
+    num_permutations = selection_dict[NUM_PERMUTATIONS_KEY]
+
+    orig_values = validation_matrix[:, column_index].copy()
+    random_state_object = numpy.random.RandomState(seed=random_seed)
+    xentropy_by_permutation = numpy.full(num_permutations, numpy.nan)
+    auc_by_permutation = numpy.full(num_permutations, numpy.nan)
+
+    for k in range(num_permutations):
+        validation_matrix[:, column_index] = orig_values[
+            random_state_object.permutation(len(orig_values))]
+
+        these_forecast_probabilities = selection_dict[
+            TRAINED_ESTIMATOR_KEY].predict_proba(validation_matrix)[:, 1]
+        auc_by_permutation[k] = model_eval.get_area_under_roc_curve_from_probs(
+            these_forecast_probabilities, validation_labels)
+        xentropy_by_permutation[k] = model_eval.get_cross_entropy(
+            these_forecast_probabilities, validation_labels)
+
+    validation_matrix[:, column_index] = orig_values
+    return xentropy_by_permutation, auc_by_permutation
+
+
+def _permute_one_feature_in_worker(argument_list):
+    """Same as _permute_one_feature, but runs in worker process.
+
+    :param argument_list: List with the following items.
+    column_index: See doc for _permute_one_feature.
+    random_seed: Same.
+    :return: xentropy_by_permutation: Same.
+    :return: auc_by_permutation: Same.
+    """
+
+    return _permute_one_feature(_WORKER_SELECTION_DICT, *argument_list)
+
+
+def _get_selection_fingerprint(
+        selection_dict, feature_names=None, hyperparameters=None):
+    """Computes fingerprint of inputs to sequential-selection algorithm.
+
+    The fingerprint is a hash of the training and validation data, estimator,
+    feature names (in order), and hyperparameters.  It is stored in the
+    checkpoint file, so that a run is never resumed with different inputs.
+
+    :param selection_dict: Dictionary created by _get_selection_dict.
+    :param feature_names: 1-D list with names of all features.
+    :param hyperparameters: 1-D list of hyperparameters that affect the
+        selection (for example, min_fractional_xentropy_decrease).
+    :return: input_fingerprint: Fingerprint (string).
+    """
+
+    hash_object = hashlib.sha1()
+    hash_object.update(str(feature_names))
+    hash_object.update(str(hyperparameters))
+    hash_object.update(str(selection_dict[ESTIMATOR_KEY]))
+
+    for this_key in [TRAINING_MATRIX_KEY, TRAINING_LABELS_KEY,
+                     VALIDATION_MATRIX_KEY, VALIDATION_LABELS_KEY]:
+        this_array = numpy.ascontiguousarray(selection_dict[this_key])
+        hash_object.update(str(this_array.dtype) + str(this_array.shape))
+        hash_object.update(this_array.tobytes())
+
+    return hash_object.hexdigest()
+
+
+def _write_selection_checkpoint(
+        checkpoint_file_name, algorithm_name=None, feature_names=None,
+        selected_feature_names=None, unselected_feature_names=None,
+        min_xentropy_by_step=None, major_step_num=None,
+        input_fingerprint=None):
+    """Writes state of sequential-selection algorithm to Pickle file.
+
+    The file is written to a temporary path and then renamed, so that an
+    interruption never leaves a partial checkpoint.
+
+    :param checkpoint_file_name: Path to output file.
+    :param algorithm_name: Name of selection algorithm (for example, "sfs" or
+        "sbfs").
+    :param feature_names: 1-D list with names of all features.
+    :param selected_feature_names: 1-D list with names of selected features.
+    :param unselected_feature_names: 1-D list with names of unselected features
+        (remaining features for forward selection, removed features for
+        backward selection).
+    :param min_xentropy_by_step: 1-D numpy array of minimum cross-entropies
+        (indexed by number of features selected or removed).
+    :param major_step_num: Number of major steps completed.
+    :param input_fingerprint: Fingerprint created by _get_selection_fingerprint.
+    """
+
+    checkpoint_dict = {
+        ALGORITHM_NAME_KEY: algorithm_name,
+        ALL_FEATURES_KEY: feature_names,
+        SELECTED_FEATURES_KEY: selected_feature_names,
+        UNSELECTED_FEATURES_KEY: unselected_feature_names,
+        MIN_XENTROPY_BY_STEP_KEY: min_xentropy_by_step,
+        MAJOR_STEP_NUM_KEY: major_step_num,
+        INPUT_FINGERPRINT_KEY: input_fingerprint
+    }
+
+    file_system_utils.mkdir_recursive_if_necessary(
+        file_name=checkpoint_file_name)
+
+    temp_file_name = checkpoint_file_name + '.tmp'
+    pickle_file_handle = open(temp_file_name, 'wb')
+    pickle.dump(checkpoint_dict, pickle_file_handle)
+    pickle_file_handle.close()
+    os.rename(temp_file_name, checkpoint_file_name)
+
+
+def _read_selection_checkpoint(
+        checkpoint_file_name, algorithm_name=None, feature_names=None,
+        input_fingerprint=None):
+    """Reads state of sequential-selection algorithm from Pickle file.
+
+    :param checkpoint_file_name: Path to input file.
+    :param algorithm_name: Name of selection algorithm being run.
+    :param feature_names: 1-D list with names of all features.
+    :param input_fingerprint: Fingerprint (created by
+        _get_selection_fingerprint) of inputs to the run being resumed.
+    :return: checkpoint_dict: Dictionary with keys listed in
+        _write_selection_checkpoint.  If the file does not exist, this is None.
+    :raises: ValueError: if the checkpoint was written by a different algorithm,
+        for a different set of features, or for different inputs (data,
+        estimator, or hyperparameters).
+    """
+
+    if checkpoint_file_name is None or not os.path.isfile(checkpoint_file_name):
+        return None
+
+    pickle_file_handle = open(checkpoint_file_name, 'rb')
+    checkpoint_dict = pickle.load(pickle_file_handle)
+    pickle_file_handle.close()
+
+    if checkpoint_dict[ALGORITHM_NAME_KEY] != algorithm_name:
+        error_string = (
+            'Checkpoint file ("' + checkpoint_file_name + '") was written '
+            'by "' + checkpoint_dict[ALGORITHM_NAME_KEY] + '", not "' +
+            algorithm_name + '".')
+        raise ValueError(error_string)
+
+    if set(checkpoint_dict[ALL_FEATURES_KEY]) != set(feature_names):
+        error_string = (
+            'Checkpoint file ("' + checkpoint_file_name + '") was written for '
+            'a different set of features.')
+        raise ValueError(error_string)
+
+    if checkpoint_dict.get(INPUT_FINGERPRINT_KEY) != input_fingerprint:
+        error_string = (
+            'Checkpoint file ("' + checkpoint_file_name + '") was written for '
+            'different data, estimator, or hyperparameters.')
+        raise ValueError(error_string)
+
+    print 'Resuming ' + algorithm_name + ' from checkpoint...'
+    return checkpoint_dict
+
+
+def _delete_selection_checkpoint(checkpoint_file_name):
+    """Deletes checkpoint file after sequential-selection algorithm completes.
+
+    :param checkpoint_file_name: Path to checkpoint file (or None).
+    """
+
+    if checkpoint_file_name is None or not os.path.isfile(checkpoint_file_name):
+        return
+
+    os.remove(checkpoint_file_name)
+
+
 def _evaluate_feature_selection(
         training_table=None, validation_table=None, testing_table=None,
         estimator_object=None, selected_feature_names=None, target_name=None):
@@ -261,7 +676,9 @@ def sequential_forward_selection(
         training_table=None, validation_table=None, testing_table=None,
         feature_names=None, target_name=None, estimator_object=None,
         min_fractional_xentropy_decrease=
-        DEFAULT_MIN_FRACTIONAL_XENTROPY_DECR_FOR_SFS):
+        DEFAULT_MIN_FRACTIONAL_XENTROPY_DECR_FOR_SFS,
+        num_processes=DEFAULT_NUM_PROCESSES_FOR_SELECTION,
+        checkpoint_file_name=None):
     """Runs the SFS (sequential forward selection) algorithm.
 
     SFS is defined in Chapter 9 of Webb (2003).
@@ -280,6 +697,15 @@ def sequential_forward_selection(
         fractional decrease in cross-entropy from adding a feature is <
         `min_fractional_xentropy_decrease`, SFS will stop.  Must be in range
         (0, 1).
+    :param num_processes: Number of worker processes.  At each step, all
+        candidate feature sets are evaluated concurrently by a pool of this many
+        processes.  If num_processes = 1, candidates are evaluated serially.
+    :param checkpoint_file_name: Path to checkpoint file (Pickle).  If None,
+        there will be no checkpointing.  Otherwise, the state of the algorithm
+        is written here after each step, and if the file already exists, the
+        algorithm resumes from the state therein (only if the file was written
+        for the same data, estimator, and hyperparameters).  The file is
+        deleted when the algorithm completes.
     :return: sfs_dictionary: Same as output from _evaluate_feature_selection,
         except with one additional key.
     sfs_dictionary['validation_xentropy_by_step']: length-f numpy array of
@@ -304,55 +730,77 @@ def sequential_forward_selection(
     min_cross_entropy_by_num_selected = numpy.full(num_features, numpy.nan)
     min_cross_entropy_by_num_selected[0] = 1e10
 
-    while remaining_feature_names:  # While there are still features to select.
-        num_selected_features = len(selected_feature_names)
-        num_remaining_features = len(remaining_feature_names)
-        new_xentropy_by_feature = numpy.full(num_remaining_features, numpy.nan)
-
-        print ('Step {0:d} of sequential forward selection: {1:d} features '
-               'selected, {2:d} remaining...').format(
-                   num_selected_features + 1, num_selected_features,
-                   num_remaining_features)
+    selection_dict = _get_selection_dict(
+        training_table=training_table, validation_table=validation_table,
+        feature_names=feature_names, target_name=target_name,
+        estimator_object=estimator_object)
+    input_fingerprint = _get_selection_fingerprint(
+        selection_dict, feature_names=feature_names,
+        hyperparameters=[min_fractional_xentropy_decrease])
+
+    checkpoint_dict = _read_selection_checkpoint(
+        checkpoint_file_name, algorithm_name=SFS_NAME,
+        feature_names=feature_names, input_fingerprint=input_fingerprint)
+    if checkpoint_dict is not None:
+        selected_feature_names = checkpoint_dict[SELECTED_FEATURES_KEY]
+        remaining_feature_names = checkpoint_dict[UNSELECTED_FEATURES_KEY]
+        min_cross_entropy_by_num_selected = checkpoint_dict[
+            MIN_XENTROPY_BY_STEP_KEY]
+
+    worker_pool = _create_worker_pool(selection_dict, num_processes)
+    try:
+        # While there are still features to select.
+        while remaining_feature_names:
+            num_selected_features = len(selected_feature_names)
+            num_remaining_features = len(remaining_feature_names)
 
-        for j in range(num_remaining_features):
-            these_feature_names = (
-                selected_feature_names + [remaining_feature_names[j]])
+            print ('Step {0:d} of sequential forward selection: {1:d} features '
+                   'selected, {2:d} remaining...').format(
+                       num_selected_features + 1, num_selected_features,
+                       num_remaining_features)
 
-            new_estimator_object = sklearn.base.clone(estimator_object)
-            new_estimator_object.fit(
-                training_table.as_matrix(columns=these_feature_names),
-                training_table[target_name].values)
+            new_xentropy_by_feature = _get_xentropy_for_candidates(
+                selection_dict,
+                _get_candidates_for_addition(
+                    selected_feature_names, remaining_feature_names),
+                worker_pool=worker_pool)
 
-            these_forecast_probabilities = new_estimator_object.predict_proba(
-                validation_table.as_matrix(columns=these_feature_names))[:, 1]
-            new_xentropy_by_feature[j] = model_eval.get_cross_entropy(
-                these_forecast_probabilities,
-                validation_table[target_name].values)
+            min_new_cross_entropy = numpy.min(new_xentropy_by_feature)
+            this_best_feature_index = numpy.argmin(new_xentropy_by_feature)
+            this_best_feature_name = remaining_feature_names[
+                this_best_feature_index]
 
-        min_new_cross_entropy = numpy.min(new_xentropy_by_feature)
-        this_best_feature_index = numpy.argmin(new_xentropy_by_feature)
-        this_best_feature_name = remaining_feature_names[
-            this_best_feature_index]
+            print (
+                'Minimum cross-entropy ({0:.4f}) given by adding feature '
+                '"{1:s}"; previous min cross-entropy = {2:.4f}').format(
+                    min_new_cross_entropy, this_best_feature_name,
+                    min_cross_entropy_by_num_selected[num_selected_features])
 
-        print (
-            'Minimum cross-entropy ({0:.4f}) given by adding feature '
-            '"{1:s}"; previous min cross-entropy = {2:.4f}').format(
-                min_new_cross_entropy, this_best_feature_name,
-                min_cross_entropy_by_num_selected[num_selected_features])
+            stop_if_cross_entropy_above = (
+                min_cross_entropy_by_num_selected[num_selected_features] * (
+                    1. - min_fractional_xentropy_decrease))
+            if min_new_cross_entropy > stop_if_cross_entropy_above:
+                break
 
-        stop_if_cross_entropy_above = (
-            min_cross_entropy_by_num_selected[num_selected_features] * (
-                1. - min_fractional_xentropy_decrease))
-        if min_new_cross_entropy > stop_if_cross_entropy_above:
-            break
+            min_cross_entropy_by_num_selected[
+                num_selected_features + 1] = min_new_cross_entropy
 
-        min_cross_entropy_by_num_selected[
-            num_selected_features + 1] = min_new_cross_entropy
+            selected_feature_names.append(this_best_feature_name)
+            remaining_feature_names = set(remaining_feature_names)
+            remaining_feature_names.remove(this_best_feature_name)
+            remaining_feature_names = list(remaining_feature_names)
 
-        selected_feature_names.append(this_best_feature_name)
-        remaining_feature_names = set(remaining_feature_names)
-        remaining_feature_names.remove(this_best_feature_name)
-        remaining_feature_names = list(remaining_feature_names)
+            if checkpoint_file_name is not None:
+                _write_selection_checkpoint(
+                    checkpoint_file_name, algorithm_name=SFS_NAME,
+                    feature_names=feature_names,
+                    selected_feature_names=selected_feature_names,
+                    unselected_feature_names=remaining_feature_names,
+                    min_xentropy_by_step=min_cross_entropy_by_num_selected,
+                    major_step_num=None,
+                    input_fingerprint=input_fingerprint)
+    finally:
+        _close_worker_pool(worker_pool)
 
     sfs_dictionary = _evaluate_feature_selection(
         training_table=training_table, validation_table=validation_table,
@@ -363,6 +811,8 @@ def sequential_forward_selection(
     sfs_dictionary.update(
         {VALIDATION_XENTROPY_BY_STEP_KEY:
              min_cross_entropy_by_num_selected[1:(num_selected_features + 1)]})
+
+    _delete_selection_checkpoint(checkpoint_file_name)
     return sfs_dictionary
 
 
@@ -372,7 +822,9 @@ def sfs_with_backward_steps(
         num_forward_steps=DEFAULT_NUM_FORWARD_STEPS_FOR_SFS,
         num_backward_steps=DEFAULT_NUM_BACKWARD_STEPS_FOR_SFS,
         min_fractional_xentropy_decrease=
-        DEFAULT_MIN_FRACTIONAL_XENTROPY_DECR_FOR_SFS):
+        DEFAULT_MIN_FRACTIONAL_XENTROPY_DECR_FOR_SFS,
+        num_processes=DEFAULT_NUM_PROCESSES_FOR_SELECTION,
+        checkpoint_file_name=None):
     """Runs SFS (sequential forward selection) with backward steps.
 
     This method is called "plus l - take away r selection" in Chapter 9 of Webb
@@ -399,6 +851,8 @@ def sfs_with_backward_steps(
         fractional decrease in cross-entropy from a major step is <
         `min_fractional_xentropy_decrease`, algorithm will stop.  Must be in
         range (0, 1).
+    :param num_processes: See doc for sequential_forward_selection.
+    :param checkpoint_file_name: See doc for sequential_forward_selection.
     :return: sfs_dictionary: See doc for sequential_forward_selection.
     """
 
@@ -429,117 +883,126 @@ def sfs_with_backward_steps(
     min_cross_entropy_by_num_selected = numpy.full(num_features, numpy.nan)
     min_cross_entropy_by_num_selected[0] = 1e10
 
-    while len(selected_feature_names) + num_forward_steps <= num_features:
-        major_step_num += 1
-        min_cross_entropy_prev_major_step = min_cross_entropy_by_num_selected[
-            len(selected_feature_names)]
-        selected_feature_names_prev_major_step = copy.deepcopy(
-            selected_feature_names)
-
-        for i in range(num_forward_steps):
-            num_selected_features = len(selected_feature_names)
-            num_remaining_features = len(remaining_feature_names)
-            new_xentropy_by_feature = numpy.full(
-                num_remaining_features, numpy.nan)
-
-            print ('Major step {0:d}, forward step {1:d}: {2:d} features '
-                   'selected, {3:d} remaining...').format(
-                       major_step_num, i + 1, num_selected_features,
-                       num_remaining_features)
-
-            for j in range(num_remaining_features):
-                these_feature_names = (
-                    selected_feature_names + [remaining_feature_names[j]])
-
-                new_estimator_object = sklearn.base.clone(estimator_object)
-                new_estimator_object.fit(
-                    training_table.as_matrix(columns=these_feature_names),
-                    training_table[target_name].values)
-
-                these_forecast_probabilities = (
-                    new_estimator_object.predict_proba(
-                        validation_table.as_matrix(
-                            columns=these_feature_names))[:, 1])
-                new_xentropy_by_feature[j] = model_eval.get_cross_entropy(
-                    these_forecast_probabilities,
-                    validation_table[target_name].values)
-
-            min_new_cross_entropy = numpy.min(new_xentropy_by_feature)
-            this_best_feature_index = numpy.argmin(new_xentropy_by_feature)
-            this_best_feature_name = remaining_feature_names[
-                this_best_feature_index]
-
-            print (
-                'Minimum cross-entropy ({0:.4f}) given by adding feature '
-                '"{1:s}"; previous min cross-entropy = {2:.4f}').format(
-                    min_new_cross_entropy, this_best_feature_name,
-                    min_cross_entropy_by_num_selected[num_selected_features])
-
-            min_cross_entropy_by_num_selected[
-                num_selected_features + 1] = min_new_cross_entropy
-
-            selected_feature_names.append(this_best_feature_name)
-            remaining_feature_names = set(remaining_feature_names)
-            remaining_feature_names.remove(this_best_feature_name)
-            remaining_feature_names = list(remaining_feature_names)
-
-        for i in range(num_backward_steps):
-            num_selected_features = len(selected_feature_names)
-            new_xentropy_by_feature = numpy.full(
-                num_selected_features, numpy.nan)
-
-            print ('Major step {0:d}, backward step {1:d}: {2:d}/{3:d} '
-                   'features selected...').format(
-                       major_step_num, i + 1, num_selected_features,
-                       num_features)
-
-            for j in range(num_selected_features):
-                these_feature_names = set(selected_feature_names)
-                these_feature_names.remove(selected_feature_names[j])
-                these_feature_names = list(these_feature_names)
-
-                new_estimator_object = sklearn.base.clone(estimator_object)
-                new_estimator_object.fit(
-                    training_table.as_matrix(columns=these_feature_names),
-                    training_table[target_name].values)
-
-                these_forecast_probabilities = (
-                    new_estimator_object.predict_proba(
-                        validation_table.as_matrix(
-                            columns=these_feature_names))[:, 1])
-                new_xentropy_by_feature[j] = model_eval.get_cross_entropy(
-                    these_forecast_probabilities,
-                    validation_table[target_name].values)
-
-            min_new_cross_entropy = numpy.min(new_xentropy_by_feature)
-            this_worst_feature_index = numpy.argmin(new_xentropy_by_feature)
-            this_worst_feature_name = selected_feature_names[
-                this_worst_feature_index]
-
-            print (
-                'Minimum cross-entropy ({0:.4f}) given by removing feature '
-                '"{1:s}"; previous min cross-entropy = {2:.4f}').format(
-                    min_new_cross_entropy, this_worst_feature_name,
-                    min_cross_entropy_by_num_selected[num_selected_features])
-
-            min_cross_entropy_by_num_selected[num_selected_features] = numpy.nan
-            min_cross_entropy_by_num_selected[
-                num_selected_features - 1] = min_new_cross_entropy
-
-            remaining_feature_names.append(this_worst_feature_name)
-            selected_feature_names = set(selected_feature_names)
-            selected_feature_names.remove(this_worst_feature_name)
-            selected_feature_names = list(selected_feature_names)
-
-        print '\n'
-        stop_if_cross_entropy_above = min_cross_entropy_prev_major_step * (
-            1. - min_fractional_xentropy_decrease)
-
-        if (min_cross_entropy_by_num_selected[len(selected_feature_names)] >
-                stop_if_cross_entropy_above):
-            selected_feature_names = copy.deepcopy(
-                selected_feature_names_prev_major_step)
-            break
+    selection_dict = _get_selection_dict(
+        training_table=training_table, validation_table=validation_table,
+        feature_names=feature_names, target_name=target_name,
+        estimator_object=estimator_object)
+    input_fingerprint = _get_selection_fingerprint(
+        selection_dict, feature_names=feature_names,
+        hyperparameters=[num_forward_steps, num_backward_steps,
+                         min_fractional_xentropy_decrease])
+
+    checkpoint_dict = _read_selection_checkpoint(
+        checkpoint_file_name, algorithm_name=SFS_WITH_BACKWARD_STEPS_NAME,
+        feature_names=feature_names, input_fingerprint=input_fingerprint)
+    if checkpoint_dict is not None:
+        selected_feature_names = checkpoint_dict[SELECTED_FEATURES_KEY]
+        remaining_feature_names = checkpoint_dict[UNSELECTED_FEATURES_KEY]
+        min_cross_entropy_by_num_selected = checkpoint_dict[
+            MIN_XENTROPY_BY_STEP_KEY]
+        major_step_num = checkpoint_dict[MAJOR_STEP_NUM_KEY]
+
+    worker_pool = _create_worker_pool(selection_dict, num_processes)
+    try:
+        while len(selected_feature_names) + num_forward_steps <= num_features:
+            major_step_num += 1
+            min_cross_entropy_prev_major_step = (
+                min_cross_entropy_by_num_selected[len(selected_feature_names)])
+            selected_feature_names_prev_major_step = copy.deepcopy(
+                selected_feature_names)
+
+            for i in range(num_forward_steps):
+                num_selected_features = len(selected_feature_names)
+                num_remaining_features = len(remaining_feature_names)
+
+                print ('Major step {0:d}, forward step {1:d}: {2:d} features '
+                       'selected, {3:d} remaining...').format(
+                           major_step_num, i + 1, num_selected_features,
+                           num_remaining_features)
+
+                new_xentropy_by_feature = _get_xentropy_for_candidates(
+                    selection_dict,
+                    _get_candidates_for_addition(
+                        selected_feature_names, remaining_feature_names),
+                    worker_pool=worker_pool)
+
+                min_new_cross_entropy = numpy.min(new_xentropy_by_feature)
+                this_best_feature_index = numpy.argmin(new_xentropy_by_feature)
+                this_best_feature_name = remaining_feature_names[
+                    this_best_feature_index]
+
+                print (
+                    'Minimum cross-entropy ({0:.4f}) given by adding feature '
+                    '"{1:s}"; previous min cross-entropy = {2:.4f}').format(
+                        min_new_cross_entropy, this_best_feature_name,
+                        min_cross_entropy_by_num_selected[
+                            num_selected_features])
+
+                min_cross_entropy_by_num_selected[
+                    num_selected_features + 1] = min_new_cross_entropy
+
+                selected_feature_names.append(this_best_feature_name)
+                remaining_feature_names = set(remaining_feature_names)
+                remaining_feature_names.remove(this_best_feature_name)
+                remaining_feature_names = list(remaining_feature_names)
+
+            for i in range(num_backward_steps):
+                num_selected_features = len(selected_feature_names)
+
+                print ('Major step {0:d}, backward step {1:d}: {2:d}/{3:d} '
+                       'features selected...').format(
+                           major_step_num, i + 1, num_selected_features,
+                           num_features)
+
+                new_xentropy_by_feature = _get_xentropy_for_candidates(
+                    selection_dict,
+                    _get_candidates_for_removal(selected_feature_names),
+                    worker_pool=worker_pool)
+
+                min_new_cross_entropy = numpy.min(new_xentropy_by_feature)
+                this_worst_feature_index = numpy.argmin(new_xentropy_by_feature)
+                this_worst_feature_name = selected_feature_names[
+                    this_worst_feature_index]
+
+                print (
+                    'Minimum cross-entropy ({0:.4f}) given by removing feature '
+                    '"{1:s}"; previous min cross-entropy = {2:.4f}').format(
+                        min_new_cross_entropy, this_worst_feature_name,
+                        min_cross_entropy_by_num_selected[
+                            num_selected_features])
+
+                min_cross_entropy_by_num_selected[
+                    num_selected_features] = numpy.nan
+                min_cross_entropy_by_num_selected[
+                    num_selected_features - 1] = min_new_cross_entropy
+
+                remaining_feature_names.append(this_worst_feature_name)
+                selected_feature_names = set(selected_feature_names)
+                selected_feature_names.remove(this_worst_feature_name)
+                selected_feature_names = list(selected_feature_names)
+
+            print '\n'
+            stop_if_cross_entropy_above = min_cross_entropy_prev_major_step * (
+                1. - min_fractional_xentropy_decrease)
+
+            if (min_cross_entropy_by_num_selected[len(selected_feature_names)] >
+                    stop_if_cross_entropy_above):
+                selected_feature_names = copy.deepcopy(
+                    selected_feature_names_prev_major_step)
+                break
+
+            if checkpoint_file_name is not None:
+                _write_selection_checkpoint(
+                    checkpoint_file_name,
+                    algorithm_name=SFS_WITH_BACKWARD_STEPS_NAME,
+                    feature_names=feature_names,
+                    selected_feature_names=selected_feature_names,
+                    unselected_feature_names=remaining_feature_names,
+                    min_xentropy_by_step=min_cross_entropy_by_num_selected,
+                    major_step_num=major_step_num,
+                    input_fingerprint=input_fingerprint)
+    finally:
+        _close_worker_pool(worker_pool)
 
     sfs_dictionary = _evaluate_feature_selection(
         training_table=training_table, validation_table=validation_table,
@@ -550,6 +1013,8 @@ def sfs_with_backward_steps(
     sfs_dictionary.update(
         {VALIDATION_XENTROPY_BY_STEP_KEY:
              min_cross_entropy_by_num_selected[1:(num_selected_features + 1)]})
+
+    _delete_selection_checkpoint(checkpoint_file_name)
     return sfs_dictionary
 
 
@@ -557,7 +1022,9 @@ def floating_sfs(
         training_table=None, validation_table=None, testing_table=None,
         feature_names=None, target_name=None, estimator_object=None,
         min_fractional_xentropy_decrease=
-        DEFAULT_MIN_FRACTIONAL_XENTROPY_DECR_FOR_SFS):
+        DEFAULT_MIN_FRACTIONAL_XENTROPY_DECR_FOR_SFS,
+        num_processes=DEFAULT_NUM_PROCESSES_FOR_SELECTION,
+        checkpoint_file_name=None):
     """Runs the SFFS (sequential forward floating selection) algorithm.
 
     SFFS is defined in Chapter 9 of Webb (2003).
@@ -571,6 +1038,8 @@ def floating_sfs(
     :param estimator_object: See doc for sequential_forward_selection.
     :param min_fractional_xentropy_decrease: See doc for
         sequential_forward_selection.
+    :param num_processes: See doc for sequential_forward_selection.
+    :param checkpoint_file_name: See doc for sequential_forward_selection.
     :return: sfs_dictionary: See doc for sequential_forward_selection.
     """
 
@@ -592,119 +1061,129 @@ def floating_sfs(
     min_cross_entropy_by_num_selected = numpy.full(num_features, numpy.nan)
     min_cross_entropy_by_num_selected[0] = 1e10
 
-    while remaining_feature_names:  # While there are still features to select.
-        major_step_num += 1
-        num_selected_features = len(selected_feature_names)
-        num_remaining_features = len(remaining_feature_names)
-        new_xentropy_by_feature = numpy.full(num_remaining_features, numpy.nan)
-
-        print ('Major step {0:d} of SFFS: {1:d} features selected, {2:d} '
-               'remaining...').format(major_step_num, num_selected_features,
-                                      num_remaining_features)
-
-        for j in range(num_remaining_features):
-            these_feature_names = (
-                selected_feature_names + [remaining_feature_names[j]])
-
-            new_estimator_object = sklearn.base.clone(estimator_object)
-            new_estimator_object.fit(
-                training_table.as_matrix(columns=these_feature_names),
-                training_table[target_name].values)
-
-            these_forecast_probabilities = new_estimator_object.predict_proba(
-                validation_table.as_matrix(columns=these_feature_names))[:, 1]
-            new_xentropy_by_feature[j] = model_eval.get_cross_entropy(
-                these_forecast_probabilities,
-                validation_table[target_name].values)
-
-        min_new_cross_entropy = numpy.min(new_xentropy_by_feature)
-        this_best_feature_index = numpy.argmin(new_xentropy_by_feature)
-        this_best_feature_name = remaining_feature_names[
-            this_best_feature_index]
-
-        print (
-            'Minimum cross-entropy ({0:.4f}) given by adding feature '
-            '"{1:s}"; previous min cross-entropy = {2:.4f}').format(
-                min_new_cross_entropy, this_best_feature_name,
-                min_cross_entropy_by_num_selected[num_selected_features])
-
-        stop_if_cross_entropy_above = (
-            min_cross_entropy_by_num_selected[num_selected_features] * (
-                1. - min_fractional_xentropy_decrease))
-        if min_new_cross_entropy > stop_if_cross_entropy_above:
-            break
-
-        min_cross_entropy_by_num_selected[
-            num_selected_features + 1] = min_new_cross_entropy
-        selected_feature_names.append(this_best_feature_name)
-        remaining_feature_names = set(remaining_feature_names)
-        remaining_feature_names.remove(this_best_feature_name)
-        remaining_feature_names = list(remaining_feature_names)
-
-        if len(selected_feature_names) < 2:
-            continue
-
-        backward_step_num = 0
-        while len(selected_feature_names) >= 2:
-            backward_step_num += 1
+    selection_dict = _get_selection_dict(
+        training_table=training_table, validation_table=validation_table,
+        feature_names=feature_names, target_name=target_name,
+        estimator_object=estimator_object)
+    input_fingerprint = _get_selection_fingerprint(
+        selection_dict, feature_names=feature_names,
+        hyperparameters=[min_fractional_xentropy_decrease])
+
+    checkpoint_dict = _read_selection_checkpoint(
+        checkpoint_file_name, algorithm_name=SFFS_NAME,
+        feature_names=feature_names, input_fingerprint=input_fingerprint)
+    if checkpoint_dict is not None:
+        selected_feature_names = checkpoint_dict[SELECTED_FEATURES_KEY]
+        remaining_feature_names = checkpoint_dict[UNSELECTED_FEATURES_KEY]
+        min_cross_entropy_by_num_selected = checkpoint_dict[
+            MIN_XENTROPY_BY_STEP_KEY]
+        major_step_num = checkpoint_dict[MAJOR_STEP_NUM_KEY]
+
+    worker_pool = _create_worker_pool(selection_dict, num_processes)
+    try:
+        # While there are still features to select.
+        while remaining_feature_names:
+            major_step_num += 1
             num_selected_features = len(selected_feature_names)
-            new_xentropy_by_feature = numpy.full(
-                num_selected_features, numpy.nan)
-
-            print ('Major step {0:d}, backward step {1:d}: {2:d}/{3:d} '
-                   'features selected...').format(
-                       major_step_num, backward_step_num, num_selected_features,
-                       num_features)
-
-            for j in range(num_selected_features):
-                these_feature_names = set(selected_feature_names)
-                these_feature_names.remove(selected_feature_names[j])
-                these_feature_names = list(these_feature_names)
-
-                new_estimator_object = sklearn.base.clone(estimator_object)
-                new_estimator_object.fit(
-                    training_table.as_matrix(columns=these_feature_names),
-                    training_table[target_name].values)
-
-                these_forecast_probabilities = (
-                    new_estimator_object.predict_proba(
-                        validation_table.as_matrix(
-                            columns=these_feature_names))[:, 1])
-                new_xentropy_by_feature[j] = model_eval.get_cross_entropy(
-                    these_forecast_probabilities,
-                    validation_table[target_name].values)
+            num_remaining_features = len(remaining_feature_names)
 
-            min_new_cross_entropy = numpy.min(new_xentropy_by_feature)
-            this_worst_feature_index = numpy.argmin(new_xentropy_by_feature)
-            this_worst_feature_name = selected_feature_names[
-                this_worst_feature_index]
+            print ('Major step {0:d} of SFFS: {1:d} features selected, {2:d} '
+                   'remaining...').format(major_step_num, num_selected_features,
+                                          num_remaining_features)
 
-            if backward_step_num == 1:
-                if this_worst_feature_index == num_selected_features - 1:
-                    break  # Cannot remove feature that was just added.
+            new_xentropy_by_feature = _get_xentropy_for_candidates(
+                selection_dict,
+                _get_candidates_for_addition(
+                    selected_feature_names, remaining_feature_names),
+                worker_pool=worker_pool)
 
-            else:
-                if (min_new_cross_entropy >= min_cross_entropy_by_num_selected[
-                        num_selected_features - 1]):
-                    break  # Remove feature only if it improves performance.
+            min_new_cross_entropy = numpy.min(new_xentropy_by_feature)
+            this_best_feature_index = numpy.argmin(new_xentropy_by_feature)
+            this_best_feature_name = remaining_feature_names[
+                this_best_feature_index]
 
             print (
-                'Minimum cross-entropy ({0:.4f}) given by removing feature '
+                'Minimum cross-entropy ({0:.4f}) given by adding feature '
                 '"{1:s}"; previous min cross-entropy = {2:.4f}').format(
-                    min_new_cross_entropy, this_worst_feature_name,
-                    min_cross_entropy_by_num_selected[
-                        num_selected_features - 1])
+                    min_new_cross_entropy, this_best_feature_name,
+                    min_cross_entropy_by_num_selected[num_selected_features])
 
-            min_cross_entropy_by_num_selected[num_selected_features] = numpy.nan
-            min_cross_entropy_by_num_selected[
-                num_selected_features - 1] = min_new_cross_entropy
+            stop_if_cross_entropy_above = (
+                min_cross_entropy_by_num_selected[num_selected_features] * (
+                    1. - min_fractional_xentropy_decrease))
+            if min_new_cross_entropy > stop_if_cross_entropy_above:
+                break
 
-            remaining_feature_names.append(this_worst_feature_name)
-            selected_feature_names = set(selected_feature_names)
-            selected_feature_names.remove(this_worst_feature_name)
-            selected_feature_names = list(selected_feature_names)
+            min_cross_entropy_by_num_selected[
+                num_selected_features + 1] = min_new_cross_entropy
+            selected_feature_names.append(this_best_feature_name)
+            remaining_feature_names = set(remaining_feature_names)
+            remaining_feature_names.remove(this_best_feature_name)
+            remaining_feature_names = list(remaining_feature_names)
 
-        print '\n'
+            if len(selected_feature_names) < 2:
+                continue
+
+            backward_step_num = 0
+            while len(selected_feature_names) >= 2:
+                backward_step_num += 1
+                num_selected_features = len(selected_feature_names)
+
+                print ('Major step {0:d}, backward step {1:d}: {2:d}/{3:d} '
+                       'features selected...').format(
+                           major_step_num, backward_step_num,
+                           num_selected_features, num_features)
+
+                new_xentropy_by_feature = _get_xentropy_for_candidates(
+                    selection_dict,
+                    _get_candidates_for_removal(selected_feature_names),
+                    worker_pool=worker_pool)
+
+                min_new_cross_entropy = numpy.min(new_xentropy_by_feature)
+                this_worst_feature_index = numpy.argmin(new_xentropy_by_feature)
+                this_worst_feature_name = selected_feature_names[
+                    this_worst_feature_index]
+
+                if backward_step_num == 1:
+                    if this_worst_feature_index == num_selected_features - 1:
+                        break  # Cannot remove feature that was just added.
+
+                else:
+                    if (min_new_cross_entropy >=
+                            min_cross_entropy_by_num_selected[
+                                num_selected_features - 1]):
+                        break  # Remove feature only if it improves performance.
+
+                print (
+                    'Minimum cross-entropy ({0:.4f}) given by removing feature '
+                    '"{1:s}"; previous min cross-entropy = {2:.4f}').format(
+                        min_new_cross_entropy, this_worst_feature_name,
+                        min_cross_entropy_by_num_selected[
+                            num_selected_features - 1])
+
+                min_cross_entropy_by_num_selected[
+                    num_selected_features] = numpy.nan
+                min_cross_entropy_by_num_selected[
+                    num_selected_features - 1] = min_new_cross_entropy
+
+                remaining_feature_names.append(this_worst_feature_name)
+                selected_feature_names = set(selected_feature_names)
+                selected_feature_names.remove(this_worst_feature_name)
+                selected_feature_names = list(selected_feature_names)
+
+            print '\n'
+
+            if checkpoint_file_name is not None:
+                _write_selection_checkpoint(
+                    checkpoint_file_name, algorithm_name=SFFS_NAME,
+                    feature_names=feature_names,
+                    selected_feature_names=selected_feature_names,
+                    unselected_feature_names=remaining_feature_names,
+                    min_xentropy_by_step=min_cross_entropy_by_num_selected,
+                    major_step_num=major_step_num,
+                    input_fingerprint=input_fingerprint)
+    finally:
+        _close_worker_pool(worker_pool)
 
     sfs_dictionary = _evaluate_feature_selection(
         training_table=training_table, validation_table=validation_table,
@@ -715,6 +1194,8 @@ def floating_sfs(
     sfs_dictionary.update(
         {VALIDATION_XENTROPY_BY_STEP_KEY:
              min_cross_entropy_by_num_selected[1:(num_selected_features + 1)]})
+
+    _delete_selection_checkpoint(checkpoint_file_name)
     return sfs_dictionary
 
 
@@ -722,7 +1203,9 @@ def sequential_backward_selection(
         training_table=None, validation_table=None, testing_table=None,
         feature_names=None, target_name=None, estimator_object=None,
         min_fractional_xentropy_decrease=
-        DEFAULT_MIN_FRACTIONAL_XENTROPY_DECR_FOR_SBS):
+        DEFAULT_MIN_FRACTIONAL_XENTROPY_DECR_FOR_SBS,
+        num_processes=DEFAULT_NUM_PROCESSES_FOR_SELECTION,
+        checkpoint_file_name=None):
     """Runs the SBS (sequential backward selection) algorithm.
 
     SBS is defined in Chapter 9 of Webb (2003).
@@ -741,6 +1224,8 @@ def sequential_backward_selection(
         `min_fractional_xentropy_decrease`, SBS will stop.  Must be in range
         (-1, 1).  If negative, cross-entropy may increase slightly without SBS
         stopping.
+    :param num_processes: See doc for sequential_forward_selection.
+    :param checkpoint_file_name: See doc for sequential_forward_selection.
     :return: sbs_dictionary: Same as output from _evaluate_feature_selection,
         but with the following additional keys.
     sbs_dictionary['removed_feature_names']: length-f with names of removed
@@ -767,56 +1252,76 @@ def sequential_backward_selection(
     min_cross_entropy_by_num_removed = numpy.full(num_features, numpy.nan)
     min_cross_entropy_by_num_removed[0] = 1e10
 
-    while selected_feature_names:  # While there are still features to remove.
-        num_removed_features = len(removed_feature_names)
-        num_selected_features = len(selected_feature_names)
-        new_xentropy_by_feature = numpy.full(num_selected_features, numpy.nan)
-
-        print ('Step {0:d} of sequential backward selection: {1:d} features '
-               'removed, {2:d} remaining...').format(
-                   num_removed_features + 1, num_removed_features,
-                   num_selected_features)
-
-        for j in range(num_selected_features):
-            these_feature_names = set(selected_feature_names)
-            these_feature_names.remove(selected_feature_names[j])
-            these_feature_names = list(these_feature_names)
-
-            new_estimator_object = sklearn.base.clone(estimator_object)
-            new_estimator_object.fit(
-                training_table.as_matrix(columns=these_feature_names),
-                training_table[target_name].values)
-
-            these_forecast_probabilities = new_estimator_object.predict_proba(
-                validation_table.as_matrix(columns=these_feature_names))[:, 1]
-            new_xentropy_by_feature[j] = model_eval.get_cross_entropy(
-                these_forecast_probabilities,
-                validation_table[target_name].values)
-
-        min_new_cross_entropy = numpy.min(new_xentropy_by_feature)
-        this_worst_feature_index = numpy.argmin(new_xentropy_by_feature)
-        this_worst_feature_name = selected_feature_names[
-            this_worst_feature_index]
+    selection_dict = _get_selection_dict(
+        training_table=training_table, validation_table=validation_table,
+        feature_names=feature_names, target_name=target_name,
+        estimator_object=estimator_object)
+    input_fingerprint = _get_selection_fingerprint(
+        selection_dict, feature_names=feature_names,
+        hyperparameters=[min_fractional_xentropy_decrease])
+
+    checkpoint_dict = _read_selection_checkpoint(
+        checkpoint_file_name, algorithm_name=SBS_NAME,
+        feature_names=feature_names, input_fingerprint=input_fingerprint)
+    if checkpoint_dict is not None:
+        selected_feature_names = checkpoint_dict[SELECTED_FEATURES_KEY]
+        removed_feature_names = checkpoint_dict[UNSELECTED_FEATURES_KEY]
+        min_cross_entropy_by_num_removed = checkpoint_dict[
+            MIN_XENTROPY_BY_STEP_KEY]
+
+    worker_pool = _create_worker_pool(selection_dict, num_processes)
+    try:
+        # While there are still features to remove.
+        while selected_feature_names:
+            num_removed_features = len(removed_feature_names)
+            num_selected_features = len(selected_feature_names)
 
-        print (
-            'Minimum cross-entropy ({0:.4f}) given by removing feature '
-            '"{1:s}"; previous min cross-entropy = {2:.4f}').format(
-                min_new_cross_entropy, this_worst_feature_name,
-                min_cross_entropy_by_num_removed[num_removed_features])
+            print ('Step {0:d} of sequential backward selection: {1:d} '
+                   'features removed, {2:d} remaining...').format(
+                       num_removed_features + 1, num_removed_features,
+                       num_selected_features)
 
-        stop_if_cross_entropy_above = (
-            min_cross_entropy_by_num_removed[num_removed_features] * (
-                1. - min_fractional_xentropy_decrease))
-        if min_new_cross_entropy > stop_if_cross_entropy_above:
-            break
+            new_xentropy_by_feature = _get_xentropy_for_candidates(
+                selection_dict,
+                _get_candidates_for_removal(selected_feature_names),
+                worker_pool=worker_pool)
 
-        min_cross_entropy_by_num_removed[
-            num_removed_features + 1] = min_new_cross_entropy
+            min_new_cross_entropy = numpy.min(new_xentropy_by_feature)
+            this_worst_feature_index = numpy.argmin(new_xentropy_by_feature)
+            this_worst_feature_name = selected_feature_names[
+                this_worst_feature_index]
+
+            print (
+                'Minimum cross-entropy ({0:.4f}) given by removing feature '
+                '"{1:s}"; previous min cross-entropy = {2:.4f}').format(
+                    min_new_cross_entropy, this_worst_feature_name,
+                    min_cross_entropy_by_num_removed[num_removed_features])
+
+            stop_if_cross_entropy_above = (
+                min_cross_entropy_by_num_removed[num_removed_features] * (
+                    1. - min_fractional_xentropy_decrease))
+            if min_new_cross_entropy > stop_if_cross_entropy_above:
+                break
+
+            min_cross_entropy_by_num_removed[
+                num_removed_features + 1] = min_new_cross_entropy
+
+            removed_feature_names.append(this_worst_feature_name)
+            selected_feature_names = set(selected_feature_names)
+            selected_feature_names.remove(this_worst_feature_name)
+            selected_feature_names = list(selected_feature_names)
 
-        removed_feature_names.append(this_worst_feature_name)
-        selected_feature_names = set(selected_feature_names)
-        selected_feature_names.remove(this_worst_feature_name)
-        selected_feature_names = list(selected_feature_names)
+            if checkpoint_file_name is not None:
+                _write_selection_checkpoint(
+                    checkpoint_file_name, algorithm_name=SBS_NAME,
+                    feature_names=feature_names,
+                    selected_feature_names=selected_feature_names,
+                    unselected_feature_names=removed_feature_names,
+                    min_xentropy_by_step=min_cross_entropy_by_num_removed,
+                    major_step_num=None,
+                    input_fingerprint=input_fingerprint)
+    finally:
+        _close_worker_pool(worker_pool)
 
     sbs_dictionary = _evaluate_feature_selection(
         training_table=training_table, validation_table=validation_table,
@@ -828,6 +1333,8 @@ def sequential_backward_selection(
     sbs_dictionary.update(
         {VALIDATION_XENTROPY_BY_STEP_KEY:
              min_cross_entropy_by_num_removed[1:(num_removed_features + 1)]})
+
+    _delete_selection_checkpoint(checkpoint_file_name)
     return sbs_dictionary
 
 
@@ -837,7 +1344,9 @@ def sbs_with_forward_steps(
         num_forward_steps=DEFAULT_NUM_FORWARD_STEPS_FOR_SBS,
         num_backward_steps=DEFAULT_NUM_BACKWARD_STEPS_FOR_SBS,
         min_fractional_xentropy_decrease=
-        DEFAULT_MIN_FRACTIONAL_XENTROPY_DECR_FOR_SBS):
+        DEFAULT_MIN_FRACTIONAL_XENTROPY_DECR_FOR_SBS,
+        num_processes=DEFAULT_NUM_PROCESSES_FOR_SELECTION,
+        checkpoint_file_name=None):
     """Runs SBS (sequential backward selection) with forward steps.
 
     This method is called "plus l - take away r selection" in Chapter 9 of Webb
@@ -865,6 +1374,8 @@ def sbs_with_forward_steps(
         `min_fractional_xentropy_decrease`, algorithm will stop.  Must be in
         range (-1, 1).  If negative, cross-entropy may increase slightly without
         the algorithm stopping.
+    :param num_processes: See doc for sequential_forward_selection.
+    :param checkpoint_file_name: See doc for sequential_forward_selection.
     :return: sbs_dictionary: See documentation for
         sequential_backward_selection.
     """
@@ -896,122 +1407,129 @@ def sbs_with_forward_steps(
     min_cross_entropy_by_num_removed = numpy.full(num_features, numpy.nan)
     min_cross_entropy_by_num_removed[0] = 1e10
 
-    while len(selected_feature_names) - num_backward_steps >= 0:
-        major_step_num += 1
-
-        min_cross_entropy_prev_major_step = min_cross_entropy_by_num_removed[
-            len(removed_feature_names)]
-        removed_feature_names_prev_major_step = copy.deepcopy(
-            removed_feature_names)
-        selected_feature_names_prev_major_step = copy.deepcopy(
-            selected_feature_names)
-
-        for i in range(num_backward_steps):
-            num_removed_features = len(removed_feature_names)
-            num_selected_features = len(selected_feature_names)
-            new_xentropy_by_feature = numpy.full(
-                num_selected_features, numpy.nan)
-
-            print ('Major step {0:d}, backward step {1:d}: {2:d} features '
-                   'removed, {3:d} remaining...').format(
-                       major_step_num, i + 1, num_removed_features,
-                       num_selected_features)
-
-            for j in range(num_selected_features):
-                these_feature_names = set(selected_feature_names)
-                these_feature_names.remove(selected_feature_names[j])
-                these_feature_names = list(these_feature_names)
-
-                new_estimator_object = sklearn.base.clone(estimator_object)
-                new_estimator_object.fit(
-                    training_table.as_matrix(columns=these_feature_names),
-                    training_table[target_name].values)
-
-                these_forecast_probabilities = (
-                    new_estimator_object.predict_proba(
-                        validation_table.as_matrix(
-                            columns=these_feature_names))[:, 1])
-                new_xentropy_by_feature[j] = model_eval.get_cross_entropy(
-                    these_forecast_probabilities,
-                    validation_table[target_name].values)
-
-            min_new_cross_entropy = numpy.min(new_xentropy_by_feature)
-            this_worst_feature_index = numpy.argmin(new_xentropy_by_feature)
-            this_worst_feature_name = selected_feature_names[
-                this_worst_feature_index]
-
-            print (
-                'Minimum cross-entropy ({0:.4f}) given by removing feature '
-                '"{1:s}"; previous min cross-entropy = {2:.4f}').format(
-                    min_new_cross_entropy, this_worst_feature_name,
-                    min_cross_entropy_by_num_removed[num_removed_features])
-
-            min_cross_entropy_by_num_removed[
-                num_removed_features + 1] = min_new_cross_entropy
-
-            removed_feature_names.append(this_worst_feature_name)
-            selected_feature_names = set(selected_feature_names)
-            selected_feature_names.remove(this_worst_feature_name)
-            selected_feature_names = list(selected_feature_names)
-
-        for i in range(num_forward_steps):
-            num_removed_features = len(removed_feature_names)
-            new_xentropy_by_feature = numpy.full(
-                num_removed_features, numpy.nan)
-
-            print ('Major step {0:d}, forward step {1:d}: {2:d}/{3:d} '
-                   'features removed...').format(
-                       major_step_num, i + 1, num_removed_features,
-                       num_features)
-
-            for j in range(num_removed_features):
-                these_feature_names = (
-                    selected_feature_names + [removed_feature_names[j]])
-
-                new_estimator_object = sklearn.base.clone(estimator_object)
-                new_estimator_object.fit(
-                    training_table.as_matrix(columns=these_feature_names),
-                    training_table[target_name].values)
-
-                these_forecast_probabilities = (
-                    new_estimator_object.predict_proba(
-                        validation_table.as_matrix(
-                            columns=these_feature_names))[:, 1])
-                new_xentropy_by_feature[j] = model_eval.get_cross_entropy(
-                    these_forecast_probabilities,
-                    validation_table[target_name].values)
-
-            min_new_cross_entropy = numpy.min(new_xentropy_by_feature)
-            this_best_feature_index = numpy.argmin(new_xentropy_by_feature)
-            this_best_feature_name = removed_feature_names[
-                this_best_feature_index]
-
-            print (
-                'Minimum cross-entropy ({0:.4f}) given by adding feature '
-                '"{1:s}"; previous min cross-entropy = {2:.4f}').format(
-                    min_new_cross_entropy, this_best_feature_name,
-                    min_cross_entropy_by_num_removed[num_removed_features])
-
-            min_cross_entropy_by_num_removed[num_removed_features] = numpy.nan
-            min_cross_entropy_by_num_removed[
-                num_removed_features + 1] = min_new_cross_entropy
-
-            selected_feature_names.append(this_best_feature_name)
-            removed_feature_names = set(removed_feature_names)
-            removed_feature_names.remove(this_best_feature_name)
-            removed_feature_names = list(removed_feature_names)
-
-        print '\n'
-        stop_if_cross_entropy_above = min_cross_entropy_prev_major_step * (
-            1. - min_fractional_xentropy_decrease)
-
-        if (min_cross_entropy_by_num_removed[len(removed_feature_names)] >
-                stop_if_cross_entropy_above):
-            removed_feature_names = copy.deepcopy(
-                removed_feature_names_prev_major_step)
-            selected_feature_names = copy.deepcopy(
-                selected_feature_names_prev_major_step)
-            break
+    selection_dict = _get_selection_dict(
+        training_table=training_table, validation_table=validation_table,
+        feature_names=feature_names, target_name=target_name,
+        estimator_object=estimator_object)
+    input_fingerprint = _get_selection_fingerprint(
+        selection_dict, feature_names=feature_names,
+        hyperparameters=[num_forward_steps, num_backward_steps,
+                         min_fractional_xentropy_decrease])
+
+    checkpoint_dict = _read_selection_checkpoint(
+        checkpoint_file_name, algorithm_name=SBS_WITH_FORWARD_STEPS_NAME,
+        feature_names=feature_names, input_fingerprint=input_fingerprint)
+    if checkpoint_dict is not None:
+        selected_feature_names = checkpoint_dict[SELECTED_FEATURES_KEY]
+        removed_feature_names = checkpoint_dict[UNSELECTED_FEATURES_KEY]
+        min_cross_entropy_by_num_removed = checkpoint_dict[
+            MIN_XENTROPY_BY_STEP_KEY]
+        major_step_num = checkpoint_dict[MAJOR_STEP_NUM_KEY]
+
+    worker_pool = _create_worker_pool(selection_dict, num_processes)
+    try:
+        while len(selected_feature_names) - num_backward_steps >= 0:
+            major_step_num += 1
+
+            min_cross_entropy_prev_major_step = (
+                min_cross_entropy_by_num_removed[len(removed_feature_names)])
+            removed_feature_names_prev_major_step = copy.deepcopy(
+                removed_feature_names)
+            selected_feature_names_prev_major_step = copy.deepcopy(
+                selected_feature_names)
+
+            for i in range(num_backward_steps):
+                num_removed_features = len(removed_feature_names)
+                num_selected_features = len(selected_feature_names)
+
+                print ('Major step {0:d}, backward step {1:d}: {2:d} features '
+                       'removed, {3:d} remaining...').format(
+                           major_step_num, i + 1, num_removed_features,
+                           num_selected_features)
+
+                new_xentropy_by_feature = _get_xentropy_for_candidates(
+                    selection_dict,
+                    _get_candidates_for_removal(selected_feature_names),
+                    worker_pool=worker_pool)
+
+                min_new_cross_entropy = numpy.min(new_xentropy_by_feature)
+                this_worst_feature_index = numpy.argmin(new_xentropy_by_feature)
+                this_worst_feature_name = selected_feature_names[
+                    this_worst_feature_index]
+
+                print (
+                    'Minimum cross-entropy ({0:.4f}) given by removing feature '
+                    '"{1:s}"; previous min cross-entropy = {2:.4f}').format(
+                        min_new_cross_entropy, this_worst_feature_name,
+                        min_cross_entropy_by_num_removed[num_removed_features])
+
+                min_cross_entropy_by_num_removed[
+                    num_removed_features + 1] = min_new_cross_entropy
+
+                removed_feature_names.append(this_worst_feature_name)
+                selected_feature_names = set(selected_feature_names)
+                selected_feature_names.remove(this_worst_feature_name)
+                selected_feature_names = list(selected_feature_names)
+
+            for i in range(num_forward_steps):
+                num_removed_features = len(removed_feature_names)
+
+                print ('Major step {0:d}, forward step {1:d}: {2:d}/{3:d} '
+                       'features removed...').format(
+                           major_step_num, i + 1, num_removed_features,
+                           num_features)
+
+                new_xentropy_by_feature = _get_xentropy_for_candidates(
+                    selection_dict,
+                    _get_candidates_for_addition(
+                        selected_feature_names, removed_feature_names),
+                    worker_pool=worker_pool)
+
+                min_new_cross_entropy = numpy.min(new_xentropy_by_feature)
+                this_best_feature_index = numpy.argmin(new_xentropy_by_feature)
+                this_best_feature_name = removed_feature_names[
+                    this_best_feature_index]
+
+                print (
+                    'Minimum cross-entropy ({0:.4f}) given by adding feature '
+                    '"{1:s}"; previous min cross-entropy = {2:.4f}').format(
+                        min_new_cross_entropy, this_best_feature_name,
+                        min_cross_entropy_by_num_removed[num_removed_features])
+
+                min_cross_entropy_by_num_removed[
+                    num_removed_features] = numpy.nan
+                min_cross_entropy_by_num_removed[
+                    num_removed_features + 1] = min_new_cross_entropy
+
+                selected_feature_names.append(this_best_feature_name)
+                removed_feature_names = set(removed_feature_names)
+                removed_feature_names.remove(this_best_feature_name)
+                removed_feature_names = list(removed_feature_names)
+
+            print '\n'
+            stop_if_cross_entropy_above = min_cross_entropy_prev_major_step * (
+                1. - min_fractional_xentropy_decrease)
+
+            if (min_cross_entropy_by_num_removed[len(removed_feature_names)] >
+                    stop_if_cross_entropy_above):
+                removed_feature_names = copy.deepcopy(
+                    removed_feature_names_prev_major_step)
+                selected_feature_names = copy.deepcopy(
+                    selected_feature_names_prev_major_step)
+                break
+
+            if checkpoint_file_name is not None:
+                _write_selection_checkpoint(
+                    checkpoint_file_name,
+                    algorithm_name=SBS_WITH_FORWARD_STEPS_NAME,
+                    feature_names=feature_names,
+                    selected_feature_names=selected_feature_names,
+                    unselected_feature_names=removed_feature_names,
+                    min_xentropy_by_step=min_cross_entropy_by_num_removed,
+                    major_step_num=major_step_num,
+                    input_fingerprint=input_fingerprint)
+    finally:
+        _close_worker_pool(worker_pool)
 
     sbs_dictionary = _evaluate_feature_selection(
         training_table=training_table, validation_table=validation_table,
@@ -1023,6 +1541,8 @@ def sbs_with_forward_steps(
     sbs_dictionary.update(
         {VALIDATION_XENTROPY_BY_STEP_KEY:
              min_cross_entropy_by_num_removed[1:(num_removed_features + 1)]})
+
+    _delete_selection_checkpoint(checkpoint_file_name)
     return sbs_dictionary
 
 
@@ -1030,7 +1550,9 @@ def floating_sbs(
         training_table=None, validation_table=None, testing_table=None,
         feature_names=None, target_name=None, estimator_object=None,
         min_fractional_xentropy_decrease=
-        DEFAULT_MIN_FRACTIONAL_XENTROPY_DECR_FOR_SBS):
+        DEFAULT_MIN_FRACTIONAL_XENTROPY_DECR_FOR_SBS,
+        num_processes=DEFAULT_NUM_PROCESSES_FOR_SELECTION,
+        checkpoint_file_name=None):
     """Runs the SBFS (sequential backward floating selection) algorithm.
 
     SBFS is defined in Chapter 9 of Webb (2003).
@@ -1044,6 +1566,8 @@ def floating_sbs(
     :param estimator_object: See doc for sequential_forward_selection.
     :param min_fractional_xentropy_decrease: See doc for
         sequential_backward_selection.
+    :param num_processes: See doc for sequential_forward_selection.
+    :param checkpoint_file_name: See doc for sequential_forward_selection.
     :return: sbs_dictionary: See doc for sequential_backward_selection.
     """
 
@@ -1065,118 +1589,130 @@ def floating_sbs(
     min_cross_entropy_by_num_removed = numpy.full(num_features, numpy.nan)
     min_cross_entropy_by_num_removed[0] = 1e10
 
-    while selected_feature_names:  # While there are still features to remove.
-        major_step_num += 1
-        num_removed_features = len(removed_feature_names)
-        num_selected_features = len(selected_feature_names)
-        new_xentropy_by_feature = numpy.full(num_selected_features, numpy.nan)
-
-        print ('Major step {0:d} of SBFS: {1:d} features removed, {2:d} '
-               'remaining...').format(
-                   major_step_num, num_removed_features, num_selected_features)
-
-        for j in range(num_selected_features):
-            these_feature_names = set(selected_feature_names)
-            these_feature_names.remove(selected_feature_names[j])
-            these_feature_names = list(these_feature_names)
-
-            new_estimator_object = sklearn.base.clone(estimator_object)
-            new_estimator_object.fit(
-                training_table.as_matrix(columns=these_feature_names),
-                training_table[target_name].values)
-
-            these_forecast_probabilities = new_estimator_object.predict_proba(
-                validation_table.as_matrix(columns=these_feature_names))[:, 1]
-            new_xentropy_by_feature[j] = model_eval.get_cross_entropy(
-                these_forecast_probabilities,
-                validation_table[target_name].values)
-
-        min_new_cross_entropy = numpy.min(new_xentropy_by_feature)
-        this_worst_feature_index = numpy.argmin(new_xentropy_by_feature)
-        this_worst_feature_name = selected_feature_names[
-            this_worst_feature_index]
-
-        print (
-            'Minimum cross-entropy ({0:.4f}) given by removing feature '
-            '"{1:s}"; previous min cross-entropy = {2:.4f}').format(
-                min_new_cross_entropy, this_worst_feature_name,
-                min_cross_entropy_by_num_removed[num_removed_features])
-
-        stop_if_cross_entropy_above = (
-            min_cross_entropy_by_num_removed[num_removed_features] * (
-                1. - min_fractional_xentropy_decrease))
-        if min_new_cross_entropy > stop_if_cross_entropy_above:
-            break
-
-        min_cross_entropy_by_num_removed[
-            num_removed_features + 1] = min_new_cross_entropy
-        removed_feature_names.append(this_worst_feature_name)
-        selected_feature_names = set(selected_feature_names)
-        selected_feature_names.remove(this_worst_feature_name)
-        selected_feature_names = list(selected_feature_names)
-
-        if len(removed_feature_names) < 2:
-            continue
-
-        forward_step_num = 0
-        while len(removed_feature_names) >= 2:
-            forward_step_num += 1
+    selection_dict = _get_selection_dict(
+        training_table=training_table, validation_table=validation_table,
+        feature_names=feature_names, target_name=target_name,
+        estimator_object=estimator_object)
+    input_fingerprint = _get_selection_fingerprint(
+        selection_dict, feature_names=feature_names,
+        hyperparameters=[min_fractional_xentropy_decrease])
+
+    checkpoint_dict = _read_selection_checkpoint(
+        checkpoint_file_name, algorithm_name=SBFS_NAME,
+        feature_names=feature_names, input_fingerprint=input_fingerprint)
+    if checkpoint_dict is not None:
+        selected_feature_names = checkpoint_dict[SELECTED_FEATURES_KEY]
+        removed_feature_names = checkpoint_dict[UNSELECTED_FEATURES_KEY]
+        min_cross_entropy_by_num_removed = checkpoint_dict[
+            MIN_XENTROPY_BY_STEP_KEY]
+        major_step_num = checkpoint_dict[MAJOR_STEP_NUM_KEY]
+
+    worker_pool = _create_worker_pool(selection_dict, num_processes)
+    try:
+        # While there are still features to remove.
+        while selected_feature_names:
+            major_step_num += 1
             num_removed_features = len(removed_feature_names)
-            new_xentropy_by_feature = numpy.full(
-                num_removed_features, numpy.nan)
-
-            print ('Major step {0:d}, forward step {1:d}: {2:d}/{3:d} '
-                   'features removed...').format(
-                       major_step_num, forward_step_num, num_removed_features,
-                       num_features)
-
-            for j in range(num_removed_features):
-                these_feature_names = (
-                    selected_feature_names + [removed_feature_names[j]])
-
-                new_estimator_object = sklearn.base.clone(estimator_object)
-                new_estimator_object.fit(
-                    training_table.as_matrix(columns=these_feature_names),
-                    training_table[target_name].values)
-
-                these_forecast_probabilities = (
-                    new_estimator_object.predict_proba(
-                        validation_table.as_matrix(
-                            columns=these_feature_names))[:, 1])
-                new_xentropy_by_feature[j] = model_eval.get_cross_entropy(
-                    these_forecast_probabilities,
-                    validation_table[target_name].values)
+            num_selected_features = len(selected_feature_names)
 
-            min_new_cross_entropy = numpy.min(new_xentropy_by_feature)
-            this_best_feature_index = numpy.argmin(new_xentropy_by_feature)
-            this_best_feature_name = removed_feature_names[
-                this_best_feature_index]
+            print ('Major step {0:d} of SBFS: {1:d} features removed, {2:d} '
+                   'remaining...').format(
+                       major_step_num, num_removed_features,
+                       num_selected_features)
 
-            if forward_step_num == 1:
-                if this_best_feature_index == num_removed_features - 1:
-                    break  # Cannot add feature that was just removed.
+            new_xentropy_by_feature = _get_xentropy_for_candidates(
+                selection_dict,
+                _get_candidates_for_removal(selected_feature_names),
+                worker_pool=worker_pool)
 
-            else:
-                if (min_new_cross_entropy >= min_cross_entropy_by_num_removed[
-                        num_removed_features - 1]):
-                    break  # Add feature only if it improves performance.
+            min_new_cross_entropy = numpy.min(new_xentropy_by_feature)
+            this_worst_feature_index = numpy.argmin(new_xentropy_by_feature)
+            this_worst_feature_name = selected_feature_names[
+                this_worst_feature_index]
 
             print (
-                'Minimum cross-entropy ({0:.4f}) given by adding feature '
+                'Minimum cross-entropy ({0:.4f}) given by removing feature '
                 '"{1:s}"; previous min cross-entropy = {2:.4f}').format(
-                    min_new_cross_entropy, this_best_feature_name,
-                    min_cross_entropy_by_num_removed[num_removed_features - 1])
+                    min_new_cross_entropy, this_worst_feature_name,
+                    min_cross_entropy_by_num_removed[num_removed_features])
 
-            min_cross_entropy_by_num_removed[num_removed_features] = numpy.nan
-            min_cross_entropy_by_num_removed[
-                num_removed_features - 1] = min_new_cross_entropy
+            stop_if_cross_entropy_above = (
+                min_cross_entropy_by_num_removed[num_removed_features] * (
+                    1. - min_fractional_xentropy_decrease))
+            if min_new_cross_entropy > stop_if_cross_entropy_above:
+                break
 
-            selected_feature_names.append(this_best_feature_name)
-            removed_feature_names = set(removed_feature_names)
-            removed_feature_names.remove(this_best_feature_name)
-            removed_feature_names = list(removed_feature_names)
+            min_cross_entropy_by_num_removed[
+                num_removed_features + 1] = min_new_cross_entropy
+            removed_feature_names.append(this_worst_feature_name)
+            selected_feature_names = set(selected_feature_names)
+            selected_feature_names.remove(this_worst_feature_name)
+            selected_feature_names = list(selected_feature_names)
 
-        print '\n'
+            if len(removed_feature_names) < 2:
+                continue
+
+            forward_step_num = 0
+            while len(removed_feature_names) >= 2:
+                forward_step_num += 1
+                num_removed_features = len(removed_feature_names)
+
+                print ('Major step {0:d}, forward step {1:d}: {2:d}/{3:d} '
+                       'features removed...').format(
+                           major_step_num, forward_step_num,
+                           num_removed_features, num_features)
+
+                new_xentropy_by_feature = _get_xentropy_for_candidates(
+                    selection_dict,
+                    _get_candidates_for_addition(
+                        selected_feature_names, removed_feature_names),
+                    worker_pool=worker_pool)
+
+                min_new_cross_entropy = numpy.min(new_xentropy_by_feature)
+                this_best_feature_index = numpy.argmin(new_xentropy_by_feature)
+                this_best_feature_name = removed_feature_names[
+                    this_best_feature_index]
+
+                if forward_step_num == 1:
+                    if this_best_feature_index == num_removed_features - 1:
+                        break  # Cannot add feature that was just removed.
+
+                else:
+                    if (min_new_cross_entropy >=
+                            min_cross_entropy_by_num_removed[
+                                num_removed_features - 1]):
+                        break  # Add feature only if it improves performance.
+
+                print (
+                    'Minimum cross-entropy ({0:.4f}) given by adding feature '
+                    '"{1:s}"; previous min cross-entropy = {2:.4f}').format(
+                        min_new_cross_entropy, this_best_feature_name,
+                        min_cross_entropy_by_num_removed[
+                            num_removed_features - 1])
+
+                min_cross_entropy_by_num_removed[
+                    num_removed_features] = numpy.nan
+                min_cross_entropy_by_num_removed[
+                    num_removed_features - 1] = min_new_cross_entropy
+
+                selected_feature_names.append(this_best_feature_name)
+                removed_feature_names = set(removed_feature_names)
+                removed_feature_names.remove(this_best_feature_name)
+                removed_feature_names = list(removed_feature_names)
+
+            print '\n'
+
+            if checkpoint_file_name is not None:
+                _write_selection_checkpoint(
+                    checkpoint_file_name, algorithm_name=SBFS_NAME,
+                    feature_names=feature_names,
+                    selected_feature_names=selected_feature_names,
+                    unselected_feature_names=removed_feature_names,
+                    min_xentropy_by_step=min_cross_entropy_by_num_removed,
+                    major_step_num=major_step_num,
+                    input_fingerprint=input_fingerprint)
+    finally:
+        _close_worker_pool(worker_pool)
 
     sbs_dictionary = _evaluate_feature_selection(
         training_table=training_table, validation_table=validation_table,
@@ -1188,28 +1724,55 @@ def floating_sbs(
     sbs_dictionary.update(
         {VALIDATION_XENTROPY_BY_STEP_KEY:
              min_cross_entropy_by_num_removed[1:(num_removed_features + 1)]})
+
+    _delete_selection_checkpoint(checkpoint_file_name)
     return sbs_dictionary
 
 
 def permutation_selection(
         training_table=None, validation_table=None, feature_names=None,
-        target_name=None, estimator_object=None):
+        target_name=None, estimator_object=None,
+        num_permutations=DEFAULT_NUM_PERMUTATIONS,
+        confidence_level=DEFAULT_CONFIDENCE_LEVEL_FOR_PERMUTATION,
+        random_seed=None, num_processes=DEFAULT_NUM_PROCESSES_FOR_SELECTION):
     """Runs the permutation algorithm (Lakshmanan et al. 2015).
 
+    At each step, each remaining feature is permuted `num_permutations` times
+    (with features in previous steps kept permuted).  The feature whose
+    permutation causes the greatest mean cross-entropy is then permanently
+    permuted (using the first of its permutations).
+
     :param training_table: See documentation for
         _check_sequential_selection_inputs.
     :param validation_table: See doc for _check_sequential_selection_inputs.
     :param feature_names: See doc for _check_sequential_selection_inputs.
     :param target_name: See doc for _check_sequential_selection_inputs.
     :param estimator_object: See doc for sequential_forward_selection.
+    :param num_permutations: Number of times to permute each feature at each
+        step.
+    :param confidence_level: Level for confidence intervals over permutations
+        (see `bootstrapping.get_confidence_interval`).
+    :param random_seed: Seed for random-number generator.  If None, results
+        will not be reproducible.  Results do not depend on `num_processes`.
+    :param num_processes: See doc for sequential_forward_selection.
     :return: permutation_table: pandas DataFrame with the following columns.
         Each row corresponds to one feature.  Order of rows = order in which
         features were permuted.  In other words, the feature in the [i]th row
         was the [i]th to be permuted.
     permutation_table.feature_name: Name of feature.
     permutation_table.validation_cross_entropy: Validation cross-entropy after
-        permuting feature (and keeping features in previous rows permuted).
-    permutation_table.validation_auc: Same but for area under ROC curve.
+        permuting feature (and keeping features in previous rows permuted),
+        averaged over permutations.
+    permutation_table.validation_cross_entropy_ci_bottom: Bottom of confidence
+        interval for validation cross-entropy.
+    permutation_table.validation_cross_entropy_ci_top: Top of confidence
+        interval.
+    permutation_table.validation_auc: Same as validation_cross_entropy but for
+        area under ROC curve.
+    permutation_table.validation_auc_ci_bottom: Same as
+        validation_cross_entropy_ci_bottom but for AUC.
+    permutation_table.validation_auc_ci_top: Same as
+        validation_cross_entropy_ci_top but for AUC.
 
     orig_validation_cross_entropy: Validation cross-entropy with no permuted
         features.
@@ -1222,24 +1785,41 @@ def permutation_selection(
         testing_table=None, feature_names=feature_names,
         target_name=target_name)
 
+    error_checking.assert_is_integer(num_permutations)
+    error_checking.assert_is_greater(num_permutations, 0)
+
     # Find validation cross-entropy and AUC before permutation.
+    selection_dict = _get_selection_dict(
+        training_table=training_table, validation_table=validation_table,
+        feature_names=feature_names, target_name=target_name,
+        estimator_object=estimator_object)
+    validation_matrix = selection_dict[VALIDATION_MATRIX_KEY]
+    validation_labels = selection_dict[VALIDATION_LABELS_KEY]
+
     new_estimator_object = sklearn.base.clone(estimator_object)
     new_estimator_object.fit(
-        training_table.as_matrix(columns=feature_names),
-        training_table[target_name].values)
+        selection_dict[TRAINING_MATRIX_KEY],
+        selection_dict[TRAINING_LABELS_KEY])
+    selection_dict.update({
+        TRAINED_ESTIMATOR_KEY: new_estimator_object,
+        NUM_PERMUTATIONS_KEY: num_permutations
+    })
 
     forecast_probs_for_validation = new_estimator_object.predict_proba(
-        validation_table.as_matrix(columns=feature_names))[:, 1]
+        validation_matrix)[:, 1]
+    orig_validation_auc = model_eval.get_area_under_roc_curve_from_probs(
+        forecast_probs_for_validation, validation_labels)
     orig_validation_cross_entropy = model_eval.get_cross_entropy(
-        forecast_probs_for_validation, validation_table[target_name].values)
-    orig_validation_auc = sklearn.metrics.roc_auc_score(
-        validation_table[target_name].values, forecast_probs_for_validation)
+        forecast_probs_for_validation, validation_labels)
 
     # Initialize values for permutation algorithm.
+    random_state_object = numpy.random.RandomState(seed=random_seed)
     remaining_feature_names = copy.deepcopy(feature_names)
     permutation_dict = {
         FEATURE_NAME_KEY: [], VALIDATION_XENTROPY_KEY: [],
-        VALIDATION_AUC_KEY: []
+        VALIDATION_XENTROPY_CI_BOTTOM_KEY: [],
+        VALIDATION_XENTROPY_CI_TOP_KEY: [], VALIDATION_AUC_KEY: [],
+        VALIDATION_AUC_CI_BOTTOM_KEY: [], VALIDATION_AUC_CI_TOP_KEY: []
     }
 
     while remaining_feature_names:  # While there are still features to permute.
@@ -1251,31 +1831,31 @@ def permutation_selection(
                    num_permuted_features + 1, num_permuted_features,
                    num_remaining_features)
 
-        new_xentropy_by_feature = numpy.full(num_remaining_features, numpy.nan)
-        new_auc_by_feature = numpy.full(num_remaining_features, numpy.nan)
-        permuted_values_for_best_feature = None
-
-        for j in range(num_remaining_features):
-            this_validation_matrix = validation_table.as_matrix(
-                columns=feature_names)
-            column_to_permute = feature_names.index(remaining_feature_names[j])
-            this_validation_matrix[:, column_to_permute] = (
-                numpy.random.permutation(
-                    this_validation_matrix[:, column_to_permute]))
-
-            these_forecast_probabilities = new_estimator_object.predict_proba(
-                this_validation_matrix)[:, 1]
-            new_xentropy_by_feature[j] = model_eval.get_cross_entropy(
-                these_forecast_probabilities,
-                validation_table[target_name].values)
-            new_auc_by_feature[j] = sklearn.metrics.roc_auc_score(
-                validation_table[target_name].values,
-                these_forecast_probabilities)
-
-            if numpy.nanargmax(new_xentropy_by_feature) == j:
-                permuted_values_for_best_feature = (
-                    this_validation_matrix[:, column_to_permute])
-
+        these_column_indices = [
+            selection_dict[COLUMN_INDEX_BY_FEATURE_KEY][f]
+            for f in remaining_feature_names]
+        these_random_seeds = random_state_object.randint(
+            0, MAX_RANDOM_SEED, size=num_remaining_features)
+        these_argument_lists = [
+            [these_column_indices[j], these_random_seeds[j]]
+            for j in range(num_remaining_features)]
+
+        # The pool is created at each step, so that workers see the features
+        # permanently permuted in previous steps.
+        worker_pool = _create_worker_pool(selection_dict, num_processes)
+        if worker_pool is None:
+            these_score_lists = [
+                _permute_one_feature(selection_dict, *a)
+                for a in these_argument_lists]
+        else:
+            try:
+                these_score_lists = worker_pool.map(
+                    _permute_one_feature_in_worker, these_argument_lists)
+            finally:
+                _close_worker_pool(worker_pool)
+
+        new_xentropy_by_feature = numpy.array(
+            [numpy.mean(l[0]) for l in these_score_lists])
         max_new_cross_entropy = numpy.max(new_xentropy_by_feature)
         this_best_feature_index = numpy.argmax(new_xentropy_by_feature)
         this_best_feature_name = remaining_feature_names[
@@ -1294,14 +1874,33 @@ def permutation_selection(
                 max_new_cross_entropy, this_best_feature_name,
                 max_prev_cross_entropy)
 
-        validation_table = validation_table.assign(
-            **{this_best_feature_name: permuted_values_for_best_feature})
+        # Permanently permute the best feature, using its first permutation.
+        this_column_index = these_column_indices[this_best_feature_index]
+        this_random_state_object = numpy.random.RandomState(
+            seed=these_random_seeds[this_best_feature_index])
+        validation_matrix[:, this_column_index] = validation_matrix[
+            this_random_state_object.permutation(validation_matrix.shape[0]),
+            this_column_index]
+
+        these_xentropies, these_aucs = these_score_lists[
+            this_best_feature_index]
+        this_xentropy_interval = bootstrapping.get_confidence_interval(
+            these_xentropies, confidence_level=confidence_level)
+        this_auc_interval = bootstrapping.get_confidence_interval(
+            these_aucs, confidence_level=confidence_level)
 
         permutation_dict[FEATURE_NAME_KEY].append(this_best_feature_name)
         permutation_dict[VALIDATION_XENTROPY_KEY].append(
             new_xentropy_by_feature[this_best_feature_index])
-        permutation_dict[VALIDATION_AUC_KEY].append(
-            new_auc_by_feature[this_best_feature_index])
+        permutation_dict[VALIDATION_XENTROPY_CI_BOTTOM_KEY].append(
+            this_xentropy_interval[0])
+        permutation_dict[VALIDATION_XENTROPY_CI_TOP_KEY].append(
+            this_xentropy_interval[1])
+        permutation_dict[VALIDATION_AUC_KEY].append(numpy.mean(these_aucs))
+        permutation_dict[VALIDATION_AUC_CI_BOTTOM_KEY].append(
+            this_auc_interval[0])
+        permutation_dict[VALIDATION_AUC_CI_TOP_KEY].append(
+            this_auc_interval[1])
 
         remaining_feature_names = set(remaining_feature_names)
         remaining_feature_names.remove(this_best_feature_name)
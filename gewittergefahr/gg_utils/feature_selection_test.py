@@ -0,0 +1,346 @@
+"""Unit tests for feature_selection.py."""
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy
+import pandas
+import sklearn.linear_model
+from gewittergefahr.gg_utils import feature_selection
+
+TOLERANCE = 1e-6
+
+# The following constants are used to test _get_candidates_for_addition and
+# _get_candidates_for_removal.
+SELECTED_FEATURE_NAMES = ['a', 'b']
+OTHER_FEATURE_NAMES = ['c', 'd', 'e']
+CANDIDATES_FOR_ADDITION = [['a', 'b', 'c'], ['a', 'b', 'd'], ['a', 'b', 'e']]
+CANDIDATES_FOR_REMOVAL = [['b'], ['a']]
+
+# The following constants are used to test _get_xentropy_for_candidates and
+# the checkpoint methods.
+NUM_TRAINING_EXAMPLES = 200
+NUM_VALIDATION_EXAMPLES = 100
+FEATURE_NAMES = ['foo', 'bar', 'hal', 'moo']
+TARGET_NAME = 'label'
+WEIGHT_BY_FEATURE = numpy.array([2., -1., 0.5, 0.])
+
+
+def _create_example_table(num_examples, random_seed):
+    """Creates pandas DataFrame with random examples.
+
+    :param num_examples: Number of examples.
+    :param random_seed: Seed for random-number generator.
+    :return: example_table: pandas DataFrame, where each row is one example.
+        Columns are the features in FEATURE_NAMES and the binary label
+        TARGET_NAME.
+    """
+
+    random_state_object = numpy.random.RandomState(seed=random_seed)
+    feature_matrix = random_state_object.normal(
+        size=(num_examples, len(FEATURE_NAMES)))
+
+    linear_outputs = (
+        numpy.dot(feature_matrix, WEIGHT_BY_FEATURE) +
+        random_state_object.normal(size=num_examples))
+    example_dict = {TARGET_NAME: (linear_outputs > 0).astype(int)}
+    for j in range(len(FEATURE_NAMES)):
+        example_dict[FEATURE_NAMES[j]] = feature_matrix[:, j]
+
+    return pandas.DataFrame.from_dict(example_dict)
+
+
+TRAINING_TABLE = _create_example_table(NUM_TRAINING_EXAMPLES, random_seed=1)
+VALIDATION_TABLE = _create_example_table(
+    NUM_VALIDATION_EXAMPLES, random_seed=2)
+SELECTION_DICT = feature_selection._get_selection_dict(
+    training_table=TRAINING_TABLE, validation_table=VALIDATION_TABLE,
+    feature_names=FEATURE_NAMES, target_name=TARGET_NAME,
+    estimator_object=sklearn.linear_model.LogisticRegression(
+        solver='liblinear'))
+
+LIST_OF_CANDIDATE_FEATURE_NAMES = [
+    ['foo'], ['bar'], ['foo', 'bar'], ['foo', 'bar', 'hal', 'moo']]
+NUM_PROCESSES = 2
+
+ALGORITHM_NAME = feature_selection.SFFS_NAME
+CHECKPOINT_SELECTED_FEATURE_NAMES = ['foo', 'hal']
+CHECKPOINT_UNSELECTED_FEATURE_NAMES = ['bar', 'moo']
+CHECKPOINT_XENTROPY_BY_STEP = numpy.array([1e10, 0.6, 0.5, numpy.nan])
+CHECKPOINT_MAJOR_STEP_NUM = 2
+HYPERPARAMETERS = [0.01]
+OTHER_HYPERPARAMETERS = [0.02]
+
+# The following constants are used to test permutation_selection.
+NUM_PERMUTATIONS = 5
+RANDOM_SEED = 6695
+
+
+class FeatureSelectionTests(unittest.TestCase):
+    """Each method is a unit test for feature_selection.py."""
+
+    def setUp(self):
+        """Creates temporary directory for checkpoint files."""
+
+        self.directory_name = tempfile.mkdtemp()
+        self.checkpoint_file_name = os.path.join(
+            self.directory_name, 'checkpoint.p')
+        self.input_fingerprint = feature_selection._get_selection_fingerprint(
+            SELECTION_DICT, feature_names=FEATURE_NAMES,
+            hyperparameters=HYPERPARAMETERS)
+
+    def tearDown(self):
+        """Deletes temporary directory."""
+
+        shutil.rmtree(self.directory_name)
+
+    def _write_checkpoint(self):
+        """Writes checkpoint file used by several tests."""
+
+        feature_selection._write_selection_checkpoint(
+            self.checkpoint_file_name, algorithm_name=ALGORITHM_NAME,
+            feature_names=FEATURE_NAMES,
+            selected_feature_names=CHECKPOINT_SELECTED_FEATURE_NAMES,
+            unselected_feature_names=CHECKPOINT_UNSELECTED_FEATURE_NAMES,
+            min_xentropy_by_step=CHECKPOINT_XENTROPY_BY_STEP,
+            major_step_num=CHECKPOINT_MAJOR_STEP_NUM,
+            input_fingerprint=self.input_fingerprint)
+
+    def test_get_candidates_for_addition(self):
+        """Ensures correct output from _get_candidates_for_addition."""
+
+        these_candidates = feature_selection._get_candidates_for_addition(
+            SELECTED_FEATURE_NAMES, OTHER_FEATURE_NAMES)
+        self.assertTrue(these_candidates == CANDIDATES_FOR_ADDITION)
+
+    def test_get_candidates_for_addition_no_side_effects(self):
+        """Ensures that _get_candidates_for_addition does not modify input."""
+
+        these_selected_feature_names = SELECTED_FEATURE_NAMES + []
+        these_candidates = feature_selection._get_candidates_for_addition(
+            these_selected_feature_names, OTHER_FEATURE_NAMES)
+
+        these_candidates[0].append('foo')
+        self.assertTrue(these_selected_feature_names == SELECTED_FEATURE_NAMES)
+
+    def test_get_candidates_for_removal(self):
+        """Ensures correct output from _get_candidates_for_removal."""
+
+        these_candidates = feature_selection._get_candidates_for_removal(
+            SELECTED_FEATURE_NAMES)
+        self.assertTrue(
+            [sorted(c) for c in these_candidates] == CANDIDATES_FOR_REMOVAL)
+
+    def test_get_xentropy_for_candidates_serial_vs_pooled(self):
+        """Ensures that _get_xentropy_for_candidates gives the same results.
+
+        In this case, results with a pool of worker processes are compared with
+        serial results.
+        """
+
+        these_serial_xentropies = (
+            feature_selection._get_xentropy_for_candidates(
+                SELECTION_DICT, LIST_OF_CANDIDATE_FEATURE_NAMES,
+                worker_pool=None))
+
+        this_worker_pool = feature_selection._create_worker_pool(
+            SELECTION_DICT, NUM_PROCESSES)
+        try:
+            these_pooled_xentropies = (
+                feature_selection._get_xentropy_for_candidates(
+                    SELECTION_DICT, LIST_OF_CANDIDATE_FEATURE_NAMES,
+                    worker_pool=this_worker_pool))
+        finally:
+            feature_selection._close_worker_pool(this_worker_pool)
+
+        self.assertTrue(len(these_serial_xentropies) ==
+                        len(LIST_OF_CANDIDATE_FEATURE_NAMES))
+        self.assertTrue(numpy.array_equal(
+            these_serial_xentropies, these_pooled_xentropies))
+
+    def test_get_selection_fingerprint_same_inputs(self):
+        """Ensures that _get_selection_fingerprint is deterministic."""
+
+        this_fingerprint = feature_selection._get_selection_fingerprint(
+            SELECTION_DICT, feature_names=FEATURE_NAMES,
+            hyperparameters=HYPERPARAMETERS)
+        self.assertTrue(this_fingerprint == self.input_fingerprint)
+
+    def test_get_selection_fingerprint_different_hyperparams(self):
+        """Ensures that _get_selection_fingerprint depends on hyperparameters.
+        """
+
+        this_fingerprint = feature_selection._get_selection_fingerprint(
+            SELECTION_DICT, feature_names=FEATURE_NAMES,
+            hyperparameters=OTHER_HYPERPARAMETERS)
+        self.assertFalse(this_fingerprint == self.input_fingerprint)
+
+    def test_get_selection_fingerprint_different_data(self):
+        """Ensures that _get_selection_fingerprint depends on input data."""
+
+        this_selection_dict = feature_selection._get_selection_dict(
+            training_table=VALIDATION_TABLE, validation_table=TRAINING_TABLE,
+            feature_names=FEATURE_NAMES, target_name=TARGET_NAME,
+            estimator_object=SELECTION_DICT[feature_selection.ESTIMATOR_KEY])
+        this_fingerprint = feature_selection._get_selection_fingerprint(
+            this_selection_dict, feature_names=FEATURE_NAMES,
+            hyperparameters=HYPERPARAMETERS)
+        self.assertFalse(this_fingerprint == self.input_fingerprint)
+
+    def test_write_read_selection_checkpoint(self):
+        """Ensures that checkpoint is unchanged by writing and reading."""
+
+        self._write_checkpoint()
+        this_checkpoint_dict = feature_selection._read_selection_checkpoint(
+            self.checkpoint_file_name, algorithm_name=ALGORITHM_NAME,
+            feature_names=FEATURE_NAMES,
+            input_fingerprint=self.input_fingerprint)
+
+        self.assertTrue(
+            this_checkpoint_dict[feature_selection.SELECTED_FEATURES_KEY] ==
+            CHECKPOINT_SELECTED_FEATURE_NAMES)
+        self.assertTrue(
+            this_checkpoint_dict[feature_selection.UNSELECTED_FEATURES_KEY] ==
+            CHECKPOINT_UNSELECTED_FEATURE_NAMES)
+        self.assertTrue(numpy.allclose(
+            this_checkpoint_dict[feature_selection.MIN_XENTROPY_BY_STEP_KEY],
+            CHECKPOINT_XENTROPY_BY_STEP, atol=TOLERANCE, equal_nan=True))
+        self.assertTrue(
+            this_checkpoint_dict[feature_selection.MAJOR_STEP_NUM_KEY] ==
+            CHECKPOINT_MAJOR_STEP_NUM)
+        self.assertFalse(os.path.isfile(self.checkpoint_file_name + '.tmp'))
+
+    def test_read_selection_checkpoint_missing(self):
+        """Ensures that _read_selection_checkpoint returns None if no file."""
+
+        self.assertTrue(feature_selection._read_selection_checkpoint(
+            self.checkpoint_file_name, algorithm_name=ALGORITHM_NAME,
+            feature_names=FEATURE_NAMES,
+            input_fingerprint=self.input_fingerprint) is None)
+
+    def test_read_selection_checkpoint_other_algorithm(self):
+        """Ensures that _read_selection_checkpoint errors on wrong algorithm."""
+
+        self._write_checkpoint()
+        with self.assertRaises(ValueError):
+            feature_selection._read_selection_checkpoint(
+                self.checkpoint_file_name,
+                algorithm_name=feature_selection.SFS_NAME,
+                feature_names=FEATURE_NAMES,
+                input_fingerprint=self.input_fingerprint)
+
+    def test_read_selection_checkpoint_other_features(self):
+        """Ensures that _read_selection_checkpoint errors on wrong features."""
+
+        self._write_checkpoint()
+        with self.assertRaises(ValueError):
+            feature_selection._read_selection_checkpoint(
+                self.checkpoint_file_name, algorithm_name=ALGORITHM_NAME,
+                feature_names=FEATURE_NAMES[:-1],
+                input_fingerprint=self.input_fingerprint)
+
+    def test_read_selection_checkpoint_other_fingerprint(self):
+        """Ensures that _read_selection_checkpoint errors on wrong inputs."""
+
+        self._write_checkpoint()
+        this_fingerprint = feature_selection._get_selection_fingerprint(
+            SELECTION_DICT, feature_names=FEATURE_NAMES,
+            hyperparameters=OTHER_HYPERPARAMETERS)
+
+        with self.assertRaises(ValueError):
+            feature_selection._read_selection_checkpoint(
+                self.checkpoint_file_name, algorithm_name=ALGORITHM_NAME,
+                feature_names=FEATURE_NAMES,
+                input_fingerprint=this_fingerprint)
+
+    def test_delete_selection_checkpoint(self):
+        """Ensures that _delete_selection_checkpoint deletes the file."""
+
+        self._write_checkpoint()
+        feature_selection._delete_selection_checkpoint(
+            self.checkpoint_file_name)
+        self.assertFalse(os.path.isfile(self.checkpoint_file_name))
+
+        # Deleting a missing (or None) checkpoint should not fail.
+        feature_selection._delete_selection_checkpoint(
+            self.checkpoint_file_name)
+        feature_selection._delete_selection_checkpoint(None)
+
+    def test_sequential_forward_selection_deletes_checkpoint(self):
+        """Ensures that sequential_forward_selection deletes checkpoint.
+
+        The checkpoint should be deleted once the algorithm completes.
+        """
+
+        feature_selection.sequential_forward_selection(
+            training_table=TRAINING_TABLE, validation_table=VALIDATION_TABLE,
+            testing_table=VALIDATION_TABLE, feature_names=FEATURE_NAMES,
+            target_name=TARGET_NAME,
+            estimator_object=SELECTION_DICT[feature_selection.ESTIMATOR_KEY],
+            checkpoint_file_name=self.checkpoint_file_name)
+        self.assertFalse(os.path.isfile(self.checkpoint_file_name))
+
+    def _run_permutation_selection(self, num_processes):
+        """Runs permutation_selection with a fixed random seed.
+
+        :param num_processes: Number of worker processes.
+        :return: permutation_table: See doc for
+            `feature_selection.permutation_selection`.
+        :return: orig_validation_cross_entropy: Same.
+        :return: orig_validation_auc: Same.
+        """
+
+        return feature_selection.permutation_selection(
+            training_table=TRAINING_TABLE, validation_table=VALIDATION_TABLE,
+            feature_names=FEATURE_NAMES, target_name=TARGET_NAME,
+            estimator_object=SELECTION_DICT[feature_selection.ESTIMATOR_KEY],
+            num_permutations=NUM_PERMUTATIONS, random_seed=RANDOM_SEED,
+            num_processes=num_processes)
+
+    def _compare_permutation_results(self, first_results, second_results):
+        """Ensures that two sets of results from permutation_selection match.
+
+        :param first_results: Tuple returned by permutation_selection.
+        :param second_results: Same.
+        """
+
+        first_table, second_table = first_results[0], second_results[0]
+        self.assertTrue(
+            first_table[feature_selection.FEATURE_NAME_KEY].values.tolist() ==
+            second_table[feature_selection.FEATURE_NAME_KEY].values.tolist())
+
+        for this_column_name in list(first_table):
+            if this_column_name == feature_selection.FEATURE_NAME_KEY:
+                continue
+
+            self.assertTrue(numpy.allclose(
+                first_table[this_column_name].values,
+                second_table[this_column_name].values, atol=TOLERANCE))
+
+        self.assertTrue(numpy.isclose(
+            first_results[1], second_results[1], atol=TOLERANCE))
+        self.assertTrue(numpy.isclose(
+            first_results[2], second_results[2], atol=TOLERANCE))
+
+    def test_permutation_selection_fixed_seed(self):
+        """Ensures that permutation_selection is reproducible.
+
+        In this case, the algorithm is run twice with the same random seed.
+        """
+
+        self._compare_permutation_results(
+            self._run_permutation_selection(num_processes=1),
+            self._run_permutation_selection(num_processes=1))
+
+    def test_permutation_selection_num_processes(self):
+        """Ensures that permutation_selection does not depend on num processes.
+        """
+
+        self._compare_permutation_results(
+            self._run_permutation_selection(num_processes=1),
+            self._run_permutation_selection(num_processes=NUM_PROCESSES))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,8 +2,14 @@
 
 Currently the only method in this file is SVD (singular-value decomposition).
 However, I may add more.
+
+Methods with a `feature_table` argument work on pandas DataFrames.  The classes
+FeatureStandardizer and SvdTransformer work directly on numpy matrices (which
+may be float32, to save memory) and can be fit incrementally over chunks of
+training examples.
 """
 
+import copy
 import numpy
 import pandas
 from gewittergefahr.gg_utils import error_checking
@@ -54,6 +60,266 @@ def _reorder_standardization_dict(standardization_dict, new_feature_names):
     return standardization_dict
 
 
+def _check_feature_matrix(feature_matrix, num_features=None):
+    """Error-checks feature matrix.
+
+    N = number of examples
+    M = number of features (input variables)
+
+    :param feature_matrix: N-by-M numpy array of floats (may be 32- or 64-bit).
+    :param num_features: Expected number of features (M).  If None, will not
+        check number of features.
+    """
+
+    error_checking.assert_is_float_numpy_array(feature_matrix)
+    if num_features is None:
+        error_checking.assert_is_numpy_array(feature_matrix, num_dimensions=2)
+    else:
+        error_checking.assert_is_numpy_array(
+            feature_matrix, exact_dimensions=numpy.array(
+                [feature_matrix.shape[0], num_features]))
+
+
+class FeatureStandardizer(object):
+    """Standardizes features (converts to z-scores).
+
+    Works on numpy matrices rather than pandas DataFrames.  Means and standard
+    deviations may be fit incrementally (one chunk of examples at a time, with
+    `partial_fit`), so that the full training set need not fit in memory.
+
+    Equivalent to `standardization_dict` (see _standardize_features), which can
+    be created by `get_standardization_dict` or used to initialize the object.
+    """
+
+    def __init__(self, feature_names=None, standardization_dict=None):
+        """Constructor.
+
+        M = number of features (input variables)
+
+        :param feature_names: length-M list of feature names.  Used only if
+            `standardization_dict` is None.
+        :param standardization_dict: Dictionary created by
+            _standardize_features (or `get_standardization_dict`).  If None,
+            the object must be fit before `transform` is called.
+        """
+
+        if standardization_dict is None:
+            error_checking.assert_is_string_list(feature_names)
+            error_checking.assert_is_numpy_array(
+                numpy.array(feature_names), num_dimensions=1)
+
+            num_features = len(feature_names)
+            self.feature_names = copy.deepcopy(feature_names)
+            self.num_values_by_feature = numpy.full(num_features, 0, dtype=int)
+            self.feature_means = numpy.full(num_features, 0.)
+            self.sum_squared_deviations = numpy.full(num_features, 0.)
+            self.feature_standard_deviations = None
+        else:
+            self.feature_names = copy.deepcopy(
+                standardization_dict[FEATURE_NAMES_KEY])
+            self.num_values_by_feature = None
+            self.feature_means = numpy.array(
+                standardization_dict[ORIGINAL_MEANS_KEY], dtype=float)
+            self.sum_squared_deviations = None
+            self.feature_standard_deviations = numpy.array(
+                standardization_dict[ORIGINAL_STDEVIATIONS_KEY], dtype=float)
+
+    def partial_fit(self, feature_matrix):
+        """Updates means and standard deviations with one chunk of examples.
+
+        Running moments are merged with the pairwise formula of Chan et al.
+        (1979), which is numerically stable.  NaN's are ignored.
+
+        :param feature_matrix: N-by-M numpy array of feature values, with
+            columns in the same order as `self.feature_names`.
+        :raises: ValueError: if this object was created from an existing
+            standardization dictionary.
+        """
+
+        if self.num_values_by_feature is None:
+            raise ValueError('Cannot fit a standardizer created from an '
+                             'existing standardization dictionary.')
+
+        _check_feature_matrix(
+            feature_matrix, num_features=len(self.feature_names))
+
+        real_value_flags = numpy.invert(numpy.isnan(feature_matrix))
+        these_num_values = numpy.sum(real_value_flags, axis=0)
+        these_sums = numpy.sum(
+            numpy.where(real_value_flags, feature_matrix, 0.), axis=0,
+            dtype=float)
+        these_means = these_sums / numpy.maximum(these_num_values, 1)
+        these_sum_squared_deviations = numpy.sum(
+            numpy.where(
+                real_value_flags, feature_matrix - these_means, 0.) ** 2,
+            axis=0, dtype=float)
+
+        new_num_values = self.num_values_by_feature + these_num_values
+        these_weights = (
+            these_num_values.astype(float) / numpy.maximum(new_num_values, 1))
+        these_deltas = these_means - self.feature_means
+
+        self.feature_means = self.feature_means + these_deltas * these_weights
+        self.sum_squared_deviations = (
+            self.sum_squared_deviations + these_sum_squared_deviations +
+            these_deltas ** 2 * self.num_values_by_feature * these_weights)
+        self.num_values_by_feature = new_num_values
+        self.feature_standard_deviations = None
+
+    def fit(self, feature_matrix):
+        """Computes means and standard deviations from all training examples.
+
+        :param feature_matrix: See doc for `partial_fit`.
+        """
+
+        num_features = len(self.feature_names)
+        self.num_values_by_feature = numpy.full(num_features, 0, dtype=int)
+        self.feature_means = numpy.full(num_features, 0.)
+        self.sum_squared_deviations = numpy.full(num_features, 0.)
+        self.partial_fit(feature_matrix)
+
+    def get_standardization_dict(self):
+        """Returns means and standard deviations as dictionary.
+
+        :return: standardization_dict: See doc for _standardize_features.
+        :raises: ValueError: if any feature has < 2 real values (not NaN) in the
+            data used for fitting.
+        """
+
+        if self.feature_standard_deviations is None:
+            if numpy.any(self.num_values_by_feature < 2):
+                raise ValueError('Each feature must have >= 2 real values (not '
+                                 'NaN).')
+
+            self.feature_standard_deviations = numpy.sqrt(
+                self.sum_squared_deviations / (self.num_values_by_feature - 1))
+
+        return {
+            FEATURE_NAMES_KEY: copy.deepcopy(self.feature_names),
+            ORIGINAL_MEANS_KEY: copy.deepcopy(self.feature_means),
+            ORIGINAL_STDEVIATIONS_KEY:
+                copy.deepcopy(self.feature_standard_deviations)
+        }
+
+    def transform(self, feature_matrix, in_place=False):
+        """Standardizes features.
+
+        After standardization, NaN's are replaced with zero (the mean).
+
+        :param feature_matrix: See doc for `partial_fit`.
+        :param in_place: Boolean flag.  If True, `feature_matrix` will be
+            overwritten (and keeps its data type, e.g., float32).  If False, a
+            new matrix will be returned.
+        :return: standardized_feature_matrix: N-by-M numpy array of z-scores.
+        """
+
+        _check_feature_matrix(
+            feature_matrix, num_features=len(self.feature_names))
+        error_checking.assert_is_boolean(in_place)
+
+        standardization_dict = self.get_standardization_dict()
+        if in_place:
+            standardized_feature_matrix = feature_matrix
+        else:
+            standardized_feature_matrix = feature_matrix.astype(float)
+
+        standardized_feature_matrix -= standardization_dict[ORIGINAL_MEANS_KEY]
+        standardized_feature_matrix /= standardization_dict[
+            ORIGINAL_STDEVIATIONS_KEY]
+        standardized_feature_matrix[
+            numpy.isnan(standardized_feature_matrix)] = 0.
+
+        return standardized_feature_matrix
+
+
+class SvdTransformer(object):
+    """Transforms features via SVD (singular-value decomposition).
+
+    Works on numpy matrices rather than pandas DataFrames.  The SVD may be fit
+    incrementally (one chunk of examples at a time, with `partial_fit`), so
+    that the full training set need not fit in memory.
+
+    For standardized feature matrix Z, SVD gives Z = U * S * V^T.  Incremental
+    fitting accumulates the M-by-M scatter matrix Z^T * Z = V * S^2 * V^T,
+    whose eigendecomposition yields the EOFs (V) and eigenvalues (S^2) exactly.
+    However, principal components (U) are not computed, because they have one
+    row per training example.
+    """
+
+    def __init__(self, standardization_dict):
+        """Constructor.
+
+        :param standardization_dict: Dictionary created by
+            _standardize_features or
+            `FeatureStandardizer.get_standardization_dict`, from training data.
+        """
+
+        self.standardizer = FeatureStandardizer(
+            standardization_dict=standardization_dict)
+
+        num_features = len(self.standardizer.feature_names)
+        self.scatter_matrix = numpy.full((num_features, num_features), 0.)
+        self.svd_dictionary = None
+
+    def partial_fit(self, feature_matrix):
+        """Updates scatter matrix with one chunk of examples.
+
+        :param feature_matrix: N-by-M numpy array of raw (not standardized)
+            feature values, with columns in the same order as the
+            standardization dictionary.
+        """
+
+        standardized_feature_matrix = self.standardizer.transform(
+            feature_matrix, in_place=False)
+        self.scatter_matrix += numpy.dot(
+            numpy.transpose(standardized_feature_matrix),
+            standardized_feature_matrix)
+        self.svd_dictionary = None
+
+    def get_svd_dictionary(self):
+        """Returns SVD results as dictionary.
+
+        :return: svd_dictionary: See doc for perform_svd.  However,
+            svd_dictionary['principal_component_matrix'] is None.
+        """
+
+        if self.svd_dictionary is None:
+            eigenvalues, eof_matrix = numpy.linalg.eigh(self.scatter_matrix)
+            sort_indices = numpy.argsort(-eigenvalues)
+
+            self.svd_dictionary = {
+                PC_MATRIX_KEY: None,
+                EIGENVALUE_MATRIX_KEY: numpy.diag(
+                    numpy.maximum(eigenvalues[sort_indices], 0.)),
+                EOF_MATRIX_KEY: eof_matrix[:, sort_indices]
+            }
+
+        return copy.deepcopy(self.svd_dictionary)
+
+    def transform(self, feature_matrix, svd_dictionary=None, in_place=False):
+        """Projects features onto EOFs (empirical orthogonal functions).
+
+        K = number of EOFs kept
+
+        :param feature_matrix: See doc for `partial_fit`.
+        :param svd_dictionary: Dictionary created by `get_svd_dictionary` (and
+            possibly filtered by filter_svd_by_explained_variance).  If None,
+            will use all EOFs.
+        :param in_place: Boolean flag.  If True, `feature_matrix` will be
+            standardized in place (overwritten) before projection.
+        :return: transformed_feature_matrix: N-by-K numpy array of transformed
+            features.
+        """
+
+        if svd_dictionary is None:
+            svd_dictionary = self.get_svd_dictionary()
+
+        standardized_feature_matrix = self.standardizer.transform(
+            feature_matrix, in_place=in_place)
+        return numpy.dot(
+            standardized_feature_matrix, svd_dictionary[EOF_MATRIX_KEY])
+
+
 def _standardize_features(feature_table, standardization_dict=None):
     """Standardizes each feature by converting to z-score.
 
@@ -82,44 +348,34 @@ def _standardize_features(feature_table, standardization_dict=None):
         (not NaN).
     """
 
+    feature_names = list(feature_table)
+    feature_matrix = feature_table.as_matrix().astype(float)
+
     num_real_values_by_feature = numpy.sum(
-        numpy.invert(numpy.isnan(feature_table.as_matrix())), axis=0)
+        numpy.invert(numpy.isnan(feature_matrix)), axis=0)
     if numpy.any(num_real_values_by_feature < 2):
         raise ValueError('Each column of feature_table must have >= 2 real '
                          'values (not NaN).')
 
     if standardization_dict is None:
-        feature_means = numpy.nanmean(feature_table.as_matrix(), axis=0)
+        feature_means = numpy.nanmean(feature_matrix, axis=0)
         feature_standard_deviations = numpy.nanstd(
-            feature_table.as_matrix(), axis=0, ddof=1)
+            feature_matrix, axis=0, ddof=1)
 
-        standardization_dict = {FEATURE_NAMES_KEY: list(feature_table),
+        standardization_dict = {FEATURE_NAMES_KEY: feature_names,
                                 ORIGINAL_MEANS_KEY: feature_means,
                                 ORIGINAL_STDEVIATIONS_KEY: feature_standard_deviations}
 
     else:
         standardization_dict = _reorder_standardization_dict(
-            standardization_dict, list(feature_table))
-
-    feature_names = list(feature_table)
-    num_features = len(feature_names)
-    standardized_feature_table = None
-
-    for j in range(num_features):
-        these_standardized_values = (
-            (feature_table[feature_names[j]].values -
-             standardization_dict[ORIGINAL_MEANS_KEY][j]) /
-            standardization_dict[ORIGINAL_STDEVIATIONS_KEY][j])
+            standardization_dict, feature_names)
 
-        nan_indices = numpy.where(numpy.isnan(these_standardized_values))[0]
-        these_standardized_values[nan_indices] = 0.
+    standardizer = FeatureStandardizer(
+        standardization_dict=standardization_dict)
+    standardizer.transform(feature_matrix, in_place=True)
 
-        if standardized_feature_table is None:
-            standardized_feature_table = pandas.DataFrame.from_dict(
-                {feature_names[j]: these_standardized_values})
-        else:
-            standardized_feature_table = standardized_feature_table.assign(
-                **{feature_names[j]: these_standardized_values})
+    standardized_feature_table = pandas.DataFrame(
+        feature_matrix, columns=feature_names)
 
     return standardized_feature_table, standardization_dict
 
@@ -161,7 +417,8 @@ def filter_svd_by_explained_variance(
         fraction_of_variance_to_keep=DEFAULT_FRACTION_OF_VARIANCE_TO_KEEP):
     """Filters SVD results by explained variance.
 
-    :param svd_dictionary: Dictionary returned by perform_svd.
+    :param svd_dictionary: Dictionary returned by perform_svd or
+        `SvdTransformer.get_svd_dictionary`.
     :param fraction_of_variance_to_keep: Fraction of variance to keep.  Will
         select modes in descending order until they explain >=
         `fraction_of_variance_to_keep` of total variance in dataset.
@@ -179,8 +436,9 @@ def filter_svd_by_explained_variance(
     num_modes_to_keep = 1 + numpy.where(
         cumul_explained_variance_by_mode >= fraction_of_variance_to_keep)[0][0]
 
-    svd_dictionary[PC_MATRIX_KEY] = (
-        svd_dictionary[PC_MATRIX_KEY][:, :num_modes_to_keep])
+    if svd_dictionary[PC_MATRIX_KEY] is not None:
+        svd_dictionary[PC_MATRIX_KEY] = (
+            svd_dictionary[PC_MATRIX_KEY][:, :num_modes_to_keep])
     svd_dictionary[EIGENVALUE_MATRIX_KEY] = (
         svd_dictionary[EIGENVALUE_MATRIX_KEY][:num_modes_to_keep,
                                               :num_modes_to_keep])
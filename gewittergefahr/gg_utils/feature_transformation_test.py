@@ -38,17 +38,28 @@ FEATURE_TABLE_TOO_MANY_NAN = pandas.DataFrame.from_dict(THIS_FEATURE_DICT)
 FEATURE_MEANS = numpy.array([3., 1., 5.])
 FEATURE_STANDARD_DEVIATIONS = numpy.sqrt(numpy.array([2.5, 1., 50. / 3]))
 STANDARDIZATION_DICT = {
-    feature_trans.FEATURE_NAME_KEY: FEATURE_NAMES,
-    feature_trans.ORIGINAL_MEAN_KEY: FEATURE_MEANS,
-    feature_trans.ORIGINAL_STDEV_KEY: FEATURE_STANDARD_DEVIATIONS
+    feature_trans.FEATURE_NAMES_KEY: FEATURE_NAMES,
+    feature_trans.ORIGINAL_MEANS_KEY: FEATURE_MEANS,
+    feature_trans.ORIGINAL_STDEVIATIONS_KEY: FEATURE_STANDARD_DEVIATIONS
 }
 
+# The following constants are used to test FeatureStandardizer.
+FIRST_CHUNK_ROW_INDICES = numpy.array([0, 1], dtype=int)
+SECOND_CHUNK_ROW_INDICES = numpy.array([2, 3, 4], dtype=int)
+
+STANDARDIZED_FEATURE_MATRIX = numpy.array(
+    [[-2. / numpy.sqrt(2.5), -1., 5. / numpy.sqrt(50. / 3)],
+     [-1. / numpy.sqrt(2.5), 0., 0.],
+     [0., 1., 0.],
+     [1. / numpy.sqrt(2.5), 0., -5. / numpy.sqrt(50. / 3)],
+     [2. / numpy.sqrt(2.5), 0., 0.]])
+
 # The following constants are used to test _reorder_standardization_dict.
 PERMUTED_FEATURE_NAMES = ['b', 'c', 'a']
 PERMUTED_STANDARDIZATION_DICT = {
-    feature_trans.FEATURE_NAME_KEY: PERMUTED_FEATURE_NAMES,
-    feature_trans.ORIGINAL_MEAN_KEY: numpy.array([1., 5., 3.]),
-    feature_trans.ORIGINAL_STDEV_KEY:
+    feature_trans.FEATURE_NAMES_KEY: PERMUTED_FEATURE_NAMES,
+    feature_trans.ORIGINAL_MEANS_KEY: numpy.array([1., 5., 3.]),
+    feature_trans.ORIGINAL_STDEVIATIONS_KEY:
         numpy.sqrt(numpy.array([1., 50. / 3, 2.5]))
 }
 
@@ -98,12 +109,13 @@ class FeatureTransformationTests(unittest.TestCase):
         self.assertTrue(set(this_standardization_dict.keys()) ==
                         set(PERMUTED_STANDARDIZATION_DICT.keys()))
         self.assertTrue(numpy.allclose(
-            this_standardization_dict[feature_trans.ORIGINAL_MEAN_KEY],
-            PERMUTED_STANDARDIZATION_DICT[feature_trans.ORIGINAL_MEAN_KEY],
+            this_standardization_dict[feature_trans.ORIGINAL_MEANS_KEY],
+            PERMUTED_STANDARDIZATION_DICT[feature_trans.ORIGINAL_MEANS_KEY],
             atol=TOLERANCE))
         self.assertTrue(numpy.allclose(
-            this_standardization_dict[feature_trans.ORIGINAL_STDEV_KEY],
-            PERMUTED_STANDARDIZATION_DICT[feature_trans.ORIGINAL_STDEV_KEY],
+            this_standardization_dict[feature_trans.ORIGINAL_STDEVIATIONS_KEY],
+            PERMUTED_STANDARDIZATION_DICT[
+                feature_trans.ORIGINAL_STDEVIATIONS_KEY],
             atol=TOLERANCE))
 
     def test_reorder_standardization_dict_mismatch(self):
@@ -126,12 +138,12 @@ class FeatureTransformationTests(unittest.TestCase):
         self.assertTrue(set(this_standardization_dict.keys()) ==
                         set(STANDARDIZATION_DICT.keys()))
         self.assertTrue(numpy.allclose(
-            this_standardization_dict[feature_trans.ORIGINAL_MEAN_KEY],
-            STANDARDIZATION_DICT[feature_trans.ORIGINAL_MEAN_KEY],
+            this_standardization_dict[feature_trans.ORIGINAL_MEANS_KEY],
+            STANDARDIZATION_DICT[feature_trans.ORIGINAL_MEANS_KEY],
             atol=TOLERANCE))
         self.assertTrue(numpy.allclose(
-            this_standardization_dict[feature_trans.ORIGINAL_STDEV_KEY],
-            STANDARDIZATION_DICT[feature_trans.ORIGINAL_STDEV_KEY],
+            this_standardization_dict[feature_trans.ORIGINAL_STDEVIATIONS_KEY],
+            STANDARDIZATION_DICT[feature_trans.ORIGINAL_STDEVIATIONS_KEY],
             atol=TOLERANCE))
 
     def test_standardize_features_too_many_nans(self):
@@ -140,6 +152,74 @@ class FeatureTransformationTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             feature_trans._standardize_features(FEATURE_TABLE_TOO_MANY_NAN)
 
+    def test_standardizer_partial_fit(self):
+        """Ensures correct output from FeatureStandardizer.partial_fit.
+
+        In this case, the standardizer is fit over two chunks of examples.
+        """
+
+        this_standardizer = feature_trans.FeatureStandardizer(
+            feature_names=FEATURE_NAMES)
+        this_standardizer.partial_fit(FEATURE_MATRIX[FIRST_CHUNK_ROW_INDICES])
+        this_standardizer.partial_fit(FEATURE_MATRIX[SECOND_CHUNK_ROW_INDICES])
+        this_standardization_dict = this_standardizer.get_standardization_dict()
+
+        self.assertTrue(this_standardization_dict[
+            feature_trans.FEATURE_NAMES_KEY] == FEATURE_NAMES)
+        self.assertTrue(numpy.allclose(
+            this_standardization_dict[feature_trans.ORIGINAL_MEANS_KEY],
+            STANDARDIZATION_DICT[feature_trans.ORIGINAL_MEANS_KEY],
+            atol=TOLERANCE))
+        self.assertTrue(numpy.allclose(
+            this_standardization_dict[feature_trans.ORIGINAL_STDEVIATIONS_KEY],
+            STANDARDIZATION_DICT[feature_trans.ORIGINAL_STDEVIATIONS_KEY],
+            atol=TOLERANCE))
+
+    def test_standardizer_too_many_nans(self):
+        """Ensures that FeatureStandardizer throws too-many-NaN error."""
+
+        this_standardizer = feature_trans.FeatureStandardizer(
+            feature_names=FEATURE_NAMES)
+        this_standardizer.fit(FEATURE_MATRIX_TOO_MANY_NAN)
+
+        with self.assertRaises(ValueError):
+            this_standardizer.get_standardization_dict()
+
+    def test_standardizer_transform_in_place(self):
+        """Ensures correct output from FeatureStandardizer.transform.
+
+        In this case, a float32 matrix is standardized in place.
+        """
+
+        this_standardizer = feature_trans.FeatureStandardizer(
+            standardization_dict=STANDARDIZATION_DICT)
+        this_feature_matrix = FEATURE_MATRIX.astype(numpy.float32)
+        this_standardizer.transform(this_feature_matrix, in_place=True)
+
+        self.assertTrue(this_feature_matrix.dtype == numpy.float32)
+        self.assertTrue(numpy.allclose(
+            this_feature_matrix, STANDARDIZED_FEATURE_MATRIX, atol=TOLERANCE))
+
+    def test_standardizer_transform_new_matrix(self):
+        """Ensures correct output from FeatureStandardizer.transform.
+
+        In this case, the input matrix is not modified.
+        """
+
+        this_standardizer = feature_trans.FeatureStandardizer(
+            feature_names=FEATURE_NAMES)
+        this_standardizer.fit(FEATURE_MATRIX)
+        this_feature_matrix = copy.deepcopy(FEATURE_MATRIX)
+        this_standardized_matrix = this_standardizer.transform(
+            this_feature_matrix, in_place=False)
+
+        self.assertTrue(numpy.allclose(
+            this_standardized_matrix, STANDARDIZED_FEATURE_MATRIX,
+            atol=TOLERANCE))
+        self.assertTrue(numpy.allclose(
+            this_feature_matrix, FEATURE_MATRIX, atol=TOLERANCE,
+            equal_nan=True))
+
     def test_perform_svd_no_crash(self):
         """Ensures that perform_svd does not crash.
 
@@ -149,6 +229,34 @@ class FeatureTransformationTests(unittest.TestCase):
 
         feature_trans.perform_svd(FEATURE_TABLE)
 
+    def test_svd_transformer(self):
+        """Ensures that SvdTransformer is consistent with perform_svd.
+
+        In this case, the transformer is fit over two chunks of examples.
+        Since EOFs are unique only up to sign, the transformed features are
+        compared in absolute value.
+        """
+
+        this_standardization_dict, this_svd_dictionary = (
+            feature_trans.perform_svd(FEATURE_TABLE))
+        these_expected_features = feature_trans.transform_features_via_svd(
+            FEATURE_TABLE, this_standardization_dict, this_svd_dictionary)
+
+        this_transformer = feature_trans.SvdTransformer(
+            this_standardization_dict)
+        this_transformer.partial_fit(FEATURE_MATRIX[FIRST_CHUNK_ROW_INDICES])
+        this_transformer.partial_fit(FEATURE_MATRIX[SECOND_CHUNK_ROW_INDICES])
+        this_new_svd_dictionary = this_transformer.get_svd_dictionary()
+        these_actual_features = this_transformer.transform(FEATURE_MATRIX)
+
+        self.assertTrue(numpy.allclose(
+            this_new_svd_dictionary[feature_trans.EIGENVALUE_MATRIX_KEY],
+            this_svd_dictionary[feature_trans.EIGENVALUE_MATRIX_KEY],
+            atol=TOLERANCE))
+        self.assertTrue(numpy.allclose(
+            numpy.absolute(these_actual_features),
+            numpy.absolute(these_expected_features), atol=TOLERANCE))
+
     def test_filter_svd_by_explained_variance_90pct(self):
         """Ensures correct output from filter_svd_by_explained_variance.
 
@@ -52,9 +52,14 @@ Dead storm object = storm object for which the corresponding cell no longer
     label) are used.
 """
 
+import os
 import os.path
+import copy
 import pickle
+import multiprocessing
 import numpy
+import pandas
+import netCDF4
 from gewittergefahr.gg_io import storm_tracking_io as tracking_io
 from gewittergefahr.gg_utils import radar_statistics as radar_stats
 from gewittergefahr.gg_utils import shape_statistics as shape_stats
@@ -72,6 +77,9 @@ KT_TO_METRES_PER_SECOND = 1.852 / 3.6
 
 FEATURE_FILE_PREFIX = 'features'
 FEATURE_FILE_EXTENSION = '.p'
+FEATURE_STORE_FILE_EXTENSION = '.nc'
+VALID_FILE_EXTENSIONS = [FEATURE_FILE_EXTENSION, FEATURE_STORE_FILE_EXTENSION]
+SAMPLING_INDEX_FILE_SUFFIX = '_sampling_index'
 TIME_FORMAT_IN_FILE_NAMES = '%Y-%m-%d-%H%M%S'
 
 STORM_TO_WIND_COLUMNS_TO_KEEP = [
@@ -106,6 +114,34 @@ DEFAULT_MIN_OBSERVATIONS_FOR_SAMPLING = 25
 DEFAULT_MIN_OBS_DENSITY_FOR_SAMPLING_M02 = 1e-7
 DEFAULT_CUTOFFS_FOR_UNIFORM_SAMPLING_M_S01 = (
     KT_TO_METRES_PER_SECOND * numpy.array([10., 20., 30., 40., 50.]))
+DEFAULT_NUM_PROCESSES_FOR_SAMPLING = 1
+
+INPUT_FILE_NAMES_KEY = 'input_feature_file_names'
+OUTPUT_FILE_NAMES_KEY = 'output_feature_file_names'
+SAMPLING_METHOD_KEY = 'sampling_method'
+SAMPLING_PARAMS_KEY = 'sampling_param_dict'
+SELECTED_INDICES_BY_FILE_KEY = 'selected_indices_by_file'
+FILE_WRITTEN_FLAGS_KEY = 'output_file_written_flags'
+MANIFEST_KEYS = [
+    INPUT_FILE_NAMES_KEY, OUTPUT_FILE_NAMES_KEY, SAMPLING_METHOD_KEY,
+    SAMPLING_PARAMS_KEY, SELECTED_INDICES_BY_FILE_KEY, FILE_WRITTEN_FLAGS_KEY]
+
+FEATURE_STORE_ROW_DIMENSION = 'storm_object'
+FEATURE_STORE_CHUNK_SIZE = 4096
+FEATURE_STORE_FLOAT_TYPE = 'f4'
+FEATURE_STORE_CLASS_LABEL_TYPE = 'i4'
+FEATURE_STORE_INTEGER_COLUMN_TYPE_DICT = {
+    tracking_io.TIME_COLUMN: 'i8', storms_to_winds.END_TIME_COLUMN: 'i8',
+    labels.NUM_OBSERVATIONS_FOR_LABEL_COLUMN: 'i4'
+}
+
+STORE_FILE_NAMES_KEY = 'feature_store_file_names'
+STORE_COLUMNS_KEY = 'column_names'
+STORE_TIMES_BY_FILE_KEY = 'storm_times_by_file_unix_sec'
+
+MIN_OBSERVATIONS_PARAM_NAME = 'min_observations'
+MIN_DENSITY_PARAM_NAME = 'min_observation_density_m02'
+CUTOFFS_PARAM_NAME = 'cutoffs_m_s01'
 
 
 def _find_live_and_dead_storms(feature_table):
@@ -120,7 +156,7 @@ def _find_live_and_dead_storms(feature_table):
         objects.
     """
 
-    _, regression_label_column_name, _ = check_feature_table(
+    regression_label_column_name, _ = _check_label_columns(
         feature_table, require_storm_objects=True)
     label_parameter_dict = labels.column_name_to_label_params(
         regression_label_column_name)
@@ -230,7 +266,7 @@ def _get_observation_densities(feature_table):
         densities (number per m^2).
     """
 
-    _, regression_label_column_name, _, = check_feature_table(
+    regression_label_column_name, _ = _check_label_columns(
         feature_table, require_storm_objects=True)
     label_parameter_dict = labels.column_name_to_label_params(
         regression_label_column_name)
@@ -348,52 +384,23 @@ def _indices_from_overall_to_file_specific(overall_indices,
     return indices_by_file
 
 
-def check_feature_table(feature_table, require_storm_objects=True):
-    """Ensures that pandas DataFrame contains features and labels.
+def _check_label_columns(feature_table, require_storm_objects=True):
+    """Finds label columns in pandas DataFrame.
 
-    feature_table must contain one or more feature columns.
-    feature_table must contain either 1 or 2 label columns.  If 2 columns, there
-    must be one regression label L_r and one classification label L_c, where L_r
-    is the regression version of L_c.
+    This method is the part of check_feature_table that deals with labels.  It
+    does not require feature columns, so it can be used with sampling indices
+    (see write_features_for_storm_objects) as well as full feature tables.
 
     :param feature_table: pandas DataFrame.
-    :param require_storm_objects: Boolean flag.  If True, feature_table must
-        contain columns "storm_id" and "unix_time_sec".  If False, feature_table
-        does not need these columns.
-    :return: feature_column_names: 1-D list containing names of columns with
-        features.
-    :return: regression_label_column_name: Name of column with regression label.
-        If there is no regression label, this will be None.
-    :return: classification_label_column_name: Name of column with
-        classification label.  If there is no regression label, this will be
-        None.
-    :raises: ValueError: if feature_table does not contain any feature columns.
+    :param require_storm_objects: See documentation for check_feature_table.
+    :return: regression_label_column_name: See documentation for
+        check_feature_table.
+    :return: classification_label_column_name: See documentation for
+        check_feature_table.
     :raises: ValueError: if feature_table does not contain exactly one label
         column.
     """
 
-    feature_column_names = radar_stats.get_statistic_columns(feature_table)
-
-    shape_stat_column_names = shape_stats.get_statistic_columns(feature_table)
-    if shape_stat_column_names:
-        if feature_column_names:
-            feature_column_names += shape_stat_column_names
-        else:
-            feature_column_names = shape_stat_column_names
-
-    sounding_stat_column_names = soundings.get_sounding_stat_columns(
-        feature_table)
-    if sounding_stat_column_names:
-        if feature_column_names:
-            feature_column_names += sounding_stat_column_names
-        else:
-            feature_column_names = sounding_stat_column_names
-
-    if feature_column_names is None:
-        raise ValueError(
-            'feature_table does not contain any columns with features '
-            '(predictor variables).')
-
     regression_label_column_names = labels.get_regression_label_columns(
         feature_table)
     if regression_label_column_names and len(
@@ -445,6 +452,600 @@ def check_feature_table(feature_table, require_storm_objects=True):
         error_checking.assert_columns_in_dataframe(
             feature_table, STORM_TO_WIND_COLUMNS_TO_KEEP)
 
+    return regression_label_column_name, classification_label_column_name
+
+
+def _get_sampling_index_columns(feature_table):
+    """Returns names of columns needed to sample feature vectors.
+
+    These are the storm-object columns, label columns, and (if present) the
+    distance buffer used to create labels.  They are enough for the first pass
+    of sample_many_files_by_min_obs_or_density and
+    sample_many_files_by_uniform_wind_speed.
+
+    :param feature_table: pandas DataFrame created by
+        join_features_and_label_for_storm_objects.
+    :return: index_column_names: 1-D list with names of columns needed for
+        sampling.
+    """
+
+    regression_label_column_name, classification_label_column_name = (
+        _check_label_columns(feature_table, require_storm_objects=True))
+
+    index_column_names = copy.deepcopy(STORM_TO_WIND_COLUMNS_TO_KEEP)
+    if regression_label_column_name is not None:
+        index_column_names.append(regression_label_column_name)
+    if classification_label_column_name is not None:
+        index_column_names.append(classification_label_column_name)
+
+    label_parameter_dict = labels.column_name_to_label_params(
+        index_column_names[-1])
+    min_buffer_distance_metres = label_parameter_dict[labels.MIN_DISTANCE_NAME]
+    if min_buffer_distance_metres < TOLERANCE:
+        min_buffer_distance_metres = numpy.nan
+
+    buffer_column_name = tracking_io.distance_buffer_to_column_name(
+        min_buffer_distance_metres,
+        label_parameter_dict[labels.MAX_DISTANCE_NAME])
+    if buffer_column_name in feature_table:
+        index_column_names.append(buffer_column_name)
+
+    return index_column_names
+
+
+def _check_input_and_output_files(input_feature_file_names,
+                                  output_feature_file_names):
+    """Error-checks input and output files for sampling.
+
+    N = number of input files
+
+    :param input_feature_file_names: length-N list with paths to files
+        containing unsampled feature vectors.
+    :param output_feature_file_names: length-N list with paths to files
+        containing sampled feature vectors.
+    """
+
+    error_checking.assert_is_string_list(input_feature_file_names)
+    error_checking.assert_is_numpy_array(
+        numpy.asarray(input_feature_file_names), num_dimensions=1)
+    for this_file_name in input_feature_file_names:
+        error_checking.assert_file_exists(this_file_name)
+    num_files = len(input_feature_file_names)
+
+    error_checking.assert_is_string_list(output_feature_file_names)
+    error_checking.assert_is_numpy_array(
+        numpy.asarray(output_feature_file_names),
+        exact_dimensions=numpy.array([num_files]))
+
+
+def _check_regression_label_same(index_table, file_index,
+                                 first_regression_label_column_name):
+    """Ensures that file has the same regression label as the first file.
+
+    :param index_table: pandas DataFrame (sampling index or full feature table)
+        for the given file.
+    :param file_index: Index of file (0 for the first file).
+    :param first_regression_label_column_name: Name of regression-label column
+        in the first file.  If file_index = 0, this is ignored.
+    :return: regression_label_column_name: Name of regression-label column in
+        the given file.
+    :raises: ValueError: if file has a different regression label than the
+        first file.
+    """
+
+    regression_label_column_name, _ = _check_label_columns(
+        index_table, require_storm_objects=True)
+    if file_index == 0:
+        return regression_label_column_name
+
+    if regression_label_column_name != first_regression_label_column_name:
+        error_string = (
+            'Files ' + str(file_index + 1) + ' and 1 have different ' +
+            'regression-label columns ("' + regression_label_column_name +
+            '" and "' + first_regression_label_column_name +
+            '", respectively).')
+        raise ValueError(error_string)
+
+    return regression_label_column_name
+
+
+def _write_sampled_features_for_one_file(argument_list):
+    """Writes sampled feature vectors from one file.
+
+    This method is called by _write_sampled_files, possibly in a worker process,
+    so it takes one argument list rather than keyword arguments.
+
+    :param argument_list: List with the following elements.
+    argument_list[0]: Index of file (used only for bookkeeping).
+    argument_list[1]: Path to input file (readable by
+        read_features_for_storm_objects).
+    argument_list[2]: Path to output file.
+    argument_list[3]: 1-D numpy array with indices (rows) of selected storm
+        objects.
+    :return: file_index: Same as argument_list[0].
+    """
+
+    (file_index, input_feature_file_name, output_feature_file_name,
+     selected_indices) = argument_list
+
+    feature_table = read_features_for_storm_objects(input_feature_file_name)
+    write_features_for_storm_objects(
+        feature_table.iloc[selected_indices], output_feature_file_name)
+    return file_index
+
+
+def _write_sampling_manifest(manifest_dict, manifest_file_name):
+    """Writes sampling manifest to Pickle file.
+
+    The file is written to a temporary path and then renamed, so that an
+    interruption never leaves a partial manifest.
+
+    :param manifest_dict: Dictionary with keys listed in
+        _read_sampling_manifest.
+    :param manifest_file_name: Path to output file.
+    """
+
+    file_system_utils.mkdir_recursive_if_necessary(file_name=manifest_file_name)
+
+    temp_file_name = manifest_file_name + '.tmp'
+    pickle_file_handle = open(temp_file_name, 'wb')
+    pickle.dump(manifest_dict, pickle_file_handle)
+    pickle_file_handle.close()
+    os.rename(temp_file_name, manifest_file_name)
+
+
+def _read_sampling_manifest(manifest_file_name):
+    """Reads sampling manifest from Pickle file.
+
+    N = number of input files
+
+    :param manifest_file_name: Path to input file.
+    :return: manifest_dict: Dictionary with the following keys.
+    manifest_dict['input_feature_file_names']: length-N list with paths to
+        files containing unsampled feature vectors.
+    manifest_dict['output_feature_file_names']: length-N list with paths to
+        files containing sampled feature vectors.
+    manifest_dict['sampling_method']: Sampling method.
+    manifest_dict['sampling_param_dict']: Dictionary with parameters of sampling
+        method.
+    manifest_dict['selected_indices_by_file']: length-N list, where each element
+        is a 1-D numpy array with indices (rows) of selected storm objects.
+    manifest_dict['output_file_written_flags']: length-N numpy array of Boolean
+        flags, indicating which output files have already been written.
+    :raises: ValueError: if any of the expected keys are missing.
+    """
+
+    pickle_file_handle = open(manifest_file_name, 'rb')
+    manifest_dict = pickle.load(pickle_file_handle)
+    pickle_file_handle.close()
+
+    missing_keys = list(set(MANIFEST_KEYS) - set(manifest_dict.keys()))
+    if missing_keys:
+        error_string = (
+            '\n\n' + str(missing_keys) + '\n\nKeys listed above were ' +
+            'expected, but not found, in file "' + manifest_file_name + '".')
+        raise ValueError(error_string)
+
+    return manifest_dict
+
+
+def _check_sampling_manifest(
+        manifest_dict, input_feature_file_names=None,
+        output_feature_file_names=None, sampling_method=None,
+        sampling_param_dict=None):
+    """Ensures that sampling manifest matches the current sampling job.
+
+    :param manifest_dict: Dictionary created by _read_sampling_manifest.
+    :param input_feature_file_names: See documentation for
+        sample_many_files_by_min_obs_or_density.
+    :param output_feature_file_names: Same.
+    :param sampling_method: Same.
+    :param sampling_param_dict: Dictionary with parameters of sampling method.
+    :raises: ValueError: if manifest does not match the current job.
+    """
+
+    if (manifest_dict[INPUT_FILE_NAMES_KEY] != input_feature_file_names or
+            manifest_dict[OUTPUT_FILE_NAMES_KEY] != output_feature_file_names):
+        raise ValueError(
+            'Sampling manifest was created with different input or output '
+            'files.')
+
+    if manifest_dict[SAMPLING_METHOD_KEY] != sampling_method:
+        raise ValueError(
+            'Sampling manifest was created with sampling method "' +
+            manifest_dict[SAMPLING_METHOD_KEY] + '", not "' + sampling_method +
+            '".')
+
+    for this_key in sampling_param_dict.keys():
+        if not numpy.allclose(
+                numpy.asarray(manifest_dict[SAMPLING_PARAMS_KEY][this_key]),
+                numpy.asarray(sampling_param_dict[this_key]), atol=TOLERANCE):
+            raise ValueError(
+                'Sampling manifest was created with a different value of "' +
+                this_key + '".')
+
+
+def _write_sampled_files(manifest_dict, manifest_file_name=None,
+                         num_processes=DEFAULT_NUM_PROCESSES_FOR_SAMPLING):
+    """Writes sampled feature vectors (second pass of sampling).
+
+    Output files that the manifest marks as already written are skipped.  If
+    num_processes > 1, files are handled in parallel by a pool of worker
+    processes.  After each file is written, the manifest is updated (if
+    manifest_file_name is not None), so that an interrupted job can be resumed.
+
+    :param manifest_dict: Dictionary with keys listed in
+        _read_sampling_manifest.
+    :param manifest_file_name: Path to manifest file.  If None, the manifest
+        will not be written.
+    :param num_processes: Number of worker processes.
+    """
+
+    input_feature_file_names = manifest_dict[INPUT_FILE_NAMES_KEY]
+    output_feature_file_names = manifest_dict[OUTPUT_FILE_NAMES_KEY]
+    num_files = len(input_feature_file_names)
+
+    file_indices_to_write = numpy.where(
+        numpy.invert(manifest_dict[FILE_WRITTEN_FLAGS_KEY]))[0]
+    num_files_to_write = len(file_indices_to_write)
+    if num_files_to_write == 0:
+        return
+
+    argument_lists = [
+        [i, input_feature_file_names[i], output_feature_file_names[i],
+         manifest_dict[SELECTED_INDICES_BY_FILE_KEY][i]]
+        for i in file_indices_to_write]
+
+    if num_processes == 1 or num_files_to_write <= 1:
+        worker_pool = None
+        file_index_iterator = (
+            _write_sampled_features_for_one_file(a) for a in argument_lists)
+    else:
+        worker_pool = multiprocessing.Pool(
+            processes=min([num_processes, num_files_to_write]))
+        file_index_iterator = worker_pool.imap_unordered(
+            _write_sampled_features_for_one_file, argument_lists)
+
+    try:
+        for this_file_index in file_index_iterator:
+            print ('Wrote sampled data to file ' + str(this_file_index + 1) +
+                   '/' + str(num_files) + ': ' +
+                   output_feature_file_names[this_file_index] + '...')
+
+            manifest_dict[FILE_WRITTEN_FLAGS_KEY][this_file_index] = True
+            if manifest_file_name is not None:
+                _write_sampling_manifest(manifest_dict, manifest_file_name)
+    finally:
+        if worker_pool is not None:
+            worker_pool.close()
+            worker_pool.join()
+
+
+def _get_storm_object_keys(list_of_tables):
+    """Assigns a dense integer key to each storm object.
+
+    Keys are assigned jointly over all tables, so that the same storm object
+    (same storm ID and valid time) has the same key in every table.
+
+    T = number of tables
+    K = number of unique storm objects over all tables
+
+    :param list_of_tables: length-T list of pandas DataFrames, each containing
+        columns "storm_id" and "unix_time_sec".
+    :return: keys_by_table: length-T list, where the [i]th element is a 1-D
+        numpy array of keys (ranging from 0...[K - 1]) for rows in the [i]th
+        table.
+    :return: num_keys: Number of unique keys (K).
+    """
+
+    num_rows_by_table = numpy.array(
+        [len(t.index) for t in list_of_tables], dtype=int)
+
+    storm_id_indices, _ = pandas.factorize(numpy.concatenate(
+        [t[tracking_io.STORM_ID_COLUMN].values for t in list_of_tables]))
+    time_indices, unique_times_unix_sec = pandas.factorize(numpy.concatenate(
+        [t[tracking_io.TIME_COLUMN].values for t in list_of_tables]))
+
+    all_keys, unique_keys = pandas.factorize(
+        storm_id_indices.astype(numpy.int64) * len(unique_times_unix_sec) +
+        time_indices)
+
+    keys_by_table = numpy.split(
+        all_keys, numpy.cumsum(num_rows_by_table)[:-1])
+    return keys_by_table, len(unique_keys)
+
+
+def _join_tables_on_storm_objects(list_of_tables, list_of_column_names):
+    """Joins tables on storm object (inner join).
+
+    This method is equivalent to a sequence of inner merges on "storm_id" and
+    "unix_time_sec" (with the first table on the left).  However, each storm
+    object is assigned an integer key only once (see _get_storm_object_keys),
+    each table is aligned to the first by looking up keys in an array, and
+    each column is copied only once (when taking the aligned rows).
+
+    T = number of tables
+
+    :param list_of_tables: length-T list of pandas DataFrames, each containing
+        columns "storm_id" and "unix_time_sec".
+    :param list_of_column_names: length-T list, where the [i]th element is a
+        list of columns to keep from the [i]th table (not including "storm_id"
+        and "unix_time_sec").  No column may be kept from two tables.
+    :return: joined_table: pandas DataFrame with columns "storm_id",
+        "unix_time_sec", and all columns in `list_of_column_names`.  Rows are
+        storm objects found in every table, in the order of the first table.
+    :raises: ValueError: if any table contains the same storm object twice.
+    """
+
+    keys_by_table, num_keys = _get_storm_object_keys(list_of_tables)
+    num_tables = len(list_of_tables)
+
+    for i in range(num_tables):
+        if numpy.any(numpy.bincount(keys_by_table[i], minlength=1) > 1):
+            error_string = (
+                'Table ' + str(i + 1) + ' contains the same storm object '
+                '(storm ID and valid time) more than once.')
+            raise ValueError(error_string)
+
+    row_indices_by_table = [None] * num_tables
+    for i in range(num_tables):
+        these_row_by_key = numpy.full(num_keys, -1, dtype=int)
+        these_row_by_key[keys_by_table[i]] = numpy.linspace(
+            0, len(keys_by_table[i]) - 1, num=len(keys_by_table[i]),
+            dtype=int)
+        row_indices_by_table[i] = these_row_by_key[keys_by_table[0]]
+
+    found_flags = numpy.all(
+        numpy.vstack([r >= 0 for r in row_indices_by_table]), axis=0)
+    found_indices = numpy.where(found_flags)[0]
+
+    these_column_names = COLUMNS_TO_MERGE_ON + list_of_column_names[0]
+    joined_table = list_of_tables[0].take(
+        row_indices_by_table[0][found_indices])
+    if list(joined_table) != these_column_names:
+        joined_table = joined_table[these_column_names]
+    joined_table.index = pandas.RangeIndex(len(found_indices))
+
+    # The rows taken above are already a copy, so columns from other tables can
+    # be added in place (without consolidating a new copy of the whole table).
+    joined_table = pandas.DataFrame(joined_table, copy=False)
+
+    for i in range(1, num_tables):
+        these_row_indices = row_indices_by_table[i][found_indices]
+        for this_column_name in list_of_column_names[i]:
+            joined_table[this_column_name] = list_of_tables[i][
+                this_column_name].values[these_row_indices]
+
+    return joined_table
+
+
+def _check_file_extension(file_extension):
+    """Error-checks file extension for feature vectors.
+
+    :param file_extension: File extension (must be in list
+        `VALID_FILE_EXTENSIONS`).
+    :raises: ValueError: if file extension is not in list
+        `VALID_FILE_EXTENSIONS`.
+    """
+
+    error_checking.assert_is_string(file_extension)
+    if file_extension not in VALID_FILE_EXTENSIONS:
+        error_string = (
+            '\n\n' + str(VALID_FILE_EXTENSIONS) + '\n\nValid file ' +
+            'extensions (listed above) do not include "' + file_extension +
+            '".')
+        raise ValueError(error_string)
+
+
+def _get_feature_store_types(feature_table):
+    """Returns NetCDF type for each column to be written to feature store.
+
+    Features and regression labels are stored as 32-bit floats.  Storm IDs are
+    stored as variable-length strings.  Polygons (storm outlines and distance
+    buffers) are not stored.
+
+    :param feature_table: pandas DataFrame created by
+        join_features_and_label_for_storm_objects.
+    :return: column_type_dict: Dictionary, where each key is a column name and
+        each value is a NetCDF data type.
+    """
+
+    (feature_column_names,
+     regression_label_column_name,
+     classification_label_column_name) = check_feature_table(
+         feature_table, require_storm_objects=True)
+
+    column_type_dict = {tracking_io.STORM_ID_COLUMN: str}
+    column_type_dict.update(FEATURE_STORE_INTEGER_COLUMN_TYPE_DICT)
+    for this_column_name in feature_column_names:
+        column_type_dict[this_column_name] = FEATURE_STORE_FLOAT_TYPE
+
+    if regression_label_column_name is not None:
+        column_type_dict[
+            regression_label_column_name] = FEATURE_STORE_FLOAT_TYPE
+    if classification_label_column_name is not None:
+        column_type_dict[
+            classification_label_column_name] = FEATURE_STORE_CLASS_LABEL_TYPE
+
+    return column_type_dict
+
+
+def _check_feature_store_columns(feature_store_dict, column_names):
+    """Ensures that feature store contains the desired columns.
+
+    :param feature_store_dict: Dictionary created by open_feature_store.
+    :param column_names: 1-D list of desired columns.
+    :raises: ValueError: if any desired column is not in the feature store.
+    """
+
+    error_checking.assert_is_string_list(column_names)
+    error_checking.assert_is_numpy_array(
+        numpy.asarray(column_names), num_dimensions=1)
+
+    missing_column_names = [
+        c for c in column_names
+        if c not in feature_store_dict[STORE_COLUMNS_KEY]]
+    if missing_column_names:
+        error_string = (
+            '\n\n' + str(missing_column_names) + '\n\nColumns listed above ' +
+            'are not in the feature store.')
+        raise ValueError(error_string)
+
+
+def _read_columns_from_feature_store(
+        feature_store_dict, column_names, storm_object_indices):
+    """Reads columns from feature store.
+
+    Each file is opened only if it contains at least one of the desired storm
+    objects, and only the desired columns are read.
+
+    :param feature_store_dict: Dictionary created by open_feature_store.
+    :param column_names: 1-D list of columns to read.
+    :param storm_object_indices: 1-D numpy array with overall indices of storm
+        objects to read (sorted in ascending order).
+    :return: column_dict: Dictionary, where each key is a column name and each
+        value is a 1-D numpy array.
+    """
+
+    num_objects_by_file = numpy.array(
+        [len(t) for t in feature_store_dict[STORE_TIMES_BY_FILE_KEY]],
+        dtype=int)
+    indices_by_file = _indices_from_overall_to_file_specific(
+        storm_object_indices, num_objects_by_file)
+
+    list_of_column_dicts = []
+    for i in range(len(indices_by_file)):
+        these_indices = indices_by_file[i].astype(int)
+        if not len(these_indices):
+            continue
+
+        this_first_index = these_indices[0]
+        this_row_slice = slice(this_first_index, these_indices[-1] + 1)
+        these_indices = these_indices - this_first_index
+
+        netcdf_dataset = netCDF4.Dataset(
+            feature_store_dict[STORE_FILE_NAMES_KEY][i])
+        netcdf_dataset.set_auto_mask(False)
+
+        this_column_dict = {}
+        for this_column_name in column_names:
+            this_column_dict[this_column_name] = netcdf_dataset.variables[
+                this_column_name][this_row_slice][these_indices]
+
+            if this_column_name == tracking_io.STORM_ID_COLUMN:
+                this_column_dict[this_column_name] = numpy.array([
+                    s.encode('utf-8') for s in
+                    this_column_dict[this_column_name]])
+
+        netcdf_dataset.close()
+        list_of_column_dicts.append(this_column_dict)
+
+    column_dict = {}
+    for this_column_name in column_names:
+        if list_of_column_dicts:
+            column_dict[this_column_name] = numpy.concatenate(
+                [d[this_column_name] for d in list_of_column_dicts])
+        else:
+            column_dict[this_column_name] = numpy.array([])
+
+    return column_dict
+
+
+def _find_rows_in_feature_store(
+        feature_store_dict, storm_object_indices=None, start_time_unix_sec=None,
+        end_time_unix_sec=None):
+    """Finds rows (storm objects) to read from feature store.
+
+    :param feature_store_dict: Dictionary created by open_feature_store.
+    :param storm_object_indices: 1-D numpy array with overall indices of storm
+        objects (into the virtual dataset).  If None, will consider all storm
+        objects.
+    :param start_time_unix_sec: Start time.  Storm objects before this time will
+        not be read.  If None, there is no start time.
+    :param end_time_unix_sec: End time.  Storm objects after this time will not
+        be read.  If None, there is no end time.
+    :return: storm_object_indices: 1-D numpy array with overall indices of storm
+        objects to read, sorted in ascending order.
+    """
+
+    storm_times_unix_sec = get_feature_store_times(feature_store_dict)
+    num_storm_objects = len(storm_times_unix_sec)
+
+    if storm_object_indices is None:
+        storm_object_indices = numpy.linspace(
+            0, num_storm_objects - 1, num=num_storm_objects, dtype=int)
+    else:
+        error_checking.assert_is_integer_numpy_array(storm_object_indices)
+        error_checking.assert_is_geq_numpy_array(storm_object_indices, 0)
+        error_checking.assert_is_less_than_numpy_array(
+            storm_object_indices, num_storm_objects)
+        storm_object_indices = numpy.unique(storm_object_indices)
+
+    good_flags = numpy.full(len(storm_object_indices), True, dtype=bool)
+    if start_time_unix_sec is not None:
+        error_checking.assert_is_integer(start_time_unix_sec)
+        good_flags = numpy.logical_and(
+            good_flags,
+            storm_times_unix_sec[storm_object_indices] >= start_time_unix_sec)
+    if end_time_unix_sec is not None:
+        error_checking.assert_is_integer(end_time_unix_sec)
+        good_flags = numpy.logical_and(
+            good_flags,
+            storm_times_unix_sec[storm_object_indices] <= end_time_unix_sec)
+
+    return storm_object_indices[good_flags]
+
+
+def check_feature_table(feature_table, require_storm_objects=True):
+    """Ensures that pandas DataFrame contains features and labels.
+
+    feature_table must contain one or more feature columns.
+    feature_table must contain either 1 or 2 label columns.  If 2 columns, there
+    must be one regression label L_r and one classification label L_c, where L_r
+    is the regression version of L_c.
+
+    :param feature_table: pandas DataFrame.
+    :param require_storm_objects: Boolean flag.  If True, feature_table must
+        contain columns "storm_id" and "unix_time_sec".  If False, feature_table
+        does not need these columns.
+    :return: feature_column_names: 1-D list containing names of columns with
+        features.
+    :return: regression_label_column_name: Name of column with regression label.
+        If there is no regression label, this will be None.
+    :return: classification_label_column_name: Name of column with
+        classification label.  If there is no regression label, this will be
+        None.
+    :raises: ValueError: if feature_table does not contain any feature columns.
+    :raises: ValueError: if feature_table does not contain exactly one label
+        column.
+    """
+
+    feature_column_names = radar_stats.get_statistic_columns(feature_table)
+
+    shape_stat_column_names = shape_stats.get_statistic_columns(feature_table)
+    if shape_stat_column_names:
+        if feature_column_names:
+            feature_column_names += shape_stat_column_names
+        else:
+            feature_column_names = shape_stat_column_names
+
+    sounding_stat_column_names = soundings.get_sounding_stat_columns(
+        feature_table)
+    if sounding_stat_column_names:
+        if feature_column_names:
+            feature_column_names += sounding_stat_column_names
+        else:
+            feature_column_names = sounding_stat_column_names
+
+    if feature_column_names is None:
+        raise ValueError(
+            'feature_table does not contain any columns with features '
+            '(predictor variables).')
+
+    regression_label_column_name, classification_label_column_name = (
+        _check_label_columns(
+            feature_table, require_storm_objects=require_storm_objects))
+
     return (feature_column_names, regression_label_column_name,
             classification_label_column_name)
 
@@ -490,37 +1091,26 @@ def join_features_and_label_for_storm_objects(
         defining the outline of the storm object.
     """
 
-    feature_table = None
+    list_of_tables = []
+    list_of_column_names = []
 
     if radar_statistic_table is not None:
         radar_stat_column_names = radar_stats.check_statistic_table(
             radar_statistic_table, require_storm_objects=True)
-        feature_table = radar_statistic_table[
-            COLUMNS_TO_MERGE_ON + radar_stat_column_names]
+        list_of_tables.append(radar_statistic_table)
+        list_of_column_names.append(radar_stat_column_names)
 
     if shape_statistic_table is not None:
         shape_stat_column_names = shape_stats.check_statistic_table(
             shape_statistic_table, require_storm_objects=True)
-        shape_statistic_table = shape_statistic_table[
-            COLUMNS_TO_MERGE_ON + shape_stat_column_names]
-
-        if feature_table is None:
-            feature_table = shape_statistic_table
-        else:
-            feature_table = feature_table.merge(
-                shape_statistic_table, on=COLUMNS_TO_MERGE_ON, how='inner')
+        list_of_tables.append(shape_statistic_table)
+        list_of_column_names.append(shape_stat_column_names)
 
     if sounding_stat_table is not None:
         sounding_stat_column_names = soundings.check_sounding_stat_table(
             sounding_stat_table, require_storm_objects=True)
-        sounding_stat_table = sounding_stat_table[
-            COLUMNS_TO_MERGE_ON + sounding_stat_column_names]
-
-        if feature_table is None:
-            feature_table = sounding_stat_table
-        else:
-            feature_table = feature_table.merge(
-                sounding_stat_table, on=COLUMNS_TO_MERGE_ON, how='inner')
+        list_of_tables.append(sounding_stat_table)
+        list_of_column_names.append(sounding_stat_column_names)
 
     label_parameter_dict = labels.column_name_to_label_params(label_column_name)
     if label_parameter_dict[labels.CLASS_CUTOFFS_NAME] is None:
@@ -546,11 +1136,15 @@ def join_features_and_label_for_storm_objects(
     if distance_buffer_column_names is None:
         distance_buffer_column_names = []
 
-    storm_to_winds_table = storm_to_winds_table[
-        STORM_TO_WIND_COLUMNS_TO_KEEP + label_column_names +
-        distance_buffer_column_names]
-    return feature_table.merge(
-        storm_to_winds_table, on=COLUMNS_TO_MERGE_ON, how='inner')
+    storm_to_wind_columns_to_keep = [
+        c for c in STORM_TO_WIND_COLUMNS_TO_KEEP
+        if c not in COLUMNS_TO_MERGE_ON]
+
+    list_of_tables.append(storm_to_winds_table)
+    list_of_column_names.append(
+        storm_to_wind_columns_to_keep + label_column_names +
+        distance_buffer_column_names)
+    return _join_tables_on_storm_objects(list_of_tables, list_of_column_names)
 
 
 def sample_by_min_observations(
@@ -616,7 +1210,7 @@ def sample_by_min_observations_plus(
     error_checking.assert_is_greater(min_observations, 0)
     error_checking.assert_is_boolean(return_table)
 
-    _, _, classification_label_column_name = check_feature_table(
+    _, classification_label_column_name = _check_label_columns(
         feature_table, require_storm_objects=True)
     label_parameter_dict = labels.column_name_to_label_params(
         classification_label_column_name)
@@ -701,7 +1295,7 @@ def sample_by_min_obs_density_plus(
     feature_table, observation_densities_m02 = _get_observation_densities(
         feature_table)
 
-    _, _, classification_label_column_name = check_feature_table(
+    _, classification_label_column_name = _check_label_columns(
         feature_table, require_storm_objects=True)
     label_parameter_dict = labels.column_name_to_label_params(
         classification_label_column_name)
@@ -756,7 +1350,7 @@ def sample_by_uniform_wind_speed(
         [i]th storm object.
     """
 
-    _, regression_label_column_name, _ = check_feature_table(
+    regression_label_column_name, _ = _check_label_columns(
         feature_table, require_storm_objects=True)
     speed_category_by_storm_object = classifn_utils.classify_values(
         feature_table[regression_label_column_name].values, cutoffs_m_s01,
@@ -782,13 +1376,20 @@ def sample_many_files_by_min_obs_or_density(
         input_feature_file_names, output_feature_file_names,
         sampling_method=None,
         min_observations=DEFAULT_MIN_OBSERVATIONS_FOR_SAMPLING,
-        min_observation_density_m02=DEFAULT_MIN_OBS_DENSITY_FOR_SAMPLING_M02):
+        min_observation_density_m02=DEFAULT_MIN_OBS_DENSITY_FOR_SAMPLING_M02,
+        num_processes=DEFAULT_NUM_PROCESSES_FOR_SAMPLING,
+        manifest_file_name=None):
     """Samples feature vectors from many files.
 
     For any sampling method other than "uniform_wind_speed".  To sample from
     many files with the "uniform_wind_speed" method, see
     sample_many_files_by_uniform_wind_speed.
 
+    Sampling is done in two passes.  The first pass reads only the sampling
+    index for each input file (see read_sampling_index) and selects storm
+    objects.  The second pass reads full feature tables and writes selected
+    storm objects, possibly in parallel (see _write_sampled_files).
+
     N = number of input files
 
     :param input_feature_file_names: length-N list with paths to files
@@ -800,24 +1401,23 @@ def sample_many_files_by_min_obs_or_density(
     :param min_observations: See documentation for sample_by_min_observations.
     :param min_observation_density_m02: See documentation for
         sample_by_min_obs_density.
+    :param num_processes: Number of worker processes for the second pass.
+    :param manifest_file_name: Path to manifest file (Pickle), which records
+        storm objects selected in the first pass and output files written in the
+        second pass.  If the file exists, the first pass is skipped and output
+        files already written are not written again, so an interrupted job can
+        be resumed.  If None, no manifest is used.
     :raises: ValueError: All input files must have the same label columns.  In
         other words, labels must have been created with the same params for each
         file.
     :raises: ValueError: if sampling method is invalid.
+    :raises: ValueError: if manifest was created for a different sampling job.
     """
 
-    error_checking.assert_is_string_list(input_feature_file_names)
-    error_checking.assert_is_numpy_array(
-        numpy.asarray(input_feature_file_names), num_dimensions=1)
-    for this_file_name in input_feature_file_names:
-        error_checking.assert_file_exists(this_file_name)
+    _check_input_and_output_files(
+        input_feature_file_names, output_feature_file_names)
     num_files = len(input_feature_file_names)
 
-    error_checking.assert_is_string_list(output_feature_file_names)
-    error_checking.assert_is_numpy_array(
-        numpy.asarray(output_feature_file_names),
-        exact_dimensions=numpy.array([num_files]))
-
     error_checking.assert_is_string(sampling_method)
     if sampling_method not in NON_UNIFORM_SAMPLING_METHODS:
         error_string = (
@@ -826,52 +1426,57 @@ def sample_many_files_by_min_obs_or_density(
             '"; listed above) do not include "' + sampling_method + '".')
         raise ValueError(error_string)
 
+    error_checking.assert_is_integer(num_processes)
+    error_checking.assert_is_greater(num_processes, 0)
+
+    sampling_param_dict = {
+        MIN_OBSERVATIONS_PARAM_NAME: min_observations,
+        MIN_DENSITY_PARAM_NAME: min_observation_density_m02
+    }
+
+    if manifest_file_name is not None and os.path.isfile(manifest_file_name):
+        manifest_dict = _read_sampling_manifest(manifest_file_name)
+        _check_sampling_manifest(
+            manifest_dict, input_feature_file_names=input_feature_file_names,
+            output_feature_file_names=output_feature_file_names,
+            sampling_method=sampling_method,
+            sampling_param_dict=sampling_param_dict)
+
+        _write_sampled_files(
+            manifest_dict, manifest_file_name=manifest_file_name,
+            num_processes=num_processes)
+        return
+
     live_selected_indices_by_file = [None] * num_files
     live_indices_by_file = [None] * num_files
     dead_indices_by_file = [None] * num_files
     num_storm_objects_by_file = numpy.full(num_files, 0, dtype=int)
+    regression_label_column_name = None
 
     for i in range(num_files):
-        file_system_utils.mkdir_recursive_if_necessary(
-            file_name=output_feature_file_names[i])
-
         print ('Sampling data from file ' + str(i + 1) + '/' + str(num_files) +
                ': ' + input_feature_file_names[i] + '...')
 
-        this_feature_table = read_features_for_storm_objects(
-            input_feature_file_names[i])
-
-        if i == 0:
-            _, regression_label_column_name, _ = check_feature_table(
-                this_feature_table, require_storm_objects=True)
-        else:
-            _, this_regression_label_column_name, _ = check_feature_table(
-                this_feature_table, require_storm_objects=True)
-            if (this_regression_label_column_name !=
-                    regression_label_column_name):
-                error_string = (
-                    'Files ' + str(i + 1) + ' and 1 have different regression-'
-                    + 'label columns ("' + this_regression_label_column_name +
-                    '" and "' + regression_label_column_name +
-                    '", respectively).')
-                raise ValueError(error_string)
+        this_index_table = read_sampling_index(input_feature_file_names[i])
+        regression_label_column_name = _check_regression_label_same(
+            this_index_table, i, regression_label_column_name)
 
         if sampling_method == MIN_OBS_SAMPLING_METHOD:
             _, this_metadata_dict = sample_by_min_observations(
-                this_feature_table, min_observations=min_observations,
+                this_index_table, min_observations=min_observations,
                 return_table=False)
         elif sampling_method == MIN_OBS_PLUS_SAMPLING_METHOD:
             _, this_metadata_dict = sample_by_min_observations_plus(
-                this_feature_table, min_observations=min_observations,
+                this_index_table, min_observations=min_observations,
                 return_table=False)
         elif sampling_method == MIN_DENSITY_SAMPLING_METHOD:
             _, this_metadata_dict = sample_by_min_obs_density(
-                this_feature_table,
+                this_index_table,
                 min_observation_density_m02=min_observation_density_m02,
                 return_table=False)
         elif sampling_method == MIN_DENSITY_PLUS_SAMPLING_METHOD:
             _, this_metadata_dict = sample_by_min_obs_density_plus(
-                this_feature_table,
+                this_index_table,
                 min_observation_density_m02=min_observation_density_m02,
                 return_table=False)
 
@@ -879,7 +1484,7 @@ def sample_many_files_by_min_obs_or_density(
             LIVE_SELECTED_INDICES_KEY]
         live_indices_by_file[i] = this_metadata_dict[LIVE_INDICES_KEY]
         dead_indices_by_file[i] = this_metadata_dict[DEAD_INDICES_KEY]
-        num_storm_objects_by_file[i] = len(this_feature_table.index)
+        num_storm_objects_by_file[i] = len(this_index_table.index)
 
     live_selected_indices = _indices_from_file_specific_to_overall(
         live_selected_indices_by_file, num_storm_objects_by_file)
@@ -891,25 +1496,34 @@ def sample_many_files_by_min_obs_or_density(
     selected_indices = _select_dead_storms(
         live_indices=live_indices, dead_indices=dead_indices,
         live_selected_indices=live_selected_indices)
-    selected_indices_by_file = _indices_from_overall_to_file_specific(
-        selected_indices, num_storm_objects_by_file)
 
-    for i in range(num_files):
-        print ('Writing sampled data to file ' + str(i - 1) + '/' +
-               str(num_files) + ': ' + output_feature_file_names[i] + '...')
+    manifest_dict = {
+        INPUT_FILE_NAMES_KEY: input_feature_file_names,
+        OUTPUT_FILE_NAMES_KEY: output_feature_file_names,
+        SAMPLING_METHOD_KEY: sampling_method,
+        SAMPLING_PARAMS_KEY: sampling_param_dict,
+        SELECTED_INDICES_BY_FILE_KEY: _indices_from_overall_to_file_specific(
+            selected_indices.astype(int), num_storm_objects_by_file),
+        FILE_WRITTEN_FLAGS_KEY: numpy.full(num_files, False, dtype=bool)
+    }
 
-        this_feature_table = read_features_for_storm_objects(
-            input_feature_file_names[i])
-        write_features_for_storm_objects(
-            this_feature_table.iloc[selected_indices_by_file[i]],
-            output_feature_file_names[i])
+    if manifest_file_name is not None:
+        _write_sampling_manifest(manifest_dict, manifest_file_name)
+    _write_sampled_files(
+        manifest_dict, manifest_file_name=manifest_file_name,
+        num_processes=num_processes)
 
 
 def sample_many_files_by_uniform_wind_speed(
         input_feature_file_names, output_feature_file_names,
-        cutoffs_m_s01=DEFAULT_CUTOFFS_FOR_UNIFORM_SAMPLING_M_S01):
+        cutoffs_m_s01=DEFAULT_CUTOFFS_FOR_UNIFORM_SAMPLING_M_S01,
+        num_processes=DEFAULT_NUM_PROCESSES_FOR_SAMPLING,
+        manifest_file_name=None):
     """Samples feature vectors from many files by "uniform_wind_speed" method.
 
+    Sampling is done in two passes, as in
+    sample_many_files_by_min_obs_or_density.
+
     N = number of input files
 
     :param input_feature_file_names: length-N list with paths to files
@@ -917,54 +1531,52 @@ def sample_many_files_by_uniform_wind_speed(
     :param output_feature_file_names: length-N list with paths to files
         containing sampled feature vectors.
     :param cutoffs_m_s01: See documentation for sample_by_uniform_wind_speed.
+    :param num_processes: See documentation for
+        sample_many_files_by_min_obs_or_density.
+    :param manifest_file_name: Same.
     :raises: ValueError: All input files must have the same label columns.  In
         other words, labels must have been created with the same params for each
         file.
+    :raises: ValueError: if manifest was created for a different sampling job.
     """
 
-    error_checking.assert_is_string_list(input_feature_file_names)
-    error_checking.assert_is_numpy_array(
-        numpy.asarray(input_feature_file_names), num_dimensions=1)
-    for this_file_name in input_feature_file_names:
-        error_checking.assert_file_exists(this_file_name)
+    _check_input_and_output_files(
+        input_feature_file_names, output_feature_file_names)
     num_files = len(input_feature_file_names)
 
-    error_checking.assert_is_string_list(output_feature_file_names)
-    error_checking.assert_is_numpy_array(
-        numpy.asarray(output_feature_file_names),
-        exact_dimensions=numpy.array([num_files]))
+    error_checking.assert_is_integer(num_processes)
+    error_checking.assert_is_greater(num_processes, 0)
+
+    sampling_param_dict = {CUTOFFS_PARAM_NAME: cutoffs_m_s01}
+
+    if manifest_file_name is not None and os.path.isfile(manifest_file_name):
+        manifest_dict = _read_sampling_manifest(manifest_file_name)
+        _check_sampling_manifest(
+            manifest_dict, input_feature_file_names=input_feature_file_names,
+            output_feature_file_names=output_feature_file_names,
+            sampling_method=UNIFORM_SAMPLING_METHOD,
+            sampling_param_dict=sampling_param_dict)
+
+        _write_sampled_files(
+            manifest_dict, manifest_file_name=manifest_file_name,
+            num_processes=num_processes)
+        return
 
     speed_category_by_storm_object = numpy.array([], dtype=int)
     num_observations_by_storm_object = numpy.array([], dtype=int)
     num_storm_objects_by_file = numpy.full(num_files, 0, dtype=int)
+    regression_label_column_name = None
 
     for i in range(num_files):
-        file_system_utils.mkdir_recursive_if_necessary(
-            file_name=output_feature_file_names[i])
-
-        print ('Sampling data from file ' + str(i - 1) + '/' + str(num_files) +
+        print ('Sampling data from file ' + str(i + 1) + '/' + str(num_files) +
                ': ' + input_feature_file_names[i] + '...')
 
-        this_feature_table = read_features_for_storm_objects(
-            input_feature_file_names[i])
-
-        if i == 0:
-            _, regression_label_column_name, _ = check_feature_table(
-                this_feature_table, require_storm_objects=True)
-        else:
-            _, this_regression_label_column_name, _ = check_feature_table(
-                this_feature_table, require_storm_objects=True)
-            if (this_regression_label_column_name !=
-                    regression_label_column_name):
-                error_string = (
-                    'Files ' + str(i + 1) + ' and 1 have different regression-'
-                    + 'label columns ("' + this_regression_label_column_name +
-                    '" and "' + regression_label_column_name +
-                    '", respectively).')
-                raise ValueError(error_string)
+        this_index_table = read_sampling_index(input_feature_file_names[i])
+        regression_label_column_name = _check_regression_label_same(
+            this_index_table, i, regression_label_column_name)
 
         _, this_metadata_dict = sample_by_uniform_wind_speed(
-            this_feature_table, cutoffs_m_s01=cutoffs_m_s01, return_table=False)
+            this_index_table, cutoffs_m_s01=cutoffs_m_s01, return_table=False)
 
         speed_category_by_storm_object = numpy.concatenate((
             speed_category_by_storm_object,
@@ -972,38 +1584,54 @@ def sample_many_files_by_uniform_wind_speed(
         num_observations_by_storm_object = numpy.concatenate((
             num_observations_by_storm_object,
             this_metadata_dict[NUM_OBSERVATIONS_KEY]))
-        num_storm_objects_by_file[i] = len(this_feature_table.index)
+        num_storm_objects_by_file[i] = len(this_index_table.index)
 
     selected_indices = _select_storms_uniformly_by_category(
         speed_category_by_storm_object, num_observations_by_storm_object)
-    selected_indices_by_file = _indices_from_overall_to_file_specific(
-        selected_indices, num_storm_objects_by_file)
 
-    for i in range(num_files):
-        print ('Writing sampled data to file ' + str(i - 1) + '/' +
-               str(num_files) + ': ' + output_feature_file_names[i] + '...')
-
-        this_feature_table = read_features_for_storm_objects(
-            input_feature_file_names[i])
-        write_features_for_storm_objects(
-            this_feature_table.iloc[selected_indices_by_file[i]],
-            output_feature_file_names[i])
-
-
-def write_features_for_storm_objects(feature_table, pickle_file_name):
+    manifest_dict = {
+        INPUT_FILE_NAMES_KEY: input_feature_file_names,
+        OUTPUT_FILE_NAMES_KEY: output_feature_file_names,
+        SAMPLING_METHOD_KEY: UNIFORM_SAMPLING_METHOD,
+        SAMPLING_PARAMS_KEY: sampling_param_dict,
+        SELECTED_INDICES_BY_FILE_KEY: _indices_from_overall_to_file_specific(
+            selected_indices.astype(int), num_storm_objects_by_file),
+        FILE_WRITTEN_FLAGS_KEY: numpy.full(num_files, False, dtype=bool)
+    }
+
+    if manifest_file_name is not None:
+        _write_sampling_manifest(manifest_dict, manifest_file_name)
+    _write_sampled_files(
+        manifest_dict, manifest_file_name=manifest_file_name,
+        num_processes=num_processes)
+
+
+def write_features_for_storm_objects(
+        feature_table, pickle_file_name, write_sampling_index=True):
     """Writes features for storm objects to a Pickle file.
 
     :param feature_table: pandas DataFrame created by
         join_features_and_label_for_storm_objects.
     :param pickle_file_name: Path to output file.
+    :param write_sampling_index: Boolean flag.  If True, will also write the
+        sampling index (columns needed to sample feature vectors; see
+        _get_sampling_index_columns) to a separate, much smaller, Pickle file.
+        The location of this file is given by find_sampling_index_file.  If
+        False, any existing sampling index for pickle_file_name will be
+        deleted, since it would no longer match the feature file.
     """
 
+    error_checking.assert_is_boolean(write_sampling_index)
+
     (feature_column_names,
      regression_label_column_name,
      classification_label_column_name) = check_feature_table(
          feature_table, require_storm_objects=True)
     distance_buffer_column_names = tracking_io.get_distance_buffer_columns(
         feature_table)
+    if distance_buffer_column_names is None:
+        distance_buffer_column_names = []
+
     columns_to_write = (
         STORM_TO_WIND_COLUMNS_TO_KEEP + feature_column_names +
         distance_buffer_column_names)
@@ -1018,6 +1646,17 @@ def write_features_for_storm_objects(feature_table, pickle_file_name):
     pickle.dump(feature_table[columns_to_write], pickle_file_handle)
     pickle_file_handle.close()
 
+    index_file_name = find_sampling_index_file(pickle_file_name)
+    if not write_sampling_index:
+        if os.path.isfile(index_file_name):
+            os.remove(index_file_name)
+        return
+
+    pickle_file_handle = open(index_file_name, 'wb')
+    pickle.dump(feature_table[_get_sampling_index_columns(feature_table)],
+                pickle_file_handle)
+    pickle_file_handle.close()
+
 
 def read_features_for_storm_objects(pickle_file_name):
     """Reads features for storm objects from a Pickle file.
@@ -1035,9 +1674,239 @@ def read_features_for_storm_objects(pickle_file_name):
     return feature_table
 
 
+def find_sampling_index_file(feature_file_name):
+    """Locates sampling index for file with feature vectors.
+
+    :param feature_file_name: Path to file with feature vectors.
+    :return: index_file_name: Path to sampling index (file may or may not
+        exist).
+    """
+
+    error_checking.assert_is_string(feature_file_name)
+    file_name_without_extension, file_extension = os.path.splitext(
+        feature_file_name)
+    return '{0:s}{1:s}{2:s}'.format(
+        file_name_without_extension, SAMPLING_INDEX_FILE_SUFFIX,
+        file_extension)
+
+
+def read_sampling_index(feature_file_name):
+    """Reads sampling index for file with feature vectors.
+
+    If the sampling index does not exist (e.g., the feature file was written
+    before sampling indices were introduced), this method reads the full
+    feature file and keeps only the relevant columns.
+
+    :param feature_file_name: Path to file with feature vectors.
+    :return: index_table: pandas DataFrame with columns listed in
+        _get_sampling_index_columns.
+    """
+
+    index_file_name = find_sampling_index_file(feature_file_name)
+    if not os.path.isfile(index_file_name):
+        feature_table = read_features_for_storm_objects(feature_file_name)
+        return feature_table[_get_sampling_index_columns(feature_table)]
+
+    pickle_file_handle = open(index_file_name, 'rb')
+    index_table = pickle.load(pickle_file_handle)
+    pickle_file_handle.close()
+
+    _check_label_columns(index_table, require_storm_objects=True)
+    return index_table
+
+
+def write_feature_store(feature_table, netcdf_file_name):
+    """Writes features for storm objects to columnar NetCDF file.
+
+    Unlike write_features_for_storm_objects, this method writes each column to a
+    separate (chunked and compressed) NetCDF variable, so that subsets of
+    columns and rows can be read without reading the whole file.  Polygons are
+    not written, so sampling should still be done with Pickle files.
+
+    N = number of storm objects
+
+    :param feature_table: N-row pandas DataFrame created by
+        join_features_and_label_for_storm_objects.
+    :param netcdf_file_name: Path to output file.
+    """
+
+    column_type_dict = _get_feature_store_types(feature_table)
+    num_storm_objects = len(feature_table.index)
+
+    file_system_utils.mkdir_recursive_if_necessary(file_name=netcdf_file_name)
+    netcdf_dataset = netCDF4.Dataset(
+        netcdf_file_name, 'w', format='NETCDF4')
+    netcdf_dataset.createDimension(
+        FEATURE_STORE_ROW_DIMENSION, num_storm_objects)
+
+    columns_to_write = [
+        c for c in list(feature_table) if c in column_type_dict]
+
+    for this_column_name in columns_to_write:
+        if column_type_dict[this_column_name] is str:
+            netcdf_dataset.createVariable(
+                this_column_name, str, (FEATURE_STORE_ROW_DIMENSION,))
+            if num_storm_objects > 0:
+                netcdf_dataset.variables[this_column_name][:] = numpy.array(
+                    feature_table[this_column_name].values, dtype=object)
+            continue
+
+        if num_storm_objects > 0:
+            these_chunk_sizes = (
+                min([num_storm_objects, FEATURE_STORE_CHUNK_SIZE]),)
+        else:
+            these_chunk_sizes = None
+
+        netcdf_dataset.createVariable(
+            this_column_name, column_type_dict[this_column_name],
+            (FEATURE_STORE_ROW_DIMENSION,), zlib=True,
+            chunksizes=these_chunk_sizes)
+        if num_storm_objects > 0:
+            netcdf_dataset.variables[this_column_name][:] = feature_table[
+                this_column_name].values
+
+    netcdf_dataset.close()
+
+
+def open_feature_store(netcdf_file_names):
+    """Opens one or more feature-store files as a single virtual dataset.
+
+    Only column names and storm times are read, so this method is fast even for
+    many large files.  Rows of the virtual dataset are storm objects from the
+    first file, then storm objects from the second file, and so on.
+
+    N = number of files
+
+    :param netcdf_file_names: length-N list with paths to files created by
+        write_feature_store.
+    :return: feature_store_dict: Dictionary with the following keys.
+    feature_store_dict['feature_store_file_names']: Same as input.
+    feature_store_dict['column_names']: 1-D list with names of columns in
+        feature store.
+    feature_store_dict['storm_times_by_file_unix_sec']: length-N list, where the
+        [i]th element is a 1-D numpy array with valid times of storm objects in
+        the [i]th file.
+    :raises: ValueError: if files do not all have the same columns.
+    """
+
+    error_checking.assert_is_string_list(netcdf_file_names)
+    error_checking.assert_is_numpy_array(
+        numpy.asarray(netcdf_file_names), num_dimensions=1)
+
+    num_files = len(netcdf_file_names)
+    storm_times_by_file_unix_sec = [None] * num_files
+    column_names = None
+
+    for i in range(num_files):
+        error_checking.assert_file_exists(netcdf_file_names[i])
+        netcdf_dataset = netCDF4.Dataset(netcdf_file_names[i])
+        netcdf_dataset.set_auto_mask(False)
+
+        these_column_names = [
+            str(c) for c in netcdf_dataset.variables.keys()]
+        storm_times_by_file_unix_sec[i] = netcdf_dataset.variables[
+            tracking_io.TIME_COLUMN][:].astype(int)
+        netcdf_dataset.close()
+
+        if column_names is None:
+            column_names = these_column_names
+        elif set(these_column_names) != set(column_names):
+            error_string = (
+                'Files ' + str(i + 1) + ' and 1 ("' + netcdf_file_names[i] +
+                '" and "' + netcdf_file_names[0] + '") have different '
+                'columns.')
+            raise ValueError(error_string)
+
+    return {
+        STORE_FILE_NAMES_KEY: netcdf_file_names,
+        STORE_COLUMNS_KEY: column_names,
+        STORE_TIMES_BY_FILE_KEY: storm_times_by_file_unix_sec
+    }
+
+
+def get_feature_store_times(feature_store_dict):
+    """Returns valid times of all storm objects in feature store.
+
+    These may be used to split the virtual dataset into training, validation,
+    and testing sets (see `tvt_splitting.split_training_validation_testing`).
+    The resulting indices can then be passed to read_feature_store or
+    read_feature_matrix.
+
+    :param feature_store_dict: Dictionary created by open_feature_store.
+    :return: storm_times_unix_sec: 1-D numpy array of valid times.
+    """
+
+    if not feature_store_dict[STORE_TIMES_BY_FILE_KEY]:
+        return numpy.array([], dtype=int)
+    return numpy.concatenate(feature_store_dict[STORE_TIMES_BY_FILE_KEY])
+
+
+def read_feature_store(
+        feature_store_dict, column_names=None, storm_object_indices=None,
+        start_time_unix_sec=None, end_time_unix_sec=None):
+    """Reads columns from feature store into pandas DataFrame.
+
+    :param feature_store_dict: Dictionary created by open_feature_store.
+    :param column_names: 1-D list of columns to read.  If None, will read all
+        columns.
+    :param storm_object_indices: See doc for _find_rows_in_feature_store.
+    :param start_time_unix_sec: Same.
+    :param end_time_unix_sec: Same.
+    :return: feature_table: pandas DataFrame with the desired columns.  Each row
+        is one storm object.
+    """
+
+    if column_names is None:
+        column_names = feature_store_dict[STORE_COLUMNS_KEY]
+    else:
+        _check_feature_store_columns(feature_store_dict, column_names)
+
+    storm_object_indices = _find_rows_in_feature_store(
+        feature_store_dict, storm_object_indices=storm_object_indices,
+        start_time_unix_sec=start_time_unix_sec,
+        end_time_unix_sec=end_time_unix_sec)
+
+    column_dict = _read_columns_from_feature_store(
+        feature_store_dict, column_names, storm_object_indices)
+    return pandas.DataFrame.from_dict(column_dict)[column_names]
+
+
+def read_feature_matrix(
+        feature_store_dict, column_names, storm_object_indices=None,
+        start_time_unix_sec=None, end_time_unix_sec=None):
+    """Reads numeric columns from feature store into numpy matrix.
+
+    N = number of storm objects read
+    C = number of columns read
+
+    :param feature_store_dict: Dictionary created by open_feature_store.
+    :param column_names: length-C list of columns to read (features and/or
+        labels).
+    :param storm_object_indices: See doc for _find_rows_in_feature_store.
+    :param start_time_unix_sec: Same.
+    :param end_time_unix_sec: Same.
+    :return: feature_matrix: N-by-C numpy array.  If all columns are stored as
+        32-bit floats, this matrix will also contain 32-bit floats.
+    """
+
+    _check_feature_store_columns(feature_store_dict, column_names)
+    if tracking_io.STORM_ID_COLUMN in column_names:
+        raise ValueError(
+            'Column "' + tracking_io.STORM_ID_COLUMN + '" is not numeric.')
+
+    storm_object_indices = _find_rows_in_feature_store(
+        feature_store_dict, storm_object_indices=storm_object_indices,
+        start_time_unix_sec=start_time_unix_sec,
+        end_time_unix_sec=end_time_unix_sec)
+
+    column_dict = _read_columns_from_feature_store(
+        feature_store_dict, column_names, storm_object_indices)
+    return numpy.stack([column_dict[c] for c in column_names], axis=-1)
+
+
 def find_unsampled_file_one_time(
         unix_time_sec=None, spc_date_unix_sec=None, top_directory_name=None,
-        raise_error_if_missing=True):
+        raise_error_if_missing=True, file_extension=FEATURE_FILE_EXTENSION):
     """Locates file with unsampled feature vectors for one time step.
 
     :param unix_time_sec: Time step (valid time).
@@ -1045,6 +1914,9 @@ def find_unsampled_file_one_time(
     :param top_directory_name: Name of top-level directory with feature files.
     :param raise_error_if_missing: Boolean flag.  If True and file is missing,
         this method will raise an error.
+    :param file_extension: File extension (either ".p" for Pickle files written
+        by write_features_for_storm_objects, or ".nc" for feature stores written
+        by write_feature_store).
     :return: unsampled_file_name: Path to file with unsampled feature vectors
         for one time step.  If raise_error_if_missing = False and file is
         missing, this will be the *expected* path.
@@ -1053,11 +1925,12 @@ def find_unsampled_file_one_time(
 
     error_checking.assert_is_string(top_directory_name)
     error_checking.assert_is_boolean(raise_error_if_missing)
+    _check_file_extension(file_extension)
 
     pathless_file_name = '{0:s}_{1:s}{2:s}'.format(
         FEATURE_FILE_PREFIX,
         time_conversion.unix_sec_to_string(
-            unix_time_sec, TIME_FORMAT_IN_FILE_NAMES), FEATURE_FILE_EXTENSION)
+            unix_time_sec, TIME_FORMAT_IN_FILE_NAMES), file_extension)
 
     unsampled_file_name = '{0:s}/{1:s}/{2:s}'.format(
         top_directory_name,
@@ -1074,7 +1947,7 @@ def find_unsampled_file_one_time(
 
 def find_unsampled_file_time_period(
         start_time_unix_sec, end_time_unix_sec, directory_name=None,
-        raise_error_if_missing=True):
+        raise_error_if_missing=True, file_extension=FEATURE_FILE_EXTENSION):
     """Locates file with unsampled feature vectors for time period.
 
     :param start_time_unix_sec: Beginning of time period.
@@ -1082,6 +1955,7 @@ def find_unsampled_file_time_period(
     :param directory_name: Name of directory.
     :param raise_error_if_missing: Boolean flag.  If True and file is missing,
         this method will raise an error.
+    :param file_extension: See documentation for find_unsampled_file_one_time.
     :return: unsampled_file_name: Path to file with unsampled feature vectors
         for time period.  If raise_error_if_missing = False and file is missing,
         this will be the *expected* path.
@@ -1090,6 +1964,7 @@ def find_unsampled_file_time_period(
 
     error_checking.assert_is_string(directory_name)
     error_checking.assert_is_boolean(raise_error_if_missing)
+    _check_file_extension(file_extension)
 
     start_time_string = time_conversion.unix_sec_to_string(
         start_time_unix_sec, TIME_FORMAT_IN_FILE_NAMES)
@@ -1099,7 +1974,7 @@ def find_unsampled_file_time_period(
 
     pathless_file_name = '{0:s}_{1:s}_{2:s}{3:s}'.format(
         FEATURE_FILE_PREFIX, start_time_string, end_time_string,
-        FEATURE_FILE_EXTENSION)
+        file_extension)
     unsampled_file_name = '{0:s}/{1:s}'.format(
         directory_name, pathless_file_name)
 
@@ -1,5 +1,8 @@
 """Unit tests for feature_vectors_test.py."""
 
+import os
+import shutil
+import tempfile
 import unittest
 import copy
 import numpy
@@ -193,6 +196,30 @@ OVERALL_INDICES = numpy.array(
     [0, 24, 25, 49, 50, 99, 100, 149, 150, 151, 152, 153, 190, 227, 228, 232,
      236], dtype=int)
 
+# The following constants are used to test _join_tables_on_storm_objects.
+FIRST_TABLE_TO_JOIN = pandas.DataFrame.from_dict({
+    tracking_io.STORM_ID_COLUMN: ['a', 'b', 'c', 'a'],
+    tracking_io.TIME_COLUMN: numpy.array([0, 0, 0, 300], dtype=int),
+    RADAR_STATISTIC_NAME: numpy.array([1., 2., 3., 4.])
+})
+SECOND_TABLE_TO_JOIN = pandas.DataFrame.from_dict({
+    tracking_io.STORM_ID_COLUMN: ['a', 'c', 'a', 'd'],
+    tracking_io.TIME_COLUMN: numpy.array([300, 0, 0, 0], dtype=int),
+    SHAPE_STATISTIC_NAME: numpy.array([40., 30., 10., 50.]),
+    SOUNDING_STAT_NAME: numpy.array([-4., -3., -1., -5.])
+})
+COLUMN_NAMES_TO_JOIN = [[RADAR_STATISTIC_NAME], [SHAPE_STATISTIC_NAME]]
+
+JOINED_TABLE = pandas.DataFrame.from_dict({
+    tracking_io.STORM_ID_COLUMN: ['a', 'c', 'a'],
+    tracking_io.TIME_COLUMN: numpy.array([0, 0, 300], dtype=int),
+    RADAR_STATISTIC_NAME: numpy.array([1., 3., 4.]),
+    SHAPE_STATISTIC_NAME: numpy.array([10., 30., 40.])
+})
+JOINED_COLUMN_NAMES = [
+    tracking_io.STORM_ID_COLUMN, tracking_io.TIME_COLUMN, RADAR_STATISTIC_NAME,
+    SHAPE_STATISTIC_NAME]
+
 # The following constants are used to test check_feature_table.
 FEATURE_COLUMN_NAMES = [
     RADAR_STATISTIC_NAME, SHAPE_STATISTIC_NAME, SOUNDING_STAT_NAME]
@@ -219,6 +246,16 @@ INTEGER_AND_STRING_COLUMNS = [
     tracking_io.TIME_COLUMN, CLASSIFICATION_LABEL_COLUMN_NAME]
 POLYGON_COLUMNS = [tracking_io.POLYGON_OBJECT_LATLNG_COLUMN, BUFFER_COLUMN_NAME]
 
+# The following constants are used to test _get_sampling_index_columns.
+SAMPLING_INDEX_COLUMN_NAMES = (
+    feature_vectors.STORM_TO_WIND_COLUMNS_TO_KEEP +
+    [REGRESSION_LABEL_COLUMN_NAME, CLASSIFICATION_LABEL_COLUMN_NAME,
+     BUFFER_COLUMN_NAME])
+
+# The following constants are used to test find_sampling_index_file.
+SAMPLING_INDEX_FILE_NAME = (
+    'feature_vectors/20171105/features_2017-11-06-025310_sampling_index.p')
+
 # The following constants are used to test find_unsampled_file_one_time.
 FILE_TIME_UNIX_SEC = 1509936790  # 025310 6 Nov 2017
 FILE_SPC_DATE_UNIX_SEC = 1509936790
@@ -226,6 +263,21 @@ TOP_DIRECTORY_NAME = 'feature_vectors'
 FEATURE_FILE_NAME_ONE_TIME = (
     'feature_vectors/20171105/features_2017-11-06-025310.p')
 
+# The following constants are used to test _get_feature_store_types.
+FEATURE_STORE_TYPE_DICT = {
+    tracking_io.STORM_ID_COLUMN: str, tracking_io.TIME_COLUMN: 'i8',
+    storms_to_winds.END_TIME_COLUMN: 'i8',
+    labels.NUM_OBSERVATIONS_FOR_LABEL_COLUMN: 'i4',
+    RADAR_STATISTIC_NAME: 'f4', SHAPE_STATISTIC_NAME: 'f4',
+    SOUNDING_STAT_NAME: 'f4', REGRESSION_LABEL_COLUMN_NAME: 'f4',
+    CLASSIFICATION_LABEL_COLUMN_NAME: 'i4'
+}
+
+# The following constants are used to test find_unsampled_file_one_time with
+# feature stores.
+FEATURE_STORE_NAME_ONE_TIME = (
+    'feature_vectors/20171105/features_2017-11-06-025310.nc')
+
 # The following constants are used to test find_unsampled_file_time_period.
 FILE_START_TIME_UNIX_SEC = 1509883200  # 1200 UTC 5 Nov 2017
 FILE_END_TIME_UNIX_SEC = 1509969599  # 115959 UTC 6 Nov 2017
@@ -365,6 +417,30 @@ class FeatureVectorsTests(unittest.TestCase):
             self.assertTrue(numpy.array_equal(
                 these_indices_by_file[i], INDICES_BY_FILE[i]))
 
+    def test_join_tables_on_storm_objects(self):
+        """Ensures correct output from _join_tables_on_storm_objects."""
+
+        this_joined_table = feature_vectors._join_tables_on_storm_objects(
+            [FIRST_TABLE_TO_JOIN, SECOND_TABLE_TO_JOIN], COLUMN_NAMES_TO_JOIN)
+
+        self.assertTrue(list(this_joined_table) == JOINED_COLUMN_NAMES)
+        self.assertTrue(this_joined_table.equals(
+            JOINED_TABLE[JOINED_COLUMN_NAMES]))
+
+    def test_join_tables_on_storm_objects_duplicate(self):
+        """Ensures that _join_tables_on_storm_objects throws an error.
+
+        In this case, the second table contains the same storm object twice.
+        """
+
+        this_second_table = pandas.concat(
+            [SECOND_TABLE_TO_JOIN, SECOND_TABLE_TO_JOIN.iloc[[0]]],
+            axis=0, ignore_index=True)
+
+        with self.assertRaises(ValueError):
+            feature_vectors._join_tables_on_storm_objects(
+                [FIRST_TABLE_TO_JOIN, this_second_table], COLUMN_NAMES_TO_JOIN)
+
     def test_check_feature_table(self):
         """Ensures correct output from check_feature_table."""
 
@@ -579,6 +655,54 @@ class FeatureVectorsTests(unittest.TestCase):
             this_metadata_dict[feature_vectors.NUM_OBSERVATIONS_KEY],
             NUM_OBSERVATIONS_BY_STORM_OBJECT))
 
+    def test_get_sampling_index_columns(self):
+        """Ensures correct output from _get_sampling_index_columns."""
+
+        these_column_names = feature_vectors._get_sampling_index_columns(
+            FEATURE_TABLE)
+        self.assertTrue(these_column_names == SAMPLING_INDEX_COLUMN_NAMES)
+
+    def test_get_feature_store_types(self):
+        """Ensures correct output from _get_feature_store_types."""
+
+        this_type_dict = feature_vectors._get_feature_store_types(
+            FEATURE_TABLE)
+        self.assertTrue(this_type_dict == FEATURE_STORE_TYPE_DICT)
+
+    def test_find_sampling_index_file(self):
+        """Ensures correct output from find_sampling_index_file."""
+
+        this_file_name = feature_vectors.find_sampling_index_file(
+            FEATURE_FILE_NAME_ONE_TIME)
+        self.assertTrue(this_file_name == SAMPLING_INDEX_FILE_NAME)
+
+    def test_write_features_without_sampling_index(self):
+        """Ensures that write_features_for_storm_objects deletes stale index.
+
+        In this case, the feature file is written with a sampling index and then
+        rewritten without one, so the old sampling index must be deleted.
+        """
+
+        this_directory_name = tempfile.mkdtemp()
+        this_feature_file_name = os.path.join(
+            this_directory_name, 'features.p')
+        this_index_file_name = feature_vectors.find_sampling_index_file(
+            this_feature_file_name)
+
+        try:
+            feature_vectors.write_features_for_storm_objects(
+                FEATURE_TABLE, this_feature_file_name,
+                write_sampling_index=True)
+            self.assertTrue(os.path.isfile(this_index_file_name))
+
+            feature_vectors.write_features_for_storm_objects(
+                FEATURE_TABLE, this_feature_file_name,
+                write_sampling_index=False)
+            self.assertTrue(os.path.isfile(this_feature_file_name))
+            self.assertFalse(os.path.isfile(this_index_file_name))
+        finally:
+            shutil.rmtree(this_directory_name)
+
     def test_find_unsampled_file_one_time(self):
         """Ensures correct output from find_unsampled_file_one_time."""
 
@@ -588,6 +712,30 @@ class FeatureVectorsTests(unittest.TestCase):
             top_directory_name=TOP_DIRECTORY_NAME, raise_error_if_missing=False)
         self.assertTrue(this_file_name == FEATURE_FILE_NAME_ONE_TIME)
 
+    def test_find_unsampled_file_one_time_feature_store(self):
+        """Ensures correct output from find_unsampled_file_one_time.
+
+        In this case, file is a feature store (NetCDF) rather than Pickle.
+        """
+
+        this_file_name = feature_vectors.find_unsampled_file_one_time(
+            unix_time_sec=FILE_TIME_UNIX_SEC,
+            spc_date_unix_sec=FILE_SPC_DATE_UNIX_SEC,
+            top_directory_name=TOP_DIRECTORY_NAME,
+            file_extension=feature_vectors.FEATURE_STORE_FILE_EXTENSION,
+            raise_error_if_missing=False)
+        self.assertTrue(this_file_name == FEATURE_STORE_NAME_ONE_TIME)
+
+    def test_find_unsampled_file_one_time_bad_extension(self):
+        """Ensures that find_unsampled_file_one_time errors on bad extension."""
+
+        with self.assertRaises(ValueError):
+            feature_vectors.find_unsampled_file_one_time(
+                unix_time_sec=FILE_TIME_UNIX_SEC,
+                spc_date_unix_sec=FILE_SPC_DATE_UNIX_SEC,
+                top_directory_name=TOP_DIRECTORY_NAME, file_extension='.csv',
+                raise_error_if_missing=False)
+
     def test_find_unsampled_file_time_period(self):
         """Ensures correct output from find_unsampled_file_time_period."""
 
@@ -596,6 +744,18 @@ class FeatureVectorsTests(unittest.TestCase):
             directory_name=TOP_DIRECTORY_NAME, raise_error_if_missing=False)
         self.assertTrue(this_file_name == FEATURE_FILE_NAME_TIME_PERIOD)
 
+    def test_find_unsampled_file_time_period_positional(self):
+        """Ensures correct output from find_unsampled_file_time_period.
+
+        In this case, all arguments are passed by position, as callers did
+        before the file extension was added.
+        """
+
+        this_file_name = feature_vectors.find_unsampled_file_time_period(
+            FILE_START_TIME_UNIX_SEC, FILE_END_TIME_UNIX_SEC,
+            TOP_DIRECTORY_NAME, False)
+        self.assertTrue(this_file_name == FEATURE_FILE_NAME_TIME_PERIOD)
+
 
 if __name__ == '__main__':
     unittest.main()
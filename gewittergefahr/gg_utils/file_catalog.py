@@ -0,0 +1,359 @@
+"""Time-indexed catalogs of data files.
+
+A "catalog" lists all data files in one directory (usually one SPC date, one
+field, and one height), along with the valid time of each file.  The directory
+is scanned once (with one call to `os.listdir`), and later queries are answered
+by binary search over the sorted file times.  This avoids a `glob.glob` call --
+and one `stat` per matched file -- for every query, which dominates run time on
+network file systems.
+
+Catalogs are cached in memory and, optionally, in a small index file.  A
+catalog is rebuilt whenever the modification time of its directory changes
+(i.e., whenever a file is added to or removed from the directory).  At most
+MAX_CATALOGS_IN_MEMORY catalogs are kept in memory; when this limit is
+exceeded, the least recently used catalog is dropped.  Cached catalogs are
+shared by all spellings of the same directory (e.g., "top" and "top/"), but
+paths returned by `find_files_in_time_range` and `find_nearest_file` always
+start with the spelling given to `get_catalog`.
+"""
+
+import os
+import os.path
+import sys
+import pickle
+import collections
+import hashlib
+import numpy
+from gewittergefahr.gg_utils import file_system_utils
+from gewittergefahr.gg_utils import error_checking
+
+DIRECTORY_NAME_KEY = 'directory_name'
+DIRECTORY_MTIME_KEY = 'directory_mtime_unix_sec'
+FILE_TIMES_KEY = 'file_times_unix_sec'
+PATHLESS_FILE_NAMES_KEY = 'pathless_file_names'
+
+INDEX_FILE_PREFIX = 'file_catalog'
+INDEX_FILE_EXTENSION = '.p'
+
+MAX_CATALOGS_IN_MEMORY = 1000
+
+_CATALOG_DICT_BY_KEY = collections.OrderedDict()
+
+
+def _get_catalog_key(directory_name, file_name_to_time):
+    """Returns key used to cache catalog in memory.
+
+    The key contains the function itself, rather than its name, so that two
+    functions with the same name (e.g., two lambdas) never share a catalog.
+
+    :param directory_name: Name of directory.
+    :param file_name_to_time: Function used to parse time from file name.
+    :return: catalog_key: Tuple with absolute path to directory and
+        `file_name_to_time`.
+    """
+
+    return os.path.abspath(directory_name), file_name_to_time
+
+
+def _get_index_key(directory_name, file_name_to_time):
+    """Returns key used to name index file for catalog.
+
+    Index files are shared between processes, so this key is based on the name
+    of `file_name_to_time`.  Names are unique only for module-level functions,
+    so other functions (e.g., lambdas and nested functions) do not get a key.
+
+    :param directory_name: Name of directory.
+    :param file_name_to_time: Function used to parse time from file name.
+    :return: index_key: Key (string).  If `file_name_to_time` is not a
+        module-level function, this is None.
+    """
+
+    module_name = getattr(file_name_to_time, '__module__', None)
+    function_name = getattr(file_name_to_time, '__name__', None)
+    if module_name is None or function_name is None:
+        return None
+
+    module_object = sys.modules.get(module_name)
+    if getattr(module_object, function_name, None) is not file_name_to_time:
+        return None
+
+    return '{0:s}|{1:s}.{2:s}'.format(
+        os.path.abspath(directory_name), module_name, function_name)
+
+
+def _get_index_file_name(index_directory_name, index_key):
+    """Returns name of index file for catalog.
+
+    :param index_directory_name: Name of directory with index files.
+    :param index_key: Key returned by _get_index_key.
+    :return: index_file_name: Path to index file.
+    """
+
+    return '{0:s}/{1:s}_{2:s}{3:s}'.format(
+        index_directory_name, INDEX_FILE_PREFIX,
+        hashlib.md5(index_key.encode('utf-8')).hexdigest(),
+        INDEX_FILE_EXTENSION)
+
+
+def _cache_catalog(catalog_key, catalog_dict):
+    """Caches catalog in memory, as the most recently used.
+
+    If there are more than MAX_CATALOGS_IN_MEMORY catalogs in memory, the least
+    recently used are dropped.
+
+    :param catalog_key: Key returned by _get_catalog_key.
+    :param catalog_dict: Dictionary created by _scan_directory.
+    """
+
+    _CATALOG_DICT_BY_KEY.pop(catalog_key, None)
+    _CATALOG_DICT_BY_KEY[catalog_key] = catalog_dict
+
+    while len(_CATALOG_DICT_BY_KEY) > MAX_CATALOGS_IN_MEMORY:
+        _CATALOG_DICT_BY_KEY.popitem(last=False)
+
+
+def _set_directory_name(catalog_dict, directory_name):
+    """Returns copy of catalog with the caller's spelling of the directory.
+
+    The cached catalog is not modified, since it may be shared by callers that
+    spell the directory name differently.
+
+    :param catalog_dict: Dictionary created by _scan_directory.
+    :param directory_name: Name of directory, as given to get_catalog.
+    :return: catalog_dict: Shallow copy of input, with `directory_name` as the
+        directory name.
+    """
+
+    catalog_dict = catalog_dict.copy()
+    catalog_dict[DIRECTORY_NAME_KEY] = directory_name
+    return catalog_dict
+
+
+def _get_directory_mtime(directory_name):
+    """Returns modification time of directory.
+
+    :param directory_name: Name of directory.
+    :return: directory_mtime_unix_sec: Modification time.  If directory does
+        not exist, this is None.
+    """
+
+    try:
+        return os.stat(directory_name).st_mtime
+    except OSError:
+        return None
+
+
+def _scan_directory(directory_name, file_name_to_time,
+                    directory_mtime_unix_sec):
+    """Scans directory and creates catalog.
+
+    :param directory_name: See doc for get_catalog.
+    :param file_name_to_time: Same.
+    :param directory_mtime_unix_sec: Modification time of directory.
+    :return: catalog_dict: Same.
+    """
+
+    if directory_mtime_unix_sec is None:
+        pathless_file_names = []
+    else:
+        pathless_file_names = os.listdir(directory_name)
+
+    file_times_unix_sec = []
+    cataloged_file_names = []
+    for this_file_name in pathless_file_names:
+        this_time_unix_sec = file_name_to_time(this_file_name)
+        if this_time_unix_sec is None:
+            continue
+
+        file_times_unix_sec.append(this_time_unix_sec)
+        cataloged_file_names.append(this_file_name)
+
+    file_times_unix_sec = numpy.array(file_times_unix_sec, dtype=int)
+    sort_indices = numpy.lexsort(
+        (numpy.array(cataloged_file_names, dtype=object), file_times_unix_sec))
+
+    return {
+        DIRECTORY_NAME_KEY: directory_name,
+        DIRECTORY_MTIME_KEY: directory_mtime_unix_sec,
+        FILE_TIMES_KEY: file_times_unix_sec[sort_indices],
+        PATHLESS_FILE_NAMES_KEY:
+            [cataloged_file_names[k] for k in sort_indices]
+    }
+
+
+def _write_index_file(catalog_dict, index_file_name):
+    """Writes catalog to index file.
+
+    The catalog is written to a temporary file, which is then renamed, so that
+    a concurrent reader never sees a partial index file.
+
+    :param catalog_dict: Dictionary created by _scan_directory.
+    :param index_file_name: Path to output file.
+    """
+
+    file_system_utils.mkdir_recursive_if_necessary(file_name=index_file_name)
+
+    temp_file_name = '{0:s}.tmp{1:d}'.format(index_file_name, os.getpid())
+    pickle_file_handle = open(temp_file_name, 'wb')
+    pickle.dump(catalog_dict, pickle_file_handle)
+    pickle_file_handle.close()
+    os.rename(temp_file_name, index_file_name)
+
+
+def _read_index_file(index_file_name):
+    """Reads catalog from index file.
+
+    :param index_file_name: Path to input file.
+    :return: catalog_dict: Dictionary created by _scan_directory.  If the file
+        does not exist or cannot be read, this is None.
+    """
+
+    if not os.path.isfile(index_file_name):
+        return None
+
+    try:
+        pickle_file_handle = open(index_file_name, 'rb')
+        catalog_dict = pickle.load(pickle_file_handle)
+        pickle_file_handle.close()
+    except (IOError, EOFError, pickle.UnpicklingError):
+        return None
+
+    return catalog_dict
+
+
+def get_catalog(directory_name, file_name_to_time, index_directory_name=None):
+    """Returns catalog for one directory.
+
+    The catalog is taken from memory if possible, then from the index file (if
+    `index_directory_name` is specified), and otherwise created by scanning the
+    directory.  In the first two cases, the catalog is used only if the
+    modification time of the directory has not changed.
+
+    N = number of files in catalog
+
+    :param directory_name: Name of directory.
+    :param file_name_to_time: Function that takes a pathless file name and
+        returns the valid time (Unix format).  For files that should not be in
+        the catalog, this function should return None.
+    :param index_directory_name: Name of directory with index files.  If None,
+        catalogs will be cached only in memory.  Catalogs are also cached only
+        in memory if `file_name_to_time` is not a module-level function.
+    :return: catalog_dict: Dictionary with the following keys.
+    catalog_dict['directory_name']: Name of directory (`directory_name`, as
+        given, even if the catalog was cached under another spelling).
+    catalog_dict['directory_mtime_unix_sec']: Modification time of directory
+        when it was scanned.  If directory did not exist, this is None.
+    catalog_dict['file_times_unix_sec']: length-N numpy array of valid times,
+        sorted in ascending order.
+    catalog_dict['pathless_file_names']: length-N list of pathless file names
+        (ties in valid time are sorted by file name).
+    """
+
+    error_checking.assert_is_string(directory_name)
+    catalog_key = _get_catalog_key(directory_name, file_name_to_time)
+    directory_mtime_unix_sec = _get_directory_mtime(directory_name)
+
+    catalog_dict = _CATALOG_DICT_BY_KEY.get(catalog_key)
+    if (catalog_dict is not None and directory_mtime_unix_sec is not None and
+            catalog_dict[DIRECTORY_MTIME_KEY] == directory_mtime_unix_sec):
+        _cache_catalog(catalog_key, catalog_dict)
+        return _set_directory_name(catalog_dict, directory_name)
+
+    index_file_name = None
+    if index_directory_name is not None:
+        error_checking.assert_is_string(index_directory_name)
+        index_key = _get_index_key(directory_name, file_name_to_time)
+
+        if index_key is not None:
+            index_file_name = _get_index_file_name(
+                index_directory_name, index_key)
+            catalog_dict = _read_index_file(index_file_name)
+
+            if (catalog_dict is not None and
+                    directory_mtime_unix_sec is not None and
+                    catalog_dict[DIRECTORY_MTIME_KEY] ==
+                    directory_mtime_unix_sec):
+                _cache_catalog(catalog_key, catalog_dict)
+                return _set_directory_name(catalog_dict, directory_name)
+
+    catalog_dict = _scan_directory(
+        directory_name, file_name_to_time, directory_mtime_unix_sec)
+
+    # Catalogs of missing directories are not cached, so that files will be
+    # found if the directory is created later.
+    if directory_mtime_unix_sec is None:
+        return catalog_dict
+
+    _cache_catalog(catalog_key, catalog_dict)
+    if index_file_name is not None:
+        _write_index_file(catalog_dict, index_file_name)
+
+    return _set_directory_name(catalog_dict, directory_name)
+
+
+def find_files_in_time_range(catalog_dict, start_time_unix_sec,
+                             end_time_unix_sec):
+    """Finds files with valid time in the given range (inclusive).
+
+    :param catalog_dict: Dictionary created by get_catalog.
+    :param start_time_unix_sec: Start of time range.
+    :param end_time_unix_sec: End of time range.
+    :return: file_names: 1-D list of paths to files, sorted by valid time.
+    """
+
+    first_index = numpy.searchsorted(
+        catalog_dict[FILE_TIMES_KEY], start_time_unix_sec, side='left')
+    last_index = numpy.searchsorted(
+        catalog_dict[FILE_TIMES_KEY], end_time_unix_sec, side='right')
+
+    return [
+        '{0:s}/{1:s}'.format(catalog_dict[DIRECTORY_NAME_KEY], f)
+        for f in catalog_dict[PATHLESS_FILE_NAMES_KEY][first_index:last_index]]
+
+
+def find_nearest_file(catalog_dict, desired_time_unix_sec,
+                      max_time_offset_sec):
+    """Finds file with valid time nearest to the desired time.
+
+    If two files are equally near, this method returns the earlier one.  If two
+    files have the same valid time, this method returns the one whose name comes
+    first alphabetically.
+
+    :param catalog_dict: Dictionary created by get_catalog.
+    :param desired_time_unix_sec: Desired time.
+    :param max_time_offset_sec: Maximum offset between desired and actual valid
+        time.
+    :return: file_name: Path to file.  If there is no file within
+        `max_time_offset_sec` of the desired time, this is None.
+    """
+
+    file_times_unix_sec = catalog_dict[FILE_TIMES_KEY]
+    num_files = len(file_times_unix_sec)
+    if num_files == 0:
+        return None
+
+    right_index = numpy.searchsorted(
+        file_times_unix_sec, desired_time_unix_sec, side='left')
+    left_index = numpy.searchsorted(
+        file_times_unix_sec, file_times_unix_sec[max([right_index - 1, 0])],
+        side='left')
+    right_index = min([right_index, num_files - 1])
+
+    left_offset_sec = numpy.absolute(
+        desired_time_unix_sec - file_times_unix_sec[left_index])
+    right_offset_sec = numpy.absolute(
+        file_times_unix_sec[right_index] - desired_time_unix_sec)
+
+    if left_offset_sec <= right_offset_sec:
+        nearest_index = left_index
+        min_offset_sec = left_offset_sec
+    else:
+        nearest_index = right_index
+        min_offset_sec = right_offset_sec
+
+    if min_offset_sec > max_time_offset_sec:
+        return None
+
+    return '{0:s}/{1:s}'.format(
+        catalog_dict[DIRECTORY_NAME_KEY],
+        catalog_dict[PATHLESS_FILE_NAMES_KEY][nearest_index])
@@ -0,0 +1,225 @@
+"""Unit tests for file_catalog.py."""
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy
+from gewittergefahr.gg_utils import file_catalog
+
+PATHLESS_FILE_NAMES = ['0300.dat', '0100.dat', '0200.dat', '0200.dat.gz',
+                       'foo.txt']
+FILE_TIMES_UNIX_SEC = numpy.array([100, 200, 200, 300], dtype=int)
+CATALOGED_FILE_NAMES = ['0100.dat', '0200.dat', '0200.dat.gz', '0300.dat']
+NEW_PATHLESS_FILE_NAME = '0250.dat'
+
+
+def _file_name_to_time(pathless_file_name):
+    """Parses time from file name (format "HHMM.dat" or "HHMM.dat.gz").
+
+    :param pathless_file_name: Pathless file name.
+    :return: unix_time_sec: Valid time (or None).
+    """
+
+    file_name_parts = pathless_file_name.split('.')
+    if file_name_parts[1] != 'dat':
+        return None
+
+    return int(file_name_parts[0]) // 100 * 100
+
+
+class FileCatalogTests(unittest.TestCase):
+    """Each method is a unit test for file_catalog.py."""
+
+    def setUp(self):
+        """Creates temporary directory with (empty) data files."""
+
+        self.directory_name = tempfile.mkdtemp()
+        self.index_directory_name = tempfile.mkdtemp()
+        for this_file_name in PATHLESS_FILE_NAMES:
+            open('{0:s}/{1:s}'.format(
+                self.directory_name, this_file_name), 'w').close()
+
+    def tearDown(self):
+        """Deletes temporary directories."""
+
+        shutil.rmtree(self.directory_name)
+        shutil.rmtree(self.index_directory_name)
+
+    def test_get_catalog(self):
+        """Ensures correct output from get_catalog."""
+
+        this_catalog_dict = file_catalog.get_catalog(
+            self.directory_name, file_name_to_time=_file_name_to_time,
+            index_directory_name=self.index_directory_name)
+
+        self.assertTrue(numpy.array_equal(
+            this_catalog_dict[file_catalog.FILE_TIMES_KEY],
+            FILE_TIMES_UNIX_SEC))
+        self.assertTrue(
+            this_catalog_dict[file_catalog.PATHLESS_FILE_NAMES_KEY] ==
+            CATALOGED_FILE_NAMES)
+        self.assertTrue(len(os.listdir(self.index_directory_name)) == 1)
+
+    def test_get_catalog_new_file(self):
+        """Ensures that get_catalog finds file added after first scan."""
+
+        file_catalog.get_catalog(
+            self.directory_name, file_name_to_time=_file_name_to_time)
+
+        # Ensure that modification time of directory changes.
+        this_mtime_unix_sec = os.stat(self.directory_name).st_mtime
+        open('{0:s}/{1:s}'.format(
+            self.directory_name, NEW_PATHLESS_FILE_NAME), 'w').close()
+        os.utime(self.directory_name,
+                 (this_mtime_unix_sec + 10, this_mtime_unix_sec + 10))
+
+        this_catalog_dict = file_catalog.get_catalog(
+            self.directory_name, file_name_to_time=_file_name_to_time)
+        self.assertTrue(
+            NEW_PATHLESS_FILE_NAME in
+            this_catalog_dict[file_catalog.PATHLESS_FILE_NAMES_KEY])
+
+    def test_get_catalog_missing_directory(self):
+        """Ensures correct output from get_catalog.
+
+        In this case, the directory does not exist.
+        """
+
+        this_catalog_dict = file_catalog.get_catalog(
+            self.directory_name + '/foo', file_name_to_time=_file_name_to_time)
+        self.assertTrue(
+            len(this_catalog_dict[file_catalog.FILE_TIMES_KEY]) == 0)
+
+    def test_get_catalog_lambdas(self):
+        """Ensures correct output from get_catalog.
+
+        In this case, two lambdas (with the same name) are used for the same
+        directory, so they must not share a catalog.  Also, lambdas do not have
+        a unique name, so there should be no index file.
+        """
+
+        first_catalog_dict = file_catalog.get_catalog(
+            self.directory_name, file_name_to_time=lambda f: None,
+            index_directory_name=self.index_directory_name)
+        second_catalog_dict = file_catalog.get_catalog(
+            self.directory_name, file_name_to_time=lambda f: 0,
+            index_directory_name=self.index_directory_name)
+
+        self.assertTrue(
+            len(first_catalog_dict[file_catalog.FILE_TIMES_KEY]) == 0)
+        self.assertTrue(
+            len(second_catalog_dict[file_catalog.FILE_TIMES_KEY]) ==
+            len(PATHLESS_FILE_NAMES))
+        self.assertTrue(len(os.listdir(self.index_directory_name)) == 0)
+
+    def test_get_catalog_max_in_memory(self):
+        """Ensures that get_catalog keeps limited number of catalogs in memory.
+        """
+
+        orig_max_catalogs = file_catalog.MAX_CATALOGS_IN_MEMORY
+        file_catalog.MAX_CATALOGS_IN_MEMORY = 2
+
+        try:
+            for _ in range(3):
+                file_catalog.get_catalog(
+                    self.directory_name, file_name_to_time=lambda f: None)
+
+            file_catalog.get_catalog(
+                self.directory_name, file_name_to_time=_file_name_to_time)
+            self.assertTrue(len(file_catalog._CATALOG_DICT_BY_KEY) == 2)
+            self.assertTrue(
+                file_catalog._get_catalog_key(
+                    self.directory_name, _file_name_to_time) in
+                file_catalog._CATALOG_DICT_BY_KEY)
+        finally:
+            file_catalog.MAX_CATALOGS_IN_MEMORY = orig_max_catalogs
+
+    def test_find_files_in_time_range(self):
+        """Ensures correct output from find_files_in_time_range."""
+
+        this_catalog_dict = file_catalog.get_catalog(
+            self.directory_name, file_name_to_time=_file_name_to_time)
+        these_file_names = file_catalog.find_files_in_time_range(
+            this_catalog_dict, start_time_unix_sec=150, end_time_unix_sec=300)
+
+        these_expected_file_names = [
+            '{0:s}/{1:s}'.format(self.directory_name, f)
+            for f in CATALOGED_FILE_NAMES[1:]]
+        self.assertTrue(these_file_names == these_expected_file_names)
+
+    def test_find_files_two_spellings(self):
+        """Ensures correct output from find_files_in_time_range.
+
+        In this case, the same directory is spelled two ways (with and without
+        a trailing slash), and each call should get paths with its own
+        spelling, whether the catalog comes from memory or the index file.
+        """
+
+        these_directory_names = [
+            self.directory_name + '/', self.directory_name,
+            self.directory_name + '/']
+
+        for i in range(len(these_directory_names)):
+            if i == 2:
+                file_catalog._CATALOG_DICT_BY_KEY.clear()
+
+            this_catalog_dict = file_catalog.get_catalog(
+                these_directory_names[i], file_name_to_time=_file_name_to_time,
+                index_directory_name=self.index_directory_name)
+            these_file_names = file_catalog.find_files_in_time_range(
+                this_catalog_dict, start_time_unix_sec=100,
+                end_time_unix_sec=100)
+
+            self.assertTrue(these_file_names == [
+                '{0:s}/{1:s}'.format(
+                    these_directory_names[i], CATALOGED_FILE_NAMES[0])])
+
+    def test_find_nearest_file(self):
+        """Ensures correct output from find_nearest_file.
+
+        In this case, the nearest file is within the max offset.  Of the two
+        files with the nearest time, the one with the first name is returned.
+        """
+
+        this_catalog_dict = file_catalog.get_catalog(
+            self.directory_name, file_name_to_time=_file_name_to_time)
+        this_file_name = file_catalog.find_nearest_file(
+            this_catalog_dict, desired_time_unix_sec=240,
+            max_time_offset_sec=50)
+
+        self.assertTrue(this_file_name == '{0:s}/{1:s}'.format(
+            self.directory_name, CATALOGED_FILE_NAMES[1]))
+
+    def test_find_nearest_file_tie(self):
+        """Ensures correct output from find_nearest_file.
+
+        In this case, two files are equally near, so the earlier is returned.
+        """
+
+        this_catalog_dict = file_catalog.get_catalog(
+            self.directory_name, file_name_to_time=_file_name_to_time)
+        this_file_name = file_catalog.find_nearest_file(
+            this_catalog_dict, desired_time_unix_sec=150,
+            max_time_offset_sec=50)
+
+        self.assertTrue(this_file_name == '{0:s}/{1:s}'.format(
+            self.directory_name, CATALOGED_FILE_NAMES[0]))
+
+    def test_find_nearest_file_too_far(self):
+        """Ensures correct output from find_nearest_file.
+
+        In this case, no file is within the max offset.
+        """
+
+        this_catalog_dict = file_catalog.get_catalog(
+            self.directory_name, file_name_to_time=_file_name_to_time)
+        this_file_name = file_catalog.find_nearest_file(
+            this_catalog_dict, desired_time_unix_sec=1000,
+            max_time_offset_sec=50)
+
+        self.assertTrue(this_file_name is None)
+
+
+if __name__ == '__main__':
+    unittest.main()
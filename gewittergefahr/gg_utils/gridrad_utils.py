@@ -19,6 +19,7 @@ import numpy
 import pandas
 import scipy.interpolate
 from gewittergefahr.gg_io import grib_io
+from gewittergefahr.gg_io import gridrad_io
 from gewittergefahr.gg_io import radar_io
 from gewittergefahr.gg_utils import interp
 from gewittergefahr.gg_utils import grids
@@ -26,6 +27,8 @@ from gewittergefahr.gg_utils import radar_utils
 from gewittergefahr.gg_utils import longitude_conversion as lng_conversion
 from gewittergefahr.gg_utils import error_checking
 
+DEFAULT_NUM_ROWS_PER_CHUNK = 100
+
 
 def _get_field_name_for_echo_tops(critical_reflectivity_dbz,
                                   myrorss_format=False):
@@ -174,28 +177,91 @@ def interp_reflectivity_to_heights(
     return interp_refl_matrix_dbz
 
 
-def get_column_max_reflectivity(reflectivity_matrix_dbz):
-    """Finds column-max reflectivity at each horizontal location.
+def _iterate_refl_chunks(reflectivity_matrix_dbz, num_rows_per_chunk):
+    """Iterates over reflectivity grid in chunks of consecutive rows.
 
     M = number of rows (unique grid-point latitudes)
     N = number of columns (unique grid-point longitudes)
     H = number of height levels (unique grid-point heights)
+    R = number of rows in chunk
+
+    :param reflectivity_matrix_dbz: H-by-M-by-N matrix of reflectivities, or
+        instance of `gridrad_io.GridradFieldView`.  In the latter case, only one
+        chunk is read into memory at a time.
+    :param num_rows_per_chunk: Number of rows per chunk.
+    :return: first_row_index: Index of the first row in the chunk.
+    :return: refl_matrix_for_chunk_dbz: H-by-R-by-N matrix of reflectivities.
+    """
 
-    :param reflectivity_matrix_dbz: H-by-M-by-N matrix of reflectivities.
-    :return: column_max_refl_matrix_dbz: M-by-N matrix of column-max
-        reflectivities.
+    if isinstance(reflectivity_matrix_dbz, gridrad_io.GridradFieldView):
+        for first_row_index, refl_matrix_for_chunk_dbz in (
+                reflectivity_matrix_dbz.iterate_row_chunks(
+                    num_rows_per_chunk)):
+            yield first_row_index, refl_matrix_for_chunk_dbz
+        return
+
+    error_checking.assert_is_integer(num_rows_per_chunk)
+    error_checking.assert_is_greater(num_rows_per_chunk, 0)
+
+    num_grid_rows = reflectivity_matrix_dbz.shape[1]
+    for first_row_index in range(0, num_grid_rows, num_rows_per_chunk):
+        yield first_row_index, reflectivity_matrix_dbz[
+            :, first_row_index:(first_row_index + num_rows_per_chunk), :]
+
+
+def _check_refl_grid(reflectivity_matrix_dbz):
+    """Error-checks reflectivity grid.
+
+    :param reflectivity_matrix_dbz: See doc for `_iterate_refl_chunks`.
+    :return: grid_shape: length-3 tuple (H, M, N).
     """
 
+    if isinstance(reflectivity_matrix_dbz, gridrad_io.GridradFieldView):
+        return reflectivity_matrix_dbz.shape
+
     error_checking.assert_is_numpy_array(
         reflectivity_matrix_dbz, num_dimensions=3)
     error_checking.assert_is_real_numpy_array(reflectivity_matrix_dbz)
+    return reflectivity_matrix_dbz.shape
 
-    return numpy.nanmax(reflectivity_matrix_dbz, axis=0)
+
+def get_column_max_reflectivity(
+        reflectivity_matrix_dbz,
+        num_rows_per_chunk=DEFAULT_NUM_ROWS_PER_CHUNK):
+    """Finds column-max reflectivity at each horizontal location.
+
+    M = number of rows (unique grid-point latitudes)
+    N = number of columns (unique grid-point longitudes)
+    H = number of height levels (unique grid-point heights)
+
+    :param reflectivity_matrix_dbz: H-by-M-by-N matrix of reflectivities, or
+        instance of `gridrad_io.GridradFieldView` (created by
+        `gridrad_io.open_field_from_full_grid_file`).  In the latter case, the
+        grid is read and reduced one chunk at a time, so the full 3-D grid is
+        never held in memory.
+    :param num_rows_per_chunk: Number of rows per chunk.
+    :return: column_max_refl_matrix_dbz: M-by-N matrix of column-max
+        reflectivities.
+    """
+
+    _, num_grid_rows, num_grid_columns = _check_refl_grid(
+        reflectivity_matrix_dbz)
+
+    column_max_refl_matrix_dbz = numpy.full(
+        (num_grid_rows, num_grid_columns), numpy.nan)
+    for first_row_index, refl_matrix_for_chunk_dbz in _iterate_refl_chunks(
+            reflectivity_matrix_dbz, num_rows_per_chunk):
+        last_row_index = first_row_index + refl_matrix_for_chunk_dbz.shape[1]
+        column_max_refl_matrix_dbz[first_row_index:last_row_index, :] = (
+            numpy.nanmax(refl_matrix_for_chunk_dbz, axis=0))
+
+    return column_max_refl_matrix_dbz
 
 
 def get_echo_tops(
         reflectivity_matrix_dbz=None, unique_grid_point_heights_m_asl=None,
-        critical_reflectivity_dbz=None):
+        critical_reflectivity_dbz=None,
+        num_rows_per_chunk=DEFAULT_NUM_ROWS_PER_CHUNK):
     """Finds echo top at each horizontal location.
 
     "Echo top" = maximum height with >= critical reflectivity.
@@ -204,26 +270,30 @@ def get_echo_tops(
     N = number of columns (unique grid-point longitudes)
     H = number of height levels (unique grid-point heights)
 
-    :param reflectivity_matrix_dbz: H-by-M-by-N matrix of reflectivities.
+    :param reflectivity_matrix_dbz: H-by-M-by-N matrix of reflectivities, or
+        instance of `gridrad_io.GridradFieldView` (see doc for
+        get_column_max_reflectivity).
     :param unique_grid_point_heights_m_asl: length-H numpy array of grid-point
         heights (metres above sea level).  Must be sorted in ascending order,
         which means that height must increase with the first index of
-        reflectivity_matrix_dbz.
+        reflectivity_matrix_dbz.  If reflectivity_matrix_dbz is a view, this may
+        be None (in which case heights are taken from the view).
     :param critical_reflectivity_dbz: Critical reflectivity.
+    :param num_rows_per_chunk: Number of rows per chunk.
     :return: echo_top_matrix_m_asl: M-by-N matrix of echo tops (metres above sea
         level).
     :raises: ValueError: unique_grid_point_heights_m_asl not sorted in ascending
         order.
     """
 
-    error_checking.assert_is_numpy_array(
-        reflectivity_matrix_dbz, num_dimensions=3)
-    error_checking.assert_is_real_numpy_array(reflectivity_matrix_dbz)
+    num_grid_heights, num_grid_rows, num_grid_columns = _check_refl_grid(
+        reflectivity_matrix_dbz)
     error_checking.assert_is_greater(critical_reflectivity_dbz, 0.)
 
-    num_grid_heights = reflectivity_matrix_dbz.shape[0]
-    num_grid_rows = reflectivity_matrix_dbz.shape[1]
-    num_grid_columns = reflectivity_matrix_dbz.shape[2]
+    if (unique_grid_point_heights_m_asl is None and isinstance(
+            reflectivity_matrix_dbz, gridrad_io.GridradFieldView)):
+        unique_grid_point_heights_m_asl = (
+            reflectivity_matrix_dbz.unique_grid_point_heights_m_asl)
 
     error_checking.assert_is_numpy_array(
         unique_grid_point_heights_m_asl,
@@ -239,13 +309,20 @@ def get_echo_tops(
 
     echo_top_matrix_m_asl = numpy.full(
         (num_grid_rows, num_grid_columns), numpy.nan)
-    for i in range(num_grid_rows):
-        for j in range(num_grid_columns):
-            echo_top_matrix_m_asl[i, j] = (
-                radar_utils.get_echo_top_single_column(
-                    reflectivities_dbz=reflectivity_matrix_dbz[:, i, j],
-                    heights_m_asl=unique_grid_point_heights_m_asl,
-                    critical_reflectivity_dbz=critical_reflectivity_dbz,
-                    check_args=False))
+    for first_row_index, refl_matrix_for_chunk_dbz in _iterate_refl_chunks(
+            reflectivity_matrix_dbz, num_rows_per_chunk):
+        num_rows_in_chunk = refl_matrix_for_chunk_dbz.shape[1]
+        these_echo_tops_m_asl = radar_utils.get_echo_top_multi_column(
+            reflectivity_matrix_dbz=numpy.reshape(
+                refl_matrix_for_chunk_dbz.astype(float),
+                (num_grid_heights, num_rows_in_chunk * num_grid_columns)),
+            heights_m_asl=unique_grid_point_heights_m_asl,
+            critical_reflectivity_dbz=critical_reflectivity_dbz,
+            check_args=False)
+
+        echo_top_matrix_m_asl[
+            first_row_index:(first_row_index + num_rows_in_chunk), :
+        ] = numpy.reshape(
+            these_echo_tops_m_asl, (num_rows_in_chunk, num_grid_columns))
 
     return echo_top_matrix_m_asl
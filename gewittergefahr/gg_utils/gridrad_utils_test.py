@@ -146,6 +146,18 @@ class GridradUtilsTests(unittest.TestCase):
             this_column_max_matrix_dbz, COLUMN_MAX_REFL_MATRIX_DBZ,
             atol=TOLERANCE, equal_nan=True))
 
+    def test_get_column_max_reflectivity_chunked(self):
+        """Ensures correct output from get_column_max_reflectivity.
+
+        In this case, the grid is reduced in chunks of 2 rows.
+        """
+
+        this_column_max_matrix_dbz = gridrad_utils.get_column_max_reflectivity(
+            REFLECTIVITY_MATRIX_DBZ, num_rows_per_chunk=2)
+        self.assertTrue(numpy.allclose(
+            this_column_max_matrix_dbz, COLUMN_MAX_REFL_MATRIX_DBZ,
+            atol=TOLERANCE, equal_nan=True))
+
     def test_get_echo_tops(self):
         """Ensures correct output from get_echo_tops."""
 
@@ -158,6 +170,22 @@ class GridradUtilsTests(unittest.TestCase):
             this_echo_top_matrix_m_asl, ECHO_TOP_MATRIX_M_ASL, atol=TOLERANCE,
             equal_nan=True))
 
+    def test_get_echo_tops_chunked(self):
+        """Ensures correct output from get_echo_tops.
+
+        In this case, the grid is reduced in chunks of 2 rows.
+        """
+
+        this_echo_top_matrix_m_asl = gridrad_utils.get_echo_tops(
+            reflectivity_matrix_dbz=REFL_MATRIX_FOR_ECHO_TOPS_DBZ,
+            unique_grid_point_heights_m_asl=UNIQUE_GRID_POINT_HEIGHTS_M_ASL,
+            critical_reflectivity_dbz=CRIT_REFL_FOR_ECHO_TOPS_DBZ,
+            num_rows_per_chunk=2)
+
+        self.assertTrue(numpy.allclose(
+            this_echo_top_matrix_m_asl, ECHO_TOP_MATRIX_M_ASL, atol=TOLERANCE,
+            equal_nan=True))
+
 
 if __name__ == '__main__':
     unittest.main()
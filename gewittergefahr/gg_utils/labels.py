@@ -405,6 +405,52 @@ def check_label_table(label_table, require_storm_objects=True):
     return label_column_names
 
 
+def _get_segmented_percentiles(
+        sorted_values, segment_start_indices, percentile_level):
+    """Computes one percentile for each segment of a flat array.
+
+    N = number of segments
+    V = total number of values
+
+    Values in the [i]th segment are sorted_values[j], where j ranges from
+    segment_start_indices[i]...(segment_start_indices[i + 1] - 1).  Each
+    percentile is computed with linear interpolation, as in `numpy.percentile`.
+
+    :param sorted_values: length-V numpy array of values, sorted in ascending
+        order within each segment.
+    :param segment_start_indices: length-(N + 1) numpy array of offsets into
+        sorted_values.
+    :param percentile_level: Percentile level (from 0...100).
+    :return: percentiles: length-N numpy array of percentiles.  If a segment is
+        empty, the corresponding percentile is zero.
+    """
+
+    num_values_by_segment = numpy.diff(segment_start_indices)
+    percentiles = numpy.full(len(num_values_by_segment), 0.)
+
+    nonempty_indices = numpy.where(num_values_by_segment > 0)[0]
+    if not len(nonempty_indices):
+        return percentiles
+
+    these_num_values = num_values_by_segment[nonempty_indices]
+    these_positions = (percentile_level / 100.) * (these_num_values - 1)
+    these_below_indices = numpy.floor(these_positions).astype(int)
+    these_above_indices = numpy.minimum(
+        these_below_indices + 1, these_num_values - 1)
+
+    these_above_weights = these_positions - these_below_indices
+    these_below_weights = 1. - these_above_weights
+
+    these_first_indices = segment_start_indices[nonempty_indices]
+    percentiles[nonempty_indices] = (
+        sorted_values[these_first_indices + these_below_indices] *
+        these_below_weights +
+        sorted_values[these_first_indices + these_above_indices] *
+        these_above_weights)
+
+    return percentiles
+
+
 def label_wind_for_regression(
         storm_to_winds_table, min_lead_time_sec=DEFAULT_MIN_LEAD_TIME_SEC,
         max_lead_time_sec=DEFAULT_MAX_LEAD_TIME_SEC,
@@ -452,11 +498,57 @@ def label_wind_for_regression(
         max_distance_metres=max_distance_metres,
         percentile_level=percentile_level)
 
-    min_lead_time_sec = parameter_dict[MIN_LEAD_TIME_NAME]
-    max_lead_time_sec = parameter_dict[MAX_LEAD_TIME_NAME]
-    min_distance_metres = parameter_dict[MIN_DISTANCE_NAME]
-    max_distance_metres = parameter_dict[MAX_DISTANCE_NAME]
-    percentile_level = parameter_dict[PERCENTILE_LEVEL_NAME]
+    return label_wind_for_many_regressions(
+        storm_to_winds_table, [parameter_dict])
+
+
+def label_wind_for_many_regressions(
+        storm_to_winds_table, list_of_parameter_dicts):
+    """Labels each storm object for regression, with many label definitions.
+
+    P = number of label definitions
+
+    This method is equivalent to calling label_wind_for_regression P times,
+    but linkages are gathered from the flat arrays in storm_to_winds_table (see
+    `link_storms_to_winds.flatten_storm_to_winds_table`) and wind speeds are
+    sorted only once.  Label definitions with the same time and distance window
+    also share the same filtering.
+
+    :param storm_to_winds_table: See documentation for
+        label_wind_for_regression.
+    :param list_of_parameter_dicts: length-P list of dictionaries, each with
+        the keys listed below (see documentation for label_wind_for_regression).
+        Any other keys (e.g., "class_cutoffs_kt" from
+        column_name_to_label_params) are ignored.
+    list_of_parameter_dicts[j]['min_lead_time_sec']
+    list_of_parameter_dicts[j]['max_lead_time_sec']
+    list_of_parameter_dicts[j]['min_distance_metres']
+    list_of_parameter_dicts[j]['max_distance_metres']
+    list_of_parameter_dicts[j]['percentile_level']
+
+    :return: storm_to_winds_table: Same as input, except for the following.
+        [1] May have fewer rows (storm objects occurring too close to end of
+            tracking period, with respect to the largest max_lead_time_sec, are
+            removed).
+        [2] Contains P additional columns with regression labels.  The name of
+            each column is determined by get_column_name_for_regression_label.
+    """
+
+    error_checking.assert_is_list(list_of_parameter_dicts)
+    num_label_defs = len(list_of_parameter_dicts)
+    error_checking.assert_is_greater(num_label_defs, 0)
+
+    list_of_parameter_dicts = [
+        _check_regression_params(
+            min_lead_time_sec=d[MIN_LEAD_TIME_NAME],
+            max_lead_time_sec=d[MAX_LEAD_TIME_NAME],
+            min_distance_metres=d[MIN_DISTANCE_NAME],
+            max_distance_metres=d[MAX_DISTANCE_NAME],
+            percentile_level=d[PERCENTILE_LEVEL_NAME])
+        for d in list_of_parameter_dicts]
+
+    max_lead_time_sec = max(
+        [d[MAX_LEAD_TIME_NAME] for d in list_of_parameter_dicts])
 
     times_before_end_of_tracking_sec = (
         storm_to_winds_table[tracking_io.TRACKING_END_TIME_COLUMN] -
@@ -467,45 +559,74 @@ def label_wind_for_regression(
         storm_to_winds_table.index[bad_storm_object_rows], axis=0, inplace=True)
 
     num_storm_objects = len(storm_to_winds_table.index)
-    labels_m_s01 = numpy.full(num_storm_objects, numpy.nan)
-
-    for i in range(num_storm_objects):
-        these_relative_wind_times_sec = storm_to_winds_table[
-            storms_to_winds.RELATIVE_TIMES_COLUMN].values[i]
-        these_distances_metres = storm_to_winds_table[
-            storms_to_winds.LINKAGE_DISTANCES_COLUMN].values[i]
-
-        these_valid_time_flags = numpy.logical_and(
-            these_relative_wind_times_sec >= min_lead_time_sec,
-            these_relative_wind_times_sec <= max_lead_time_sec)
-        these_valid_distance_flags = numpy.logical_and(
-            these_distances_metres >= min_distance_metres,
-            these_distances_metres <= max_distance_metres)
-        these_valid_wind_flags = numpy.logical_and(
-            these_valid_time_flags, these_valid_distance_flags)
-        if not numpy.any(these_valid_wind_flags):
-            labels_m_s01[i] = 0.
-            continue
-
-        these_valid_wind_indices = numpy.where(these_valid_wind_flags)[0]
-        these_u_winds_m_s01 = storm_to_winds_table[
-            storms_to_winds.U_WINDS_COLUMN].values[i][these_valid_wind_indices]
-        these_v_winds_m_s01 = storm_to_winds_table[
-            storms_to_winds.V_WINDS_COLUMN].values[i][these_valid_wind_indices]
-
-        these_wind_speeds_m_s01 = numpy.sqrt(
-            these_u_winds_m_s01 ** 2 + these_v_winds_m_s01 ** 2)
-        labels_m_s01[i] = numpy.percentile(
-            these_wind_speeds_m_s01, percentile_level)
-
-    label_column_name = get_column_name_for_regression_label(
-        min_lead_time_sec=min_lead_time_sec,
-        max_lead_time_sec=max_lead_time_sec,
-        min_distance_metres=min_distance_metres,
-        max_distance_metres=max_distance_metres,
-        percentile_level=percentile_level)
+    flat_linkage_dict = storms_to_winds.flatten_storm_to_winds_table(
+        storm_to_winds_table)
 
-    return storm_to_winds_table.assign(**{label_column_name: labels_m_s01})
+    storm_object_indices = flat_linkage_dict[
+        storms_to_winds.STORM_OBJECT_INDICES_KEY]
+    wind_speeds_m_s01 = numpy.sqrt(
+        flat_linkage_dict[storms_to_winds.U_WINDS_COLUMN] ** 2 +
+        flat_linkage_dict[storms_to_winds.V_WINDS_COLUMN] ** 2)
+
+    sort_indices = numpy.lexsort((wind_speeds_m_s01, storm_object_indices))
+    storm_object_indices = storm_object_indices[sort_indices]
+    wind_speeds_m_s01 = wind_speeds_m_s01[sort_indices]
+    relative_wind_times_sec = flat_linkage_dict[
+        storms_to_winds.RELATIVE_TIMES_COLUMN][sort_indices]
+    distances_metres = flat_linkage_dict[
+        storms_to_winds.LINKAGE_DISTANCES_COLUMN][sort_indices]
+
+    window_to_winds_dict = {}
+    argument_dict = {}
+
+    for j in range(num_label_defs):
+        this_min_lead_time_sec = list_of_parameter_dicts[j][MIN_LEAD_TIME_NAME]
+        this_max_lead_time_sec = list_of_parameter_dicts[j][MAX_LEAD_TIME_NAME]
+        this_min_distance_metres = list_of_parameter_dicts[j][MIN_DISTANCE_NAME]
+        this_max_distance_metres = list_of_parameter_dicts[j][MAX_DISTANCE_NAME]
+        this_percentile_level = list_of_parameter_dicts[j][
+            PERCENTILE_LEVEL_NAME]
+
+        this_window = (this_min_lead_time_sec, this_max_lead_time_sec,
+                       this_min_distance_metres, this_max_distance_metres)
+
+        if this_window not in window_to_winds_dict:
+            these_valid_time_flags = numpy.logical_and(
+                relative_wind_times_sec >= this_min_lead_time_sec,
+                relative_wind_times_sec <= this_max_lead_time_sec)
+            these_valid_distance_flags = numpy.logical_and(
+                distances_metres >= this_min_distance_metres,
+                distances_metres <= this_max_distance_metres)
+            these_valid_wind_indices = numpy.where(numpy.logical_and(
+                these_valid_time_flags, these_valid_distance_flags))[0]
+
+            these_num_winds_by_storm_object = numpy.bincount(
+                storm_object_indices[these_valid_wind_indices],
+                minlength=num_storm_objects)
+            these_start_indices = numpy.concatenate((
+                numpy.array([0], dtype=int),
+                numpy.cumsum(these_num_winds_by_storm_object)))
+
+            window_to_winds_dict[this_window] = (
+                wind_speeds_m_s01[these_valid_wind_indices],
+                these_start_indices)
+
+        these_sorted_speeds_m_s01, these_start_indices = window_to_winds_dict[
+            this_window]
+        these_labels_m_s01 = _get_segmented_percentiles(
+            sorted_values=these_sorted_speeds_m_s01,
+            segment_start_indices=these_start_indices,
+            percentile_level=this_percentile_level)
+
+        this_column_name = get_column_name_for_regression_label(
+            min_lead_time_sec=this_min_lead_time_sec,
+            max_lead_time_sec=this_max_lead_time_sec,
+            min_distance_metres=this_min_distance_metres,
+            max_distance_metres=this_max_distance_metres,
+            percentile_level=this_percentile_level)
+        argument_dict[this_column_name] = these_labels_m_s01
+
+    return storm_to_winds_table.assign(**argument_dict)
 
 
 def label_wind_for_classification(
@@ -556,7 +677,7 @@ def label_wind_for_classification(
         max_distance_metres=max_distance_metres,
         percentile_level=percentile_level)
 
-    regression_label_column_name = get_column_name_for_classification_label(
+    regression_label_column_name = get_column_name_for_regression_label(
         min_lead_time_sec=min_lead_time_sec,
         max_lead_time_sec=max_lead_time_sec,
         min_distance_metres=min_distance_metres,
@@ -592,6 +713,8 @@ def write_labels(storm_to_winds_table, pickle_file_name):
 
     label_column_names = check_label_table(
         storm_to_winds_table, require_storm_objects=True)
+    storm_to_winds_table = storms_to_winds.add_ragged_linkage_columns(
+        storm_to_winds_table)
     columns_to_write = (
         label_column_names +
         storms_to_winds.get_columns_to_write(storm_to_winds_table))
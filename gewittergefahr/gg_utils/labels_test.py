@@ -38,6 +38,12 @@ COLUMN_NAME_FOR_CLASSIFICATION = (
     'distance=00001-05000m_cutoffs=10-20-30-40-50kt')
 FAKE_LABEL_COLUMN_NAME = 'poop'
 
+# The following constants are used to test _get_segmented_percentiles.
+SORTED_VALUES_BY_SEGMENT = numpy.array([1., 2., 3., 4., 5., 2., 4.])
+SEGMENT_START_INDICES = numpy.array([0, 4, 4, 5, 7], dtype=int)
+MEDIANS_BY_SEGMENT = numpy.array([2.5, 0., 5., 3.])
+MAXIMA_BY_SEGMENT = numpy.array([4., 0., 5., 4.])
+
 
 class LabelsTests(unittest.TestCase):
     """Each method is a unit test for labels.py."""
@@ -140,6 +146,30 @@ class LabelsTests(unittest.TestCase):
 
         self.assertTrue(this_column_name == COLUMN_NAME_FOR_CLASSIFICATION)
 
+    def test_get_segmented_percentiles_median(self):
+        """Ensures correct output from _get_segmented_percentiles.
+
+        In this case, percentile level is 50 (median).
+        """
+
+        these_medians = labels._get_segmented_percentiles(
+            sorted_values=SORTED_VALUES_BY_SEGMENT,
+            segment_start_indices=SEGMENT_START_INDICES, percentile_level=50.)
+        self.assertTrue(numpy.allclose(
+            these_medians, MEDIANS_BY_SEGMENT, atol=TOLERANCE))
+
+    def test_get_segmented_percentiles_max(self):
+        """Ensures correct output from _get_segmented_percentiles.
+
+        In this case, percentile level is 100 (maximum).
+        """
+
+        these_maxima = labels._get_segmented_percentiles(
+            sorted_values=SORTED_VALUES_BY_SEGMENT,
+            segment_start_indices=SEGMENT_START_INDICES, percentile_level=100.)
+        self.assertTrue(numpy.allclose(
+            these_maxima, MAXIMA_BY_SEGMENT, atol=TOLERANCE))
+
 
 if __name__ == '__main__':
     unittest.main()
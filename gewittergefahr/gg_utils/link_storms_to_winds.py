@@ -10,6 +10,7 @@ one storm object.
 """
 
 import copy
+import itertools
 import pickle
 import numpy
 import pandas
@@ -67,6 +68,23 @@ U_WINDS_COLUMN = 'u_winds_m_s01'
 V_WINDS_COLUMN = 'v_winds_m_s01'
 LINKAGE_DISTANCES_COLUMN = 'wind_distances_metres'
 RELATIVE_TIMES_COLUMN = 'relative_wind_times_sec'
+FLAT_LINKAGE_COLUMNS = [
+    STATION_IDS_COLUMN, WIND_LATITUDES_COLUMN, WIND_LONGITUDES_COLUMN,
+    U_WINDS_COLUMN, V_WINDS_COLUMN, LINKAGE_DISTANCES_COLUMN,
+    RELATIVE_TIMES_COLUMN]
+
+STORM_START_INDICES_KEY = 'storm_start_indices'
+STORM_OBJECT_INDICES_KEY = 'storm_object_indices'
+WIND_INDEX_KEY = 'wind_index'
+
+FLAT_LINKAGE_DICT_COLUMN = 'flat_linkage_dict'
+LINKAGE_START_INDEX_COLUMN = 'linkage_start_index'
+LINKAGE_END_INDEX_COLUMN = 'linkage_end_index'
+LINKAGE_GROUP_COLUMN = 'linkage_group_index'
+
+# Each call to _add_flat_linkage_columns takes the next group index, so that
+# rows from different flat arrays stay apart after tables are concatenated.
+_LINKAGE_GROUP_COUNTER = itertools.count()
 
 REQUIRED_COLUMNS_TO_WRITE = REQUIRED_STORM_COLUMNS + [
     START_TIME_COLUMN, END_TIME_COLUMN, STATION_IDS_COLUMN,
@@ -586,104 +604,333 @@ def _find_nearest_storms(
     return wind_table.assign(**argument_dict)
 
 
-def _create_storm_to_winds_table(storm_object_table, wind_to_storm_table):
-    """For each storm cell S, creates list of wind observations linked to S.
+def _create_flat_storm_to_winds_arrays(
+        storm_object_table, wind_to_storm_table):
+    """For each storm object, finds wind observations linked to its storm cell.
 
     N = number of storm objects
     K = number of wind observations
-    k = number of wind observations linked to a given storm cell
+    L = number of (storm object, wind observation) pairs
+
+    Linkages are returned in flattened form: arrays for all storm objects are
+    concatenated, with linkages for the [i]th storm object in elements
+    storm_start_indices[i]...(storm_start_indices[i + 1] - 1).  Within each
+    storm object, wind observations are in the same order as in
+    wind_to_storm_table.
 
     :param storm_object_table: N-row pandas DataFrame created by
         _storm_objects_to_cells.
     :param wind_to_storm_table: K-row pandas DataFrame created by
         _find_nearest_storms.
+    :return: flat_linkage_dict: Dictionary with the following keys.
+    flat_linkage_dict['storm_start_indices']: length-(N + 1) numpy array of
+        offsets into the other arrays.
+    flat_linkage_dict['storm_object_indices']: length-L numpy array, where the
+        [j]th element is the row (in storm_object_table) of the [j]th linkage.
+    flat_linkage_dict['wind_station_ids']: length-L numpy array of station IDs.
+    flat_linkage_dict['wind_latitudes_deg']: length-L numpy array of latitudes
+        (deg N).
+    flat_linkage_dict['wind_longitudes_deg']: length-L numpy array of
+        longitudes (deg E).
+    flat_linkage_dict['u_winds_m_s01']: length-L numpy array of u-components
+        (metres per second).
+    flat_linkage_dict['v_winds_m_s01']: length-L numpy array of v-components
+        (metres per second).
+    flat_linkage_dict['wind_distances_metres']: length-L numpy array of
+        distances between wind observation and storm object.
+    flat_linkage_dict['relative_wind_times_sec']: length-L numpy array of
+        relative times (wind time minus storm-object time).
+    """
+
+    num_storm_objects = len(storm_object_table.index)
+    nearest_storm_ids = wind_to_storm_table[NEAREST_STORM_ID_COLUMN].values
+    linked_wind_indices = numpy.where(
+        [s is not None for s in nearest_storm_ids])[0]
+
+    wind_index_table = pandas.DataFrame.from_dict({
+        tracking_io.STORM_ID_COLUMN: nearest_storm_ids[linked_wind_indices],
+        WIND_INDEX_KEY: linked_wind_indices})
+    storm_index_table = pandas.DataFrame.from_dict({
+        tracking_io.STORM_ID_COLUMN:
+            storm_object_table[tracking_io.STORM_ID_COLUMN].values,
+        STORM_OBJECT_INDICES_KEY: numpy.linspace(
+            0, num_storm_objects - 1, num=num_storm_objects, dtype=int)})
+
+    pair_table = storm_index_table.merge(
+        wind_index_table, on=tracking_io.STORM_ID_COLUMN, how='inner')
+    storm_object_indices = pair_table[
+        STORM_OBJECT_INDICES_KEY].values.astype(int)
+    wind_indices = pair_table[WIND_INDEX_KEY].values.astype(int)
+
+    sort_indices = numpy.lexsort((wind_indices, storm_object_indices))
+    storm_object_indices = storm_object_indices[sort_indices]
+    wind_indices = wind_indices[sort_indices]
+
+    num_winds_by_storm_object = numpy.bincount(
+        storm_object_indices, minlength=num_storm_objects)
+    storm_start_indices = numpy.concatenate((
+        numpy.array([0], dtype=int),
+        numpy.cumsum(num_winds_by_storm_object)))
+
+    relative_times_sec = (
+        wind_to_storm_table[raw_wind_io.TIME_COLUMN].values[wind_indices] -
+        storm_object_table[tracking_io.TIME_COLUMN].values[
+            storm_object_indices])
+
+    return {
+        STORM_START_INDICES_KEY: storm_start_indices,
+        STORM_OBJECT_INDICES_KEY: storm_object_indices,
+        STATION_IDS_COLUMN: wind_to_storm_table[
+            raw_wind_io.STATION_ID_COLUMN].values[wind_indices],
+        WIND_LATITUDES_COLUMN: wind_to_storm_table[
+            raw_wind_io.LATITUDE_COLUMN].values[wind_indices],
+        WIND_LONGITUDES_COLUMN: wind_to_storm_table[
+            raw_wind_io.LONGITUDE_COLUMN].values[wind_indices],
+        U_WINDS_COLUMN: wind_to_storm_table[
+            raw_wind_io.U_WIND_COLUMN].values[wind_indices],
+        V_WINDS_COLUMN: wind_to_storm_table[
+            raw_wind_io.V_WIND_COLUMN].values[wind_indices],
+        LINKAGE_DISTANCES_COLUMN: wind_to_storm_table[
+            LINKAGE_DISTANCE_COLUMN].values[wind_indices],
+        RELATIVE_TIMES_COLUMN: relative_times_sec
+    }
+
+
+def _add_flat_linkage_columns(storm_to_winds_table, flat_linkage_dict):
+    """Adds flat linkage arrays, and offsets into them, to storm-to-winds table.
+
+    N = number of storm objects
+
+    :param storm_to_winds_table: N-row pandas DataFrame.  The [i]th row must
+        correspond to the [i]th storm object in flat_linkage_dict.
+    :param flat_linkage_dict: Dictionary created by
+        _create_flat_storm_to_winds_arrays.
     :return: storm_to_winds_table: Same as input, but with additional columns
         listed below.
-    storm_to_winds_table.wind_station_ids: length-K list with string IDs of wind
-        stations.
-    storm_to_winds_table.wind_latitudes_deg: length-K numpy array with latitudes
-        (deg N) of wind stations.
-    storm_to_winds_table.wind_longitudes_deg: length-K numpy array with
-        longitudes (deg E) of wind stations.
-    storm_to_winds_table.u_winds_m_s01: length-K numpy array with u-components
-        (metres per second) of wind velocities.
-    storm_to_winds_table.v_winds_m_s01: length-K numpy array with v-components
-        (metres per second) of wind velocities.
-    storm_to_winds_table.wind_distances_metres: length-K numpy array with
-        distances of wind observations from storm object.
-    storm_to_winds_table.relative_wind_times_sec: length-K numpy array with
-        relative times of wind observations (wind time minus storm-object time).
+    storm_to_winds_table.flat_linkage_dict: Reference to flat_linkage_dict.
+    storm_to_winds_table.linkage_group_index: Integer index of
+        flat_linkage_dict (the same for every row, and different for each call
+        to this method).  Rows are grouped by this index, rather than by
+        identity of the dictionary, in flatten_storm_to_winds_table.
+    storm_to_winds_table.linkage_start_index: First index (into arrays in
+        flat_linkage_dict) of linkages for the given storm object.
+    storm_to_winds_table.linkage_end_index: Last index (into arrays in
+        flat_linkage_dict) of linkages for the given storm object, plus one.
     """
 
-    nested_array = storm_object_table[[
-        tracking_io.STORM_ID_COLUMN,
-        tracking_io.STORM_ID_COLUMN]].values.tolist()
+    storm_start_indices = flat_linkage_dict[STORM_START_INDICES_KEY]
+    flat_linkage_dicts = numpy.full(
+        len(storm_to_winds_table.index), None, dtype=object)
+    flat_linkage_dicts.fill(flat_linkage_dict)
+    linkage_group_indices = numpy.full(
+        len(storm_to_winds_table.index), next(_LINKAGE_GROUP_COUNTER),
+        dtype=int)
+
     argument_dict = {
-        STATION_IDS_COLUMN: nested_array, WIND_LATITUDES_COLUMN: nested_array,
-        WIND_LONGITUDES_COLUMN: nested_array, U_WINDS_COLUMN: nested_array,
-        V_WINDS_COLUMN: nested_array, LINKAGE_DISTANCES_COLUMN: nested_array,
-        RELATIVE_TIMES_COLUMN: nested_array}
+        FLAT_LINKAGE_DICT_COLUMN: flat_linkage_dicts,
+        LINKAGE_GROUP_COLUMN: linkage_group_indices,
+        LINKAGE_START_INDEX_COLUMN: storm_start_indices[:-1],
+        LINKAGE_END_INDEX_COLUMN: storm_start_indices[1:]
+    }
+    return storm_to_winds_table.assign(**argument_dict)
+
+
+def _create_storm_to_winds_table(storm_object_table, wind_to_storm_table):
+    """For each storm cell S, creates list of wind observations linked to S.
+
+    N = number of storm objects
+    K = number of wind observations
+
+    Linkages are not split into one array per storm object.  Instead, the table
+    holds the flat arrays created by _create_flat_storm_to_winds_arrays, along
+    with offsets into these arrays.  Use flatten_storm_to_winds_table to
+    retrieve linkages for all storm objects at once, or
+    add_ragged_linkage_columns to retrieve linkages for each storm object.
+
+    :param storm_object_table: N-row pandas DataFrame created by
+        _storm_objects_to_cells.
+    :param wind_to_storm_table: K-row pandas DataFrame created by
+        _find_nearest_storms.
+    :return: storm_to_winds_table: Same as input, but with additional columns
+        documented in _add_flat_linkage_columns.
+    """
+
+    flat_linkage_dict = _create_flat_storm_to_winds_arrays(
+        storm_object_table, wind_to_storm_table)
 
     storm_to_winds_table = copy.deepcopy(storm_object_table)
-    storm_to_winds_table = storm_to_winds_table.assign(**argument_dict)
+    return _add_flat_linkage_columns(storm_to_winds_table, flat_linkage_dict)
+
+
+def _flatten_ragged_linkage_columns(storm_to_winds_table):
+    """Converts ragged linkages in storm_to_winds_table to flat arrays.
+
+    :param storm_to_winds_table: pandas DataFrame with columns documented in
+        `write_storm_to_winds_table`.
+    :return: flat_linkage_dict: See doc for _create_flat_storm_to_winds_arrays.
+    """
+
     num_storm_objects = len(storm_to_winds_table.index)
+    num_winds_by_storm_object = numpy.array(
+        [len(x) for x in storm_to_winds_table[U_WINDS_COLUMN].values],
+        dtype=int)
+
+    flat_linkage_dict = {
+        STORM_START_INDICES_KEY: numpy.concatenate((
+            numpy.array([0], dtype=int),
+            numpy.cumsum(num_winds_by_storm_object))),
+        STORM_OBJECT_INDICES_KEY: numpy.repeat(
+            numpy.linspace(
+                0, num_storm_objects - 1, num=num_storm_objects, dtype=int),
+            num_winds_by_storm_object)
+    }
+
+    for this_column_name in FLAT_LINKAGE_COLUMNS:
+        these_arrays = [
+            numpy.asarray(x)
+            for x in storm_to_winds_table[this_column_name].values]
+
+        if these_arrays:
+            flat_linkage_dict[this_column_name] = numpy.concatenate(
+                these_arrays)
+        else:
+            flat_linkage_dict[this_column_name] = numpy.array([])
 
-    for i in range(num_storm_objects):
-        storm_to_winds_table[STATION_IDS_COLUMN].values[i] = []
-        storm_to_winds_table[WIND_LATITUDES_COLUMN].values[i] = []
-        storm_to_winds_table[WIND_LONGITUDES_COLUMN].values[i] = []
-        storm_to_winds_table[U_WINDS_COLUMN].values[i] = []
-        storm_to_winds_table[V_WINDS_COLUMN].values[i] = []
-        storm_to_winds_table[LINKAGE_DISTANCES_COLUMN].values[i] = []
-        storm_to_winds_table[RELATIVE_TIMES_COLUMN].values[i] = []
-
-    num_wind_observations = len(wind_to_storm_table.index)
-    for k in range(num_wind_observations):
-        this_storm_id = wind_to_storm_table[NEAREST_STORM_ID_COLUMN].values[k]
-        if this_storm_id is None:
+    return flat_linkage_dict
+
+
+def flatten_storm_to_winds_table(storm_to_winds_table):
+    """Returns linkages for all storm objects in storm_to_winds_table.
+
+    If the table contains flat linkage arrays (see _add_flat_linkage_columns),
+    linkages for the remaining storm objects are gathered from these arrays,
+    rather than one storm object at a time.  Rows are grouped by linkage-group
+    index, so this works after rows have been removed or reordered, after
+    tables have been concatenated, and after cell objects have been copied.
+    Otherwise, ragged linkages (one array per storm object) are concatenated.
+
+    This lets callers operate on wind observations for all storm objects at
+    once (rather than looping over storm objects).
+
+    :param storm_to_winds_table: pandas DataFrame created by
+        _create_storm_to_winds_table or read_storm_to_winds_table.
+    :return: flat_linkage_dict: See doc for _create_flat_storm_to_winds_arrays.
+        Storm-object indices are rows (positions) in storm_to_winds_table.
+    :raises: ValueError: if rows with the same linkage-group index refer to
+        flat arrays of different lengths, or if any offset is out of range.
+    """
+
+    if FLAT_LINKAGE_DICT_COLUMN not in storm_to_winds_table:
+        return _flatten_ragged_linkage_columns(storm_to_winds_table)
+
+    num_storm_objects = len(storm_to_winds_table.index)
+    linkage_start_indices = storm_to_winds_table[
+        LINKAGE_START_INDEX_COLUMN].values.astype(int)
+    num_winds_by_storm_object = (
+        storm_to_winds_table[LINKAGE_END_INDEX_COLUMN].values.astype(int) -
+        linkage_start_indices)
+
+    storm_start_indices = numpy.concatenate((
+        numpy.array([0], dtype=int), numpy.cumsum(num_winds_by_storm_object)))
+    num_linkages = storm_start_indices[-1]
+
+    storm_object_indices = numpy.repeat(
+        numpy.linspace(
+            0, num_storm_objects - 1, num=num_storm_objects, dtype=int),
+        num_winds_by_storm_object)
+    linkage_indices = (
+        numpy.linspace(0, num_linkages - 1, num=num_linkages, dtype=int) -
+        storm_start_indices[:-1][storm_object_indices] +
+        linkage_start_indices[storm_object_indices])
+
+    # Rows may refer to different flat arrays if tables were concatenated.
+    flat_linkage_dicts = storm_to_winds_table[FLAT_LINKAGE_DICT_COLUMN].values
+    _, first_rows_by_dict, dict_index_by_storm_object = numpy.unique(
+        storm_to_winds_table[LINKAGE_GROUP_COLUMN].values.astype(int),
+        return_index=True, return_inverse=True)
+    dict_index_by_linkage = dict_index_by_storm_object[storm_object_indices]
+
+    num_flat_linkages_by_storm_object = numpy.array(
+        [len(d[STORM_OBJECT_INDICES_KEY]) for d in flat_linkage_dicts],
+        dtype=int)
+    num_flat_linkages_by_dict = num_flat_linkages_by_storm_object[
+        first_rows_by_dict]
+
+    if not numpy.array_equal(
+            num_flat_linkages_by_storm_object,
+            num_flat_linkages_by_dict[dict_index_by_storm_object]):
+        raise ValueError('Rows with the same linkage-group index refer to flat '
+                         'arrays of different lengths.')
+
+    if numpy.any(num_winds_by_storm_object < 0) or numpy.any(
+            linkage_start_indices + num_winds_by_storm_object >
+            num_flat_linkages_by_storm_object):
+        raise ValueError('Linkage offsets are out of range of flat arrays.')
+
+    output_indices_by_dict = []
+    input_indices_by_dict = []
+    for k in range(len(first_rows_by_dict)):
+        these_output_indices = numpy.where(dict_index_by_linkage == k)[0]
+        output_indices_by_dict.append(these_output_indices)
+        input_indices_by_dict.append(linkage_indices[these_output_indices])
+
+    if output_indices_by_dict:
+        sort_indices = numpy.argsort(
+            numpy.concatenate(output_indices_by_dict), kind='mergesort')
+
+    flat_linkage_dict = {
+        STORM_START_INDICES_KEY: storm_start_indices,
+        STORM_OBJECT_INDICES_KEY: storm_object_indices
+    }
+
+    for this_column_name in FLAT_LINKAGE_COLUMNS:
+        if not output_indices_by_dict:
+            flat_linkage_dict[this_column_name] = numpy.array([])
             continue
 
-        this_storm_flags = [s == this_storm_id for s in storm_to_winds_table[
-            tracking_io.STORM_ID_COLUMN].values]
-        this_storm_rows = numpy.where(this_storm_flags)[0]
-
-        for i in range(len(this_storm_rows)):
-            j = this_storm_rows[i]
-            storm_to_winds_table[STATION_IDS_COLUMN].values[j].append(
-                wind_to_storm_table[raw_wind_io.STATION_ID_COLUMN].values[k])
-            storm_to_winds_table[WIND_LATITUDES_COLUMN].values[j].append(
-                wind_to_storm_table[raw_wind_io.LATITUDE_COLUMN].values[k])
-            storm_to_winds_table[WIND_LONGITUDES_COLUMN].values[j].append(
-                wind_to_storm_table[raw_wind_io.LONGITUDE_COLUMN].values[k])
-            storm_to_winds_table[U_WINDS_COLUMN].values[j].append(
-                wind_to_storm_table[raw_wind_io.U_WIND_COLUMN].values[k])
-            storm_to_winds_table[V_WINDS_COLUMN].values[j].append(
-                wind_to_storm_table[raw_wind_io.V_WIND_COLUMN].values[k])
-            storm_to_winds_table[LINKAGE_DISTANCES_COLUMN].values[j].append(
-                wind_to_storm_table[LINKAGE_DISTANCE_COLUMN].values[k])
-
-            this_relative_time_sec = (
-                wind_to_storm_table[raw_wind_io.TIME_COLUMN].values[k] -
-                storm_to_winds_table[tracking_io.TIME_COLUMN].values[j])
-            storm_to_winds_table[RELATIVE_TIMES_COLUMN].values[j].append(
-                this_relative_time_sec)
+        these_arrays = [
+            flat_linkage_dicts[first_rows_by_dict[k]][this_column_name][
+                input_indices_by_dict[k]]
+            for k in range(len(first_rows_by_dict))]
+        flat_linkage_dict[this_column_name] = numpy.concatenate(
+            these_arrays)[sort_indices]
 
-    for i in range(num_storm_objects):
-        storm_to_winds_table[WIND_LATITUDES_COLUMN].values[i] = numpy.asarray(
-            storm_to_winds_table[WIND_LATITUDES_COLUMN].values[i])
-        storm_to_winds_table[WIND_LONGITUDES_COLUMN].values[i] = numpy.asarray(
-            storm_to_winds_table[WIND_LONGITUDES_COLUMN].values[i])
-        storm_to_winds_table[U_WINDS_COLUMN].values[i] = numpy.asarray(
-            storm_to_winds_table[U_WINDS_COLUMN].values[i])
-        storm_to_winds_table[V_WINDS_COLUMN].values[i] = numpy.asarray(
-            storm_to_winds_table[V_WINDS_COLUMN].values[i])
-        storm_to_winds_table[LINKAGE_DISTANCES_COLUMN].values[i] = (
-            numpy.asarray(
-                storm_to_winds_table[LINKAGE_DISTANCES_COLUMN].values[i]))
-        storm_to_winds_table[RELATIVE_TIMES_COLUMN].values[i] = numpy.asarray(
-            storm_to_winds_table[RELATIVE_TIMES_COLUMN].values[i])
-
-    return storm_to_winds_table
+    return flat_linkage_dict
+
+
+def add_ragged_linkage_columns(storm_to_winds_table):
+    """Adds ragged linkages (one array per storm object) to the table.
+
+    Ragged linkages are used only in files and for plotting, so they are created
+    only when needed.
+
+    :param storm_to_winds_table: pandas DataFrame created by
+        _create_storm_to_winds_table or read_storm_to_winds_table.
+    :return: storm_to_winds_table: Same as input, but with ragged columns
+        documented in write_storm_to_winds_table.  If the input already contains
+        these columns, it is returned unchanged.
+    """
+
+    if all([c in storm_to_winds_table for c in FLAT_LINKAGE_COLUMNS]):
+        return storm_to_winds_table
+
+    flat_linkage_dict = flatten_storm_to_winds_table(storm_to_winds_table)
+    split_indices = flat_linkage_dict[STORM_START_INDICES_KEY][1:-1]
+    num_storm_objects = len(storm_to_winds_table.index)
+
+    argument_dict = {}
+    for this_column_name in FLAT_LINKAGE_COLUMNS:
+        these_arrays = numpy.split(
+            flat_linkage_dict[this_column_name], split_indices)
+        if this_column_name == STATION_IDS_COLUMN:
+            these_arrays = [a.tolist() for a in these_arrays]
+
+        argument_dict[this_column_name] = numpy.full(
+            num_storm_objects, None, dtype=object)
+        for i in range(num_storm_objects):
+            argument_dict[this_column_name][i] = these_arrays[i]
+
+    return storm_to_winds_table.assign(**argument_dict)
 
 
 def _read_storm_tracks(tracking_file_names):
@@ -755,9 +1002,13 @@ def _read_storm_tracks(tracking_file_names):
 
 def _read_wind_observations(
         storm_object_table, max_time_before_storm_start_sec,
-        max_time_after_storm_end_sec, top_directory_name):
+        max_time_after_storm_end_sec, top_directory_name,
+        file_extension=raw_wind_io.PROCESSED_FILE_EXTENSION):
     """Reads wind observations from one or more files.
 
+    Only columns in REQUIRED_WIND_COLUMNS are read, and only observations that
+    could possibly be linked to a storm (given the time constraints) are kept.
+
     :param storm_object_table: pandas DataFrame created by _read_storm_tracks.
     :param max_time_before_storm_start_sec: Max wind time before beginning of
         storm cell.  If wind observation W occurs >
@@ -768,22 +1019,23 @@ def _read_wind_observations(
         last time in storm cell S, W cannot be linked to S.
     :param top_directory_name: Name of top-level directory with wind
         observations (files created by `raw_wind_io.write_processed_file`).
-    :return: wind_table: pandas DataFrame with columns documented in
-        `raw_wind_io.write_processed_file`.
+    :param file_extension: Extension of wind files (see documentation for
+        `raw_wind_io.find_processed_file`).
+    :return: wind_table: pandas DataFrame with columns in REQUIRED_WIND_COLUMNS.
     """
 
-    min_wind_time_unix_sec = numpy.min(
+    min_wind_time_unix_sec = int(numpy.min(
         storm_object_table[tracking_io.TIME_COLUMN].values
-    ) - max_time_before_storm_start_sec
-    max_wind_time_unix_sec = numpy.max(
+    ) - max_time_before_storm_start_sec)
+    max_wind_time_unix_sec = int(numpy.max(
         storm_object_table[tracking_io.TIME_COLUMN].values
-    ) + max_time_after_storm_end_sec
+    ) + max_time_after_storm_end_sec)
 
     wind_file_names, _ = raw_wind_io.find_processed_hourly_files(
         start_time_unix_sec=min_wind_time_unix_sec,
         end_time_unix_sec=max_wind_time_unix_sec,
         primary_source=WIND_DATA_SOURCE, top_directory_name=top_directory_name,
-        raise_error_if_missing=True)
+        raise_error_if_missing=True, file_extension=file_extension)
 
     num_files = len(wind_file_names)
     list_of_wind_tables = [None] * num_files
@@ -793,7 +1045,9 @@ def _read_wind_observations(
                ' "{2:s}"...').format(i + 1, num_files, wind_file_names[i])
 
         list_of_wind_tables[i] = raw_wind_io.read_processed_file(
-            wind_file_names[i])[REQUIRED_WIND_COLUMNS]
+            wind_file_names[i], column_names=REQUIRED_WIND_COLUMNS,
+            start_time_unix_sec=min_wind_time_unix_sec,
+            end_time_unix_sec=max_wind_time_unix_sec)
         if i == 0:
             continue
 
@@ -825,7 +1079,8 @@ def link_each_storm_to_winds(
         padding_for_storm_bounding_box_metres=
         PADDING_FOR_STORM_BOUNDING_BOX_DEFAULT_METRES,
         interp_time_spacing_sec=INTERP_TIME_SPACING_DEFAULT_SEC,
-        max_linkage_dist_metres=MAX_LINKAGE_DIST_DEFAULT_METRES):
+        max_linkage_dist_metres=MAX_LINKAGE_DIST_DEFAULT_METRES,
+        wind_file_extension=raw_wind_io.PROCESSED_FILE_EXTENSION):
     """Links each storm cell to zero or more wind observations.
 
     :param storm_track_file_names: 1-D list of paths to storm-tracking files
@@ -855,6 +1110,8 @@ def link_each_storm_to_winds(
     :param max_linkage_dist_metres: Max linkage distance.  If the nearest storm
         to wind observation W is > max_linkage_dist_metres away, W will not be
         linked to any storm cells.
+    :param wind_file_extension: Extension of wind files (see documentation for
+        `raw_wind_io.find_processed_file`).
     :return: storm_to_winds_table: pandas DataFrame created by
         _create_storm_to_winds_table.
     """
@@ -877,7 +1134,8 @@ def link_each_storm_to_winds(
         storm_object_table,
         max_time_before_storm_start_sec=max_time_before_storm_start_sec,
         max_time_after_storm_end_sec=max_time_after_storm_end_sec,
-        top_directory_name=top_wind_directory_name)
+        top_directory_name=top_wind_directory_name,
+        file_extension=wind_file_extension)
     print SEPARATOR_STRING
 
     projection_object = _init_azimuthal_equidistant_projection(
@@ -945,6 +1203,10 @@ def write_storm_to_winds_table(storm_to_winds_table, pickle_file_names):
     storm_to_winds_table.relative_wind_times_sec: length-K numpy array with
         relative times of wind observations (wind time minus storm-object time).
 
+    Instead of the last 7 columns (ragged linkages), the table may contain flat
+    linkages created by _create_storm_to_winds_table.  In this case ragged
+    linkages are created (by add_ragged_linkage_columns) for each output file.
+
     :param pickle_file_names: length-N list of paths to output files.
     """
 
@@ -967,8 +1229,8 @@ def write_storm_to_winds_table(storm_to_winds_table, pickle_file_names):
             file_name=pickle_file_names[i])
 
         this_file_handle = open(pickle_file_names[i], 'wb')
-        this_table = storm_to_winds_table.loc[
-            storm_to_winds_table[FILE_INDEX_COLUMN] == i][columns_to_write]
+        this_table = add_ragged_linkage_columns(storm_to_winds_table.loc[
+            storm_to_winds_table[FILE_INDEX_COLUMN] == i])[columns_to_write]
         pickle.dump(this_table, this_file_handle)
         this_file_handle.close()
 
@@ -978,7 +1240,9 @@ def read_storm_to_winds_table(pickle_file_name):
 
     :param pickle_file_name: Path to input file.
     :return: storm_to_winds_table: pandas DataFrame with columns documented in
-        write_storm_to_winds_table.
+        write_storm_to_winds_table.  Linkages are also flattened once (see
+        _add_flat_linkage_columns), so that flatten_storm_to_winds_table need
+        not loop over storm objects.
     """
 
     pickle_file_handle = open(pickle_file_name, 'rb')
@@ -987,4 +1251,6 @@ def read_storm_to_winds_table(pickle_file_name):
 
     error_checking.assert_columns_in_dataframe(
         storm_to_winds_table, REQUIRED_COLUMNS_TO_WRITE)
-    return storm_to_winds_table
+    return _add_flat_linkage_columns(
+        storm_to_winds_table,
+        _flatten_ragged_linkage_columns(storm_to_winds_table))
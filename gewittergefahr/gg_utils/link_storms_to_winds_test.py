@@ -373,6 +373,27 @@ STORM_TO_WINDS_TABLE[storms_to_winds.RELATIVE_TIMES_COLUMN].values[
 STORM_TO_WINDS_TABLE[storms_to_winds.RELATIVE_TIMES_COLUMN].values[
     5] = numpy.array([0, 0, 0])
 
+# The following constants are used to test flatten_storm_to_winds_table.
+STORM_START_INDICES = numpy.array([0, 6, 9, 15, 18, 24, 27], dtype=int)
+STORM_OBJECT_INDICES = numpy.array(
+    [0, 0, 0, 0, 0, 0, 1, 1, 1, 2, 2, 2, 2, 2, 2, 3, 3, 3,
+     4, 4, 4, 4, 4, 4, 5, 5, 5], dtype=int)
+FLAT_U_WINDS_M_S01 = numpy.array(
+    [5., 6., 7., 5., 6., 7., 1., 2., 3., 5., 6., 7., 5., 6., 7., 1., 2., 3.,
+     5., 6., 7., 5., 6., 7., 1., 2., 3.])
+FLAT_RELATIVE_TIMES_SEC = numpy.array(
+    [600, 600, 600, 700, 700, 700, 600, 600, 600,
+     300, 300, 300, 400, 400, 400, 300, 300, 300,
+     -100, -100, -100, 0, 0, 0, 0, 0, 0])
+
+# The following constants are used to test flatten_storm_to_winds_table after
+# removing rows and concatenating tables.
+ROWS_TO_KEEP = numpy.array([5, 2, 3], dtype=int)
+FLAT_U_WINDS_KEPT_ROWS_M_S01 = numpy.array(
+    [1., 2., 3., 5., 6., 7., 5., 6., 7., 1., 2., 3.])
+FLAT_RELATIVE_TIMES_KEPT_ROWS_SEC = numpy.array(
+    [0, 0, 0, 300, 300, 300, 400, 400, 400, 300, 300, 300])
+
 
 class StormsToWindsTests(unittest.TestCase):
     """Each method is a unit test for storms_to_winds.py."""
@@ -535,7 +556,22 @@ class StormsToWindsTests(unittest.TestCase):
                 wind_to_storm_table=WIND_TO_STORM_TABLE))
 
         self.assertTrue(set(list(this_storm_to_winds_table)) ==
-                        set(list(STORM_TO_WINDS_TABLE)))
+                        set(list(STORM_OBJECT_TABLE_2CELLS) + [
+                            storms_to_winds.FLAT_LINKAGE_DICT_COLUMN,
+                            storms_to_winds.LINKAGE_GROUP_COLUMN,
+                            storms_to_winds.LINKAGE_START_INDEX_COLUMN,
+                            storms_to_winds.LINKAGE_END_INDEX_COLUMN]))
+        self.assertTrue(numpy.array_equal(
+            this_storm_to_winds_table[
+                storms_to_winds.LINKAGE_START_INDEX_COLUMN].values,
+            STORM_START_INDICES[:-1]))
+        self.assertTrue(numpy.array_equal(
+            this_storm_to_winds_table[
+                storms_to_winds.LINKAGE_END_INDEX_COLUMN].values,
+            STORM_START_INDICES[1:]))
+
+        this_storm_to_winds_table = storms_to_winds.add_ragged_linkage_columns(
+            this_storm_to_winds_table)
         self.assertTrue(len(this_storm_to_winds_table.index) ==
                         len(STORM_TO_WINDS_TABLE.index))
 
@@ -555,6 +591,164 @@ class StormsToWindsTests(unittest.TestCase):
                         STORM_TO_WINDS_TABLE[this_column_name].values[i],
                         atol=TOLERANCE))
 
+    def test_flatten_storm_to_winds_table(self):
+        """Ensures correct output from flatten_storm_to_winds_table.
+
+        In this case, the table contains only ragged linkages.
+        """
+
+        this_flat_linkage_dict = storms_to_winds.flatten_storm_to_winds_table(
+            STORM_TO_WINDS_TABLE)
+
+        self.assertTrue(numpy.array_equal(
+            this_flat_linkage_dict[storms_to_winds.STORM_START_INDICES_KEY],
+            STORM_START_INDICES))
+        self.assertTrue(numpy.array_equal(
+            this_flat_linkage_dict[storms_to_winds.STORM_OBJECT_INDICES_KEY],
+            STORM_OBJECT_INDICES))
+        self.assertTrue(numpy.allclose(
+            this_flat_linkage_dict[storms_to_winds.U_WINDS_COLUMN],
+            FLAT_U_WINDS_M_S01, atol=TOLERANCE))
+        self.assertTrue(numpy.array_equal(
+            this_flat_linkage_dict[storms_to_winds.RELATIVE_TIMES_COLUMN],
+            FLAT_RELATIVE_TIMES_SEC))
+
+    def test_flatten_storm_to_winds_table_flat(self):
+        """Ensures correct output from flatten_storm_to_winds_table.
+
+        In this case, the table contains flat linkages.
+        """
+
+        this_storm_to_winds_table = (
+            storms_to_winds._create_storm_to_winds_table(
+                storm_object_table=STORM_OBJECT_TABLE_2CELLS,
+                wind_to_storm_table=WIND_TO_STORM_TABLE))
+        this_flat_linkage_dict = storms_to_winds.flatten_storm_to_winds_table(
+            this_storm_to_winds_table)
+
+        self.assertTrue(numpy.array_equal(
+            this_flat_linkage_dict[storms_to_winds.STORM_START_INDICES_KEY],
+            STORM_START_INDICES))
+        self.assertTrue(numpy.array_equal(
+            this_flat_linkage_dict[storms_to_winds.STORM_OBJECT_INDICES_KEY],
+            STORM_OBJECT_INDICES))
+        self.assertTrue(numpy.allclose(
+            this_flat_linkage_dict[storms_to_winds.U_WINDS_COLUMN],
+            FLAT_U_WINDS_M_S01, atol=TOLERANCE))
+        self.assertTrue(numpy.array_equal(
+            this_flat_linkage_dict[storms_to_winds.RELATIVE_TIMES_COLUMN],
+            FLAT_RELATIVE_TIMES_SEC))
+
+    def test_flatten_storm_to_winds_table_subset(self):
+        """Ensures correct output from flatten_storm_to_winds_table.
+
+        In this case, the table contains flat linkages and some rows have been
+        removed and reordered.
+        """
+
+        this_storm_to_winds_table = (
+            storms_to_winds._create_storm_to_winds_table(
+                storm_object_table=STORM_OBJECT_TABLE_2CELLS,
+                wind_to_storm_table=WIND_TO_STORM_TABLE))
+        this_flat_linkage_dict = storms_to_winds.flatten_storm_to_winds_table(
+            this_storm_to_winds_table.iloc[ROWS_TO_KEEP])
+
+        self.assertTrue(numpy.array_equal(
+            this_flat_linkage_dict[storms_to_winds.STORM_START_INDICES_KEY],
+            numpy.array([0, 3, 9, 12], dtype=int)))
+        self.assertTrue(numpy.allclose(
+            this_flat_linkage_dict[storms_to_winds.U_WINDS_COLUMN],
+            FLAT_U_WINDS_KEPT_ROWS_M_S01, atol=TOLERANCE))
+        self.assertTrue(numpy.array_equal(
+            this_flat_linkage_dict[storms_to_winds.RELATIVE_TIMES_COLUMN],
+            FLAT_RELATIVE_TIMES_KEPT_ROWS_SEC))
+
+    def test_flatten_storm_to_winds_table_concat(self):
+        """Ensures correct output from flatten_storm_to_winds_table.
+
+        In this case, the table is a concatenation of two tables, each with its
+        own flat linkages.
+        """
+
+        first_storm_to_winds_table = (
+            storms_to_winds._create_storm_to_winds_table(
+                storm_object_table=STORM_OBJECT_TABLE_2CELLS,
+                wind_to_storm_table=WIND_TO_STORM_TABLE))
+        second_storm_to_winds_table = (
+            storms_to_winds._create_storm_to_winds_table(
+                storm_object_table=STORM_OBJECT_TABLE_2CELLS,
+                wind_to_storm_table=WIND_TO_STORM_TABLE))
+
+        this_storm_to_winds_table = pandas.concat(
+            [first_storm_to_winds_table.iloc[ROWS_TO_KEEP[:1]],
+             second_storm_to_winds_table.iloc[ROWS_TO_KEEP[1:]]],
+            axis=0, ignore_index=True)
+        this_flat_linkage_dict = storms_to_winds.flatten_storm_to_winds_table(
+            this_storm_to_winds_table)
+
+        self.assertTrue(numpy.allclose(
+            this_flat_linkage_dict[storms_to_winds.U_WINDS_COLUMN],
+            FLAT_U_WINDS_KEPT_ROWS_M_S01, atol=TOLERANCE))
+        self.assertTrue(numpy.array_equal(
+            this_flat_linkage_dict[storms_to_winds.RELATIVE_TIMES_COLUMN],
+            FLAT_RELATIVE_TIMES_KEPT_ROWS_SEC))
+
+        self.assertFalse(numpy.array_equal(
+            first_storm_to_winds_table[
+                storms_to_winds.LINKAGE_GROUP_COLUMN].values,
+            second_storm_to_winds_table[
+                storms_to_winds.LINKAGE_GROUP_COLUMN].values))
+
+    def test_flatten_storm_to_winds_table_copied_cells(self):
+        """Ensures correct output from flatten_storm_to_winds_table.
+
+        In this case, the table contains flat linkages and each row has its own
+        copy of the flat arrays.
+        """
+
+        this_storm_to_winds_table = (
+            storms_to_winds._create_storm_to_winds_table(
+                storm_object_table=STORM_OBJECT_TABLE_2CELLS,
+                wind_to_storm_table=WIND_TO_STORM_TABLE))
+        this_storm_to_winds_table = this_storm_to_winds_table.iloc[
+            ROWS_TO_KEEP]
+
+        these_flat_linkage_dicts = this_storm_to_winds_table[
+            storms_to_winds.FLAT_LINKAGE_DICT_COLUMN].values
+        for i in range(len(these_flat_linkage_dicts)):
+            these_flat_linkage_dicts[i] = copy.deepcopy(
+                these_flat_linkage_dicts[i])
+
+        this_flat_linkage_dict = storms_to_winds.flatten_storm_to_winds_table(
+            this_storm_to_winds_table)
+
+        self.assertTrue(numpy.allclose(
+            this_flat_linkage_dict[storms_to_winds.U_WINDS_COLUMN],
+            FLAT_U_WINDS_KEPT_ROWS_M_S01, atol=TOLERANCE))
+        self.assertTrue(numpy.array_equal(
+            this_flat_linkage_dict[storms_to_winds.RELATIVE_TIMES_COLUMN],
+            FLAT_RELATIVE_TIMES_KEPT_ROWS_SEC))
+
+    def test_flatten_storm_to_winds_table_mismatched_group(self):
+        """Ensures that flatten_storm_to_winds_table raises error.
+
+        In this case, one row refers to different flat arrays than other rows
+        with the same linkage-group index.
+        """
+
+        this_storm_to_winds_table = (
+            storms_to_winds._create_storm_to_winds_table(
+                storm_object_table=STORM_OBJECT_TABLE_2CELLS,
+                wind_to_storm_table=WIND_TO_STORM_TABLE))
+        this_storm_to_winds_table[
+            storms_to_winds.FLAT_LINKAGE_DICT_COLUMN].values[0] = (
+                storms_to_winds._flatten_ragged_linkage_columns(
+                    STORM_TO_WINDS_TABLE.iloc[:2]))
+
+        with self.assertRaises(ValueError):
+            storms_to_winds.flatten_storm_to_winds_table(
+                this_storm_to_winds_table)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -16,6 +16,7 @@ Lagerquist, R., McGovern, A., and Smith, T., 2017: Machine learning for real-
 
 import copy
 import numpy
+import scipy.stats
 import sklearn.metrics
 from gewittergefahr.gg_utils import grids
 from gewittergefahr.gg_utils import bootstrapping
@@ -579,6 +580,43 @@ def get_area_under_roc_curve(pofd_by_threshold, pod_by_threshold):
         pofd_by_threshold[real_indices], pod_by_threshold[real_indices])
 
 
+def get_area_under_roc_curve_from_probs(
+        forecast_probabilities=None, observed_labels=None):
+    """Computes area under ROC curve directly from forecast probabilities.
+
+    This method uses the rank-sum (Mann-Whitney) formulation, which requires
+    only one sort of the forecasts, rather than binarizing them at many
+    thresholds.  Tied forecasts receive their average rank, so the result is
+    the same as `sklearn.metrics.roc_auc_score`.
+
+    N = number of forecasts
+
+    :param forecast_probabilities: See documentation for
+        _check_forecast_probs_and_observed_labels.
+    :param observed_labels: See doc for
+        _check_forecast_probs_and_observed_labels.
+    :return: area_under_curve: Area under ROC curve.  If all observed labels are
+        the same, this is NaN.
+    """
+
+    _check_forecast_probs_and_observed_labels(
+        forecast_probabilities, observed_labels)
+
+    positive_flags = observed_labels == 1
+    num_positive_examples = numpy.sum(positive_flags)
+    num_negative_examples = len(observed_labels) - num_positive_examples
+    if num_positive_examples == 0 or num_negative_examples == 0:
+        return numpy.nan
+
+    forecast_ranks = scipy.stats.rankdata(forecast_probabilities)
+    rank_sum_for_positives = numpy.sum(forecast_ranks[positive_flags])
+
+    return (
+        (rank_sum_for_positives -
+         num_positive_examples * (num_positive_examples + 1) / 2.) /
+        (num_positive_examples * num_negative_examples))
+
+
 def get_points_in_roc_curve(
         forecast_probabilities=None, observed_labels=None, threshold_arg=None,
         unique_forecast_precision=DEFAULT_PRECISION_FOR_THRESHOLDS):
@@ -91,6 +91,10 @@ CROSS_ENTROPY = -0.1 * numpy.sum(
     numpy.log2(MODIFIED_FORECAST_PROBS_FOR_XENTROPY[-5:]) +
     numpy.log2(1 - MODIFIED_FORECAST_PROBS_FOR_XENTROPY[:5]))
 
+# The following constants are used to test
+# get_area_under_roc_curve_from_probs.
+AUC_FROM_PROBS = 0.82
+
 # The following constants are used to test get_points_in_roc_curve.
 ROC_AND_PERFORMANCE_THRESHOLDS = numpy.array(
     [0., 0.04, 0.05, 0.08, 0.11, 0.18, 0.27, 0.29, 0.8, 0.95,
@@ -550,6 +554,29 @@ class ModelEvaluationTests(unittest.TestCase):
             these_pofd_by_threshold, these_pod_by_threshold)
         self.assertTrue(numpy.isnan(this_auc))
 
+    def test_get_area_under_roc_curve_from_probs(self):
+        """Ensures correct output from get_area_under_roc_curve_from_probs.
+
+        In this case, one positive and one negative example have the same
+        forecast probability.
+        """
+
+        this_auc = model_eval.get_area_under_roc_curve_from_probs(
+            forecast_probabilities=FORECAST_PROBS_FOR_BS_AND_XENTROPY,
+            observed_labels=OBSERVED_LABELS)
+        self.assertTrue(numpy.isclose(this_auc, AUC_FROM_PROBS, atol=TOLERANCE))
+
+    def test_get_area_under_roc_curve_from_probs_one_class(self):
+        """Ensures correct output from get_area_under_roc_curve_from_probs.
+
+        In this case, all observed labels are the same.
+        """
+
+        this_auc = model_eval.get_area_under_roc_curve_from_probs(
+            forecast_probabilities=FORECAST_PROBS_FOR_BS_AND_XENTROPY,
+            observed_labels=numpy.full(len(OBSERVED_LABELS), 1, dtype=int))
+        self.assertTrue(numpy.isnan(this_auc))
+
     def test_get_points_in_roc_curve(self):
         """Ensures correct output from get_points_in_roc_curve."""
 
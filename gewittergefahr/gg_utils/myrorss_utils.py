@@ -9,24 +9,65 @@ Ortega, K., and Coauthors, 2012: "The multi-year reanalysis of remotely sensed
     American Meteorological Society.
 """
 
+import multiprocessing
 import numpy
 from gewittergefahr.gg_io import radar_io
+from gewittergefahr.gg_utils import grids
 from gewittergefahr.gg_utils import time_conversion
 from gewittergefahr.gg_utils import radar_utils
 from gewittergefahr.gg_utils import radar_sparse_to_full as radar_s2f
 from gewittergefahr.gg_utils import error_checking
 
 DEFAULT_TOP_INPUT_HEIGHT_FOR_ECHO_TOPS_M_ASL = 20000
+DEFAULT_NUM_PROCESSES_FOR_ECHO_TOPS = 1
+
+
+def _read_refl_at_grid_points(argument_list):
+    """Reads single-height reflectivity at the given grid points.
+
+    P = number of grid points
+
+    :param argument_list: List with the following items (packed into one
+        argument, so that this method can be mapped over a worker pool).
+    argument_list[0]: Path to input file (single-height reflectivity).
+    argument_list[1]: length-P numpy array of linear indices (into full grid).
+    argument_list[2]: Lowest reflectivity to consider (lower values will be
+        replaced with NaN).
+    :return: reflectivities_dbz: length-P numpy array of reflectivities.
+    """
+
+    file_name = argument_list[0]
+    print 'Reading "{0:s}" for echo-top calculation...'.format(file_name)
+
+    metadata_dict = radar_io.read_metadata_from_raw_file(
+        file_name, data_source=radar_io.MYRORSS_SOURCE_ID)
+    sparse_grid_table = radar_io.read_data_from_sparse_grid_file(
+        file_name,
+        field_name_orig=metadata_dict[radar_io.FIELD_NAME_COLUMN_ORIG],
+        data_source=radar_io.MYRORSS_SOURCE_ID,
+        sentinel_values=metadata_dict[radar_io.SENTINEL_VALUE_COLUMN])
+
+    return radar_s2f.get_values_at_linear_indices(
+        sparse_grid_table, field_name=metadata_dict[radar_io.FIELD_NAME_COLUMN],
+        num_grid_rows=metadata_dict[radar_io.NUM_LAT_COLUMN],
+        num_grid_columns=metadata_dict[radar_io.NUM_LNG_COLUMN],
+        linear_indices=argument_list[1], ignore_if_below=argument_list[2])
 
 
 def get_echo_tops(unix_time_sec, spc_date_string, top_directory_name,
                   critical_reflectivity_dbz, top_height_to_consider_m_asl=
                   DEFAULT_TOP_INPUT_HEIGHT_FOR_ECHO_TOPS_M_ASL,
-                  lowest_refl_to_consider_dbz=None):
+                  lowest_refl_to_consider_dbz=None,
+                  num_processes=DEFAULT_NUM_PROCESSES_FOR_ECHO_TOPS):
     """Finds echo top at each horizontal location.
 
     "Echo top" is max height with reflectivity >= critical reflectivity.
 
+    Sparse grids are never converted to full grids.  Echo tops are computed
+    only at grid points where column-max reflectivity >= critical
+    reflectivity, and single-height reflectivity is decoded only at these
+    points.
+
     M = number of rows (unique grid-point latitudes)
     N = number of columns (unique grid-point longitudes)
 
@@ -39,6 +80,8 @@ def get_echo_tops(unix_time_sec, spc_date_string, top_directory_name,
         above sea level).
     :param lowest_refl_to_consider_dbz: Lowest reflectivity to consider in echo
         top calculations.  If None, will consider all reflectivities.
+    :param num_processes: Number of processes used to read single-height
+        reflectivity files.  If 1, files will be read serially.
     :return: echo_top_matrix_m_asl: M-by-N matrix of echo tops (metres above sea
         level).  Latitude increases down each column, and longitude increases to
         the right along each row.
@@ -53,6 +96,8 @@ def get_echo_tops(unix_time_sec, spc_date_string, top_directory_name,
     error_checking.assert_is_greater(critical_reflectivity_dbz, 0.)
     error_checking.assert_is_integer(top_height_to_consider_m_asl)
     error_checking.assert_is_greater(top_height_to_consider_m_asl, 0)
+    error_checking.assert_is_integer(num_processes)
+    error_checking.assert_is_geq(num_processes, 1)
 
     if lowest_refl_to_consider_dbz is None:
         lowest_refl_to_consider_dbz = 0.
@@ -93,16 +138,24 @@ def get_echo_tops(unix_time_sec, spc_date_string, top_directory_name,
         data_source=radar_io.MYRORSS_SOURCE_ID,
         sentinel_values=metadata_dict[radar_io.SENTINEL_VALUE_COLUMN])
 
-    (column_max_refl_matrix_dbz,
-     grid_point_latitudes_deg,
-     grid_point_longitudes_deg) = radar_s2f.sparse_to_full_grid(
-         this_sparse_grid_table, metadata_dict)
-
-    num_grid_rows = len(grid_point_latitudes_deg)
-    num_grid_columns = len(grid_point_longitudes_deg)
-    linear_indices_to_consider = numpy.where(numpy.reshape(
-        column_max_refl_matrix_dbz, num_grid_rows * num_grid_columns) >=
-                                             critical_reflectivity_dbz)[0]
+    num_grid_rows = metadata_dict[radar_io.NUM_LAT_COLUMN]
+    num_grid_columns = metadata_dict[radar_io.NUM_LNG_COLUMN]
+    min_latitude_deg = metadata_dict[radar_io.NW_GRID_POINT_LAT_COLUMN] - (
+        metadata_dict[radar_io.LAT_SPACING_COLUMN] * (num_grid_rows - 1))
+
+    grid_point_latitudes_deg, grid_point_longitudes_deg = (
+        grids.get_latlng_grid_points(
+            min_latitude_deg=min_latitude_deg,
+            min_longitude_deg=metadata_dict[radar_io.NW_GRID_POINT_LNG_COLUMN],
+            lat_spacing_deg=metadata_dict[radar_io.LAT_SPACING_COLUMN],
+            lng_spacing_deg=metadata_dict[radar_io.LNG_SPACING_COLUMN],
+            num_rows=num_grid_rows, num_columns=num_grid_columns))
+
+    linear_indices_to_consider = radar_s2f.get_linear_indices_at_or_above(
+        this_sparse_grid_table,
+        field_name=metadata_dict[radar_io.FIELD_NAME_COLUMN],
+        num_grid_rows=num_grid_rows, num_grid_columns=num_grid_columns,
+        threshold=critical_reflectivity_dbz)
 
     print ('Echo-top calculation is needed at only {0:d}/{1:d} horizontal grid '
            'points!').format(len(linear_indices_to_consider),
@@ -112,42 +165,38 @@ def get_echo_tops(unix_time_sec, spc_date_string, top_directory_name,
         (num_grid_rows, num_grid_columns), numpy.nan)
     num_horiz_points_to_consider = len(linear_indices_to_consider)
     if num_horiz_points_to_consider == 0:
-        return echo_top_matrix_m_asl
-
-    grid_rows_to_consider, grid_columns_to_consider = numpy.unravel_index(
-        linear_indices_to_consider, (num_grid_rows, num_grid_columns))
-    reflectivity_matrix_dbz = numpy.full(
-        (num_grid_heights, num_horiz_points_to_consider), numpy.nan)
-
-    for k in range(num_grid_heights):
-        print 'Reading "{0:s}" for echo-top calculation...'.format(
-            single_height_refl_file_names[k])
-
-        this_metadata_dict = radar_io.read_metadata_from_raw_file(
-            single_height_refl_file_names[k],
-            data_source=radar_io.MYRORSS_SOURCE_ID)
-        this_sparse_grid_table = radar_io.read_data_from_sparse_grid_file(
-            single_height_refl_file_names[k],
-            field_name_orig=this_metadata_dict[radar_io.FIELD_NAME_COLUMN_ORIG],
-            data_source=radar_io.MYRORSS_SOURCE_ID,
-            sentinel_values=this_metadata_dict[radar_io.SENTINEL_VALUE_COLUMN])
-
-        this_reflectivity_matrix_dbz, _, _ = radar_s2f.sparse_to_full_grid(
-            this_sparse_grid_table, this_metadata_dict,
-            ignore_if_below=lowest_refl_to_consider_dbz)
-        reflectivity_matrix_dbz[k, :] = this_reflectivity_matrix_dbz[
-            grid_rows_to_consider, grid_columns_to_consider]
+        return (echo_top_matrix_m_asl, grid_point_latitudes_deg,
+                grid_point_longitudes_deg, metadata_dict)
+
+    argument_lists = [
+        [f, linear_indices_to_consider, lowest_refl_to_consider_dbz]
+        for f in single_height_refl_file_names]
+
+    if num_processes == 1:
+        list_of_refl_arrays_dbz = map(
+            _read_refl_at_grid_points, argument_lists)
+    else:
+        worker_pool = multiprocessing.Pool(
+            processes=min([num_processes, num_grid_heights]))
+        try:
+            list_of_refl_arrays_dbz = worker_pool.map(
+                _read_refl_at_grid_points, argument_lists)
+        finally:
+            worker_pool.close()
+            worker_pool.join()
+
+    reflectivity_matrix_dbz = numpy.vstack(list_of_refl_arrays_dbz)
 
     print 'Computing echo tops at the {0:d} horizontal grid points...'.format(
         num_horiz_points_to_consider)
 
-    for i in range(num_horiz_points_to_consider):
-        echo_top_matrix_m_asl[
-            grid_rows_to_consider[i], grid_columns_to_consider[i]] = (
-                radar_utils.get_echo_top_single_column(
-                    reflectivities_dbz=reflectivity_matrix_dbz[:, i],
-                    heights_m_asl=grid_point_heights_m_asl,
-                    critical_reflectivity_dbz=critical_reflectivity_dbz))
+    grid_rows_to_consider, grid_columns_to_consider = numpy.unravel_index(
+        linear_indices_to_consider, (num_grid_rows, num_grid_columns))
+    echo_top_matrix_m_asl[grid_rows_to_consider, grid_columns_to_consider] = (
+        radar_utils.get_echo_top_multi_column(
+            reflectivity_matrix_dbz=reflectivity_matrix_dbz,
+            heights_m_asl=grid_point_heights_m_asl,
+            critical_reflectivity_dbz=critical_reflectivity_dbz))
 
-    return (numpy.flipud(echo_top_matrix_m_asl), grid_point_latitudes_deg[::-1],
+    return (numpy.flipud(echo_top_matrix_m_asl), grid_point_latitudes_deg,
             grid_point_longitudes_deg, metadata_dict)
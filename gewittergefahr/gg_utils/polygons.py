@@ -22,6 +22,9 @@ from gewittergefahr.gg_utils import error_checking
 
 TOLERANCE = 1e-6
 
+# Default resolution of `shapely.geometry.Polygon.buffer`.
+NUM_BUFFER_SEGMENTS_PER_QUADRANT = 16
+
 UP_DIRECTION_NAME = 'up'
 DOWN_DIRECTION_NAME = 'down'
 RIGHT_DIRECTION_NAME = 'right'
@@ -280,27 +283,27 @@ def _remove_redundant_vertices(row_indices_orig, column_indices_orig):
 
     _check_vertex_arrays(column_indices_orig, row_indices_orig, allow_nan=False)
 
-    num_vertices_orig = len(row_indices_orig)
-    row_indices = numpy.array([])
-    column_indices = numpy.array([])
+    # When a vertex is repeated, everything after its first occurrence is a loop
+    # and is removed.  Positions of vertices in the output are kept in a
+    # dictionary, so that each vertex is looked up in constant time.
+    vertex_tuples = []
+    vertex_to_position_dict = {}
+
+    for this_vertex_tuple in zip(row_indices_orig[:-1],
+                                 column_indices_orig[:-1]):
+        if this_vertex_tuple not in vertex_to_position_dict:
+            vertex_to_position_dict[this_vertex_tuple] = len(vertex_tuples)
+            vertex_tuples.append(this_vertex_tuple)
+            continue
 
-    for i in range(num_vertices_orig - 1):
-        found_flags = numpy.logical_and(
-            row_indices == row_indices_orig[i],
-            column_indices == column_indices_orig[i])
+        this_position = vertex_to_position_dict[this_vertex_tuple]
+        for this_removed_tuple in vertex_tuples[(this_position + 1):]:
+            del vertex_to_position_dict[this_removed_tuple]
+        del vertex_tuples[(this_position + 1):]
 
-        if not numpy.any(found_flags):
-            row_indices = numpy.concatenate(
-                (row_indices, row_indices_orig[[i]]))
-            column_indices = numpy.concatenate(
-                (column_indices, column_indices_orig[[i]]))
-        else:
-            found_index = numpy.where(found_flags)[0][0]
-            row_indices = row_indices[0:(found_index + 1)]
-            column_indices = column_indices[0:(found_index + 1)]
-
-    row_indices = numpy.concatenate((row_indices, row_indices[[0]]))
-    column_indices = numpy.concatenate((column_indices, column_indices[[0]]))
+    vertex_tuples.append(vertex_tuples[0])
+    row_indices = numpy.array([t[0] for t in vertex_tuples], dtype=float)
+    column_indices = numpy.array([t[1] for t in vertex_tuples], dtype=float)
     return row_indices, column_indices
 
 
@@ -391,6 +394,120 @@ def _binary_matrix_to_grid_points_in_poly(binary_matrix, first_row_index,
             column_indices_in_subgrid + first_column_index)
 
 
+def _find_grid_points_in_or_on_polygon(
+        vertex_x_coords, vertex_y_coords, grid_point_x_coords,
+        grid_point_y_coords):
+    """Finds grid points inside or touching a simple polygon.
+
+    This method uses a scanline (crossing-number) test, vectorized over all grid
+    points in each row, and gives the same answer as is_point_in_or_on_polygon.
+    Points on an edge are found exactly when the intersection of the edge with
+    the row is exactly representable, which is always true for vertices on grid
+    points or grid-cell edges.
+
+    V = number of vertices
+    M = number of grid rows
+    N = number of grid columns
+
+    :param vertex_x_coords: length-V numpy array with x-coordinates of vertices.
+    :param vertex_y_coords: length-V numpy array with y-coordinates of vertices.
+    :param grid_point_x_coords: length-N numpy array with x-coordinates of grid
+        points.
+    :param grid_point_y_coords: length-M numpy array with y-coordinates of grid
+        points.
+    :return: in_or_on_polygon_matrix: M-by-N numpy array of Boolean flags.
+    """
+
+    first_x_coords = vertex_x_coords
+    second_x_coords = numpy.roll(vertex_x_coords, -1)
+    first_y_coords = vertex_y_coords
+    second_y_coords = numpy.roll(vertex_y_coords, -1)
+
+    min_y_by_edge = numpy.minimum(first_y_coords, second_y_coords)
+    max_y_by_edge = numpy.maximum(first_y_coords, second_y_coords)
+    horizontal_edge_flags = first_y_coords == second_y_coords
+
+    in_or_on_polygon_matrix = numpy.full(
+        (len(grid_point_y_coords), len(grid_point_x_coords)), False, dtype=bool)
+
+    for i in range(len(grid_point_y_coords)):
+        this_y_coord = grid_point_y_coords[i]
+
+        # Each non-horizontal edge is counted from its lower endpoint
+        # (inclusive) to its upper endpoint (exclusive), so that vertices are
+        # not counted twice by the crossing test.
+        these_spanning_indices = numpy.where(numpy.logical_and(
+            numpy.invert(horizontal_edge_flags), numpy.logical_and(
+                min_y_by_edge <= this_y_coord,
+                max_y_by_edge >= this_y_coord)))[0]
+
+        these_crossing_x_coords = first_x_coords[these_spanning_indices] + (
+            (this_y_coord - first_y_coords[these_spanning_indices]) *
+            (second_x_coords[these_spanning_indices] -
+             first_x_coords[these_spanning_indices]) /
+            (second_y_coords[these_spanning_indices] -
+             first_y_coords[these_spanning_indices]))
+
+        these_counted_flags = (
+            max_y_by_edge[these_spanning_indices] != this_y_coord)
+        these_sorted_x_coords = numpy.sort(
+            these_crossing_x_coords[these_counted_flags])
+        these_num_crossings = len(these_sorted_x_coords) - numpy.searchsorted(
+            these_sorted_x_coords, grid_point_x_coords, side='right')
+        in_or_on_polygon_matrix[i, :] = numpy.mod(these_num_crossings, 2) == 1
+
+        in_or_on_polygon_matrix[i, :] = numpy.logical_or(
+            in_or_on_polygon_matrix[i, :],
+            numpy.in1d(grid_point_x_coords, these_crossing_x_coords))
+
+        these_horizontal_indices = numpy.where(numpy.logical_and(
+            horizontal_edge_flags, first_y_coords == this_y_coord))[0]
+
+        for j in these_horizontal_indices:
+            in_or_on_polygon_matrix[i, :] = numpy.logical_or(
+                in_or_on_polygon_matrix[i, :], numpy.logical_and(
+                    grid_point_x_coords >= min(
+                        [first_x_coords[j], second_x_coords[j]]),
+                    grid_point_x_coords <= max(
+                        [first_x_coords[j], second_x_coords[j]])))
+
+    return in_or_on_polygon_matrix
+
+
+def _get_diagonal_steps(first_row, second_row, first_column, second_column):
+    """Finds grid points along diagonal edge between two vertices.
+
+    S = number of steps (grid points along the edge, minus one)
+
+    :param first_row: Row number (integer) of first vertex.
+    :param second_row: Row number (integer) of second vertex.
+    :param first_column: Column number (integer) of first vertex.
+    :param second_column: Column number (integer) of second vertex.
+    :return: row_indices: numpy array (length S + 1) with row numbers of grid
+        points along the edge, including both vertices.
+    :return: column_indices: Same as above, except for columns.
+    """
+
+    absolute_row_diff = numpy.absolute(second_row - first_row)
+    absolute_column_diff = numpy.absolute(second_column - first_column)
+    num_steps = int(numpy.min(numpy.array(
+        [absolute_row_diff, absolute_column_diff])))
+
+    row_indices = numpy.linspace(
+        float(first_row), float(second_row), num=num_steps + 1)
+    column_indices = numpy.linspace(
+        float(first_column), float(second_column), num=num_steps + 1)
+
+    row_integer_flags = numpy.isclose(
+        row_indices, numpy.round(row_indices), atol=TOLERANCE)
+    column_integer_flags = numpy.isclose(
+        column_indices, numpy.round(column_indices), atol=TOLERANCE)
+    valid_indices = numpy.where(
+        numpy.logical_and(row_integer_flags, column_integer_flags))[0]
+
+    return row_indices[valid_indices], column_indices[valid_indices]
+
+
 def _vertices_from_grid_points_to_edges(row_indices_orig, column_indices_orig):
     """Moves vertices from grid points to grid-cell edges.
 
@@ -399,6 +516,13 @@ def _vertices_from_grid_points_to_edges(row_indices_orig, column_indices_orig):
 
     This method works only for simple polygons sorted in counterclockwise order.
 
+    Each edge between original vertices is replaced by new vertices, according
+    to its direction (see `_get_direction_of_vertex_pair`).  A straight edge
+    gets 2 new vertices.  A diagonal edge is split into steps between grid
+    points along the edge, and each step gets 3 new vertices.  The new vertices
+    are computed for all edges at once, except for diagonal edges that are not
+    at a 45-degree angle.
+
     v = original number of vertices
     V = final number of vertices
 
@@ -414,117 +538,145 @@ def _vertices_from_grid_points_to_edges(row_indices_orig, column_indices_orig):
     error_checking.assert_is_integer_numpy_array(row_indices_orig)
     error_checking.assert_is_integer_numpy_array(column_indices_orig)
 
-    num_orig_vertices = len(row_indices_orig)
-    row_indices = numpy.array([])
-    column_indices = numpy.array([])
-
-    for i in range(num_orig_vertices - 1):
-        this_direction = _get_direction_of_vertex_pair(
+    first_rows = row_indices_orig[:-1].astype(float)
+    second_rows = row_indices_orig[1:].astype(float)
+    first_columns = column_indices_orig[:-1].astype(float)
+    second_columns = column_indices_orig[1:].astype(float)
+    row_signs = numpy.sign(second_rows - first_rows)
+    column_signs = numpy.sign(second_columns - first_columns)
+
+    # Each step of each edge is described by its first and last grid points
+    # (in the original vertex arrays) and direction.
+    straight_edge_flags = numpy.logical_xor(row_signs == 0, column_signs == 0)
+    num_steps_by_edge = numpy.where(straight_edge_flags, 1, 0)
+
+    absolute_row_diffs = numpy.absolute(second_rows - first_rows)
+    absolute_column_diffs = numpy.absolute(second_columns - first_columns)
+    diagonal_edge_flags = numpy.logical_and(row_signs != 0, column_signs != 0)
+    regular_diagonal_flags = numpy.logical_and(
+        diagonal_edge_flags, absolute_row_diffs == absolute_column_diffs)
+    num_steps_by_edge[regular_diagonal_flags] = absolute_row_diffs[
+        regular_diagonal_flags].astype(int)
+
+    edge_indices = numpy.repeat(
+        numpy.arange(len(first_rows)), num_steps_by_edge)
+    step_indices = (
+        numpy.arange(len(edge_indices)) -
+        numpy.repeat(numpy.cumsum(num_steps_by_edge) - num_steps_by_edge,
+                     num_steps_by_edge))
+
+    step_first_rows = first_rows[edge_indices]
+    step_first_columns = first_columns[edge_indices]
+    straight_step_flags = straight_edge_flags[edge_indices]
+    step_row_signs = row_signs[edge_indices]
+    step_column_signs = column_signs[edge_indices]
+
+    diagonal_step_indices = numpy.where(numpy.invert(straight_step_flags))[0]
+    step_first_rows[diagonal_step_indices] += (
+        step_indices[diagonal_step_indices] *
+        step_row_signs[diagonal_step_indices])
+    step_first_columns[diagonal_step_indices] += (
+        step_indices[diagonal_step_indices] *
+        step_column_signs[diagonal_step_indices])
+
+    step_second_rows = step_first_rows + step_row_signs
+    step_second_columns = step_first_columns + step_column_signs
+    straight_step_indices = numpy.where(straight_step_flags)[0]
+    step_second_rows[straight_step_indices] = second_rows[
+        edge_indices[straight_step_indices]]
+    step_second_columns[straight_step_indices] = second_columns[
+        edge_indices[straight_step_indices]]
+
+    # Irregular diagonal edges (not at 45 degrees) are handled one at a time.
+    irregular_edge_indices = numpy.where(numpy.logical_and(
+        diagonal_edge_flags, numpy.invert(regular_diagonal_flags)))[0]
+
+    for i in irregular_edge_indices:
+        these_rows, these_columns = _get_diagonal_steps(
             row_indices_orig[i], row_indices_orig[i + 1],
             column_indices_orig[i], column_indices_orig[i + 1])
-
-        # TODO(thunderhoser): put the following block in another method.
-        if this_direction in COMPLEX_DIRECTIONS:
-            this_absolute_row_diff = numpy.absolute(
-                row_indices_orig[i + 1] - row_indices_orig[i])
-            this_absolute_column_diff = numpy.absolute(
-                column_indices_orig[i + 1] - column_indices_orig[i])
-            this_num_steps = int(numpy.min(numpy.array(
-                [this_absolute_row_diff, this_absolute_column_diff])))
-
-            these_row_indices_orig = numpy.linspace(
-                float(row_indices_orig[i]), float(row_indices_orig[i + 1]),
-                num=this_num_steps + 1)
-            these_column_indices_orig = numpy.linspace(
-                float(column_indices_orig[i]),
-                float(column_indices_orig[i + 1]), num=this_num_steps + 1)
-
-            these_row_integer_flags = numpy.isclose(
-                these_row_indices_orig, numpy.round(these_row_indices_orig),
-                atol=TOLERANCE)
-            these_column_integer_flags = numpy.isclose(
-                these_column_indices_orig,
-                numpy.round(these_column_indices_orig), atol=TOLERANCE)
-            these_valid_flags = numpy.logical_and(
-                these_row_integer_flags, these_column_integer_flags)
-
-            these_valid_indices = numpy.where(these_valid_flags)[0]
-            these_row_indices_orig = these_row_indices_orig[these_valid_indices]
-            these_column_indices_orig = these_column_indices_orig[
-                these_valid_indices]
-            this_num_steps = len(these_row_indices_orig) - 1
-
-        if this_direction == UP_DIRECTION_NAME:
-            rows_to_append = numpy.array(
-                [row_indices_orig[i] + 0.5, row_indices_orig[i + 1] - 0.5])
-            columns_to_append = numpy.array([column_indices_orig[i] + 0.5,
-                                             column_indices_orig[i + 1] + 0.5])
-        elif this_direction == DOWN_DIRECTION_NAME:
-            rows_to_append = numpy.array(
-                [row_indices_orig[i] - 0.5, row_indices_orig[i + 1] + 0.5])
-            columns_to_append = numpy.array([column_indices_orig[i] - 0.5,
-                                             column_indices_orig[i + 1] - 0.5])
-        elif this_direction == RIGHT_DIRECTION_NAME:
-            rows_to_append = numpy.array(
-                [row_indices_orig[i] + 0.5, row_indices_orig[i + 1] + 0.5])
-            columns_to_append = numpy.array([column_indices_orig[i] - 0.5,
-                                             column_indices_orig[i + 1] + 0.5])
-        elif this_direction == LEFT_DIRECTION_NAME:
-            rows_to_append = numpy.array(
-                [row_indices_orig[i] - 0.5, row_indices_orig[i + 1] - 0.5])
-            columns_to_append = numpy.array([column_indices_orig[i] + 0.5,
-                                             column_indices_orig[i + 1] - 0.5])
-        else:
-            rows_to_append = numpy.array([])
-            columns_to_append = numpy.array([])
-
-            for j in range(this_num_steps):
-                if this_direction == UP_RIGHT_DIRECTION_NAME:
-                    these_rows_to_append = numpy.array(
-                        [these_row_indices_orig[j] + 0.5,
-                         these_row_indices_orig[j + 1] + 0.5,
-                         these_row_indices_orig[j + 1] + 0.5])
-                    these_columns_to_append = numpy.array(
-                        [these_column_indices_orig[j] + 0.5,
-                         these_column_indices_orig[j] + 0.5,
-                         these_column_indices_orig[j + 1] + 0.5])
-                elif this_direction == UP_LEFT_DIRECTION_NAME:
-                    these_rows_to_append = numpy.array(
-                        [these_row_indices_orig[j] - 0.5,
-                         these_row_indices_orig[j] - 0.5,
-                         these_row_indices_orig[j + 1] - 0.5])
-                    these_columns_to_append = numpy.array(
-                        [these_column_indices_orig[j] + 0.5,
-                         these_column_indices_orig[j + 1] + 0.5,
-                         these_column_indices_orig[j + 1] + 0.5])
-                elif this_direction == DOWN_RIGHT_DIRECTION_NAME:
-                    these_rows_to_append = numpy.array(
-                        [these_row_indices_orig[j] + 0.5,
-                         these_row_indices_orig[j] + 0.5,
-                         these_row_indices_orig[j + 1] + 0.5])
-                    these_columns_to_append = numpy.array(
-                        [these_column_indices_orig[j] - 0.5,
-                         these_column_indices_orig[j + 1] - 0.5,
-                         these_column_indices_orig[j + 1] - 0.5])
-                elif this_direction == DOWN_LEFT_DIRECTION_NAME:
-                    these_rows_to_append = numpy.array(
-                        [these_row_indices_orig[j] - 0.5,
-                         these_row_indices_orig[j + 1] - 0.5,
-                         these_row_indices_orig[j + 1] - 0.5])
-                    these_columns_to_append = numpy.array(
-                        [these_column_indices_orig[j] - 0.5,
-                         these_column_indices_orig[j] - 0.5,
-                         these_column_indices_orig[j + 1] - 0.5])
-
-                rows_to_append = numpy.concatenate((
-                    rows_to_append, these_rows_to_append))
-                columns_to_append = numpy.concatenate((
-                    columns_to_append, these_columns_to_append))
-
-        row_indices = numpy.concatenate((row_indices, rows_to_append))
-        column_indices = numpy.concatenate((column_indices, columns_to_append))
-
-    return row_indices, column_indices
+        this_num_steps = len(these_rows) - 1
+
+        edge_indices = numpy.concatenate((
+            edge_indices, numpy.full(this_num_steps, i, dtype=int)))
+        step_first_rows = numpy.concatenate((step_first_rows, these_rows[:-1]))
+        step_second_rows = numpy.concatenate((step_second_rows, these_rows[1:]))
+        step_first_columns = numpy.concatenate((
+            step_first_columns, these_columns[:-1]))
+        step_second_columns = numpy.concatenate((
+            step_second_columns, these_columns[1:]))
+        step_row_signs = numpy.concatenate((
+            step_row_signs, numpy.full(this_num_steps, row_signs[i])))
+        step_column_signs = numpy.concatenate((
+            step_column_signs, numpy.full(this_num_steps, column_signs[i])))
+        straight_step_flags = numpy.concatenate((
+            straight_step_flags, numpy.full(this_num_steps, False, dtype=bool)))
+
+    sort_indices = numpy.argsort(edge_indices, kind='mergesort')
+    step_first_rows = step_first_rows[sort_indices]
+    step_second_rows = step_second_rows[sort_indices]
+    step_first_columns = step_first_columns[sort_indices]
+    step_second_columns = step_second_columns[sort_indices]
+    step_row_signs = step_row_signs[sort_indices]
+    step_column_signs = step_column_signs[sort_indices]
+    straight_step_flags = straight_step_flags[sort_indices]
+
+    # For a straight step, the 2 new vertices are offset from the first and
+    # last grid points by half a grid cell, to the right of the direction of
+    # travel.  For a diagonal step, the 3 new vertices go around the grid cell
+    # to the right of the direction of travel.
+    num_steps = len(step_first_rows)
+    num_vertices_by_step = numpy.where(straight_step_flags, 2, 3)
+    row_matrix = numpy.full((num_steps, 3), numpy.nan)
+    column_matrix = numpy.full((num_steps, 3), numpy.nan)
+
+    straight_step_indices = numpy.where(straight_step_flags)[0]
+    these_row_signs = step_row_signs[straight_step_indices]
+    these_column_signs = step_column_signs[straight_step_indices]
+
+    row_matrix[straight_step_indices, 0] = (
+        step_first_rows[straight_step_indices] +
+        0.5 * (these_column_signs - these_row_signs))
+    row_matrix[straight_step_indices, 1] = (
+        step_second_rows[straight_step_indices] +
+        0.5 * (these_column_signs + these_row_signs))
+    column_matrix[straight_step_indices, 0] = (
+        step_first_columns[straight_step_indices] -
+        0.5 * (these_column_signs + these_row_signs))
+    column_matrix[straight_step_indices, 1] = (
+        step_second_columns[straight_step_indices] +
+        0.5 * (these_column_signs - these_row_signs))
+
+    diagonal_step_indices = numpy.where(numpy.invert(straight_step_flags))[0]
+    these_row_signs = step_row_signs[diagonal_step_indices]
+    these_column_signs = step_column_signs[diagonal_step_indices]
+    these_same_sign_flags = these_row_signs == these_column_signs
+    these_row_offsets = 0.5 * these_column_signs
+    these_column_offsets = -0.5 * these_row_signs
+
+    these_first_rows = step_first_rows[diagonal_step_indices]
+    these_second_rows = step_second_rows[diagonal_step_indices]
+    these_first_columns = step_first_columns[diagonal_step_indices]
+    these_second_columns = step_second_columns[diagonal_step_indices]
+
+    row_matrix[diagonal_step_indices, 0] = these_first_rows + these_row_offsets
+    row_matrix[diagonal_step_indices, 1] = numpy.where(
+        these_same_sign_flags, these_first_rows,
+        these_second_rows) + these_row_offsets
+    row_matrix[diagonal_step_indices, 2] = (
+        these_second_rows + these_row_offsets)
+    column_matrix[diagonal_step_indices, 0] = (
+        these_first_columns + these_column_offsets)
+    column_matrix[diagonal_step_indices, 1] = numpy.where(
+        these_same_sign_flags, these_second_columns,
+        these_first_columns) + these_column_offsets
+    column_matrix[diagonal_step_indices, 2] = (
+        these_second_columns + these_column_offsets)
+
+    valid_flag_matrix = (
+        numpy.arange(3)[numpy.newaxis, :] <
+        num_vertices_by_step[:, numpy.newaxis])
+    return row_matrix[valid_flag_matrix], column_matrix[valid_flag_matrix]
 
 
 def separate_exterior_and_holes(vertex_x_coords, vertex_y_coords):
@@ -918,6 +1070,105 @@ def polygon_object_to_vertex_arrays(polygon_object):
             HOLE_Y_COLUMN: hole_y_coords_list}
 
 
+def polygon_objects_to_flat_arrays(polygon_objects, exterior_only=False):
+    """Converts many `shapely.geometry.Polygon` objects to flat vertex arrays.
+
+    The flat representation allows coordinates of many polygons to be converted
+    (e.g., projected) with one vectorized call.
+
+    P = number of polygons
+    R = total number of rings (exteriors and holes) over all polygons
+    V = total number of vertices over all rings
+
+    :param polygon_objects: length-P list (or numpy array) of
+        `shapely.geometry.Polygon` objects.
+    :param exterior_only: Boolean flag.  If True, will ignore holes.
+    :return: vertex_x_coords: length-V numpy array with x-coordinates of
+        vertices.
+    :return: vertex_y_coords: length-V numpy array with y-coordinates of
+        vertices.
+    :return: ring_offsets: numpy array (length R + 1) of integers.  Vertices in
+        the [j]th ring are vertex_x_coords[ring_offsets[j]:ring_offsets[j + 1]].
+    :return: polygon_offsets: numpy array (length P + 1) of integers.  Rings in
+        the [i]th polygon are [polygon_offsets[i]:polygon_offsets[i + 1]], where
+        the first is the exterior and the others are holes.
+    """
+
+    error_checking.assert_is_boolean(exterior_only)
+
+    ring_coord_matrices = []
+    num_rings_by_polygon = numpy.full(len(polygon_objects), 0, dtype=int)
+
+    for i in range(len(polygon_objects)):
+        ring_coord_matrices.append(
+            numpy.asarray(polygon_objects[i].exterior.coords)[:, :2])
+        num_rings_by_polygon[i] = 1
+        if exterior_only:
+            continue
+
+        for this_interior in polygon_objects[i].interiors:
+            ring_coord_matrices.append(
+                numpy.asarray(this_interior.coords)[:, :2])
+            num_rings_by_polygon[i] += 1
+
+    num_vertices_by_ring = numpy.array(
+        [m.shape[0] for m in ring_coord_matrices], dtype=int)
+    ring_offsets = numpy.concatenate((
+        numpy.array([0], dtype=int), numpy.cumsum(num_vertices_by_ring)))
+    polygon_offsets = numpy.concatenate((
+        numpy.array([0], dtype=int), numpy.cumsum(num_rings_by_polygon)))
+
+    if not ring_coord_matrices:
+        return (numpy.array([]), numpy.array([]), ring_offsets,
+                polygon_offsets)
+
+    vertex_coord_matrix = numpy.vstack(ring_coord_matrices)
+    return (vertex_coord_matrix[:, 0], vertex_coord_matrix[:, 1], ring_offsets,
+            polygon_offsets)
+
+
+def flat_arrays_to_polygon_objects(vertex_x_coords, vertex_y_coords,
+                                   ring_offsets, polygon_offsets):
+    """Converts flat vertex arrays to many `shapely.geometry.Polygon` objects.
+
+    This method is the inverse of polygon_objects_to_flat_arrays.
+
+    P = number of polygons
+
+    :param vertex_x_coords: See documentation for
+        polygon_objects_to_flat_arrays.
+    :param vertex_y_coords: Same.
+    :param ring_offsets: Same.
+    :param polygon_offsets: Same.
+    :return: polygon_objects: length-P list of `shapely.geometry.Polygon`
+        objects.
+    :raises: ValueError: if any resulting polygon with holes is invalid.
+    """
+
+    vertex_coord_matrix = numpy.transpose(
+        numpy.vstack((vertex_x_coords, vertex_y_coords)))
+
+    num_polygons = len(polygon_offsets) - 1
+    polygon_objects = [None] * num_polygons
+
+    for i in range(num_polygons):
+        these_ring_matrices = [
+            vertex_coord_matrix[ring_offsets[j]:ring_offsets[j + 1], :]
+            for j in range(polygon_offsets[i], polygon_offsets[i + 1])]
+
+        if len(these_ring_matrices) == 1:
+            polygon_objects[i] = shapely.geometry.Polygon(
+                shell=these_ring_matrices[0])
+            continue
+
+        polygon_objects[i] = shapely.geometry.Polygon(
+            shell=these_ring_matrices[0], holes=these_ring_matrices[1:])
+        if not polygon_objects[i].is_valid:
+            raise ValueError('Resulting polygon is invalid.')
+
+    return polygon_objects
+
+
 def grid_points_in_poly_to_vertices(grid_point_row_indices,
                                     grid_point_column_indices):
     """Converts list of grid points in polygon to list of vertices.
@@ -1004,9 +1255,6 @@ def simple_polygon_to_grid_points(vertex_row_indices, vertex_column_indices):
         (integers) of grid points in polygon.
     """
 
-    polygon_object = vertex_arrays_to_polygon_object(
-        vertex_column_indices, vertex_row_indices)
-
     min_grid_point_row = numpy.floor(numpy.min(vertex_row_indices))
     max_grid_point_row = numpy.ceil(numpy.max(vertex_row_indices))
     num_grid_point_rows = max_grid_point_row - min_grid_point_row + 1
@@ -1025,21 +1273,14 @@ def simple_polygon_to_grid_points(vertex_row_indices, vertex_column_indices):
      grid_point_row_matrix) = grids.xy_vectors_to_matrices(
          unique_grid_point_columns, unique_grid_point_rows)
 
-    grid_point_row_vector = numpy.reshape(grid_point_row_matrix,
-                                          grid_point_row_matrix.size)
-    grid_point_column_vector = numpy.reshape(grid_point_column_matrix,
-                                             grid_point_column_matrix.size)
+    in_polygon_matrix = _find_grid_points_in_or_on_polygon(
+        vertex_x_coords=numpy.asarray(vertex_column_indices, dtype=float),
+        vertex_y_coords=numpy.asarray(vertex_row_indices, dtype=float),
+        grid_point_x_coords=unique_grid_point_columns.astype(float),
+        grid_point_y_coords=unique_grid_point_rows.astype(float))
 
-    num_grid_points = len(grid_point_row_vector)
-    in_polygon_flags = numpy.full(num_grid_points, False, dtype=bool)
-    for i in range(num_grid_points):
-        in_polygon_flags[i] = is_point_in_or_on_polygon(
-            polygon_object, query_x_coordinate=grid_point_column_vector[i],
-            query_y_coordinate=grid_point_row_vector[i])
-
-    in_polygon_indices = numpy.where(in_polygon_flags)[0]
-    return (grid_point_row_vector[in_polygon_indices],
-            grid_point_column_vector[in_polygon_indices])
+    return (grid_point_row_matrix[in_polygon_matrix],
+            grid_point_column_matrix[in_polygon_matrix])
 
 
 def fix_probsevere_vertices(row_indices_orig, column_indices_orig):
@@ -1172,3 +1413,43 @@ def buffer_simple_polygon(orig_vertex_x_metres, orig_vertex_y_metres,
         max_buffer_vertex_dict[EXTERIOR_Y_COLUMN],
         hole_x_coords_list=[min_buffer_vertex_dict[EXTERIOR_X_COLUMN]],
         hole_y_coords_list=[min_buffer_vertex_dict[EXTERIOR_Y_COLUMN]])
+
+
+def buffer_many_polygons(polygon_objects, buffer_dist_metres,
+                         preserve_angles=False):
+    """Creates buffer (with the same distance) around each of many polygons.
+
+    If the installed version of shapely has vectorized geometry functions
+    (shapely >= 2.0), all polygons are buffered in one call.  Otherwise, they
+    are buffered one at a time.
+
+    P = number of polygons
+
+    :param polygon_objects: length-P list (or numpy array) of
+        `shapely.geometry.Polygon` objects, with vertices in metres.
+    :param buffer_dist_metres: Buffer distance.
+    :param preserve_angles: See documentation for buffer_simple_polygon.
+    :return: buffer_polygon_objects: length-P list of
+        `shapely.geometry.Polygon` objects.
+    """
+
+    error_checking.assert_is_geq(buffer_dist_metres, 0.)
+    error_checking.assert_is_boolean(preserve_angles)
+
+    if preserve_angles:
+        join_style = shapely.geometry.JOIN_STYLE.mitre
+    else:
+        join_style = shapely.geometry.JOIN_STYLE.round
+
+    vectorized_buffer_function = getattr(shapely, 'buffer', None)
+    if vectorized_buffer_function is None:
+        return [p.buffer(buffer_dist_metres,
+                         resolution=NUM_BUFFER_SEGMENTS_PER_QUADRANT,
+                         join_style=join_style)
+                for p in polygon_objects]
+
+    polygon_object_array = numpy.full(len(polygon_objects), None, dtype=object)
+    polygon_object_array[:] = list(polygon_objects)
+    return list(vectorized_buffer_function(
+        polygon_object_array, buffer_dist_metres,
+        quad_segs=NUM_BUFFER_SEGMENTS_PER_QUADRANT, join_style=join_style))
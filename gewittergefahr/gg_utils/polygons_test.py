@@ -67,6 +67,27 @@ POLYGON_OBJECT_XY = shapely.geometry.Polygon(
     shell=EXTERIOR_VERTEX_METRES_LIST, holes=(HOLE1_VERTEX_METRES_LIST,
                                               HOLE2_VERTEX_METRES_LIST))
 
+# The following constants are used to test polygon_objects_to_flat_arrays and
+# flat_arrays_to_polygon_objects.
+POLYGON_OBJECTS_FOR_FLAT_ARRAYS = [
+    POLYGON_OBJECT_XY, shapely.geometry.Polygon(
+        shell=HOLE1_VERTEX_METRES_LIST)]
+FLAT_VERTEX_X_METRES = numpy.concatenate((
+    EXTERIOR_VERTEX_X_METRES, HOLE1_VERTEX_X_METRES, HOLE2_VERTEX_X_METRES,
+    HOLE1_VERTEX_X_METRES))
+FLAT_VERTEX_Y_METRES = numpy.concatenate((
+    EXTERIOR_VERTEX_Y_METRES, HOLE1_VERTEX_Y_METRES, HOLE2_VERTEX_Y_METRES,
+    HOLE1_VERTEX_Y_METRES))
+RING_OFFSETS = numpy.array([0, 5, 10, 15, 20], dtype=int)
+POLYGON_OFFSETS = numpy.array([0, 3, 4], dtype=int)
+
+FLAT_EXTERIOR_X_METRES = numpy.concatenate((
+    EXTERIOR_VERTEX_X_METRES, HOLE1_VERTEX_X_METRES))
+FLAT_EXTERIOR_Y_METRES = numpy.concatenate((
+    EXTERIOR_VERTEX_Y_METRES, HOLE1_VERTEX_Y_METRES))
+EXTERIOR_RING_OFFSETS = numpy.array([0, 5, 10], dtype=int)
+EXTERIOR_POLYGON_OFFSETS = numpy.array([0, 1, 2], dtype=int)
+
 # The following constants are used to test project_xy_to_latlng and
 # project_latlng_to_xy.
 EXTERIOR_VERTEX_LATITUDES_DEG = numpy.array([49., 49., 60., 60., 53.8, 49.])
@@ -94,6 +115,15 @@ GRID_POINT_ROWS_IN_SIMPLE_POLY = numpy.array(
 GRID_POINT_COLUMNS_IN_SIMPLE_POLY = numpy.array(
     [1, 2, 3, 1, 2, 3, 0, 1, 2, 3, 0, 1, 2, 3, 2, 3])
 
+# The following constants are used to test _find_grid_points_in_or_on_polygon.
+VERTEX_X_TRIANGLE = numpy.array([0., 4., 0., 0.])
+VERTEX_Y_TRIANGLE = numpy.array([0., 0., 2., 0.])
+GRID_POINT_X_FOR_TRIANGLE = numpy.array([0., 1., 2., 3., 4.])
+GRID_POINT_Y_FOR_TRIANGLE = numpy.array([0., 1., 2.])
+IN_OR_ON_TRIANGLE_MATRIX = numpy.array([[1, 1, 1, 1, 1],
+                                        [1, 1, 1, 0, 0],
+                                        [1, 0, 0, 0, 0]], dtype=bool)
+
 # The following constants are used to test is_point_in_or_on_polygon and
 # buffer_simple_polygon.
 SMALL_BUFFER_DIST_METRES = 2.5
@@ -126,6 +156,11 @@ Y_IN_NESTED_BUFFER = 5.
 Y_ON_NESTED_BUFFER = 5.
 Y_OUTSIDE_NESTED_BUFFER = 5.
 
+# The following constants are used to test buffer_many_polygons.
+POLYGON_OBJECTS_TO_BUFFER = [
+    shapely.geometry.Polygon(shell=EXTERIOR_VERTEX_METRES_LIST),
+    shapely.geometry.Polygon(shell=HOLE1_VERTEX_METRES_LIST)]
+
 # The following constants are used to test _get_latlng_centroid.
 LATITUDE_POINTS_DEG = numpy.array([50., 51., 52., 53., 55.])
 LONGITUDE_POINTS_DEG = numpy.array([263., 246., 253., 247., 241.])
@@ -180,6 +215,22 @@ VERTEX_COLUMNS_GRID_POINTS = numpy.array(
 VERTEX_COLUMNS_GRID_POINTS_COMPLEX = numpy.array(
     [501, 501, 502, 503, 504, 504, 503, 502, 501, numpy.nan, 0, 0, 1, 1, 0])
 
+# The following constants are used to test _vertices_from_grid_points_to_edges
+# with an irregular diagonal edge (not at a multiple of 45 degrees).
+VERTEX_ROWS_IRREGULAR_DIAG = numpy.array([0, 4, 4, 0])
+VERTEX_COLUMNS_IRREGULAR_DIAG = numpy.array([0, 2, 0, 0])
+VERTEX_ROWS_IRREGULAR_DIAG_EDGES = numpy.array(
+    [0.5, 0.5, 2.5, 2.5, 2.5, 4.5, 3.5, 3.5, 4.5, -0.5])
+VERTEX_COLUMNS_IRREGULAR_DIAG_EDGES = numpy.array(
+    [-0.5, 0.5, 0.5, 0.5, 1.5, 1.5, 2.5, -0.5, 0.5, 0.5])
+
+# The following constants are used to test _vertices_from_grid_points_to_edges
+# with a zero-length edge (repeated vertex).
+VERTEX_ROWS_REPEATED = numpy.array([0, 2, 2, 2, 0, 0])
+VERTEX_COLUMNS_REPEATED = numpy.array([0, 1, 1, 3, 3, 0])
+VERTEX_ROWS_NOT_REPEATED = numpy.array([0, 2, 2, 0, 0])
+VERTEX_COLUMNS_NOT_REPEATED = numpy.array([0, 1, 3, 3, 0])
+
 # The following constants are used to test _remove_redundant_vertices.
 VERTEX_ROWS_GRID_CELL_EDGES_REDUNDANT = numpy.array(
     [100.5, 102.5, 102.5, 103.5, 103.5, 103.5, 103.5, 103.5, 104.5, 104.5,
@@ -470,6 +521,40 @@ class PolygonsTests(unittest.TestCase):
             these_vertex_columns_non_redundant,
             VERTEX_COLUMNS_GRID_CELL_EDGES_NON_REDUNDANT))
 
+    def test_vertices_from_grid_points_to_edges_irregular_diag(self):
+        """Ensures correct output from _vertices_from_grid_points_to_edges.
+
+        In this case, one edge is diagonal but not at a multiple of 45 degrees.
+        """
+
+        these_vertex_rows, these_vertex_columns = (
+            polygons._vertices_from_grid_points_to_edges(
+                VERTEX_ROWS_IRREGULAR_DIAG, VERTEX_COLUMNS_IRREGULAR_DIAG))
+
+        self.assertTrue(numpy.array_equal(
+            these_vertex_rows, VERTEX_ROWS_IRREGULAR_DIAG_EDGES))
+        self.assertTrue(numpy.array_equal(
+            these_vertex_columns, VERTEX_COLUMNS_IRREGULAR_DIAG_EDGES))
+
+    def test_vertices_from_grid_points_to_edges_repeated(self):
+        """Ensures correct output from _vertices_from_grid_points_to_edges.
+
+        In this case, one vertex is repeated (creating a zero-length edge),
+        which should be ignored.
+        """
+
+        these_vertex_rows, these_vertex_columns = (
+            polygons._vertices_from_grid_points_to_edges(
+                VERTEX_ROWS_REPEATED, VERTEX_COLUMNS_REPEATED))
+        these_expected_rows, these_expected_columns = (
+            polygons._vertices_from_grid_points_to_edges(
+                VERTEX_ROWS_NOT_REPEATED, VERTEX_COLUMNS_NOT_REPEATED))
+
+        self.assertTrue(numpy.array_equal(
+            these_vertex_rows, these_expected_rows))
+        self.assertTrue(numpy.array_equal(
+            these_vertex_columns, these_expected_columns))
+
     def test_separate_exterior_and_holes(self):
         """Ensures correct output from separate_exterior_and_holes."""
 
@@ -668,6 +753,22 @@ class PolygonsTests(unittest.TestCase):
         self.assertTrue(numpy.array_equal(
             these_vertex_columns, VERTEX_COLUMNS_GRID_CELL_EDGES_NON_REDUNDANT))
 
+    def test_find_grid_points_in_or_on_polygon(self):
+        """Ensures correct output from _find_grid_points_in_or_on_polygon.
+
+        In this case, several grid points lie on the boundary (including the
+        sloped edge) and should be counted as inside.
+        """
+
+        this_matrix = polygons._find_grid_points_in_or_on_polygon(
+            vertex_x_coords=VERTEX_X_TRIANGLE,
+            vertex_y_coords=VERTEX_Y_TRIANGLE,
+            grid_point_x_coords=GRID_POINT_X_FOR_TRIANGLE,
+            grid_point_y_coords=GRID_POINT_Y_FOR_TRIANGLE)
+
+        self.assertTrue(numpy.array_equal(
+            this_matrix, IN_OR_ON_TRIANGLE_MATRIX))
+
     def test_simple_polygon_to_grid_points(self):
         """Ensures correct output from simple_polygon_to_grid_points."""
 
@@ -844,5 +945,75 @@ class PolygonsTests(unittest.TestCase):
             atol=TOLERANCE, equal_nan=True))
 
 
+    def test_polygon_objects_to_flat_arrays_with_holes(self):
+        """Ensures correct output from polygon_objects_to_flat_arrays.
+
+        In this case, holes are included.
+        """
+
+        (these_vertex_x_metres, these_vertex_y_metres, these_ring_offsets,
+         these_polygon_offsets) = polygons.polygon_objects_to_flat_arrays(
+             POLYGON_OBJECTS_FOR_FLAT_ARRAYS, exterior_only=False)
+
+        self.assertTrue(numpy.allclose(
+            these_vertex_x_metres, FLAT_VERTEX_X_METRES, atol=TOLERANCE))
+        self.assertTrue(numpy.allclose(
+            these_vertex_y_metres, FLAT_VERTEX_Y_METRES, atol=TOLERANCE))
+        self.assertTrue(numpy.array_equal(these_ring_offsets, RING_OFFSETS))
+        self.assertTrue(numpy.array_equal(
+            these_polygon_offsets, POLYGON_OFFSETS))
+
+    def test_polygon_objects_to_flat_arrays_exterior_only(self):
+        """Ensures correct output from polygon_objects_to_flat_arrays.
+
+        In this case, holes are ignored.
+        """
+
+        (these_vertex_x_metres, these_vertex_y_metres, these_ring_offsets,
+         these_polygon_offsets) = polygons.polygon_objects_to_flat_arrays(
+             POLYGON_OBJECTS_FOR_FLAT_ARRAYS, exterior_only=True)
+
+        self.assertTrue(numpy.allclose(
+            these_vertex_x_metres, FLAT_EXTERIOR_X_METRES, atol=TOLERANCE))
+        self.assertTrue(numpy.allclose(
+            these_vertex_y_metres, FLAT_EXTERIOR_Y_METRES, atol=TOLERANCE))
+        self.assertTrue(numpy.array_equal(
+            these_ring_offsets, EXTERIOR_RING_OFFSETS))
+        self.assertTrue(numpy.array_equal(
+            these_polygon_offsets, EXTERIOR_POLYGON_OFFSETS))
+
+    def test_flat_arrays_to_polygon_objects(self):
+        """Ensures correct output from flat_arrays_to_polygon_objects."""
+
+        these_polygon_objects = polygons.flat_arrays_to_polygon_objects(
+            FLAT_VERTEX_X_METRES, FLAT_VERTEX_Y_METRES, RING_OFFSETS,
+            POLYGON_OFFSETS)
+
+        self.assertTrue(
+            len(these_polygon_objects) == len(POLYGON_OBJECTS_FOR_FLAT_ARRAYS))
+        for i in range(len(these_polygon_objects)):
+            self.assertTrue(these_polygon_objects[i].equals(
+                POLYGON_OBJECTS_FOR_FLAT_ARRAYS[i]))
+
+    def test_buffer_many_polygons(self):
+        """Ensures correct output from buffer_many_polygons."""
+
+        these_buffer_objects = polygons.buffer_many_polygons(
+            POLYGON_OBJECTS_TO_BUFFER, LARGE_BUFFER_DIST_METRES)
+
+        self.assertTrue(
+            len(these_buffer_objects) == len(POLYGON_OBJECTS_TO_BUFFER))
+        for i in range(len(these_buffer_objects)):
+            this_vertex_dict = polygons.polygon_object_to_vertex_arrays(
+                POLYGON_OBJECTS_TO_BUFFER[i])
+            this_expected_object = polygons.buffer_simple_polygon(
+                this_vertex_dict[polygons.EXTERIOR_X_COLUMN],
+                this_vertex_dict[polygons.EXTERIOR_Y_COLUMN],
+                max_buffer_dist_metres=LARGE_BUFFER_DIST_METRES)
+
+            self.assertTrue(
+                these_buffer_objects[i].equals(this_expected_object))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -13,24 +13,46 @@ COVAR_MATRIX_DETERMINANT_KEY = 'covar_matrix_determinant'
 
 PRIOR_CLASS_PROBABILITY_KEY = 'prior_class_probability'
 ORIG_FEATURE_TABLE_KEY = 'orig_feature_table'
+SORTED_ORIG_FEATURE_MATRIX_KEY = 'sorted_orig_feature_matrix'
 
 MIN_CUMUL_DENSITY_FOR_NORMAL_DIST = 1e-6
 MAX_CUMUL_DENSITY_FOR_NORMAL_DIST = 1. - 1e-6
 
 
+def _sort_each_marginal(feature_matrix):
+    """Sorts values of each feature.
+
+    The sorted values define the empirical CDF (cumulative distribution
+    function) of each feature, used by _transform_each_marginal_to_uniform.
+
+    P = number of examples
+    M = number of features
+
+    :param feature_matrix: P-by-M numpy array of feature values.
+    :return: sorted_feature_matrix: P-by-M numpy array, where each column is
+        sorted in ascending order.  NaN's are at the bottom of each column.
+    """
+
+    return numpy.sort(feature_matrix, axis=0)
+
+
 def _transform_each_marginal_to_uniform(
-        new_feature_table, orig_feature_table=None):
+        new_feature_table, orig_feature_table=None,
+        sorted_orig_feature_matrix=None):
     """Transforms marginal distribution of each feature to uniform distribution.
 
     This method transforms data in `new_feature_table` only.
 
-    If `orig_feature_table` is None, the transformation for feature "x" in the
-    [i]th example will be based on the percentile score of
-    new_feature_table["x"].values[i] in new_feature_table["x"].values.
+    If `orig_feature_table` and `sorted_orig_feature_matrix` are both None, the
+    transformation for feature "x" in the [i]th example will be based on the
+    percentile score of new_feature_table["x"].values[i] in
+    new_feature_table["x"].values.
 
-    If `orig_feature_table` is specified, the transformation for feature "x" in
-    the [i]th example will be based on the percentile score of
-    new_feature_table["x"].values[i] in orig_feature_table["x"].values.
+    Otherwise, the transformation for feature "x" in the [i]th example will be
+    based on the percentile score of new_feature_table["x"].values[i] in
+    orig_feature_table["x"].values.  This is the "weak" percentile score (see
+    `scipy.stats.percentileofscore`), found by binary search in the sorted
+    original values.
 
     P = number of original examples
     Q = number of new examples
@@ -40,85 +62,82 @@ def _transform_each_marginal_to_uniform(
         Column names are feature names.
     :param orig_feature_table: pandas DataFrame with P rows and M columns.
         Column names are feature names.
-    :return: transformed_new_feature_table: Same as input, except that the
-        marginal distribution of each column is uniform.
+    :param sorted_orig_feature_matrix: P-by-M numpy array created by
+        _sort_each_marginal, with columns in the same order as
+        `new_feature_table`.  If this is specified, `orig_feature_table` will
+        not be used (so the original values need not be sorted again).
+    :return: transformed_new_feature_matrix: Q-by-M numpy array, where the
+        marginal distribution of each column is uniform.  Columns are in the
+        same order as `new_feature_table`.
     """
 
-    # TODO(thunderhoser): I could probably make this faster for cases where
-    # `orig_feature_table` is specified.
-
     feature_names = list(new_feature_table)
     new_feature_matrix = new_feature_table.as_matrix(columns=feature_names)
 
-    if orig_feature_table is not None:
+    if sorted_orig_feature_matrix is None and orig_feature_table is not None:
         error_checking.assert_columns_in_dataframe(
             orig_feature_table, feature_names)
-        orig_feature_matrix = orig_feature_table.as_matrix(
-            columns=feature_names)
+        sorted_orig_feature_matrix = _sort_each_marginal(
+            orig_feature_table.as_matrix(columns=feature_names))
+
+    if sorted_orig_feature_matrix is not None:
+        num_orig_values_by_feature = numpy.sum(
+            numpy.invert(numpy.isnan(sorted_orig_feature_matrix)), axis=0)
 
     num_features = len(feature_names)
-    num_new_examples = new_feature_matrix.shape[0]
-    transformed_new_feature_table = None
+    transformed_new_feature_matrix = numpy.full(new_feature_matrix.shape, 0.5)
 
     for j in range(num_features):
         new_indices_to_use = numpy.where(
             numpy.invert(numpy.isnan(new_feature_matrix[:, j])))[0]
-        transformed_values = numpy.full(num_new_examples, 0.5)
 
-        if orig_feature_table is None:
+        if sorted_orig_feature_matrix is None:
             these_ranks = scipy.stats.rankdata(
                 new_feature_matrix[new_indices_to_use, j], method='average')
-            transformed_values[new_indices_to_use] = (
+            transformed_new_feature_matrix[new_indices_to_use, j] = (
                 these_ranks / len(new_indices_to_use))
-        else:
-            orig_indices_to_use = numpy.where(
-                numpy.invert(numpy.isnan(orig_feature_matrix[:, j])))[0]
+            continue
 
-            for i in new_indices_to_use:
-                transformed_values[i] = scipy.stats.percentileofscore(
-                    orig_feature_matrix[orig_indices_to_use, j],
-                    new_feature_matrix[i, j], kind='weak') / 100
+        this_num_orig_values = num_orig_values_by_feature[j]
+        if this_num_orig_values == 0:
+            transformed_new_feature_matrix[new_indices_to_use, j] = 1.
+            continue
 
-        if transformed_new_feature_table is None:
-            transformed_new_feature_table = pandas.DataFrame.from_dict(
-                {feature_names[j]: transformed_values})
-        else:
-            transformed_new_feature_table = (
-                transformed_new_feature_table.assign(
-                    **{feature_names[j]: transformed_values}))
+        these_num_orig_values_leq = numpy.searchsorted(
+            sorted_orig_feature_matrix[:this_num_orig_values, j],
+            new_feature_matrix[new_indices_to_use, j], side='right')
+        transformed_new_feature_matrix[new_indices_to_use, j] = (
+            these_num_orig_values_leq.astype(float) / this_num_orig_values)
 
-    return transformed_new_feature_table
+    return transformed_new_feature_matrix
 
 
 def _transform_each_marginal_to_normal(
-        new_feature_table, orig_feature_table=None):
+        new_feature_table, orig_feature_table=None,
+        sorted_orig_feature_matrix=None):
     """Transforms marginal distribution of each feature to normal distribution.
 
-    To learn about the roles of `new_feature_table` and `orig_feature_table`,
-    see documentation for _transform_each_marginal_to_uniform.
+    To learn about the roles of `new_feature_table`, `orig_feature_table`, and
+    `sorted_orig_feature_matrix`, see documentation for
+    _transform_each_marginal_to_uniform.
 
     :param new_feature_table: See doc for _transform_each_marginal_to_uniform.
     :param orig_feature_table: See doc for _transform_each_marginal_to_uniform.
-    :return: transformed_new_feature_table: Same as input, except that the
-        marginal distribution of each column is normal.
+    :param sorted_orig_feature_matrix: See doc for
+        _transform_each_marginal_to_uniform.
+    :return: transformed_new_feature_matrix: Same as output from
+        _transform_each_marginal_to_uniform, except that the marginal
+        distribution of each column is normal.
     """
 
-    transformed_new_feature_table = _transform_each_marginal_to_uniform(
-        new_feature_table, orig_feature_table)
-
-    for this_column in list(transformed_new_feature_table):
-        these_values = transformed_new_feature_table[this_column].values
-
-        these_values[these_values < MIN_CUMUL_DENSITY_FOR_NORMAL_DIST] = (
-            MIN_CUMUL_DENSITY_FOR_NORMAL_DIST)
-        these_values[these_values > MAX_CUMUL_DENSITY_FOR_NORMAL_DIST] = (
-            MAX_CUMUL_DENSITY_FOR_NORMAL_DIST)
-        these_values = scipy.stats.norm.ppf(these_values, loc=0, scale=1)
-
-        transformed_new_feature_table = transformed_new_feature_table.assign(
-            **{this_column: these_values})
+    transformed_new_feature_matrix = _transform_each_marginal_to_uniform(
+        new_feature_table, orig_feature_table=orig_feature_table,
+        sorted_orig_feature_matrix=sorted_orig_feature_matrix)
 
-    return transformed_new_feature_table
+    transformed_new_feature_matrix = numpy.clip(
+        transformed_new_feature_matrix, MIN_CUMUL_DENSITY_FOR_NORMAL_DIST,
+        MAX_CUMUL_DENSITY_FOR_NORMAL_DIST)
+    return scipy.stats.norm.ppf(transformed_new_feature_matrix, loc=0, scale=1)
 
 
 def _normalize_class_probabilities(class_probability_matrix):
@@ -247,7 +266,7 @@ def fit_multivariate_normal(feature_table, assume_diagonal_covar_matrix=False):
                          'values (not NaN).')
 
     covariance_matrix, feature_means = _get_covariance_matrix(
-        _transform_each_marginal_to_normal(feature_table).as_matrix(),
+        _transform_each_marginal_to_normal(feature_table),
         assume_diagonal=assume_diagonal_covar_matrix)
 
     return {FEATURE_NAMES_KEY: list(feature_table),
@@ -278,6 +297,10 @@ def fit_mvn_for_each_class(feature_table, class_labels, num_classes,
         [k]th class.  This is the frequency of value (k - 1) in `class_labels`.
     list_of_mvn_dictionaries[k]['orig_feature_table']: Original feature table
         (before transforming marginals to normal distribution) for [k]th class.
+    list_of_mvn_dictionaries[k]['sorted_orig_feature_matrix']: Same as
+        orig_feature_table, but as a numpy array with each column sorted (see
+        _sort_each_marginal).  This is used to transform marginals of new data
+        without sorting the original data again.
     list_of_mvn_dictionaries[k]['feature_names']: length-M list of feature names
         (same for each class).
     list_of_mvn_dictionaries[k]['feature_means']: length-M numpy array with mean
@@ -318,6 +341,10 @@ def fit_mvn_for_each_class(feature_table, class_labels, num_classes,
                               float(len(these_indices)) / num_examples})
         this_dict.update(
             {ORIG_FEATURE_TABLE_KEY: feature_table.iloc[these_indices]})
+        this_dict.update({
+            SORTED_ORIG_FEATURE_MATRIX_KEY: _sort_each_marginal(
+                feature_table.iloc[these_indices].as_matrix())
+        })
 
         list_of_mvn_dictionaries.append(this_dict)
 
@@ -368,29 +395,27 @@ def apply_mvn_for_each_class(feature_table, list_of_mvn_dictionaries):
     forecast_prob_matrix = numpy.full((num_examples, num_classes), numpy.nan)
 
     for k in range(num_classes):
-        transformed_feature_table = _transform_each_marginal_to_normal(
+        transformed_feature_matrix = _transform_each_marginal_to_normal(
             feature_table, orig_feature_table=
-            list_of_mvn_dictionaries[k][ORIG_FEATURE_TABLE_KEY])
-        transformed_feature_matrix = transformed_feature_table.as_matrix()
-
-        for i in range(num_examples):
-            this_deviation_vector = (
-                transformed_feature_matrix[i, :] -
-                list_of_mvn_dictionaries[k][FEATURE_MEANS_KEY])
-            this_deviation_vector = numpy.reshape(
-                this_deviation_vector, (num_features, 1))
-
-            this_matrix_product = numpy.dot(
-                list_of_mvn_dictionaries[k][COVAR_MATRIX_INVERSE_KEY],
-                this_deviation_vector)
-            this_matrix_product = numpy.dot(
-                numpy.transpose(this_deviation_vector), this_matrix_product)[
-                    0, 0]
-
-            forecast_prob_matrix[i, k] = -0.5 * (
-                numpy.log(
-                    list_of_mvn_dictionaries[k][COVAR_MATRIX_DETERMINANT_KEY]) +
-                this_matrix_product)
+            list_of_mvn_dictionaries[k][ORIG_FEATURE_TABLE_KEY],
+            sorted_orig_feature_matrix=list_of_mvn_dictionaries[k].get(
+                SORTED_ORIG_FEATURE_MATRIX_KEY))
+
+        # The [i]th element of this_matrix_product_by_example is the quadratic
+        # form d_i^T * C^-1 * d_i, where d_i is the deviation vector for the
+        # [i]th example.
+        this_deviation_matrix = (
+            transformed_feature_matrix -
+            list_of_mvn_dictionaries[k][FEATURE_MEANS_KEY])
+        this_matrix_product_by_example = numpy.sum(
+            numpy.dot(this_deviation_matrix,
+                      list_of_mvn_dictionaries[k][COVAR_MATRIX_INVERSE_KEY]) *
+            this_deviation_matrix, axis=1)
+
+        forecast_prob_matrix[:, k] = -0.5 * (
+            numpy.log(
+                list_of_mvn_dictionaries[k][COVAR_MATRIX_DETERMINANT_KEY]) +
+            this_matrix_product_by_example)
 
     forecast_prob_matrix = numpy.exp(
         forecast_prob_matrix - 0.5 * num_classes * numpy.log(2 * numpy.pi))
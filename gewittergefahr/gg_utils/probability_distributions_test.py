@@ -45,6 +45,13 @@ THIS_FEATURE_DICT = {'a': THESE_VALUES_FEATURE_A, 'b': THESE_VALUES_FEATURE_B,
 FEATURE_TABLE_UNIF_MARGINALS_NEW_TO_ORIG = pandas.DataFrame.from_dict(
     THIS_FEATURE_DICT)
 
+# The following constants are used to test _sort_each_marginal.
+SORTED_ORIG_FEATURE_MATRIX = numpy.array(
+    [[2., -3., 5.],
+     [4., 0., 10.],
+     [6., 0., 15.],
+     [8., numpy.nan, numpy.nan]])
+
 # The following constants are used to test _normalize_class_probabilities.
 ORIGINAL_PROB_MATRIX = numpy.array(
     [[2., 3.],
@@ -104,11 +111,11 @@ class ProbabilityDistributionsTests(unittest.TestCase):
         In this case the argument `orig_feature_table` is None.
         """
 
-        this_feature_table = prob_dist._transform_each_marginal_to_uniform(
+        this_feature_matrix = prob_dist._transform_each_marginal_to_uniform(
             NEW_FEATURE_TABLE, orig_feature_table=None)
 
         self.assertTrue(numpy.allclose(
-            this_feature_table.as_matrix(),
+            this_feature_matrix,
             FEATURE_TABLE_UNIF_MARGINALS_NEW_TO_NEW.as_matrix(), atol=TOLERANCE,
             equal_nan=True))
 
@@ -119,12 +126,12 @@ class ProbabilityDistributionsTests(unittest.TestCase):
         are in the same order.
         """
 
-        this_feature_table = prob_dist._transform_each_marginal_to_uniform(
+        this_feature_matrix = prob_dist._transform_each_marginal_to_uniform(
             new_feature_table=NEW_FEATURE_TABLE,
             orig_feature_table=ORIG_FEATURE_TABLE)
 
         self.assertTrue(numpy.allclose(
-            this_feature_table.as_matrix(),
+            this_feature_matrix,
             FEATURE_TABLE_UNIF_MARGINALS_NEW_TO_ORIG.as_matrix(),
             atol=TOLERANCE, equal_nan=True))
 
@@ -135,12 +142,12 @@ class ProbabilityDistributionsTests(unittest.TestCase):
         are in different orders.
         """
 
-        this_feature_table = prob_dist._transform_each_marginal_to_uniform(
+        this_feature_matrix = prob_dist._transform_each_marginal_to_uniform(
             new_feature_table=NEW_FEATURE_TABLE,
             orig_feature_table=ORIG_FEATURE_TABLE[['b', 'c', 'a']])
 
         self.assertTrue(numpy.allclose(
-            this_feature_table.as_matrix(),
+            this_feature_matrix,
             FEATURE_TABLE_UNIF_MARGINALS_NEW_TO_ORIG.as_matrix(),
             atol=TOLERANCE, equal_nan=True))
 
@@ -153,15 +160,40 @@ class ProbabilityDistributionsTests(unittest.TestCase):
 
         this_orig_feature_table = copy.deepcopy(ORIG_FEATURE_TABLE)
         this_orig_feature_table['d'] = this_orig_feature_table['b']
-        this_feature_table = prob_dist._transform_each_marginal_to_uniform(
+        this_feature_matrix = prob_dist._transform_each_marginal_to_uniform(
             new_feature_table=NEW_FEATURE_TABLE,
             orig_feature_table=this_orig_feature_table)
 
         self.assertTrue(numpy.allclose(
-            this_feature_table.as_matrix(),
+            this_feature_matrix,
             FEATURE_TABLE_UNIF_MARGINALS_NEW_TO_ORIG.as_matrix(),
             atol=TOLERANCE, equal_nan=True))
 
+    def test_transform_each_marginal_to_uniform_sorted_orig_matrix(self):
+        """Ensures correct output from _transform_each_marginal_to_uniform.
+
+        In this case, original values are passed as a sorted matrix (created by
+        _sort_each_marginal), rather than a table.
+        """
+
+        this_feature_matrix = prob_dist._transform_each_marginal_to_uniform(
+            new_feature_table=NEW_FEATURE_TABLE[['a', 'b', 'c']],
+            sorted_orig_feature_matrix=SORTED_ORIG_FEATURE_MATRIX)
+
+        self.assertTrue(numpy.allclose(
+            this_feature_matrix,
+            FEATURE_TABLE_UNIF_MARGINALS_NEW_TO_ORIG[['a', 'b', 'c']].values,
+            atol=TOLERANCE, equal_nan=True))
+
+    def test_sort_each_marginal(self):
+        """Ensures correct output from _sort_each_marginal."""
+
+        this_sorted_matrix = prob_dist._sort_each_marginal(
+            ORIG_FEATURE_TABLE[['a', 'b', 'c']].values)
+        self.assertTrue(numpy.allclose(
+            this_sorted_matrix, SORTED_ORIG_FEATURE_MATRIX, atol=TOLERANCE,
+            equal_nan=True))
+
     def test_normalize_class_probabilities(self):
         """Ensures correct output from _normalize_class_probabilities."""
 
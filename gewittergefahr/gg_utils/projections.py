@@ -208,3 +208,66 @@ def project_xy_to_latlng(x_coords_metres, y_coords_metres,
 
     return (numpy.reshape(latitudes_deg_flat, shape_of_coord_arrays),
             numpy.reshape(longitudes_deg_flat, shape_of_coord_arrays))
+
+
+def project_latlng_to_xy_local_lambert(latitudes_deg, longitudes_deg,
+                                       central_latitudes_deg=None,
+                                       central_longitudes_deg=None):
+    """Projects each point with its own tangent Lambert conformal projection.
+
+    The projection for the [i]th point is the same one created by
+    `init_lambert_conformal_projection`, with both standard parallels at
+    central_latitudes_deg[i] and central meridian at central_longitudes_deg[i].
+    Thus, this method is equivalent to calling `project_latlng_to_xy` once for
+    each unique projection.  However, the formulas (for a spherical earth) are
+    evaluated in numpy, which makes it possible to project many objects (e.g.,
+    storm polygons, each with its own local projection) in one call.
+
+    P = number of points
+
+    :param latitudes_deg: length-P numpy array of latitudes (deg N).
+    :param longitudes_deg: length-P numpy array of longitudes (deg E).
+    :param central_latitudes_deg: length-P numpy array with standard parallel
+        (deg N) for each point.  Must all be non-zero.
+    :param central_longitudes_deg: length-P numpy array with central meridian
+        (deg E) for each point.
+    :return: x_coords_metres: length-P numpy array of x-coordinates.
+    :return: y_coords_metres: length-P numpy array of y-coordinates.
+    """
+
+    error_checking.assert_is_valid_lat_numpy_array(latitudes_deg)
+    error_checking.assert_is_numpy_array(latitudes_deg, num_dimensions=1)
+    num_points = len(latitudes_deg)
+
+    these_expected_dim = numpy.array([num_points])
+    error_checking.assert_is_valid_lng_numpy_array(longitudes_deg)
+    error_checking.assert_is_numpy_array(
+        longitudes_deg, exact_dimensions=these_expected_dim)
+    error_checking.assert_is_valid_lat_numpy_array(central_latitudes_deg)
+    error_checking.assert_is_numpy_array(
+        central_latitudes_deg, exact_dimensions=these_expected_dim)
+    error_checking.assert_is_greater_numpy_array(
+        numpy.absolute(central_latitudes_deg), 0.)
+    error_checking.assert_is_valid_lng_numpy_array(central_longitudes_deg)
+    error_checking.assert_is_numpy_array(
+        central_longitudes_deg, exact_dimensions=these_expected_dim)
+
+    latitudes_rad = numpy.deg2rad(latitudes_deg)
+    central_latitudes_rad = numpy.deg2rad(central_latitudes_deg)
+    longitude_diffs_deg = numpy.mod(
+        longitudes_deg - central_longitudes_deg + 180., 360.) - 180.
+
+    cone_constants = numpy.sin(central_latitudes_rad)
+    scale_factors = (
+        numpy.cos(central_latitudes_rad) * numpy.power(
+            numpy.tan(numpy.pi / 4 + central_latitudes_rad / 2),
+            cone_constants) / cone_constants)
+
+    radii_metres = EARTH_RADIUS_METRES * scale_factors / numpy.power(
+        numpy.tan(numpy.pi / 4 + latitudes_rad / 2), cone_constants)
+    origin_radii_metres = EARTH_RADIUS_METRES * scale_factors
+    angles_rad = cone_constants * numpy.deg2rad(longitude_diffs_deg)
+
+    x_coords_metres = radii_metres * numpy.sin(angles_rad)
+    y_coords_metres = origin_radii_metres - radii_metres * numpy.cos(angles_rad)
+    return x_coords_metres, y_coords_metres
@@ -29,6 +29,13 @@ Y_COORDS_METRES = numpy.array([[4540., 3905., numpy.nan],
                                [5047., 3818., 4748.],
                                [5030., 4748., numpy.nan]])
 
+# The following constants are used to test project_latlng_to_xy_local_lambert.
+LOCAL_LATITUDES_DEG = numpy.array([35.2, 35.3, 41.9, 42.1, 30.])
+LOCAL_LONGITUDES_DEG = numpy.array([262.6, 262.8, -100.1, 259.7, 1.])
+LOCAL_CENTRAL_LATITUDES_DEG = numpy.array([35.25, 35.25, 42., 42., 29.5])
+LOCAL_CENTRAL_LONGITUDES_DEG = numpy.array(
+    [262.7, 262.7, 259.8, -100.2, 359.5])
+
 
 class ProjectionsTests(unittest.TestCase):
     """Each method is a unit test for projections.py."""
@@ -108,5 +115,37 @@ class ProjectionsTests(unittest.TestCase):
             equal_nan=True))
 
 
+    def test_project_latlng_to_xy_local_lambert(self):
+        """Ensures correct output from project_latlng_to_xy_local_lambert.
+
+        This is an integration test, not a unit test, because expected values
+        come from init_lambert_conformal_projection and project_latlng_to_xy.
+        """
+
+        these_x_coords_metres, these_y_coords_metres = (
+            projections.project_latlng_to_xy_local_lambert(
+                LOCAL_LATITUDES_DEG, LOCAL_LONGITUDES_DEG,
+                central_latitudes_deg=LOCAL_CENTRAL_LATITUDES_DEG,
+                central_longitudes_deg=LOCAL_CENTRAL_LONGITUDES_DEG))
+
+        for i in range(len(LOCAL_LATITUDES_DEG)):
+            this_projection_object = (
+                projections.init_lambert_conformal_projection(
+                    numpy.full(2, LOCAL_CENTRAL_LATITUDES_DEG[i]),
+                    LOCAL_CENTRAL_LONGITUDES_DEG[i]))
+
+            this_x_coord_metres, this_y_coord_metres = (
+                projections.project_latlng_to_xy(
+                    LOCAL_LATITUDES_DEG[[i]], LOCAL_LONGITUDES_DEG[[i]],
+                    projection_object=this_projection_object))
+
+            self.assertTrue(numpy.isclose(
+                these_x_coords_metres[i], this_x_coord_metres[0],
+                atol=TOLERANCE))
+            self.assertTrue(numpy.isclose(
+                these_y_coords_metres[i], this_y_coord_metres[0],
+                atol=TOLERANCE))
+
+
 if __name__ == '__main__':
     unittest.main()
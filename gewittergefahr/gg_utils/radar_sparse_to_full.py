@@ -74,6 +74,155 @@ def _convert(sparse_grid_table, field_name, num_grid_rows, num_grid_columns,
     return numpy.reshape(full_matrix, (num_grid_rows, num_grid_columns))
 
 
+def _get_data_runs(sparse_grid_table, field_name, num_grid_rows,
+                   num_grid_columns, ignore_if_below=None):
+    """Returns runs of equal values (one per row of sparse grid).
+
+    R = number of runs
+
+    :param sparse_grid_table: See doc for _convert.
+    :param field_name: Same.
+    :param num_grid_rows: Same.
+    :param num_grid_columns: Same.
+    :param ignore_if_below: Same.
+    :return: start_indices: length-R numpy array with linear index (into full
+        grid) of first grid cell in each run, sorted in ascending order.
+    :return: run_lengths: length-R numpy array with number of grid cells in
+        each run.
+    :return: data_values: length-R numpy array with radar value in each run.
+    """
+
+    data_values = sparse_grid_table[field_name].values
+    if ignore_if_below is None:
+        sparse_indices_to_consider = numpy.linspace(
+            0, len(data_values) - 1, num=len(data_values), dtype=int)
+    else:
+        sparse_indices_to_consider = numpy.where(
+            data_values >= ignore_if_below)[0]
+
+    start_indices = numpy.ravel_multi_index(
+        (sparse_grid_table[radar_io.GRID_ROW_COLUMN].values[
+            sparse_indices_to_consider].astype(int),
+         sparse_grid_table[radar_io.GRID_COLUMN_COLUMN].values[
+             sparse_indices_to_consider].astype(int)),
+        (num_grid_rows, num_grid_columns))
+    run_lengths = sparse_grid_table[radar_io.NUM_GRID_CELL_COLUMN].values[
+        sparse_indices_to_consider].astype(int)
+    data_values = data_values[sparse_indices_to_consider]
+
+    sort_indices = numpy.argsort(start_indices, kind='mergesort')
+    return (start_indices[sort_indices], run_lengths[sort_indices],
+            data_values[sort_indices])
+
+
+def get_linear_indices_at_or_above(
+        sparse_grid_table, field_name, num_grid_rows, num_grid_columns,
+        threshold):
+    """Finds grid cells with radar value >= threshold.
+
+    Only runs with value >= threshold are expanded, so the full grid is never
+    created.
+
+    K = number of grid cells found
+
+    :param sparse_grid_table: See doc for _convert.
+    :param field_name: Same.
+    :param num_grid_rows: Same.
+    :param num_grid_columns: Same.
+    :param threshold: Threshold for radar value.
+    :return: linear_indices: length-K numpy array of linear indices (into full
+        grid), sorted in ascending order.  To convert to row and column
+        indices, use `numpy.unravel_index(linear_indices, (M, N))`, where M and
+        N are the number of rows and columns.
+    """
+
+    start_indices, run_lengths, _ = _get_data_runs(
+        sparse_grid_table, field_name=field_name, num_grid_rows=num_grid_rows,
+        num_grid_columns=num_grid_columns, ignore_if_below=threshold)
+
+    num_values = numpy.sum(run_lengths)
+    if num_values == 0:
+        return numpy.array([], dtype=int)
+
+    offsets_in_run = numpy.arange(num_values) - numpy.repeat(
+        numpy.cumsum(run_lengths) - run_lengths, run_lengths)
+    return numpy.repeat(start_indices, run_lengths) + offsets_in_run
+
+
+def get_values_at_linear_indices(
+        sparse_grid_table, field_name, num_grid_rows, num_grid_columns,
+        linear_indices, ignore_if_below=None):
+    """Returns radar values at the given grid cells.
+
+    This is equivalent to converting to a full grid (with _convert) and then
+    indexing the full grid, but the full grid is never created.  This method
+    assumes that runs in the sparse grid do not overlap.
+
+    K = number of grid cells
+
+    :param sparse_grid_table: See doc for _convert.
+    :param field_name: Same.
+    :param num_grid_rows: Same.
+    :param num_grid_columns: Same.
+    :param linear_indices: length-K numpy array of linear indices (into full
+        grid).
+    :param ignore_if_below: See doc for _convert.
+    :return: data_values: length-K numpy array of radar values.  This is NaN
+        for grid cells with no data.
+    """
+
+    start_indices, run_lengths, run_values = _get_data_runs(
+        sparse_grid_table, field_name=field_name, num_grid_rows=num_grid_rows,
+        num_grid_columns=num_grid_columns, ignore_if_below=ignore_if_below)
+
+    data_values = numpy.full(len(linear_indices), numpy.nan)
+    run_indices = numpy.searchsorted(
+        start_indices, linear_indices, side='right') - 1
+
+    found_flags = run_indices >= 0
+    found_flags[found_flags] = (
+        linear_indices[found_flags] <
+        start_indices[run_indices[found_flags]] +
+        run_lengths[run_indices[found_flags]])
+
+    data_values[found_flags] = run_values[run_indices[found_flags]]
+    return data_values
+
+
+def sparse_to_grid_point_values(sparse_grid_table, metadata_dict,
+                                grid_point_rows, grid_point_columns,
+                                ignore_if_below=None):
+    """Returns radar values at the given grid points.
+
+    This is equivalent to calling sparse_to_full_grid and then indexing the full
+    grid, but the full grid is never created.  Thus, memory usage scales with
+    the number of grid points requested, rather than the size of the grid.
+
+    P = number of grid points
+
+    :param sparse_grid_table: See doc for sparse_to_full_grid.
+    :param metadata_dict: Same.
+    :param grid_point_rows: length-P numpy array with row indices of grid
+        points.
+    :param grid_point_columns: length-P numpy array with column indices of grid
+        points.
+    :param ignore_if_below: See doc for sparse_to_full_grid.
+    :return: data_values: length-P numpy array of radar values.  This is NaN for
+        grid points with no data.
+    """
+
+    num_grid_rows = metadata_dict[radar_io.NUM_LAT_COLUMN]
+    num_grid_columns = metadata_dict[radar_io.NUM_LNG_COLUMN]
+    linear_indices = numpy.ravel_multi_index(
+        (grid_point_rows.astype(int), grid_point_columns.astype(int)),
+        (num_grid_rows, num_grid_columns))
+
+    return get_values_at_linear_indices(
+        sparse_grid_table, field_name=metadata_dict[radar_io.FIELD_NAME_COLUMN],
+        num_grid_rows=num_grid_rows, num_grid_columns=num_grid_columns,
+        linear_indices=linear_indices, ignore_if_below=ignore_if_below)
+
+
 def sparse_to_full_grid(sparse_grid_table, metadata_dict, ignore_if_below=None):
     """Converts data from sparse to full grid (public wrapper for _convert).
 
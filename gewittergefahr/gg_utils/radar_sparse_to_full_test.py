@@ -35,6 +35,26 @@ FULL_MATRIX_LESS_THAN_51_IGNORED = numpy.array(
      [numpy.nan, 70., 70., 70., numpy.nan, numpy.nan],
      [65., 65., 65., 65., numpy.nan, numpy.nan]])
 
+# The following constants are used to test get_linear_indices_at_or_above and
+# get_values_at_linear_indices.
+LINEAR_INDICES_AT_OR_ABOVE_51 = numpy.array(
+    [13, 14, 15, 18, 19, 20, 21], dtype=int)
+LINEAR_INDICES_TO_QUERY = numpy.array([0, 3, 8, 9, 14, 21, 22, 23], dtype=int)
+VALUES_AT_LINEAR_INDICES = numpy.array(
+    [numpy.nan, 35., 50., 50., 70., 65., numpy.nan, numpy.nan])
+VALUES_AT_LINEAR_INDICES_LESS_THAN_51_IGNORED = numpy.array(
+    [numpy.nan, numpy.nan, numpy.nan, numpy.nan, 70., 65., numpy.nan,
+     numpy.nan])
+
+
+# The following constants are used to test sparse_to_grid_point_values.
+METADATA_DICT = {radar_io.NUM_LAT_COLUMN: NUM_GRID_ROWS,
+                 radar_io.NUM_LNG_COLUMN: NUM_GRID_COLUMNS,
+                 radar_io.FIELD_NAME_COLUMN: RADAR_FIELD_NAME}
+GRID_POINT_ROWS_TO_QUERY = numpy.array([0, 0, 1, 1, 2, 3, 3, 3], dtype=int)
+GRID_POINT_COLUMNS_TO_QUERY = numpy.array(
+    [0, 3, 2, 3, 2, 3, 4, 5], dtype=int)
+
 
 class RadarSparseToFullTests(unittest.TestCase):
     """Each method is a unit test for radar_sparse_to_full.py."""
@@ -70,6 +90,72 @@ class RadarSparseToFullTests(unittest.TestCase):
             this_full_matrix, FULL_MATRIX_LESS_THAN_51_IGNORED, atol=TOLERANCE,
             equal_nan=True))
 
+    def test_get_linear_indices_at_or_above(self):
+        """Ensures correct output from get_linear_indices_at_or_above."""
+
+        these_linear_indices = radar_s2f.get_linear_indices_at_or_above(
+            SPARSE_GRID_TABLE, field_name=RADAR_FIELD_NAME,
+            num_grid_rows=NUM_GRID_ROWS, num_grid_columns=NUM_GRID_COLUMNS,
+            threshold=51.)
+
+        self.assertTrue(numpy.array_equal(
+            these_linear_indices, LINEAR_INDICES_AT_OR_ABOVE_51))
+
+    def test_get_linear_indices_at_or_above_none(self):
+        """Ensures correct output from get_linear_indices_at_or_above.
+
+        In this case, no value reaches the threshold.
+        """
+
+        these_linear_indices = radar_s2f.get_linear_indices_at_or_above(
+            SPARSE_GRID_TABLE, field_name=RADAR_FIELD_NAME,
+            num_grid_rows=NUM_GRID_ROWS, num_grid_columns=NUM_GRID_COLUMNS,
+            threshold=100.)
+
+        self.assertTrue(len(these_linear_indices) == 0)
+
+    def test_get_values_at_linear_indices_no_values_ignored(self):
+        """Ensures correct output from get_values_at_linear_indices.
+
+        In this case, `ignore_if_below` is None.
+        """
+
+        these_values = radar_s2f.get_values_at_linear_indices(
+            SPARSE_GRID_TABLE, field_name=RADAR_FIELD_NAME,
+            num_grid_rows=NUM_GRID_ROWS, num_grid_columns=NUM_GRID_COLUMNS,
+            linear_indices=LINEAR_INDICES_TO_QUERY, ignore_if_below=None)
+
+        self.assertTrue(numpy.allclose(
+            these_values, VALUES_AT_LINEAR_INDICES, atol=TOLERANCE,
+            equal_nan=True))
+
+    def test_get_values_at_linear_indices_less_than_51_ignored(self):
+        """Ensures correct output from get_values_at_linear_indices.
+
+        In this case, `ignore_if_below` = 51.
+        """
+
+        these_values = radar_s2f.get_values_at_linear_indices(
+            SPARSE_GRID_TABLE, field_name=RADAR_FIELD_NAME,
+            num_grid_rows=NUM_GRID_ROWS, num_grid_columns=NUM_GRID_COLUMNS,
+            linear_indices=LINEAR_INDICES_TO_QUERY, ignore_if_below=51.)
+
+        self.assertTrue(numpy.allclose(
+            these_values, VALUES_AT_LINEAR_INDICES_LESS_THAN_51_IGNORED,
+            atol=TOLERANCE, equal_nan=True))
+
+    def test_sparse_to_grid_point_values(self):
+        """Ensures correct output from sparse_to_grid_point_values."""
+
+        these_values = radar_s2f.sparse_to_grid_point_values(
+            SPARSE_GRID_TABLE, metadata_dict=METADATA_DICT,
+            grid_point_rows=GRID_POINT_ROWS_TO_QUERY,
+            grid_point_columns=GRID_POINT_COLUMNS_TO_QUERY)
+
+        self.assertTrue(numpy.allclose(
+            these_values, VALUES_AT_LINEAR_INDICES, atol=TOLERANCE,
+            equal_nan=True))
+
 
 if __name__ == '__main__':
     unittest.main()
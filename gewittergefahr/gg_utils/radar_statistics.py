@@ -5,6 +5,10 @@ These are usually spatial statistics based on values inside a storm object.
 
 import warnings
 import pickle
+import threading
+import collections
+import multiprocessing
+import multiprocessing.pool
 import numpy
 import pandas
 import scipy.stats
@@ -19,6 +23,8 @@ from gewittergefahr.gg_utils import error_checking
 
 TOLERANCE = 1e-6
 DEFAULT_DILATION_PERCENTILE_LEVEL = 90.
+DEFAULT_NUM_READ_AHEAD_FILES = 0
+DEFAULT_NUM_PROCESSES_FOR_STATS = 1
 
 TIME_FORMAT_FOR_LOG_MESSAGES = '%Y-%m-%d-%H%M%S'
 STORM_COLUMNS_TO_KEEP = [tracking_io.STORM_ID_COLUMN, tracking_io.TIME_COLUMN]
@@ -28,16 +34,9 @@ RADAR_HEIGHT_KEY = 'radar_height_m_agl'
 STATISTIC_NAME_KEY = 'statistic_name'
 PERCENTILE_LEVEL_KEY = 'percentile_level'
 
-GRID_METADATA_KEYS_TO_COMPARE = [
-    radar_io.NW_GRID_POINT_LAT_COLUMN, radar_io.NW_GRID_POINT_LNG_COLUMN,
-    radar_io.LAT_SPACING_COLUMN, radar_io.LNG_SPACING_COLUMN,
-    radar_io.NUM_LAT_COLUMN, radar_io.NUM_LNG_COLUMN]
-
 STORM_OBJECT_TO_GRID_PTS_COLUMNS = [
     tracking_io.STORM_ID_COLUMN, tracking_io.GRID_POINT_ROW_COLUMN,
     tracking_io.GRID_POINT_COLUMN_COLUMN]
-GRID_POINT_LATLNG_COLUMNS = [tracking_io.GRID_POINT_LAT_COLUMN,
-                             tracking_io.GRID_POINT_LNG_COLUMN]
 
 # TODO(thunderhoser): Currently statistic names cannot have underscores (this
 # will ruin _column_name_to_statistic_params).  I should change that.
@@ -61,6 +60,23 @@ DEFAULT_RADAR_FIELD_NAMES = [
     radar_io.REFL_M20CELSIUS_NAME, radar_io.REFL_LOWEST_ALTITUDE_NAME,
     radar_io.SHI_NAME, radar_io.VIL_NAME]
 
+RADAR_FILE_NAME_MATRIX_KEY = 'radar_file_name_matrix'
+METADATA_DICT_BY_FIELD_KEY = 'metadata_dict_by_field'
+GRID_POINT_ROWS_BY_FIELD_KEY = 'grid_point_rows_by_field'
+GRID_POINT_COLUMNS_BY_FIELD_KEY = 'grid_point_columns_by_field'
+STORM_INDICES_BY_TIME_KEY = 'storm_indices_by_time'
+DILATION_FLAG_BY_FIELD_KEY = 'dilation_flag_by_field'
+RADAR_DATA_SOURCE_KEY = 'radar_data_source'
+DILATION_HALF_WIDTH_KEY = 'dilation_half_width_in_pixels'
+DILATION_PERCENTILE_LEVEL_KEY = 'dilation_percentile_level'
+STATISTIC_NAMES_KEY = 'statistic_names'
+PERCENTILE_LEVELS_KEY = 'percentile_levels'
+
+# Reading from the same NetCDF library in several threads is not safe, so reads
+# are serialized.  Decoding and dilation still overlap.
+_NETCDF_READ_LOCK = threading.Lock()
+_WORKER_STATS_DICT = None
+
 IGNORABLE_FIELD_NAMES = [
     radar_io.LOW_LEVEL_SHEAR_NAME, radar_io.MID_LEVEL_SHEAR_NAME]
 AZIMUTHAL_SHEAR_FIELD_NAMES = [
@@ -184,12 +200,8 @@ def _are_grids_equal(metadata_dict_orig, metadata_dict_new):
     :return: are_grids_equal_flag: Boolean flag.
     """
 
-    metadata_dict_orig = {
-        k: metadata_dict_orig[k] for k in GRID_METADATA_KEYS_TO_COMPARE}
-    metadata_dict_new = {
-        k: metadata_dict_new[k] for k in GRID_METADATA_KEYS_TO_COMPARE}
-
-    return metadata_dict_orig == metadata_dict_new
+    return (radar_io.RadarGrid(metadata_dict_orig) ==
+            radar_io.RadarGrid(metadata_dict_new))
 
 
 def _check_statistic_params(statistic_names, percentile_levels):
@@ -224,6 +236,328 @@ def _check_statistic_params(statistic_names, percentile_levels):
         rounder.round_to_nearest(percentile_levels, PERCENTILE_LEVEL_PRECISION))
 
 
+def _get_grid_points_for_storms(
+        storm_indices, grid_point_rows_by_storm, grid_point_columns_by_storm):
+    """Concatenates grid points in the given storm objects.
+
+    S = number of storm objects
+    P = total number of grid points in the S storm objects
+
+    :param storm_indices: length-S numpy array with indices of storm objects
+        (rows in `storm_object_table`).
+    :param grid_point_rows_by_storm: 1-D numpy array (one element per storm
+        object in `storm_object_table`), where each element is a numpy array
+        with row indices of grid points in the storm object.
+    :param grid_point_columns_by_storm: Same but for column indices.
+    :return: grid_point_rows: length-P numpy array of row indices.
+    :return: grid_point_columns: length-P numpy array of column indices.
+    :return: num_grid_points_by_storm: length-S numpy array with number of grid
+        points in each storm object.
+    """
+
+    if len(storm_indices) == 0:
+        return (numpy.array([], dtype=int), numpy.array([], dtype=int),
+                numpy.array([], dtype=int))
+
+    grid_point_rows = numpy.concatenate(
+        [grid_point_rows_by_storm[k] for k in storm_indices]).astype(int)
+    grid_point_columns = numpy.concatenate(
+        [grid_point_columns_by_storm[k] for k in storm_indices]).astype(int)
+    num_grid_points_by_storm = numpy.array(
+        [len(grid_point_rows_by_storm[k]) for k in storm_indices], dtype=int)
+
+    return grid_point_rows, grid_point_columns, num_grid_points_by_storm
+
+
+def _dilate_at_storm_grid_points(
+        sparse_grid_table, metadata_dict, grid_point_rows, grid_point_columns,
+        num_grid_points_by_storm, dilation_half_width_in_pixels,
+        dilation_percentile_level):
+    """Dilates radar field at grid points in storm objects.
+
+    Each storm object is dilated separately, using only the bounding box around
+    the storm object (see `dilation.get_bounding_box_for_points`).  Thus, the
+    full grid is never created, and results are the same as dilating the full
+    grid.
+
+    S = number of storm objects
+    P = total number of grid points in the S storm objects
+
+    :param sparse_grid_table: pandas DataFrame created by
+        `radar_io.read_data_from_sparse_grid_file`.
+    :param metadata_dict: See doc for _read_radar_values_for_stats.
+    :param grid_point_rows: length-P numpy array with row indices of grid
+        points (created by _get_grid_points_for_storms).
+    :param grid_point_columns: Same but for column indices.
+    :param num_grid_points_by_storm: length-S numpy array with number of grid
+        points in each storm object.
+    :param dilation_half_width_in_pixels: See doc for
+        get_stats_for_storm_objects.
+    :param dilation_percentile_level: Same.
+    :return: radar_values: length-P numpy array of dilated radar values.
+    """
+
+    num_grid_rows = metadata_dict[radar_io.NUM_LAT_COLUMN]
+    num_grid_columns = metadata_dict[radar_io.NUM_LNG_COLUMN]
+    last_point_indices = numpy.cumsum(num_grid_points_by_storm)
+    first_point_indices = last_point_indices - num_grid_points_by_storm
+
+    num_storm_objects = len(num_grid_points_by_storm)
+    box_limit_matrix = numpy.full((num_storm_objects, 4), -1, dtype=int)
+    box_rows_by_storm = []
+    box_columns_by_storm = []
+
+    for i in range(num_storm_objects):
+        if num_grid_points_by_storm[i] == 0:
+            continue
+
+        these_point_indices = numpy.arange(
+            first_point_indices[i], last_point_indices[i])
+        box_limit_matrix[i, :] = dilation.get_bounding_box_for_points(
+            row_indices=grid_point_rows[these_point_indices],
+            column_indices=grid_point_columns[these_point_indices],
+            half_width_in_pixels=dilation_half_width_in_pixels,
+            num_rows=num_grid_rows, num_columns=num_grid_columns)
+
+        this_box_row_matrix, this_box_column_matrix = numpy.meshgrid(
+            numpy.arange(box_limit_matrix[i, 0], box_limit_matrix[i, 1] + 1),
+            numpy.arange(box_limit_matrix[i, 2], box_limit_matrix[i, 3] + 1),
+            indexing='ij')
+        box_rows_by_storm.append(numpy.ravel(this_box_row_matrix))
+        box_columns_by_storm.append(numpy.ravel(this_box_column_matrix))
+
+    radar_values = numpy.full(len(grid_point_rows), numpy.nan)
+    if not box_rows_by_storm:
+        return radar_values
+
+    box_values = radar_s2f.sparse_to_grid_point_values(
+        sparse_grid_table, metadata_dict=metadata_dict,
+        grid_point_rows=numpy.concatenate(box_rows_by_storm),
+        grid_point_columns=numpy.concatenate(box_columns_by_storm))
+    num_box_values_used = 0
+
+    for i in range(num_storm_objects):
+        if num_grid_points_by_storm[i] == 0:
+            continue
+
+        this_num_rows = box_limit_matrix[i, 1] - box_limit_matrix[i, 0] + 1
+        this_num_columns = box_limit_matrix[i, 3] - box_limit_matrix[i, 2] + 1
+        this_box_matrix = numpy.reshape(
+            box_values[num_box_values_used:(
+                num_box_values_used + this_num_rows * this_num_columns)],
+            (this_num_rows, this_num_columns))
+        num_box_values_used += this_num_rows * this_num_columns
+
+        this_box_matrix = dilation.dilate_2d_matrix(
+            this_box_matrix, percentile_level=dilation_percentile_level,
+            half_width_in_pixels=dilation_half_width_in_pixels,
+            take_largest_absolute_value=True)
+
+        these_point_indices = numpy.arange(
+            first_point_indices[i], last_point_indices[i])
+        radar_values[these_point_indices] = this_box_matrix[
+            grid_point_rows[these_point_indices] - box_limit_matrix[i, 0],
+            grid_point_columns[these_point_indices] - box_limit_matrix[i, 2]]
+
+    return radar_values
+
+
+def _read_radar_values_for_stats(
+        radar_file_name, metadata_dict, radar_data_source, storm_indices,
+        grid_point_rows_by_storm, grid_point_columns_by_storm, dilate_flag,
+        dilation_half_width_in_pixels, dilation_percentile_level):
+    """Reads radar values at storm grid points, to be used for statistics.
+
+    Values are looked up directly in the sparse grid, so the full grid is never
+    created.
+
+    S = number of storm objects
+    P = total number of grid points in the S storm objects
+
+    :param radar_file_name: Path to input file (raw MYRORSS or MRMS file).
+    :param metadata_dict: Dictionary created by
+        `radar_io.read_metadata_from_raw_file` for the given field.
+    :param radar_data_source: See doc for get_stats_for_storm_objects.
+    :param storm_indices: See doc for _get_grid_points_for_storms.
+    :param grid_point_rows_by_storm: Same.
+    :param grid_point_columns_by_storm: Same.
+    :param dilate_flag: Boolean flag.  If True, will dilate radar field.
+    :param dilation_half_width_in_pixels: See doc for
+        get_stats_for_storm_objects.
+    :param dilation_percentile_level: Same.
+    :return: radar_values: length-P numpy array of radar values, with NaN's
+        replaced by zero.  See doc for _get_stats_from_radar_values.
+    :return: num_grid_points_by_storm: length-S numpy array with number of grid
+        points in each storm object.
+    """
+
+    grid_point_rows, grid_point_columns, num_grid_points_by_storm = (
+        _get_grid_points_for_storms(
+            storm_indices=storm_indices,
+            grid_point_rows_by_storm=grid_point_rows_by_storm,
+            grid_point_columns_by_storm=grid_point_columns_by_storm))
+
+    with _NETCDF_READ_LOCK:
+        sparse_grid_table = radar_io.read_data_from_sparse_grid_file(
+            radar_file_name,
+            field_name_orig=metadata_dict[radar_io.FIELD_NAME_COLUMN_ORIG],
+            data_source=radar_data_source,
+            sentinel_values=metadata_dict[radar_io.SENTINEL_VALUE_COLUMN])
+
+    if dilate_flag:
+        print 'Dilating azimuthal-shear field...'
+        radar_values = _dilate_at_storm_grid_points(
+            sparse_grid_table, metadata_dict=metadata_dict,
+            grid_point_rows=grid_point_rows,
+            grid_point_columns=grid_point_columns,
+            num_grid_points_by_storm=num_grid_points_by_storm,
+            dilation_half_width_in_pixels=dilation_half_width_in_pixels,
+            dilation_percentile_level=dilation_percentile_level)
+
+    else:
+        radar_values = radar_s2f.sparse_to_grid_point_values(
+            sparse_grid_table, metadata_dict=metadata_dict,
+            grid_point_rows=grid_point_rows,
+            grid_point_columns=grid_point_columns)
+
+    radar_values[numpy.isnan(radar_values)] = 0.
+    return radar_values, num_grid_points_by_storm
+
+
+def _read_radar_values_in_order(read_argument_lists, num_read_ahead_files):
+    """Reads radar values for each task in order, possibly with read-ahead.
+
+    T = number of tasks (radar files to read)
+
+    :param read_argument_lists: length-T list, where each element is a tuple of
+        arguments for _read_radar_values_for_stats.
+    :param num_read_ahead_files: Number of files to read ahead.  If 0, each
+        file is read only when requested.  Otherwise, a pool of
+        `num_read_ahead_files` threads reads the next `num_read_ahead_files`
+        files while the caller is working on the current one.
+    :return: radar_values: See doc for _read_radar_values_for_stats.
+    :return: num_grid_points_by_storm: Same.
+
+    This is a generator, yielding one pair of outputs at a time in the same
+    order as `read_argument_lists`.
+    """
+
+    num_files = len(read_argument_lists)
+    if num_read_ahead_files == 0:
+        for t in range(num_files):
+            yield _read_radar_values_for_stats(*read_argument_lists[t])
+        return
+
+    thread_pool = multiprocessing.pool.ThreadPool(
+        processes=num_read_ahead_files)
+    pending_results = collections.deque()
+    num_files_submitted = 0
+
+    try:
+        for _ in range(num_files):
+            while (num_files_submitted < num_files and
+                   len(pending_results) <= num_read_ahead_files):
+                pending_results.append(thread_pool.apply_async(
+                    _read_radar_values_for_stats,
+                    read_argument_lists[num_files_submitted]))
+                num_files_submitted += 1
+
+            yield pending_results.popleft().get()
+    finally:
+        thread_pool.close()
+        thread_pool.join()
+
+
+def _get_stats_from_radar_values(
+        radar_values, num_grid_points_by_storm, statistic_names,
+        percentile_levels):
+    """Computes statistics for storm objects from one radar field.
+
+    S = number of storm objects
+    K = number of non-percentile-based statistics
+    P = number of percentile levels
+
+    :param radar_values: 1-D numpy array of radar values (created by
+        _read_radar_values_for_stats), where the first
+        `num_grid_points_by_storm[0]` values are in the first storm object, the
+        next `num_grid_points_by_storm[1]` values are in the second storm
+        object, etc.
+    :param num_grid_points_by_storm: length-S numpy array with number of grid
+        points in each storm object.
+    :param statistic_names: length-K list of non-percentile-based statistics.
+    :param percentile_levels: length-P numpy array of percentile levels.
+    :return: statistic_matrix: S-by-K numpy array of non-percentile-based
+        statistics.
+    :return: percentile_matrix: S-by-P numpy array of percentiles.
+    """
+
+    num_storm_objects = len(num_grid_points_by_storm)
+    statistic_matrix = numpy.full(
+        (num_storm_objects, len(statistic_names)), numpy.nan)
+    percentile_matrix = numpy.full(
+        (num_storm_objects, len(percentile_levels)), numpy.nan)
+
+    last_indices = numpy.cumsum(num_grid_points_by_storm)
+    first_indices = last_indices - num_grid_points_by_storm
+
+    for i in range(num_storm_objects):
+        statistic_matrix[i, :], percentile_matrix[i, :] = (
+            get_spatial_statistics(
+                radar_values[first_indices[i]:last_indices[i]],
+                statistic_names=statistic_names,
+                percentile_levels=percentile_levels))
+
+    return statistic_matrix, percentile_matrix
+
+
+def _init_stats_worker(stats_dict):
+    """Initializes worker process for computing statistics.
+
+    This method stores all data needed by the worker in a global variable, so
+    that it is sent to each worker only once (rather than once per task).
+
+    :param stats_dict: Dictionary with keys listed in
+        _get_stats_for_one_task_in_worker.
+    """
+
+    global _WORKER_STATS_DICT
+    _WORKER_STATS_DICT = stats_dict
+
+
+def _get_stats_for_one_task_in_worker(task_indices):
+    """Computes statistics for one radar field at one time step.
+
+    This method is meant to be mapped over a worker pool (see
+    _init_stats_worker).
+
+    :param task_indices: length-2 tuple with index of valid time and index of
+        radar field.
+    :return: statistic_matrix: See doc for _get_stats_from_radar_values.
+    :return: percentile_matrix: Same.
+    """
+
+    time_index, field_index = task_indices
+    stats_dict = _WORKER_STATS_DICT
+
+    radar_values, num_grid_points_by_storm = _read_radar_values_for_stats(
+        stats_dict[RADAR_FILE_NAME_MATRIX_KEY][time_index, field_index],
+        metadata_dict=stats_dict[METADATA_DICT_BY_FIELD_KEY][field_index],
+        radar_data_source=stats_dict[RADAR_DATA_SOURCE_KEY],
+        storm_indices=stats_dict[STORM_INDICES_BY_TIME_KEY][time_index],
+        grid_point_rows_by_storm=stats_dict[
+            GRID_POINT_ROWS_BY_FIELD_KEY][field_index],
+        grid_point_columns_by_storm=stats_dict[
+            GRID_POINT_COLUMNS_BY_FIELD_KEY][field_index],
+        dilate_flag=stats_dict[DILATION_FLAG_BY_FIELD_KEY][field_index],
+        dilation_half_width_in_pixels=stats_dict[DILATION_HALF_WIDTH_KEY],
+        dilation_percentile_level=stats_dict[DILATION_PERCENTILE_LEVEL_KEY])
+
+    return _get_stats_from_radar_values(
+        radar_values, num_grid_points_by_storm=num_grid_points_by_storm,
+        statistic_names=stats_dict[STATISTIC_NAMES_KEY],
+        percentile_levels=stats_dict[PERCENTILE_LEVELS_KEY])
+
+
 def get_statistic_columns(statistic_table):
     """Returns names of columns with radar statistics.
 
@@ -314,6 +648,12 @@ def get_grid_points_in_storm_objects(storm_object_table,
                                      new_metadata_dict):
     """Finds grid points inside each storm object.
 
+    Grid points are remapped with `radar_io.RadarGrid.get_remapping_table`, so
+    this method assumes that grid-point latitudes and longitudes in
+    storm_object_table are the coordinates of grid-point rows and columns in
+    the original grid (as they are in tables created by segmotion_io and
+    probsevere_io).
+
     :param storm_object_table: pandas DataFrame with columns specified by
         `storm_tracking_io.write_processed_file`.
     :param metadata_dict_for_storm_objects: Dictionary (with keys specified by
@@ -331,31 +671,38 @@ def get_grid_points_in_storm_objects(storm_object_table,
         column indices (integers) of grid points in storm object.
     """
 
-    if _are_grids_equal(metadata_dict_for_storm_objects, new_metadata_dict):
+    grid_for_storm_objects = radar_io.RadarGrid(
+        metadata_dict_for_storm_objects)
+    new_grid = radar_io.RadarGrid(new_metadata_dict)
+    if grid_for_storm_objects == new_grid:
         return storm_object_table[STORM_OBJECT_TO_GRID_PTS_COLUMNS]
 
     storm_object_to_grid_points_table = storm_object_table[
-        STORM_OBJECT_TO_GRID_PTS_COLUMNS + GRID_POINT_LATLNG_COLUMNS]
-    num_storm_objects = len(storm_object_to_grid_points_table.index)
+        STORM_OBJECT_TO_GRID_PTS_COLUMNS].copy()
+
+    # All storm objects are remapped with one lookup, rather than one lat-long
+    # conversion per storm object.
+    target_rows, target_columns = grid_for_storm_objects.get_remapping_table(
+        new_grid)
+    old_grid_point_rows, offsets = radar_io.flatten_ragged_arrays(
+        storm_object_to_grid_points_table[
+            tracking_io.GRID_POINT_ROW_COLUMN].values.tolist())
+    old_grid_point_columns, _ = radar_io.flatten_ragged_arrays(
+        storm_object_to_grid_points_table[
+            tracking_io.GRID_POINT_COLUMN_COLUMN].values.tolist())
+
+    new_rows_by_storm = radar_io.unflatten_ragged_arrays(
+        target_rows[old_grid_point_rows.astype(int)], offsets)
+    new_columns_by_storm = radar_io.unflatten_ragged_arrays(
+        target_columns[old_grid_point_columns.astype(int)], offsets)
 
+    num_storm_objects = len(storm_object_to_grid_points_table.index)
     for i in range(num_storm_objects):
-        (storm_object_to_grid_points_table[
-            tracking_io.GRID_POINT_ROW_COLUMN].values[i],
-         storm_object_to_grid_points_table[
-             tracking_io.GRID_POINT_COLUMN_COLUMN].values[i]) = (
-                 radar_io.latlng_to_rowcol(
-                     storm_object_to_grid_points_table[
-                         tracking_io.GRID_POINT_LAT_COLUMN].values[i],
-                     storm_object_to_grid_points_table[
-                         tracking_io.GRID_POINT_LNG_COLUMN].values[i],
-                     nw_grid_point_lat_deg=
-                     new_metadata_dict[radar_io.NW_GRID_POINT_LAT_COLUMN],
-                     nw_grid_point_lng_deg=
-                     new_metadata_dict[radar_io.NW_GRID_POINT_LNG_COLUMN],
-                     lat_spacing_deg=
-                     new_metadata_dict[radar_io.LAT_SPACING_COLUMN],
-                     lng_spacing_deg=
-                     new_metadata_dict[radar_io.LNG_SPACING_COLUMN]))
+        storm_object_to_grid_points_table[
+            tracking_io.GRID_POINT_ROW_COLUMN].values[i] = new_rows_by_storm[i]
+        storm_object_to_grid_points_table[
+            tracking_io.GRID_POINT_COLUMN_COLUMN].values[i] = (
+                new_columns_by_storm[i])
 
     return storm_object_to_grid_points_table[STORM_OBJECT_TO_GRID_PTS_COLUMNS]
 
@@ -414,9 +761,29 @@ def get_stats_for_storm_objects(
         radar_data_source=radar_io.MYRORSS_SOURCE_ID,
         top_radar_directory_name=None, dilate_azimuthal_shear=False,
         dilation_half_width_in_pixels=dilation.DEFAULT_HALF_WIDTH,
-        dilation_percentile_level=DEFAULT_DILATION_PERCENTILE_LEVEL):
+        dilation_percentile_level=DEFAULT_DILATION_PERCENTILE_LEVEL,
+        index_directory_name=None,
+        num_read_ahead_files=DEFAULT_NUM_READ_AHEAD_FILES,
+        num_processes=DEFAULT_NUM_PROCESSES_FOR_STATS):
     """Computes radar statistics for one or more storm objects.
 
+    Each task (one radar field at one time step) consists of reading a radar
+    file, extracting values at grid points in storm objects at the given time,
+    and computing statistics for these storm objects.  Values are extracted
+    directly from the sparse grid, so the full grid is never created.  If the
+    field is dilated, dilation is done only in a bounding box around each storm
+    object.  Tasks may be run in one of three ways:
+
+    [1] Serially, if num_read_ahead_files = 0 and num_processes = 1.
+    [2] With read-ahead, if num_read_ahead_files > 0 and num_processes = 1.  A
+        pool of `num_read_ahead_files` threads reads the next
+        `num_read_ahead_files` radar files while the main thread computes
+        statistics.  At most `num_read_ahead_files` + 1 files are held in
+        memory.
+    [3] In a pool of `num_processes` worker processes, if num_processes > 1.
+        Each worker runs whole tasks.  Results do not depend on the number of
+        processes.
+
     F = number of radar field-height pairs
     K = number of statistics (percentile- and non-percentile-based)
 
@@ -445,6 +812,12 @@ def get_stats_for_storm_objects(
         `dilation.dilate_2d_matrix`.
     :param dilation_percentile_level: See documentation for
         `dilation.dilate_2d_matrix`.
+    :param index_directory_name: Name of directory with index files for radar
+        file catalogs (see `file_catalog.get_catalog`).  If None, catalogs will
+        be cached only in memory.
+    :param num_read_ahead_files: Number of radar files to read ahead (see
+        above).
+    :param num_processes: Number of worker processes (see above).
     :return: storm_radar_statistic_table: pandas DataFrame with 2 + K * F
         columns, where the last K * F columns are one for each statistic-field
         pair.  Names of these columns are determined by
@@ -460,6 +833,10 @@ def get_stats_for_storm_objects(
     percentile_levels = _check_statistic_params(
         statistic_names, percentile_levels)
     error_checking.assert_is_boolean(dilate_azimuthal_shear)
+    error_checking.assert_is_integer(num_read_ahead_files)
+    error_checking.assert_is_geq(num_read_ahead_files, 0)
+    error_checking.assert_is_integer(num_processes)
+    error_checking.assert_is_geq(num_processes, 1)
 
     radar_field_name_by_pair, radar_height_by_pair_m_agl = (
         radar_io.unique_fields_and_heights_to_pairs(
@@ -488,7 +865,8 @@ def get_stats_for_storm_objects(
                         field_name=radar_field_name_by_pair[j],
                         data_source=radar_data_source,
                         top_directory_name=top_radar_directory_name,
-                        raise_error_if_missing=False))
+                        raise_error_if_missing=False,
+                        index_directory_name=index_directory_name))
 
             else:
                 radar_file_name_matrix[i, j] = radar_io.find_raw_file(
@@ -498,7 +876,8 @@ def get_stats_for_storm_objects(
                     height_m_agl=radar_height_by_pair_m_agl[j],
                     data_source=radar_data_source,
                     top_directory_name=top_radar_directory_name,
-                    raise_error_if_missing=True)
+                    raise_error_if_missing=True,
+                    index_directory_name=index_directory_name)
 
             if radar_file_name_matrix[i, j] is None:
                 this_time_string = time_conversion.unix_sec_to_string(
@@ -520,75 +899,109 @@ def get_stats_for_storm_objects(
     percentile_matrix = numpy.full(
         (num_storms, num_radar_fields, num_percentiles), numpy.nan)
 
-    for j in range(num_radar_fields):
-        metadata_dict_for_this_field = None
+    metadata_dict_by_field = [None] * num_radar_fields
+    grid_point_rows_by_field = [None] * num_radar_fields
+    grid_point_columns_by_field = [None] * num_radar_fields
+    task_indices_list = []
 
+    for j in range(num_radar_fields):
         for i in range(num_unique_storm_times):
             if radar_file_name_matrix[i, j] is None:
                 continue
 
+            task_indices_list.append((i, j))
+            if metadata_dict_by_field[j] is not None:
+                continue
+
+            metadata_dict_by_field[j] = radar_io.read_metadata_from_raw_file(
+                radar_file_name_matrix[i, j], data_source=radar_data_source)
+            this_grid_point_table = get_grid_points_in_storm_objects(
+                storm_object_table, metadata_dict_for_storm_objects,
+                metadata_dict_by_field[j])
+
+            grid_point_rows_by_field[j] = this_grid_point_table[
+                tracking_io.GRID_POINT_ROW_COLUMN].values
+            grid_point_columns_by_field[j] = this_grid_point_table[
+                tracking_io.GRID_POINT_COLUMN_COLUMN].values
+
+    storm_indices_by_time = [None] * num_unique_storm_times
+    for i in range(num_unique_storm_times):
+        these_storm_flags = numpy.logical_and(
+            storm_object_table[tracking_io.TIME_COLUMN].values ==
+            unique_storm_times_unix_sec[i],
+            storm_object_table[tracking_io.SPC_DATE_COLUMN].values ==
+            unique_spc_dates_unix_sec[i])
+        storm_indices_by_time[i] = numpy.where(these_storm_flags)[0]
+
+    dilation_flag_by_field = [
+        dilate_azimuthal_shear and f in AZIMUTHAL_SHEAR_FIELD_NAMES
+        for f in radar_field_name_by_pair]
+    num_tasks = len(task_indices_list)
+
+    if num_processes > 1:
+        stats_dict = {
+            RADAR_FILE_NAME_MATRIX_KEY: radar_file_name_matrix,
+            METADATA_DICT_BY_FIELD_KEY: metadata_dict_by_field,
+            GRID_POINT_ROWS_BY_FIELD_KEY: grid_point_rows_by_field,
+            GRID_POINT_COLUMNS_BY_FIELD_KEY: grid_point_columns_by_field,
+            STORM_INDICES_BY_TIME_KEY: storm_indices_by_time,
+            DILATION_FLAG_BY_FIELD_KEY: dilation_flag_by_field,
+            RADAR_DATA_SOURCE_KEY: radar_data_source,
+            DILATION_HALF_WIDTH_KEY: dilation_half_width_in_pixels,
+            DILATION_PERCENTILE_LEVEL_KEY: dilation_percentile_level,
+            STATISTIC_NAMES_KEY: statistic_names,
+            PERCENTILE_LEVELS_KEY: percentile_levels
+        }
+
+        print ('Computing stats for {0:d} field-time pairs in {1:d} '
+               'processes...').format(num_tasks, num_processes)
+        worker_pool = multiprocessing.Pool(
+            processes=num_processes, initializer=_init_stats_worker,
+            initargs=(stats_dict,))
+
+        try:
+            for t, (this_statistic_matrix, this_percentile_matrix) in enumerate(
+                    worker_pool.imap(
+                        _get_stats_for_one_task_in_worker, task_indices_list)):
+                i, j = task_indices_list[t]
+                statistic_matrix[storm_indices_by_time[i], j, :] = (
+                    this_statistic_matrix)
+                percentile_matrix[storm_indices_by_time[i], j, :] = (
+                    this_percentile_matrix)
+        finally:
+            worker_pool.close()
+            worker_pool.join()
+
+    else:
+        read_argument_lists = [
+            (radar_file_name_matrix[i, j], metadata_dict_by_field[j],
+             radar_data_source, storm_indices_by_time[i],
+             grid_point_rows_by_field[j], grid_point_columns_by_field[j],
+             dilation_flag_by_field[j], dilation_half_width_in_pixels,
+             dilation_percentile_level)
+            for i, j in task_indices_list]
+
+        for t, (these_radar_values, these_num_points_by_storm) in enumerate(
+                _read_radar_values_in_order(
+                    read_argument_lists, num_read_ahead_files)):
+            i, j = task_indices_list[t]
             this_time_string = time_conversion.unix_sec_to_string(
                 unique_storm_times_unix_sec[i], TIME_FORMAT_FOR_LOG_MESSAGES)
             print ('Computing stats for "' + str(radar_field_name_by_pair[j]) +
                    '" at ' + str(radar_height_by_pair_m_agl[j]) +
                    ' m AGL and ' + this_time_string + '...')
 
-            if metadata_dict_for_this_field is None:
-                metadata_dict_for_this_field = (
-                    radar_io.read_metadata_from_raw_file(
-                        radar_file_name_matrix[i, j],
-                        data_source=radar_data_source))
-                storm_object_to_grid_pts_table_this_field = (
-                    get_grid_points_in_storm_objects(
-                        storm_object_table, metadata_dict_for_storm_objects,
-                        metadata_dict_for_this_field))
-
-            sparse_grid_table_this_field = (
-                radar_io.read_data_from_sparse_grid_file(
-                    radar_file_name_matrix[i, j],
-                    field_name_orig=metadata_dict_for_this_field[
-                        radar_io.FIELD_NAME_COLUMN_ORIG],
-                    data_source=radar_data_source,
-                    sentinel_values=metadata_dict_for_this_field[
-                        radar_io.SENTINEL_VALUE_COLUMN]))
-
-            radar_matrix_this_field, _, _ = radar_s2f.sparse_to_full_grid(
-                sparse_grid_table_this_field, metadata_dict_for_this_field)
-
-            if (dilate_azimuthal_shear and radar_field_name_by_pair[j] in
-                    AZIMUTHAL_SHEAR_FIELD_NAMES):
-                print 'Dilating azimuthal-shear field...'
-                radar_matrix_this_field = dilation.dilate_2d_matrix(
-                    radar_matrix_this_field,
-                    percentile_level=dilation_percentile_level,
-                    half_width_in_pixels=dilation_half_width_in_pixels,
-                    take_largest_absolute_value=True)
-
-            radar_matrix_this_field[numpy.isnan(radar_matrix_this_field)] = 0.
-
-            these_storm_flags = numpy.logical_and(
-                storm_object_table[tracking_io.TIME_COLUMN].values ==
-                unique_storm_times_unix_sec[i],
-                storm_object_table[tracking_io.SPC_DATE_COLUMN].values ==
-                unique_spc_dates_unix_sec[i])
-            these_storm_indices = numpy.where(these_storm_flags)[0]
-
-            for this_storm_index in these_storm_indices:
-                radar_values_this_storm = extract_radar_grid_points(
-                    radar_matrix_this_field,
-                    row_indices=storm_object_to_grid_pts_table_this_field[
-                        tracking_io.GRID_POINT_ROW_COLUMN].values[
-                            this_storm_index].astype(int),
-                    column_indices=storm_object_to_grid_pts_table_this_field[
-                        tracking_io.GRID_POINT_COLUMN_COLUMN].values[
-                            this_storm_index].astype(int))
-
-                (statistic_matrix[this_storm_index, j, :],
-                 percentile_matrix[this_storm_index, j, :]) = (
-                     get_spatial_statistics(
-                         radar_values_this_storm,
-                         statistic_names=statistic_names,
-                         percentile_levels=percentile_levels))
+            this_statistic_matrix, this_percentile_matrix = (
+                _get_stats_from_radar_values(
+                    these_radar_values,
+                    num_grid_points_by_storm=these_num_points_by_storm,
+                    statistic_names=statistic_names,
+                    percentile_levels=percentile_levels))
+
+            statistic_matrix[storm_indices_by_time[i], j, :] = (
+                this_statistic_matrix)
+            percentile_matrix[storm_indices_by_time[i], j, :] = (
+                this_percentile_matrix)
 
     storm_radar_statistic_dict = {}
     for j in range(num_radar_fields):
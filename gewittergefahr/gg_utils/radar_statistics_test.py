@@ -48,6 +48,30 @@ STATISTIC_VALUES = numpy.array([30., 24.494897, 0.170103, -1.75])
 PERCENTILE_LEVELS = numpy.array([0., 5., 25., 50., 75., 95., 100.])
 PERCENTILE_VALUES = numpy.array([0., 4., 20., 20., 50., 58., 60.])
 
+# The following constants are used to test _get_grid_points_for_storms.
+THESE_ALL_ROWS = numpy.array([0, 0, 0, 1, 1, 1], dtype=int)
+THESE_ALL_COLUMNS = numpy.array([0, 1, 2, 0, 1, 2], dtype=int)
+GRID_POINT_ROWS_BY_STORM = numpy.array(
+    [THESE_ALL_ROWS, numpy.array([0], dtype=int), THESE_ALL_ROWS[:3]],
+    dtype=object)
+GRID_POINT_COLUMNS_BY_STORM = numpy.array(
+    [THESE_ALL_COLUMNS, numpy.array([0], dtype=int), THESE_ALL_COLUMNS[:3]],
+    dtype=object)
+STORM_INDICES_FOR_STATS = numpy.array([2, 0], dtype=int)
+CONCAT_GRID_POINT_ROWS = numpy.concatenate(
+    (THESE_ALL_ROWS[:3], THESE_ALL_ROWS))
+CONCAT_GRID_POINT_COLUMNS = numpy.concatenate(
+    (THESE_ALL_COLUMNS[:3], THESE_ALL_COLUMNS))
+NUM_GRID_POINTS_BY_STORM = numpy.array([3, 6], dtype=int)
+
+# The following constants are used to test _get_stats_from_radar_values.
+RADAR_VALUES_FOR_STORMS = numpy.concatenate(
+    (numpy.array([1., 2., 3.]), numpy.ravel(RADAR_FIELD_FOR_STATS)))
+FIRST_STATISTIC_VALUES = numpy.array([2., 1., 0., -1.5])
+FIRST_PERCENTILE_VALUES = numpy.array([1., 1.1, 1.5, 2., 2.5, 2.9, 3.])
+STATISTIC_MATRIX = numpy.vstack((FIRST_STATISTIC_VALUES, STATISTIC_VALUES))
+PERCENTILE_MATRIX = numpy.vstack((FIRST_PERCENTILE_VALUES, PERCENTILE_VALUES))
+
 
 class RadarStatisticsTests(unittest.TestCase):
     """Each method is a unit test for radar_statistics.py."""
@@ -249,6 +273,36 @@ class RadarStatisticsTests(unittest.TestCase):
         self.assertTrue(numpy.allclose(
             these_percentile_values, PERCENTILE_VALUES, atol=TOLERANCE))
 
+    def test_get_grid_points_for_storms(self):
+        """Ensures correct output from _get_grid_points_for_storms."""
+
+        these_rows, these_columns, these_num_points_by_storm = (
+            radar_stats._get_grid_points_for_storms(
+                storm_indices=STORM_INDICES_FOR_STATS,
+                grid_point_rows_by_storm=GRID_POINT_ROWS_BY_STORM,
+                grid_point_columns_by_storm=GRID_POINT_COLUMNS_BY_STORM))
+
+        self.assertTrue(numpy.array_equal(these_rows, CONCAT_GRID_POINT_ROWS))
+        self.assertTrue(numpy.array_equal(
+            these_columns, CONCAT_GRID_POINT_COLUMNS))
+        self.assertTrue(numpy.array_equal(
+            these_num_points_by_storm, NUM_GRID_POINTS_BY_STORM))
+
+    def test_get_stats_from_radar_values(self):
+        """Ensures correct output from _get_stats_from_radar_values."""
+
+        this_statistic_matrix, this_percentile_matrix = (
+            radar_stats._get_stats_from_radar_values(
+                RADAR_VALUES_FOR_STORMS,
+                num_grid_points_by_storm=NUM_GRID_POINTS_BY_STORM,
+                statistic_names=STATISTIC_NAMES,
+                percentile_levels=PERCENTILE_LEVELS))
+
+        self.assertTrue(numpy.allclose(
+            this_statistic_matrix, STATISTIC_MATRIX, atol=TOLERANCE))
+        self.assertTrue(numpy.allclose(
+            this_percentile_matrix, PERCENTILE_MATRIX, atol=TOLERANCE))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -91,6 +91,106 @@ def get_echo_top_single_column(
     return interp_object(critical_reflectivity_dbz)
 
 
+def get_echo_top_multi_column(
+        reflectivity_matrix_dbz, heights_m_asl, critical_reflectivity_dbz,
+        check_args=False):
+    """Finds echo top for many columns (horizontal locations) at once.
+
+    This is a vectorized version of get_echo_top_single_column, with identical
+    results for each column.
+
+    H = number of heights
+    P = number of columns
+
+    :param reflectivity_matrix_dbz: H-by-P numpy array of reflectivities.
+    :param heights_m_asl: length-H numpy array of heights (metres above sea
+        level).  This method assumes that heights are sorted in ascending order.
+    :param critical_reflectivity_dbz: Critical reflectivity.
+    :param check_args: Boolean flag.  If True, will check input arguments for
+        errors.
+    :return: echo_tops_m_asl: length-P numpy array of echo tops.
+    """
+
+    error_checking.assert_is_boolean(check_args)
+    if check_args:
+        error_checking.assert_is_real_numpy_array(reflectivity_matrix_dbz)
+        error_checking.assert_is_numpy_array(
+            reflectivity_matrix_dbz, num_dimensions=2)
+
+        num_heights = reflectivity_matrix_dbz.shape[0]
+        error_checking.assert_is_geq_numpy_array(heights_m_asl, 0.)
+        error_checking.assert_is_numpy_array(
+            heights_m_asl, exact_dimensions=numpy.array([num_heights]))
+
+        error_checking.assert_is_greater(critical_reflectivity_dbz, 0.)
+
+    num_heights = reflectivity_matrix_dbz.shape[0]
+    num_columns = reflectivity_matrix_dbz.shape[1]
+    echo_tops_m_asl = numpy.full(num_columns, numpy.nan)
+
+    with numpy.errstate(invalid='ignore'):
+        critical_flag_matrix = (
+            reflectivity_matrix_dbz >= critical_reflectivity_dbz)
+        subcritical_flag_matrix = (
+            reflectivity_matrix_dbz < critical_reflectivity_dbz)
+
+    column_indices = numpy.where(numpy.any(critical_flag_matrix, axis=0))[0]
+    if len(column_indices) == 0:
+        return echo_tops_m_asl
+
+    critical_flag_matrix = critical_flag_matrix[:, column_indices]
+    subcritical_flag_matrix = subcritical_flag_matrix[:, column_indices]
+    reflectivity_matrix_dbz = reflectivity_matrix_dbz[:, column_indices]
+
+    highest_critical_indices = num_heights - 1 - numpy.argmax(
+        critical_flag_matrix[::-1, :], axis=0)
+    highest_critical_refls_dbz = reflectivity_matrix_dbz[
+        highest_critical_indices, numpy.arange(len(column_indices))]
+
+    subcritical_flag_matrix[
+        numpy.arange(num_heights)[:, numpy.newaxis] <=
+        highest_critical_indices[numpy.newaxis, :]] = False
+    interp_flags = numpy.any(subcritical_flag_matrix, axis=0)
+
+    # Columns with no subcritical value above the echo top: extrapolate.
+    extrap_indices = numpy.where(numpy.invert(interp_flags))[0]
+    these_height_indices = highest_critical_indices[extrap_indices]
+    these_upper_indices = numpy.where(
+        these_height_indices + 1 < num_heights, these_height_indices + 1,
+        these_height_indices)
+    these_lower_indices = numpy.where(
+        these_height_indices + 1 < num_heights, these_height_indices,
+        these_height_indices - 1)
+    these_height_spacings_metres = (
+        heights_m_asl[these_upper_indices] - heights_m_asl[these_lower_indices])
+
+    echo_tops_m_asl[column_indices[extrap_indices]] = (
+        heights_m_asl[these_height_indices] +
+        these_height_spacings_metres * (
+            1. - critical_reflectivity_dbz /
+            highest_critical_refls_dbz[extrap_indices]))
+
+    # Other columns: interpolate between highest critical value and adjacent
+    # subcritical value.
+    interp_indices = numpy.where(interp_flags)[0]
+    these_height_indices = highest_critical_indices[interp_indices]
+    these_subcritical_indices = numpy.argmax(
+        subcritical_flag_matrix[:, interp_indices], axis=0)
+    these_subcritical_refls_dbz = reflectivity_matrix_dbz[
+        these_subcritical_indices, interp_indices]
+
+    echo_tops_m_asl[column_indices[interp_indices]] = (
+        heights_m_asl[these_height_indices] +
+        (critical_reflectivity_dbz -
+         highest_critical_refls_dbz[interp_indices]) *
+        (heights_m_asl[these_subcritical_indices] -
+         heights_m_asl[these_height_indices]) /
+        (these_subcritical_refls_dbz -
+         highest_critical_refls_dbz[interp_indices]))
+
+    return echo_tops_m_asl
+
+
 def write_field_to_myrorss_file(
         field_matrix, netcdf_file_name, field_name, metadata_dict,
         height_m_asl=None):
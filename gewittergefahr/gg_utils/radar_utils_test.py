@@ -48,6 +48,36 @@ class RadarUtilsTests(unittest.TestCase):
             this_echo_top_matrix_m_asl, ECHO_TOP_MATRIX_M_ASL, atol=TOLERANCE,
             equal_nan=True))
 
+    def test_get_echo_top_multi_column(self):
+        """Ensures correct output from get_echo_top_multi_column."""
+
+        this_num_heights = REFLECTIVITY_MATRIX_DBZ.shape[0]
+        these_echo_tops_m_asl = radar_utils.get_echo_top_multi_column(
+            reflectivity_matrix_dbz=numpy.reshape(
+                REFLECTIVITY_MATRIX_DBZ, (this_num_heights, -1)),
+            heights_m_asl=UNIQUE_GRID_POINT_HEIGHTS_M_ASL,
+            critical_reflectivity_dbz=CRIT_REFL_FOR_ECHO_TOPS_DBZ,
+            check_args=True)
+
+        self.assertTrue(numpy.allclose(
+            these_echo_tops_m_asl, numpy.ravel(ECHO_TOP_MATRIX_M_ASL),
+            atol=TOLERANCE, equal_nan=True))
+
+    def test_get_echo_top_multi_column_no_critical(self):
+        """Ensures correct output from get_echo_top_multi_column.
+
+        In this case, no column reaches the critical reflectivity.
+        """
+
+        this_num_heights = REFLECTIVITY_MATRIX_DBZ.shape[0]
+        these_echo_tops_m_asl = radar_utils.get_echo_top_multi_column(
+            reflectivity_matrix_dbz=numpy.reshape(
+                REFLECTIVITY_MATRIX_DBZ, (this_num_heights, -1)),
+            heights_m_asl=UNIQUE_GRID_POINT_HEIGHTS_M_ASL,
+            critical_reflectivity_dbz=100., check_args=True)
+
+        self.assertTrue(numpy.all(numpy.isnan(these_echo_tops_m_asl)))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -176,26 +176,105 @@ def _project_polygon_latlng_to_xy(polygon_object_latlng,
         vertex_x_metres, vertex_y_metres)
 
 
-def _xy_polygon_to_binary_matrix(
-        polygon_object_xy,
+def _project_polygons_latlng_to_xy(polygon_objects_latlng,
+                                   centroid_latitudes_deg=None,
+                                   centroid_longitudes_deg=None):
+    """Projects many polygons from lat-long to x-y coordinates.
+
+    This method is equivalent to calling _project_polygon_latlng_to_xy for each
+    polygon, but all vertices are projected with one vectorized call.  Only the
+    exterior of each polygon is projected.
+
+    N = number of polygons
+    V = total number of vertices over all polygons
+
+    :param polygon_objects_latlng: length-N list (or numpy array) of
+        `shapely.geometry.Polygon` objects, where x-coordinates are actually
+        longitudes and y-coordinates are actually latitudes.
+    :param centroid_latitudes_deg: length-N numpy array with latitudes (deg N)
+        at polygon centroids.
+    :param centroid_longitudes_deg: length-N numpy array with longitudes (deg E)
+        at polygon centroids.
+    :return: vertex_x_metres: length-V numpy array of x-coordinates.
+    :return: vertex_y_metres: length-V numpy array of y-coordinates.
+    :return: vertex_offsets: numpy array (length N + 1) of integers.  Vertices
+        for the [i]th polygon are vertex_x_metres[
+        vertex_offsets[i]:vertex_offsets[i + 1]].
+    """
+
+    vertex_longitudes_deg, vertex_latitudes_deg, vertex_offsets, _ = (
+        polygons.polygon_objects_to_flat_arrays(
+            polygon_objects_latlng, exterior_only=True))
+    num_vertices_by_polygon = numpy.diff(vertex_offsets)
+
+    vertex_x_metres, vertex_y_metres = (
+        projections.project_latlng_to_xy_local_lambert(
+            vertex_latitudes_deg, vertex_longitudes_deg,
+            central_latitudes_deg=numpy.repeat(
+                centroid_latitudes_deg, num_vertices_by_polygon),
+            central_longitudes_deg=numpy.repeat(
+                centroid_longitudes_deg, num_vertices_by_polygon)))
+
+    return vertex_x_metres, vertex_y_metres, vertex_offsets
+
+
+def _get_areas_and_perimeters(vertex_x_metres, vertex_y_metres,
+                              vertex_offsets):
+    """Computes area and perimeter of many simple polygons.
+
+    N = number of polygons
+
+    :param vertex_x_metres: See documentation for
+        _project_polygons_latlng_to_xy.  Each polygon must be closed (first
+        vertex = last vertex).
+    :param vertex_y_metres: Same.
+    :param vertex_offsets: Same.
+    :return: areas_metres2: length-N numpy array of areas.
+    :return: perimeters_metres: length-N numpy array of perimeters.
+    """
+
+    # Each term involves a vertex and the next one.  Terms that span two
+    # polygons (last vertex of one, first vertex of the next) are zeroed out.
+    cross_products_metres2 = (
+        vertex_x_metres[:-1] * vertex_y_metres[1:] -
+        vertex_x_metres[1:] * vertex_y_metres[:-1])
+    edge_lengths_metres = numpy.sqrt(
+        numpy.diff(vertex_x_metres) ** 2 + numpy.diff(vertex_y_metres) ** 2)
+
+    polygon_end_indices = vertex_offsets[1:-1] - 1
+    cross_products_metres2[polygon_end_indices] = 0.
+    edge_lengths_metres[polygon_end_indices] = 0.
+
+    cross_products_metres2 = numpy.concatenate((
+        cross_products_metres2, numpy.array([0.])))
+    edge_lengths_metres = numpy.concatenate((
+        edge_lengths_metres, numpy.array([0.])))
+
+    polygon_start_indices = vertex_offsets[:-1]
+    areas_metres2 = 0.5 * numpy.absolute(
+        numpy.add.reduceat(cross_products_metres2, polygon_start_indices))
+    perimeters_metres = numpy.add.reduceat(
+        edge_lengths_metres, polygon_start_indices)
+
+    return areas_metres2, perimeters_metres
+
+
+def _vertex_arrays_to_binary_matrix(
+        vertex_x_metres, vertex_y_metres,
         grid_spacing_metres=GRID_SPACING_FOR_BINARY_MATRIX_DEFAULT_METRES):
-    """Converts x-y polygon to binary image matrix.
+    """Converts x-y polygon (defined by vertex arrays) to binary image matrix.
 
     M = number of rows in x-y grid
     N = number of columns in x-y grid
 
-    :param polygon_object_xy: Instance of `shapely.geometry.Polygon`, where x-
-        and y-coordinates are in metres.
-    :param grid_spacing_metres: Grid spacing (distance between adjacent grid
-        points).
-    :return: binary_image_matrix_xy: M-by-N Boolean numpy array.  If
-        binary_image_matrix[i, j] = True, grid point [i, j] is inside the
-        polygon.  Otherwise, grid point [i, j] is outside the polygon.
+    :param vertex_x_metres: 1-D numpy array with x-coordinates of vertices.
+    :param vertex_y_metres: 1-D numpy array with y-coordinates of vertices.
+    :param grid_spacing_metres: See documentation for
+        _xy_polygon_to_binary_matrix.
+    :return: binary_image_matrix_xy: See documentation for
+        _xy_polygon_to_binary_matrix.
     """
 
-    vertex_x_metres = numpy.asarray(polygon_object_xy.exterior.xy[0])
-    vertex_y_metres = numpy.asarray(polygon_object_xy.exterior.xy[1])
-
     num_grid_rows = int(numpy.ceil(
         (numpy.max(vertex_y_metres) - numpy.min(vertex_y_metres)) /
         grid_spacing_metres))
@@ -218,6 +297,95 @@ def _xy_polygon_to_binary_matrix(
         (num_grid_rows, num_grid_columns), vertex_array_xy_metres)
 
 
+def _xy_polygon_to_binary_matrix(
+        polygon_object_xy,
+        grid_spacing_metres=GRID_SPACING_FOR_BINARY_MATRIX_DEFAULT_METRES):
+    """Converts x-y polygon to binary image matrix.
+
+    M = number of rows in x-y grid
+    N = number of columns in x-y grid
+
+    :param polygon_object_xy: Instance of `shapely.geometry.Polygon`, where x-
+        and y-coordinates are in metres.
+    :param grid_spacing_metres: Grid spacing (distance between adjacent grid
+        points).
+    :return: binary_image_matrix_xy: M-by-N Boolean numpy array.  If
+        binary_image_matrix[i, j] = True, grid point [i, j] is inside the
+        polygon.  Otherwise, grid point [i, j] is outside the polygon.
+    """
+
+    return _vertex_arrays_to_binary_matrix(
+        numpy.asarray(polygon_object_xy.exterior.xy[0]),
+        numpy.asarray(polygon_object_xy.exterior.xy[1]),
+        grid_spacing_metres=grid_spacing_metres)
+
+
+def _binary_matrices_to_label_matrix(binary_image_matrices):
+    """Packs binary images for many polygons into one label image.
+
+    Images are placed side by side in horizontal strips ("shelves"), so that
+    `skimage.measure.regionprops` can be run once for all polygons.  Region
+    properties computed by this module do not depend on the position of the
+    region in the image, so they are the same as those computed from each
+    binary image separately.
+
+    N = number of polygons
+    M = number of rows in label image
+    P = number of columns in label image
+
+    :param binary_image_matrices: length-N list of Boolean numpy arrays, each
+        created by _vertex_arrays_to_binary_matrix.
+    :return: label_matrix: M-by-P numpy array of integers.  If
+        label_matrix[i, j] = 0, pixel [i, j] is not inside any polygon.  If
+        label_matrix[i, j] = k, pixel [i, j] is inside the [k - 1]th polygon.
+    """
+
+    num_rows_by_image = numpy.array(
+        [m.shape[0] for m in binary_image_matrices], dtype=int)
+    num_columns_by_image = numpy.array(
+        [m.shape[1] for m in binary_image_matrices], dtype=int)
+
+    total_num_pixels = numpy.sum(num_rows_by_image * num_columns_by_image)
+    shelf_width = max([
+        numpy.max(num_columns_by_image),
+        int(numpy.ceil(numpy.sqrt(total_num_pixels)))])
+
+    sort_indices = numpy.argsort(-num_rows_by_image, kind='mergesort')
+    first_row_by_image = numpy.full(len(binary_image_matrices), -1, dtype=int)
+    first_column_by_image = numpy.full(
+        len(binary_image_matrices), -1, dtype=int)
+
+    this_shelf_first_row = 0
+    this_shelf_num_rows = 0
+    this_shelf_num_columns = 0
+
+    for i in sort_indices:
+        if this_shelf_num_columns + num_columns_by_image[i] > shelf_width:
+            this_shelf_first_row += this_shelf_num_rows
+            this_shelf_num_rows = 0
+            this_shelf_num_columns = 0
+
+        first_row_by_image[i] = this_shelf_first_row
+        first_column_by_image[i] = this_shelf_num_columns
+        this_shelf_num_rows = max(
+            [this_shelf_num_rows, num_rows_by_image[i]])
+        this_shelf_num_columns += num_columns_by_image[i]
+
+    label_matrix = numpy.full(
+        (this_shelf_first_row + this_shelf_num_rows, shelf_width), 0,
+        dtype=int)
+
+    for i in range(len(binary_image_matrices)):
+        this_label_submatrix = label_matrix[
+            first_row_by_image[i]:
+            (first_row_by_image[i] + num_rows_by_image[i]),
+            first_column_by_image[i]:
+            (first_column_by_image[i] + num_columns_by_image[i])]
+        this_label_submatrix[binary_image_matrices[i]] = i + 1
+
+    return label_matrix
+
+
 def get_statistic_columns(statistic_table):
     """Returns names of columns with shape statistics.
 
@@ -399,62 +567,107 @@ def get_stats_for_storm_objects(
         statistic_names)
 
     num_storm_objects = len(storm_object_table.index)
-    nan_array = numpy.full(num_storm_objects, numpy.nan)
-
-    argument_dict = {}
+    statistic_dict = {}
     for this_name in statistic_names:
-        argument_dict.update({this_name: nan_array})
-    storm_object_table = storm_object_table.assign(**argument_dict)
-
-    for i in range(num_storm_objects):
-        this_polygon_object_xy = _project_polygon_latlng_to_xy(
-            storm_object_table[
-                tracking_io.POLYGON_OBJECT_LATLNG_COLUMN].values[i],
-            centroid_latitude_deg=
-            storm_object_table[tracking_io.CENTROID_LAT_COLUMN].values[i],
-            centroid_longitude_deg=
-            storm_object_table[tracking_io.CENTROID_LNG_COLUMN].values[i])
-
-        if basic_stat_names:
-            this_basic_stat_dict = get_basic_statistics(
-                this_polygon_object_xy, basic_stat_names)
-
-            for this_name in basic_stat_names:
-                storm_object_table[this_name].values[i] = this_basic_stat_dict[
-                    this_name]
-
-        if region_property_names:
-            this_binary_image_matrix = _xy_polygon_to_binary_matrix(
-                this_polygon_object_xy, grid_spacing_for_binary_matrix_metres)
-
-            this_region_prop_dict = get_region_properties(
-                this_binary_image_matrix, property_names=region_property_names)
-
-            for this_name in region_property_names:
-                storm_object_table[this_name].values[i] = this_region_prop_dict[
-                    this_name]
-
-        if curvature_based_stat_names:
-            these_x_smoothed_metres, these_y_smoothed_metres = (
-                sia.sia_for_closed_polygon(
-                    this_polygon_object_xy,
-                    num_vertices_in_half_window=
-                    num_vertices_in_smoothing_half_window,
-                    num_iterations=num_smoothing_iterations,
-                    check_input_args=i == 0))
-
-            this_polygon_object_xy_smoothed = (
-                polygons.vertex_arrays_to_polygon_object(
-                    these_x_smoothed_metres, these_y_smoothed_metres))
-
-            this_curvature_based_stat_dict = get_curvature_based_stats(
-                this_polygon_object_xy_smoothed,
-                statistic_names=curvature_based_stat_names)
-
-            for this_name in curvature_based_stat_names:
-                storm_object_table[this_name].values[i] = (
-                    this_curvature_based_stat_dict[this_name])
-
+        statistic_dict.update(
+            {this_name: numpy.full(num_storm_objects, numpy.nan)})
+
+    if num_storm_objects == 0:
+        return storm_object_table.assign(**statistic_dict)[
+            STORM_COLUMNS_TO_KEEP + statistic_names]
+
+    vertex_x_metres, vertex_y_metres, vertex_offsets = (
+        _project_polygons_latlng_to_xy(
+            storm_object_table[tracking_io.POLYGON_OBJECT_LATLNG_COLUMN].values,
+            centroid_latitudes_deg=
+            storm_object_table[tracking_io.CENTROID_LAT_COLUMN].values,
+            centroid_longitudes_deg=
+            storm_object_table[tracking_io.CENTROID_LNG_COLUMN].values))
+
+    if basic_stat_names:
+        areas_metres2, perimeters_metres = _get_areas_and_perimeters(
+            vertex_x_metres, vertex_y_metres, vertex_offsets)
+
+        if AREA_NAME in basic_stat_names:
+            statistic_dict[AREA_NAME] = areas_metres2
+        if PERIMETER_NAME in basic_stat_names:
+            statistic_dict[PERIMETER_NAME] = perimeters_metres
+
+    if region_property_names:
+        unique_times_unix_sec, orig_to_unique_time_indices = numpy.unique(
+            storm_object_table[tracking_io.TIME_COLUMN].values,
+            return_inverse=True)
+
+        for j in range(len(unique_times_unix_sec)):
+            these_storm_indices = numpy.where(
+                orig_to_unique_time_indices == j)[0]
+
+            these_binary_image_matrices = [
+                _vertex_arrays_to_binary_matrix(
+                    vertex_x_metres[vertex_offsets[i]:vertex_offsets[i + 1]],
+                    vertex_y_metres[vertex_offsets[i]:vertex_offsets[i + 1]],
+                    grid_spacing_metres=grid_spacing_for_binary_matrix_metres)
+                for i in these_storm_indices]
+            this_label_matrix = _binary_matrices_to_label_matrix(
+                these_binary_image_matrices)
+
+            for this_regionprops_object in skimage.measure.regionprops(
+                    this_label_matrix):
+                this_storm_index = these_storm_indices[
+                    this_regionprops_object.label - 1]
+
+                for this_name in region_property_names:
+                    this_value = getattr(
+                        this_regionprops_object,
+                        _stat_name_new_to_orig(this_name))
+                    if this_name == ORIENTATION_NAME:
+                        this_value *= RADIANS_TO_DEGREES
+
+                    statistic_dict[this_name][this_storm_index] = this_value
+
+    if curvature_based_stat_names:
+        smoothed_vertex_x_metres, smoothed_vertex_y_metres = (
+            sia.sia_for_closed_polygons(
+                vertex_x_metres, vertex_y_metres, vertex_offsets,
+                num_vertices_in_half_window=
+                num_vertices_in_smoothing_half_window,
+                num_iterations=num_smoothing_iterations))
+
+        curvatures_by_storm_metres01 = [
+            shape_utils.get_curvature_for_closed_vertex_arrays(
+                smoothed_vertex_x_metres[
+                    vertex_offsets[i]:vertex_offsets[i + 1]],
+                smoothed_vertex_y_metres[
+                    vertex_offsets[i]:vertex_offsets[i + 1]])
+            for i in range(num_storm_objects)]
+
+        smoothed_areas_metres2, smoothed_perimeters_metres = (
+            _get_areas_and_perimeters(
+                smoothed_vertex_x_metres, smoothed_vertex_y_metres,
+                vertex_offsets))
+
+        curvature_offsets = numpy.concatenate((
+            numpy.array([0], dtype=int),
+            numpy.cumsum([len(c) for c in curvatures_by_storm_metres01])))
+        curvatures_metres01 = numpy.concatenate(curvatures_by_storm_metres01)
+        num_vertices_by_storm = numpy.diff(curvature_offsets)
+
+        if MEAN_ABS_CURVATURE_NAME in curvature_based_stat_names:
+            statistic_dict[MEAN_ABS_CURVATURE_NAME] = numpy.add.reduceat(
+                numpy.absolute(curvatures_metres01),
+                curvature_offsets[:-1]) / num_vertices_by_storm
+
+        if BENDING_ENERGY_NAME in curvature_based_stat_names:
+            statistic_dict[BENDING_ENERGY_NAME] = numpy.add.reduceat(
+                curvatures_metres01 ** 2,
+                curvature_offsets[:-1]) / smoothed_perimeters_metres
+
+        if COMPACTNESS_NAME in curvature_based_stat_names:
+            statistic_dict[COMPACTNESS_NAME] = (
+                smoothed_perimeters_metres ** 2 /
+                (4 * numpy.pi * smoothed_areas_metres2))
+
+    storm_object_table = storm_object_table.assign(**statistic_dict)
     return storm_object_table[STORM_COLUMNS_TO_KEEP + statistic_names]
 
 
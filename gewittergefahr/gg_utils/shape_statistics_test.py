@@ -5,6 +5,7 @@ import numpy
 from gewittergefahr.gg_utils import shape_statistics as shape_stats
 from gewittergefahr.gg_utils import polygons
 
+TOLERANCE = 1e-6
 FAKE_STATISTIC_NAME = 'foo'
 
 VERTEX_X_METRES = numpy.array(
@@ -36,6 +37,22 @@ VERTEX_Y_METRES_OFFSET = VERTEX_Y_METRES + Y_OFFSET_METRES
 POLYGON_OBJECT_XY_OFFSET = polygons.vertex_arrays_to_polygon_object(
     VERTEX_X_METRES_OFFSET, VERTEX_Y_METRES_OFFSET)
 
+# The following constants are used to test _get_areas_and_perimeters.
+SQUARE_VERTEX_X_METRES = numpy.array([0., 2., 2., 0., 0.])
+SQUARE_VERTEX_Y_METRES = numpy.array([0., 0., 2., 2., 0.])
+FLAT_VERTEX_X_METRES = numpy.concatenate((
+    VERTEX_X_METRES, SQUARE_VERTEX_X_METRES))
+FLAT_VERTEX_Y_METRES = numpy.concatenate((
+    VERTEX_Y_METRES, SQUARE_VERTEX_Y_METRES))
+VERTEX_OFFSETS = numpy.array([0, 13, 18], dtype=int)
+AREAS_METRES2 = numpy.array([POLYGON_OBJECT_XY.area, 4.])
+PERIMETERS_METRES = numpy.array([POLYGON_OBJECT_XY.length, 8.])
+
+# The following constants are used to test _binary_matrices_to_label_matrix.
+SMALL_BINARY_MATRIX = numpy.array([[1, 0], [1, 1]], dtype=bool)
+BINARY_IMAGE_MATRICES = [
+    SMALL_BINARY_MATRIX, BINARY_IMAGE_MATRIX, SMALL_BINARY_MATRIX]
+
 
 class ShapeStatisticsTests(unittest.TestCase):
     """Each method is a unit test for shape_statistics.py."""
@@ -122,5 +139,34 @@ class ShapeStatisticsTests(unittest.TestCase):
             this_binary_image_matrix, BINARY_IMAGE_MATRIX))
 
 
+    def test_get_areas_and_perimeters(self):
+        """Ensures correct output from _get_areas_and_perimeters."""
+
+        these_areas_metres2, these_perimeters_metres = (
+            shape_stats._get_areas_and_perimeters(
+                FLAT_VERTEX_X_METRES, FLAT_VERTEX_Y_METRES, VERTEX_OFFSETS))
+
+        self.assertTrue(numpy.allclose(
+            these_areas_metres2, AREAS_METRES2, atol=TOLERANCE))
+        self.assertTrue(numpy.allclose(
+            these_perimeters_metres, PERIMETERS_METRES, atol=TOLERANCE))
+
+    def test_binary_matrices_to_label_matrix(self):
+        """Ensures correct output from _binary_matrices_to_label_matrix."""
+
+        this_label_matrix = shape_stats._binary_matrices_to_label_matrix(
+            BINARY_IMAGE_MATRICES)
+
+        for i in range(len(BINARY_IMAGE_MATRICES)):
+            these_rows, these_columns = numpy.where(this_label_matrix == i + 1)
+            this_binary_matrix = this_label_matrix[
+                numpy.min(these_rows):(numpy.max(these_rows) + 1),
+                numpy.min(these_columns):(numpy.max(these_columns) + 1)
+            ] == i + 1
+
+            self.assertTrue(numpy.array_equal(
+                this_binary_matrix, BINARY_IMAGE_MATRICES[i]))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -183,6 +183,34 @@ def get_curvature_for_closed_polygon(polygon_object_xy_metres):
     return _get_curvature(vertex_x_padded_metres, vertex_y_padded_metres)
 
 
+def get_curvature_for_closed_vertex_arrays(vertex_x_metres, vertex_y_metres):
+    """Computes signed curvature at each vertex of closed polygon.
+
+    This method is the same as get_curvature_for_closed_polygon, except that the
+    polygon is specified by vertex arrays rather than a shapely object.
+
+    V = number of vertices (including the duplicate of the first vertex, used to
+        close the polygon)
+
+    :param vertex_x_metres: length-V numpy array with x-coordinates of vertices.
+    :param vertex_y_metres: length-V numpy array with y-coordinates of vertices.
+    :return: vertex_curvatures_metres01: numpy array (length V - 1) of
+        curvatures (inverse metres).
+    """
+
+    vertex_x_metres = vertex_x_metres[:-1]
+    vertex_y_metres = vertex_y_metres[:-1]
+
+    vertex_x_padded_metres = numpy.concatenate((
+        vertex_x_metres[-SPLINE_DEGREE:], vertex_x_metres,
+        vertex_x_metres[:SPLINE_DEGREE]))
+    vertex_y_padded_metres = numpy.concatenate((
+        vertex_y_metres[-SPLINE_DEGREE:], vertex_y_metres,
+        vertex_y_metres[:SPLINE_DEGREE]))
+
+    return _get_curvature(vertex_x_padded_metres, vertex_y_padded_metres)
+
+
 def get_curvature_for_polyline(vertex_x_metres, vertex_y_metres):
     """Computes signed curvature at each vertex of polyline*.
 
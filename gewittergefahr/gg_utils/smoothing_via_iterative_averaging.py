@@ -11,10 +11,8 @@ Mansouryar, Mohsen, and Amin Hedayati. "Smoothing via iterative averaging (SIA)
     Electrical Engineering 4.3 (2012): 307.
 """
 
-import copy
 import numpy
 from gewittergefahr.gg_utils import shape_utils
-from gewittergefahr.gg_utils import polygons
 from gewittergefahr.gg_utils import error_checking
 
 MIN_VERTICES_IN_POLYGON_OR_LINE = 4
@@ -41,32 +39,161 @@ def _sia_one_iteration(vertex_x_coords_padded, vertex_y_coords_padded,
         y-coordinates of vertices.
     """
 
-    num_vertices_padded = len(vertex_x_coords_padded)
-    vertex_x_coords_smoothed = numpy.full(num_vertices_padded, numpy.nan)
-    vertex_y_coords_smoothed = numpy.full(num_vertices_padded, numpy.nan)
-
-    start_index = num_vertices_in_half_window
-    end_index = len(vertex_x_coords_padded) - num_vertices_in_half_window
-
-    for i in range(start_index, end_index):
-        vertex_x_coords_smoothed[i] = numpy.mean(
-            vertex_x_coords_padded[
-                (i - num_vertices_in_half_window):
-                (i + num_vertices_in_half_window + 1)])
-        vertex_y_coords_smoothed[i] = numpy.mean(
-            vertex_y_coords_padded[
-                (i - num_vertices_in_half_window):
-                (i + num_vertices_in_half_window + 1)])
-
-    vertex_x_coords_smoothed = (
-        vertex_x_coords_smoothed[
-            num_vertices_in_half_window:-num_vertices_in_half_window])
-    vertex_y_coords_smoothed = (
-        vertex_y_coords_smoothed[
-            num_vertices_in_half_window:-num_vertices_in_half_window])
+    averaging_kernel = numpy.full(2 * num_vertices_in_half_window + 1, 1.)
+    num_vertices_in_window = float(len(averaging_kernel))
+
+    vertex_x_coords_smoothed = numpy.convolve(
+        vertex_x_coords_padded, averaging_kernel, mode='valid'
+    ) / num_vertices_in_window
+    vertex_y_coords_smoothed = numpy.convolve(
+        vertex_y_coords_padded, averaging_kernel, mode='valid'
+    ) / num_vertices_in_window
+
     return vertex_x_coords_smoothed, vertex_y_coords_smoothed
 
 
+def _get_neighbour_indices_for_closed_polygons(
+        num_vertices_by_polygon, num_vertices_in_half_window):
+    """Finds indices of vertices in smoothing window, for many closed polygons.
+
+    N = number of polygons
+    V = total number of unique vertices (not counting the duplicate of the first
+        vertex, used to close each polygon)
+    W = number of vertices in full window = 2 * num_vertices_in_half_window + 1
+
+    :param num_vertices_by_polygon: length-N numpy array with number of unique
+        vertices in each polygon.
+    :param num_vertices_in_half_window: Number of vertices in smoothing half-
+        window.  For each polygon, this is capped at (number of vertices - 1).
+    :return: neighbour_index_matrix: V-by-W numpy array.  The window for the
+        [i]th vertex contains vertices neighbour_index_matrix[i, :], with
+        wrap-around at the end of each polygon.
+    :return: neighbour_flag_matrix: V-by-W numpy array of Boolean flags.  If
+        neighbour_flag_matrix[i, j] = False, the [j]th vertex in the window for
+        the [i]th vertex is outside the (capped) window and must be ignored.
+    :return: num_vertices_in_window_by_vertex: length-V numpy array with number
+        of vertices in window (after capping) for each vertex.
+    """
+
+    polygon_start_indices = numpy.concatenate((
+        numpy.array([0], dtype=int), numpy.cumsum(num_vertices_by_polygon)))
+    polygon_index_by_vertex = numpy.repeat(
+        numpy.linspace(
+            0, len(num_vertices_by_polygon) - 1,
+            num=len(num_vertices_by_polygon), dtype=int),
+        num_vertices_by_polygon)
+
+    num_vertices_total = polygon_start_indices[-1]
+    local_index_by_vertex = (
+        numpy.linspace(0, num_vertices_total - 1, num=num_vertices_total,
+                       dtype=int) -
+        polygon_start_indices[polygon_index_by_vertex])
+
+    window_offsets = numpy.linspace(
+        -num_vertices_in_half_window, num_vertices_in_half_window,
+        num=2 * num_vertices_in_half_window + 1, dtype=int)
+    num_vertices_by_vertex = num_vertices_by_polygon[polygon_index_by_vertex]
+
+    neighbour_index_matrix = (
+        polygon_start_indices[polygon_index_by_vertex][:, None] + numpy.mod(
+            local_index_by_vertex[:, None] + window_offsets[None, :],
+            num_vertices_by_vertex[:, None]))
+
+    half_windows_by_vertex = numpy.minimum(
+        num_vertices_in_half_window, num_vertices_by_vertex - 1)
+    neighbour_flag_matrix = (
+        numpy.absolute(window_offsets)[None, :] <=
+        half_windows_by_vertex[:, None])
+
+    return (neighbour_index_matrix, neighbour_flag_matrix,
+            2 * half_windows_by_vertex + 1)
+
+
+def sia_for_closed_polygons(
+        vertex_x_coords, vertex_y_coords, vertex_offsets,
+        num_vertices_in_half_window=NUM_VERTICES_IN_HALF_WINDOW_DEFAULT,
+        num_iterations=NUM_ITERATIONS_DEFAULT, check_input_args=True):
+    """Implements the SIA algorithm for many closed polygons at once.
+
+    This method is equivalent to calling sia_for_closed_polygon for each
+    polygon, but all polygons are smoothed together with vectorized operations.
+
+    N = number of polygons
+    V = total number of vertices over all polygons
+
+    :param vertex_x_coords: length-V numpy array with x-coordinates of vertices.
+        Each polygon must be closed (first vertex = last vertex), as in the
+        output of `polygons.polygon_objects_to_flat_arrays`.
+    :param vertex_y_coords: length-V numpy array with y-coordinates of vertices.
+    :param vertex_offsets: numpy array (length N + 1) of integers.  Vertices in
+        the [i]th polygon are vertex_x_coords[
+        vertex_offsets[i]:vertex_offsets[i + 1]].
+    :param num_vertices_in_half_window: See documentation for
+        sia_for_closed_polygon.
+    :param num_iterations: Same.
+    :param check_input_args: Same.
+    :return: vertex_x_coords_smoothed: length-V numpy array with smoothed
+        x-coordinates of vertices.  The [i]th polygon is still closed and
+        occupies vertex_x_coords_smoothed[
+        vertex_offsets[i]:vertex_offsets[i + 1]].
+    :return: vertex_y_coords_smoothed: Same, but for y-coordinates.
+    """
+
+    num_vertices_by_polygon = numpy.diff(vertex_offsets) - 1
+
+    if check_input_args:
+        num_vertices_total = len(vertex_x_coords)
+        error_checking.assert_is_numpy_array_without_nan(vertex_x_coords)
+        error_checking.assert_is_numpy_array(vertex_x_coords, num_dimensions=1)
+        error_checking.assert_is_numpy_array_without_nan(vertex_y_coords)
+        error_checking.assert_is_numpy_array(
+            vertex_y_coords, exact_dimensions=numpy.array([num_vertices_total]))
+
+        error_checking.assert_is_integer_numpy_array(vertex_offsets)
+        error_checking.assert_is_numpy_array(vertex_offsets, num_dimensions=1)
+        error_checking.assert_is_geq_numpy_array(
+            num_vertices_by_polygon, MIN_VERTICES_IN_POLYGON_OR_LINE)
+        error_checking.assert_is_integer(num_vertices_in_half_window)
+        error_checking.assert_is_geq(num_vertices_in_half_window, 1)
+        error_checking.assert_is_integer(num_iterations)
+        error_checking.assert_is_geq(num_iterations, 1)
+
+    closing_vertex_flags = numpy.full(len(vertex_x_coords), False, dtype=bool)
+    closing_vertex_flags[vertex_offsets[1:] - 1] = True
+    unique_vertex_indices = numpy.where(numpy.invert(closing_vertex_flags))[0]
+
+    vertex_x_coords_smoothed = vertex_x_coords[unique_vertex_indices]
+    vertex_y_coords_smoothed = vertex_y_coords[unique_vertex_indices]
+
+    (neighbour_index_matrix, neighbour_flag_matrix,
+     num_vertices_in_window_by_vertex) = (
+         _get_neighbour_indices_for_closed_polygons(
+             num_vertices_by_polygon, num_vertices_in_half_window))
+
+    for _ in range(num_iterations):
+        vertex_x_coords_smoothed = numpy.sum(
+            vertex_x_coords_smoothed[neighbour_index_matrix] *
+            neighbour_flag_matrix, axis=1) / num_vertices_in_window_by_vertex
+        vertex_y_coords_smoothed = numpy.sum(
+            vertex_y_coords_smoothed[neighbour_index_matrix] *
+            neighbour_flag_matrix, axis=1) / num_vertices_in_window_by_vertex
+
+    unique_vertex_offsets = vertex_offsets - numpy.linspace(
+        0, len(vertex_offsets) - 1, num=len(vertex_offsets), dtype=int)
+    first_vertex_indices = unique_vertex_offsets[:-1]
+
+    vertex_x_coords_closed = numpy.full(len(vertex_x_coords), numpy.nan)
+    vertex_y_coords_closed = numpy.full(len(vertex_y_coords), numpy.nan)
+    vertex_x_coords_closed[unique_vertex_indices] = vertex_x_coords_smoothed
+    vertex_y_coords_closed[unique_vertex_indices] = vertex_y_coords_smoothed
+    vertex_x_coords_closed[closing_vertex_flags] = vertex_x_coords_smoothed[
+        first_vertex_indices]
+    vertex_y_coords_closed[closing_vertex_flags] = vertex_y_coords_smoothed[
+        first_vertex_indices]
+
+    return vertex_x_coords_closed, vertex_y_coords_closed
+
+
 def sia_for_closed_polygon(
         polygon_object,
         num_vertices_in_half_window=NUM_VERTICES_IN_HALF_WINDOW_DEFAULT,
@@ -91,42 +218,14 @@ def sia_for_closed_polygon(
         y-coordinates of vertices.
     """
 
-    num_vertices = len(polygon_object.exterior.xy[0]) - 1
-
-    if check_input_args:
-        error_checking.assert_is_geq(
-            num_vertices, MIN_VERTICES_IN_POLYGON_OR_LINE)
-        error_checking.assert_is_integer(num_vertices_in_half_window)
-        error_checking.assert_is_geq(num_vertices_in_half_window, 1)
-        error_checking.assert_is_integer(num_iterations)
-        error_checking.assert_is_geq(num_iterations, 1)
-
-    num_vertices_in_half_window = numpy.min(
-        numpy.array([num_vertices_in_half_window, num_vertices - 1]))
-
-    for i in range(num_iterations):
-        if i == 0:
-            this_polygon_object = copy.deepcopy(polygon_object)
-        else:
-            this_polygon_object = polygons.vertex_arrays_to_polygon_object(
-                vertex_x_coords_smoothed, vertex_y_coords_smoothed)
-
-        vertex_x_coords_padded, vertex_y_coords_padded = (
-            shape_utils.pad_closed_polygon(
-                this_polygon_object,
-                num_padding_vertices=num_vertices_in_half_window,
-                check_input_args=False))
+    vertex_x_coords = numpy.asarray(polygon_object.exterior.xy[0])
+    vertex_y_coords = numpy.asarray(polygon_object.exterior.xy[1])
 
-        vertex_x_coords_smoothed, vertex_y_coords_smoothed = _sia_one_iteration(
-            vertex_x_coords_padded, vertex_y_coords_padded,
-            num_vertices_in_half_window)
-
-    vertex_x_coords_smoothed = numpy.concatenate((
-        vertex_x_coords_smoothed, numpy.array([vertex_x_coords_smoothed[0]])))
-    vertex_y_coords_smoothed = numpy.concatenate((
-        vertex_y_coords_smoothed, numpy.array([vertex_y_coords_smoothed[0]])))
-
-    return vertex_x_coords_smoothed, vertex_y_coords_smoothed
+    return sia_for_closed_polygons(
+        vertex_x_coords, vertex_y_coords,
+        numpy.array([0, len(vertex_x_coords)], dtype=int),
+        num_vertices_in_half_window=num_vertices_in_half_window,
+        num_iterations=num_iterations, check_input_args=check_input_args)
 
 
 def sia_for_polyline(
@@ -33,6 +33,26 @@ POLYGON_Y_COORDS_SMOOTHED = numpy.array(
     [5., 4., 2.333333, 1.666667, 0.666667, 0.333333, 0.333333, 0.666667,
      1.666667, 2.333333, 4., 5.])
 
+# The following constants are used to test sia_for_closed_polygons.
+POLYGON_X_COORDS_SMOOTHED_CLOSED = numpy.concatenate((
+    POLYGON_X_COORDS_SMOOTHED, POLYGON_X_COORDS_SMOOTHED[[0]]))
+POLYGON_Y_COORDS_SMOOTHED_CLOSED = numpy.concatenate((
+    POLYGON_Y_COORDS_SMOOTHED, POLYGON_Y_COORDS_SMOOTHED[[0]]))
+
+FLAT_X_COORDS = numpy.concatenate((POLYGON_X_COORDS, POLYGON_X_COORDS[::-1]))
+FLAT_Y_COORDS = numpy.concatenate((POLYGON_Y_COORDS, POLYGON_Y_COORDS[::-1]))
+FLAT_VERTEX_OFFSETS = numpy.array(
+    [0, len(POLYGON_X_COORDS), 2 * len(POLYGON_X_COORDS)], dtype=int)
+
+# Reversing the order of vertices does not change the moving average, except
+# that the first (unique) vertex is now the old last vertex.
+THESE_X_COORDS = numpy.roll(POLYGON_X_COORDS_SMOOTHED[::-1], 1)
+THESE_Y_COORDS = numpy.roll(POLYGON_Y_COORDS_SMOOTHED[::-1], 1)
+FLAT_X_COORDS_SMOOTHED = numpy.concatenate((
+    POLYGON_X_COORDS_SMOOTHED_CLOSED, THESE_X_COORDS, THESE_X_COORDS[[0]]))
+FLAT_Y_COORDS_SMOOTHED = numpy.concatenate((
+    POLYGON_Y_COORDS_SMOOTHED_CLOSED, THESE_Y_COORDS, THESE_Y_COORDS[[0]]))
+
 
 class SmoothingViaIterativeAveragingTests(unittest.TestCase):
     """Each method is a unit test for smoothing_via_iterative_averaging.py."""
@@ -77,5 +97,36 @@ class SmoothingViaIterativeAveragingTests(unittest.TestCase):
             atol=TOLERANCE))
 
 
+    def test_sia_for_closed_polygon(self):
+        """Ensures correct output from sia_for_closed_polygon."""
+
+        these_x_coords_smoothed, these_y_coords_smoothed = (
+            sia.sia_for_closed_polygon(
+                POLYGON_OBJECT,
+                num_vertices_in_half_window=
+                NUM_VERTICES_IN_SMOOTHING_HALF_WINDOW, num_iterations=1))
+
+        self.assertTrue(numpy.allclose(
+            these_x_coords_smoothed, POLYGON_X_COORDS_SMOOTHED_CLOSED,
+            atol=TOLERANCE))
+        self.assertTrue(numpy.allclose(
+            these_y_coords_smoothed, POLYGON_Y_COORDS_SMOOTHED_CLOSED,
+            atol=TOLERANCE))
+
+    def test_sia_for_closed_polygons(self):
+        """Ensures correct output from sia_for_closed_polygons."""
+
+        these_x_coords_smoothed, these_y_coords_smoothed = (
+            sia.sia_for_closed_polygons(
+                FLAT_X_COORDS, FLAT_Y_COORDS, FLAT_VERTEX_OFFSETS,
+                num_vertices_in_half_window=
+                NUM_VERTICES_IN_SMOOTHING_HALF_WINDOW, num_iterations=1))
+
+        self.assertTrue(numpy.allclose(
+            these_x_coords_smoothed, FLAT_X_COORDS_SMOOTHED, atol=TOLERANCE))
+        self.assertTrue(numpy.allclose(
+            these_y_coords_smoothed, FLAT_Y_COORDS_SMOOTHED, atol=TOLERANCE))
+
+
 if __name__ == '__main__':
     unittest.main()
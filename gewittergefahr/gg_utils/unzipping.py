@@ -1,33 +1,397 @@
-"""Methods for unzipping files."""
+"""Methods for unzipping files.
+
+All methods work in-process (with the `tarfile` and `gzip` modules), rather
+than calling the Unix commands `tar` and `gunzip`.
+"""
 
 import os
+import gzip
+import time
+import shutil
+import tarfile
+import warnings
+import collections
+import multiprocessing.pool
+from io import BytesIO
 from gewittergefahr.gg_utils import file_system_utils
 from gewittergefahr.gg_utils import error_checking
 
+GZIP_FILE_EXTENSION = '.gz'
+DEFAULT_NUM_THREADS = 1
+BYTES_TO_MEGABYTES = 1e-6
+COPY_BUFFER_SIZE_BYTES = 1048576
+
+
+def _check_member_name(member_name):
+    """Ensures that tar member can be safely extracted.
+
+    :param member_name: Name of tar member (relative path inside tar file).
+    :raises: ValueError: if member name is an absolute path or contains "..".
+    """
+
+    if os.path.isabs(member_name) or '..' in member_name.split('/'):
+        error_string = (
+            'Tar member "{0:s}" would be extracted outside the target '
+            'directory.').format(member_name)
+        raise ValueError(error_string)
+
+
+def _check_link_name(member_object):
+    """Ensures that tar member, if it is a link, points inside the archive.
+
+    The target of a symbolic link is relative to the directory containing the
+    link, while the target of a hard link is relative to the top of the archive.
+
+    :param member_object: Instance of `tarfile.TarInfo`, with normalized name
+        (see `_match_tar_member`).
+    :raises: ValueError: if member is a symbolic or hard link whose target is an
+        absolute path or is outside the archive.
+    """
+
+    if not (member_object.issym() or member_object.islnk()):
+        return
+
+    link_name = member_object.linkname
+    if member_object.issym():
+        link_target = os.path.join(
+            os.path.dirname(member_object.name), link_name)
+    else:
+        link_target = link_name
+
+    link_target = os.path.normpath(link_target)
+
+    if (os.path.isabs(link_name) or link_target == '..' or
+            link_target.startswith('../')):
+        error_string = (
+            'Tar member "{0:s}" is a link to "{1:s}", which is outside the '
+            'target directory.').format(member_object.name, link_name)
+        raise ValueError(error_string)
+
+
+def _match_tar_member(member_object, relative_paths):
+    """Determines whether or not tar member should be extracted.
+
+    A member is extracted if its name matches one of the relative paths, or if
+    it is inside one of the relative paths (which are directories).  If the
+    member is extracted, its name is normalized (leading "./" and trailing "/"
+    are removed).  Members with unsafe names, or links pointing outside the
+    archive, cause an error.
+
+    :param member_object: Instance of `tarfile.TarInfo`.
+    :param relative_paths: 1-D list of relative paths (see doc for
+        `file_and_dir_names_to_unzip` in unzip_tar), without leading or trailing
+        slashes.
+    :return: matching_path: Element of `relative_paths` that matches the
+        member.  If the member should not be extracted, this is None.
+    """
+
+    member_name = member_object.name
+    if member_name.startswith('./'):
+        member_name = member_name[2:]
+    member_name = member_name.rstrip('/')
+
+    for this_relative_path in relative_paths:
+        if not (member_name == this_relative_path or
+                member_name.startswith(this_relative_path + '/')):
+            continue
+
+        _check_member_name(member_name)
+        member_object.name = member_name
+        _check_link_name(member_object)
+        return this_relative_path
+
+    return None
+
+
+def _warn_about_missing_paths(relative_paths, relative_paths_found):
+    """Warns about relative paths that were not found in tar file.
+
+    :param relative_paths: 1-D list of relative paths.
+    :param relative_paths_found: Set of relative paths that were found.
+    """
+
+    for this_relative_path in relative_paths:
+        if this_relative_path in relative_paths_found:
+            continue
+
+        warning_string = 'Cannot find "{0:s}" in tar file.'.format(
+            this_relative_path)
+        warnings.warn(warning_string)
+
+
+def _find_tar_members(tar_file_handle, file_and_dir_names_to_unzip):
+    """Finds tar members to extract.
+
+    :param tar_file_handle: Instance of `tarfile.TarFile`.
+    :param file_and_dir_names_to_unzip: See doc for unzip_tar.
+    :return: member_objects: 1-D list of members to extract (instances of
+        `tarfile.TarInfo`), in the order that they appear in the tar file.
+    """
+
+    relative_paths = [p.strip('/') for p in file_and_dir_names_to_unzip]
+    relative_paths_found = set()
+    member_objects = []
+
+    for this_member_object in tar_file_handle:
+        this_matching_path = _match_tar_member(
+            this_member_object, relative_paths)
+        if this_matching_path is None:
+            continue
+
+        relative_paths_found.add(this_matching_path)
+        member_objects.append(this_member_object)
+
+    _warn_about_missing_paths(relative_paths, relative_paths_found)
+    return member_objects
+
+
+def _copy_tar_member(tar_file_name, member_object, target_directory_name):
+    """Copies one regular file from uncompressed tar file.
+
+    Each call opens its own handle to the tar file and seeks directly to the
+    member's data, so that several members can be copied in parallel threads.
+
+    :param tar_file_name: Path to tar file (must not be compressed).
+    :param member_object: Instance of `tarfile.TarInfo`.
+    :param target_directory_name: Path to output directory.
+    :return: num_bytes: Number of bytes copied.
+    """
+
+    output_file_name = '{0:s}/{1:s}'.format(
+        target_directory_name, member_object.name)
+    file_system_utils.mkdir_recursive_if_necessary(file_name=output_file_name)
+
+    input_file_handle = open(tar_file_name, 'rb')
+    output_file_handle = open(output_file_name, 'wb')
+
+    try:
+        input_file_handle.seek(member_object.offset_data)
+        num_bytes_left = member_object.size
+
+        while num_bytes_left > 0:
+            this_buffer = input_file_handle.read(
+                min([num_bytes_left, COPY_BUFFER_SIZE_BYTES]))
+            if not this_buffer:
+                error_string = 'Tar file "{0:s}" ends in middle of "{1:s}".'
+                raise IOError(error_string.format(
+                    tar_file_name, member_object.name))
+
+            output_file_handle.write(this_buffer)
+            num_bytes_left -= len(this_buffer)
+    finally:
+        input_file_handle.close()
+        output_file_handle.close()
+
+    os.utime(output_file_name, (member_object.mtime, member_object.mtime))
+    return member_object.size
+
+
+def _read_member_contents(member_name, member_contents, unzip_gzip_members):
+    """Returns contents of tar member, unzipping if necessary.
+
+    :param member_name: Name of tar member.
+    :param member_contents: Contents of tar member (string).
+    :param unzip_gzip_members: See doc for read_tar_members.
+    :return: member_name: Name of tar member (without ".gz", if unzipped).
+    :return: member_contents: Contents of tar member (unzipped, if necessary).
+    """
+
+    if not (unzip_gzip_members and member_name.endswith(GZIP_FILE_EXTENSION)):
+        return member_name, member_contents
+
+    gzip_file_handle = gzip.GzipFile(fileobj=BytesIO(member_contents))
+    try:
+        member_contents = gzip_file_handle.read()
+    finally:
+        gzip_file_handle.close()
+
+    return member_name[:-len(GZIP_FILE_EXTENSION)], member_contents
+
+
+def _report_throughput(num_files, num_bytes, start_time_unix_sec, verb_string):
+    """Prints number of files and bytes processed per second.
+
+    :param num_files: Number of files processed.
+    :param num_bytes: Number of bytes processed.
+    :param start_time_unix_sec: Time (from `time.time`) when processing started.
+    :param verb_string: Verb describing processing (e.g., "Unzipped").
+    """
+
+    elapsed_time_sec = max([time.time() - start_time_unix_sec, 1e-6])
+    print ('{0:s} {1:d} files ({2:.1f} MB) in {3:.2f} seconds ({4:.1f} '
+           'MB/s).').format(
+               verb_string, num_files, num_bytes * BYTES_TO_MEGABYTES,
+               elapsed_time_sec,
+               num_bytes * BYTES_TO_MEGABYTES / elapsed_time_sec)
+
 
 def unzip_tar(tar_file_name, target_directory_name=None,
-              file_and_dir_names_to_unzip=None):
+              file_and_dir_names_to_unzip=None,
+              num_threads=DEFAULT_NUM_THREADS):
     """Unzips tar file.
 
+    If the tar file is uncompressed, regular files are copied directly from
+    their offsets in the tar file, in `num_threads` parallel threads.  If the
+    tar file is compressed, it can be read only sequentially, so `num_threads`
+    is ignored.
+
+    Relative paths that are not found in the tar file are skipped with a
+    warning (like the Unix command `tar`, which extracts everything it can
+    before reporting missing paths).
+
     :param tar_file_name: Path to input file.
     :param target_directory_name: Path to output directory.
     :param file_and_dir_names_to_unzip: List of files and directories to extract
         from the tar file.  Each list element should be a relative path inside
         the tar file.  After unzipping, the same relative path will exist inside
         `target_directory_name`.
+    :param num_threads: Number of threads used to copy files.
     """
 
-    error_checking.assert_is_string(tar_file_name)
+    error_checking.assert_file_exists(tar_file_name)
     error_checking.assert_is_string_list(file_and_dir_names_to_unzip)
+    error_checking.assert_is_integer(num_threads)
+    error_checking.assert_is_greater(num_threads, 0)
     file_system_utils.mkdir_recursive_if_necessary(
         directory_name=target_directory_name)
 
-    unix_command_string = 'tar -C "{0:s}" -xvf "{1:s}"'.format(
-        target_directory_name, tar_file_name)
-    for this_relative_path in file_and_dir_names_to_unzip:
-        unix_command_string += ' "' + this_relative_path + '"'
+    start_time_unix_sec = time.time()
+    try:
+        tar_file_handle = tarfile.open(tar_file_name, 'r:')
+        is_compressed = False
+    except tarfile.ReadError:
+        tar_file_handle = tarfile.open(tar_file_name, 'r:*')
+        is_compressed = True
+
+    try:
+        member_objects = _find_tar_members(
+            tar_file_handle, file_and_dir_names_to_unzip)
+        num_bytes = sum([m.size for m in member_objects if m.isfile()])
 
-    os.system(unix_command_string)
+        if is_compressed:
+            for this_member_object in member_objects:
+                tar_file_handle.extract(
+                    this_member_object, path=target_directory_name)
+        else:
+            regular_file_objects = []
+            for this_member_object in member_objects:
+                if this_member_object.isfile() and not (
+                        this_member_object.issparse()):
+                    regular_file_objects.append(this_member_object)
+                else:
+                    tar_file_handle.extract(
+                        this_member_object, path=target_directory_name)
+
+            if num_threads == 1:
+                for this_member_object in regular_file_objects:
+                    _copy_tar_member(
+                        tar_file_name, this_member_object,
+                        target_directory_name)
+            else:
+                thread_pool = multiprocessing.pool.ThreadPool(
+                    processes=num_threads)
+                try:
+                    thread_pool.map(
+                        lambda m: _copy_tar_member(
+                            tar_file_name, m, target_directory_name),
+                        regular_file_objects)
+                finally:
+                    thread_pool.close()
+                    thread_pool.join()
+    finally:
+        tar_file_handle.close()
+
+    _report_throughput(
+        num_files=len([m for m in member_objects if m.isfile()]),
+        num_bytes=num_bytes, start_time_unix_sec=start_time_unix_sec,
+        verb_string='Unzipped')
+
+
+def read_tar_members(tar_file_name, file_and_dir_names_to_read,
+                     unzip_gzip_members=True, num_threads=DEFAULT_NUM_THREADS):
+    """Reads files from tar file into memory, without writing them to disk.
+
+    The tar file is read once, sequentially.  If `unzip_gzip_members = True`,
+    gzipped members are unzipped in a pool of `num_threads` threads (zlib
+    releases the global interpreter lock, so this runs in parallel), while the
+    main thread reads the next members.  At most 2 * `num_threads` members are
+    held in memory at once.
+
+    :param tar_file_name: Path to input file.
+    :param file_and_dir_names_to_read: See doc for `file_and_dir_names_to_unzip`
+        in unzip_tar.
+    :param unzip_gzip_members: Boolean flag.  If True, members ending in ".gz"
+        will be unzipped.
+    :param num_threads: Number of threads used to unzip members.
+    :return: member_name: Relative path of file inside the tar file.  If the
+        file was unzipped, ".gz" is removed from the end.
+    :return: member_contents: Contents of file (string).
+
+    This is a generator, yielding one pair of outputs at a time, in the order
+    that files appear in the tar file.
+    """
+
+    error_checking.assert_file_exists(tar_file_name)
+    error_checking.assert_is_string_list(file_and_dir_names_to_read)
+    error_checking.assert_is_boolean(unzip_gzip_members)
+    error_checking.assert_is_integer(num_threads)
+    error_checking.assert_is_greater(num_threads, 0)
+
+    start_time_unix_sec = time.time()
+    tar_file_handle = tarfile.open(tar_file_name, 'r:*')
+    thread_pool = None
+    num_files = 0
+    num_bytes = 0
+
+    try:
+        if num_threads > 1 and unzip_gzip_members:
+            thread_pool = multiprocessing.pool.ThreadPool(
+                processes=num_threads)
+
+        relative_paths = [p.strip('/') for p in file_and_dir_names_to_read]
+        relative_paths_found = set()
+        pending_results = collections.deque()
+
+        for this_member_object in tar_file_handle:
+            this_matching_path = _match_tar_member(
+                this_member_object, relative_paths)
+            if this_matching_path is None:
+                continue
+
+            relative_paths_found.add(this_matching_path)
+            if not this_member_object.isfile():
+                continue
+
+            this_file_handle = tar_file_handle.extractfile(this_member_object)
+            this_contents = this_file_handle.read()
+            this_file_handle.close()
+            num_files += 1
+            num_bytes += len(this_contents)
+
+            if thread_pool is None:
+                yield _read_member_contents(
+                    this_member_object.name, this_contents, unzip_gzip_members)
+                continue
+
+            pending_results.append(thread_pool.apply_async(
+                _read_member_contents,
+                (this_member_object.name, this_contents, unzip_gzip_members)))
+            if len(pending_results) >= 2 * num_threads:
+                yield pending_results.popleft().get()
+
+        while pending_results:
+            yield pending_results.popleft().get()
+
+        _warn_about_missing_paths(relative_paths, relative_paths_found)
+    finally:
+        if thread_pool is not None:
+            thread_pool.close()
+            thread_pool.join()
+        tar_file_handle.close()
+
+    _report_throughput(
+        num_files=num_files, num_bytes=num_bytes,
+        start_time_unix_sec=start_time_unix_sec, verb_string='Read')
 
 
 def unzip_gzip(gzip_file_name, extracted_file_name):
@@ -40,10 +404,33 @@ def unzip_gzip(gzip_file_name, extracted_file_name):
         here.
     """
 
-    error_checking.assert_is_string(gzip_file_name)
+    error_checking.assert_file_exists(gzip_file_name)
     file_system_utils.mkdir_recursive_if_necessary(
         file_name=extracted_file_name)
 
-    unix_command_string = 'gunzip -v -c "{0:s}" > "{1:s}"'.format(
-        gzip_file_name, extracted_file_name)
-    os.system(unix_command_string)
+    gzip_file_handle = gzip.open(gzip_file_name, 'rb')
+    extracted_file_handle = open(extracted_file_name, 'wb')
+
+    try:
+        shutil.copyfileobj(
+            gzip_file_handle, extracted_file_handle, COPY_BUFFER_SIZE_BYTES)
+    finally:
+        gzip_file_handle.close()
+        extracted_file_handle.close()
+
+
+def read_gzip_file(gzip_file_name):
+    """Reads gzip archive into memory, without writing unzipped file to disk.
+
+    :param gzip_file_name: Path to gzip archive.
+    :return: file_contents: Contents of the one file in the gzip archive
+        (string).
+    """
+
+    error_checking.assert_file_exists(gzip_file_name)
+
+    gzip_file_handle = gzip.open(gzip_file_name, 'rb')
+    try:
+        return gzip_file_handle.read()
+    finally:
+        gzip_file_handle.close()
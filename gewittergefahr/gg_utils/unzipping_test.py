@@ -0,0 +1,309 @@
+"""Unit tests for unzipping.py."""
+
+import os
+import gzip
+import shutil
+import tarfile
+import tempfile
+import unittest
+from io import BytesIO
+from gewittergefahr.gg_utils import unzipping
+
+FILE_CONTENTS_BY_NAME = {
+    'reflectivity/0250/a.txt': b'foo',
+    'reflectivity/0250/b.txt': b'bar' * 1000,
+    'reflectivity/0500/a.txt': b'moo',
+    'mesh/a.txt': b'hello world'
+}
+GZIPPED_FILE_NAME = 'reflectivity/0250/c.txt.gz'
+GZIPPED_FILE_CONTENTS = b'unzipped contents'
+
+DIRECTORY_NAMES_TO_UNZIP = ['reflectivity/0250', 'mesh/a.txt']
+UNZIPPED_FILE_NAMES = [
+    'reflectivity/0250/a.txt', 'reflectivity/0250/b.txt',
+    'reflectivity/0250/c.txt.gz', 'mesh/a.txt']
+NOT_UNZIPPED_FILE_NAMES = ['reflectivity/0500/a.txt']
+
+LINK_NAME = 'reflectivity/0250/link.txt'
+UNSAFE_LINK_TARGETS = ['../../../outside.txt', '/etc/passwd']
+SAFE_LINK_TARGET = 'a.txt'
+
+MEMBER_NAMES_READ = [
+    'mesh/a.txt', 'reflectivity/0250/a.txt', 'reflectivity/0250/b.txt',
+    'reflectivity/0250/c.txt']
+
+
+def _gzip_string(input_string):
+    """Gzips string in memory.
+
+    :param input_string: String.
+    :return: gzipped_string: Gzipped version.
+    """
+
+    bytes_io_object = BytesIO()
+    gzip_file_object = gzip.GzipFile(fileobj=bytes_io_object, mode='wb')
+    gzip_file_object.write(input_string)
+    gzip_file_object.close()
+    return bytes_io_object.getvalue()
+
+
+def _write_tar_file(tar_file_name, file_contents_by_name, mode_string):
+    """Writes tar file.
+
+    :param tar_file_name: Path to output file.
+    :param file_contents_by_name: Dictionary, where each key is a relative path
+        inside the tar file and each value is the contents of the file.
+    :param mode_string: Mode for `tarfile.open` (e.g., "w" or "w:gz").
+    """
+
+    tar_file_handle = tarfile.open(tar_file_name, mode_string)
+    for this_name in sorted(file_contents_by_name.keys()):
+        this_member_object = tarfile.TarInfo(name=this_name)
+        this_member_object.size = len(file_contents_by_name[this_name])
+        tar_file_handle.addfile(
+            this_member_object, BytesIO(file_contents_by_name[this_name]))
+
+    tar_file_handle.close()
+
+
+def _add_link_to_tar_file(tar_file_name, link_name, link_target, link_type,
+                          mode_string):
+    """Writes tar file with one regular file and one link.
+
+    :param tar_file_name: Path to output file.
+    :param link_name: Relative path to link inside the tar file.
+    :param link_target: Target of link.
+    :param link_type: Type of link (`tarfile.SYMTYPE` or `tarfile.LNKTYPE`).
+    :param mode_string: Mode for `tarfile.open` (e.g., "w" or "w:gz").
+    """
+
+    tar_file_handle = tarfile.open(tar_file_name, mode_string)
+
+    this_member_object = tarfile.TarInfo(name='reflectivity/0250/a.txt')
+    this_member_object.size = len(FILE_CONTENTS_BY_NAME[
+        'reflectivity/0250/a.txt'])
+    tar_file_handle.addfile(
+        this_member_object,
+        BytesIO(FILE_CONTENTS_BY_NAME['reflectivity/0250/a.txt']))
+
+    this_member_object = tarfile.TarInfo(name=link_name)
+    this_member_object.type = link_type
+    this_member_object.linkname = link_target
+    tar_file_handle.addfile(this_member_object)
+
+    tar_file_handle.close()
+
+
+class UnzippingTests(unittest.TestCase):
+    """Each method is a unit test for unzipping.py."""
+
+    def setUp(self):
+        """Creates temporary directory with tar files."""
+
+        self.directory_name = tempfile.mkdtemp()
+        self.file_contents_by_name = FILE_CONTENTS_BY_NAME.copy()
+        self.file_contents_by_name.update(
+            {GZIPPED_FILE_NAME: _gzip_string(GZIPPED_FILE_CONTENTS)})
+
+        self.tar_file_name = '{0:s}/data.tar'.format(self.directory_name)
+        _write_tar_file(
+            self.tar_file_name, self.file_contents_by_name, mode_string='w')
+
+        self.compressed_tar_file_name = '{0:s}/data.tar.gz'.format(
+            self.directory_name)
+        _write_tar_file(
+            self.compressed_tar_file_name, self.file_contents_by_name,
+            mode_string='w:gz')
+
+        self.target_directory_name = '{0:s}/unzipped'.format(
+            self.directory_name)
+
+    def tearDown(self):
+        """Deletes temporary directory."""
+
+        shutil.rmtree(self.directory_name)
+
+    def _check_unzipped_files(self):
+        """Ensures that correct files were unzipped."""
+
+        for this_name in UNZIPPED_FILE_NAMES:
+            this_file_handle = open('{0:s}/{1:s}'.format(
+                self.target_directory_name, this_name), 'rb')
+            self.assertTrue(
+                this_file_handle.read() == self.file_contents_by_name[
+                    this_name])
+            this_file_handle.close()
+
+        for this_name in NOT_UNZIPPED_FILE_NAMES:
+            self.assertFalse(os.path.exists('{0:s}/{1:s}'.format(
+                self.target_directory_name, this_name)))
+
+    def test_unzip_tar_one_thread(self):
+        """Ensures correct output from unzip_tar.
+
+        In this case, the tar file is uncompressed and num_threads = 1.
+        """
+
+        unzipping.unzip_tar(
+            self.tar_file_name,
+            target_directory_name=self.target_directory_name,
+            file_and_dir_names_to_unzip=DIRECTORY_NAMES_TO_UNZIP, num_threads=1)
+        self._check_unzipped_files()
+
+    def test_unzip_tar_many_threads(self):
+        """Ensures correct output from unzip_tar.
+
+        In this case, the tar file is uncompressed and num_threads > 1.
+        """
+
+        unzipping.unzip_tar(
+            self.tar_file_name,
+            target_directory_name=self.target_directory_name,
+            file_and_dir_names_to_unzip=DIRECTORY_NAMES_TO_UNZIP, num_threads=3)
+        self._check_unzipped_files()
+
+    def test_unzip_tar_compressed(self):
+        """Ensures correct output from unzip_tar.
+
+        In this case, the tar file is compressed.
+        """
+
+        unzipping.unzip_tar(
+            self.compressed_tar_file_name,
+            target_directory_name=self.target_directory_name,
+            file_and_dir_names_to_unzip=DIRECTORY_NAMES_TO_UNZIP, num_threads=3)
+        self._check_unzipped_files()
+
+    def test_unzip_tar_unsafe_member(self):
+        """Ensures that unzip_tar raises error for unsafe member name."""
+
+        _write_tar_file(
+            self.tar_file_name, {'reflectivity/../../a.txt': b'foo'},
+            mode_string='w')
+
+        with self.assertRaises(ValueError):
+            unzipping.unzip_tar(
+                self.tar_file_name,
+                target_directory_name=self.target_directory_name,
+                file_and_dir_names_to_unzip=['reflectivity'])
+
+    def test_unzip_tar_unsafe_symlink(self):
+        """Ensures that unzip_tar raises error for unsafe symbolic link.
+
+        In this case, the tar file is uncompressed.
+        """
+
+        for this_link_target in UNSAFE_LINK_TARGETS:
+            _add_link_to_tar_file(
+                self.tar_file_name, link_name=LINK_NAME,
+                link_target=this_link_target, link_type=tarfile.SYMTYPE,
+                mode_string='w')
+
+            with self.assertRaises(ValueError):
+                unzipping.unzip_tar(
+                    self.tar_file_name,
+                    target_directory_name=self.target_directory_name,
+                    file_and_dir_names_to_unzip=['reflectivity'])
+
+            self.assertFalse(os.path.lexists('{0:s}/{1:s}'.format(
+                self.target_directory_name, LINK_NAME)))
+
+    def test_unzip_tar_unsafe_symlink_compressed(self):
+        """Ensures that unzip_tar raises error for unsafe symbolic link.
+
+        In this case, the tar file is compressed.
+        """
+
+        for this_link_target in UNSAFE_LINK_TARGETS:
+            _add_link_to_tar_file(
+                self.compressed_tar_file_name, link_name=LINK_NAME,
+                link_target=this_link_target, link_type=tarfile.SYMTYPE,
+                mode_string='w:gz')
+
+            with self.assertRaises(ValueError):
+                unzipping.unzip_tar(
+                    self.compressed_tar_file_name,
+                    target_directory_name=self.target_directory_name,
+                    file_and_dir_names_to_unzip=['reflectivity'])
+
+            self.assertFalse(os.path.lexists('{0:s}/{1:s}'.format(
+                self.target_directory_name, LINK_NAME)))
+
+    def test_unzip_tar_unsafe_hard_link(self):
+        """Ensures that unzip_tar raises error for unsafe hard link."""
+
+        for this_link_target in UNSAFE_LINK_TARGETS:
+            _add_link_to_tar_file(
+                self.tar_file_name, link_name=LINK_NAME,
+                link_target=this_link_target, link_type=tarfile.LNKTYPE,
+                mode_string='w')
+
+            with self.assertRaises(ValueError):
+                unzipping.unzip_tar(
+                    self.tar_file_name,
+                    target_directory_name=self.target_directory_name,
+                    file_and_dir_names_to_unzip=['reflectivity'])
+
+            self.assertFalse(os.path.lexists('{0:s}/{1:s}'.format(
+                self.target_directory_name, LINK_NAME)))
+
+    def test_unzip_tar_safe_symlink(self):
+        """Ensures that unzip_tar extracts symbolic link inside archive."""
+
+        _add_link_to_tar_file(
+            self.compressed_tar_file_name, link_name=LINK_NAME,
+            link_target=SAFE_LINK_TARGET, link_type=tarfile.SYMTYPE,
+            mode_string='w:gz')
+
+        unzipping.unzip_tar(
+            self.compressed_tar_file_name,
+            target_directory_name=self.target_directory_name,
+            file_and_dir_names_to_unzip=['reflectivity'])
+
+        this_link_name = '{0:s}/{1:s}'.format(
+            self.target_directory_name, LINK_NAME)
+        self.assertTrue(os.path.islink(this_link_name))
+        self.assertTrue(os.readlink(this_link_name) == SAFE_LINK_TARGET)
+
+    def test_read_tar_members(self):
+        """Ensures correct output from read_tar_members."""
+
+        these_names = []
+        for this_name, this_contents in unzipping.read_tar_members(
+                self.compressed_tar_file_name,
+                file_and_dir_names_to_read=DIRECTORY_NAMES_TO_UNZIP,
+                unzip_gzip_members=True, num_threads=2):
+            these_names.append(this_name)
+
+            if this_name + '.gz' == GZIPPED_FILE_NAME:
+                self.assertTrue(this_contents == GZIPPED_FILE_CONTENTS)
+            else:
+                self.assertTrue(
+                    this_contents == self.file_contents_by_name[this_name])
+
+        self.assertTrue(these_names == MEMBER_NAMES_READ)
+
+    def test_unzip_gzip(self):
+        """Ensures correct output from unzip_gzip."""
+
+        unzipping.unzip_tar(
+            self.tar_file_name,
+            target_directory_name=self.target_directory_name,
+            file_and_dir_names_to_unzip=[GZIPPED_FILE_NAME])
+
+        this_gzip_file_name = '{0:s}/{1:s}'.format(
+            self.target_directory_name, GZIPPED_FILE_NAME)
+        this_extracted_file_name = this_gzip_file_name.replace('.gz', '')
+        unzipping.unzip_gzip(this_gzip_file_name, this_extracted_file_name)
+
+        this_file_handle = open(this_extracted_file_name, 'rb')
+        self.assertTrue(this_file_handle.read() == GZIPPED_FILE_CONTENTS)
+        this_file_handle.close()
+
+        self.assertTrue(
+            unzipping.read_gzip_file(this_gzip_file_name) ==
+            GZIPPED_FILE_CONTENTS)
+
+
+if __name__ == '__main__':
+    unittest.main()